@@ -0,0 +1,221 @@
+"""Tiny local DTS for offline XBRL tests (no SEC/FASB downloads).
+
+`std/` stands in for a standard taxonomy (label linkbase only, like the us-gaap
+entry point); `<cik>/<accession>/` is a filing whose extension schema adds its own
+dimension, members, a label override and presentation/definition networks. The
+instance path keeps the `<cik>/<accession>/<file>` shape the node u_ids rely on.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STD_NS = "http://example.org/std/2099"
+EXT_NS = "http://example.com/20250101"
+CIK = "0000123456"
+ROLE = "http://example.com/role/Revenue"
+SEGMENTS_ROLE = "http://example.com/role/SegmentsDetails"
+
+_HEAD = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+         '<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" '
+         'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:xbrldt="http://xbrl.org/2005/xbrldt">\n')
+_SCHEMA_NS = ('xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+              'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+              'xmlns:xbrldt="http://xbrl.org/2005/xbrldt"')
+_IMPORTS = ('<xs:import namespace="http://www.xbrl.org/2003/instance" '
+            'schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>\n'
+            '<xs:import namespace="http://xbrl.org/2005/xbrldt" '
+            'schemaLocation="http://www.xbrl.org/2005/xbrldt-2005.xsd"/>\n')
+
+STD_DIMENSIONS = ["ProductOrServiceAxis", "LegalEntityAxis", "ScenarioAxis", "RestatementAxis", "UnlabeledAxis"]
+
+
+def _element(prefix, name, kind):
+    group, typ, extra = {
+        "dim": ("xbrldt:dimensionItem", "xbrli:stringItemType", ' abstract="true"'),
+        "cube": ("xbrldt:hypercubeItem", "xbrli:stringItemType", ' abstract="true"'),
+        "abstract": ("xbrli:item", "xbrli:stringItemType", ' abstract="true"'),
+        "money": ("xbrli:item", "xbrli:monetaryItemType", ' xbrli:balance="credit"'),
+    }[kind]
+    return (f'<xs:element id="{prefix}_{name}" name="{name}" type="{typ}" substitutionGroup="{group}" '
+            f'xbrli:periodType="duration" nillable="true"{extra}/>\n')
+
+
+def _linkbase_ref(href, kind):
+    return (f'<link:linkbaseRef xlink:type="simple" xlink:href="{href}" '
+            f'xlink:role="http://www.xbrl.org/2003/role/{kind}LinkbaseRef" '
+            f'xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>\n')
+
+
+def _labels(xsd, labels):
+    body = '<link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">\n'
+    for i, (eid, text) in enumerate(labels):
+        body += (f'<link:loc xlink:type="locator" xlink:href="{xsd}#{eid}" xlink:label="loc{i}"/>\n'
+                 f'<link:label xlink:type="resource" xlink:label="lab{i}" '
+                 f'xlink:role="http://www.xbrl.org/2003/role/label" xml:lang="en-US">{text}</link:label>\n'
+                 f'<link:labelArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" '
+                 f'xlink:from="loc{i}" xlink:to="lab{i}"/>\n')
+    return _HEAD + body + '</link:labelLink>\n</link:linkbase>\n'
+
+
+def _arcs(link, arc, locs, sections):
+    """Linkbase with one extended link per (role, role_id, arcs) section."""
+    refs = body = ""
+    for role, role_id, arcs in sections:
+        refs += f'<link:roleRef roleURI="{role}" xlink:type="simple" xlink:href="ext.xsd#{role_id}"/>\n'
+        body += f'<link:{link} xlink:type="extended" xlink:role="{role}">\n'
+        for label, href in locs.items():
+            body += f'<link:loc xlink:type="locator" xlink:href="{href}" xlink:label="{label}"/>\n'
+        for order, (arcrole, frm, to, extra) in enumerate(arcs, 1):
+            body += (f'<link:{arc} xlink:type="arc" xlink:arcrole="{arcrole}" xlink:from="{frm}" '
+                     f'xlink:to="{to}" order="{order}"{extra}/>\n')
+        body += f'</link:{link}>\n'
+    return _HEAD + refs + body + '</link:linkbase>\n'
+
+
+def _role_type(role, role_id, definition):
+    return (f'<link:roleType roleURI="{role}" id="{role_id}"><link:definition>{definition}</link:definition>'
+            '<link:usedOn>link:presentationLink</link:usedOn><link:usedOn>link:definitionLink</link:usedOn>'
+            '</link:roleType>\n')
+
+
+def write_dts(root):
+    """Write the fixture DTS under root; returns the instance path."""
+    std_dir = os.path.join(root, "std")
+    filing_dir = os.path.join(root, CIK, "000012345625000001")
+    os.makedirs(std_dir, exist_ok=True)
+    os.makedirs(filing_dir, exist_ok=True)
+
+    std_elements = [_element("std", n, "dim") for n in STD_DIMENSIONS] + [
+        _element("std", "StatementTable", "cube"), _element("std", "StatementLineItems", "abstract"),
+        _element("std", "ProductsAndServicesDomain", "abstract"), _element("std", "ServiceMember", "abstract"),
+        _element("std", "Revenues", "money")]
+    with open(os.path.join(std_dir, "std-2099.xsd"), "w") as fh:
+        fh.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<xs:schema {_SCHEMA_NS} xmlns:std="{STD_NS}" '
+                 f'targetNamespace="{STD_NS}" elementFormDefault="qualified">\n'
+                 '<xs:annotation><xs:appinfo>\n' + _linkbase_ref("std-2099-lab.xml", "label")
+                 + '</xs:appinfo></xs:annotation>\n' + _IMPORTS + "".join(std_elements) + '</xs:schema>\n')
+    with open(os.path.join(std_dir, "std-2099-lab.xml"), "w") as fh:
+        fh.write(_labels("std-2099.xsd", [
+            ("std_ProductOrServiceAxis", "Product and Service [Axis]"),
+            ("std_LegalEntityAxis", "Legal Entity [Axis]"),
+            ("std_ScenarioAxis", "Scenario [Axis]"),
+            ("std_RestatementAxis", "Restatement [Axis]"),
+            ("std_ProductsAndServicesDomain", "Product and Service [Domain]"),
+            ("std_Revenues", "Revenues")]))
+
+    std_xsd = os.path.relpath(os.path.join(std_dir, "std-2099.xsd"), filing_dir)
+    ext_elements = [_element("ext", "SegmentAxis", "dim"), _element("ext", "SegmentDomain", "abstract"),
+                    _element("ext", "WidgetsMember", "abstract"), _element("ext", "GadgetsMember", "abstract"),
+                    _element("ext", "NorthMember", "abstract"), _element("ext", "OtherRevenue", "money")]
+    with open(os.path.join(filing_dir, "ext.xsd"), "w") as fh:
+        fh.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<xs:schema {_SCHEMA_NS} xmlns:ext="{EXT_NS}" '
+                 f'targetNamespace="{EXT_NS}" elementFormDefault="qualified">\n<xs:annotation><xs:appinfo>\n'
+                 + _role_type(ROLE, "Revenue", "0000001 - Statement - Revenue")
+                 + _role_type(SEGMENTS_ROLE, "SegmentsDetails", "0000002 - Disclosure - Segments (Details)")
+                 + _linkbase_ref("ext-lab.xml", "label") + _linkbase_ref("ext-pre.xml", "presentation")
+                 + _linkbase_ref("ext-def.xml", "definition") + '</xs:appinfo></xs:annotation>\n' + _IMPORTS
+                 + f'<xs:import namespace="{STD_NS}" schemaLocation="{std_xsd}"/>\n'
+                 + "".join(ext_elements) + '</xs:schema>\n')
+    with open(os.path.join(filing_dir, "ext-lab.xml"), "w") as fh:
+        fh.write(_labels("ext.xsd", [
+            ("ext_SegmentAxis", "Segment [Axis]"), ("ext_SegmentDomain", "Segment [Domain]"),
+            ("ext_WidgetsMember", "Widgets [Member]"), ("ext_GadgetsMember", "Gadgets [Member]"),
+            ("ext_OtherRevenue", "Other Revenue")]).replace(
+            '</link:labelLink>',
+            f'<link:loc xlink:type="locator" xlink:href="{std_xsd}#std_RestatementAxis" xlink:label="locR"/>\n'
+            '<link:label xlink:type="resource" xlink:label="labR" xlink:role="http://www.xbrl.org/2003/role/label" '
+            'xml:lang="en-US">Restated Periods [Axis]</link:label>\n'
+            '<link:labelArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" '
+            'xlink:from="locR" xlink:to="labR" priority="1"/>\n</link:labelLink>'))
+
+    locs = {n: f"{std_xsd}#std_{n}" for n in ("StatementTable", "StatementLineItems", "ProductOrServiceAxis",
+                                                "ProductsAndServicesDomain", "ServiceMember", "Revenues")}
+    locs.update({n: f"ext.xsd#ext_{n}" for n in ("SegmentAxis", "SegmentDomain", "WidgetsMember",
+                                                "GadgetsMember", "NorthMember", "OtherRevenue")})
+    xdt = "http://xbrl.org/int/dim/arcrole/"
+    with open(os.path.join(filing_dir, "ext-def.xml"), "w") as fh:
+        fh.write(_arcs("definitionLink", "definitionArc", locs, [(ROLE, "Revenue", [
+            (xdt + "all", "StatementLineItems", "StatementTable", ' xbrldt:contextElement="segment" xbrldt:closed="true"'),
+            (xdt + "hypercube-dimension", "StatementTable", "ProductOrServiceAxis", ""),
+            (xdt + "hypercube-dimension", "StatementTable", "SegmentAxis", ""),
+            (xdt + "dimension-domain", "ProductOrServiceAxis", "ProductsAndServicesDomain", ""),
+            (xdt + "dimension-default", "ProductOrServiceAxis", "ProductsAndServicesDomain", ""),
+            (xdt + "domain-member", "ProductsAndServicesDomain", "ServiceMember", ""),
+            (xdt + "domain-member", "ProductsAndServicesDomain", "WidgetsMember", ""),
+            (xdt + "domain-member", "WidgetsMember", "GadgetsMember", ""),
+            (xdt + "dimension-domain", "SegmentAxis", "SegmentDomain", ""),
+            (xdt + "dimension-default", "SegmentAxis", "SegmentDomain", ""),
+            (xdt + "domain-member", "SegmentDomain", "NorthMember", ""),
+            (xdt + "domain-member", "StatementLineItems", "Revenues", ""),
+            (xdt + "domain-member", "StatementLineItems", "OtherRevenue", ""),
+        ]), (SEGMENTS_ROLE, "SegmentsDetails", [
+            (xdt + "notAll", "OtherRevenue", "StatementTable", ' xbrldt:contextElement="segment"'),
+            (xdt + "hypercube-dimension", "StatementTable", "SegmentAxis", ""),
+            (xdt + "dimension-domain", "SegmentAxis", "SegmentDomain", ""),
+            (xdt + "domain-member", "SegmentDomain", "NorthMember", ""),
+        ])]))
+    parent_child = "http://www.xbrl.org/2003/arcrole/parent-child"
+    with open(os.path.join(filing_dir, "ext-pre.xml"), "w") as fh:
+        fh.write(_arcs("presentationLink", "presentationArc", locs, [(ROLE, "Revenue", [
+            (parent_child, "StatementTable", "ProductOrServiceAxis", ""),
+            (parent_child, "StatementTable", "StatementLineItems", ""),
+            (parent_child, "StatementLineItems", "Revenues", ""),
+            (parent_child, "StatementLineItems", "OtherRevenue", ""),
+        ]), (SEGMENTS_ROLE, "SegmentsDetails", [
+            (parent_child, "SegmentAxis", "SegmentDomain", ""),
+            (parent_child, "SegmentDomain", "NorthMember", ""),
+        ])]))
+
+    instance = os.path.join(filing_dir, "ext-20250101.xml")
+    with open(instance, "w") as fh:
+        fh.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+            'xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            'xmlns:xbrldi="http://xbrl.org/2006/xbrldi" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+            f'xmlns:std="{STD_NS}" xmlns:ext="{EXT_NS}">\n'
+            '<link:schemaRef xlink:type="simple" xlink:href="ext.xsd"/>\n'
+            '<xbrli:context id="FY"><xbrli:entity><xbrli:identifier scheme="http://www.sec.gov/CIK">'
+            f'{CIK}</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:startDate>2025-01-01</xbrli:startDate>'
+            '<xbrli:endDate>2025-12-31</xbrli:endDate></xbrli:period></xbrli:context>\n'
+            '<xbrli:context id="FY_Service"><xbrli:entity><xbrli:identifier scheme="http://www.sec.gov/CIK">'
+            f'{CIK}</xbrli:identifier><xbrli:segment><xbrldi:explicitMember dimension="std:ProductOrServiceAxis">'
+            'std:ServiceMember</xbrldi:explicitMember></xbrli:segment></xbrli:entity><xbrli:period>'
+            '<xbrli:startDate>2025-01-01</xbrli:startDate><xbrli:endDate>2025-12-31</xbrli:endDate>'
+            '</xbrli:period></xbrli:context>\n'
+            '<xbrli:unit id="USD"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n'
+            '<std:Revenues contextRef="FY" unitRef="USD" decimals="-6">1000000</std:Revenues>\n'
+            '<std:Revenues contextRef="FY_Service" unitRef="USD" decimals="-6">400000</std:Revenues>\n'
+            '<ext:OtherRevenue contextRef="FY" unitRef="USD" decimals="-6">50000</ext:OtherRevenue>\n'
+            '</xbrli:xbrl>\n')
+    return instance
+
+
+@pytest.fixture(scope="session")
+def fixture_dts(tmp_path_factory):
+    """(root dir, instance path) of the fixture DTS."""
+    pytest.importorskip("arelle")
+    root = str(tmp_path_factory.mktemp("dts"))
+    return root, write_dts(root)
+
+
+@pytest.fixture
+def load_model(fixture_dts):
+    """Factory: a freshly loaded ModelXbrl for the fixture filing (closed after the test)."""
+    from arelle import Cntlr, FileSource
+
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    models = []
+
+    def load():
+        model = cntlr.modelManager.load(FileSource.openFileSource(fixture_dts[1], cntlr))
+        models.append(model)
+        return model
+
+    yield load
+    for model in models:
+        model.close()
+    cntlr.close()
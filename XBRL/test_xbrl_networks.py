@@ -0,0 +1,152 @@
+"""Indexed network/hypercube construction must match the original full-scan builders
+(fixture DTS in conftest.py: one statement and one disclosure role, all + notAll cubes)."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("arelle")
+
+from arelle import XbrlConst  # noqa: E402
+
+from XBRL.xbrl_concept_nodes import Concept  # noqa: E402
+from XBRL.xbrl_dimensions import Hypercube, RelationshipIndex  # noqa: E402
+from XBRL.xbrl_processor import process_report  # noqa: E402
+
+
+# ---- reference: the scans the indexed builders replaced ----
+class LegacyHypercube(Hypercube):
+    def _get_hypercube_properties(self):
+        for rel_type, is_all in ((XbrlConst.all, True), (XbrlConst.notAll, False)):
+            for rel in self.model_xbrl.relationshipSet(rel_type, self.network_uri).modelRelationships:
+                if rel.toModelObject is not None and rel.toModelObject == self.hypercube_item:
+                    return is_all, getattr(rel, 'closed', 'false').lower() == 'true'
+        raise ValueError("no all/notAll")
+
+    def _link_hypercube_concepts(self, report_concepts, report_abstracts):
+        domain_member = self.model_xbrl.relationshipSet(XbrlConst.domainMember, self.network_uri)
+        seen = set()
+
+        def collect(concept):
+            if concept is None or str(concept.qname) in seen:
+                return
+            seen.add(str(concept.qname))
+            cid = f"{concept.qname.namespaceURI}:{concept.qname}"
+            if not concept.isAbstract:
+                match = next((c for c in report_concepts if c.id == cid), None)
+                if match:
+                    self.concepts.append(match)
+            else:
+                match = next((a for a in report_abstracts if a.id == cid), None)
+                if match:
+                    self.abstracts.append(match)
+                else:
+                    self.lineitems.append(concept)
+            for rel in domain_member.fromModelObject(concept):
+                collect(rel.toModelObject)
+
+        for rel_type in (XbrlConst.all, XbrlConst.notAll):
+            for rel in self.model_xbrl.relationshipSet(rel_type, self.network_uri).modelRelationships:
+                if rel.toModelObject is not None and rel.toModelObject == self.hypercube_item:
+                    collect(rel.fromModelObject)
+
+
+def legacy_networks(model_xbrl, relationship_sets):
+    networks = [
+        (uri, ' - '.join(parts[2:]), parts[0], parts[1], rel_set)
+        for rel_set in relationship_sets
+        for rel in model_xbrl.relationshipSet(rel_set).modelRelationships
+        if (role_name := model_xbrl.roleTypeName(roleURI=(uri := rel.linkrole)))
+        and len(parts := [p.strip() for p in role_name.split(' - ')]) >= 3]
+    unique = {}
+    for uri, name, nid, category, rel_set in networks:
+        sets = unique.setdefault((uri, name, nid, category), [])
+        if rel_set not in sets:
+            sets.append(rel_set)
+    return [(*key, sets) for key, sets in unique.items()]
+
+
+def legacy_hypercubes(model_xbrl, network_uri, concepts, abstracts):
+    cubes = []
+    for rel_type in (XbrlConst.all, XbrlConst.notAll):
+        for rel in model_xbrl.relationshipSet(rel_type, network_uri).modelRelationships:
+            if rel.toModelObject is not None and getattr(rel.toModelObject, 'isHypercubeItem', False):
+                cube = LegacyHypercube(model_xbrl=model_xbrl, hypercube_item=rel.toModelObject, network_uri=network_uri)
+                cube._link_hypercube_concepts(concepts, abstracts)
+                cubes.append(cube)
+    return cubes
+
+
+# ---- helpers ----
+RELATIONSHIP_SETS = [XbrlConst.parentChild, *XbrlConst.summationItems, XbrlConst.all, XbrlConst.notAll,
+                     XbrlConst.dimensionDefault, XbrlConst.dimensionDomain, XbrlConst.domainMember,
+                     XbrlConst.hypercubeDimension]
+
+
+def _report(model_xbrl):
+    concepts = [Concept(f.concept) for f in model_xbrl.factsInInstance]
+    concepts = list({c.id: c for c in concepts}.values())
+    return SimpleNamespace(model_xbrl=model_xbrl, concepts=concepts, abstracts=[],
+                           _concept_lookup={c.id: c for c in concepts}, _abstract_lookup={})
+
+
+def _cube_snapshot(cube):
+    return (str(cube.qname), cube.is_all, cube.closed,
+            [(d.u_id, d.domain.u_id if d.domain else None, sorted(d.members_dict)) for d in cube.dimensions],
+            [c.id for c in cube.concepts], [a.id for a in cube.abstracts], [str(li.qname) for li in cube.lineitems])
+
+
+def _presentation_snapshot(network):
+    if not network.presentation:
+        return None
+    return {cid: (n.order, n.level, n.children, n.concept.id if n.concept else None)
+            for cid, n in network.presentation.nodes.items()}
+
+
+def test_build_networks_matches_full_scan(load_model):
+    model = load_model()
+    report = _report(model)
+    process_report._build_networks(report)
+
+    legacy = legacy_networks(model, RELATIONSHIP_SETS)
+    assert [(n.network_uri, n.name, n.id, n.category, n.relationship_sets) for n in report.networks] == legacy
+    assert [n.name for n in report.networks] == ["Revenue", "Segments (Details)"]
+
+    for network in report.networks:
+        expected = [_cube_snapshot(c) for c in
+                    legacy_hypercubes(model, network.network_uri, report.concepts, report.abstracts)]
+        assert [_cube_snapshot(c) for c in network.hypercubes] == expected
+
+    revenue, segments = report.networks
+    assert _cube_snapshot(revenue.hypercubes[0])[1:3] == (True, True)
+    assert [c.qname for c in revenue.hypercubes[0].concepts] == ["std:Revenues", "ext:OtherRevenue"]
+    assert [a.qname for a in revenue.hypercubes[0].abstracts] == ["std:StatementLineItems"]   # via presentation
+    assert _cube_snapshot(segments.hypercubes[0])[1:3] == (False, False)
+    assert set(_presentation_snapshot(revenue)) >= {f"{c.model_concept.qname.namespaceURI}:{c.qname}"
+                                                    for c in report.concepts}
+
+
+def test_presentation_matches_fresh_model(load_model):
+    """Same nodes whether networks share one index or each hypercube builds its own."""
+    shared, fresh = _report(load_model()), _report(load_model())
+    process_report._build_networks(shared)
+    process_report._build_networks(fresh)
+    for network in fresh.networks:
+        network.hypercubes = []
+        network.index = None
+        network.add_hypercubes(fresh.model_xbrl)
+    assert [_presentation_snapshot(n) for n in shared.networks] == [_presentation_snapshot(n) for n in fresh.networks]
+    assert ([[_cube_snapshot(c)[:4] for c in n.hypercubes] for n in shared.networks]
+            == [[_cube_snapshot(c)[:4] for c in n.hypercubes] for n in fresh.networks])
+
+
+def test_relationship_index_lookups(load_model):
+    model = load_model()
+    index = RelationshipIndex(model)
+    assert index.linkroles(XbrlConst.parentChild) == ["http://example.com/role/Revenue",
+                                                      "http://example.com/role/SegmentsDetails"]
+    assert index.linkroles(XbrlConst.summationItem) == []
+    table = next(c for q, c in model.qnameConcepts.items() if q.localName == "StatementTable")
+    [rel] = index.to_object(XbrlConst.all, "http://example.com/role/Revenue", table)
+    assert rel.fromModelObject.qname.localName == "StatementLineItems"
+    assert index.to_object(XbrlConst.all, "http://example.com/role/SegmentsDetails", table) == []
+    assert index.rel_set(XbrlConst.all) is index.rel_set(XbrlConst.all)
@@ -0,0 +1,88 @@
+"""Taxonomy.build_dimensions with and without the standard-dimension cache (fixture DTS in conftest.py)."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("arelle")
+
+from config import feature_flags  # noqa: E402
+from XBRL import xbrl_taxonomy  # noqa: E402
+from XBRL.xbrl_taxonomy import DimensionCache, Taxonomy  # noqa: E402
+
+
+@pytest.fixture
+def std_prefix(fixture_dts, monkeypatch):
+    root, _ = fixture_dts
+    monkeypatch.setattr(xbrl_taxonomy, "STANDARD_TAXONOMY_PREFIXES",
+                        xbrl_taxonomy.STANDARD_TAXONOMY_PREFIXES + (os.path.join(root, "std") + os.sep,))
+
+
+def _build(load_model, monkeypatch, cache_dir):
+    monkeypatch.setattr(feature_flags, "XBRL_DIMENSION_CACHE_DIR", cache_dir)
+    taxonomy = Taxonomy(load_model())
+    taxonomy.build_dimensions()
+    return taxonomy
+
+
+def _snapshot(taxonomy):
+    return {d.u_id: (d.properties, d.domain.properties if d.domain else None,
+                     sorted((m.u_id, m.parent_qname, m.level) for m in d.members_dict.values()),
+                     d.default_member.u_id if d.default_member else None)
+            for d in taxonomy.dimensions}
+
+
+def test_cached_build_matches_full_build(load_model, monkeypatch, tmp_path, std_prefix):
+    full = _snapshot(_build(load_model, monkeypatch, None))
+    assert set(full) == {f"0000123456:{ns}:{q}" for ns, q in [
+        ("http://example.org/std/2099", "std:ProductOrServiceAxis"), ("http://example.org/std/2099", "std:LegalEntityAxis"),
+        ("http://example.org/std/2099", "std:ScenarioAxis"), ("http://example.org/std/2099", "std:RestatementAxis"),
+        ("http://example.org/std/2099", "std:UnlabeledAxis"), ("http://example.com/20250101", "ext:SegmentAxis")]}
+
+    cache_dir = str(tmp_path / "dims")
+    miss = _snapshot(_build(load_model, monkeypatch, cache_dir))
+    monkeypatch.setattr(xbrl_taxonomy, "_dimension_cache", None)   # force a reload from disk
+    hit = _snapshot(_build(load_model, monkeypatch, cache_dir))
+    assert miss == full
+    assert hit == full
+
+    [record_file] = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, record_file)) as fh:
+        record = json.load(fh)
+    assert "http://example.org/std/2099" in record["namespaces"]
+    assert "http://example.com/20250101" not in record["namespaces"]
+    dims = record["dimensions"]
+    assert set(dims) == {"{http://example.org/std/2099}" + n for n in
+                         ["ProductOrServiceAxis", "LegalEntityAxis", "ScenarioAxis", "RestatementAxis", "UnlabeledAxis"]}
+    assert dims["{http://example.org/std/2099}LegalEntityAxis"][3] == "Legal Entity [Axis]"
+    assert dims["{http://example.org/std/2099}RestatementAxis"][3] is None      # filer overrides the label
+
+
+def test_cache_hit_builds_only_filer_specific_dimensions(load_model, monkeypatch, tmp_path, std_prefix):
+    cache_dir = str(tmp_path / "dims")
+    _build(load_model, monkeypatch, cache_dir)
+
+    built = []
+    original = Taxonomy._add_built_dimension
+
+    def spy(self, concept):
+        built.append(concept.qname.localName)
+        return original(self, concept)
+
+    monkeypatch.setattr(Taxonomy, "_add_built_dimension", spy)
+    taxonomy = _build(load_model, monkeypatch, cache_dir)
+    # Domain from the filer's definition linkbase, filer label override, extension axis
+    assert sorted(built) == ["ProductOrServiceAxis", "RestatementAxis", "SegmentAxis"]
+    product = taxonomy._dimension_lookup["std:ProductOrServiceAxis"]
+    assert product.domain.qname == "std:ProductsAndServicesDomain"
+    assert set(product.members_dict) == {"std:ServiceMember", "ext:WidgetsMember", "ext:GadgetsMember"}
+
+
+def test_dimension_cache_learns_unknown_labels(tmp_path):
+    cache = DimensionCache(str(tmp_path))
+    key = DimensionCache.key(["b.xsd", "a.xsd"])
+    assert key == DimensionCache.key(["a.xsd", "b.xsd"])
+    assert cache.get(key) is None
+    cache.put(key, {"namespaces": ["ns"], "dimensions": {"{ns}XAxis": ["p", "ns", "XAxis", None, True, False]}})
+    cache.learn_labels(key, {"{ns}XAxis": "X [Axis]"})
+    assert DimensionCache(str(tmp_path)).get(key)["dimensions"]["{ns}XAxis"][3] == "X [Axis]"
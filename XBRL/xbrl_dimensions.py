@@ -79,6 +79,41 @@ class CycleDetector:
             logger.warning(f"Could not get identifier for cycle detection: {e}")
             return True
 
+class RelationshipIndex:
+    """Per-report index over arelle relationship sets: (arcrole, linkrole) -> set, with
+    from/to-object lookups and the linkroles each arcrole uses (in document order).
+    Replaces full modelRelationships walks when building networks and hypercubes."""
+
+    def __init__(self, model_xbrl: ModelXbrl):
+        self.model_xbrl = model_xbrl
+        self._sets: Dict[Tuple[Any, Optional[str]], Any] = {}
+        self._linkroles: Dict[Any, List[str]] = {}
+
+    def rel_set(self, arcrole, linkrole: Optional[str] = None):
+        key = (arcrole, linkrole)
+        if key not in self._sets:
+            self._sets[key] = (self.model_xbrl.relationshipSet(arcrole, linkrole) if linkrole
+                               else self.model_xbrl.relationshipSet(arcrole))
+        return self._sets[key]
+
+    def to_object(self, arcrole, linkrole: Optional[str], model_object) -> list:
+        """Relationships of (arcrole, linkrole) whose target is model_object, in document order."""
+        rel_set = self.rel_set(arcrole, linkrole)
+        return rel_set.toModelObject(model_object) if rel_set else []
+
+    def from_object(self, arcrole, linkrole: Optional[str], model_object) -> list:
+        rel_set = self.rel_set(arcrole, linkrole)
+        return rel_set.fromModelObject(model_object) if rel_set else []
+
+    def linkroles(self, arcrole) -> List[str]:
+        """Distinct linkroles with arcrole relationships, in order of first relationship."""
+        if arcrole not in self._linkroles:
+            rel_set = self.rel_set(arcrole)
+            self._linkroles[arcrole] = list(dict.fromkeys(
+                rel.linkrole for rel in rel_set.modelRelationships)) if rel_set else []
+        return self._linkroles[arcrole]
+
+
 @dataclass
 class Member(Neo4jNode):
     """Represents a dimension member in a hierarchical structure"""
@@ -277,6 +312,27 @@ class Dimension(Neo4jNode):
         
         self._build_relationships()
     
+    @classmethod
+    def from_cached(cls, model_xbrl: ModelXbrl, item: ModelConcept, label: Optional[str],
+                    is_explicit: bool, is_typed: bool) -> 'Dimension':
+        """Taxonomy-wide dimension from cached properties, skipping the DTS reads in __post_init__.
+        Only valid when the filing gives the dimension no domain (so no members or default)."""
+        dimension = cls.__new__(cls)
+        dimension.model_xbrl = model_xbrl
+        dimension.item = item
+        dimension.network_uri = None
+        company_id = model_xbrl.modelDocument.uri.split('/')[-3]
+        dimension.u_id = f"{company_id}:{item.qname.namespaceURI}:{item.qname}"
+        dimension.name = str(item.qname.localName)
+        dimension.qname = str(item.qname)
+        dimension.label = label
+        dimension.is_explicit = is_explicit
+        dimension.is_typed = is_typed
+        dimension.domain = None
+        dimension.members_dict = {}
+        dimension.default_member = None
+        return dimension
+
     def _build_relationships(self) -> None:
         """Build all relationships"""
         self._build_domain()
@@ -429,21 +485,15 @@ class Hypercube:
     lineitems: List['Concept'] = field(init=False)  # These are Lineitems, abstracts typically used to organize concepts
     is_all: bool = field(init=False)  # True for 'all', False for 'notAll'
     closed: bool = field(init=False)  # Value of closed attribute
+    index: Optional[RelationshipIndex] = field(default=None, repr=False)  # Shared per-report relationship index
 
     def _get_hypercube_properties(self) -> tuple[bool, bool]:
         """Get hypercube relationship type (is_all) and closed attribute.
         Returns: (is_all, closed)"""
-        # Check for 'all' relationship
-        all_rels = self.model_xbrl.relationshipSet(XbrlConst.all, self.network_uri).modelRelationships
-        for rel in all_rels:
-            if rel.toModelObject is not None and rel.toModelObject == self.hypercube_item:
-                return True, getattr(rel, 'closed', 'false').lower() == 'true'  # Convert to bool
-        
-        # Check for 'notAll' relationship
-        not_all_rels = self.model_xbrl.relationshipSet(XbrlConst.notAll, self.network_uri).modelRelationships
-        for rel in not_all_rels:
-            if rel.toModelObject is not None and rel.toModelObject == self.hypercube_item:
-                return False, getattr(rel, 'closed', 'false').lower() == 'true'  # Convert to bool
+        # Check for 'all' relationship, then 'notAll' - first relationship targeting this hypercube
+        for rel_type, is_all in ((XbrlConst.all, True), (XbrlConst.notAll, False)):
+            for rel in self.index.to_object(rel_type, self.network_uri, self.hypercube_item):
+                return is_all, getattr(rel, 'closed', 'false').lower() == 'true'  # Convert to bool
         
         raise ValueError(f"Hypercube {self.hypercube_item.qname} has neither 'all' nor 'notAll' relationship")    
 
@@ -458,6 +508,8 @@ class Hypercube:
         self.concepts = []  # Initialize concepts list here
         self.abstracts = []  # Initialize abstracts list here
         self.lineitems = []  # Initialize lineitems list here
+        if self.index is None:
+            self.index = RelationshipIndex(self.model_xbrl)
 
         self.is_all, self.closed = self._get_hypercube_properties()
         self._build_dimensions()
@@ -466,14 +518,8 @@ class Hypercube:
     def _build_dimensions(self) -> None:
         """Build dimension objects from model_xbrl matching this hypercube"""
         
-        hc_dim_rel_set = self.model_xbrl.relationshipSet(XbrlConst.hypercubeDimension, self.network_uri)
-        if not hc_dim_rel_set: return
-            
-        relationships = hc_dim_rel_set.fromModelObject(self.hypercube_item)
-        if not relationships: return
-            
         # Get Target of 'hypercubeDimension' relationship
-        for rel in relationships:
+        for rel in self.index.from_object(XbrlConst.hypercubeDimension, self.network_uri, self.hypercube_item):
             dim_object = rel.toModelObject
             if dim_object is None: continue
             
@@ -488,10 +534,9 @@ class Hypercube:
             except Exception as e: continue
 
     # Get all concepts related to a hypercube: All dimensions in a hypercube apply to all concepts in that hypercube (as per the specification)
-    def _link_hypercube_concepts(self, report_concepts: List['Concept'], report_abstracts: List['AbstractConcept']) -> None:
-        all_set = self.model_xbrl.relationshipSet(XbrlConst.all, self.network_uri)
-        not_all_set = self.model_xbrl.relationshipSet(XbrlConst.notAll, self.network_uri)
-        domain_member = self.model_xbrl.relationshipSet(XbrlConst.domainMember, self.network_uri)
+    def _link_hypercube_concepts(self, concept_lookup: Dict[str, 'Concept'], abstract_lookup: Dict[str, 'AbstractConcept']) -> None:
+        """Link report concepts/abstracts reachable from the primary items of this hypercube.
+        concept_lookup / abstract_lookup map concept id ("namespace:qname") to the report's nodes."""
         
         # Initialize cycle detector for this traversal
         cycle_detector = CycleDetector(f"hypercube_concepts_{self.hypercube_item.qname if hasattr(self.hypercube_item, 'qname') else 'unknown'}")
@@ -502,17 +547,15 @@ class Hypercube:
                 if cycle_detector.has_visited(concept):
                     return
                     
+                concept_id = f"{concept.qname.namespaceURI}:{concept.qname}"
                 if not concept.isAbstract:
-                    # Find matching concept in report_concepts
-                    concept_id = f"{concept.qname.namespaceURI}:{concept.qname}"
-                    matching_concept = next( (c for c in report_concepts if c.id == concept_id), None)
-                    
+                    # Find matching concept in report concepts
+                    matching_concept = concept_lookup.get(concept_id)
                     if matching_concept:
                         self.concepts.append(matching_concept)
                 else:
                     # Abstracts found in this Hypercube; storing it here in case it is needed
-                    abstract_id = f"{concept.qname.namespaceURI}:{concept.qname}"
-                    matching_abstract = next( (a for a in report_abstracts if a.id == abstract_id), None)
+                    matching_abstract = abstract_lookup.get(concept_id)
                     if matching_abstract:
                         self.abstracts.append(matching_abstract)
                     else:
@@ -521,24 +564,14 @@ class Hypercube:
                         # Here we could instead add it to report.abstracts but those are for Presentation network and not this hypercube
 
                 # Recursively collect domain members
-                for member_rel in domain_member.fromModelObject(concept):
+                for member_rel in self.index.from_object(XbrlConst.domainMember, self.network_uri, concept):
                     collect_domain_members(member_rel.toModelObject)
                 
-        
-        # Process 'all' relationships
-        if all_set:
-            for rel in all_set.modelRelationships:
-                if (rel.toModelObject is not None and 
-                    rel.toModelObject == self.hypercube_item):
-                    collect_domain_members(rel.fromModelObject)
-
-        # Process 'notAll' relationships - Not 100% sure about this logic but SEC anyway forbids negative (notAll) hypercubes        
-        
-        if not_all_set:
-            for rel in not_all_set.modelRelationships:
-                if (rel.toModelObject is not None and 
-                    rel.toModelObject == self.hypercube_item):  # Check hypercube as target
-                    collect_domain_members(rel.fromModelObject)  # Process from primary item
+        # Process 'all' then 'notAll' relationships (primary item -> this hypercube)
+        # Not 100% sure about the notAll logic but SEC anyway forbids negative (notAll) hypercubes
+        for rel_type in (XbrlConst.all, XbrlConst.notAll):
+            for rel in self.index.to_object(rel_type, self.network_uri, self.hypercube_item):
+                collect_domain_members(rel.fromModelObject)
 
 
     @property
@@ -13,7 +13,7 @@ from .utils import *
 from .xbrl_core import Neo4jNode, NodeType, RelationType, GroupingType
 from .xbrl_core import PRESENTATION_EDGE_UNIQUE_PROPS, CALCULATION_EDGE_UNIQUE_PROPS, ReportElementClassifier
 from .xbrl_concept_nodes import Concept, AbstractConcept
-from .xbrl_dimensions import Hypercube
+from .xbrl_dimensions import Hypercube, RelationshipIndex
 
 # Type checking imports
 from typing import TYPE_CHECKING
@@ -268,17 +268,20 @@ class Network(ValidationMixin):
 
     # Add field to store validated facts
     validated_facts: List['Fact'] = field(init=False, default_factory=list)
+    index: Optional[RelationshipIndex] = field(default=None, repr=False) # Shared per-report relationship index
 
 
     def add_hypercubes(self, model_xbrl) -> None:
         """Add hypercubes if this is a definition network"""
         if not self.isDefinition:
             return
+        if self.index is None:
+            self.index = RelationshipIndex(model_xbrl)
                 
         # 1. Get the specific definition network relationships
         for rel_type in [XbrlConst.all, XbrlConst.notAll]:
             # Important: Specify the network_uri when getting relationships
-            rel_set = model_xbrl.relationshipSet(rel_type, self.network_uri)
+            rel_set = self.index.rel_set(rel_type, self.network_uri)
             if not rel_set:
                 continue
                 
@@ -291,7 +294,8 @@ class Network(ValidationMixin):
                     hypercube = Hypercube(
                         model_xbrl=self.model_xbrl,
                         hypercube_item=rel.toModelObject,
-                        network_uri=self.network_uri
+                        network_uri=self.network_uri,
+                        index=self.index
                     )
                     self.hypercubes.append(hypercube)
 
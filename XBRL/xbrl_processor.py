@@ -21,7 +21,7 @@ from .xbrl_concept_nodes import Concept, GuidanceConcept, AbstractConcept
 
 # Import specialized modules
 from .xbrl_taxonomy import Taxonomy
-from .xbrl_dimensions import Dimension, Domain, Member, Hypercube
+from .xbrl_dimensions import Dimension, Domain, Member, Hypercube, RelationshipIndex
 from .xbrl_networks import Network, Presentation, Calculation
 from .xbrl_reporting import Fact
 
@@ -1675,34 +1675,33 @@ class process_report:
         # role_name: (0000003 - Statement - CONSOLIDATED BALANCE SHEETS)
     
         # Create networks for each section of this specific report (e.g., Balance Sheet, Income Statement, Notes)
-        self.networks = [
-            Network(
-                model_xbrl = self.model_xbrl,
-                name =' - '.join(parts[2:]), 
-                network_uri=uri,
-                id=parts[0],
-                category=parts[1],
-                relationship_sets=[rel_set]
-            )
-            for rel_set in relationship_sets
-            for rel in self.model_xbrl.relationshipSet(rel_set).modelRelationships
-
-            # Skip if  is missing
-            if (role_name := self.model_xbrl.roleTypeName(roleURI=(uri := rel.linkrole))) 
-            and len(parts := [p.strip() for p in role_name.split(' - ')]) >= 3 ] # Need at least ID, Category, and Description
-        
-
-        # 1. Network deduplication with relationship set merging
+        # One network per linkrole (deduplicated, merging relationship sets), in order of first relationship
+        index = RelationshipIndex(self.model_xbrl)
+        role_parts: Dict[str, List[str]] = {}
         unique_networks = {}
-        for network in self.networks:
-            key = (network.network_uri, network.name, network.id, network.category)
-            if key in unique_networks:
-                # Add any new relationship sets that aren't already present
-                unique_networks[key].relationship_sets.extend(
-                    rs for rs in network.relationship_sets 
-                    if rs not in unique_networks[key].relationship_sets)
-            else:
-                unique_networks[key] = network
+        for rel_set in relationship_sets:
+            for uri in index.linkroles(rel_set):
+                if uri not in role_parts:
+                    role_name = self.model_xbrl.roleTypeName(roleURI=uri)
+                    role_parts[uri] = [p.strip() for p in role_name.split(' - ')] if role_name else []
+                parts = role_parts[uri]
+                if len(parts) < 3:  # Need at least ID, Category, and Description
+                    continue
+
+                key = (uri, ' - '.join(parts[2:]), parts[0], parts[1])
+                if key in unique_networks:
+                    if rel_set not in unique_networks[key].relationship_sets:
+                        unique_networks[key].relationship_sets.append(rel_set)
+                else:
+                    unique_networks[key] = Network(
+                        model_xbrl = self.model_xbrl,
+                        name = key[1],
+                        network_uri=uri,
+                        id=parts[0],
+                        category=parts[1],
+                        relationship_sets=[rel_set],
+                        index=index
+                    )
         
         self.networks = list(unique_networks.values())
 
@@ -1720,10 +1719,13 @@ class process_report:
                                                   name=network.name, model_xbrl=self.model_xbrl, process_report=self)
                             
         # 3. Adding hypercubes after networks are complete which in turn builds dimensions
+        concept_lookup = {}
+        for concept in self.concepts:
+            concept_lookup.setdefault(concept.id, concept)
         for network in self.networks:
             network.add_hypercubes(self.model_xbrl)
             for hypercube in network.hypercubes:                
-                hypercube._link_hypercube_concepts(self.concepts, self.abstracts)
+                hypercube._link_hypercube_concepts(concept_lookup, self._abstract_lookup)
 
 
     def _map_fact_relationships(self, rel_types: List[Tuple[Type[Neo4jNode], Type[Neo4jNode], RelationType]]) -> List[Tuple[Neo4jNode, Neo4jNode, RelationType]]:
@@ -52,6 +52,108 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+import hashlib
+import json
+import os
+import threading
+
+# Document URL prefixes of standard taxonomies (us-gaap/srt/dei/ifrs and the XBRL specs).
+# Everything else in a DTS is the filer's extension.
+STANDARD_TAXONOMY_PREFIXES = (
+    "http://xbrl.fasb.org/", "https://xbrl.fasb.org/",
+    "http://xbrl.sec.gov/", "https://xbrl.sec.gov/",
+    "http://xbrl.ifrs.org/", "https://xbrl.ifrs.org/",
+    "http://www.xbrl.org/", "https://www.xbrl.org/",
+    "http://xbrl.org/", "https://xbrl.org/",
+    "http://www.w3.org/",
+)
+
+
+def is_standard_url(url: str) -> bool:
+    return url.startswith(STANDARD_TAXONOMY_PREFIXES)
+
+
+class DimensionCache:
+    """Standard-taxonomy dimension records shared across filings and processes.
+
+    Keyed by the sorted URLs of the standard documents in a DTS (so by taxonomy
+    versions/entry points), one JSON file per key:
+        {"namespaces": [...], "dimensions": {clark: [prefix, ns, local, label, is_explicit, is_typed]}}
+    Only static properties are cached: domains, members and defaults come from the
+    filer's own definition linkbase, so those are always built per filing.
+    A label is None when it was first seen overridden by a filer and is learned later.
+    """
+    VERSION = 1
+
+    def __init__(self, root: str):
+        self.root = root
+        self._memo: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def key(cls, documents: List[str]) -> str:
+        payload = "\n".join([f"v{cls.VERSION}", *sorted(documents)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            record = self._memo.get(key)
+        if record is not None:
+            return record
+        try:
+            with open(self._path(key), "r") as fh:
+                record = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dimension cache {key}: {e}")
+            return None
+        with self._lock:
+            return self._memo.setdefault(key, record)
+
+    def put(self, key: str, record: dict) -> None:
+        with self._lock:
+            self._memo[key] = record
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w") as fh:
+                json.dump(record, fh, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except Exception as e:
+            logger.warning(f"Could not persist dimension cache {key}: {e}")
+
+    def learn_labels(self, key: str, labels: Dict[str, str]) -> None:
+        """Fill labels that were unknown when the record was written (copy-on-write)."""
+        record = self.get(key)
+        if record is None:
+            return
+        dimensions = dict(record["dimensions"])
+        for clark, label in labels.items():
+            if clark in dimensions and dimensions[clark][3] is None:
+                dimensions[clark] = dimensions[clark][:3] + [label] + dimensions[clark][4:]
+        self.put(key, {**record, "dimensions": dimensions})
+
+
+_dimension_cache: Optional[DimensionCache] = None
+_dimension_cache_lock = threading.Lock()
+
+
+def get_dimension_cache() -> Optional[DimensionCache]:
+    """Process-wide cache under XBRL_DIMENSION_CACHE_DIR (None when disabled)."""
+    global _dimension_cache
+    from config.feature_flags import XBRL_DIMENSION_CACHE_DIR
+    if not XBRL_DIMENSION_CACHE_DIR:
+        return None
+    with _dimension_cache_lock:
+        if _dimension_cache is None or _dimension_cache.root != XBRL_DIMENSION_CACHE_DIR:
+            _dimension_cache = DimensionCache(XBRL_DIMENSION_CACHE_DIR)
+        return _dimension_cache
+
+
 @dataclass
 class Taxonomy:
     model_xbrl: ModelXbrl
@@ -59,32 +161,91 @@ class Taxonomy:
     _dimension_lookup: Dict[str, 'Dimension'] = field(default_factory=dict)
     
     def build_dimensions(self):
-        """Build taxonomy-wide dimensions and their hierarchies"""
-        
-        dim_dom_rel_set = self.model_xbrl.relationshipSet(XbrlConst.dimensionDomain) # Get dimension-domain relationships first                
-        
-        for concept in self.model_xbrl.qnameConcepts.values():                       # Find all dimensions in taxonomy
-            if concept.isDimensionItem: 
-                try:
-                    # Indicates taxonomy-wide context
-                    dimension = Dimension(model_xbrl=self.model_xbrl, item=concept, network_uri=None)
-                    
-                    # Get domain first - Note: Typically Domain qname ends with 'Domain' but sometimes it ends with 'Member'
-                    if dim_dom_rel_set:
-                        for rel in dim_dom_rel_set.fromModelObject(concept):
-                            if rel.toModelObject is not None:
-                                dimension.domain = Domain(model_xbrl=self.model_xbrl,item=rel.toModelObject)
-                                break
-                    
-                    # Build members only after domain is potentially set
-                    dimension._build_members()
-                    
-                    self.dimensions.append(dimension)                    
-                    self._dimension_lookup[dimension.qname] = dimension     # Building lookup table for dimensions
-                    
-                except Exception as e:
-                    logger.error(f"Error creating dimension {concept.qname}: {str(e)}", exc_info=True)
+        """Build taxonomy-wide dimensions and their hierarchies.
+
+        With the dimension cache, standard-taxonomy dimensions this filing does not touch
+        (no dimension-domain arc, no extension label) are created from cached records and
+        only the extension namespaces are scanned; a cache miss builds everything and
+        records the standard dimensions for the next filing on the same taxonomy versions."""
+        cache = get_dimension_cache()
+        if cache is None:
+            for concept in self.model_xbrl.qnameConcepts.values():
+                if concept.isDimensionItem:
+                    self._add_built_dimension(concept)
+            return
+
+        standard_docs = [url for url in self.model_xbrl.urlDocs if is_standard_url(url)]
+        key = cache.key(standard_docs)
+        record = cache.get(key)
+        if record is None:
+            self._build_and_record(cache, key, standard_docs)
+            return
+
+        learned = {}
+        for clark, (prefix, ns, local, label, is_explicit, is_typed) in record["dimensions"].items():
+            concept = self.model_xbrl.qnameConcepts.get(QName(prefix, ns, local))
+            if concept is None:
+                continue
+            if self._is_filer_specific(concept):
+                self._add_built_dimension(concept)
+            elif label is None:
+                dimension = self._add_built_dimension(concept)
+                if dimension:
+                    learned[clark] = dimension.label
+            else:
+                self._add_dimension(Dimension.from_cached(self.model_xbrl, concept, label, is_explicit, is_typed))
+
+        standard_ns = set(record["namespaces"])
+        for qname, concept in self.model_xbrl.qnameConcepts.items():
+            if qname.namespaceURI not in standard_ns and concept.isDimensionItem:
+                self._add_built_dimension(concept)
+
+        if learned:
+            cache.learn_labels(key, learned)
+
+    def _build_and_record(self, cache: DimensionCache, key: str, standard_docs: List[str]):
+        """Full build, recording the standard-taxonomy dimensions under key."""
+        namespaces = sorted({doc.targetNamespace for url in standard_docs
+                             if (doc := self.model_xbrl.urlDocs.get(url)) is not None
+                             and getattr(doc, 'targetNamespace', None)})
+        records = {}
+        for concept in self.model_xbrl.qnameConcepts.values():
+            if not concept.isDimensionItem:
+                continue
+            dimension = self._add_built_dimension(concept)
+            if dimension is None or not is_standard_url(concept.modelDocument.uri):
+                continue
+            qname = concept.qname
+            label = None if self._has_extension_label(concept) else dimension.label
+            records[qname.clarkNotation] = [qname.prefix, qname.namespaceURI, qname.localName,
+                                            label, dimension.is_explicit, dimension.is_typed]
+        cache.put(key, {"namespaces": namespaces, "dimensions": records})
+        logger.debug(f"Recorded {len(records)} standard dimensions for taxonomy set {key[:12]}")
+
+    def _has_extension_label(self, concept: ModelConcept) -> bool:
+        label_rels = self.model_xbrl.relationshipSet(XbrlConst.conceptLabel)
+        return any(not is_standard_url(rel.modelDocument.uri) for rel in label_rels.fromModelObject(concept))
+
+    def _is_filer_specific(self, concept: ModelConcept) -> bool:
+        """True if this filing gives a standard dimension a domain or its own label."""
+        dim_dom_rel_set = self.model_xbrl.relationshipSet(XbrlConst.dimensionDomain)
+        if dim_dom_rel_set and dim_dom_rel_set.fromModelObject(concept):
+            return True
+        return self._has_extension_label(concept)
+
+    def _add_built_dimension(self, concept: ModelConcept) -> Optional['Dimension']:
+        try:
+            # Indicates taxonomy-wide context; __post_init__ builds the domain, members and default
+            dimension = Dimension(model_xbrl=self.model_xbrl, item=concept, network_uri=None)
+        except Exception as e:
+            logger.error(f"Error creating dimension {concept.qname}: {str(e)}", exc_info=True)
+            return None
+        self._add_dimension(dimension)
+        return dimension
 
+    def _add_dimension(self, dimension: 'Dimension'):
+        self.dimensions.append(dimension)
+        self._dimension_lookup[dimension.qname] = dimension     # Building lookup table for dimensions
 
 
     def get_dimension_domain_relationships(self) -> List[Tuple[Neo4jNode, Neo4jNode, RelationType]]:
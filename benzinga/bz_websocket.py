@@ -10,6 +10,8 @@ from benzinga.bz_news_errors import NewsErrorHandler
 from redisDB.redisClasses import RedisClient
 import threading
 from config.feature_flags import ENABLE_LIVE_DATA
+from utils.ws_pipeline import pipeline_from_flags
+from utils.lifecycle_trace import trace
 
 
 class BenzingaNewsWebSocket:
@@ -82,6 +84,9 @@ class BenzingaNewsWebSocket:
         # Feature flag logging state
         self._feature_flag_logged = False
 
+        # Receive/process split (None when ENABLE_WS_FRAME_PIPELINE is off)
+        self._pipeline = pipeline_from_flags("news", self._process_frames)
+
         self.logger.info("=== BENZINGA NEWS WEBSOCKET INITIALIZED ===")
 
     @staticmethod
@@ -204,6 +209,9 @@ class BenzingaNewsWebSocket:
             self.heartbeat_thread.daemon = True
             self.heartbeat_thread.start()
         
+        if self._pipeline:
+            self._pipeline.start()
+        
         self.logger.info(f"Starting WebSocket connection (format: {'raw' if raw else 'unified'})...")
         
         while self.should_run:
@@ -270,6 +278,11 @@ class BenzingaNewsWebSocket:
         if self.ws:
             self.ws.close()
         
+        # Let the workers store what was already received
+        if self._pipeline:
+            self._pipeline.stop(timeout=10)
+            self._pipeline.log_stats()
+        
         # Wait for heartbeat thread to finish
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
             self.heartbeat_thread.join(timeout=5)
@@ -335,6 +348,16 @@ class BenzingaNewsWebSocket:
 
     def _on_message(self, ws, message: str):
         """Handle incoming WebSocket message"""
+        received_at = time.monotonic()
+        if self._pipeline and ENABLE_LIVE_DATA and not message.isdigit():
+            with self._stats_lock:
+                self.last_message_time = datetime.now(timezone.utc)
+                self.current_retry = 0
+                self.stats['messages_received'] += 1
+            # Parsing, validation and Redis writes run on the pipeline workers (_process_frames)
+            self._pipeline.submit(message)
+            return
+
         with self._stats_lock:
             now = datetime.now(timezone.utc)
             self.last_message_time = now
@@ -363,6 +386,8 @@ class BenzingaNewsWebSocket:
                 if processed_item:
                     # Always store unified version in Redis
                     unified_item = self.error_handler.process_news_item(data, raw=False)
+                    if unified_item:
+                        trace("news", unified_item.id, "ws_receive", received_at)
                     if self.redis_client.set_news(unified_item, ex=self.ttl):
                         # Only print news items at debug level to reduce console spam
                         if self.logger.isEnabledFor(logging.DEBUG):
@@ -390,6 +415,46 @@ class BenzingaNewsWebSocket:
                 self.logger.error(f"Unexpected error processing message: {str(e)}", exc_info=True)
                 self.error_handler.handle_unexpected_error(e)
 
+    def _process_frames(self, frames) -> int:
+        """Pipeline worker: parse and validate a batch of frames, store the news in one Redis pipeline"""
+        display_items, unified_items = [], []
+        for frame in frames:
+            try:
+                data = json.loads(frame.data)
+                # Process item based on raw setting for display
+                processed_item = self.error_handler.process_news_item(data, self.raw)
+                if processed_item:
+                    # Always store unified version in Redis
+                    unified_item = self.error_handler.process_news_item(data, raw=False)
+                    # A None here would fail the whole batch in set_news_live_batch, not just this item
+                    if unified_item:
+                        trace("news", unified_item.id, "ws_receive", frame.received_at)
+                        unified_items.append(unified_item)
+                        display_items.append(processed_item)
+            except json.JSONDecodeError as je:
+                self.logger.error(f"Failed to parse message: {frame.data[:100]}...", exc_info=True)
+                self.error_handler.handle_json_error(je, frame.data)
+            except Exception as e:
+                self.logger.error(f"Unexpected error processing message: {str(e)}", exc_info=True)
+                self.error_handler.handle_unexpected_error(e)
+
+        stored = self.redis_client.set_news_live_batch(unified_items, ex=self.ttl) if unified_items else []
+        processed_count = 0
+        for item, ok in zip(display_items, stored):
+            if ok:
+                processed_count += 1
+                # Only print news items at debug level to reduce console spam
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.print_news_item(item)
+
+        with self._stats_lock:
+            before = self.stats['messages_processed']
+            self.stats['messages_processed'] += processed_count
+            # Log stats periodically to reduce console spam
+            if before // 100 != self.stats['messages_processed'] // 100:
+                self._log_stats()
+        return processed_count
+
     def _on_error(self, ws, error):
         """Handle WebSocket error"""
         self.connected = False
@@ -485,6 +550,8 @@ class BenzingaNewsWebSocket:
     def print_stats(self):
         """Print current statistics (for external calls)"""
         self._log_stats()
+        if self._pipeline:
+            self._pipeline.log_stats()
         # Log error handler stats at debug level to reduce noise
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(self.error_handler.get_summary())
@@ -0,0 +1,77 @@
+"""Offline tests for BenzingaNewsWebSocket._process_frames against the in-memory FakeRedis (no live feed)."""
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("pydantic")
+pytest.importorskip("websocket")
+pytest.importorskip("redis")
+
+from benzinga import bz_websocket  # noqa: E402
+from redisDB import redisClasses  # noqa: E402
+from redisDB.redis_constants import RedisKeys  # noqa: E402
+from scripts.ingestion_bench import NEWS_ID_BASE, news_ws_frames  # noqa: E402
+from utils.ingest_fakes import FakeRedis, fake_redis_module  # noqa: E402
+from utils.ws_pipeline import Frame  # noqa: E402
+
+
+@pytest.fixture
+def ws(monkeypatch):
+    server = FakeRedis()
+    monkeypatch.setattr(redisClasses, "redis", fake_redis_module(server))
+    redis_client = redisClasses.RedisClient(prefix=f"{RedisKeys.SOURCE_NEWS}:live:", source_type=RedisKeys.SOURCE_NEWS)
+    client = bz_websocket.BenzingaNewsWebSocket(api_key="test", redis_client=redis_client)
+    return client, server
+
+
+def _frames(n):
+    created = datetime(2026, 10, 19, 14, 0, tzinfo=timezone.utc)
+    return [Frame(data) for _, data in news_ws_frames(n, ["AAPL", "MSFT"], burst_size=n, burst_gap=0, created=created)]
+
+
+def test_unconvertible_item_does_not_drop_the_batch(ws, monkeypatch):
+    client, server = ws
+    convert = client.error_handler.process_news_item
+
+    def process_news_item(data, raw=False):
+        if not raw and data["data"]["id"] == NEWS_ID_BASE + 1:
+            return None                                 # display version parses, unified conversion does not
+        return convert(data, raw)
+
+    monkeypatch.setattr(client.error_handler, "process_news_item", process_news_item)
+    assert client._process_frames(_frames(4)) == 3
+    raw_queue = server.lrange(client.redis_client.RAW_QUEUE, 0, -1)
+    assert sorted(key.split(":")[-1].split(".")[0] for key in raw_queue) == \
+        [str(NEWS_ID_BASE + i) for i in (0, 2, 3)]
+    metas = [key for key in server.lifecycle if key.startswith("tracking:meta:news:")]
+    assert len(metas) == 3 and all({"ingested_at", "source_api_timestamp"} <= set(server.hgetall(m)) for m in metas)
+    assert server.smembers(f"tracking:pending:{RedisKeys.SOURCE_NEWS}") == set(metas)
+
+    # a redelivered item is stored again but its set-once lifecycle fields are not rewritten
+    hsets = server.command_counts["hset"]
+    assert client._process_frames(_frames(1)) == 1
+    assert server.command_counts["hset"] == hsets
+    assert json.loads(server.get(raw_queue[-1]))["id"] == str(NEWS_ID_BASE)
+
+
+def test_pipeline_path_traces_receive_and_ingest(ws, monkeypatch):
+    from config import feature_flags
+    from utils import lifecycle_trace
+
+    monkeypatch.setattr(feature_flags, "ENABLE_LIFECYCLE_TRACING", True)
+    monkeypatch.setattr(feature_flags, "LIFECYCLE_TRACE_JSONL", "")
+    monkeypatch.setattr(feature_flags, "LIFECYCLE_TRACE_PORT", 0)
+    monkeypatch.setattr(lifecycle_trace, "_tracer_singleton", None)
+    client, _ = ws
+    assert client._process_frames(_frames(3)) == 3
+
+    tracer = lifecycle_trace.get_tracer()
+    for i in range(3):
+        assert list(tracer.timeline("news", str(NEWS_ID_BASE + i))) == ["ws_receive", "ingested"]
+    assert tracer.snapshot()["sources"]["news"]["ingested"]["count"] == 3
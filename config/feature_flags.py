@@ -98,6 +98,11 @@ PRESERVE_XBRL_FAILED_STATUS = True
 import os, tempfile as _tmp
 XBRL_JSON_CACHE_DIR = os.path.join(_tmp.gettempdir(), "xbrl_json_cache")
 
+# Shared cache of standard-taxonomy (us-gaap/dei/srt...) dimension records, keyed by the
+# set of standard documents in a filing's DTS (XBRL/xbrl_taxonomy.py). Set to None to
+# disable and build every dimension from the DTS.
+XBRL_DIMENSION_CACHE_DIR = os.path.join(_tmp.gettempdir(), "xbrl_dimension_cache")
+
 # Toggle bulk UNWIND node merges (used only in XBRL path for now)
 ENABLE_BULK_NODE_MERGE_XBRL = True
 
@@ -208,15 +213,22 @@ CHUNK_MAX_WAIT_SECONDS = 86400 # 24 hours (no practical timeout — let Neo4j fi
 # - Long enough for reasonable processing, short enough for safety
 SECTION_BATCH_EXTRACTION_TIMEOUT = 450  # seconds
 
-# Max time for a single sec-api.get_section() call (90s)
-# - Runs in ThreadPoolExecutor inside each worker (now also in _extract_section_content directly)
-# - Terminates thread on timeout, marks section as failed
+# Max time for a single sec-api extractor call (90s)
+# - Enforced as a per-request deadline by secReports/sec_fetch.py (connect + body)
+# - A timed-out attempt counts against the section's retries, then the section is marked failed
 # - Allows sec-api retries while preventing hung HTTP requests
 EXTRACTOR_CALL_TIMEOUT = 90  # seconds
 
-# Number of threads for parallel section extraction within a single report (10-K/10-Q)
-# when processed by ReportProcessor._extract_sections using ThreadPoolExecutor.
-THREADS_PER_SECTION_EXTRACTION = 4 # Default number of threads
+# Shared SEC fetch layer (secReports/sec_fetch.py) used by ReportProcessor / report_enricher:
+# one keep-alive pool + thread pool per process, Redis token buckets shared by all enricher
+# processes (SEC fair-access limit is 10 req/s per client), and a content-addressed disk
+# cache of fetched sections/exhibits. Set SEC_FETCH_CACHE_DIR = None to disable caching.
+SEC_FETCH_CACHE_DIR = os.path.join(_tmp.gettempdir(), "sec_fetch_cache")
+SEC_FETCH_CACHE_MAX_MB = 2048          # least recently used blobs are pruned above this
+SEC_FETCH_POOL_SIZE = 16               # keep-alive connections per host
+SEC_FETCH_WORKERS = 8                  # shared fan-out threads (sections + exhibits)
+SEC_RATE_LIMIT_PER_SEC = 8             # sec.gov documents/exhibits, all processes combined
+SEC_API_EXTRACTOR_RATE_PER_SEC = 10    # sec-api.io extractor calls, all processes combined
 
 # --- End Historical Chunked Processing Configuration ---
 
@@ -252,4 +264,113 @@ REMOVE_FROM_PENDING_SET = True  # Default behaviour – safe for production
 # --- End Pending Set Configuration ---
 
 # Number of threads for parallel SEC historical filings ingestion (raw queue population)
-SEC_HISTORICAL_INGESTION_THREADS = 4  # Used in sec_restAPI.py ThreadPoolExecutor
\ No newline at end of file
+SEC_HISTORICAL_INGESTION_THREADS = 4  # Used in sec_restAPI.py ThreadPoolExecutor
+# --- Streaming Price Tape (live returns) ---
+# When True, live ReturnsProcessor legs are resolved from an in-memory trade tape
+# (eventReturns/price_tape.py) as soon as the horizon closes; Polygon REST (after
+# polygon_subscription_delay) is only the fallback for prices the tape did not see.
+# Feed is chosen by env PRICE_TAPE_FEED ('ibkr' or 'replay:<path.jsonl>').
+ENABLE_PRICE_TAPE = False
+PRICE_TAPE_SETTLE_SECONDS = 3          # wait after a horizon closes for late prints
+PRICE_TAPE_RETENTION_SECONDS = 26 * 3600  # covers daily legs starting at the prior close
+PRICE_TAPE_MAX_LINES = 95              # IBKR market-data lines (account default 100)
+# --- End Streaming Price Tape ---
+# --- Event Return Store ---
+# When True, ReturnsProcessor also appends every priced leg (event × symbol ×
+# horizon × stock/sector/industry/macro, with start/end prices and data tier) to a
+# date-partitioned Parquet store (eventReturns/return_store.py). Bulk null-finding,
+# repair and Neo4j sync run off it via scripts/event_return_store.py.
+ENABLE_RETURN_STORE = False
+RETURN_STORE_DIR = "data/event_returns"   # overridable with env RETURN_STORE_DIR
+RETURN_STORE_FLUSH_ROWS = 500
+RETURN_STORE_FLUSH_SECONDS = 60
+# --- End Event Return Store ---
+# --- Report Subgraph Writer ---
+# When True, ReportMixin assembles each report (Report node, section / exhibit /
+# financial-statement / filing-text nodes, company/sector/industry/market edges,
+# IN_CATEGORY) into parameter rows and neograph/report_writer.py commits a whole
+# Redis batch of reports in one UNWIND-driven transaction per REPORT_WRITER_BATCH_SIZE.
+ENABLE_REPORT_SUBGRAPH_WRITER = False
+REPORT_WRITER_BATCH_SIZE = 50
+# --- End Report Subgraph Writer ---
+# --- Live WebSocket Frame Pipeline ---
+# When True, SECWebSocket / BenzingaNewsWebSocket only timestamp and enqueue raw frames
+# on the socket thread; a worker pool (utils/ws_pipeline.py) parses, validates and
+# writes them to Redis in one pipeline per batch. Overflow: "block" applies
+# backpressure to the reader for up to WS_PIPELINE_BLOCK_SECONDS, then drops the frame;
+# "drop_oldest" evicts the oldest queued frame. Drops are counted in the pipeline stats.
+ENABLE_WS_FRAME_PIPELINE = False
+WS_PIPELINE_CAPACITY = 10000           # queued frames per feed
+WS_PIPELINE_WORKERS = 2
+WS_PIPELINE_BATCH_SIZE = 50            # frames per Redis pipeline
+WS_PIPELINE_MAX_WAIT_SECONDS = 0.02    # wait for a burst to fill a batch
+WS_PIPELINE_OVERFLOW = "block"
+WS_PIPELINE_BLOCK_SECONDS = 1.0        # stays well under PING_TIMEOUT (5s)
+# --- End Live WebSocket Frame Pipeline ---
+# --- Speaker Role Resolver ---
+# When True, EarningsCallProcessor resolves speaker roles through
+# transcripts/speaker_roles.py: the per-company speaker registry (Redis hash
+# admin:speaker_roles:{SYMBOL}), then title heuristics and prior-quarter titles,
+# and only the still-unresolved speakers go to SPEAKER_CLASSIFICATION_MODEL,
+# pooled across all transcripts of a date / date range.
+ENABLE_SPEAKER_ROLE_RESOLVER = False
+SPEAKER_CLASSIFICATION_BATCH_SIZE = 200   # speakers per model request
+# --- End Speaker Role Resolver ---
+# --- Graph Bootstrap Engine ---
+# When True, Neo4jInitializer.initialize_all builds Date nodes, HAS_PRICE,
+# dividends and splits through neograph/graph_bootstrap.py: grouped daily bars
+# are fetched concurrently into Parquet files under GRAPH_BOOTSTRAP_DIR with a
+# manifest.json of fetched / loaded dates, session metadata is computed over the
+# whole calendar at once, and everything is written with UNWIND batches. An
+# interrupted bootstrap resumes from the manifest on the next run.
+ENABLE_GRAPH_BOOTSTRAP_ENGINE = False
+GRAPH_BOOTSTRAP_DIR = "data/graph_bootstrap"
+GRAPH_BOOTSTRAP_FETCH_WORKERS = 8           # concurrent Polygon requests
+GRAPH_BOOTSTRAP_UNWIND_BATCH_SIZE = 20000   # rows per UNWIND statement / HAS_PRICE transaction
+# --- End Graph Bootstrap Engine ---
+# --- Embedding Micro-Batching ---
+# When True, the live pubsub path (_create_news_embedding / _create_qaexchange_embedding)
+# hands (node id, content) to neograph/embedding_batcher.py instead of embedding one
+# node at a time. A worker drains the queue in batches of up to EMBEDDING_MICROBATCH_SIZE,
+# waiting at most EMBEDDING_MICROBATCH_MAX_WAIT_SECONDS for a batch to fill, and does one
+# Chroma multi-get, one encodeBatch call for the misses, one UNWIND write and one Chroma
+# multi-add per batch. Nodes that fail are picked up by batch_process_*_embeddings.
+# In this mode the two methods return the batcher's Future (True once written), not True.
+ENABLE_EMBEDDING_MICROBATCH = False
+EMBEDDING_MICROBATCH_SIZE = 64
+EMBEDDING_MICROBATCH_MAX_WAIT_SECONDS = 0.05
+EMBEDDING_MICROBATCH_CAPACITY = 10000       # queued requests per label
+# --- End Embedding Micro-Batching ---
+# --- Local Vector Mirror ---
+# When True, vector_similarity_search on News / QAExchange goes through
+# neograph/vector_mirror.py: query embeddings are cached by normalized text, candidates
+# come from an int8 IVF mirror of the embeddings truncated to VECTOR_MIRROR_DIMS
+# (0 = all 3072), and the top VECTOR_MIRROR_RESCORE_CANDIDATES x limit candidates are
+# rescored exactly in Neo4j. The mirror is built from Neo4j on a background thread
+# (searches use Neo4j until it is ready), saved under VECTOR_MIRROR_DIR, reconciled with
+# Neo4j each time it is loaded, and kept current by the embedding write paths. Delete
+# the .npz files to force a rebuild.
+ENABLE_LOCAL_VECTOR_MIRROR = False
+VECTOR_MIRROR_DIR = "data/vector_mirror"
+VECTOR_MIRROR_DIMS = 256
+VECTOR_MIRROR_NPROBE = 16                 # IVF lists scanned per query
+VECTOR_MIRROR_RESCORE_CANDIDATES = 5      # candidates rescored per requested result
+VECTOR_MIRROR_SAVE_EVERY = 1000           # synced vectors between saves
+QUERY_EMBEDDING_CACHE_SIZE = 10000
+# --- End Local Vector Mirror ---
+# --- Lifecycle Tracing ---
+# When True, utils/lifecycle_trace.py records monotonic per-item stage stamps (websocket
+# receive, _process_item, _add_metadata, every tracking:meta lifecycle field, return
+# horizon completion, pubsub pickup) into rolling per-source, per-stage latency
+# histograms with the slowest items kept as exemplars. Snapshots are appended to
+# LIFECYCLE_TRACE_JSONL every LIFECYCLE_TRACE_EXPORT_SECONDS ("{pid}" is replaced by the
+# process id; empty = no file) and served on http://127.0.0.1:LIFECYCLE_TRACE_PORT/trace
+# (0 = no endpoint).
+ENABLE_LIFECYCLE_TRACING = False
+LIFECYCLE_TRACE_WINDOW_SECONDS = 300
+LIFECYCLE_TRACE_EXEMPLARS = 10            # slowest items kept per source and stage
+LIFECYCLE_TRACE_MAX_ITEMS = 50000         # item timelines kept in memory
+LIFECYCLE_TRACE_JSONL = "logs/lifecycle_trace_{pid}.jsonl"
+LIFECYCLE_TRACE_EXPORT_SECONDS = 60
+LIFECYCLE_TRACE_PORT = 0
+# --- End Lifecycle Tracing ---
@@ -31,7 +31,9 @@ def _f(x):
     except (TypeError, ValueError): return 0.0
 
 def snapshot():
-    d = _post({"type": "metaAndAssetCtxs", "dex": "xyz"})
+    return normalize_snapshot(_post({"type": "metaAndAssetCtxs", "dex": "xyz"}))
+
+def normalize_snapshot(d):  # metaAndAssetCtxs response -> one row per market
     uni, ctxs = d[0]['universe'], d[1]
     out = []
     for u, c in zip(uni, ctxs):
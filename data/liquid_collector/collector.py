@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+# Long-running async collector for the Hyperliquid xyz dex and the Liquid trackers feed.
+# Replaces per-request urllib polling (pull_prices.py / poll_feed.py) for continuous coverage:
+#   - keep-alive HTTP/1.1 connection pool per host, concurrent per-symbol / per-feed jobs
+#   - incremental fetching from persisted cursors (candle open time, funding time, feed seq)
+#   - token-bucket rate limits per host; 429 honours Retry-After and pauses the whole host
+#   - append-only Parquet parts partitioned by dataset and UTC date, deduplicated on write
+#     (unchanged rows are skipped) and on read (latest written_at wins per key); Parquet
+#     I/O runs in worker threads, and an hourly compaction folds each date's parts into one
+#   - gap metrics: missing candles / funding hours, skipped feed seqs, missed snapshot polls
+# Normalization reuses pull_prices.normalize_snapshot and poll_feed.tickers.
+import argparse, asyncio, glob, http.client, json, os, random, sys, threading, time, uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+FOLDER = Path(__file__).resolve().parent
+sys.path[:0] = [str(FOLDER.parent / "hyperliquid_24x7_prices"), str(FOLDER.parent / "liquid_social_feed")]
+import poll_feed, pull_prices  # noqa: E402
+
+HL_API = "https://api.hyperliquid.xyz"
+FEED_API = "https://api.liquidmax.xyz"
+ROOT = FOLDER / "store"
+
+INTERVAL_MS = {"1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+               "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "8h": 28_800_000,
+               "12h": 43_200_000, "1d": 86_400_000}
+FUNDING_MS = 3_600_000
+# dataset -> (key columns, millisecond timestamp column that picks the date partition)
+DATASETS = {
+    "candles": (["sym", "interval", "t"], "t"),
+    "funding": (["sym", "time"], "time"),
+    "snapshots": (["sym", "ts"], "ts"),
+    "feed": (["seq"], "received_at"),
+}
+
+
+class CollectorError(Exception):
+    pass
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def _date(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).strftime("%Y-%m-%d")
+
+
+# ---------------------------------------------------------------- HTTP ---- #
+
+class HttpPool:
+    """Keep-alive connections to one host. A request borrows an idle connection
+    (or opens one, up to size) and runs the blocking round trip in a thread."""
+
+    def __init__(self, base, size=8, timeout=20, user_agent="eventtrader-collector/1.0"):
+        u = urlsplit(base)
+        self.https, self.host, self.port = u.scheme == "https", u.hostname, u.port
+        self.prefix = u.path.rstrip("/")
+        self.size, self.timeout = size, timeout
+        self.headers = {"Accept": "application/json", "User-Agent": user_agent, "Connection": "keep-alive"}
+        self._idle, self._slots = [], asyncio.Semaphore(size)
+        self.opened = self.reconnects = self.requests = 0
+
+    def _connect(self):
+        self.opened += 1
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _roundtrip(self, conn, method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = dict(self.headers, **({"Content-Type": "application/json"} if data else {}))
+        for attempt in (0, 1):
+            try:
+                conn.request(method, self.prefix + path, body=data, headers=headers)
+                resp = conn.getresponse()
+                return resp.status, {k.lower(): v for k, v in resp.getheaders()}, resp.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    BrokenPipeError, ConnectionResetError):
+                conn.close()  # idle keep-alive connection dropped by the server: reconnect once
+                if attempt:
+                    raise
+                self.reconnects += 1
+
+    async def request(self, method, path, body=None):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else self._connect()
+            try:
+                result = await asyncio.to_thread(self._roundtrip, conn, method, path, body)
+            except BaseException:
+                conn.close()
+                raise
+            self.requests += 1
+            self._idle.append(conn)
+            return result
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class RateLimiter:
+    """Token bucket (rate per second, 0 = unlimited) that a 429 can pause."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens, self.updated, self.paused_until = self.capacity, time.monotonic(), 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate and time.monotonic() >= self.paused_until:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if not self.rate:
+                    return
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+def _retry_after(headers, default):
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return default
+
+
+# ------------------------------------------------------------- storage ---- #
+
+class PartitionedStore:
+    """Append-only Parquet parts: <root>/<dataset>/date=YYYY-MM-DD/part-<ms>-<rand>.parquet.
+
+    append() skips rows identical to the last row written for their key (recent
+    partitions are remembered, and reloaded from disk on start); read() keeps the
+    latest written_at per key, so an updated row (the still-open candle) simply
+    supersedes the older one. compact() merges a partition's parts into one.
+
+    append(), take() and preload() belong to the event loop; write(), compact() and
+    read() touch files and are safe to run in worker threads."""
+
+    def __init__(self, root, remember_days=2):
+        self.root = Path(root)
+        self.remember_days = remember_days
+        self._buffer = defaultdict(list)
+        self._last = {}  # (dataset, date) -> {key: fingerprint}
+        self._io = threading.Lock()  # compaction deletes parts that a read or write could be listing
+
+    def _load_seen(self, dataset, date):
+        keys, _ = DATASETS[dataset]
+        df = self.read(dataset, [date])
+        return {tuple(r[k] for k in keys): _fingerprint(r) for r in df.drop(columns="written_at").to_dict("records")}
+
+    def _seen(self, dataset, date):
+        if (dataset, date) not in self._last:
+            self._last[(dataset, date)] = self._load_seen(dataset, date)
+        return self._last[(dataset, date)]
+
+    async def preload(self, dataset, rows):
+        """Load the remembered keys of the rows' date partitions in a thread, so append() does not read Parquet."""
+        _, ts_col = DATASETS[dataset]
+        for date in sorted({_date(row[ts_col]) for row in rows}):
+            if (dataset, date) not in self._last:
+                seen = await asyncio.to_thread(self._load_seen, dataset, date)
+                self._last.setdefault((dataset, date), seen)
+
+    def append(self, dataset, rows):
+        """Buffer rows that are new or changed; returns (appended, duplicates)."""
+        keys, ts_col = DATASETS[dataset]
+        appended = 0
+        for row in rows:
+            seen = self._seen(dataset, _date(row[ts_col]))
+            key, fp = tuple(row[k] for k in keys), _fingerprint(row)
+            if seen.get(key) == fp:
+                continue
+            seen[key] = fp
+            self._buffer[dataset].append(row)
+            appended += 1
+        return appended, len(rows) - appended
+
+    def take(self):
+        """The buffered rows by dataset, leaving the buffer empty."""
+        batches, self._buffer = dict(self._buffer), defaultdict(list)
+        cutoff = _date(now_ms() - self.remember_days * 86_400_000)
+        for dataset, date in [k for k in self._last if k[1] < cutoff]:
+            del self._last[(dataset, date)]
+        return batches
+
+    def write(self, batches):
+        """One new part per dataset and date of batches; returns rows written."""
+        written = 0
+        with self._io:
+            for dataset, rows in batches.items():
+                if not rows:
+                    continue
+                _, ts_col = DATASETS[dataset]
+                df = pd.DataFrame(rows)
+                df["written_at"] = time.time()
+                for date, part in df.groupby(df[ts_col].map(_date)):
+                    self._write_part(self.root / dataset / f"date={date}", part)
+                    written += len(part)
+        return written
+
+    def flush(self):
+        return self.write(self.take())
+
+    @staticmethod
+    def _write_part(directory, df):
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{now_ms()}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)  # readers only glob *.parquet
+
+    def compact(self, min_parts=2):
+        """Fold every date partition with at least min_parts parts into one part holding
+        the latest row per key (written_at kept), so read() and the restart reload open
+        one file per compacted day instead of one per flush. Returns parts removed."""
+        removed = 0
+        with self._io:
+            for dataset in DATASETS:
+                for directory in sorted((self.root / dataset).glob("date=*")):
+                    parts = sorted(directory.glob("*.parquet"))
+                    if len(parts) < min_parts:
+                        continue
+                    self._write_part(directory, self._latest(dataset, parts))
+                    for part in parts:  # a crash before this only leaves rows that read() dedups
+                        part.unlink()
+                    removed += len(parts)
+        return removed
+
+    def read(self, dataset, dates=None):
+        """Latest row per key across the parts of the given dates (all if None)."""
+        pattern = [str(self.root / dataset / f"date={d}" / "*.parquet") for d in dates] if dates else \
+            [str(self.root / dataset / "date=*" / "*.parquet")]
+        with self._io:
+            files = sorted(f for p in pattern for f in glob.glob(p))
+            keys, ts_col = DATASETS[dataset]
+            if not files:
+                return pd.DataFrame(columns=list(dict.fromkeys(keys + [ts_col, "written_at"])))
+            return self._latest(dataset, files).sort_values(keys).reset_index(drop=True)
+
+    @staticmethod
+    def _latest(dataset, files):
+        keys, _ = DATASETS[dataset]
+        df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        return df.sort_values("written_at", kind="stable").drop_duplicates(keys, keep="last")
+
+
+def _fingerprint(row):
+    return json.dumps({k: v for k, v in row.items() if k != "written_at"}, sort_keys=True, default=str)
+
+
+# ------------------------------------------------------------- metrics ---- #
+
+class JobMetrics:
+    def __init__(self, interval):
+        self.interval = interval
+        self.fetches = self.errors = self.rate_limited = self.rows = self.duplicates = 0
+        self.gaps = self.missing = 0
+        self.last_ok = None
+        self.latency = deque(maxlen=512)
+
+    def gap(self, missing):
+        if missing > 0:
+            self.gaps += 1
+            self.missing += int(missing)
+
+    def snapshot(self):
+        lat = sorted(self.latency)
+        pct = lambda q: round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 1) if lat else None
+        lag = round(time.monotonic() - self.last_ok, 1) if self.last_ok is not None else None
+        return {"fetches": self.fetches, "errors": self.errors, "rate_limited": self.rate_limited,
+                "rows": self.rows, "duplicates": self.duplicates, "gaps": self.gaps, "missing": self.missing,
+                "p50_ms": pct(0.5), "p95_ms": pct(0.95), "lag_s": lag,
+                "stale": lag is None or lag > 3 * self.interval}
+
+
+# ---------------------------------------------------------------- jobs ---- #
+
+class Job:
+    dataset = None
+
+    def __init__(self, name, interval):
+        self.name, self.interval = name, interval
+
+    async def collect(self, c):  # -> rows for self.dataset
+        raise NotImplementedError
+
+
+class CandleJob(Job):
+    dataset = "candles"
+
+    def __init__(self, sym, interval="1m", every=30, backfill_hours=24):
+        super().__init__(f"candles:{sym}:{interval}", every)
+        self.sym, self.candle, self.backfill_ms = sym, interval, int(backfill_hours * 3_600_000)
+
+    async def collect(self, c):
+        step, end = INTERVAL_MS[self.candle], now_ms()
+        cursor = c.state.get(self.name)  # open time of the newest candle seen (it may still be open)
+        start = cursor if cursor is not None else end - self.backfill_ms
+        data = await c.hl(self, {"type": "candleSnapshot", "req": {
+            "coin": f"xyz:{self.sym}", "interval": self.candle, "startTime": start, "endTime": end}})
+        rows = [{"sym": self.sym, "interval": self.candle, "t": int(k["t"]), "T": int(k.get("T", 0)),
+                 "o": pull_prices._f(k.get("o")), "h": pull_prices._f(k.get("h")), "l": pull_prices._f(k.get("l")),
+                 "c": pull_prices._f(k.get("c")), "v": pull_prices._f(k.get("v")), "n": int(k.get("n") or 0)}
+                for k in data or [] if k.get("t") is not None]
+        times = sorted({r["t"] for r in rows} | ({cursor} if cursor is not None else set()))
+        for a, b in zip(times, times[1:]):
+            c.metrics[self.name].gap((b - a) // step - 1)
+        if rows:
+            c.state[self.name] = times[-1]
+        return rows
+
+
+class FundingJob(Job):
+    dataset = "funding"
+
+    def __init__(self, sym, every=600, backfill_hours=72):
+        super().__init__(f"funding:{sym}", every)
+        self.sym, self.backfill_ms = sym, int(backfill_hours * 3_600_000)
+
+    async def collect(self, c):
+        cursor = c.state.get(self.name)
+        start = cursor + 1 if cursor is not None else now_ms() - self.backfill_ms
+        data = await c.hl(self, {"type": "fundingHistory", "coin": f"xyz:{self.sym}", "startTime": start})
+        rows = [{"sym": self.sym, "time": int(f["time"]), "funding": pull_prices._f(f.get("fundingRate")),
+                 "premium": pull_prices._f(f.get("premium"))} for f in data or [] if f.get("time") is not None]
+        times = sorted({r["time"] for r in rows} | ({cursor} if cursor is not None else set()))
+        for a, b in zip(times, times[1:]):
+            c.metrics[self.name].gap(round((b - a) / FUNDING_MS) - 1)
+        if rows:
+            c.state[self.name] = times[-1]
+        return rows
+
+
+class SnapshotJob(Job):
+    dataset = "snapshots"
+
+    def __init__(self, every=60, symbols=None):
+        super().__init__("snapshots", every)
+        self.symbols = set(symbols) if symbols else None
+
+    async def collect(self, c):
+        ts = now_ms()
+        data = await c.hl(self, {"type": "metaAndAssetCtxs", "dex": "xyz"})
+        last = c.state.get(self.name)
+        if last is not None:  # polls that should have happened in between
+            c.metrics[self.name].gap(round((ts - last) / (self.interval * 1000)) - 1)
+        c.state[self.name] = ts
+        return [dict(r, ts=ts) for r in pull_prices.normalize_snapshot(data)
+                if self.symbols is None or r["sym"] in self.symbols]
+
+
+class FeedJob(Job):
+    dataset = "feed"
+
+    def __init__(self, every=10):
+        super().__init__("feed", every)
+
+    async def collect(self, c):
+        data = await c.feed(self, "/api/trackers/feed")
+        last, received = int(c.state.get(self.name) or 0), now_ms()
+        events = []
+        for e in (data or {}).get("events", []):
+            try:
+                events.append((int(e.get("seq")), e))
+            except (TypeError, ValueError):
+                continue
+        new = sorted((s, e) for s, e in events if s > last)
+        if last and new and new[0][0] > last + 1:  # the ~100-event buffer rolled past us
+            c.metrics[self.name].gap(new[0][0] - last - 1)
+        if new:
+            c.state[self.name] = new[-1][0]
+        return [{"seq": s, "subject": str(e.get("subject") or ""), "source": str(e.get("source") or ""),
+                 "tickers_naive": ",".join(poll_feed.tickers(e)), "received_at": received,
+                 "event": json.dumps(e, ensure_ascii=False, sort_keys=True)} for s, e in new]
+
+
+# ----------------------------------------------------------- collector ---- #
+
+class Collector:
+    """Runs every job on its own schedule against shared connection pools and rate limits."""
+
+    def __init__(self, jobs, root=ROOT, hl_api=HL_API, feed_api=FEED_API, hl_rate=5.0, feed_rate=1.0,
+                 pool_size=8, flush_every=10.0, metrics_every=60.0, max_retries=4, verbose=True,
+                 compact_every=3600.0):
+        self.jobs, self.root = jobs, Path(root)
+        self.store = PartitionedStore(self.root)
+        self.state_path = self.root / ".collector_state.json"
+        self.state = self._load_state()
+        self.metrics = {j.name: JobMetrics(j.interval) for j in jobs}
+        self.pools = {"hl": HttpPool(hl_api, pool_size), "feed": HttpPool(feed_api, 2)}
+        self.limits = {"hl": RateLimiter(hl_rate), "feed": RateLimiter(feed_rate)}
+        self.flush_every, self.metrics_every, self.max_retries = flush_every, metrics_every, max_retries
+        self.compact_every = compact_every
+        self.verbose = verbose
+        self._persisting = threading.Lock()  # the shutdown flush can overlap a cancelled flush thread
+        self._stop = asyncio.Event()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, text):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.state_path)
+
+    async def hl(self, job, body):
+        return await self._fetch("hl", job, "POST", "/info", body)
+
+    async def feed(self, job, path):
+        return await self._fetch("feed", job, "GET", path)
+
+    async def _fetch(self, host, job, method, path, body=None):
+        m = self.metrics[job.name]
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            status = None
+            await self.limits[host].acquire()
+            started = time.monotonic()
+            try:
+                status, headers, payload = await self.pools[host].request(method, path, body)
+            except (OSError, http.client.HTTPException) as e:
+                m.errors += 1
+                if attempt == self.max_retries:
+                    raise CollectorError(f"{job.name}: {e}") from e
+            else:
+                m.latency.append(time.monotonic() - started)
+                if status == 429:
+                    m.rate_limited += 1
+                    self.limits[host].pause(_retry_after(headers, backoff))
+                elif status >= 500:
+                    m.errors += 1
+                elif status >= 400:
+                    raise CollectorError(f"{job.name}: HTTP {status}")
+                else:
+                    return json.loads(payload or b"null")
+                if attempt == self.max_retries:
+                    raise CollectorError(f"{job.name}: HTTP {status} after {attempt + 1} attempts")
+            if status != 429:  # a 429 already paused the host limiter for Retry-After
+                await asyncio.sleep(backoff * (1 + random.random() * 0.2))
+            backoff = min(backoff * 2, 60.0)
+
+    async def run_job(self, job):
+        m = self.metrics[job.name]
+        try:
+            rows = await job.collect(self)
+        except (CollectorError, ValueError, KeyError, TypeError) as e:
+            m.errors += 1
+            if self.verbose:
+                print(f"[collector] {job.name} failed: {e}", file=sys.stderr)
+            return 0
+        m.fetches += 1
+        m.last_ok = time.monotonic()
+        await self.store.preload(job.dataset, rows)
+        appended, duplicates = self.store.append(job.dataset, rows)
+        m.rows += appended
+        m.duplicates += duplicates
+        return appended
+
+    async def _job_loop(self, job, offset):
+        await self._sleep(offset)  # stagger first runs so jobs do not fire in lockstep
+        while not self._stop.is_set():
+            started = time.monotonic()
+            await self.run_job(job)
+            await self._sleep(max(0.0, job.interval - (time.monotonic() - started)))
+
+    async def _every(self, seconds, fn):
+        while not self._stop.is_set():
+            await self._sleep(seconds)
+            result = fn()
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def _sleep(self, seconds):
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _persist(self, batches, state):
+        with self._persisting:
+            written = self.store.write(batches)
+            self._save_state(state)  # cursors only after the rows they cover
+            return written
+
+    def flush(self):
+        return self._persist(self.store.take(), json.dumps(self.state))
+
+    async def flush_async(self):
+        """flush() with the Parquet and state writes in a worker thread, off the event loop."""
+        return await asyncio.to_thread(self._persist, self.store.take(), json.dumps(self.state))
+
+    async def compact_async(self):
+        return await asyncio.to_thread(self.store.compact)
+
+    def snapshot(self):
+        return {"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "pools": {h: {"requests": p.requests, "connections": p.opened, "reconnects": p.reconnects}
+                          for h, p in self.pools.items()},
+                "jobs": {name: m.snapshot() for name, m in self.metrics.items()}}
+
+    def emit_metrics(self):
+        snap = self.snapshot()
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "metrics.jsonl", "a") as f:
+            f.write(json.dumps(snap) + "\n")
+        if self.verbose:
+            jobs = snap["jobs"].values()
+            print(f"[collector] {snap['ts']} rows={sum(j['rows'] for j in jobs)} "
+                  f"gaps={sum(j['gaps'] for j in jobs)} missing={sum(j['missing'] for j in jobs)} "
+                  f"429s={sum(j['rate_limited'] for j in jobs)} "
+                  f"stale={[n for n, j in snap['jobs'].items() if j['stale']]}", file=sys.stderr)
+        return snap
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self, duration=None):
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=sum(p.size for p in self.pools.values())))
+        n = max(1, len(self.jobs))
+        tasks = [asyncio.create_task(self._job_loop(j, min(j.interval, 5.0) * i / n)) for i, j in enumerate(self.jobs)]
+        tasks += [asyncio.create_task(self._every(self.flush_every, self.flush_async)),
+                  asyncio.create_task(self._every(self.compact_every, self.compact_async)),
+                  asyncio.create_task(self._every(self.metrics_every, self.emit_metrics))]
+        try:
+            if duration:
+                await self._sleep(duration)
+                self.stop()
+            await asyncio.gather(*tasks)
+        finally:
+            self.stop()
+            for t in tasks:
+                t.cancel()
+            self.flush()
+            self.emit_metrics()
+            self.close()
+
+    def close(self):
+        for p in self.pools.values():
+            p.close()
+
+
+def build_jobs(a, universe=None):
+    symbols = [s.strip().upper() for s in a.symbols.split(",") if s.strip()] if a.symbols else (universe or [])
+    jobs = []
+    if a.snapshot_every:
+        jobs.append(SnapshotJob(a.snapshot_every))
+    for sym in symbols:
+        if a.candle_every:
+            jobs.append(CandleJob(sym, a.interval, a.candle_every, a.backfill_hours))
+        if a.funding_every:
+            jobs.append(FundingJob(sym, a.funding_every, a.backfill_hours))
+    if a.feed_every:
+        jobs.append(FeedJob(a.feed_every))
+    return jobs
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Async collector for Hyperliquid xyz prices and the Liquid feed.")
+    ap.add_argument("--symbols", help="comma list (default: every live xyz market)")
+    ap.add_argument("--interval", default="1m", choices=sorted(INTERVAL_MS, key=INTERVAL_MS.get))
+    ap.add_argument("--candle-every", type=float, default=30, help="seconds between candle fetches (0 = off)")
+    ap.add_argument("--funding-every", type=float, default=600, help="seconds (0 = off)")
+    ap.add_argument("--snapshot-every", type=float, default=60, help="seconds (0 = off)")
+    ap.add_argument("--feed-every", type=float, default=10, help="seconds (0 = off)")
+    ap.add_argument("--backfill-hours", type=float, default=24)
+    ap.add_argument("--hl-rate", type=float, default=5.0, help="requests/s to Hyperliquid")
+    ap.add_argument("--feed-rate", type=float, default=1.0, help="requests/s to Liquid")
+    ap.add_argument("--pool", type=int, default=8, help="keep-alive connections to Hyperliquid")
+    ap.add_argument("--duration", type=float, help="stop after N seconds (default: run until Ctrl-C)")
+    ap.add_argument("--root", default=str(ROOT))
+    ap.add_argument("--hl-api", default=HL_API); ap.add_argument("--feed-api", default=FEED_API)
+    ap.add_argument("--read", metavar="DATASET", choices=sorted(DATASETS), help="print the stored dataset and exit")
+    a = ap.parse_args()
+
+    if a.read:
+        print(PartitionedStore(a.root).read(a.read).to_string(max_rows=50))
+        return
+    universe = None
+    if not a.symbols and (a.candle_every or a.funding_every):
+        pull_prices.API = a.hl_api.rstrip("/") + "/info"
+        universe = [r["sym"] for r in pull_prices.snapshot() if r["vol"] > 0]
+    collector = Collector(build_jobs(a, universe), a.root, a.hl_api, a.feed_api, a.hl_rate, a.feed_rate, a.pool)
+    print(f"[collector] {len(collector.jobs)} jobs -> {a.root} (Ctrl-C to stop)", file=sys.stderr)
+    try:
+        asyncio.run(collector.run(a.duration))
+    except KeyboardInterrupt:
+        print("\n[collector] stopped.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
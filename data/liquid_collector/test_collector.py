@@ -0,0 +1,244 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import collector
+
+MINUTE = 60_000
+
+
+class FakeApi:
+    """Local Hyperliquid /info + Liquid feed with latency, dropped candles and 429s."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.throttle = 0          # next N requests get 429
+        self.missing = set()       # candle open times to leave out
+        self.feed_events = []
+        self.connections = 0
+        self.requests = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                api.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                api.respond(self, body)
+
+            def do_GET(self):
+                api.respond(self, {"type": "feed"})
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def respond(self, handler, body):
+        self.requests.append(body)
+        time.sleep(self.latency)
+        if self.throttle:
+            self.throttle -= 1
+            return self._send(handler, 429, {"error": "rate limited"}, {"Retry-After": "0.2"})
+        kind, now = body["type"], collector.now_ms()
+        if kind == "candleSnapshot":
+            req = body["req"]
+            first = -(-req["startTime"] // MINUTE) * MINUTE
+            out = [{"t": t, "T": t + MINUTE - 1, "o": "1", "h": "2", "l": "0.5", "c": str(1 + t % 7), "v": "3", "n": 4}
+                   for t in range(first, min(req["endTime"], now) + 1, MINUTE) if t not in self.missing]
+        elif kind == "fundingHistory":
+            hour = 3_600_000
+            out = [{"coin": body["coin"], "time": t, "fundingRate": "0.0001", "premium": "0.0"}
+                   for t in range(-(-body["startTime"] // hour) * hour, now, hour)]
+        elif kind == "metaAndAssetCtxs":
+            out = [{"universe": [{"name": "xyz:GOLD", "maxLeverage": 20}, {"name": "xyz:AAPL", "maxLeverage": 10}]},
+                   [{"markPx": "2400", "funding": "0.0001", "openInterest": "1", "dayNtlVlm": "10"},
+                    {"markPx": "200", "funding": "0", "openInterest": "1", "dayNtlVlm": "0"}]]
+        else:
+            out = {"events": self.feed_events}
+        self._send(handler, 200, out)
+
+    @staticmethod
+    def _send(handler, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        for k, v in (headers or {}).items():
+            handler.send_header(k, v)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class CollectorTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.api = FakeApi()
+
+    def tearDown(self):
+        self.api.close()
+        self.tmp.cleanup()
+
+    def make(self, jobs, **kwargs):
+        kwargs.setdefault("hl_rate", 0)
+        kwargs.setdefault("feed_rate", 0)
+        c = collector.Collector(jobs, self.tmp.name, self.api.url, self.api.url, verbose=False, **kwargs)
+        self.addCleanup(c.close)
+        return c
+
+    def test_concurrent_incremental_candles_over_keepalive_pool(self):
+        self.api.latency = 0.1
+        jobs = [collector.CandleJob(sym, "1m", backfill_hours=0.5) for sym in ("GOLD", "SILVER", "CL", "EUR")]
+        c = self.make(jobs, pool_size=4)
+
+        async def twice():
+            started = time.monotonic()
+            first = await asyncio.gather(*(c.run_job(j) for j in jobs))
+            elapsed = time.monotonic() - started
+            second = await asyncio.gather(*(c.run_job(j) for j in jobs))
+            return first, second, elapsed
+
+        first, second, elapsed = asyncio.run(twice())
+        self.assertTrue(all(n >= 30 for n in first))
+        self.assertLess(elapsed, 4 * 0.1)                    # fetched concurrently, not one after another
+        self.assertTrue(all(n <= 1 for n in second))          # only the still-open candle can change
+        cursor = c.state["candles:GOLD:1m"]
+        self.assertEqual(cursor % MINUTE, 0)
+        self.assertEqual(self.api.requests[-1]["req"]["startTime"], c.state["candles:EUR:1m"])
+        self.assertEqual(c.pools["hl"].opened, 4)
+        self.assertEqual(self.api.connections, 4)            # eight requests, four kept-alive connections
+        self.assertGreaterEqual(c.metrics["candles:GOLD:1m"].duplicates, 1)
+
+        c.flush()
+        stored = collector.PartitionedStore(self.tmp.name).read("candles")
+        self.assertEqual(len(stored), len(stored.drop_duplicates(["sym", "interval", "t"])))
+        self.assertEqual(set(stored["sym"]), {"GOLD", "SILVER", "CL", "EUR"})
+        self.assertTrue(list(Path(self.tmp.name, "candles").glob("date=*/part-*.parquet")))
+
+    def test_gap_metrics_for_candles_and_feed(self):
+        now = collector.now_ms() // MINUTE * MINUTE
+        self.api.missing = {now - 10 * MINUTE, now - 11 * MINUTE, now - 20 * MINUTE}
+        candles, feed = collector.CandleJob("GOLD", "1m", backfill_hours=0.5), collector.FeedJob()
+        c = self.make([candles, feed])
+        self.api.feed_events = [{"seq": 1, "payload": "$TSLA up", "subject": "a"},
+                                {"seq": 2, "payload": "x", "subject": "b"}, {"seq": "bad"}]
+        asyncio.run(c.run_job(candles))
+        asyncio.run(c.run_job(feed))
+        self.api.feed_events = [{"seq": s, "payload": "$NVDA", "subject": "c"} for s in (2, 7, 8)]
+        asyncio.run(c.run_job(feed))
+
+        self.assertEqual((c.metrics[candles.name].gaps, c.metrics[candles.name].missing), (2, 3))
+        self.assertEqual((c.metrics["feed"].gaps, c.metrics["feed"].missing, c.state["feed"]), (1, 4, 8))
+        c.flush()
+        feed_rows = collector.PartitionedStore(self.tmp.name).read("feed")
+        self.assertEqual(list(feed_rows["seq"]), [1, 2, 7, 8])
+        self.assertEqual(feed_rows.iloc[0]["tickers_naive"], "TSLA")
+
+    def test_429_pauses_host_and_retries(self):
+        self.api.throttle = 2
+        job = collector.FundingJob("GOLD", backfill_hours=5)
+        c = self.make([job])
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(c.run_job(job)), 5)
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        m = c.metrics[job.name]
+        self.assertEqual((m.rate_limited, m.fetches, m.errors), (2, 1, 0))
+
+        self.api.throttle = 10
+        c.max_retries = 1
+        self.assertEqual(asyncio.run(c.run_job(job)), 0)
+        self.assertEqual(m.errors, 1)
+
+    def test_store_dedups_across_restarts_and_latest_row_wins(self):
+        rows = [{"sym": "GOLD", "interval": "1m", "t": 1_700_000_000_000 + i * MINUTE, "c": 1.0} for i in range(3)]
+        store = collector.PartitionedStore(self.tmp.name)
+        self.assertEqual(store.append("candles", rows), (3, 0))
+        store.flush()
+
+        store = collector.PartitionedStore(self.tmp.name)       # fresh process: keys reloaded from disk
+        self.assertEqual(store.append("candles", rows), (0, 3))
+        self.assertEqual(store.append("candles", [dict(rows[2], c=2.0)]), (1, 0))
+        store.flush()
+        stored = store.read("candles")
+        self.assertEqual(list(stored["c"]), [1.0, 1.0, 2.0])
+
+    def test_compaction_folds_parts_and_keeps_latest_rows(self):
+        day = 86_400_000
+        rows = [{"sym": "GOLD", "interval": "1m", "t": 1_700_000_000_000 + d * day + i * MINUTE, "c": 1.0}
+                for d in range(2) for i in range(3)]
+        store = collector.PartitionedStore(self.tmp.name)
+        for i, row in enumerate(rows):
+            store.append("candles", [row, dict(rows[0], c=float(i))])
+            store.flush()
+        before = store.read("candles")
+        parts = lambda: sorted(Path(self.tmp.name, "candles").glob("date=*/*.parquet"))
+        self.assertEqual(len(parts()), 9)                      # 3 flushes touch the first date, 3 touch both
+
+        self.assertEqual(store.compact(), 9)
+        self.assertEqual(len(parts()), 2)                      # one part per date
+        self.assertEqual(store.compact(), 0)
+        after = store.read("candles")
+        self.assertTrue(after.equals(before))
+        self.assertEqual(after.iloc[0]["c"], 5.0)              # written_at survives the merge
+        store.append("candles", [dict(rows[0], c=9.0)])
+        store.flush()
+        self.assertEqual(store.read("candles").iloc[0]["c"], 9.0)
+
+    def test_flush_writes_off_the_event_loop(self):
+        c = self.make([])
+        c.store.append("funding", [{"sym": "GOLD", "time": 1_700_000_000_000, "rate": 0.1}])
+        write = c.store.write
+        c.store.write = lambda batches: (time.sleep(0.3), write(batches))[1]
+
+        async def flush_while_ticking():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            written = await c.flush_async()
+            ticker.cancel()
+            return written, ticks
+
+        written, ticks = asyncio.run(flush_while_ticking())
+        self.assertEqual(written, 1)
+        self.assertGreater(ticks, 10)                          # the loop kept running during the write
+        self.assertEqual(len(collector.PartitionedStore(self.tmp.name).read("funding")), 1)
+        self.assertTrue(Path(self.tmp.name, ".collector_state.json").exists())
+
+    def test_run_writes_state_metrics_and_snapshots(self):
+        c = self.make([collector.SnapshotJob(every=0.2, symbols=["GOLD"]), collector.FeedJob(every=0.2)],
+                      flush_every=0.3, metrics_every=0.3)
+        asyncio.run(c.run(duration=1.0))
+        state = json.loads(Path(self.tmp.name, ".collector_state.json").read_text())
+        self.assertIn("snapshots", state)
+        metrics = [json.loads(x) for x in Path(self.tmp.name, "metrics.jsonl").read_text().splitlines()]
+        self.assertFalse(metrics[-1]["jobs"]["snapshots"]["stale"])
+        self.assertGreaterEqual(metrics[-1]["jobs"]["snapshots"]["fetches"], 3)
+        snaps = collector.PartitionedStore(self.tmp.name).read("snapshots")
+        self.assertEqual(set(snaps["sym"]), {"GOLD"})
+        self.assertEqual(snaps.iloc[0]["group"], "commodity")
+
+
+if __name__ == "__main__":
+    unittest.main()
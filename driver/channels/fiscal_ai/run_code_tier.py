@@ -13,12 +13,19 @@ residual.jsonl (candidates tagged with their source, handed to the LLM locator).
 abstain.jsonl. Records carry raw signals ONLY (cadence, period_end, xbrl context); NO decomposition
 (name/slice/measurement/unit/fiscal-quarter are shared-core, added downstream by the adapter+decomposer).
 
+    venv/bin/python driver/channels/fiscal_ai/run_code_tier.py --jobs 8 --tag full         # whole worklist, one command
     venv/bin/python driver/channels/fiscal_ai/run_code_tier.py --part 1 --nparts 4
     venv/bin/python driver/channels/fiscal_ai/run_code_tier.py --tickers AAP,AGL --tag smoke   # small free run
 
 Reads data/driver_catalog_seed/worklist.jsonl; writes data/driver_catalog_seed/<tag>/.
+The unit of work is ONE TICKER (all its company-periods share one TickerPrefetch). Tickers fan out
+over a process pool; each finished ticker is checkpointed under <tag>/_checkpoint/, so a crashed run
+re-invoked with the same args resumes where it left off. Outputs are merged from the checkpoints in
+sorted (ticker, form, period) order -> byte-identical to a serial run regardless of --jobs.
 """
-import os, re, json, argparse, collections, sys, hashlib
+import os, re, json, argparse, collections, sys, hashlib, shutil, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
 _ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.insert(0, _ROOT)
 sys.path.insert(0, os.path.join(_ROOT, 'scripts', 'earnings'))
@@ -44,11 +51,19 @@ ORDER BY part
 """
 
 
+_8K_TEXT_RELS = ('HAS_EXHIBIT', 'HAS_SECTION', 'HAS_FILING_TEXT')
+
+
 def _fetch_text_parts(session, accession, relationship_types):
     """Read prose parts in stable source-node-id order, preserving each node."""
     rows = list(session.run(
         _TEXT_PARTS_Q, accession=accession,
         relationship_types=list(relationship_types)))
+    return _text_parts_from_rows(rows)
+
+
+def _text_parts_from_rows(rows):
+    """Validate {part, content} rows (already in part order) into text_parts."""
     parts, seen = [], set()
     for row in rows:
         part, content = row['part'], row['content']
@@ -199,8 +214,29 @@ def fetch_earnings_8ks(session, tk, target_acc, as_of=None):
     lag-invalid late supplements park HERE; other cycles' mysteries never leak in). audit = one
     {'acc','created','verdict','label','match','lag_valid','relevant'} row per enumerated 8-K,
     written to the run's sources_ledger (label informational only)."""
-    events, audit, uncertain = [], [], 0
-    for m in match_8k_to_periodic(session, tk, require_daily_stock=False):
+    accepted, uncertain, audit = _select_earnings_8ks(
+        match_8k_to_periodic(session, tk, require_daily_stock=False),
+        lambda acc8: QI.resolve_quarter_info(tk, acc8, session=session),
+        target_acc, as_of)
+    events = []
+    for acc8, filed in accepted:
+        text_parts = _fetch_text_parts(session, acc8, _8K_TEXT_RELS)
+        if text_parts:
+            events.append(_8k_event(acc8, filed, text_parts))
+    return events, uncertain, audit
+
+
+def _8k_event(acc8, filed, text_parts):
+    return {'source_id': acc8, 'source_type': '8k', 'event_time': str(filed), 'xbrls': [],
+            'texts': [part['content'] for part in text_parts], 'text_parts': text_parts}
+
+
+def _select_earnings_8ks(matches, resolve, target_acc, as_of=None):
+    """The fetch_earnings_8ks selection, I/O-free: matches = match_8k_to_periodic rows, resolve =
+    acc8 -> quarter_identity info (may raise ValueError). Returns (accepted [(acc8, filed_8k)],
+    uncertain_count, audit) — text parts are fetched by the caller (one-by-one or batched)."""
+    accepted, audit, uncertain = [], [], 0
+    for m in matches:
         acc8 = m['accession_8k']
         if not acc8:
             continue
@@ -214,7 +250,7 @@ def fetch_earnings_8ks(session, tk, target_acc, as_of=None):
                 continue
         cand, lag_ok = m['accession_10q'], m['lag_valid']
         try:
-            info = QI.resolve_quarter_info(tk, acc8, session=session)
+            info = resolve(acc8)
         except ValueError:                 # a 2.02 8-K the resolver still can't place -> fail closed
             relevant = cand == target_acc
             audit.append({'acc': acc8, 'created': str(m['filed_8k']), 'verdict': 'resolver_error',
@@ -231,15 +267,96 @@ def fetch_earnings_8ks(session, tk, target_acc, as_of=None):
             continue
         if verdict != 'accept':
             continue
-        text_parts = _fetch_text_parts(
-            session, acc8,
-            ('HAS_EXHIBIT', 'HAS_SECTION', 'HAS_FILING_TEXT'))
-        if text_parts:
-            events.append({'source_id': acc8, 'source_type': '8k',
-                           'event_time': str(m['filed_8k']), 'xbrls': [],
-                           'texts': [part['content'] for part in text_parts],
-                           'text_parts': text_parts})
-    return events, uncertain, audit
+        accepted.append((acc8, m['filed_8k']))
+    return accepted, uncertain, audit
+
+
+_TICKER_FILINGS_Q = """
+MATCH (r:Report)-[:PRIMARY_FILER]->(c:Company {ticker:$tk})
+WHERE r.formType IN $forms AND any(p IN $periods WHERE r.periodOfReport STARTS WITH p)
+OPTIONAL MATCH (r)-[:HAS_FINANCIAL_STATEMENT]->(f:FinancialStatementContent)
+RETURN r.formType AS form, r.periodOfReport AS por, r.accessionNo AS acc, r.created AS created,
+       r.primaryDocumentUrl AS doc_url, collect(DISTINCT f.value) AS xbrls
+"""
+
+_TEXT_PARTS_BATCH_Q = """
+MATCH (r:Report)-[rel]->(n)
+WHERE r.accessionNo IN $accessions AND type(rel) IN $relationship_types AND n.content IS NOT NULL
+RETURN r.accessionNo AS acc, type(rel) AS rel, n.id AS part, n.content AS content
+ORDER BY acc, part
+"""
+
+
+class TickerPrefetch:
+    """Every source one ticker's company-periods need, in a fixed handful of queries.
+
+    Serves the same values as fetch_filing / fetch_earnings_8ks per company-period, but: the
+    ticker's named filings come from ONE query, match_8k_to_periodic runs ONCE (not once per
+    target), quarter_identity is resolved once per 8-K, and the text parts of every filing and
+    accepted 8-K come from ONE batched query. Text-part validation stays lazy (per source, on
+    access) so a malformed node fails exactly where the per-cp fetch would have."""
+
+    def __init__(self, session, tk, keys):
+        self.session, self.tk = session, tk
+        keys = sorted(set(keys))
+        rows = list(session.run(_TICKER_FILINGS_Q, tk=tk,
+                                forms=sorted({f for f, _ in keys}),
+                                periods=sorted({p for _, p in keys})))
+        self._filings = {}
+        for form, period in keys:
+            hit = next((r for r in rows if r['form'] == form
+                        and str(r['por'] or '').startswith(period)), None)
+            self._filings[(form, period)] = hit if hit and hit['acc'] else None
+        self._infos = {}
+        matches = list(match_8k_to_periodic(session, tk, require_daily_stock=False))
+        self._selections = {}
+        for hit in self._filings.values():
+            if hit and hit['acc'] not in self._selections:
+                self._selections[hit['acc']] = _select_earnings_8ks(matches, self._resolve, hit['acc'])
+        eightks = sorted({acc8 for accepted, _, _ in self._selections.values() for acc8, _ in accepted})
+        periodic = sorted({hit['acc'] for hit in self._filings.values() if hit})
+        self._part_rows = collections.defaultdict(list)
+        if eightks or periodic:
+            for row in session.run(_TEXT_PARTS_BATCH_Q, accessions=periodic + eightks,
+                                   relationship_types=list(_8K_TEXT_RELS)):
+                self._part_rows[row['acc']].append(row)
+
+    def _resolve(self, acc8):
+        if acc8 not in self._infos:
+            try:
+                self._infos[acc8] = QI.resolve_quarter_info(self.tk, acc8, session=self.session)
+            except ValueError as e:
+                self._infos[acc8] = e
+        info = self._infos[acc8]
+        if isinstance(info, ValueError):
+            raise info
+        return info
+
+    def _text_parts(self, acc, relationship_types):
+        return _text_parts_from_rows(
+            [r for r in self._part_rows.get(acc, ()) if r['rel'] in relationship_types])
+
+    def filing(self, form, period):
+        """== fetch_filing(session, tk, form, period)."""
+        r = self._filings.get((form, period))
+        if r is None:
+            return None
+        text_parts = self._text_parts(r['acc'], ('HAS_SECTION',))
+        return {'source_id': r['acc'], 'source_type': FORMMAP.get(form, form), 'event_time': r['created'],
+                'doc_url': r['doc_url'],
+                'xbrls': [x for x in r['xbrls'] if x],
+                'texts': [part['content'] for part in text_parts],
+                'text_parts': text_parts}
+
+    def earnings_8ks(self, target_acc):
+        """== fetch_earnings_8ks(session, tk, target_acc) (no as_of: the harvest is not a replay)."""
+        accepted, uncertain, audit = self._selections[target_acc]
+        events = []
+        for acc8, filed in accepted:
+            text_parts = self._text_parts(acc8, _8K_TEXT_RELS)
+            if text_parts:
+                events.append(_8k_event(acc8, filed, text_parts))
+        return events, uncertain, audit
 
 
 def resolve_one(it, src, allow_t1):
@@ -316,12 +433,158 @@ def process_cp(items, filing, prs, sources_incomplete=False):
     return resolved, residual, abstain
 
 
+def run_ticker(session, tk, ticker_cps):
+    """All company-periods of ONE ticker, ticker_cps = [((tk, form, period), items)] in sorted order.
+    Returns the rows each output file gets, in write order, plus per-ticker counters."""
+    pre = TickerPrefetch(session, tk, [(form, period) for (_, form, period), _ in ticker_cps])
+    out = {'resolved': [], 'residual': [], 'abstain': [], 'ledger': [],
+           'stats': collections.Counter()}
+    stats = out['stats']
+    for (_, form, period), items in ticker_cps:
+        filing = pre.filing(form, period)
+        if filing is None:                       # named filing not in Neo4j yet -> whole cp PARKs downstream
+            out['abstain'] += [_corpus_missing_row(it) for it in items]
+            stats['cp_no_filing'] += 1
+            continue
+        prs, uncertain_8ks, audit = pre.earnings_8ks(filing['source_id'])
+        out['ledger'].append({'ticker': tk, 'form': form, 'period': period,
+                              'filing_acc': filing['source_id'], 'eightk': audit})
+        resolved, residual, abstain = process_cp(items, filing, prs,
+                                                 sources_incomplete=uncertain_8ks > 0)
+        out['resolved'] += resolved; out['residual'] += residual; out['abstain'] += abstain
+        stats['T1_xbrl'] += sum(1 for r in resolved if r['tier'] == 'T1-xbrl')
+        stats['T2_label'] += sum(1 for r in resolved if r['tier'] == 'T2-label')
+        stats['pr_records'] += sum(1 for r in resolved if r['source_type'] == '8k')
+    out['stats'] = dict(stats)
+    return out
+
+
+def _neo4j_driver():
+    load_env_neo4j()
+    from neo4j import GraphDatabase
+    return GraphDatabase.driver(os.environ['NEO4J_URI'],
+                                auth=(os.environ.get('NEO4J_USERNAME', 'neo4j'), os.environ['NEO4J_PASSWORD']))
+
+
+class Checkpoint:
+    """<tag>/_checkpoint/: one JSON per finished ticker + a manifest fingerprinting the work set.
+    A different work set (other worklist/tickers/part) invalidates every checkpoint."""
+
+    def __init__(self, pdir, cps):
+        self.dir = f'{pdir}/_checkpoint'
+        self.fingerprint = hashlib.sha1(json.dumps(
+            [[list(k), [_iid(it) for it in items]] for k, items in sorted(cps.items())]
+        ).encode()).hexdigest()
+        manifest = f'{self.dir}/manifest.json'
+        if os.path.exists(manifest):
+            if json.load(open(manifest)).get('fingerprint') != self.fingerprint:
+                shutil.rmtree(self.dir)
+        os.makedirs(self.dir, exist_ok=True)
+        with open(manifest, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint}, f)
+
+    def path(self, tk):
+        return f'{self.dir}/{tk}.json'
+
+    def done(self, tk):
+        return os.path.exists(self.path(tk))
+
+    def save(self, tk, out):
+        tmp = self.path(tk) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(out, f)
+        os.replace(tmp, self.path(tk))            # atomic: a crash never leaves a half checkpoint
+
+    def load(self, tk):
+        return json.load(open(self.path(tk)))
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+_WORKER = {}
+
+
+def _worker_init():
+    _WORKER['driver'] = _neo4j_driver()
+    # closed when the worker exits; not atexit, which a forked pool worker (os._exit) never runs
+    Finalize(None, _WORKER['driver'].close, exitpriority=10)
+
+
+def _worker_ticker(tk, ticker_cps, ckpt):
+    """Pool task: run + checkpoint one ticker in the worker (the parent may die; the file survives)."""
+    with _WORKER['driver'].session() as s:
+        ckpt.save(tk, run_ticker(s, tk, ticker_cps))
+    return tk
+
+
+def run(cps, pdir, jobs=1, tag=''):
+    """Run every company-period, checkpointing per ticker, then merge deterministically.
+
+    jobs > 1: tickers go to a ProcessPoolExecutor largest-first; the pool's shared task queue hands
+    the next ticker to whichever worker frees up first (work-stealing), so one slow ticker never
+    idles the rest. Returns (counts, stats, resumed, cp_per_min)."""
+    by_ticker = collections.defaultdict(list)
+    for key, items in sorted(cps.items()):
+        by_ticker[key[0]].append((key, items))
+    ckpt = Checkpoint(pdir, cps)
+    pending = [tk for tk in by_ticker if not ckpt.done(tk)]
+    resumed = len(by_ticker) - len(pending)
+    if resumed:
+        print(f"[{tag}] resuming: {resumed}/{len(by_ticker)} tickers already checkpointed")
+
+    t0 = time.time(); done_cps = 0; next_log = 100
+
+    def _progress(tk):
+        nonlocal done_cps, next_log
+        done_cps += len(by_ticker[tk])
+        if done_cps >= next_log:
+            rate = done_cps / max(time.time() - t0, 1e-9) * 60
+            print(f"  {done_cps}/{sum(len(by_ticker[t]) for t in pending)} cps  ({rate:.1f} cp/min)")
+            next_log = done_cps + 100
+
+    if jobs <= 1:
+        drv = _neo4j_driver()
+        with drv.session() as s:
+            for tk in pending:
+                ckpt.save(tk, run_ticker(s, tk, by_ticker[tk]))
+                _progress(tk)
+        drv.close()
+    elif pending:
+        order = sorted(pending, key=lambda t: (-sum(len(i) for _, i in by_ticker[t]), t))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init) as pool:
+            futs = [pool.submit(_worker_ticker, tk, by_ticker[tk], ckpt) for tk in order]
+            for fut in as_completed(futs):
+                _progress(fut.result())
+    elapsed = time.time() - t0
+    cp_per_min = round(done_cps / elapsed * 60, 1) if elapsed > 0 and done_cps else 0.0
+
+    # merge: sorted ticker order == the serial run's sorted (ticker, form, period) order
+    names = {'resolved': 'code_resolved.jsonl', 'residual': 'residual.jsonl',
+             'abstain': 'abstain.jsonl', 'ledger': 'sources_ledger.jsonl'}
+    files = {k: open(f'{pdir}/{v}', 'w') for k, v in names.items()}
+    counts = collections.Counter(); stats = collections.Counter()
+    for tk in sorted(by_ticker):
+        out = ckpt.load(tk)
+        for k, fh in files.items():
+            for r in out[k]:
+                fh.write(json.dumps(r) + '\n')
+            counts[k] += len(out[k])
+        stats.update(out['stats'])
+    for fh in files.values():
+        fh.close()
+    ckpt.clear()
+    return counts, stats, resumed, cp_per_min
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--part', type=int)
     ap.add_argument('--nparts', type=int, default=4)
     ap.add_argument('--tickers', help='comma list; overrides --part (small free run)')
-    ap.add_argument('--tag', help='output subdir name (default part<N>)')
+    ap.add_argument('--tag', help='output subdir name (default part<N>, or "all" with --jobs)')
+    ap.add_argument('--jobs', type=int, default=1,
+                    help='worker processes; without --part/--tickers runs the WHOLE worklist')
     ap.add_argument('--worklist', default=f'{OUT}/worklist.jsonl',
                     help='input rows file (pass the COMMITTED slice for reproducible runs — '
                          'round-19: a clean checkout must not depend on the ignored full sheet)')
@@ -331,55 +594,29 @@ def main():
     if a.tickers:
         keep = set(a.tickers.split(',')); work = [w for w in work if w['ticker'] in keep]
         tag = a.tag or 'smoke'
-    else:
-        assert a.part, 'need --part or --tickers'
+    elif a.part:
         tickers = sorted({w['ticker'] for w in work})
         chunk = (len(tickers) + a.nparts - 1) // a.nparts
         part_tickers = set(tickers[(a.part-1)*chunk: a.part*chunk])
         work = [w for w in work if w['ticker'] in part_tickers]
         tag = a.tag or f'part{a.part}'
+    else:
+        assert a.jobs > 1, 'need --part, --tickers or --jobs N'
+        tag = a.tag or 'all'
     work, dup_collapsed = dedupe_rows(work)      # round-13: identical rows are ONE fact, ONE id
     cps = collections.defaultdict(list)
     for w in work:
         cps[(w['ticker'], w['form'], w['period'])].append(w)
-    print(f"[{tag}] {len(work)} instances, {len(cps)} company-periods")
+    print(f"[{tag}] {len(work)} instances, {len(cps)} company-periods, jobs={a.jobs}")
 
-    load_env_neo4j()
-    from neo4j import GraphDatabase
-    drv = GraphDatabase.driver(os.environ['NEO4J_URI'],
-                               auth=(os.environ.get('NEO4J_USERNAME', 'neo4j'), os.environ['NEO4J_PASSWORD']))
     pdir = f'{OUT}/{tag}'; os.makedirs(pdir, exist_ok=True)
-    R = open(f'{pdir}/code_resolved.jsonl', 'w'); RES = open(f'{pdir}/residual.jsonl', 'w')
-    AB = open(f'{pdir}/abstain.jsonl', 'w'); SL = open(f'{pdir}/sources_ledger.jsonl', 'w')
-    nR = nRes = nAb = 0
-    stats = collections.Counter()
-    with drv.session() as s:
-        for i, ((tk, form, period), items) in enumerate(sorted(cps.items())):
-            filing = fetch_filing(s, tk, form, period)
-            if filing is None:                   # named filing not in Neo4j yet -> whole cp PARKs downstream
-                for it in items:
-                    AB.write(json.dumps(_corpus_missing_row(it)) + '\n'); nAb += 1
-                stats['cp_no_filing'] += 1
-                continue
-            prs, uncertain_8ks, audit = fetch_earnings_8ks(s, tk, filing['source_id'])
-            SL.write(json.dumps({'ticker': tk, 'form': form, 'period': period,
-                                 'filing_acc': filing['source_id'],
-                                 'eightk': audit}) + '\n')
-            resolved, residual, abstain = process_cp(items, filing, prs,
-                                                     sources_incomplete=uncertain_8ks > 0)
-            for r in resolved: R.write(json.dumps(r) + '\n'); nR += 1
-            for r in residual: RES.write(json.dumps(r) + '\n'); nRes += 1
-            for r in abstain: AB.write(json.dumps(r) + '\n'); nAb += 1
-            stats[('tier', 'T1')] += sum(1 for r in resolved if r['tier'] == 'T1-xbrl')
-            stats[('tier', 'T2')] += sum(1 for r in resolved if r['tier'] == 'T2-label')
-            stats['pr_records'] += sum(1 for r in resolved if r['source_type'] == '8k')
-            if (i+1) % 100 == 0:
-                print(f"  {i+1}/{len(cps)} cps  resolved={nR} residual={nRes} abstain={nAb}")
-    drv.close(); R.close(); RES.close(); AB.close(); SL.close()
-    summary = {'tag': tag, 'records_resolved': nR, 'residual': nRes, 'abstain': nAb,
-               'company_periods': len(cps), 'T1_xbrl': stats[('tier', 'T1')], 'T2_label': stats[('tier', 'T2')],
+    counts, stats, resumed, cp_per_min = run(cps, pdir, jobs=a.jobs, tag=tag)
+    summary = {'tag': tag, 'records_resolved': counts['resolved'], 'residual': counts['residual'],
+               'abstain': counts['abstain'],
+               'company_periods': len(cps), 'T1_xbrl': stats['T1_xbrl'], 'T2_label': stats['T2_label'],
                'pr_records': stats['pr_records'], 'cp_no_filing': stats['cp_no_filing'],
-               'duplicate_rows_collapsed': dup_collapsed}
+               'duplicate_rows_collapsed': dup_collapsed,
+               'jobs': a.jobs, 'tickers_resumed': resumed, 'cp_per_min': cp_per_min}
     json.dump(summary, open(f'{pdir}/code_summary.json', 'w'), indent=2)
     print(json.dumps(summary, indent=2))
 
@@ -18,6 +18,7 @@ set/dict iteration order. NO LLM of any kind.
 from __future__ import annotations
 
 import re
+import weakref
 from dataclasses import dataclass
 
 from vocab_seed import VocabSnapshot, banned_category, MAX_EFFECTIVE_SLOTS
@@ -276,7 +277,40 @@ def rejoin_compound_metrics(tokens: list, compound_metrics: set) -> list:
 # canonicalize — §C steps 1..12 EXACTLY
 # ─────────────────────────────────────────────────────────────────────────────
 
+# canonicalize() memo, one table per VocabSnapshot object. A snapshot is
+# immutable (a new vocab = dataclasses.replace / build_vocab_snapshot = a new
+# object), so a cached result stays valid for the snapshot's lifetime; the table
+# is dropped when the snapshot is garbage-collected. Results are str or a frozen
+# Rejection, so sharing them is safe.
+_CANON_MEMO: dict[int, tuple] = {}
+
+
+def _canon_memo(vocab) -> dict | None:
+    entry = _CANON_MEMO.get(id(vocab))
+    if entry is not None and entry[0]() is vocab:
+        return entry[1]
+    key = id(vocab)
+    try:
+        ref = weakref.ref(vocab, lambda _r, _k=key: _CANON_MEMO.pop(_k, None))
+    except TypeError:                      # not weak-referenceable → no memo
+        return None
+    memo: dict = {}
+    _CANON_MEMO[key] = (ref, memo)
+    return memo
+
+
 def canonicalize(candidate: str, vocab: VocabSnapshot):
+    """§C canonicalization (see ``_canonicalize``), memoized per VocabSnapshot."""
+    memo = _canon_memo(vocab)
+    if memo is None:
+        return _canonicalize(candidate, vocab)
+    result = memo.get(candidate)
+    if result is None:
+        result = memo[candidate] = _canonicalize(candidate, vocab)
+    return result
+
+
+def _canonicalize(candidate: str, vocab: VocabSnapshot):
     """Pure §C 12-step canonicalization. Returns str | Rejection.
 
     Step map (Implementation §C, v11-3):
@@ -9,6 +9,13 @@ production swaps this for the guidance-style Neo4j registry/writer
 Driver row schema (Harness_BuilderPrompt.md §5 / §4):
   {name, aliases[], allowed_states[], segment, definition, base_label?, is_shortcut?}
 
+Lookups are index-backed so the ladder cost per packet does not grow with the
+catalog: exact name, alias (first driver in insertion order that lists it),
+sorted name tokens (B8) and the set of name/alias tokens (the B8 / V14 "known
+token" gate). Every ``add_driver`` / ``add_alias`` also appends the driver name
+to a change log that ``changes_since`` exposes, so render_catalog re-renders
+only the drivers that changed.
+
 NEVER imported by PROD-CORE (driver_ids / vocab_seed / validators / reuse /
 render_catalog / run_one). stdlib only, no network.
 """
@@ -34,6 +41,13 @@ class Registry:
         self._drivers: list[dict] = []
         # index by exact name for O(1) lookup.
         self._by_name: dict[str, dict] = {}
+        # inverted indexes (rebuilt wholesale only when a driver is replaced).
+        self._position: dict[str, int] = {}          # name -> insertion index
+        self._by_alias: dict[str, str] = {}          # alias -> first driver name listing it
+        self._by_sorted_tokens: dict[tuple, str] = {}  # sorted(name tokens) -> first driver name
+        self._tokens: set[str] = set()               # every name / alias token
+        # names touched by add_driver / add_alias; revision == len(_changes).
+        self._changes: list[str] = []
         for row in (drivers or []):
             self.add_driver(row)
 
@@ -57,10 +71,8 @@ class Registry:
     def lookup_by_alias(self, token: str) -> Optional[dict]:
         """B4 / B7: return the driver dict that lists ``token`` in its
         ``aliases``, else None. First match in insertion order."""
-        for d in self._drivers:
-            if token in d.get("aliases", []):
-                return d
-        return None
+        name = self._by_alias.get(token)
+        return self._by_name[name] if name is not None else None
 
     def all_drivers(self) -> list:
         """Return all driver dicts (insertion order)."""
@@ -69,11 +81,18 @@ class Registry:
     def sorted_token_match(self, tokens: list) -> Optional[dict]:
         """B8: return the driver whose ``sorted(name tokens)`` equals
         ``sorted(tokens)``, else None. Used by the sorted-token reuse rung."""
-        key = sorted(tokens)
-        for d in self._drivers:
-            if sorted(d["name"].split("_")) == key:
-                return d
-        return None
+        name = self._by_sorted_tokens.get(tuple(sorted(tokens)))
+        return self._by_name[name] if name is not None else None
+
+    def has_token(self, token: str) -> bool:
+        """True iff ``token`` is a ``_``-token of some Driver.name or alias (the
+        registry half of the B8 / V14 known-token gate)."""
+        return token in self._tokens
+
+    def changes_since(self, revision: int) -> tuple:
+        """Return ``(current_revision, names)`` — the driver names touched by
+        ``add_driver`` / ``add_alias`` after ``revision`` (0 = since creation)."""
+        return len(self._changes), self._changes[revision:]
 
     def add_alias(self, name: str, alias: str) -> bool:
         """ADDITIVE (Pass-3, Harness_BuilderPrompt.md §15.0) — record ``alias`` on
@@ -94,6 +113,8 @@ class Registry:
         if alias in aliases:
             return False
         aliases.append(alias)
+        self._index_alias(name, alias)
+        self._changes.append(name)
         return True
 
     def add_driver(self, row: dict) -> dict:
@@ -115,9 +136,39 @@ class Registry:
         existing = self._by_name.get(stored["name"])
         if existing is not None:
             # replace in place to preserve order
-            idx = self._drivers.index(existing)
+            idx = self._position[stored["name"]]
             self._drivers[idx] = stored
+            self._by_name[stored["name"]] = stored
+            self._rebuild_indexes()
         else:
+            self._position[stored["name"]] = len(self._drivers)
             self._drivers.append(stored)
-        self._by_name[stored["name"]] = stored
+            self._by_name[stored["name"]] = stored
+            self._index_driver(stored)
+        self._changes.append(stored["name"])
         return stored
+
+    # ── index maintenance ───────────────────────────────────────────────────
+
+    def _index_alias(self, name: str, alias: str) -> None:
+        """Point ``alias`` at ``name`` unless an EARLIER driver already lists it
+        (keeps lookup_by_alias's first-in-insertion-order answer)."""
+        current = self._by_alias.get(alias)
+        if current is None or self._position[name] < self._position[current]:
+            self._by_alias[alias] = name
+        self._tokens.update(alias.split("_"))
+
+    def _index_driver(self, driver: dict) -> None:
+        name = driver["name"]
+        tokens = name.split("_")
+        self._by_sorted_tokens.setdefault(tuple(sorted(tokens)), name)
+        self._tokens.update(tokens)
+        for alias in driver.get("aliases", []):
+            self._index_alias(name, alias)
+
+    def _rebuild_indexes(self) -> None:
+        self._by_alias.clear()
+        self._by_sorted_tokens.clear()
+        self._tokens.clear()
+        for d in self._drivers:
+            self._index_driver(d)
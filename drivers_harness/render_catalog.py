@@ -11,10 +11,17 @@ set the LLM sees; omitting it understates reuse).
 Reads the registry (the prod PIT-Neo4j seam) + the ``vocab`` snapshot; pure
 otherwise — deterministic, sorted output. Imports only the foundation vocab type
 indirectly (no test-only imports). NO LLM, stdlib only.
+
+Incremental: when the registry exposes ``changes_since(revision)`` the rendered
+per-Driver blocks are cached per registry and only the drivers touched by
+``add_driver`` / ``add_alias`` since the previous call are re-rendered; the vocab
+excerpt is cached per VocabSnapshot. Output is byte-identical to a full render.
 """
 
 from __future__ import annotations
 
+import weakref
+
 from vocab_seed import VocabSnapshot
 
 
@@ -45,19 +52,81 @@ def render_catalog(registry, vocab: VocabSnapshot) -> str:
 
     Drivers are listed in the registry's insertion order (deterministic);
     vocab excerpt tokens are SORTED so the block is byte-stable across runs."""
-    lines: list[str] = ["=== DRIVER CATALOG ==="]
-    for d in registry.all_drivers():
-        lines.append(f"- {d['name']}")
-        lines.append(f"    aliases: {_fmt_list(d.get('aliases', []))}")
-        lines.append(f"    allowed_states: {_fmt_list(d.get('allowed_states', []))}")
-        lines.append(f"    segment: {d.get('segment', 'Total')}")
-        lines.append(f"    definition: {d.get('definition', '')}")
-
-    lines.append("=== VOCAB EXCERPT ===")
-    lines.append(f"THEMES: {_fmt_list(sorted(vocab.slot_vocabs.get('theme', frozenset())))}")
-    lines.append(f"OBJECTS: {_fmt_list(sorted(vocab.slot_vocabs.get('object', frozenset())))}")
-    lines.append(f"GEOGRAPHIES: {_fmt_list(sorted(vocab.slot_vocabs.get('geography', frozenset())))}")
-    lines.append(f"METRICS: {_fmt_list(sorted(vocab.slot_vocabs.get('metric', frozenset())))}")
-    lines.append(f"SHORTCUTS: {_fmt_list(sorted(vocab.shortcuts))}")
-
-    return "\n".join(lines)
+    changes_since = getattr(registry, "changes_since", None)
+    cache = _cache_for(registry) if changes_since is not None else None
+    if cache is None:
+        drivers = "\n".join(_driver_block(d) for d in registry.all_drivers())
+        return _assemble(drivers, _vocab_excerpt(vocab))
+
+    revision, changed = changes_since(cache.revision)
+    if changed or cache.drivers is None:
+        for name in changed:
+            cache.blocks.pop(name, None)
+        parts = []
+        for d in registry.all_drivers():
+            block = cache.blocks.get(d["name"])
+            if block is None:
+                block = cache.blocks[d["name"]] = _driver_block(d)
+            parts.append(block)
+        cache.drivers = "\n".join(parts)
+    cache.revision = revision
+    if cache.vocab_ref is None or cache.vocab_ref() is not vocab:
+        cache.vocab_excerpt = _vocab_excerpt(vocab)
+        try:
+            cache.vocab_ref = weakref.ref(vocab)
+        except TypeError:
+            cache.vocab_ref = None
+    return _assemble(cache.drivers, cache.vocab_excerpt)
+
+
+def _driver_block(d: dict) -> str:
+    """The five catalog lines of one Driver."""
+    return "\n".join([
+        f"- {d['name']}",
+        f"    aliases: {_fmt_list(d.get('aliases', []))}",
+        f"    allowed_states: {_fmt_list(d.get('allowed_states', []))}",
+        f"    segment: {d.get('segment', 'Total')}",
+        f"    definition: {d.get('definition', '')}",
+    ])
+
+
+def _vocab_excerpt(vocab: VocabSnapshot) -> str:
+    return "\n".join([
+        "=== VOCAB EXCERPT ===",
+        f"THEMES: {_fmt_list(sorted(vocab.slot_vocabs.get('theme', frozenset())))}",
+        f"OBJECTS: {_fmt_list(sorted(vocab.slot_vocabs.get('object', frozenset())))}",
+        f"GEOGRAPHIES: {_fmt_list(sorted(vocab.slot_vocabs.get('geography', frozenset())))}",
+        f"METRICS: {_fmt_list(sorted(vocab.slot_vocabs.get('metric', frozenset())))}",
+        f"SHORTCUTS: {_fmt_list(sorted(vocab.shortcuts))}",
+    ])
+
+
+def _assemble(drivers: str, vocab_excerpt: str) -> str:
+    head = "=== DRIVER CATALOG ==="
+    return "\n".join([head, drivers, vocab_excerpt] if drivers else [head, vocab_excerpt])
+
+
+class _CatalogCache:
+    """Rendered blocks for one registry (keyed by driver name) + the last
+    registry revision and vocab snapshot they reflect."""
+
+    def __init__(self) -> None:
+        self.revision = 0
+        self.blocks: dict[str, str] = {}
+        self.drivers: str | None = None
+        self.vocab_ref = None
+        self.vocab_excerpt = ""
+
+
+# registry object -> _CatalogCache (dropped with the registry).
+_CACHES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _cache_for(registry) -> _CatalogCache | None:
+    try:
+        cache = _CACHES.get(registry)
+        if cache is None:
+            cache = _CACHES[registry] = _CatalogCache()
+        return cache
+    except TypeError:                      # unhashable / not weak-referenceable
+        return None
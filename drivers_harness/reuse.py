@@ -69,13 +69,21 @@ def _known_token(token: str, registry, vocab: VocabSnapshot) -> bool:
     """B8 gate: a token is KNOWN if it appears in some Driver.name, some
     Driver.aliases, or as a key/value in the §F.2-F.4 maps (§B8 wording).
     (Slot/state/compound bank membership also counts as "in §F.2-F.4 maps"'s
-    spirit — a token in a slot vocab is a known literal.)"""
-    for d in registry.all_drivers():
-        if token in d["name"].split("_"):
+    spirit — a token in a slot vocab is a known literal.)
+
+    A registry that keeps a token index exposes ``has_token``; otherwise the
+    drivers are scanned."""
+    has_token = getattr(registry, "has_token", None)
+    if has_token is not None:
+        if has_token(token):
             return True
-        for a in d.get("aliases", []):
-            if token in a.split("_"):
+    else:
+        for d in registry.all_drivers():
+            if token in d["name"].split("_"):
                 return True
+            for a in d.get("aliases", []):
+                if token in a.split("_"):
+                    return True
     for m in (vocab.synonym_map, vocab.plural_map, vocab.acronym_map):
         if token in m or token in m.values():
             return True
@@ -0,0 +1,156 @@
+"""Indexed registry + memoized canonicalize + incremental render_catalog.
+
+The fake Registry answers B3/B4/B7/B8 and the known-token gate from inverted
+indexes, canonicalize() is memoized per VocabSnapshot, and render_catalog()
+re-renders only drivers touched by add_driver / add_alias. None of that may
+change an outcome, so:
+
+  - the §15A accumulation replay is run TWICE — once on the indexed Registry,
+    once on ``LinearRegistry`` (the original linear-scan lookups, no token index,
+    no change log) — and every per-event decision, catalog block and final
+    registry must be identical;
+  - ladder outcomes over a large synthetic registry must match the linear
+    reference, and the indexed lookups must be much faster than the scans.
+
+Pure offline, stdlib only, NO LLM.
+"""
+
+from __future__ import annotations
+
+import time
+
+from apply_decision import apply_decision
+from driver_ids import canonicalize
+from registry_fake import Registry
+from render_catalog import render_catalog
+from reuse import reuse_or_propose
+from run_one import run_one
+from vocab_seed import build_vocab_snapshot
+
+from test_accumulation_replay import _scripted_events, _starting_registry
+
+
+class LinearRegistry(Registry):
+    """The pre-index lookups: linear scans, no ``has_token`` / ``changes_since``
+    (so reuse / validators / render_catalog take their generic paths)."""
+
+    has_token = None
+    changes_since = None
+
+    def lookup_by_alias(self, token):
+        for d in self._drivers:
+            if token in d.get("aliases", []):
+                return d
+        return None
+
+    def sorted_token_match(self, tokens):
+        key = sorted(tokens)
+        for d in self._drivers:
+            if sorted(d["name"].split("_")) == key:
+                return d
+        return None
+
+
+def _replay(registry):
+    vocab = build_vocab_snapshot()
+    trace = []
+    for label, emission in _scripted_events():
+        catalog = render_catalog(registry, vocab)
+        decision = run_one(emission, registry, vocab)
+        registry, vocab = apply_decision(decision, registry, vocab)
+        trace.append((label, catalog, decision))
+    return registry, trace
+
+
+def test_accumulation_replay_identical_on_indexed_and_linear_registry():
+    indexed, indexed_trace = _replay(_starting_registry())
+    linear, linear_trace = _replay(LinearRegistry(_starting_registry().all_drivers()))
+    for (label, catalog_i, decision_i), (_, catalog_l, decision_l) in zip(indexed_trace, linear_trace):
+        assert catalog_i == catalog_l, label
+        assert decision_i == decision_l, label
+    assert indexed.all_drivers() == linear.all_drivers()
+    assert render_catalog(indexed, build_vocab_snapshot()) == render_catalog(linear, build_vocab_snapshot())
+
+
+def test_alias_index_keeps_first_in_insertion_order():
+    reg = Registry([
+        {"name": "a_revenue", "aliases": []},
+        {"name": "b_revenue", "aliases": ["shared"]},
+    ])
+    assert reg.lookup_by_alias("shared")["name"] == "b_revenue"
+    assert reg.add_alias("a_revenue", "shared")            # earlier driver now lists it too
+    assert reg.lookup_by_alias("shared")["name"] == "a_revenue"
+    reg.add_driver({"name": "a_revenue", "aliases": ["other"]})   # replacement drops the alias
+    assert reg.lookup_by_alias("shared")["name"] == "b_revenue"
+    assert reg.has_token("other") and not reg.has_token("missing")
+    assert reg.sorted_token_match(["revenue", "b"])["name"] == "b_revenue"
+
+
+def test_catalog_rerenders_only_changed_drivers(monkeypatch):
+    import render_catalog as RC
+    reg, vocab = Registry.from_fixture(), build_vocab_snapshot()
+    first = render_catalog(reg, vocab)
+    rendered = []
+    real = RC._driver_block
+    monkeypatch.setattr(RC, "_driver_block", lambda d: (rendered.append(d["name"]), real(d))[1])
+
+    assert render_catalog(reg, vocab) == first and rendered == []
+    name = reg.all_drivers()[0]["name"]
+    reg.add_alias(name, "brand_new_alias")
+    updated = render_catalog(reg, vocab)
+    assert rendered == [name] and "brand_new_alias" in updated
+    assert updated == render_catalog(LinearRegistry(reg.all_drivers()), vocab)
+
+
+def test_canonicalize_memo_is_per_snapshot():
+    v1, v2 = build_vocab_snapshot(), build_vocab_snapshot({"takings": "revenue"})
+    assert canonicalize("takings", v1) is canonicalize("takings", v1)
+    assert canonicalize("takings", v2) == "revenue"
+    assert canonicalize("takings", v1) != "revenue"
+
+
+# ── large synthetic registry ──────────────────────────────────────────────
+
+_METRICS = ["revenue", "sales", "capex", "margin", "bookings", "shipments", "orders", "demand"]
+
+
+def _synthetic_rows(n):
+    rows = []
+    for i in range(n):
+        word = "".join(chr(ord("a") + int(c)) for c in str(i))      # 12 -> "bc"
+        metric = _METRICS[i % len(_METRICS)]
+        rows.append({"name": f"z{word}_{metric}", "aliases": [f"{metric}_z{word}", f"z{word}_{metric}_total"],
+                     "allowed_states": ["accelerated"], "segment": "Total", "definition": f"Synthetic {i}."})
+    return rows
+
+
+def test_large_registry_outcomes_match_and_lookups_are_indexed():
+    rows = _synthetic_rows(4000)
+    indexed, linear = Registry(rows), LinearRegistry(rows)
+    vocab = build_vocab_snapshot()
+    probes = [r["aliases"][0] for r in rows[::40]] + [r["aliases"][1] for r in rows[::97]]
+    probes += ["iphone_china_sales", "china_revenue", "capex", "unknown_thing_revenue"]
+
+    for raw in probes:
+        assert (reuse_or_propose(raw, ["SRC:x"], indexed, vocab).to_dict()
+                == reuse_or_propose(raw, ["SRC:x"], linear, vocab).to_dict()), raw
+
+    def time_lookups(reg):
+        started = time.perf_counter()
+        for raw in probes:
+            reg.lookup_by_alias(raw)
+            reg.sorted_token_match(raw.split("_"))
+        return time.perf_counter() - started
+
+    assert time_lookups(indexed) * 20 < time_lookups(linear)
+
+    render_catalog(indexed, vocab)
+    started = time.perf_counter()
+    for _ in range(50):
+        render_catalog(indexed, vocab)
+    cached = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(50):
+        render_catalog(linear, vocab)
+    full = time.perf_counter() - started
+    assert cached * 5 < full
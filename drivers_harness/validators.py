@@ -413,6 +413,9 @@ def _token_in_registry_or_banks(token: str, registry, vocab: VocabSnapshot) -> b
     for m in (vocab.synonym_map, vocab.plural_map, vocab.acronym_map):
         if token in m or token in m.values():
             return True
+    has_token = getattr(registry, "has_token", None)   # token-indexed registry
+    if has_token is not None:
+        return has_token(token)
     for d in registry.all_drivers():
         if token in d["name"].split("_"):
             return True
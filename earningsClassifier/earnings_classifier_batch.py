@@ -0,0 +1,194 @@
+"""
+Batch mode for the final earnings classifier
+
+All concept vocabularies of EarningsClassifier are compiled into one multi-pattern
+matcher that finds every concept term of "title body" in a single pass, with title
+hits kept separately. The resulting label masks feed the same
+EarningsClassifier.decide rules (memoized per mask combination), so results are
+identical to EarningsClassifier.classify. Large batches can be spread over a
+process pool.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import or_
+
+from earnings_classifier_final import DOLLAR_AMOUNT, ClassificationResult, EarningsClassifier
+
+# Feature flag -> concept list it is computed from (see EarningsClassifier.extract_features)
+TERM_FEATURES = {
+    'has_earnings_term': 'earnings_explicit',
+    'has_performance': 'performance',
+    'has_temporal': 'temporal',
+    'has_financial': 'financial_metrics',
+    'has_guidance_term': 'guidance_terms',
+    'has_call_topic': 'call_topics',
+}
+LITERAL_FEATURES = {
+    'has_earnings_call': 'earnings call',
+    'has_stock': 'stock',
+}
+
+
+class _TokenMasks(dict):
+    """Token -> bit mask of the single-word terms it contains, filled on first lookup"""
+
+    def __init__(self, terms: List[Tuple[str, int]], max_size: int):
+        super().__init__()
+        self.terms = terms
+        self.max_size = max_size
+
+    def __missing__(self, token: str) -> int:
+        mask = 0
+        for term, bit in self.terms:
+            if term in token:
+                mask |= bit
+        if len(self) >= self.max_size:
+            self.clear()
+        self[token] = mask
+        return mask
+
+
+class ConceptMatcher:
+    """
+    Matches all concept vocabularies of an EarningsClassifier at once.
+
+    Every term is compiled into one table of label bits. A term without spaces
+    occurs in a text exactly when it occurs inside one of its whitespace-separated
+    tokens, so those terms are resolved per distinct token and memoized (news reuses
+    a small vocabulary); the few multi-word terms are checked directly.
+    """
+
+    def __init__(self, concepts: Dict, token_cache_size: int = 500000):
+        labels: List = []
+        masks: Dict[str, int] = {}
+
+        def add(term: str, label):
+            if label not in labels:
+                labels.append(label)
+            masks[term] = masks.get(term, 0) | (1 << labels.index(label))
+
+        for feature, concept in TERM_FEATURES.items():
+            for term in concepts[concept]:
+                add(term, feature)
+        for feature, term in LITERAL_FEATURES.items():
+            add(term, feature)
+        for term1, term2 in concepts['exclusion_topics']:
+            for term in (term1, term2):
+                if term:
+                    add(term, ('topic', term))
+
+        self.bits = {label: 1 << i for i, label in enumerate(labels)}
+        self.multi_word = [(term, mask) for term, mask in masks.items() if ' ' in term]
+        self.tokens = _TokenMasks([(term, mask) for term, mask in masks.items() if ' ' not in term],
+                                  token_cache_size)
+        self.exclusions = [(term1, self.bits[('topic', term1)], self.bits[('topic', term2)] if term2 else 0)
+                           for term1, term2 in concepts['exclusion_topics']]
+
+    def scan(self, title_lower: str, body_lower: str) -> Tuple[int, int]:
+        """Label masks of the title and of "title body" """
+        lookup = self.tokens.__getitem__
+        head = reduce(or_, map(lookup, title_lower.split()), 0)
+        full = reduce(or_, map(lookup, body_lower.split()), head)
+        if self.multi_word:
+            text = f"{title_lower} {body_lower}"
+            for term, mask in self.multi_word:
+                if term in text:
+                    full |= mask
+                    if term in title_lower:
+                        head |= mask
+        return head, full
+
+    def other_topic(self, mask: int) -> Optional[str]:
+        """First exclusion topic whose terms are all present"""
+        for term1, bit1, bit2 in self.exclusions:
+            if mask & bit1 and (not bit2 or mask & bit2):
+                return term1
+        return None
+
+    def features(self, mask: int, text: str) -> Dict:
+        """Feature dict in the shape of EarningsClassifier.extract_features"""
+        bits = self.bits
+        features = {feature: bool(mask & bits[feature]) for feature in TERM_FEATURES}
+        features['has_dollar_amount'] = bool(DOLLAR_AMOUNT.search(text))
+        for feature in LITERAL_FEATURES:
+            features[feature] = bool(mask & bits[feature])
+        topic = self.other_topic(mask)
+        features['is_other_topic'] = topic is not None
+        features['other_topic'] = topic
+        return features
+
+
+def news_text(news: Dict) -> Tuple[str, str]:
+    """(title, body) exactly as EarningsClassifier.classify reads them"""
+    return news.get('title', ''), news.get('body_preview', news.get('body', ''))[:300]
+
+
+class BatchEarningsClassifier:
+    """
+    Classifies whole batches with EarningsClassifier's rules and a ConceptMatcher.
+
+    Args:
+        classifier: Rule set and LLM threshold to use (default EarningsClassifier())
+    """
+
+    def __init__(self, classifier: Optional[EarningsClassifier] = None):
+        self.classifier = classifier or EarningsClassifier()
+        self.matcher = ConceptMatcher(self.classifier.concepts)
+        self._decisions: Dict[Tuple[int, int, bool], ClassificationResult] = {}
+
+    def extract_features(self, title: str, body: str) -> Tuple[Dict, Dict]:
+        """(title features, title+body features) from one scan"""
+        head, full = self.matcher.scan(title.lower(), body.lower())
+        return self.matcher.features(head, title), self.matcher.features(full, f"{title} {body}")
+
+    def classify_text(self, title: str, body: str = '') -> ClassificationResult:
+        head, full = self.matcher.scan(title.lower(), body.lower())
+        # decide only reads mask-derived features plus the title+body dollar amount
+        key = (head, full, bool(DOLLAR_AMOUNT.search(title) or DOLLAR_AMOUNT.search(body)))
+        decision = self._decisions.get(key)
+        if decision is None:
+            if len(self._decisions) >= 100000:
+                self._decisions.clear()
+            decision = self._decisions[key] = self.classifier.decide(*self.extract_features(title, body))
+        # fresh object: callers update results in place
+        return ClassificationResult(decision.is_earnings, decision.confidence, decision.method,
+                                    decision.reason, decision.needs_llm)
+
+    def classify(self, news: Dict) -> ClassificationResult:
+        return self.classify_text(*news_text(news))
+
+    def classify_batch(self, news_items: List[Dict], workers: int = 0,
+                       chunk_size: int = 5000) -> List[ClassificationResult]:
+        """
+        Classify news_items in order; workers > 1 spreads chunks of chunk_size
+        over a process pool (only worth it for tens of thousands of items)
+        """
+        texts = [news_text(item) for item in news_items]
+        if workers <= 1 or len(texts) <= chunk_size:
+            return [self.classify_text(title, body) for title, body in texts]
+
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results: List[ClassificationResult] = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.classifier.llm_threshold,)) as pool:
+            for chunk_results in pool.map(_classify_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def needs_llm(self, results: List[ClassificationResult]) -> List[int]:
+        """Indices of the results that should be verified by the LLM"""
+        return [i for i, result in enumerate(results) if self.classifier.should_use_llm(result)]
+
+
+_worker_classifier: Optional[BatchEarningsClassifier] = None
+
+
+def _init_worker(llm_threshold: float):
+    global _worker_classifier
+    _worker_classifier = BatchEarningsClassifier(EarningsClassifier(llm_threshold))
+
+
+def _classify_chunk(texts: List[Tuple[str, str]]) -> List[ClassificationResult]:
+    return [_worker_classifier.classify_text(title, body) for title, body in texts]
@@ -10,6 +10,9 @@ from dataclasses import dataclass
 from datetime import datetime
 import asyncio
 
+DOLLAR_AMOUNT = re.compile(r'\$[\d,]+(?:\.\d+)?[BMK]?\b')
+
+
 @dataclass
 class ClassificationResult:
     is_earnings: bool
@@ -54,6 +57,9 @@ class EarningsClassifier:
             'financial_metrics': [
                 'revenue', 'sales', 'profit', 'income', 'margin'
             ],
+            # Context terms used directly by the rules below
+            'guidance_terms': ['guidance', 'outlook', 'sees', 'expects'],
+            'call_topics': ['ai', 'technology', 'product', 'strategy'],
             'exclusion_topics': [
                 ('fda', 'approv'), ('clinical', 'trial'),
                 ('appoint', 'ceo'), ('appoint', 'cfo'),
@@ -74,7 +80,11 @@ class EarningsClassifier:
             'has_performance': any(term in text_lower for term in self.concepts['performance']),
             'has_temporal': any(term in text_lower for term in self.concepts['temporal']),
             'has_financial': any(term in text_lower for term in self.concepts['financial_metrics']),
-            'has_dollar_amount': bool(re.search(r'\$[\d,]+(?:\.\d+)?[BMK]?\b', text)),
+            'has_dollar_amount': bool(DOLLAR_AMOUNT.search(text)),
+            'has_guidance_term': any(term in text_lower for term in self.concepts['guidance_terms']),
+            'has_call_topic': any(term in text_lower for term in self.concepts['call_topics']),
+            'has_earnings_call': 'earnings call' in text_lower,
+            'has_stock': 'stock' in text_lower,
             'is_other_topic': False,
             'other_topic': None
         }
@@ -99,7 +109,13 @@ class EarningsClassifier:
         # Extract features
         title_features = self.extract_features(title)
         full_features = self.extract_features(f"{title} {body}")
-        
+        return self.decide(title_features, full_features)
+
+    def decide(self, title_features: Dict, full_features: Dict) -> ClassificationResult:
+        """
+        Apply the classification rules to title and title+body features
+        (shared by classify and the batch classifier)
+        """
         # Rule 1: Exclusion topics override everything
         if full_features['is_other_topic']:
             return ClassificationResult(
@@ -112,8 +128,8 @@ class EarningsClassifier:
         # Rule 2: Explicit earnings in title is strong signal
         if title_features['has_earnings_term']:
             # Edge case: "at earnings call" might not be about earnings
-            if 'earnings call' in title.lower() and not title_features['has_performance']:
-                if any(term in title.lower() for term in ['ai', 'technology', 'product', 'strategy']):
+            if title_features['has_earnings_call'] and not title_features['has_performance']:
+                if title_features['has_call_topic']:
                     return ClassificationResult(
                         is_earnings=False,
                         confidence=0.88,
@@ -147,7 +163,7 @@ class EarningsClassifier:
             )
         
         # Rule 4: Guidance/Outlook with financial context
-        if any(term in f"{title} {body}".lower() for term in ['guidance', 'outlook', 'sees', 'expects']):
+        if full_features['has_guidance_term']:
             if full_features['has_financial'] or full_features['has_dollar_amount']:
                 return ClassificationResult(
                     is_earnings=True,
@@ -157,7 +173,7 @@ class EarningsClassifier:
                 )
         
         # Rule 5: Performance with financial context
-        if full_features['has_performance'] and (full_features['has_financial'] or 'stock' in f"{title} {body}".lower()):
+        if full_features['has_performance'] and (full_features['has_financial'] or full_features['has_stock']):
             return ClassificationResult(
                 is_earnings=True,
                 confidence=0.86,
@@ -187,7 +203,9 @@ class EarningsClassificationService:
     """
     
     def __init__(self, neo4j_driver=None, redis_client=None, llm_client=None):
+        from earnings_classifier_batch import BatchEarningsClassifier
         self.classifier = EarningsClassifier()
+        self.batch_classifier = BatchEarningsClassifier(self.classifier)
         self.neo4j = neo4j_driver
         self.redis = redis_client
         self.llm = llm_client
@@ -223,34 +241,19 @@ class EarningsClassificationService:
             'classified_at': datetime.utcnow().isoformat()
         }
     
-    async def classify_batch(self, news_items: List[Dict]) -> Dict:
-        """Classify multiple news items efficiently"""
-        results = []
-        llm_needed = []
-        
+    async def classify_batch(self, news_items: List[Dict], workers: int = 0) -> Dict:
+        """Classify multiple news items efficiently (workers > 1: process pool for large batches)"""
         # First pass: rule-based classification
-        for item in news_items:
-            result = self.classifier.classify(item)
-            
-            if self.classifier.should_use_llm(result):
-                llm_needed.append((item, result))
-            
-            results.append({
-                'news_id': item.get('id'),
-                **result.to_dict()
-            })
+        classified = self.batch_classifier.classify_batch(news_items, workers=workers)
+        results = [{'news_id': item.get('id'), **result.to_dict()}
+                   for item, result in zip(news_items, classified)]
+        llm_needed = self.batch_classifier.needs_llm(classified)
         
-        # Second pass: LLM for low-confidence items
+        # Second pass: LLM for low-confidence items, merged back by position
         if llm_needed and self.llm:
-            llm_results = await self._batch_llm_classify([item for item, _ in llm_needed])
-            
-            # Update results with LLM classifications
-            for (item, original_result), llm_result in zip(llm_needed, llm_results):
-                # Find and update the result
-                for i, r in enumerate(results):
-                    if r['news_id'] == item.get('id'):
-                        results[i].update(llm_result)
-                        break
+            llm_results = await self._batch_llm_classify([news_items[i] for i in llm_needed])
+            for i, llm_result in zip(llm_needed, llm_results):
+                results[i].update(llm_result)
         
         # Store all results
         if self.neo4j:
@@ -0,0 +1,73 @@
+"""Parity tests for earnings_classifier_batch.py against the saved result CSVs and the scalar classifier."""
+import asyncio
+import csv
+import os
+import random
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from earnings_classifier_batch import BatchEarningsClassifier  # noqa: E402
+from earnings_classifier_final import EarningsClassificationService, EarningsClassifier  # noqa: E402
+
+
+def _rows(name):
+    with open(os.path.join(HERE, name)) as fh:
+        return list(csv.DictReader(fh))
+
+
+def test_batch_reproduces_saved_200_sample_results():
+    batch = BatchEarningsClassifier()
+    for name in ("final_classifier_200_results.csv", "earnings_classifier_final_test_results.csv"):
+        rows = _rows(name)
+        results = batch.classify_batch([{"title": row["title"]} for row in rows])
+        for row, result in zip(rows, results):
+            assert (str(result.is_earnings), result.confidence, result.method) == \
+                   (row["predicted"], float(row["confidence"]), row["method"]), row["title"]
+            assert str(batch.classifier.should_use_llm(result)) == row["needs_llm"]
+
+
+def test_features_match_scalar_on_random_text():
+    scalar = EarningsClassifier()
+    batch = BatchEarningsClassifier(scalar)
+    words = [t for terms in scalar.concepts.values() for t in terms if isinstance(t, str)]
+    words += [t for pair in scalar.concepts["exclusion_topics"] for t in pair if t]
+    words += ["earnings call", "stock", "$1.2B", "$5,", "said", "years", "İstanbul", "\t", "the"]
+    rng = random.Random(3)
+    titles = [row["title"] for row in _rows("final_classifier_200_results.csv")]
+
+    def text(n):
+        return "".join(rng.choice(words) + rng.choice([" ", "", ", ", "-"]) for _ in range(n))
+
+    for i in range(3000):
+        title = rng.choice(titles) if i % 2 else text(rng.randint(0, 8))
+        news = {"title": title, "body": text(rng.randint(0, 80))}
+        body = news["body"][:300]
+        assert batch.extract_features(title, body) == \
+               (scalar.extract_features(title), scalar.extract_features(f"{title} {body}"))
+        assert batch.classify(news) == scalar.classify(news)
+
+
+def test_pool_keeps_order_and_results_are_independent():
+    batch = BatchEarningsClassifier()
+    items = [{"title": row["title"]} for row in _rows("final_classifier_200_results.csv")] * 3
+    local = batch.classify_batch(items)
+    assert batch.classify_batch(items, workers=2, chunk_size=150) == local
+    local[0].method = "changed"
+    assert batch.classify(items[0]).method != "changed"
+
+
+def test_service_merges_llm_answers_by_position():
+    class FakeLLMService(EarningsClassificationService):
+        async def _batch_llm_classify(self, news_items):
+            return [{"is_earnings": True, "confidence": 0.99, "reason": f"llm {n['title']}"} for n in news_items]
+
+    items = [{"id": "dup", "title": "Apple Reports Q4 2023 Earnings Beat"},
+             {"id": "dup", "title": "Tesla Gross Margins Under Pressure"},
+             {"id": "x", "title": "Netflix Plans Ad-Tier Expansion"}]
+    out = asyncio.run(FakeLLMService(llm_client=object()).classify_batch(items))
+    assert out["llm_used"] == 2 and out["total"] == 3
+    assert [r["reason"] for r in out["results"]] == [
+        "Earnings explicitly mentioned", "llm Tesla Gross Margins Under Pressure",
+        "llm Netflix Plans Ad-Tier Expansion"]
@@ -14,6 +14,12 @@ from eventReturns.polygonClass import Polygon
 from eventtrader.keys import POLYGON_API_KEY
 from utils.metadata_fields import MetadataFields
 from eventReturns.EventReturnsManager import EventReturnsManager
+from eventReturns.price_tape import get_price_tape, returns_from_prices, LatencyWindow
+from eventReturns.return_store import (get_return_store, leg_rows, neo4j_event_id,
+                                       TIER_TAPE, TIER_REST, TIER_MIXED, TIER_BATCH)
+from config import feature_flags
+from utils.lifecycle_trace import trace_latency
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -21,13 +27,16 @@ from redisDB.redis_constants import RedisKeys
 
 class ReturnsProcessor:
     """Processor for calculating returns after news events"""
-    def __init__(self, event_trader_redis: EventTraderRedis, polygon_subscription_delay: int):
+    def __init__(self, event_trader_redis: EventTraderRedis, polygon_subscription_delay: int, price_tape=None,
+                 return_store=None):
         """
         Initialize the returns processor
         
         Args:
             event_trader_redis: EventTraderRedis instance
             polygon_subscription_delay: Delay for Polygon data subscription in seconds
+            price_tape: Optional PriceTape; defaults to the shared tape when ENABLE_PRICE_TAPE is set
+            return_store: Optional ReturnStore; defaults to the shared store when ENABLE_RETURN_STORE is set
         """
         self.event_trader_redis = event_trader_redis
         self.live_client = event_trader_redis.live_client
@@ -67,6 +76,16 @@ class ReturnsProcessor:
         self.event_returns_manager = EventReturnsManager(self.stock_universe, polygon_subscription_delay=self.polygon_subscription_delay)
         self.BATCH_SIZE = 100 
 
+        # Streaming price tape: live legs resolve from memory at horizon close (+settle);
+        # REST is only the fallback for prices the tape did not witness.
+        self.price_tape = price_tape if price_tape is not None else get_price_tape()
+        self.tape_settle_seconds = feature_flags.PRICE_TAPE_SETTLE_SECONDS
+        self.publication_latency = {rt: LatencyWindow() for rt in
+                                    [MetadataFields.HOURLY, MetadataFields.SESSION, MetadataFields.DAILY]}
+
+        # Columnar copy of every priced leg (prices + tier) for bulk repair / Neo4j sync
+        self.return_store = return_store if return_store is not None else get_return_store()
+
 
     def process_all_returns(self):
         """Main processing loop to handle returns calculation"""
@@ -195,13 +214,14 @@ class ReturnsProcessor:
                     orig_news, orig_key = original_news[event_return.event_id]
                     
                     # Calculate available returns (following live logic)
+                    news_id = orig_key.split(':')[-1]
                     returns_info = self._calculate_available_returns_batch(
                         orig_news,
-                        event_return.returns
+                        event_return.returns,
+                        event_id=news_id
                     )
                     
                     # Schedule any pending returns (using same function as live)
-                    news_id = orig_key.split(':')[-1]
                     self._schedule_pending_returns(news_id, orig_news)
 
                     # Update news with calculated returns
@@ -370,8 +390,8 @@ class ReturnsProcessor:
             item = json.loads(raw)
 
             # --------- immediate returns calculation -----------
-            returns_info = self._calculate_available_returns(item)
             item_id      = key.split(":")[-1]
+            returns_info = self._calculate_available_returns(item, event_id=item_id)
 
             # schedule any future returns (always, even if all_complete)
             self._schedule_pending_returns(item_id, item)
@@ -490,7 +510,7 @@ class ReturnsProcessor:
             return any(ReturnsProcessor._has_missing_leaves(v) for v in obj)
         return False
 
-    def _calculate_available_returns(self, processed_dict: dict) -> dict:
+    def _calculate_available_returns(self, processed_dict: dict, event_id: Optional[str] = None) -> dict:
         """Calculate returns based on available timestamps"""
         try:
             self.logger.info("Starting _calculate_available_returns")  # Add this line
@@ -535,19 +555,23 @@ class ReturnsProcessor:
                                 benchmarks = instrument['benchmarks']
                                 
                                 # 6. Calculate returns using Polygon
+                                legs = {}
                                 calc_returns = self.polygon.get_event_returns(
                                     ticker=symbol,
                                     sector_etf=benchmarks['sector'],
                                     industry_etf=benchmarks['industry'],
                                     event_timestamp=processed_dict['created'],
                                     return_type=return_type,
-                                    horizon_minutes=[60] if return_type == MetadataFields.HOURLY else None
+                                    horizon_minutes=[60] if return_type == MetadataFields.HOURLY else None,
+                                    prices_out=legs
                                 )
                                 
                                 # 7. Special handling for hourly returns
                                 if return_type == MetadataFields.HOURLY:
                                     calc_returns = {k: v[0] for k, v in calc_returns.items()}
                                     # calc_returns = {k: (v[0] if isinstance(v, (list, tuple)) and v else v) for k, v in calc_returns.items()}
+                                self._store_returns(event_id, processed_dict['created'], symbol, return_type,
+                                                    calc_returns, legs, TIER_REST)
 
                                 # 8. Store calculated returns
                                 return_field = MetadataFields.RETURN_TYPE_MAP[return_type]
@@ -582,7 +606,8 @@ class ReturnsProcessor:
 
 
 
-    def _calculate_available_returns_batch(self, news_dict: dict, batch_returns: dict) -> dict:
+    def _calculate_available_returns_batch(self, news_dict: dict, batch_returns: dict,
+                                           event_id: Optional[str] = None) -> dict:
         """Calculate returns based on available timestamps (batch version)"""
         try:
             # 1. Extract metadata and setup (same as live)
@@ -629,6 +654,8 @@ class ReturnsProcessor:
                                 calc_returns = batch_returns['symbols'][symbol].get(return_field)
                                 
                                 if calc_returns:
+                                    self._store_returns(event_id, news_dict.get('created'), symbol, return_type,
+                                                        calc_returns, None, TIER_BATCH)
                                     # returns_data['symbols'][symbol][return_field] = calc_returns
 
                                     # Round here to match live flow
@@ -666,7 +693,8 @@ class ReturnsProcessor:
 
 
 
-    def _calculate_symbol_returns(self, symbol: str, created: str, timefor_returns: dict, current_time: datetime) -> dict:
+    def _calculate_symbol_returns(self, symbol: str, created: str, timefor_returns: dict, current_time: datetime,
+                                  event_id: Optional[str] = None) -> dict:
         """Calculate returns for a single symbol"""
         symbol = symbol.strip().upper()
         sector_etf = self.get_etf(symbol, 'sector_etf')
@@ -695,19 +723,22 @@ class ReturnsProcessor:
             end_time_dt = parser.parse(end_time).astimezone(self.ny_tz)
             self.logger.info(f"{return_key}: End time = {end_time_dt}, Should calculate = {current_time >= end_time_dt}")
 
-            if current_time >= (end_time_dt + timedelta(seconds=self.polygon_subscription_delay)):
+            if self._leg_due(end_time_dt, current_time):
                 try:
-                    calc_returns = self.polygon.get_event_returns(
+                    legs = {}
+                    calc_returns = self._get_event_returns(
                         ticker=symbol,
                         sector_etf=sector_etf,
                         industry_etf=industry_etf,
                         event_timestamp=created,
                         return_type=return_type,
-                        horizon_minutes=horizon
+                        horizon_minutes=horizon,
+                        legs=legs
                     )
                     
                     if return_type == MetadataFields.HOURLY:
                         calc_returns = {k: v[0] for k, v in calc_returns.items()}
+                    self._store_returns(event_id, created, symbol, return_type, calc_returns, legs, TIER_REST)
 
                     
                     # returns[return_key] = {k: round(v, 2) for k, v in calc_returns.items()}
@@ -744,12 +775,15 @@ class ReturnsProcessor:
                     # self.logger.info(f"calc_time: {calc_time}")
                     # self.logger.info(f"current_time: {current_time}")
                     
-                    data_available_time = calc_time + self.polygon_subscription_delay
+                    data_available_time = calc_time + self._first_attempt_delay()
                     # self.logger.info(f"data_available_time: {data_available_time}")
                     pipe.zadd(self.pending_zset, {f"{news_id}:{return_type}": data_available_time})
                     # self.logger.info(f"Scheduled {return_type} for {datetime.fromtimestamp(data_available_time, self.ny_tz)}")
             
             pipe.execute()
+
+            if self.price_tape is not None:     # normally already subscribed by BaseProcessor._add_metadata
+                self.price_tape.ensure_event(processed_dict.get('metadata', {}))
             
         except Exception as e:
             self.logger.error(f"Failed to schedule returns: {e}", exc_info=True)
@@ -814,9 +848,18 @@ class ReturnsProcessor:
             if not news_data:  # Empty dict case
                 self.logger.info(f"Empty News Data")
                 return True
+
+            # Tape-scheduled legs fire at horizon close; if the tape can't price every point yet
+            # and REST data isn't out of its delay window, push the entry to when it will be.
+            if self.price_tape is not None:
+                retry_at = self._tape_retry_at(news_data, return_type)
+                if retry_at is not None:
+                    self.live_client.client.zadd(self.pending_zset,
+                                                 {f"{identifier}:{return_type}": retry_at}, xx=True)
+                    return False
             
             # 2. Calculates specific return
-            updated_returns = self._calculate_specific_return(news_data, return_type)
+            updated_returns = self._calculate_specific_return(news_data, return_type, event_id=identifier)
             if not updated_returns:
                 return False
 
@@ -865,6 +908,8 @@ class ReturnsProcessor:
 
             if success:
                 self._publish_news_update(namespace, identifier)
+                if return_complete:
+                    self._record_publication_latency(news_data, return_type, identifier)
             else:
                 self.logger.error("Redis pipeline failed while moving %s → %s", key, namespace)
 
@@ -904,7 +949,7 @@ class ReturnsProcessor:
             return False
         
 
-    def _calculate_specific_return(self, news_data: dict, return_type: str) -> dict:
+    def _calculate_specific_return(self, news_data: dict, return_type: str, event_id: Optional[str] = None) -> dict:
         """Calculate a specific return type for all symbols"""
         try:
             current_time = datetime.now(timezone.utc).astimezone(self.ny_tz)
@@ -932,7 +977,8 @@ class ReturnsProcessor:
                     symbol,
                     news_data['created'],
                     specific_schedule,
-                    current_time
+                    current_time,
+                    event_id=event_id
                 )
                 
                 # Use MetadataFields mapping for return keys
@@ -945,6 +991,113 @@ class ReturnsProcessor:
             return None
 
 
+    # ------------------------------------------------------------------
+    #  Streaming price tape helpers
+    # ------------------------------------------------------------------
+    def _first_attempt_delay(self) -> float:
+        """Seconds after a horizon closes before its first calculation attempt."""
+        return self.tape_settle_seconds if self.price_tape is not None else self.polygon_subscription_delay
+
+    def _leg_due(self, end_time_dt: datetime, current_time: datetime) -> bool:
+        return current_time >= end_time_dt + timedelta(seconds=self._first_attempt_delay())
+
+    def _price_points(self, points) -> dict:
+        """(ticker, ts) -> (price, tier) for every point answerable now: the tape first, then
+        REST get_last_trade for the rest once outside the subscription delay, fetched
+        concurrently on the Polygon executor (as get_returns_indexed does) rather than one by one."""
+        seen, rest = {}, []
+        now = time.time()
+        for ticker, ts in points:
+            epoch = ts.timestamp()
+            price = self.price_tape.price_at(ticker, epoch)
+            if price is not None:
+                seen[(ticker, ts)] = (price, TIER_TAPE)
+            elif epoch + self.polygon_subscription_delay <= now:
+                rest.append((ticker, ts))
+        futures = {point: self.polygon.executor.submit(self.polygon._get_price_worker, *point) for point in rest}
+        for (ticker, ts), future in futures.items():
+            try:
+                price = future.result(timeout=30)
+            except Exception as e:
+                self.logger.error(f"Error getting REST price for {ticker} at {ts}: {e}", exc_info=True)
+                price = np.nan
+            seen[(ticker, ts)] = (price, TIER_REST)
+        return seen
+
+    def _get_event_returns(self, ticker, sector_etf, industry_etf, event_timestamp, return_type,
+                           horizon_minutes=None, legs: Optional[dict] = None):
+        """Polygon.get_event_returns contract, priced from the tape where it can be.
+        legs, if given, is filled as Polygon.get_returns_indexed prices_out, plus a tier."""
+        if self.price_tape is None or not self.polygon.validate_ticker(ticker)[0]:
+            return self.polygon.get_event_returns(
+                ticker=ticker, sector_etf=sector_etf, industry_etf=industry_etf,
+                event_timestamp=event_timestamp, return_type=return_type, horizon_minutes=horizon_minutes,
+                prices_out=legs)
+        pairs = self.polygon.event_time_pairs(ticker, sector_etf, industry_etf, event_timestamp,
+                                              return_type, horizon_minutes)
+        seen = self._price_points({(t, ts) for _, t, start, end in pairs for ts in (start, end)})
+        returns = returns_from_prices(pairs, lambda t, ts: seen.get((t, ts), (None, None))[0])
+        if legs is not None:
+            for idx, t, start, end in pairs:
+                s_price, s_tier = seen.get((t, start), (None, None))
+                e_price, e_tier = seen.get((t, end), (None, None))
+                tiers = {s_tier, e_tier} - {None}
+                legs[idx] = (t, start, end, s_price, e_price,
+                             tiers.pop() if len(tiers) == 1 else (TIER_MIXED if tiers else TIER_REST))
+        return self.polygon.organize_event_returns(
+            {k: (np.nan if v != v else v) for k, v in returns.items()}, return_type, horizon_minutes)
+
+    def _tape_retry_at(self, news_data: dict, return_type: str) -> Optional[float]:
+        """None if every price point of this leg is answerable now (tape or REST);
+        else the epoch when REST will cover the latest unanswerable point."""
+        created = news_data.get('created')
+        now = time.time()
+        retry_at = None
+        horizon = [60] if return_type == MetadataFields.HOURLY else None
+        for instrument in news_data.get('metadata', {}).get(MetadataFields.INSTRUMENTS, []):
+            benchmarks = instrument.get('benchmarks') or {}
+            try:
+                pairs = self.polygon.event_time_pairs(instrument['symbol'], benchmarks.get('sector'),
+                                                      benchmarks.get('industry'), created, return_type, horizon)
+            except Exception:
+                return None                   # let the regular path surface the error
+            for _, ticker, start, end in pairs:
+                for ts in (start, end):
+                    epoch = ts.timestamp()
+                    rest_at = epoch + self.polygon_subscription_delay
+                    if rest_at <= now or self.price_tape.can_price(ticker, epoch):
+                        continue
+                    retry_at = max(retry_at or 0, rest_at)
+        return retry_at
+
+    def _record_publication_latency(self, news_data: dict, return_type: str, identifier: Optional[str] = None):
+        """Horizon close → return published, per return type (logged every 50 samples)."""
+        try:
+            schedule = news_data.get('metadata', {}).get(MetadataFields.RETURNS_SCHEDULE, {})
+            if not schedule.get(return_type):
+                return
+            closed_at = parser.parse(schedule[return_type]).timestamp()
+            latency = time.time() - closed_at
+            window = self.publication_latency[return_type]
+            window.record(latency)
+            trace_latency(self.source_type, f"return_{return_type}", latency, identifier)
+            if window.count % 50 == 0:
+                tape = self.price_tape.snapshot() if self.price_tape is not None else None
+                self.logger.info(f"[{self.source_type}] {return_type} publication latency "
+                                 f"{window.summary()} tape={tape}")
+        except Exception as e:
+            self.logger.debug(f"Publication latency not recorded: {e}")
+
+    def _store_returns(self, event_id, created, symbol, return_type, calc_returns, legs, tier):
+        """Append one event × symbol × horizon to the return store (never fails the caller)."""
+        if self.return_store is None or not event_id:
+            return
+        try:
+            self.return_store.record(leg_rows(self.source_type, neo4j_event_id(self.source_type, event_id),
+                                              created, symbol, return_type, calc_returns, legs, tier))
+        except Exception as e:
+            self.logger.warning(f"Return store write failed for {event_id}/{symbol}/{return_type}: {e}")
+
     def get_etf(self, ticker: str, col='industry_etf'):
         """Get sector or industry ETF for a ticker"""
         ticker = ticker.strip().upper()
@@ -961,6 +1114,11 @@ class ReturnsProcessor:
             self.pubsub_client.close()
         except Exception as e:
             self.logger.error(f"Error cleaning up pubsub: {e}", exc_info=True)
+        if self.return_store is not None:
+            try:
+                self.return_store.flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing return store: {e}", exc_info=True)
 
 
     # # Is this enough?
@@ -368,11 +368,13 @@ class Polygon:
 
     # Calculates Returns inside
     # Takes in a list of tuples with index, ticker, start_time, end_time and returns a dictionary with index and return value - from QC df Returns
-    def get_returns_indexed(self, index_ticker_times: List[Tuple[int, str, datetime, datetime]], pbar=None, debug: bool = False) -> Dict[int, float]:
+    def get_returns_indexed(self, index_ticker_times: List[Tuple[int, str, datetime, datetime]], pbar=None, debug: bool = False,
+                            prices_out: Optional[Dict[int, tuple]] = None) -> Dict[int, float]:
         
         """
         Get returns with index tracking using concurrent futures
         Args: index_ticker_times: List of (index, ticker, start_time, end_time)
+              prices_out: optional dict filled with index -> (ticker, start_time, end_time, start_price, end_price)
         Returns: Dict[index, return_value] """
 
         TIMEOUT = 30  # seconds
@@ -429,6 +431,8 @@ class Polygon:
         for idx, ticker, start_time, end_time in index_ticker_times:
             s_price = start_prices.get((idx, ticker))
             e_price = end_prices.get((idx, ticker))
+            if prices_out is not None:
+                prices_out[idx] = (ticker, start_time, end_time, s_price, e_price)
             
             if not (np.isnan(s_price) or np.isnan(e_price)):
                 ret = (e_price - s_price) / s_price * 100
@@ -561,13 +565,15 @@ class Polygon:
         event_timestamp: str,
         return_type: str,
         horizon_minutes: Optional[List[int]] = None,
-        debug: bool = False
+        debug: bool = False,
+        prices_out: Optional[Dict[int, tuple]] = None
     ) -> Dict[str, Union[float, List[float]]]:
         """
         Calculate returns for stock, sector ETF, industry ETF, and SPY based on event timestamp.
         Args:
             return_type: One of MetadataFields.SESSION, DAILY, or HOURLY
             horizon_minutes: Required for HOURLY returns, list of minutes for horizons
+            prices_out: Optional dict filled with the priced legs (see get_returns_indexed)
         Returns:
             Dictionary with keys: 'stock', 'sector', 'industry', 'macro'.
             For HOURLY returns, each value is a list corresponding to horizon_minutes.
@@ -588,6 +594,25 @@ class Polygon:
                 }
             return {k: np.nan for k in ['stock', 'sector', 'industry', 'macro']}
 
+        time_pairs = self.event_time_pairs(ticker, sector_etf, industry_etf, event_timestamp,
+                                           return_type, horizon_minutes)
+
+        # Calculate returns using concurrent execution
+        returns_dict = self.get_returns_indexed(time_pairs, debug=debug, prices_out=prices_out)
+        return self.organize_event_returns(returns_dict, return_type, horizon_minutes)
+
+
+    def event_time_pairs(
+        self,
+        ticker: str,
+        sector_etf: str,
+        industry_etf: str,
+        event_timestamp: str,
+        return_type: str,
+        horizon_minutes: Optional[List[int]] = None,
+    ) -> List[Tuple[int, str, datetime, datetime]]:
+        """(index, ticker, start_time, end_time) legs of one event return, in get_event_returns order.
+        Shared with the streaming price tape so both paths price exactly the same legs."""
         # Define asset order
         assets = [(0, ticker), (1, sector_etf), (2, industry_etf), (3, 'SPY')]
         
@@ -622,14 +647,19 @@ class Polygon:
         
         else:
             raise ValueError(f"return_type must be one of: {MetadataFields.SESSION}, {MetadataFields.DAILY}, {MetadataFields.HOURLY}")
-        
-        # Calculate returns using concurrent execution
-        returns_dict = self.get_returns_indexed(time_pairs, debug=debug)
-        
+
+        return time_pairs
+
+
+    @staticmethod
+    def organize_event_returns(returns_dict: Dict[int, float], return_type: str,
+                               horizon_minutes: Optional[List[int]] = None) -> Dict[str, Union[float, List[float]]]:
+        """Shape get_returns_indexed output into the get_event_returns contract."""
         # Organize results based on return type
         if return_type in [MetadataFields.SESSION, MetadataFields.DAILY]:
             return {asset: returns_dict.get(idx) for idx, asset in enumerate(['stock', 'sector', 'industry', 'macro'])}
         else:
+            horizon_minutes = horizon_minutes or [60]
             return {
                 asset: [returns_dict.get(i*4 + idx) for i in range(len(horizon_minutes))]
                 for idx, asset in enumerate(['stock', 'sector', 'industry', 'macro'])
@@ -0,0 +1,413 @@
+# price_tape.py
+"""
+Streaming price tape for live event returns.
+
+A TradeFeed pushes (symbol, epoch_seconds, price) trades; PriceTape folds them
+into per-symbol one-second bars (close of the last trade in each second) held
+in a rolling in-memory ring. ReturnsProcessor asks the tape for the price at a
+return leg's start/end the moment the horizon closes, and only falls back to
+Polygon REST (available polygon_subscription_delay later) for points the tape
+did not witness.
+
+Lookup semantics match Polygon.get_last_trade: the close of the latest
+second-bar whose start is <= the requested timestamp.
+
+Coverage is explicit: a symbol's answers are trusted only from the moment its
+subscription went live (covered_since). A feed reconnect calls on_reset(),
+which moves covered_since forward, so a gap can never be papered over with a
+stale price.
+
+IBKR accounts carry ~100 market-data lines (data/lse_massive_replacement/README.md),
+so the tape does not stream the whole universe at once: benchmark ETFs + SPY
+are pinned, and event symbols are subscribed on demand (ensure()) with LRU
+eviction beyond max_lines.
+"""
+import bisect
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dateutil import parser
+
+from utils.metadata_fields import MetadataFields
+
+logger = logging.getLogger(__name__)
+
+
+class TradeFeed:
+    """Interface for a live trade source (IBKR in production, ReplayTradeFeed locally)."""
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def unsubscribe(self, symbols: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def run(self, on_trade: Callable[[str, float, float], None],
+            on_reset: Callable[[Optional[str]], None]) -> None:
+        """Block, delivering trades until stop(). on_reset(None) = whole feed reconnected."""
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+
+class ReplayTradeFeed(TradeFeed):
+    """Local stand-in: replays recorded trades (list or JSONL of {symbol, t, price}).
+
+    speed=None delivers as fast as possible; speed=1.0 honours recorded gaps.
+    Only subscribed symbols are delivered, as with a real feed.
+    """
+
+    def __init__(self, trades, speed: Optional[float] = None):
+        if isinstance(trades, str):
+            with open(trades) as f:
+                trades = [json.loads(line) for line in f if line.strip()]
+        self.trades = [(t['symbol'], float(t['t']), float(t['price'])) if isinstance(t, dict) else t
+                       for t in trades]
+        self.speed = speed
+        self.subscribed = set()
+        self._stop = threading.Event()
+        self.done = threading.Event()
+
+    def subscribe(self, symbols):
+        self.subscribed.update(symbols)
+
+    def unsubscribe(self, symbols):
+        self.subscribed.difference_update(symbols)
+
+    def run(self, on_trade, on_reset):
+        prev = None
+        for symbol, t, price in self.trades:
+            if self._stop.is_set():
+                break
+            if self.speed and prev is not None and t > prev:
+                time.sleep((t - prev) / self.speed)
+            prev = t
+            if symbol in self.subscribed:
+                on_trade(symbol, t, price)
+        self.done.set()
+
+    def stop(self):
+        self._stop.set()
+
+
+class IBKRTradeFeed(TradeFeed):
+    """Last-trade stream over the existing IB Gateway connection (ib_async).
+
+    Uses reqMktData (one market-data line per symbol); `ticker.time` stamps
+    each update. A gateway disconnect resets coverage for every symbol.
+    """
+
+    def __init__(self, host: str, port: int, client_id: int = 31):
+        from ib_async import IB  # optional dependency: only needed when the IBKR feed is selected
+        self.ib = IB()
+        self.host, self.port, self.client_id = host, port, client_id
+        self._tickers = {}
+        self._lock = threading.Lock()
+        self._pending_sub, self._pending_unsub = set(), set()
+
+    def subscribe(self, symbols):
+        with self._lock:
+            self._pending_sub.update(symbols)
+            self._pending_unsub.difference_update(symbols)
+
+    def unsubscribe(self, symbols):
+        with self._lock:
+            self._pending_unsub.update(symbols)
+            self._pending_sub.difference_update(symbols)
+
+    def _apply_subscriptions(self):
+        from ib_async import Stock
+        with self._lock:
+            sub, unsub = self._pending_sub, self._pending_unsub
+            self._pending_sub, self._pending_unsub = set(), set()
+        for symbol in unsub:
+            ticker = self._tickers.pop(symbol, None)
+            if ticker is not None:
+                self.ib.cancelMktData(ticker.contract)
+        for symbol in sub - set(self._tickers):
+            self._tickers[symbol] = self.ib.reqMktData(Stock(symbol, 'SMART', 'USD'), '', False, False)
+
+    def run(self, on_trade, on_reset):
+        self._running = True
+        while self._running:
+            try:
+                self.ib.connect(self.host, self.port, clientId=self.client_id)
+                on_reset(None)
+                with self._lock:
+                    self._pending_sub.update(self._tickers)
+                self._tickers = {}
+                while self._running and self.ib.isConnected():
+                    self._apply_subscriptions()
+                    for ticker in self.ib.pendingTickers():
+                        last = ticker.last
+                        if last is None or last != last or ticker.time is None:
+                            continue
+                        on_trade(ticker.contract.symbol, ticker.time.timestamp(), float(last))
+                    self.ib.sleep(0.05)
+            except Exception as e:
+                logger.warning(f"IBKR trade feed error, reconnecting: {e}")
+                on_reset(None)
+                time.sleep(2)
+            finally:
+                try:
+                    self.ib.disconnect()
+                except Exception:
+                    pass
+
+    def stop(self):
+        self._running = False
+
+
+class _SecondBars:
+    """Append-only per-symbol second bars with head-offset eviction (O(1) amortised)."""
+
+    __slots__ = ('secs', 'closes', 'head')
+
+    def __init__(self):
+        self.secs: List[int] = []
+        self.closes: List[float] = []
+        self.head = 0
+
+    def add(self, sec: int, price: float):
+        if self.secs and sec <= self.secs[-1]:
+            if sec == self.secs[-1]:
+                self.closes[-1] = price          # same second: last trade is the close
+                return
+            # late/out-of-order print: insert in place (rare)
+            i = bisect.bisect_left(self.secs, sec, self.head)
+            if i < len(self.secs) and self.secs[i] == sec:
+                self.closes[i] = price
+            else:
+                self.secs.insert(i, sec)
+                self.closes.insert(i, price)
+            return
+        self.secs.append(sec)
+        self.closes.append(price)
+
+    def at(self, ts: float) -> Optional[Tuple[int, float]]:
+        i = bisect.bisect_right(self.secs, ts, self.head) - 1
+        if i < self.head:
+            return None
+        return self.secs[i], self.closes[i]
+
+    def evict_before(self, cutoff: float):
+        """Drop bars older than cutoff, keeping the newest of them as the price anchor."""
+        i = bisect.bisect_left(self.secs, cutoff, self.head) - 1
+        if i > self.head:
+            self.head = i
+        if self.head > 4096 and self.head * 2 > len(self.secs):
+            del self.secs[:self.head]
+            del self.closes[:self.head]
+            self.head = 0
+
+    def __len__(self):
+        return len(self.secs) - self.head
+
+
+class LatencyWindow:
+    """Rolling window of latency samples (seconds) with percentile summaries."""
+
+    def __init__(self, maxlen: int = 2000):
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {'n': 0}
+        s = sorted(self.samples)
+        pick = lambda q: s[min(len(s) - 1, int(len(s) * q))]
+        return {'n': len(s), 'p50': round(pick(0.5), 3), 'p95': round(pick(0.95), 3),
+                'p99': round(pick(0.99), 3), 'max': round(s[-1], 3)}
+
+
+class PriceTape:
+    """Rolling last-trade tape fed by a TradeFeed; answers price-at-timestamp from memory."""
+
+    def __init__(self, feed: TradeFeed, retention_seconds: int = 26 * 3600, max_lines: int = 95,
+                 pinned: Iterable[str] = (), clock: Callable[[], float] = time.time):
+        self.feed = feed
+        self.retention_seconds = retention_seconds
+        self.max_lines = max_lines
+        self.clock = clock
+        self._bars: Dict[str, _SecondBars] = {}
+        self._covered_since: Dict[str, float] = {}
+        self._pinned = set()
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._trades_since_evict = 0
+        self.stats = {'trades': 0, 'hits': 0, 'misses': 0, 'resets': 0, 'evicted_symbols': 0}
+        if pinned:
+            self.ensure(pinned, pinned=True)
+
+    # ---------------------------------------------------------------- feed side
+    def start(self):
+        """Run the feed on a daemon thread."""
+        self._thread = threading.Thread(target=self.feed.run, args=(self.on_trade, self.on_reset),
+                                        name='price-tape-feed', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.feed.stop()
+
+    def on_trade(self, symbol: str, ts: float, price: float):
+        if not price or price != price:
+            return
+        with self._lock:
+            bars = self._bars.get(symbol)
+            if bars is None:
+                return                        # not (or no longer) subscribed
+            bars.add(int(ts), price)
+            self.stats['trades'] += 1
+            self._trades_since_evict += 1
+            if self._trades_since_evict >= 10000:
+                self._evict_locked()
+
+    def on_reset(self, symbol: Optional[str] = None):
+        """Feed (or one symbol) reconnected: anything before now may have been missed."""
+        now = self.clock()
+        with self._lock:
+            targets = [symbol] if symbol else list(self._covered_since)
+            for s in targets:
+                if s in self._covered_since:
+                    self._covered_since[s] = now
+                    self._bars[s] = _SecondBars()
+            self.stats['resets'] += 1
+
+    def _evict_locked(self):
+        cutoff = self.clock() - self.retention_seconds
+        for bars in self._bars.values():
+            bars.evict_before(cutoff)
+        self._trades_since_evict = 0
+
+    # ------------------------------------------------------------- subscription
+    def ensure(self, symbols: Iterable[str], pinned: bool = False):
+        """Make sure symbols are streaming; evict least-recently-needed unpinned ones past max_lines."""
+        new, dropped = [], []
+        now = self.clock()
+        with self._lock:
+            for s in symbols:
+                if not s:
+                    continue
+                s = s.upper()
+                if pinned:
+                    self._pinned.add(s)
+                    self._lru.pop(s, None)
+                elif s not in self._pinned:
+                    self._lru[s] = None
+                    self._lru.move_to_end(s)
+                if s not in self._covered_since:
+                    self._covered_since[s] = now
+                    self._bars[s] = _SecondBars()
+                    new.append(s)
+            while self._lru and len(self._pinned) + len(self._lru) > self.max_lines:
+                s, _ = self._lru.popitem(last=False)
+                self._covered_since.pop(s, None)
+                self._bars.pop(s, None)
+                dropped.append(s)
+                self.stats['evicted_symbols'] += 1
+        if dropped:
+            self.feed.unsubscribe(dropped)
+        if new:
+            self.feed.subscribe(new)
+
+    def ensure_event(self, metadata: dict) -> bool:
+        """Subscribe an event's instruments (benchmarks pinned) while any of its horizons is still open.
+
+        Called when the event's returns schedule is written, so the tape is streaming
+        before the start leg rather than only by the time the horizon closes.
+        Historical items (every horizon already closed) are skipped: they would only
+        evict live symbols. Returns True if it subscribed.
+        """
+        schedule = (metadata or {}).get(MetadataFields.RETURNS_SCHEDULE) or {}
+        closes = [parser.parse(t).timestamp() for t in schedule.values() if t]
+        if not closes or max(closes) <= self.clock():
+            return False
+        instruments = metadata.get(MetadataFields.INSTRUMENTS) or []
+        self.ensure([i['symbol'] for i in instruments])
+        self.ensure([b for i in instruments for b in (i.get('benchmarks') or {}).values()], pinned=True)
+        return True
+
+    # ----------------------------------------------------------------- queries
+    def can_price(self, symbol: str, ts: float) -> bool:
+        """price_at(symbol, ts) would answer (no hit/miss accounting)."""
+        with self._lock:
+            since = self._covered_since.get(symbol)
+            if since is None or ts < since or ts > self.clock():
+                return False
+            return self._bars[symbol].at(ts) is not None
+
+    def price_at(self, symbol: str, ts: float) -> Optional[float]:
+        """Close of the latest second-bar starting <= ts, or None if the tape can't vouch for it."""
+        with self._lock:
+            since = self._covered_since.get(symbol)
+            if since is None or ts < since or ts > self.clock():
+                self.stats['misses'] += 1
+                return None
+            hit = self._bars[symbol].at(ts)
+            if hit is None:
+                self.stats['misses'] += 1     # no trade seen since coverage began
+                return None
+            self.stats['hits'] += 1
+            return hit[1]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, 'symbols': len(self._covered_since),
+                    'bars': sum(len(b) for b in self._bars.values())}
+
+
+def returns_from_prices(index_ticker_times, price_fn) -> Dict[int, float]:
+    """Same arithmetic as Polygon.get_returns_indexed, with prices from price_fn(ticker, ts)."""
+    out = {}
+    for idx, ticker, start_time, end_time in index_ticker_times:
+        s_price = price_fn(ticker, start_time)
+        e_price = price_fn(ticker, end_time)
+        if s_price is None or e_price is None or math.isnan(s_price) or math.isnan(e_price):
+            out[idx] = float('nan')
+        else:
+            out[idx] = (e_price - s_price) / s_price * 100
+    return out
+
+
+_tape_singleton = None
+_tape_lock = threading.Lock()
+
+
+def get_price_tape() -> Optional[PriceTape]:
+    """Process-wide tape shared by every ReturnsProcessor, or None when disabled.
+
+    PRICE_TAPE_FEED selects the feed: 'ibkr' (IBKR_GATEWAY_HOST/PORT) or
+    'replay:<path.jsonl>' for a local stand-in.
+    """
+    global _tape_singleton
+    from config import feature_flags
+    if not feature_flags.ENABLE_PRICE_TAPE:
+        return None
+    with _tape_lock:
+        if _tape_singleton is None:
+            import os
+            spec = os.getenv('PRICE_TAPE_FEED', 'ibkr')
+            if spec.startswith('replay:'):
+                feed = ReplayTradeFeed(spec.split(':', 1)[1], speed=1.0)
+            else:
+                feed = IBKRTradeFeed(os.getenv('IBKR_GATEWAY_HOST', '127.0.0.1'),
+                                     int(os.getenv('IBKR_GATEWAY_PORT', '4004')),
+                                     client_id=int(os.getenv('PRICE_TAPE_CLIENT_ID', '31')))
+            _tape_singleton = PriceTape(feed,
+                                        retention_seconds=feature_flags.PRICE_TAPE_RETENTION_SECONDS,
+                                        max_lines=feature_flags.PRICE_TAPE_MAX_LINES,
+                                        pinned=['SPY']).start()
+            logger.info(f"Price tape started (feed={spec})")
+        return _tape_singleton
@@ -0,0 +1,372 @@
+# return_store.py
+"""
+Columnar store of event returns (Parquet, partitioned by event date).
+
+One row per event × symbol × horizon × role, where role is the leg the return
+was priced on (stock, sector ETF, industry ETF, SPY as macro) — the same four
+legs Polygon.event_time_pairs produces and the same {horizon}_{role}
+properties the INFLUENCES / PRIMARY_FILER edges carry in Neo4j.
+
+    <root>/date=YYYY-MM-DD/part-<ms>-<rand>.parquet
+
+Files are append-only; a newer row for the same key supersedes an older one
+on read (written_at wins), so ReturnsProcessor can write a leg as soon as it
+is priced and a repair job can simply append its corrections. compact()
+folds a partition back to one file of latest rows.
+
+Everything downstream of read() is vectorized pandas: find_nulls,
+recompute_returns, adjusted_returns, and repair(), which fetches each
+distinct (instrument, timestamp) price point once no matter how many events
+share it (SPY and the sector ETFs dominate). sync_to_neo4j writes the result
+back with one UNWIND per batch instead of one query per relationship.
+
+event_id is always the Neo4j node id (see neo4j_event_id), so rows written
+live and rows seeded from the graph describe the same key.
+"""
+import glob
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ROLES = ('stock', 'sector', 'industry', 'macro')
+HORIZONS = ('hourly', 'session', 'daily')
+
+KEY_COLUMNS = ['source', 'event_id', 'symbol', 'horizon', 'role']
+COLUMNS = KEY_COLUMNS + ['event_time', 'event_date', 'instrument', 'start_time', 'end_time',
+                         'start_price', 'end_price', 'return_pct', 'tier', 'written_at']
+_TIME_COLUMNS = ['event_time', 'start_time', 'end_time']
+_FLOAT_COLUMNS = ['start_price', 'end_price', 'return_pct', 'written_at']
+
+# Data tiers: where a row's prices came from
+TIER_TAPE = 'tape'        # streaming price tape (both points)
+TIER_REST = 'rest'        # Polygon REST after the subscription delay
+TIER_MIXED = 'mixed'      # one point each
+TIER_BATCH = 'batch'      # EventReturnsManager historical batch (returns only)
+TIER_GRAPH = 'neo4j'      # seeded from existing relationship properties
+TIER_REPAIR = 'repair'    # filled in by repair()
+
+NEO4J_LABELS = {'news': 'News', 'reports': 'Report', 'transcripts': 'Transcript'}
+
+
+def neo4j_event_id(source: str, identifier: str) -> str:
+    """Redis item identifier → id of the node it becomes in Neo4j (see neograph/mixins)."""
+    if source == 'news':
+        return f"bzNews_{identifier.split('.')[0]}"
+    if source == 'reports':
+        return identifier[:20]
+    return identifier
+
+
+def leg_rows(source: str, event_id: str, event_time: str, symbol: str, horizon: str,
+             returns: Dict[str, Optional[float]], legs: Optional[Dict[int, tuple]] = None,
+             tier: str = TIER_REST, written_at: Optional[float] = None) -> List[dict]:
+    """Rows for one event × symbol × horizon.
+
+    returns is the get_event_returns dict ({role: value}, hourly already
+    flattened); legs, when known, maps the event_time_pairs index to
+    (instrument, start_time, end_time, start_price, end_price[, tier]).
+    """
+    written_at = time.time() if written_at is None else written_at
+    rows = []
+    for idx, role in enumerate(ROLES):
+        leg = (legs or {}).get(idx)
+        value = returns.get(role)
+        row = {
+            'source': source, 'event_id': event_id, 'symbol': symbol.upper(),
+            'horizon': horizon, 'role': role,
+            'event_time': event_time, 'event_date': str(event_time)[:10],
+            'instrument': None, 'start_time': None, 'end_time': None,
+            'start_price': None, 'end_price': None,
+            'return_pct': None if value is None or _isnan(value) else float(value),
+            'tier': tier, 'written_at': written_at,
+        }
+        if leg:
+            row.update(instrument=leg[0], start_time=leg[1], end_time=leg[2],
+                       start_price=leg[3], end_price=leg[4])
+            if len(leg) > 5 and leg[5]:
+                row['tier'] = leg[5]
+        rows.append(row)
+    return rows
+
+
+def _isnan(v) -> bool:
+    try:
+        return math.isnan(v)
+    except TypeError:
+        return False
+
+
+def to_frame(rows: Iterable[dict]) -> pd.DataFrame:
+    """Normalize rows (or a frame) to the store schema: UTC timestamps, float prices."""
+    df = pd.DataFrame(list(rows) if not isinstance(rows, pd.DataFrame) else rows)
+    df = df.reindex(columns=COLUMNS)
+    for col in _TIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col], utc=True, errors='coerce', format='mixed')
+    for col in _FLOAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    for col in ['source', 'event_id', 'symbol', 'horizon', 'role', 'event_date', 'instrument', 'tier']:
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df
+
+
+class ReturnStore:
+    """Append-only, date-partitioned Parquet store with a small write buffer.
+
+    record() is cheap and thread-safe; the buffer is flushed (one file per
+    touched partition) every flush_rows rows or flush_seconds, and on flush().
+    """
+
+    def __init__(self, root: str, flush_rows: int = 500, flush_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.time):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.clock = clock
+        self._buffer: List[dict] = []
+        self._last_flush = clock()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    # ---------------- writes ----------------
+    def record(self, rows: Iterable[dict]) -> None:
+        with self._lock:
+            self._buffer.extend(rows)
+            due = (len(self._buffer) >= self.flush_rows
+                   or self.clock() - self._last_flush >= self.flush_seconds)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._last_flush = self.clock()
+        if not rows:
+            return 0
+        try:
+            self.write(to_frame(rows))
+        except Exception:
+            with self._lock:                      # keep them for the next flush
+                self._buffer[:0] = rows
+            raise
+        return len(rows)
+
+    def write(self, df: pd.DataFrame) -> int:
+        """Append a frame (already in, or coercible to, the store schema)."""
+        if df is None or df.empty:
+            return 0
+        df = to_frame(df)
+        for date, part in df.groupby('event_date', dropna=False, sort=True):
+            self._write_file(self._partition_dir(date), part)
+        return len(df)
+
+    def _partition_dir(self, date) -> str:
+        return os.path.join(self.root, f"date={date if isinstance(date, str) and date else 'unknown'}")
+
+    def _write_file(self, directory: str, part: pd.DataFrame) -> str:
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        tmp = path + '.tmp'
+        part.to_parquet(tmp, index=False)
+        os.replace(tmp, path)                     # readers only glob *.parquet
+        return path
+
+    # ---------------- reads ----------------
+    def partitions(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Partition dates in [start, end] (YYYY-MM-DD, inclusive)."""
+        dates = sorted(os.path.basename(p)[5:] for p in glob.glob(os.path.join(self.root, 'date=*')))
+        return [d for d in dates if (start is None or d >= start) and (end is None or d <= end)]
+
+    def read(self, start: Optional[str] = None, end: Optional[str] = None,
+             sources: Optional[Iterable[str]] = None, latest: bool = True) -> pd.DataFrame:
+        files = [f for d in self.partitions(start, end)
+                 for f in sorted(glob.glob(os.path.join(self._partition_dir(d), '*.parquet')))]
+        if not files:
+            return to_frame([])
+        df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        if sources is not None:
+            df = df[df['source'].isin(list(sources))]
+        return latest_rows(df) if latest else df.reset_index(drop=True)
+
+    def compact(self, start: Optional[str] = None, end: Optional[str] = None) -> int:
+        """Rewrite each partition as a single file of latest rows. Returns partitions compacted."""
+        done = 0
+        for date in self.partitions(start, end):
+            directory = self._partition_dir(date)
+            files = sorted(glob.glob(os.path.join(directory, '*.parquet')))
+            if len(files) < 2:
+                continue
+            df = latest_rows(pd.concat([pd.read_parquet(f) for f in files], ignore_index=True))
+            self._write_file(directory, df)
+            for f in files:
+                os.remove(f)
+            done += 1
+        return done
+
+
+def latest_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per key: the most recently written."""
+    return (df.sort_values('written_at', kind='stable')
+              .drop_duplicates(KEY_COLUMNS, keep='last')
+              .sort_values(KEY_COLUMNS, kind='stable')
+              .reset_index(drop=True))
+
+
+# ---------------- vectorized analysis ----------------
+def find_nulls(df: pd.DataFrame, horizons: Optional[Iterable[str]] = None,
+               roles: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    mask = df['return_pct'].isna()
+    if horizons is not None:
+        mask &= df['horizon'].isin(list(horizons))
+    if roles is not None:
+        mask &= df['role'].isin(list(roles))
+    return df[mask]
+
+
+def recompute_returns(df: pd.DataFrame) -> pd.DataFrame:
+    """return_pct from start/end prices wherever both are known (same arithmetic as
+    Polygon.get_returns_indexed); rows without prices keep their stored value."""
+    out = df.copy()
+    s, e = out['start_price'], out['end_price']
+    ok = s.notna() & e.notna() & (s != 0)
+    out.loc[ok, 'return_pct'] = (e[ok] - s[ok]) / s[ok] * 100
+    return out
+
+
+def adjusted_returns(df: pd.DataFrame) -> pd.DataFrame:
+    """Wide frame per (source, event_id, symbol, horizon): raw role returns plus
+    stock minus each benchmark (adj_sector, adj_industry, adj_macro)."""
+    wide = (latest_rows(df).set_index(KEY_COLUMNS)['return_pct']
+            .unstack('role').reindex(columns=list(ROLES)))
+    for bench in ROLES[1:]:
+        wide[f'adj_{bench}'] = wide['stock'] - wide[bench]
+    wide.columns.name = None
+    return wide.reset_index()
+
+
+def repair(df: pd.DataFrame, price_fn: Callable, max_workers: int = 16) -> pd.DataFrame:
+    """Re-price null-return rows whose leg times are known.
+
+    price_fn(instrument, timestamp) -> price | None | nan (e.g. Polygon.get_last_trade).
+    Each distinct (instrument, timestamp) point is fetched once. Returns only the
+    rows that were attempted, re-tiered as 'repair' — write() them to supersede.
+    """
+    need = df[df['return_pct'].isna() & df['instrument'].notna()
+              & df['start_time'].notna() & df['end_time'].notna()]
+    if need.empty:
+        return need.copy()
+
+    points = pd.concat([
+        need.loc[need['start_price'].isna(), ['instrument', 'start_time']].set_axis(['instrument', 'ts'], axis=1),
+        need.loc[need['end_price'].isna(), ['instrument', 'end_time']].set_axis(['instrument', 'ts'], axis=1),
+    ]).drop_duplicates(ignore_index=True)
+
+    def fetch(point):
+        try:
+            price = price_fn(point[0], point[1].to_pydatetime())
+            return np.nan if price is None else float(price)
+        except Exception as e:
+            logger.warning(f"repair: no price for {point[0]} @ {point[1]}: {e}")
+            return np.nan
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        prices = list(pool.map(fetch, points.itertuples(index=False, name=None)))
+    points['price'] = prices
+    logger.info(f"repair: {len(need)} rows, {len(points)} distinct price points")
+
+    out = need.reset_index(drop=True)
+    for side in ('start', 'end'):
+        fill = points.rename(columns={'ts': f'{side}_time', 'price': f'_{side}'})
+        out = out.merge(fill, on=['instrument', f'{side}_time'], how='left')
+        out[f'{side}_price'] = out[f'{side}_price'].fillna(out.pop(f'_{side}'))
+    out = recompute_returns(out)
+    out['tier'] = TIER_REPAIR
+    out['written_at'] = time.time()
+    return out[COLUMNS]
+
+
+# ---------------- Neo4j sync ----------------
+_SYNC_COMPANY_Q = """
+UNWIND $rows AS row
+MATCH (e:{label} {{id: row.event_id}})-[r:INFLUENCES|PRIMARY_FILER]->(c:Company {{ticker: row.symbol}})
+SET r += row.company
+RETURN count(r) AS n
+"""
+
+_SYNC_BENCHMARK_Q = """
+UNWIND $rows AS row
+MATCH (e:{label} {{id: row.event_id}})-[r:INFLUENCES]->(t)
+WHERE r.symbol = row.symbol AND (t:Sector OR t:Industry OR t:MarketIndex)
+SET r += CASE WHEN t:Sector THEN row.sector WHEN t:Industry THEN row.industry ELSE row.macro END
+RETURN count(r) AS n
+"""
+
+
+def neo4j_rows(df: pd.DataFrame) -> Dict[str, List[dict]]:
+    """Group non-null returns into UNWIND rows per node label.
+
+    Company edges get every {horizon}_{role} property (as _prepare_entity_relationship_params
+    writes them); Sector / Industry / MarketIndex edges only their own role. Values are
+    rounded to 2 places like the live path. Nulls are left out so a sync never erases data.
+    """
+    d = df[df['return_pct'].notna() & df['source'].isin(list(NEO4J_LABELS))]
+    if d.empty:
+        return {}
+    d = d.assign(prop=d['horizon'] + '_' + d['role'], value=d['return_pct'].round(2))
+    out: Dict[str, List[dict]] = {}
+    for (source, event_id, symbol), g in d.groupby(['source', 'event_id', 'symbol'], sort=True):
+        props = dict(zip(g['prop'], g['value'].astype(float)))
+        row = {'event_id': event_id, 'symbol': symbol, 'company': props}
+        for role in ROLES[1:]:
+            row[role] = {k: v for k, v in props.items() if k.endswith(f'_{role}')}
+        out.setdefault(NEO4J_LABELS[source], []).append(row)
+    return out
+
+
+def sync_to_neo4j(manager, df: pd.DataFrame, batch_size: int = 2000, dry_run: bool = False) -> int:
+    """Write the frame's returns onto the graph's relationships, one UNWIND per batch.
+    Returns the number of relationships set (rows that would be sent, when dry_run)."""
+    total = 0
+    for label, rows in neo4j_rows(df).items():
+        if dry_run:
+            total += len(rows)
+            continue
+        company_q = _SYNC_COMPANY_Q.format(label=label)
+        bench_q = _SYNC_BENCHMARK_Q.format(label=label)
+        with manager.driver.session() as session:
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i:i + batch_size]
+                for query in (company_q, bench_q):
+                    total += session.execute_write(
+                        lambda tx, q=query: tx.run(q, rows=batch).single()['n'])
+        logger.info(f"sync_to_neo4j: {label} {len(rows)} event-symbols")
+    return total
+
+
+_store_singleton = None
+_store_lock = threading.Lock()
+
+
+def get_return_store() -> Optional[ReturnStore]:
+    """Process-wide store shared by every ReturnsProcessor, or None when disabled."""
+    global _store_singleton
+    from config import feature_flags
+    if not feature_flags.ENABLE_RETURN_STORE:
+        return None
+    with _store_lock:
+        if _store_singleton is None:
+            _store_singleton = ReturnStore(os.getenv('RETURN_STORE_DIR', feature_flags.RETURN_STORE_DIR),
+                                           flush_rows=feature_flags.RETURN_STORE_FLUSH_ROWS,
+                                           flush_seconds=feature_flags.RETURN_STORE_FLUSH_SECONDS)
+            logger.info(f"Return store at {_store_singleton.root}")
+        return _store_singleton
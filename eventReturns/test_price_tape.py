@@ -0,0 +1,106 @@
+"""Offline tests for eventReturns/price_tape.py (no IBKR, no Polygon, no Redis)."""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eventReturns.price_tape import (LatencyWindow, PriceTape, ReplayTradeFeed,
+                                     returns_from_prices)
+
+
+class _Clock:
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _tape(trades, **kw):
+    clock = _Clock(0.0)
+    feed = ReplayTradeFeed(trades)
+    tape = PriceTape(feed, clock=clock, **kw)
+    return tape, feed, clock
+
+
+def _replay(tape, feed, clock, now):
+    feed.run(tape.on_trade, tape.on_reset)
+    clock.t = now
+
+
+def test_price_at_matches_last_trade_semantics():
+    tape, feed, clock = _tape([('AAPL', 100.2, 10.0), ('AAPL', 100.9, 11.0),
+                               ('AAPL', 105.5, 12.0), ('SPY', 101.0, 500.0)])
+    tape.ensure(['AAPL', 'SPY'])
+    _replay(tape, feed, clock, 1_000.0)
+    assert tape.price_at('AAPL', 100.0) == 11.0   # bar 100 starts <= 100.0, last print closes it
+    assert tape.price_at('AAPL', 104.99) == 11.0
+    assert tape.price_at('AAPL', 105.0) == 12.0
+    assert tape.price_at('AAPL', 99.0) is None    # nothing witnessed before
+    assert tape.price_at('MSFT', 105.0) is None   # never subscribed
+    assert tape.price_at('AAPL', 5_000.0) is None  # the future
+    assert tape.snapshot()['hits'] == 3
+
+
+def test_coverage_starts_at_subscription_and_resets_on_reconnect():
+    tape, feed, clock = _tape([('AAPL', 50.0, 9.0), ('AAPL', 150.0, 10.0)])
+    clock.t = 100.0
+    tape.ensure(['AAPL'])
+    _replay(tape, feed, clock, 200.0)
+    assert tape.price_at('AAPL', 60.0) is None    # before covered_since
+    assert tape.price_at('AAPL', 160.0) == 10.0
+    tape.on_reset(None)
+    assert tape.price_at('AAPL', 160.0) is None   # gap: never answer across a reconnect
+    assert not tape.can_price('AAPL', 210.0)
+
+
+def test_lru_subscription_keeps_pinned_symbols():
+    tape, feed, clock = _tape([], max_lines=3, pinned=['SPY'])
+    tape.ensure(['AAA', 'BBB'])
+    tape.ensure(['AAA'])                          # refresh AAA
+    tape.ensure(['CCC'])                          # over budget -> evicts BBB, never SPY
+    assert feed.subscribed == {'SPY', 'AAA', 'CCC'}
+    assert tape.snapshot()['evicted_symbols'] == 1
+
+
+def test_ensure_event_subscribes_open_events_only():
+    tape, feed, clock = _tape([], pinned=['SPY'])
+    clock.t = 1_700_000_000.0                     # 2023-11-14T22:13:20Z
+    metadata = {'returns_schedule': {'hourly': '2023-11-14T23:13:00+00:00', 'session': '2023-11-14T21:00:00+00:00',
+                                     'daily': None},
+                'instruments': [{'symbol': 'aapl', 'benchmarks': {'sector': 'XLK', 'industry': 'SMH'}}]}
+    assert tape.ensure_event(metadata)
+    assert feed.subscribed == {'SPY', 'AAPL', 'XLK', 'SMH'} and tape._pinned == {'SPY', 'XLK', 'SMH'}
+
+    closed = dict(metadata, returns_schedule={'hourly': '2023-11-14T22:00:00+00:00'},
+                  instruments=[{'symbol': 'MSFT', 'benchmarks': {}}])
+    assert not tape.ensure_event(closed)          # backfill item: nothing left to witness
+    assert 'MSFT' not in feed.subscribed
+
+
+def test_eviction_keeps_anchor_bar():
+    tape, feed, clock = _tape([('AAPL', float(t), float(t)) for t in range(100, 200)],
+                              retention_seconds=50)
+    tape.ensure(['AAPL'])
+    _replay(tape, feed, clock, 250.0)
+    tape._evict_locked()
+    assert tape.price_at('AAPL', 199.5) == 199.0
+    assert tape.price_at('AAPL', 250.0) == 199.0  # anchor survives though older than cutoff
+    assert tape.price_at('AAPL', 150.0) is None
+
+
+def test_returns_from_prices_matches_rest_arithmetic():
+    prices = {('X', 1): 100.0, ('X', 2): 110.0, ('Y', 1): 50.0}
+    out = returns_from_prices([(0, 'X', 1, 2), (1, 'Y', 1, 2)], lambda t, ts: prices.get((t, ts)))
+    assert abs(out[0] - 10.0) < 1e-12
+    assert math.isnan(out[1])
+
+
+def test_latency_window_summary():
+    w = LatencyWindow(maxlen=100)
+    assert w.summary() == {'n': 0}
+    for i in range(1, 101):
+        w.record(i / 10)
+    s = w.summary()
+    assert s['n'] == 100 and s['max'] == 10.0 and s['p50'] == 5.1
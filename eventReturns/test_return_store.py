@@ -0,0 +1,149 @@
+"""Offline tests for eventReturns/return_store.py (local Parquet only; no Polygon, no Neo4j)."""
+import math
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from eventReturns import return_store as rs  # noqa: E402
+
+T0 = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+T1 = T0 + timedelta(hours=1)
+
+
+def _legs(instruments, s=None, e=None):
+    return {i: (tkr, T0, T1, s, e) for i, tkr in enumerate(instruments)}
+
+
+def _rows(event_id, symbol, returns, legs=None, created='2025-03-03T09:30:00-05:00', written_at=1.0):
+    return rs.leg_rows('news', event_id, created, symbol, 'hourly', returns, legs, written_at=written_at)
+
+
+def test_record_flush_read_latest_wins(tmp_path):
+    store = rs.ReturnStore(str(tmp_path), flush_rows=10_000, flush_seconds=1e9)
+    store.record(_rows('bzNews_1', 'aapl', {'stock': None, 'sector': 1.0, 'industry': 2.0, 'macro': 0.5}))
+    store.record(_rows('bzNews_2', 'MSFT', {'stock': 3.0}, created='2025-03-04T10:00:00-05:00'))
+    assert store.read().empty                      # still buffered
+    assert store.flush() == 8
+    store.record(_rows('bzNews_1', 'AAPL', {'stock': 4.2, 'sector': 1.0, 'industry': 2.0, 'macro': 0.5},
+                       written_at=2.0))
+    store.flush()
+
+    assert store.partitions() == ['2025-03-03', '2025-03-04']
+    df = store.read()
+    assert len(df) == 8
+    aapl = df[(df.event_id == 'bzNews_1') & (df.role == 'stock')]
+    assert aapl.return_pct.tolist() == [4.2]
+    assert len(store.read(latest=False)) == 12
+    assert len(store.read('2025-03-04')) == 4
+
+    assert store.compact() == 1
+    assert len(os.listdir(tmp_path / 'date=2025-03-03')) == 1
+    assert len(store.read(latest=False)) == 8
+
+
+def test_find_nulls_and_recompute():
+    df = rs.to_frame(_rows('bzNews_1', 'AAPL', {'stock': None, 'sector': 1.0},
+                           legs=_legs(['AAPL', 'XLK', 'IGV', 'SPY'], s=100.0, e=101.0)))
+    nulls = rs.find_nulls(df)
+    assert set(nulls.role) == {'stock', 'industry', 'macro'}
+    assert rs.find_nulls(df, roles=['stock']).role.tolist() == ['stock']
+    fixed = rs.recompute_returns(df)
+    assert fixed.return_pct.round(6).tolist() == [1.0] * 4
+
+
+def test_repair_fetches_each_point_once():
+    rows = (_rows('bzNews_1', 'AAPL', {}, legs=_legs(['AAPL', 'XLK', 'IGV', 'SPY']))
+            + _rows('bzNews_2', 'MSFT', {}, legs=_legs(['MSFT', 'XLK', 'IGV', 'SPY'])))
+    prices = {('AAPL', T0): 100.0, ('AAPL', T1): 110.0, ('SPY', T0): 50.0, ('SPY', T1): 51.0,
+              ('XLK', T0): 10.0, ('XLK', T1): 10.0, ('MSFT', T0): 200.0}
+    calls = []
+
+    def price_fn(ticker, ts):
+        calls.append((ticker, ts))
+        return prices.get((ticker, ts))
+
+    out = rs.repair(rs.to_frame(rows), price_fn, max_workers=4)
+    assert len(calls) == len(set(calls)) == 10     # 5 instruments x 2 points, SPY/XLK/IGV shared
+    assert set(out.tier) == {rs.TIER_REPAIR}
+    got = out.set_index(['event_id', 'role']).return_pct
+    assert got[('bzNews_1', 'stock')] == pytest.approx(10.0)
+    assert got[('bzNews_2', 'macro')] == pytest.approx(2.0)
+    assert got[('bzNews_2', 'sector')] == 0.0
+    assert math.isnan(got[('bzNews_2', 'stock')])  # end price missing
+    assert math.isnan(got[('bzNews_1', 'industry')])
+
+
+def test_adjusted_returns():
+    df = rs.to_frame(_rows('bzNews_1', 'AAPL', {'stock': 3.0, 'sector': 1.0, 'industry': None, 'macro': 0.5}))
+    wide = rs.adjusted_returns(df).iloc[0]
+    assert wide['adj_sector'] == 2.0 and wide['adj_macro'] == 2.5
+    assert math.isnan(wide['adj_industry'])
+
+
+def test_neo4j_rows_split_by_edge_and_skip_nulls():
+    df = rs.to_frame(_rows('bzNews_1', 'AAPL', {'stock': 3.14159, 'sector': 1.0, 'industry': None, 'macro': 0.5}))
+    rows = rs.neo4j_rows(df)
+    assert list(rows) == ['News']
+    row = rows['News'][0]
+    assert row['company'] == {'hourly_stock': 3.14, 'hourly_sector': 1.0, 'hourly_macro': 0.5}
+    assert row['sector'] == {'hourly_sector': 1.0}
+    assert row['industry'] == {}
+    assert row['macro'] == {'hourly_macro': 0.5}
+
+
+class _FakeTx:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, rows):
+        self.log.append((query, len(rows)))
+        return self
+
+    def single(self):
+        return {'n': self.log[-1][1]}
+
+
+class _FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn):
+        return fn(_FakeTx(self.log))
+
+
+class _FakeManager:
+    def __init__(self):
+        self.log = []
+        self.driver = self
+
+    def session(self):
+        return _FakeSession(self.log)
+
+
+def test_sync_batches_unwind_per_label():
+    rows = [r for i in range(5) for r in _rows(f'bzNews_{i}', 'AAPL', {'stock': float(i)})]
+    mgr = _FakeManager()
+    assert rs.sync_to_neo4j(mgr, rs.to_frame(rows), batch_size=2, dry_run=True) == 5
+    assert mgr.log == []
+    rs.sync_to_neo4j(mgr, rs.to_frame(rows), batch_size=2)
+    assert [n for _, n in mgr.log] == [2, 2, 2, 2, 1, 1]   # company + benchmark query per batch
+    assert all(':News {id: row.event_id}' in q for q, _ in mgr.log)
+
+
+def test_neo4j_event_id():
+    assert rs.neo4j_event_id('news', '12345.2025-03-03T09.30.00') == 'bzNews_12345'
+    assert rs.neo4j_event_id('reports', '0000320193-25-000010.2025-03-03T09.30.00') == '0000320193-25-000010'
+    assert rs.neo4j_event_id('transcripts', 'AAPL_2025-01-30T17.00') == 'AAPL_2025-01-30T17.00'
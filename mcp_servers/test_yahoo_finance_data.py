@@ -0,0 +1,238 @@
+"""Tests for yahoo_finance_data.py against a stubbed yfinance backend (no network)."""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from yahoo_finance_data import DiskCache, YahooFinanceData  # noqa: E402
+
+
+class FakeTicker:
+    def __init__(self, backend, symbol):
+        self.backend = backend
+        self.symbol = symbol
+
+    def _touch(self, what):
+        backend = self.backend
+        with backend.lock:
+            backend.fetches[(self.symbol, what)] += 1
+            backend.active[self.symbol] += 1
+            backend.peak[self.symbol] = max(backend.peak[self.symbol], backend.active[self.symbol])
+        try:
+            time.sleep(backend.delay)
+            if backend.fail:
+                raise RuntimeError(f"{what} unavailable")
+        finally:
+            with backend.lock:
+                backend.active[self.symbol] -= 1
+
+    @property
+    def fast_info(self):
+        self._touch("fast_info")
+        return SimpleNamespace(toJSON=lambda: json.dumps({"lastPrice": 101.5, "currency": "USD"}))
+
+    def history(self, period, interval):
+        self._touch(f"history:{period}:{interval}")
+        index = pd.DatetimeIndex(["2026-10-15", "2026-10-16"], name="Date")
+        return pd.DataFrame({"Close": [100.0, 101.5], "Volume": [10, 12]}, index=index)
+
+    def _statement(self, name):
+        self._touch(name)
+        return pd.DataFrame({pd.Timestamp("2025-12-31"): [10.0, 4.0]}, index=["Revenue", "NetIncome"])
+
+    income_stmt = property(lambda self: self._statement("income_stmt"))
+    balance_sheet = property(lambda self: self._statement("balance_sheet"))
+    cash_flow = property(lambda self: self._statement("cash_flow"))
+    quarterly_income_stmt = property(lambda self: self._statement("quarterly_income_stmt"))
+
+    @property
+    def earnings_estimate(self):
+        self._touch("earnings_estimate")
+        return pd.DataFrame({"avg": [1.2, 1.4]}, index=pd.Index(["0q", "+1q"], name="period"))
+
+    @property
+    def institutional_holders(self):
+        self._touch("institutional_holders")
+        return pd.DataFrame({"Holder": ["Vanguard"], "Shares": [1000]})
+
+
+class FakeYFinance:
+    """Module-like stub: Ticker(symbol), with fetch counters and per-symbol concurrency tracking"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fail = False
+        self.lock = threading.Lock()
+        self.fetches = Counter()
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.created = Counter()
+
+    def Ticker(self, symbol):
+        self.created[symbol] += 1
+        return FakeTicker(self, symbol)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _data(backend, tmp_path=None, **kwargs):
+    return YahooFinanceData(backend=backend, cache_path=str(tmp_path / "yf.sqlite") if tmp_path else None, **kwargs)
+
+
+def test_payloads_match_the_tool_output():
+    backend = FakeYFinance()
+    data = _data(backend)
+
+    async def run():
+        quote = await data.call("get_quote", "AAPL")
+        history = await data.call("get_price_history", "AAPL", period="5d", interval="1d")
+        statement = await data.call("get_financial_statement", "AAPL", statement="income", quarterly=True)
+        holders = await data.call("get_holder_info", "AAPL", holder_type="institutional")
+        estimate = await data.call("get_earnings_estimate", "AAPL")
+        with pytest.raises(ValueError, match="Unknown statement type: ratios. Use 'income'"):
+            await data.call("get_financial_statement", "AAPL", statement="ratios")
+        return quote, history, statement, holders, estimate
+
+    quote, history, statement, holders, estimate = asyncio.run(run())
+    assert quote == {"ticker": "AAPL", "quote": {"lastPrice": 101.5, "currency": "USD"}}
+    assert history["history"][1] == {"Date": "2026-10-16T00:00:00.000", "Close": 101.5, "Volume": 12}
+    assert (history["period"], history["interval"]) == ("5d", "1d")
+    assert statement["quarterly"] is True and statement["data"] == \
+        [{"index": "2025-12-31T00:00:00.000", "Revenue": 10.0, "NetIncome": 4.0}]
+    assert holders["holders"] == [{"index": 0, "Holder": "Vanguard", "Shares": 1000}]
+    assert estimate["earnings_estimate"] == [{"period": "0q", "avg": 1.2}, {"period": "+1q", "avg": 1.4}]
+    # only the requested statement is downloaded, and one Ticker object serves every call
+    assert backend.fetches[("AAPL", "quarterly_income_stmt")] == 1
+    assert backend.fetches[("AAPL", "income_stmt")] == backend.fetches[("AAPL", "balance_sheet")] == 0
+    assert backend.created["AAPL"] == 1
+    assert data.stats()["tools"]["get_financial_statement"]["errors"] == 1
+
+
+def test_ttl_policies_per_tool():
+    backend, clock = FakeYFinance(), Clock()
+    data = YahooFinanceData(backend=backend, clock=clock)
+
+    async def calls():
+        await data.call("get_quote", "MSFT")
+        await data.call("get_financial_statement", "MSFT", statement="balance")
+        await data.call("get_price_history", "MSFT", period="1d", interval="5m")
+
+    asyncio.run(calls())
+    clock.now += 30  # past the quote TTL, within the others
+    asyncio.run(calls())
+    assert backend.fetches[("MSFT", "fast_info")] == 2
+    assert backend.fetches[("MSFT", "balance_sheet")] == 1
+    assert backend.fetches[("MSFT", "history:1d:5m")] == 1
+    clock.now += 3600  # intraday history is good for a minute, statements for a day
+    asyncio.run(calls())
+    assert backend.fetches[("MSFT", "history:1d:5m")] == 2
+    assert backend.fetches[("MSFT", "balance_sheet")] == 1
+
+    stats = data.stats()["tools"]["get_financial_statement"]
+    assert (stats["calls"], stats["memory_hits"], stats["fetches"], stats["hit_rate"]) == (3, 2, 1, 0.6667)
+    assert set(stats["latency_ms"]) == {"p50", "p95", "max"} and "fetch_ms" in stats
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    backend = FakeYFinance(delay=0.05)
+    data = _data(backend)
+
+    async def burst():
+        return await asyncio.gather(*[data.call("get_earnings_estimate", "NVDA") for _ in range(20)])
+
+    results = asyncio.run(burst())
+    assert backend.fetches[("NVDA", "earnings_estimate")] == 1
+    assert all(r == results[0] for r in results)
+    stats = data.stats()["tools"]["get_earnings_estimate"]
+    assert (stats["fetches"], stats["coalesced"]) == (1, 19)
+
+    # an error reaches every waiter and is not cached
+    backend.fail = True
+    data = _data(backend)
+
+    async def failing():
+        return await asyncio.gather(*[data.call("get_quote", "NVDA") for _ in range(5)], return_exceptions=True)
+
+    errors = asyncio.run(failing())
+    assert all(isinstance(e, RuntimeError) for e in errors) and backend.fetches[("NVDA", "fast_info")] == 1
+    backend.fail = False
+    assert asyncio.run(data.call("get_quote", "NVDA"))["quote"]["lastPrice"] == 101.5
+    assert data.stats()["tools"]["get_quote"]["errors"] == 5 and data.stats()["in_flight"] == 0
+
+
+def test_per_ticker_concurrency_limit_does_not_block_other_tickers():
+    backend = FakeYFinance(delay=0.05)
+    data = _data(backend, per_ticker=2, max_concurrency=8)
+
+    async def run():
+        slow = [data.call("get_price_history", "TSLA", period=p) for p in ("1d", "5d", "1mo", "3mo", "6mo", "1y")]
+        started = time.perf_counter()
+        other = asyncio.ensure_future(data.call("get_quote", "AMD"))
+        await other
+        other_secs = time.perf_counter() - started
+        await asyncio.gather(*slow)
+        return other_secs
+
+    other_secs = asyncio.run(run())
+    assert backend.peak["TSLA"] == 2
+    assert other_secs < 0.15  # not queued behind the six TSLA fetches
+
+
+def test_disk_cache_survives_restart_and_is_bounded(tmp_path):
+    backend = FakeYFinance()
+    data = _data(backend, tmp_path)
+    first = asyncio.run(data.call("get_financial_statement", "AAPL", statement="cashflow"))
+    asyncio.run(data.call("get_quote", "AAPL"))
+    data.close()
+
+    restarted_backend = FakeYFinance()
+    data = _data(restarted_backend, tmp_path)
+    assert asyncio.run(data.call("get_financial_statement", "AAPL", statement="cashflow")) == first
+    asyncio.run(data.call("get_quote", "AAPL"))
+    assert restarted_backend.fetches[("AAPL", "cash_flow")] == 0
+    assert restarted_backend.fetches[("AAPL", "fast_info")] == 1  # quotes stay in memory only
+    assert data.stats()["tools"]["get_financial_statement"]["disk_hits"] == 1
+    data.close()
+
+    clock = Clock()
+    cache = DiskCache(str(tmp_path / "small.sqlite"), max_bytes=1000, clock=clock)
+    for i in range(8):
+        clock.now += 1
+        cache.put(f"k{i}", "get_news", clock.now + 60, {"blob": "x" * 180})
+        if i == 4:
+            clock.now += 1
+            assert cache.get("k0") is not None  # recently used: survives the next eviction
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.get("k0") is not None and cache.get("k7") is not None and cache.get("k1") is None
+    clock.now += 120
+    assert cache.get("k7") is None  # expired
+    cache.close()
+
+
+def test_ticker_case_shares_cache_and_fetch():
+    backend = FakeYFinance(delay=0.05)
+    data = _data(backend)
+
+    async def burst():
+        return await asyncio.gather(*[data.call("get_quote", t) for t in ("aapl", "AAPL", "Aapl")])
+
+    results = asyncio.run(burst())
+    assert all(r == {"ticker": "AAPL", "quote": {"lastPrice": 101.5, "currency": "USD"}} for r in results)
+    asyncio.run(data.call("get_quote", "aapl"))
+    assert backend.fetches[("AAPL", "fast_info")] == 1 and set(backend.created) == {"AAPL"}
@@ -0,0 +1,500 @@
+"""
+Data layer of the Yahoo Finance MCP server.
+
+Every tool of yahoo_finance_server.py is a fetcher here: (yf.Ticker, args) ->
+JSON-ready payload. YahooFinanceData.call() puts four things in front of it:
+
+  * per-tool TTL policies (seconds for quotes, a day for statements / holders);
+  * an in-memory LRU plus a bounded SQLite cache on disk that survives restarts
+    (quotes and other second-scale entries are kept in memory only);
+  * in-flight coalescing: concurrent identical calls wait on one fetch;
+  * an async path: fetches run in worker threads, at most `per_ticker` at a time
+    for one symbol and `max_concurrency` overall, so one slow call no longer
+    blocks the server.
+
+stats() reports calls, hit rate, coalesced calls, errors and latency per tool.
+The yfinance module is only the default backend: anything with a Ticker(symbol)
+factory works, which is how the tests run without network.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+
+def _df_to_json(df):
+    """Convert DataFrame with DatetimeIndex to JSON-serializable records."""
+    return json.loads(df.reset_index().to_json(orient="records", date_format="iso"))
+
+
+# ---------------------------------------------------------------------------
+# Fetchers: one per MCP tool, same payloads the tools used to build inline
+# ---------------------------------------------------------------------------
+
+def fetch_earnings_dates(t, ticker, limit=12):
+    df = t.get_earnings_dates(limit=limit)
+    if df is None or df.empty:
+        return {"ticker": ticker, "earnings_dates": []}
+    return {"ticker": ticker, "earnings_dates": _df_to_json(df)}
+
+
+def fetch_quote(t, ticker):
+    return {"ticker": ticker, "quote": json.loads(t.fast_info.toJSON())}
+
+
+def fetch_price_history(t, ticker, period="1mo", interval="1d"):
+    df = t.history(period=period, interval=interval)
+    if df is None or df.empty:
+        return {"ticker": ticker, "history": []}
+    return {"ticker": ticker, "period": period, "interval": interval, "history": _df_to_json(df)}
+
+
+def fetch_calendar(t, ticker):
+    cal = t.get_calendar()
+    if cal is None:
+        return {"ticker": ticker, "calendar": {}}
+    return {"ticker": ticker, "calendar": cal}
+
+
+def fetch_news(t, ticker):
+    news = t.news
+    if not news:
+        return {"ticker": ticker, "news": []}
+    return {"ticker": ticker, "news": news}
+
+
+def fetch_stock_info(t, ticker):
+    info = t.info
+    if not info:
+        return {"ticker": ticker, "info": {}}
+    return {"ticker": ticker, "info": info}
+
+
+def fetch_stock_actions(t, ticker):
+    actions = t.actions
+    if actions is None or actions.empty:
+        return {"ticker": ticker, "actions": []}
+    return {"ticker": ticker, "actions": _df_to_json(actions)}
+
+
+STATEMENTS = {
+    "income": ("income_stmt", "quarterly_income_stmt"),
+    "balance": ("balance_sheet", "quarterly_balance_sheet"),
+    "cashflow": ("cash_flow", "quarterly_cash_flow"),
+}
+
+
+def fetch_financial_statement(t, ticker, statement="income", quarterly=False):
+    # only the requested statement is downloaded (the tool used to load all three)
+    if statement not in STATEMENTS:
+        raise ValueError(f"Unknown statement type: {statement}. Use 'income', 'balance', or 'cashflow'.")
+    df = getattr(t, STATEMENTS[statement][1 if quarterly else 0])
+    if df is None:
+        raise ValueError(f"Unknown statement type: {statement}. Use 'income', 'balance', or 'cashflow'.")
+    if df.empty:
+        return {"ticker": ticker, "statement": statement, "data": []}
+    # Financial statements have dates as columns and line items as rows — transpose for readability
+    result = json.loads(df.T.reset_index().to_json(orient="records", date_format="iso"))
+    return {"ticker": ticker, "statement": statement, "quarterly": quarterly, "data": result}
+
+
+HOLDERS = {
+    "institutional": "institutional_holders",
+    "insider": "insider_transactions",
+    "mutualfund": "mutualfund_holders",
+    "major": "major_holders",
+}
+
+
+def fetch_holder_info(t, ticker, holder_type="institutional"):
+    df = getattr(t, HOLDERS[holder_type]) if holder_type in HOLDERS else None
+    if df is None:
+        raise ValueError(f"Unknown holder_type: {holder_type}. "
+                         f"Use 'institutional', 'insider', 'mutualfund', or 'major'.")
+    if df.empty:
+        return {"ticker": ticker, "holder_type": holder_type, "holders": []}
+    return {"ticker": ticker, "holder_type": holder_type, "holders": _df_to_json(df)}
+
+
+def fetch_option_expiration_dates(t, ticker):
+    return {"ticker": ticker, "expiration_dates": list(t.options)}
+
+
+def fetch_option_chain(t, ticker, expiration):
+    chain = t.option_chain(expiration)
+    return {"ticker": ticker, "expiration": expiration,
+            "calls": _df_to_json(chain.calls), "puts": _df_to_json(chain.puts)}
+
+
+def fetch_recommendations(t, ticker, include_upgrades=False):
+    rec = t.recommendations
+    result = {"ticker": ticker}
+    result["recommendations"] = _df_to_json(rec) if rec is not None and not rec.empty else []
+    if include_upgrades:
+        ud = t.upgrades_downgrades
+        # Limit to last 50 to avoid huge responses
+        result["upgrades_downgrades"] = _df_to_json(ud.head(50)) if ud is not None and not ud.empty else []
+    return result
+
+
+def fetch_analyst_price_targets(t, ticker):
+    targets = t.analyst_price_targets
+    if not targets:
+        return {"ticker": ticker, "price_targets": {}}
+    return {"ticker": ticker, "price_targets": targets}
+
+
+def _frame_fetcher(attribute, key):
+    def fetch(t, ticker):
+        df = getattr(t, attribute)
+        if df is None or df.empty:
+            return {"ticker": ticker, key: []}
+        return {"ticker": ticker, key: _df_to_json(df)}
+    fetch.__name__ = f"fetch_{key}"
+    return fetch
+
+
+def fetch_sec_filings(t, ticker):
+    filings = t.sec_filings
+    if not filings:
+        return {"ticker": ticker, "sec_filings": []}
+    return {"ticker": ticker, "sec_filings": filings}
+
+
+def _history_ttl(kwargs):
+    return MINUTE if kwargs.get("interval", "1d") in INTRADAY_INTERVALS else HOUR
+
+
+@dataclass
+class Policy:
+    """How long a tool's answer stays fresh; persist=False keeps it out of the disk cache"""
+    fetch: Callable
+    ttl: Union[float, Callable[[Dict], float]]
+    persist: bool = True
+
+    def ttl_for(self, kwargs: Dict) -> float:
+        return self.ttl(kwargs) if callable(self.ttl) else self.ttl
+
+
+POLICIES: Dict[str, Policy] = {
+    "get_quote": Policy(fetch_quote, 15, persist=False),
+    "get_option_chain": Policy(fetch_option_chain, MINUTE, persist=False),
+    "get_price_history": Policy(fetch_price_history, _history_ttl),
+    "get_news": Policy(fetch_news, 5 * MINUTE),
+    "get_option_expiration_dates": Policy(fetch_option_expiration_dates, HOUR),
+    "get_earnings_dates": Policy(fetch_earnings_dates, 6 * HOUR),
+    "get_calendar": Policy(fetch_calendar, 6 * HOUR),
+    "get_stock_info": Policy(fetch_stock_info, 6 * HOUR),
+    "get_recommendations": Policy(fetch_recommendations, 6 * HOUR),
+    "get_analyst_price_targets": Policy(fetch_analyst_price_targets, 6 * HOUR),
+    "get_earnings_estimate": Policy(_frame_fetcher("earnings_estimate", "earnings_estimate"), 6 * HOUR),
+    "get_revenue_estimate": Policy(_frame_fetcher("revenue_estimate", "revenue_estimate"), 6 * HOUR),
+    "get_eps_trend": Policy(_frame_fetcher("eps_trend", "eps_trend"), 6 * HOUR),
+    "get_growth_estimates": Policy(_frame_fetcher("growth_estimates", "growth_estimates"), 6 * HOUR),
+    "get_sec_filings": Policy(fetch_sec_filings, 6 * HOUR),
+    "get_earnings_history": Policy(_frame_fetcher("earnings_history", "earnings_history"), DAY),
+    "get_stock_actions": Policy(fetch_stock_actions, DAY),
+    "get_financial_statement": Policy(fetch_financial_statement, DAY),
+    "get_holder_info": Policy(fetch_holder_info, DAY),
+    "get_insider_roster": Policy(_frame_fetcher("insider_roster_holders", "insider_roster"), DAY),
+}
+
+
+# ---------------------------------------------------------------------------
+# Caches
+# ---------------------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed);
+"""
+
+
+class DiskCache:
+    """SQLite cache bounded to max_bytes of payload; evicts expired, then least recently used entries.
+    One instance may be shared across threads."""
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")      # rebuildable cache: favour write speed
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """(expires, payload) of a fresh entry"""
+        now = self.clock()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT expires, payload FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] <= now:
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, tool: str, expires: float, payload: Any):
+        blob = json.dumps(payload)
+        if len(blob) > self.max_bytes:
+            return
+        now = self.clock()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, tool, expires, now, len(blob), blob))
+            self._bytes += len(blob) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Down to 90% of max_bytes (caller holds the lock)"""
+        target = self.max_bytes * 0.9
+        self._conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self._bytes <= target:
+            return
+        doomed, freed = [], 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            doomed.append((key,))
+            freed += size
+            if self._bytes - freed <= target:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self._bytes -= freed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"path": self.path, "entries": entries, "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+class _MemoryCache:
+    """LRU of key -> (expires, payload)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, expires: float, payload: Any):
+        with self._lock:
+            self._entries[key] = (expires, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _ToolStats:
+    def __init__(self, window: int = 512):
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.latency_ms: deque = deque(maxlen=window)
+        self.fetch_ms: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def incr(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def summary(self) -> Dict:
+        calls = self.counts["calls"]
+        hits = self.counts["memory_hits"] + self.counts["disk_hits"]
+        out = dict(self.counts)
+        out["hit_rate"] = round(hits / calls, 4) if calls else 0.0
+        out["coalesced_rate"] = round(self.counts["coalesced"] / calls, 4) if calls else 0.0
+        for name, samples in (("latency_ms", self.latency_ms), ("fetch_ms", self.fetch_ms)):
+            ordered = sorted(samples)
+            if ordered:
+                out[name] = {"p50": round(ordered[len(ordered) // 2], 2),
+                             "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                             "max": round(ordered[-1], 2)}
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Data layer
+# ---------------------------------------------------------------------------
+
+class YahooFinanceData:
+    """
+    Cached, coalesced, concurrency-limited access to the tool fetchers.
+
+    Args:
+        backend: Module-like object with Ticker(symbol) (default: yfinance, imported lazily)
+        cache_path: SQLite file for the disk cache (None = memory only)
+        cache_max_bytes: Payload bytes the disk cache may hold
+        memory_entries: Size of the in-memory LRU
+        per_ticker: Concurrent fetches for one symbol
+        max_concurrency: Concurrent fetches overall
+        policies: Tool name -> Policy (default POLICIES)
+    """
+
+    def __init__(self, backend=None, cache_path: Optional[str] = None, cache_max_bytes: int = 256 * 1024 * 1024,
+                 memory_entries: int = 512, per_ticker: int = 2, max_concurrency: int = 8,
+                 policies: Optional[Dict[str, Policy]] = None, clock: Callable[[], float] = time.time):
+        self._backend = backend
+        self.policies = policies or POLICIES
+        self.clock = clock
+        self.per_ticker = max(1, per_ticker)
+        self.max_concurrency = max(1, max_concurrency)
+        self.memory = _MemoryCache(memory_entries)
+        self.disk = DiskCache(cache_path, cache_max_bytes, clock) if cache_path else None
+        self._tickers: "OrderedDict[str, Any]" = OrderedDict()
+        self._tickers_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._gates: Dict[str, list] = {}
+        self._limit: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self._stats: Dict[str, _ToolStats] = defaultdict(_ToolStats)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            import yfinance
+            self._backend = yfinance
+        return self._backend
+
+    def close(self):
+        if self.disk:
+            self.disk.close()
+
+    @staticmethod
+    def cache_key(tool: str, ticker: str, kwargs: Dict) -> str:
+        return json.dumps([tool, ticker, sorted(kwargs.items())], default=str)
+
+    def _ticker(self, symbol: str):
+        """Reused yf.Ticker objects (they keep their own session and lazily loaded data)"""
+        key = symbol.upper()
+        with self._tickers_lock:
+            t = self._tickers.get(key)
+            if t is not None:
+                self._tickers.move_to_end(key)
+                return t
+        t = self.backend.Ticker(symbol)
+        with self._tickers_lock:
+            self._tickers[key] = t
+            while len(self._tickers) > 256:
+                self._tickers.popitem(last=False)
+        return t
+
+    # -- concurrency -----------------------------------------------------
+    def _global_limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._limit is None or self._limit[0] is not loop:
+            self._limit = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._limit[1]
+
+    async def _gated(self, ticker: str, fn, *args):
+        symbol = ticker.upper()
+        gate = self._gates.get(symbol)
+        if gate is None:
+            gate = self._gates[symbol] = [asyncio.Semaphore(self.per_ticker), 0]
+        gate[1] += 1
+        try:
+            async with gate[0], self._global_limit():
+                return await asyncio.to_thread(fn, *args)
+        finally:
+            gate[1] -= 1
+            if gate[1] == 0:
+                del self._gates[symbol]
+
+    # -- calls -----------------------------------------------------------
+    def _load(self, tool: str, ticker: str, kwargs: Dict, key: str, stats: _ToolStats):
+        """Worker thread: disk cache, else the backend"""
+        policy = self.policies[tool]
+        if self.disk and policy.persist:
+            cached = self.disk.get(key)
+            if cached is not None:
+                self.memory.put(key, cached[0], cached[1])
+                stats.incr("disk_hits")
+                return cached[1]
+        started = time.perf_counter()
+        raw = policy.fetch(self._ticker(ticker), ticker, **kwargs)
+        stats.fetch_ms.append((time.perf_counter() - started) * 1000)
+        stats.incr("fetches")
+        payload = json.loads(json.dumps(raw, default=str))  # what the tool returns; also what is stored
+        expires = self.clock() + policy.ttl_for(kwargs)
+        self.memory.put(key, expires, payload)
+        if self.disk and policy.persist:
+            self.disk.put(key, tool, expires, payload)
+        return payload
+
+    async def call(self, tool: str, ticker: str, **kwargs) -> Any:
+        """
+        JSON-ready payload of tool(ticker, **kwargs), shared with other callers:
+        treat it as read-only. Errors are raised to every waiting caller and never cached.
+        """
+        if tool not in self.policies:
+            raise KeyError(f"Unknown tool: {tool}")
+        stats = self._stats[tool]
+        stats.incr("calls")
+        started = time.perf_counter()
+        ticker = ticker.upper()  # "aapl" and "AAPL" share the cache entry, the in-flight fetch and the Ticker
+        key = self.cache_key(tool, ticker, kwargs)
+        try:
+            payload = self.memory.get(key, self.clock())
+            if payload is not None:
+                stats.incr("memory_hits")
+                return payload
+            task = self._inflight.get(key)
+            if task is None:
+                # a task, so the fetch (and its cache write) outlives a cancelled first caller
+                task = asyncio.ensure_future(self._gated(ticker, self._load, tool, ticker, kwargs, key, stats))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._settled(key, done))
+            else:
+                stats.incr("coalesced")
+            return await asyncio.shield(task)
+        except Exception:
+            stats.incr("errors")
+            raise
+        finally:
+            stats.latency_ms.append((time.perf_counter() - started) * 1000)
+
+    def _settled(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even when every caller was cancelled
+
+    def stats(self) -> Dict:
+        tools = {tool: s.summary() for tool, s in sorted(self._stats.items())}
+        calls = sum(s.counts["calls"] for s in self._stats.values())
+        hits = sum(s.counts["memory_hits"] + s.counts["disk_hits"] for s in self._stats.values())
+        return {"calls": calls, "hit_rate": round(hits / calls, 4) if calls else 0.0,
+                "in_flight": len(self._inflight), "memory_entries": len(self.memory),
+                "disk": self.disk.stats() if self.disk else None, "tools": tools}
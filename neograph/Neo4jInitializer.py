@@ -191,14 +191,18 @@ class Neo4jInitializer:
             # 7. Create exhibit section hierarchy
             # self.create_exhibit_sections()
             
-            # 8. Create date nodes and relationships
-            self.create_dates(start_date=start_date)
+            if feature_flags.ENABLE_GRAPH_BOOTSTRAP_ENGINE:
+                # 8-10. Dates, prices, dividends and splits via the resumable bulk engine
+                self.bootstrap_graph(start_date=start_date)
+            else:
+                # 8. Create date nodes and relationships
+                self.create_dates(start_date=start_date)
 
-            # 9. Create dividend nodes and relationships
-            self.create_dividends(start_date=start_date)
+                # 9. Create dividend nodes and relationships
+                self.create_dividends(start_date=start_date)
 
-            # 10. Create split nodes and relationships
-            self.create_splits(start_date=start_date)
+                # 10. Create split nodes and relationships
+                self.create_splits(start_date=start_date)
             
             logger.info("Market hierarchy initialization complete")
             return True
@@ -1031,6 +1035,77 @@ class Neo4jInitializer:
             logger.error(f"Error creating single date node: {e}", exc_info=True)
             return False
 
+    def _get_price_entities(self) -> Dict[str, Tuple[str, str]]:
+        """{symbol: (entity_id, entity_type)} for every price-bearing node in self.all_symbols."""
+        # Use UNION to properly match different node types with correct properties
+        entity_query = """
+        MATCH (e:Company) 
+        WHERE e.ticker IN $symbols
+        RETURN e.id as id, e.ticker as ticker, 'Company' as type
+        UNION
+        MATCH (e:Sector) 
+        WHERE e.etf IN $symbols
+        RETURN e.id as id, e.etf as ticker, 'Sector' as type
+        UNION
+        MATCH (e:Industry) 
+        WHERE e.etf IN $symbols
+        RETURN e.id as id, e.etf as ticker, 'Industry' as type
+        UNION
+        MATCH (e:MarketIndex) 
+        WHERE e.id IN $symbols
+        RETURN e.id as id, e.id as ticker, 'MarketIndex' as type
+        """
+        
+        # Use session with explicit transaction to avoid deadlocks
+        with self.manager.driver.session() as session:
+            def get_entities_tx(tx):
+                result = tx.run(entity_query, {"symbols": self.all_symbols})
+                return [record.data() for record in result]
+                
+            entity_results = session.execute_read(get_entities_tx)
+        
+        return {r["ticker"]: (r["id"], r["type"] or "Company") for r in entity_results if r["ticker"]}
+
+    def bootstrap_graph(self, start_date=None) -> bool:
+        """
+        Date nodes, HAS_PRICE, dividends and splits through neograph.graph_bootstrap:
+        concurrent grouped-bar fetch into a local store, vectorized session metadata,
+        bulk UNWIND loads, resumable from the store manifest after an interruption.
+        Replaces create_dates + create_dividends + create_splits when
+        ENABLE_GRAPH_BOOTSTRAP_ENGINE is on.
+        """
+        from neograph.graph_bootstrap import BarStore, GraphBootstrap
+
+        try:
+            if start_date is None:
+                start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+            polygon_api_key = os.environ.get('POLYGON_API_KEY')
+            if not polygon_api_key:
+                logger.error("Missing POLYGON_API_KEY environment variable")
+                return False
+            polygon = Polygon(api_key=polygon_api_key, polygon_subscription_delay=0)
+            symbols = getattr(self, 'all_symbols', None) or []
+
+            engine = GraphBootstrap(
+                self.manager, polygon,
+                BarStore(feature_flags.GRAPH_BOOTSTRAP_DIR, symbols),
+                MarketSessionClassifier().calendar,
+                workers=feature_flags.GRAPH_BOOTSTRAP_FETCH_WORKERS,
+                batch_size=feature_flags.GRAPH_BOOTSTRAP_UNWIND_BATCH_SIZE)
+
+            date_nodes = engine.create_dates(start_date)
+            if symbols:
+                engine.load_prices(date_nodes, self._get_price_entities())
+            tickers = list(self.universe_data.keys()) if self.universe_data else []
+            if tickers:
+                engine.load_dividends(tickers, start_date)
+                engine.load_splits(tickers, start_date)
+            logger.info(f"Graph bootstrap complete: {engine.stats}")
+            return True
+        except Exception as e:
+            logger.error(f"Error during graph bootstrap: {e}", exc_info=True)
+            return False
+
     def add_price_relationships_to_dates(self, dates_by_id, skip_latest=True, batch_size=500):
         """
         Add HAS_PRICE relationships from Date nodes to entity nodes with Polygon API data.
@@ -1064,47 +1139,12 @@ class Neo4jInitializer:
             if skip_latest and len(sorted_dates) > 1:
                 sorted_dates = sorted_dates[:-1]
             
-            # Get all entity nodes with a single query using Neo4jManager
-            # Use UNION to properly match different node types with correct properties
-            entity_query = """
-            MATCH (e:Company) 
-            WHERE e.ticker IN $symbols
-            RETURN e.id as id, e.ticker as ticker, 'Company' as type
-            UNION
-            MATCH (e:Sector) 
-            WHERE e.etf IN $symbols
-            RETURN e.id as id, e.etf as ticker, 'Sector' as type
-            UNION
-            MATCH (e:Industry) 
-            WHERE e.etf IN $symbols
-            RETURN e.id as id, e.etf as ticker, 'Industry' as type
-            UNION
-            MATCH (e:MarketIndex) 
-            WHERE e.id IN $symbols
-            RETURN e.id as id, e.id as ticker, 'MarketIndex' as type
-            """
-            
-            # Use session with explicit transaction to avoid deadlocks
-            entity_results = []
-            with self.manager.driver.session() as session:
-                def get_entities_tx(tx):
-                    result = tx.run(entity_query, {"symbols": self.all_symbols})
-                    return [record.data() for record in result]
-                    
-                entity_results = session.execute_read(get_entities_tx)
-                
-            if not entity_results:
+            entities = self._get_price_entities()
+            if not entities:
                 logger.warning("No entity nodes found for price relationships")
                 return 0
-                
-            # Create ticker to (entity_id, entity_type) mapping
-            ticker_to_id = {}
-            ticker_to_type = {}
-            for r in entity_results:
-                ticker = r["ticker"]
-                if ticker:
-                    ticker_to_id[ticker] = r["id"]
-                    ticker_to_type[ticker] = r["type"]
+            ticker_to_id = {ticker: entity_id for ticker, (entity_id, _) in entities.items()}
+            ticker_to_type = {ticker: entity_type for ticker, (_, entity_type) in entities.items()}
             
             today = datetime.now().strftime('%Y-%m-%d')
             total_rels = 0
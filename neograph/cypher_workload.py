@@ -0,0 +1,997 @@
+"""
+Static Cypher workload analyzer and index-coverage checker.
+
+Every Cypher string in the tree is found without importing anything: Python
+files are parsed with ast (string constants, implicit / + concatenation,
+f-strings, .format and % templates, `query += ...` continuations) and .cypher
+files are split on ';'. Interpolated pieces that cannot be resolved to a string
+constant of the same module / function become `__DYN_<expr>__` placeholders, so
+`MATCH ({alias}:{label})` still parses, with a label that is marked unknown.
+
+The declared schema is collected from the same strings (CREATE INDEX /
+CONSTRAINT statements), from the XBRL NodeType enum (Neo4jManager.create_indexes
+puts a unique `id` constraint on every member) and from the fulltext index
+dicts of create_indexes / scripts/create_fulltext_indexes.py. Fulltext and
+vector indexes are listed but never count as MATCH anchors.
+
+Each MATCH / OPTIONAL MATCH / MERGE is split into connected components. A
+component is anchored when one of its nodes (or relationships) is already bound
+by an earlier clause, is looked up by id()/elementId(), or has an equality / IN /
+STARTS WITH / range predicate (inline map or WHERE conjunct) on an indexed
+property. Findings:
+
+  * unindexed_anchor   - filtered on Label.prop, but no index covers it
+  * label_scan         - only a label (or relationship type) to start from
+  * all_nodes_scan     - not even a label
+  * cartesian          - an unanchored component that is not connected to the
+                         rows already produced by the query
+  * unbounded_varlength - `*`, `*n..` or `*..` outside shortestPath
+
+Findings are ranked by call-site frequency: the references to the variable
+holding the query, times the call sites of the enclosing function across the
+tree (call sites of a name are divided among the functions sharing it), times
+10 when any of those is inside a loop or comprehension.
+
+neograph/cypher_workload_baseline.json records the findings that are accepted
+today; test_cypher_workload.py fails on anything new, so a query added without
+an index (or a new unbounded expansion) is caught in the test suite.
+
+Usage:
+    python -m neograph.cypher_workload                  # ranked report
+    python -m neograph.cypher_workload --json --top 0
+    python -m neograph.cypher_workload --check          # exit 1 on new findings
+    python -m neograph.cypher_workload --write-baseline
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cypher_workload_baseline.json")
+
+# Not workload: tests, fixtures, vendored and archived code (dot-directories are skipped too)
+EXCLUDED_DIRS = {"archive", "node_modules", "__pycache__", "venv", "site-packages", "tests", "fixtures"}
+LOOP_WEIGHT = 10
+# Neo4jManager.create_indexes: one `REQUIRE n.id IS UNIQUE` per XBRL NodeType member
+NODE_TYPE_MODULE = os.path.join("XBRL", "xbrl_core.py")
+
+KINDS = ("cartesian", "all_nodes_scan", "unindexed_anchor", "label_scan", "unbounded_varlength")
+
+DYN = re.compile(r"__DYN_\w*?__")
+_OPAQUE = re.compile(r"(?<![.\w])__DYN_")  # a whole interpolated expression, not just a property name
+_QUERY = re.compile(r"(?<![\w.])(?:OPTIONAL\s+MATCH|MATCH|MERGE)\s+(?:\w+\s*=\s*)?(?:\w+\s*\(\s*)?\(\s*[\w`]*\s*[:){]",
+                    re.I)
+_SCHEMA = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:(RANGE|TEXT|POINT|LOOKUP|FULLTEXT|VECTOR|BTREE)\s+)?"
+                     r"(INDEX|CONSTRAINT)\b", re.I)
+_CLAUSE = re.compile(r"(?<![\w.$`:])(OPTIONAL\s+MATCH|MATCH|MERGE|WHERE|WITH|UNWIND|RETURN|CREATE|SET|"
+                     r"DETACH\s+DELETE|DELETE|REMOVE|OPTIONAL\s+CALL|CALL|YIELD|ORDER\s+BY|SKIP|LIMIT|UNION(?:\s+ALL)?|FOREACH|"
+                     r"ON\s+CREATE\s+SET|ON\s+MATCH\s+SET|LOAD\s+CSV|USING)(?![\w`])(?!\s*:)", re.I)
+_PROP_PRED = re.compile(r"^([A-Za-z_]\w*)\.([A-Za-z_]\w*)\s*(=|IN\b|STARTS\s+WITH\b|<=|>=|<|>)\s*(.+)$", re.I | re.S)
+_PROP_PRED_RHS = re.compile(r"^(.+?)\s*(=|<=|>=|<|>)\s*([A-Za-z_]\w*)\.([A-Za-z_]\w*)$", re.S)
+_ID_PRED = re.compile(r"^(?:id|elementId)\s*\(\s*([A-Za-z_]\w*)\s*\)\s*(?:=|IN\b)\s*(.+)$", re.I | re.S)
+_ID_PRED_RHS = re.compile(r"^(.+?)\s*=\s*(?:id|elementId)\s*\(\s*([A-Za-z_]\w*)\s*\)$", re.I | re.S)
+_NODE = re.compile(r"^\s*([A-Za-z_]\w*)?\s*((?:[:|&]\s*!?\s*[A-Za-z_]\w*\s*)*)(.*)$", re.S)
+_REL = re.compile(r"^\s*([A-Za-z_]\w*)?\s*((?::\s*!?\s*[A-Za-z_]\w*(?:\s*[|&]\s*:?\s*!?\s*[A-Za-z_]\w*)*)?)\s*"
+                  r"(\*\s*(\d+)?\s*(\.\.)?\s*(\d+)?)?\s*(.*)$", re.S)
+_KEYWORDS = {"and", "or", "not", "xor", "in", "is", "null", "true", "false", "as", "distinct", "case", "when",
+             "then", "else", "end", "starts", "ends", "with", "contains", "exists", "count"}
+
+
+@dataclass
+class Query:
+    """One Cypher string and where it is used"""
+    path: str
+    line: int
+    function: str
+    text: str
+    uses: int = 1
+    callers: int = 1
+    hot: bool = False
+
+    @property
+    def frequency(self) -> int:
+        return max(self.uses, 1) * max(self.callers, 1)
+
+    @property
+    def score(self) -> int:
+        return self.frequency * (LOOP_WEIGHT if self.hot else 1)
+
+
+@dataclass
+class Finding:
+    kind: str
+    detail: str
+    query: Query
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable across line moves and reformatting of the query"""
+        key = f"{self.query.path}|{self.query.function}|{self.kind}|{self.detail}"
+        return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    def describe(self) -> str:
+        return f"{self.query.path}:{self.query.line} {self.query.function} {self.kind} {self.detail}"
+
+    def to_dict(self) -> Dict:
+        q = self.query
+        return {"fingerprint": self.fingerprint, "kind": self.kind, "detail": self.detail,
+                "path": q.path, "line": q.line, "function": q.function, "uses": q.uses,
+                "callers": q.callers, "hot": q.hot, "score": q.score, "query": " ".join(q.text.split())}
+
+
+@dataclass
+class Schema:
+    """Declared indexes: label / relationship type -> property tuples usable as anchors"""
+    nodes: Dict[str, Set[Tuple[str, ...]]] = field(default_factory=lambda: defaultdict(set))
+    relationships: Dict[str, Set[Tuple[str, ...]]] = field(default_factory=lambda: defaultdict(set))
+    fulltext: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
+    vector: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
+
+    def add(self, target: str, label: str, props: Iterable[str], relationship: bool = False):
+        props = tuple(props)
+        if not props:
+            return
+        if target in ("fulltext", "vector"):
+            getattr(self, target)[label].update(props)
+        else:
+            (self.relationships if relationship else self.nodes)[label].add(props)
+
+    def covers(self, labels: Iterable[str], props: Set[str], relationship: bool = False) -> bool:
+        """Whether an index on one of labels is fully covered by the equality props"""
+        table = self.relationships if relationship else self.nodes
+        labels = list(labels)
+        if any(DYN.fullmatch(label) for label in labels):
+            # unknown label: any index on the property could be the one
+            return any(set(idx) <= props for indexes in table.values() for idx in indexes)
+        return any(set(idx) <= props for label in labels for idx in table.get(label, ()))
+
+    def to_dict(self) -> Dict:
+        def listed(table):
+            return {k: sorted(list(v)) for k, v in sorted(table.items())}
+        return {"nodes": listed(self.nodes), "relationships": listed(self.relationships),
+                "fulltext": listed(self.fulltext), "vector": listed(self.vector)}
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def _placeholder(source: str) -> str:
+    name = re.sub(r"[^0-9A-Za-z]+", "_", source).strip("_")[:40]
+    return f"__DYN_{name}__"
+
+
+def _unformat(template: str) -> str:
+    text = re.sub(r"(?<!\{)\{([\w.\[\]]*)\}(?!\})", lambda m: _placeholder(m.group(1)), template)
+    return text.replace("{{", "{").replace("}}", "}")
+
+
+def _dyn(node: ast.AST) -> str:
+    try:
+        return _placeholder(ast.unparse(node))
+    except Exception:
+        return _placeholder("")
+
+
+class _ModuleScan(ast.NodeVisitor):
+    """Collects the Cypher-looking strings of one module with their call-site data"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.found: List[Tuple[ast.AST, str, Tuple[str, ...], Optional[str], bool]] = []
+        self.scopes: List[Dict[str, Tuple[str, Optional[int]]]] = [{}]
+        self.names: List[str] = []
+        self.fragments: Set[int] = set()
+        self.loads: Dict[Tuple[Tuple[str, ...], str], List[bool]] = defaultdict(list)
+        self.loop_depth = 0
+        self.fulltext: List[Tuple[str, List[str]]] = []
+
+    # -- rendering ---------------------------------------------------------
+    def _lookup(self, name: str) -> Optional[Tuple[str, Optional[int]]]:
+        for scope in (self.scopes[-1], self.scopes[0]):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def render(self, node: ast.AST) -> Optional[str]:
+        """Text of a string expression with unresolved parts as placeholders"""
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, str):
+                return None
+            # "{{" never occurs in Cypher: a str.format template used elsewhere
+            return _unformat(node.value) if "{{" in node.value else node.value
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(str(value.value))
+                else:
+                    parts.append(self._piece(value.value))
+            return "".join(parts)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, right = self.render(node.left), self.render(node.right)
+            if left is None and right is None:
+                return None
+            return (left if left is not None else self._piece(node.left)) + \
+                   (right if right is not None else self._piece(node.right))
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod):
+            left = self.render(node.left)
+            if left is None:
+                return None
+            return re.sub(r"%(?:\([^)]*\))?[-#0 +]*\d*(?:\.\d+)?[sdrif]", _dyn(node.right), left)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+            template = self.render(node.func.value)
+            if template is None:
+                return None
+            rendered = isinstance(node.func.value, ast.Constant) and "{{" in node.func.value.value
+            return template if rendered else _unformat(template)
+        return None
+
+    def _piece(self, node: ast.AST) -> str:
+        if isinstance(node, ast.Name):
+            bound = self._lookup(node.id)
+            if bound is not None:
+                if bound[1] is not None:
+                    self.fragments.add(bound[1])
+                return bound[0]
+        text = self.render(node)
+        return text if text is not None else _dyn(node)
+
+    # -- scopes --------------------------------------------------------------
+    def _function(self, node):
+        self.names.append(node.name)
+        self.scopes.append({})
+        depth, self.loop_depth = self.loop_depth, 0
+        self._body(node)
+        self.loop_depth = depth
+        self.scopes.pop()
+        self.names.pop()
+
+    def _body(self, node):
+        body = getattr(node, "body", [])
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            body = body[1:]  # docstring
+        for child in ast.iter_child_nodes(node):
+            if child in body or not isinstance(child, ast.stmt):
+                self.visit(child)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _function
+
+    def visit_ClassDef(self, node):
+        self.names.append(node.name)
+        self._body(node)
+        self.names.pop()
+
+    def visit_Module(self, node):
+        self._body(node)
+
+    def _loop(self, node):
+        self.loop_depth += 1
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_AsyncFor = visit_While = _loop
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _loop
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            return  # bare string statement
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            scope = tuple(self.names) if node.id in self.scopes[-1] and len(self.scopes) > 1 else ()
+            self.loads[(scope, node.id)].append(self.loop_depth > 0)
+
+    def visit_Dict(self, node):
+        keys = {k.value: v for k, v in zip(node.keys, node.values)
+                if isinstance(k, ast.Constant) and isinstance(k.value, str)}
+        if {"name", "label", "properties"} <= set(keys) and isinstance(keys["label"], ast.Constant) \
+                and isinstance(keys["properties"], (ast.List, ast.Tuple)):
+            props = [p.value for p in keys["properties"].elts if isinstance(p, ast.Constant)]
+            self.fulltext.append((keys["label"].value, props))
+        self.generic_visit(node)
+
+    # -- strings -------------------------------------------------------------
+    def _string(self, node: ast.AST, holder: Optional[str]) -> Optional[int]:
+        text = self.render(node)
+        if text is None:
+            self.visit(node)
+            return None
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name):
+                self.visit_Name(sub)
+        if _QUERY.search(text) or _SCHEMA.search(text):
+            self.found.append((node, text, tuple(self.names), holder, self.loop_depth > 0))
+            return len(self.found) - 1
+        return None
+
+    def visit_Assign(self, node):
+        target = node.targets[0] if len(node.targets) == 1 else None
+        holder = None
+        if isinstance(target, ast.Name):
+            holder = target.id
+        elif isinstance(target, ast.Attribute):
+            holder = f".{target.attr}"
+        index = self._string(node.value, holder)
+        text = self.render(node.value)
+        if isinstance(target, ast.Name):
+            if text is not None:
+                self.scopes[-1][target.id] = (text, index)
+            else:
+                self.scopes[-1].pop(target.id, None)
+        for t in node.targets:
+            self.visit(t)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit_Assign(ast.Assign(targets=[node.target], value=node.value, lineno=node.lineno))
+
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name) and isinstance(node.op, ast.Add):
+            bound = self._lookup(node.target.id)
+            extra = self.render(node.value)
+            if bound is not None:
+                text = bound[0] + (extra if extra is not None else _dyn(node.value))
+                index = bound[1]
+                if index is not None:
+                    entry = self.found[index]
+                    self.found[index] = (entry[0], text) + entry[2:]
+                elif _QUERY.search(text):
+                    self.found.append((node, text, tuple(self.names), node.target.id, self.loop_depth > 0))
+                    index = len(self.found) - 1
+                self.scopes[-1][node.target.id] = (text, index)
+                return
+        self.generic_visit(node)
+
+    def generic_visit(self, node):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.Constant, ast.JoinedStr, ast.BinOp)) or \
+                    (isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute)
+                     and child.func.attr == "format"):
+                self._string(child, None)
+            else:
+                self.visit(child)
+
+
+def _python_queries(path: str, rel: str, tree: ast.Module) -> Tuple[List[Query], "_ModuleScan"]:
+    scan = _ModuleScan(rel)
+    scan.visit(tree)
+    queries = []
+    for index, (node, text, names, holder, in_loop) in enumerate(scan.found):
+        if index in scan.fragments:
+            continue
+        uses, hot = 1, in_loop
+        if holder and not holder.startswith("."):
+            loads = scan.loads.get((names, holder)) or scan.loads.get(((), holder)) or []
+            uses, hot = max(len(loads), 1), hot or any(loads)
+        queries.append(Query(rel, node.lineno, ".".join(names) or "<module>", text, uses=uses, hot=hot))
+    return queries, scan
+
+
+def _cypher_file_queries(path: str, rel: str) -> List[Query]:
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        source = fh.read()
+    queries, offset = [], 0
+    for statement in source.split(";"):
+        line = source.count("\n", 0, offset + len(statement) - len(statement.lstrip())) + 1
+        offset += len(statement) + 1
+        if _QUERY.search(statement) or _SCHEMA.search(statement):
+            queries.append(Query(rel, line, "<script>", statement))
+    return queries
+
+
+def _walk(root: str) -> Iterable[Tuple[str, str]]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith("test_") or name.endswith("_test.py"):
+                continue
+            if name.endswith((".py", ".cypher")):
+                path = os.path.join(dirpath, name)
+                yield path, os.path.relpath(path, root)
+
+
+def extract_queries(root: str = ROOT) -> Tuple[List[Query], List[Tuple[str, List[str]]]]:
+    """All Cypher strings under root with call-site counts, plus fulltext index dicts"""
+    queries: List[Query] = []
+    fulltext: List[Tuple[str, List[str]]] = []
+    calls: Counter = Counter()
+    loop_calls: Counter = Counter()
+    defs: Counter = Counter()
+    for path, rel in _walk(root):
+        if path.endswith(".cypher"):
+            queries.extend(_cypher_file_queries(path, rel))
+            continue
+        try:
+            with open(path, encoding="utf-8", errors="replace") as fh:
+                tree = ast.parse(fh.read(), filename=rel)
+        except (SyntaxError, ValueError):
+            continue
+        found, scan = _python_queries(path, rel, tree)
+        queries.extend(found)
+        fulltext.extend(scan.fulltext)
+        _count_calls(tree, calls, loop_calls, defs)
+
+    for query in queries:
+        name = query.function.rsplit(".", 1)[-1]
+        if name.startswith("<") or name.startswith("__"):
+            continue
+        share = max(defs[name], 1)
+        query.callers = max(-(-calls[name] // share), 1)
+        query.hot = query.hot or loop_calls[name] > 0
+    return queries, fulltext
+
+
+def _count_calls(tree: ast.AST, calls: Counter, loop_calls: Counter, defs: Counter):
+    def walk(node, in_loop):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            defs[node.name] += 1
+            in_loop = False
+        elif isinstance(node, ast.Call):
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            if name:
+                calls[name] += 1
+                if in_loop:
+                    loop_calls[name] += 1
+        loop = isinstance(node, (ast.For, ast.AsyncFor, ast.While, ast.comprehension))
+        for child in ast.iter_child_nodes(node):
+            walk(child, in_loop or loop)
+    walk(tree, False)
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+def _node_type_labels(root: str) -> List[str]:
+    path = os.path.join(root, NODE_TYPE_MODULE)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "NodeType":
+            return [stmt.value.value for stmt in node.body
+                    if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant)
+                    and isinstance(stmt.value.value, str)]
+    return []
+
+
+def parse_schema_statement(text: str, schema: Schema) -> bool:
+    """Add one CREATE INDEX / CONSTRAINT statement to schema; False if not Cypher DDL"""
+    text = _strip(text)
+    m = _SCHEMA.search(text)
+    if not m:
+        return False
+    kind = (m.group(1) or "").lower()
+    node = re.search(r"\bFOR\s*\(\s*\w*\s*:\s*([A-Za-z_]\w*)\s*\)", text, re.I)
+    rel = re.search(r"\bFOR\s*\(\s*\)\s*<?-\s*\[\s*\w*\s*:\s*([A-Za-z_]\w*)\s*\]\s*->?\s*\(\s*\)", text, re.I)
+    if not (node or rel) or kind == "lookup":
+        return False
+    label = (node or rel).group(1)
+    if DYN.fullmatch(label):
+        return False
+    if m.group(2).upper() == "CONSTRAINT":
+        req = re.search(r"\bREQUIRE\s+(.+?)\s+IS\s+(UNIQUE|NODE\s+KEY|RELATIONSHIP\s+KEY|KEY)\b", text, re.I | re.S)
+        if not req:
+            return False  # existence / type constraints are not indexes
+        props = re.findall(r"\w+\.(\w+)", req.group(1))
+        target = "index"
+    else:
+        on = re.search(r"\bON\s+EACH\s*\[([^\]]*)\]", text, re.I) or re.search(r"\bON\s*\(?([^)]*)\)?", text, re.I)
+        props = re.findall(r"\w+\.(\w+)", on.group(1)) if on else []
+        target = kind if kind in ("fulltext", "vector") else "index"
+    if any(DYN.fullmatch(p) for p in props):
+        return False
+    schema.add(target, label, props, relationship=rel is not None and node is None)
+    return True
+
+
+def declared_schema(queries: List[Query], fulltext: List[Tuple[str, List[str]]], root: str = ROOT) -> Schema:
+    schema = Schema()
+    for label in _node_type_labels(root):
+        schema.add("index", label, ["id"])
+    for query in queries:
+        parse_schema_statement(query.text, schema)
+    for label, props in fulltext:
+        schema.add("fulltext", label, props)
+    return schema
+
+
+# ---------------------------------------------------------------------------
+# Query analysis
+# ---------------------------------------------------------------------------
+
+def _strip(text: str) -> str:
+    """Comments removed, string literals emptied, backtick names unquoted"""
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in "'\"":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            out.append("''")
+            i = j + 1
+        elif c == "`":
+            j = text.find("`", i + 1)
+            j = n if j < 0 else j
+            out.append(re.sub(r"\W", "_", text[i + 1:j]))
+            i = j + 1
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def _split_top(text: str, sep: str = ",") -> List[str]:
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(text):
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _split_and(text: str) -> List[Tuple[str, bool]]:
+    """Top-level AND conjuncts and whether they can anchor (a top-level OR / XOR cannot)"""
+    depth, last, parts = 0, 0, []
+    for m in re.finditer(r"[()\[\]{}]|\b(AND|OR|XOR)\b", text, re.I):
+        token = m.group(0)
+        if token in "([{":
+            depth += 1
+        elif token in ")]}":
+            depth -= 1
+        elif depth == 0:
+            if token.upper() != "AND":
+                return [(text.strip(), False)]
+            parts.append(text[last:m.start()])
+            last = m.end()
+    parts.append(text[last:])
+    return [(p.strip(), True) for p in parts if p.strip()]
+
+
+def _match_close(text: str, start: int) -> int:
+    pairs = {"(": ")", "[": "]", "{": "}"}
+    depth, i = 0, start
+    while i < len(text):
+        if text[i] in pairs:
+            depth += 1
+        elif text[i] in pairs.values():
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _map_props(text: str) -> Optional[Dict[str, Set[str]]]:
+    """Inline property map -> {key: identifiers its value uses}; None when unknown ($map, placeholders)"""
+    text = text.strip()
+    if text.startswith("$") or DYN.search(text):
+        return None
+    if not text.startswith("{"):
+        return {}
+    end = _match_close(text, 0)
+    inner = text[1:end if end > 0 else len(text)]
+    props = {}
+    for item in _split_top(inner):
+        m = re.match(r"\s*([A-Za-z_]\w*)\s*:(.*)$", item, re.S)
+        if m:
+            props[m.group(1)] = _identifiers(m.group(2))
+    return props
+
+
+@dataclass
+class _Element:
+    var: Optional[str]
+    labels: List[str]
+    props: Optional[Dict[str, Set[str]]]
+    relationship: bool = False
+
+
+@dataclass
+class _Pattern:
+    elements: List[_Element]
+    names: Set[str]
+    unbounded: List[str]
+
+
+def _parse_path(text: str, counter: List[int]) -> Optional[_Pattern]:
+    text = text.strip()
+    names: Set[str] = set()
+    m = re.match(r"([A-Za-z_]\w*)\s*=\s*", text)
+    if m:
+        names.add(m.group(1))
+        text = text[m.end():]
+    shortest = re.match(r"(?:all)?shortestPath\s*\(", text, re.I)
+    if shortest:
+        end = _match_close(text, shortest.end() - 1)
+        text = text[shortest.end():end if end > 0 else len(text)]
+    elements: List[_Element] = []
+    unbounded: List[str] = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == "(":
+            end = _match_close(text, i)
+            if end < 0:
+                break
+            inner = text[i + 1:end]
+            if inner.lstrip().startswith("("):
+                break  # quantified path pattern
+            m = _NODE.match(inner)
+            labels = re.findall(r"[A-Za-z_]\w*", m.group(2))
+            elements.append(_Element(m.group(1), labels, _map_props(m.group(3))))
+            i = end + 1
+        elif c in "<-":
+            m = re.match(r"<?-\s*(?:\[)?", text[i:])
+            j = i + m.end()
+            if text[j - 1] == "[":
+                end = _match_close(text, j - 1)
+                if end < 0:
+                    break
+                inner, j = text[j:end], end + 1
+            else:
+                inner = ""
+            tail = re.match(r"\s*->?|\s*-?>?", text[j:])
+            i = j + tail.end()
+            r = _REL.match(inner)
+            types = re.findall(r"[A-Za-z_]\w*", r.group(2))
+            if r.group(3) and not shortest and (r.group(6) is None and (r.group(5) or r.group(4) is None)):
+                unbounded.append(inner.strip() or "*")
+            elements.append(_Element(r.group(1), types, _map_props(r.group(7)), relationship=True))
+        else:
+            break
+    if not elements:
+        return None
+    for element in elements:
+        if element.var is None:
+            counter[0] += 1
+            element.var = f" anon{counter[0]}"
+        names.add(element.var)
+    return _Pattern(elements, names, unbounded)
+
+
+def _identifiers(expr: str) -> Set[str]:
+    expr = re.sub(r"\$\w+", " ", expr)
+    expr = re.sub(r"\.\s*[A-Za-z_]\w*", " ", expr)
+    names = set()
+    for m in re.finditer(r"[A-Za-z_]\w*(?!\s*\()", expr):
+        if m.group(0).lower() not in _KEYWORDS and not DYN.fullmatch(m.group(0)):
+            names.add(m.group(0))
+    return names
+
+
+def _predicates(where: str) -> List[Tuple[str, Optional[str], Set[str]]]:
+    """
+    (var, prop or None for id(), identifiers used by the value) of each anchorable
+    conjunct; any other conjunct is ("", None, identifiers) and only joins variables
+    """
+    out = []
+    for conj, usable in _split_and(where):
+        if not usable:
+            out.append(("", None, _identifiers(conj)))
+            continue
+        m = _PROP_PRED.match(conj)
+        if m:
+            out.append((m.group(1), m.group(2), _identifiers(m.group(4))))
+            continue
+        m = _PROP_PRED_RHS.match(conj)
+        if m and not re.match(r"^\s*\w+\s*\(", m.group(1)):
+            out.append((m.group(3), m.group(4), _identifiers(m.group(1))))
+            continue
+        m = _ID_PRED.match(conj)
+        if m:
+            out.append((m.group(1), None, _identifiers(m.group(2))))
+            continue
+        m = _ID_PRED_RHS.match(conj)
+        if m:
+            out.append((m.group(2), None, _identifiers(m.group(1))))
+            continue
+        out.append(("", None, _identifiers(conj)))
+    return out
+
+
+def _clauses(text: str) -> List[Tuple[str, str, int]]:
+    """(KEYWORD, body, brace depth) for each clause"""
+    matches = []
+    for m in _CLAUSE.finditer(text):
+        if m.group(1).upper() == "WITH" and re.search(r"\b(STARTS|ENDS)\s*$", text[:m.start()], re.I):
+            continue
+        matches.append(m)
+    clauses = []
+    for k, m in enumerate(matches):
+        end = matches[k + 1].start() if k + 1 < len(matches) else len(text)
+        prefix = text[:m.start()]
+        depth = prefix.count("{") - prefix.count("}")
+        clauses.append((re.sub(r"\s+", " ", m.group(1).upper()), text[m.end():end], depth))
+    return clauses
+
+
+_SINGLE_ROW = re.compile(r"^(?:(?:count|sum|avg|min|max|collect|stDev\w*|percentile\w*)\s*\(|\$|-?\d|''|true\b|"
+                         r"false\b|null\b)", re.I)
+
+
+def _projected(body: str) -> Tuple[Set[str], bool, bool]:
+    """Names a WITH projects, whether it keeps everything (*), whether it yields one row"""
+    names, star, single = set(), False, True
+    for item in _split_top(body):
+        item = re.sub(r"^\s*DISTINCT\b", "", item.strip(), flags=re.I).strip()
+        if item == "*":
+            star = True
+            continue
+        m = re.search(r"\bAS\s+([A-Za-z_]\w*)\s*$", item, re.I) or re.fullmatch(r"([A-Za-z_]\w*)", item)
+        if m:
+            names.add(m.group(1))
+        single = single and bool(_SINGLE_ROW.match(item))
+    return names, star, single and not star
+
+
+def analyze_query(text: str, schema: Schema) -> List[Tuple[str, str]]:
+    """(kind, detail) findings of one query, deduplicated, in clause order"""
+    text = _strip(text)
+    if _SCHEMA.search(text) or not _QUERY.search(text):
+        return []
+    findings: List[Tuple[str, str]] = []
+    bound: Set[str] = set()
+    rows = False  # whether earlier clauses can produce more than one row
+    counter = [0]
+    clauses = _clauses(text)
+    k = 0
+    while k < len(clauses):
+        keyword, body, depth = clauses[k]
+        k += 1
+        if keyword in ("MATCH", "OPTIONAL MATCH", "MERGE"):
+            # consecutive MATCH clauses (and their WHEREs) are planned as one graph
+            bodies, wheres = [body], []
+            while k < len(clauses) and clauses[k][2] == depth:
+                nxt, nbody, _ = clauses[k]
+                if nxt == "WHERE" and keyword != "MERGE":
+                    wheres.append(nbody)
+                elif nxt == "MATCH" and keyword == "MATCH":
+                    bodies.append(nbody)
+                elif nxt != "USING":
+                    break
+                k += 1
+            patterns = [p for p in (_parse_path(part, counter) for b in bodies for part in _split_top(b)) if p]
+            predicates = [pred for where in wheres for pred in _predicates(where)]
+            # an interpolated condition may hold the anchor: leave those to the planner
+            if not any(_OPAQUE.search(where) for where in wheres):
+                findings.extend(_anchor_findings(patterns, predicates, bound, rows, schema,
+                                                 merge=keyword == "MERGE"))
+            for pattern in patterns:
+                findings.extend(("unbounded_varlength", f"[{u}]") for u in pattern.unbounded)
+                bound |= {n for n in pattern.names if not n.startswith(" ")}
+            rows = True
+        elif keyword == "CREATE":
+            for part in _split_top(body):
+                pattern = _parse_path(part, counter)
+                if pattern:
+                    bound |= {n for n in pattern.names if not n.startswith(" ")}
+        elif keyword == "WITH":
+            names, star, single = _projected(body)
+            bound = (bound | names) if star or depth > 0 else names
+            rows = rows and not (single and depth == 0)
+        elif keyword in ("UNWIND", "LOAD CSV"):
+            m = re.search(r"\bAS\s+([A-Za-z_]\w*)", body, re.I)
+            if m:
+                bound.add(m.group(1))
+            rows = True
+        elif keyword == "YIELD":
+            rows = True
+            for item in _split_top(re.split(r"\bWHERE\b", body, flags=re.I)[0]):
+                m = re.search(r"([A-Za-z_]\w*)\s*$", item.strip())
+                if m:
+                    bound.add(m.group(1))
+        elif keyword == "FOREACH":
+            m = re.match(r"\s*\(\s*([A-Za-z_]\w*)\s+IN\b", body, re.I)
+            if m:
+                bound.add(m.group(1))
+        elif keyword.startswith("UNION") and depth == 0:
+            bound, rows = set(), False
+    return list(dict.fromkeys(findings))
+
+
+def _anchor_findings(patterns: List[_Pattern], predicates, bound: Set[str], rows: bool, schema: Schema,
+                     merge: bool = False):
+    # connected components over shared variables
+    parent = list(range(len(patterns)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for i, pattern in enumerate(patterns):
+        for name in pattern.names:
+            if name in owner:
+                parent[find(i)] = find(owner[name])
+            else:
+                owner[name] = i
+    comps: Dict[int, List[_Pattern]] = defaultdict(list)
+    for i, pattern in enumerate(patterns):
+        comps[find(i)].append(pattern)
+    comps = list(comps.values())
+    comp_names = [set().union(*(p.names for p in comp)) for comp in comps]
+    comp_of = {name: c for c, names in enumerate(comp_names) for name in names}
+
+    # inline map entries are predicates like any WHERE conjunct
+    predicates = list(predicates)
+    unknown: Set[str] = set()
+    for comp in comps:
+        for pattern in comp:
+            for e in pattern.elements:
+                if e.props is None or (DYN.fullmatch(e.var) and not e.labels):
+                    unknown.add(e.var)  # a $map, or a node bound by an interpolated fragment
+                else:
+                    predicates.extend((e.var, prop, uses) for prop, uses in e.props.items())
+    filters: Dict[str, Set[str]] = defaultdict(set)  # var -> every filtered prop (for reporting)
+    for var, prop, _ in predicates:
+        if prop:
+            filters[var].add(prop)
+
+    def anchored_by(c: int, ready: Set[str]) -> bool:
+        names = comp_names[c]
+        if names & (bound | unknown):
+            return True  # bound earlier, or a $map / placeholder we cannot judge
+        usable = [(v, p) for v, p, uses in predicates if v in names and uses <= ready and v not in uses]
+        if any(p is None for _, p in usable):
+            return True  # id() / elementId()
+        for pattern in comps[c]:
+            for e in pattern.elements:
+                if e.labels and schema.covers(e.labels, {p for v, p in usable if v == e.var}, e.relationship):
+                    return True
+        return False
+
+    anchored = [False] * len(comps)
+    changed = True
+    while changed:
+        changed = False
+        ready = set(bound).union(*(comp_names[c] for c in range(len(comps)) if anchored[c]))
+        for c in range(len(comps)):
+            if not anchored[c] and anchored_by(c, ready):
+                anchored[c] = changed = True
+
+    # components whose predicates use earlier rows or each other (a join, not a cartesian product)
+    linked: Set[int] = set()
+    for var, _, uses in predicates:
+        names = uses | {var}
+        touched = {comp_of[name] for name in names if name in comp_of}
+        if len(touched) > 1 or (touched and names & bound):
+            linked |= touched
+
+    findings = []
+    for c, comp in enumerate(comps):
+        if anchored[c]:
+            continue
+        scan = _scan_kind(comp, filters)
+        if not merge and (rows or len(comps) > 1) and c not in linked:
+            findings.append(("cartesian", f"{scan[0]} {scan[1]}"))
+        else:
+            findings.append(scan)
+    return findings
+
+
+def _scan_kind(comp: List[_Pattern], filters: Dict[str, Set[str]]) -> Tuple[str, str]:
+    elements = [e for pattern in comp for e in pattern.elements]
+    nodes = [e for e in elements if not e.relationship]
+    for e in nodes + [e for e in elements if e.relationship]:
+        if e.labels and filters.get(e.var):
+            label = "?" if any(DYN.fullmatch(x) for x in e.labels) else "|".join(e.labels)
+            props = ",".join(sorted(filters[e.var]))
+            return "unindexed_anchor", (f"[:{label}].{props}" if e.relationship else f"{label}.{props}")
+    for e in nodes:
+        if e.labels:
+            label = "?" if any(DYN.fullmatch(x) for x in e.labels) else "|".join(e.labels)
+            return "label_scan", label
+    for e in elements:
+        if e.labels:
+            return "label_scan", "[:" + "|".join(e.labels) + "]"
+    return "all_nodes_scan", "()"
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Report:
+    schema: Schema
+    queries: List[Query]
+    findings: List[Finding]
+
+    def to_dict(self, top: int = 0) -> Dict:
+        findings = self.findings[:top] if top else self.findings
+        return {"queries": len(self.queries), "files": len({q.path for q in self.queries}),
+                "findings_by_kind": dict(Counter(f.kind for f in self.findings)),
+                "schema": self.schema.to_dict(), "findings": [f.to_dict() for f in findings]}
+
+
+def analyze(root: str = ROOT) -> Report:
+    queries, fulltext = extract_queries(root)
+    schema = declared_schema(queries, fulltext, root)
+    findings = [Finding(kind, detail, query) for query in queries
+                for kind, detail in analyze_query(query.text, schema)]
+    findings.sort(key=lambda f: (-f.query.score, KINDS.index(f.kind), f.query.path, f.query.line))
+    return Report(schema, queries, findings)
+
+
+def load_baseline(path: str = BASELINE) -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)["findings"]
+
+
+def write_baseline(report: Report, path: str = BASELINE):
+    findings = {f.fingerprint: f"{f.query.path} {f.query.function} {f.kind} {f.detail}" for f in report.findings}
+    with open(path, "w") as fh:
+        json.dump({"findings": dict(sorted(findings.items(), key=lambda kv: kv[1]))}, fh, indent=1)
+        fh.write("\n")
+
+
+def new_findings(report: Report, baseline: Dict[str, str]) -> List[Finding]:
+    return [f for f in report.findings if f.fingerprint not in baseline]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=ROOT)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--top", type=int, default=40, help="findings to print (0 = all)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--check", action="store_true", help="exit 1 when there are findings not in the baseline")
+    parser.add_argument("--write-baseline", action="store_true", help="accept every current finding")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.root)
+    if args.write_baseline:
+        write_baseline(report, args.baseline)
+        print(f"{len(report.findings)} findings written to {args.baseline}")
+        return 0
+    fresh = new_findings(report, load_baseline(args.baseline))
+    if args.json:
+        print(json.dumps(report.to_dict(args.top), indent=2))
+    else:
+        data = report.to_dict()
+        print(f"{data['queries']} queries in {data['files']} files, findings: {data['findings_by_kind']}")
+        shown = report.findings[:args.top] if args.top else report.findings
+        for f in shown:
+            hot = " hot" if f.query.hot else ""
+            print(f"{f.query.score:>6}{hot:4} {f.kind:<20} {f.detail:<40} {f.query.path}:{f.query.line} "
+                  f"{f.query.function}")
+        if fresh:
+            print(f"\n{len(fresh)} not in baseline:")
+            for f in fresh:
+                print("  " + f.describe())
+    return 1 if args.check and fresh else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Micro-batching embedding service for the live News / QAExchange paths.
+
+The pubsub loop used to embed one node at a time: a ChromaDB get, a Neo4j
+genai.vector.encodeBatch([content]) with a single element, then another Chroma
+get and add. EmbeddingBatcher instead queues (node_id, content) requests and a
+worker thread drains them in batches bounded by batch_size and max_wait. Each
+batch costs:
+  * one Chroma multi-get for the content hashes (cache hits skip the provider),
+  * one provider call for the misses (encode(list_of_texts) -> list_of_vectors),
+  * one UNWIND write of every vector to Neo4j,
+  * one Chroma multi-add for the freshly generated vectors.
+Results are mapped back by node id / content hash with dicts, never by scanning.
+
+Each submit() returns a concurrent.futures.Future that resolves to True when the
+node's embedding was written. Metrics separate queue wait (submit -> batch taken)
+from provider latency (one encode call), which is what tells you whether to
+raise batch_size or lower max_wait.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from hashlib import sha256
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from utils.ws_pipeline import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[List[str]], Sequence[Sequence[float]]]
+Writer = Callable[[List[Dict]], Iterable[str]]
+
+
+def content_hash(content: str) -> str:
+    """Chroma id for a piece of content (same scheme as EmbeddingMixin)."""
+    return sha256(content.encode()).hexdigest()
+
+
+@dataclass
+class EmbeddingRequest:
+    node_id: str
+    content: str
+    submitted_at: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+    """
+    Size- and time-bounded micro-batcher in front of an embedding provider.
+
+    Args:
+        name: Label for logs and the worker thread (e.g. "News")
+        encode: Called with a list of texts, returns one vector per text in the same order
+        write: Called with [{"id", "embedding"}] rows, returns the ids actually written
+        cache: Optional Chroma-like collection (get(ids=, include=) / add(ids=, documents=, embeddings=))
+        cache_call: Wrapper for cache calls (EmbeddingMixin passes utils.chromadb_safe.safe_chromadb_call)
+        batch_size: Maximum requests per batch
+        max_wait: Seconds the worker waits for a partial batch to fill
+        capacity: Maximum queued requests; submit() fails the future beyond that
+    """
+
+    def __init__(self, name: str, encode: Encoder, write: Writer, cache=None,
+                 cache_call: Optional[Callable] = None, batch_size: int = 64,
+                 max_wait: float = 0.05, capacity: int = 10000):
+        self.name = name
+        self.encode = encode
+        self.write = write
+        self.cache = cache
+        self.cache_call = cache_call or (lambda fn: fn())
+        self.batch_size = max(1, int(batch_size))
+        self.max_wait = max_wait
+        self.capacity = max(1, int(capacity))
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._busy = 0
+        self.queue_wait = LatencyWindow()
+        self.provider_latency = LatencyWindow()
+        self.stats = {
+            "submitted": 0,
+            "rejected": 0,          # queue full
+            "batches": 0,
+            "requests_handled": 0,
+            "cache_hits": 0,
+            "encoded": 0,           # texts sent to the provider
+            "provider_calls": 0,
+            "written": 0,
+            "failed": 0,
+            "max_batch": 0,
+        }
+
+    # ---- lifecycle ----
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name=f"{self.name}-embed-batcher", daemon=True)
+        self._thread.start()
+        logger.info(f"[EMBED-BATCH] {self.name} batcher started: batch {self.batch_size}, "
+                    f"max wait {self.max_wait}s, capacity {self.capacity}")
+
+    def stop(self, timeout: float = 30.0):
+        """Handle whatever is queued (up to timeout), then stop the worker."""
+        self.drain(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=max(0.1, timeout))
+            self._thread = None
+        self.log_stats()
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued request has been handled; True if it emptied in time."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return not (self._queue or self._busy)
+                self._cond.wait(remaining)
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # ---- producer side ----
+    def submit(self, node_id: str, content: str) -> Future:
+        """Queue one node for embedding; the future resolves to True once it is written."""
+        request = EmbeddingRequest(node_id, content)
+        with self._cond:
+            self.stats["submitted"] += 1
+            if len(self._queue) >= self.capacity:
+                self.stats["rejected"] += 1
+                logger.warning(f"[EMBED-BATCH] {self.name} queue full ({self.capacity}) - rejected {node_id}")
+                request.future.set_result(False)
+                return request.future
+            self._queue.append(request)
+            self._cond.notify_all()
+        return request.future
+
+    # ---- worker side ----
+    def _take_batch(self) -> List[EmbeddingRequest]:
+        with self._cond:
+            while not self._queue and self._running:
+                self._cond.wait(0.5)
+            if not self._queue:
+                return []
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.batch_size and self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._busy += 1
+            return batch
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                if not self._running and not self._queue:
+                    return
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                self.process_batch(batch)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify_all()
+
+    def process_batch(self, batch: List[EmbeddingRequest]) -> int:
+        """Embed and write one batch, resolve every request's future; returns nodes written."""
+        taken = time.monotonic()
+        self.queue_wait.add_many([taken - r.submitted_at for r in batch])
+
+        by_node: Dict[str, List[EmbeddingRequest]] = {}
+        for request in batch:
+            by_node.setdefault(request.node_id, []).append(request)
+        # Last submission for a node wins (its content is the newest)
+        node_hash = {node_id: content_hash(reqs[-1].content) for node_id, reqs in by_node.items()}
+        contents = {node_hash[node_id]: reqs[-1].content for node_id, reqs in by_node.items()}
+
+        written = set()
+        try:
+            vectors = self._cached(list(contents))
+            hits = len(vectors)
+            misses = [h for h in contents if h not in vectors]
+            fresh = {}
+            if misses:
+                started = time.monotonic()
+                try:
+                    encoded = self.encode([contents[h] for h in misses])
+                finally:
+                    self.provider_latency.add_many([time.monotonic() - started])
+                    self.stats["provider_calls"] += 1
+                if len(encoded) != len(misses):
+                    raise ValueError(f"provider returned {len(encoded)} vectors for {len(misses)} texts")
+                fresh = {h: v for h, v in zip(misses, encoded) if v is not None}
+                vectors.update(fresh)
+                self.stats["encoded"] += len(misses)
+
+            rows = [{"id": node_id, "embedding": vectors[h]} for node_id, h in node_hash.items() if h in vectors]
+            if rows:
+                written = set(self.write(rows) or ())
+            if fresh:
+                self._store(fresh, contents)
+
+            self.stats["cache_hits"] += hits
+            self.stats["written"] += len(written)
+        except Exception as e:
+            logger.error(f"[EMBED-BATCH] {self.name} batch of {len(batch)} failed: {e}", exc_info=True)
+
+        for node_id, reqs in by_node.items():
+            ok = node_id in written
+            if not ok:
+                self.stats["failed"] += len(reqs)
+            for request in reqs:
+                request.future.set_result(ok)
+        self.stats["batches"] += 1
+        self.stats["requests_handled"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        return len(written)
+
+    def _cached(self, hashes: List[str]) -> Dict[str, Sequence[float]]:
+        """One Chroma multi-get; {hash: vector} for the hits."""
+        if self.cache is None or not hashes:
+            return {}
+        try:
+            result = self.cache_call(lambda: self.cache.get(ids=hashes, include=['embeddings']))
+        except Exception as e:
+            logger.warning(f"[EMBED-BATCH] {self.name} Chroma lookup failed, embedding all {len(hashes)}: {e}")
+            return {}
+        if not result or not result.get('ids') or result.get('embeddings') is None:
+            return {}
+        return {h: v for h, v in zip(result['ids'], result['embeddings']) if v is not None}
+
+    def _store(self, fresh: Dict[str, Sequence[float]], contents: Dict[str, str]):
+        """One Chroma multi-add for the vectors the provider just generated."""
+        if self.cache is None:
+            return
+        ids = list(fresh)
+        try:
+            self.cache_call(lambda: self.cache.add(ids=ids, documents=[contents[h] for h in ids],
+                                                   embeddings=[fresh[h] for h in ids]))
+        except Exception as e:
+            if "Insert of existing embedding ID" not in str(e):
+                logger.warning(f"[EMBED-BATCH] {self.name} failed to store {len(ids)} embeddings in Chroma: {e}")
+
+    # ---- metrics ----
+    def snapshot(self) -> Dict[str, float]:
+        with self._cond:
+            stats = dict(self.stats, depth=len(self._queue))
+        stats["mean_batch"] = round(stats["requests_handled"] / stats["batches"], 2) if stats["batches"] else 0.0
+        for prefix, window in (("queue_wait", self.queue_wait), ("provider", self.provider_latency)):
+            for key, value in window.summary().items():
+                if key != "count":
+                    stats[f"{prefix}_{key}"] = value
+        return stats
+
+    def log_stats(self):
+        s = self.snapshot()
+        logger.info(f"[EMBED-BATCH] {self.name}: handled {s['requests_handled']} in {s['batches']} batches "
+                    f"(mean {s['mean_batch']}, max {s['max_batch']}), cache hits {s['cache_hits']}, "
+                    f"encoded {s['encoded']} in {s['provider_calls']} calls, written {s['written']}, "
+                    f"failed {s['failed']}, queue wait p50 {s['queue_wait_p50_ms']:.1f}ms "
+                    f"p99 {s['queue_wait_p99_ms']:.1f}ms, provider p50 {s['provider_p50_ms']:.1f}ms "
+                    f"p99 {s['provider_p99_ms']:.1f}ms")
+
+
+# ---- Neo4j-backed provider and writer ----
+def genai_encoder(manager, config: Dict) -> Encoder:
+    """Encoder running one genai.vector.encodeBatch call for the whole list of texts."""
+    query = """
+    CALL genai.vector.encodeBatch($contents, 'OpenAI', $config)
+    YIELD index, vector
+    RETURN index, vector
+    """
+
+    def encode(contents: List[str]):
+        rows = manager.execute_cypher_query_all(query, {"contents": contents, "config": config}) or []
+        by_index = {row["index"]: row["vector"] for row in rows}
+        return [by_index.get(i) for i in range(len(contents))]
+
+    return encode
+
+
+def unwind_writer(manager, label: str, embedding_property: str = "embedding", id_property: str = "id") -> Writer:
+    """Writer setting every vector of a batch in one UNWIND statement; returns the ids it set."""
+    query = f"""
+    UNWIND $batch AS item
+    MATCH (n:{label} {{{id_property}: item.id}})
+    WHERE n.{embedding_property} IS NULL
+    CALL db.create.setNodeVectorProperty(n, "{embedding_property}", item.embedding)
+    RETURN n.{id_property} AS id
+    """
+
+    def write(rows: List[Dict]):
+        return [row["id"] for row in manager.execute_cypher_query_all(query, {"batch": rows}) or []]
+
+    return write
+
+
+def batcher_from_flags(name: str, encode: Encoder, write: Writer, cache=None,
+                       cache_call: Optional[Callable] = None) -> Optional[EmbeddingBatcher]:
+    """Started EmbeddingBatcher configured from config.feature_flags, or None when ENABLE_EMBEDDING_MICROBATCH is off."""
+    from config import feature_flags as ff
+    if not getattr(ff, "ENABLE_EMBEDDING_MICROBATCH", False):
+        return None
+    batcher = EmbeddingBatcher(name, encode, write, cache=cache, cache_call=cache_call,
+                               batch_size=ff.EMBEDDING_MICROBATCH_SIZE,
+                               max_wait=ff.EMBEDDING_MICROBATCH_MAX_WAIT_SECONDS,
+                               capacity=ff.EMBEDDING_MICROBATCH_CAPACITY)
+    batcher.start()
+    return batcher
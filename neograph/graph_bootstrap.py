@@ -0,0 +1,414 @@
+"""
+Date / price / corporate-action bootstrap for Neo4jInitializer.
+
+The per-date path (create_dates -> add_price_relationships_to_dates) builds a
+MarketSessionClassifier per Date node, calls Polygon twice per trading day in
+sequence and commits one HAS_PRICE transaction per date, so a multi-year
+bootstrap takes hours and restarts from scratch when it fails. GraphBootstrap
+does the same work in stages that can resume:
+
+  1. Date nodes: session metadata for the whole range is computed in one
+     vectorized pass over the exchange calendar schedule (date_nodes_for_range),
+     then bulk-merged together with the NEXT chain.
+  2. Bars: grouped daily aggregates for every trading day (and its previous
+     trading day) are fetched concurrently into BarStore, one Parquet file per
+     date restricted to the price universe. manifest.json records which dates
+     were fetched and which were loaded into Neo4j.
+  3. Prices: HAS_PRICE rows are derived exactly as Polygon.get_daily_market_summary
+     does (intersection with the previous day, daily_return rounded to 2dp, NY
+     timestamps) and written through create_price_relationships_batch in chunks
+     of whole dates of roughly batch_size rows. A date is marked loaded only after
+     its chunk commits; dates that already have HAS_PRICE are skipped.
+  4. Dividends / splits: fetched with the universe split across worker threads,
+     cached in the store for the day, then merged with bulk UNWIND statements
+     under the same rules as create_dividends / create_splits.
+
+Re-running after an interruption only fetches and loads what the manifest does
+not yet mark complete. The manifest is tied to the price universe; a different
+symbol set starts a fresh manifest.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from neograph.EventTraderNodes import DateNode, DividendNode, SplitNode
+from XBRL.xbrl_core import RelationType
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+NY = "America/New_York"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+SESSION_FIELDS = ("pre_market", "market_open", "market_close", "post_market")
+
+DIVIDEND_COMPANY_QUERY = """
+UNWIND $params AS param
+MATCH (c:Company {ticker: param.company_ticker})
+MATCH (d:Dividend {id: param.dividend_id})
+MERGE (c)-[r:DECLARED_DIVIDEND]->(d)
+RETURN count(r) as created
+"""
+
+DIVIDEND_DATE_QUERY = """
+UNWIND $params AS param
+MATCH (date:Date {date: param.date_str})
+MATCH (d:Dividend {id: param.dividend_id})
+MERGE (date)-[r:HAS_DIVIDEND]->(d)
+RETURN count(r) as created
+"""
+
+SPLIT_COMPANY_QUERY = """
+UNWIND $params AS param
+MATCH (c:Company {ticker: param.company_ticker})
+MATCH (s:Split {id: param.split_id})
+MERGE (c)-[r:DECLARED_SPLIT]->(s)
+RETURN count(r) as created
+"""
+
+# HAS_SPLIT only for splits whose company exists (same as _create_split_relationships)
+SPLIT_DATE_QUERY = """
+UNWIND $params AS param
+MATCH (:Company {ticker: param.company_ticker})
+MATCH (date:Date {date: param.date_str})
+MATCH (s:Split {id: param.split_id})
+MERGE (date)-[r:HAS_SPLIT]->(s)
+RETURN count(r) as created
+"""
+
+
+def date_nodes_for_range(date_strings: List[str], calendar) -> List[DateNode]:
+    """DateNodes for date_strings with the same session fields as
+    Neo4jInitializer._prepare_date_node, computed over calendar.schedule at once."""
+    schedule = calendar.schedule
+    sessions = pd.DatetimeIndex(schedule.index).tz_localize(None).normalize()
+    opens, closes = schedule["open"], schedule["close"]
+    early = sessions.isin(pd.DatetimeIndex(calendar.early_closes).tz_localize(None).normalize())
+
+    def fmt(ts):
+        return ts.dt.tz_convert(NY).dt.strftime(TIME_FORMAT).to_numpy()
+
+    times = {
+        "pre_market": fmt(opens - pd.Timedelta(hours=5.5)),
+        "market_open": fmt(opens),
+        "market_close": fmt(closes),
+        "post_market": fmt(closes.where(early, closes + pd.Timedelta(hours=4))),
+    }
+
+    dates = pd.DatetimeIndex(date_strings)
+    left = sessions.searchsorted(dates, side="left")
+    is_session = (left < len(sessions)) & (sessions[np.minimum(left, len(sessions) - 1)] == dates)
+    prev_pos = left - 1                                   # last session strictly before the date
+    next_pos = sessions.searchsorted(dates, side="right")  # first session strictly after it
+
+    nodes = []
+    for i, date_str in enumerate(date_strings):
+        node = DateNode(date_str=date_str, is_trading_day=bool(is_session[i]))
+        for suffix, pos in (("current_day", left[i] if is_session[i] else -1),
+                            ("previous_day", prev_pos[i]), ("next_day", next_pos[i])):
+            if 0 <= pos < len(sessions):
+                for field in SESSION_FIELDS:
+                    setattr(node, f"{field}_{suffix}", times[field][pos])
+        nodes.append(node)
+    return nodes
+
+
+def daily_summary(df_latest: pd.DataFrame, df_prev: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Polygon.get_daily_market_summary's frame logic for two grouped-bar frames (index = ticker)."""
+    if df_latest.empty or df_prev.empty:
+        return None
+    df_latest, df_prev = df_latest.copy(), df_prev.copy()
+    for d in (df_latest, df_prev):
+        if "timestamp" in d.columns:
+            d["timestamp"] = pd.to_datetime(d["timestamp"], unit="ms").dt.tz_localize("UTC").dt.tz_convert(NY)
+    common = df_latest.index.intersection(df_prev.index)
+    df_latest, df_prev = df_latest.loc[common], df_prev.loc[common]
+    if df_latest.empty:
+        return None
+    df_latest["daily_return"] = round((df_latest["close"] - df_prev["close"]) / df_prev["close"] * 100, 2)
+    return df_latest.drop(columns=["otc"], errors="ignore")
+
+
+class BarStore:
+    """<root>/bars/<date>.parquet grouped daily bars + <root>/events/<kind>-<day>.parquet + manifest.json."""
+
+    def __init__(self, root: str, symbols: Iterable[str]):
+        self.root = root
+        self.symbols = sorted(set(symbols))
+        self.digest = hashlib.sha256("\n".join(self.symbols).encode()).hexdigest()[:16]
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "bars"), exist_ok=True)
+        os.makedirs(os.path.join(root, "events"), exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self._manifest_path) as fh:
+                manifest = json.load(fh)
+            if manifest.get("version") == MANIFEST_VERSION and manifest.get("symbols") == self.digest:
+                return manifest
+            logger.info("Bootstrap manifest is for a different universe; starting a new one")
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            logger.warning(f"Unreadable bootstrap manifest ({e}); starting a new one")
+        return {"version": MANIFEST_VERSION, "symbols": self.digest, "fetched": {}, "prices_loaded": []}
+
+    def _save(self) -> None:
+        tmp = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self.manifest, fh)
+        os.replace(tmp, self._manifest_path)
+
+    def _bar_path(self, date_str: str) -> str:
+        return os.path.join(self.root, "bars", f"{date_str}.parquet")
+
+    def has_bars(self, date_str: str) -> bool:
+        return date_str in self.manifest["fetched"] and os.path.exists(self._bar_path(date_str))
+
+    def write_bars(self, date_str: str, frame: pd.DataFrame) -> None:
+        frame.to_parquet(self._bar_path(date_str))
+        with self._lock:
+            self.manifest["fetched"][date_str] = len(frame)
+            self._save()
+
+    def read_bars(self, date_str: str) -> pd.DataFrame:
+        return pd.read_parquet(self._bar_path(date_str))
+
+    def is_loaded(self, date_str: str) -> bool:
+        return date_str in self._loaded
+
+    @property
+    def _loaded(self) -> set:
+        return set(self.manifest["prices_loaded"])
+
+    def mark_loaded(self, dates: Iterable[str]) -> None:
+        with self._lock:
+            self.manifest["prices_loaded"] = sorted(self._loaded | set(dates))
+            self._save()
+
+    def _event_path(self, kind: str, day: str) -> str:
+        return os.path.join(self.root, "events", f"{kind}-{day}.parquet")
+
+    def read_events(self, kind: str, day: str) -> Optional[pd.DataFrame]:
+        path = self._event_path(kind, day)
+        if self.manifest.get("events", {}).get(kind) == day and os.path.exists(path):
+            return pd.read_parquet(path)
+        return None
+
+    def write_events(self, kind: str, day: str, frame: pd.DataFrame) -> None:
+        frame.to_parquet(self._event_path(kind, day))
+        with self._lock:
+            self.manifest.setdefault("events", {})[kind] = day
+            self._save()
+
+
+class GraphBootstrap:
+    """Staged, resumable Date / HAS_PRICE / Dividend / Split load (see module docstring)."""
+
+    def __init__(self, manager, polygon, store: BarStore, calendar, workers: int = 8,
+                 batch_size: int = 20000, today: Optional[str] = None):
+        self.manager = manager
+        self.polygon = polygon
+        self.store = store
+        self.calendar = calendar
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.today = today or datetime.now().strftime("%Y-%m-%d")
+        self.stats = {"dates": 0, "bars_fetched": 0, "bar_fetch_failures": 0, "price_dates_loaded": 0,
+                      "price_rels": 0, "dividends": 0, "splits": 0}
+
+    # ---------------- dates ----------------
+    def create_dates(self, start_date: str, end_date: Optional[str] = None) -> List[DateNode]:
+        end_date = end_date or self.today
+        date_strings = [d.strftime("%Y-%m-%d") for d in pd.date_range(start=start_date, end=end_date)]
+        nodes = date_nodes_for_range(date_strings, self.calendar)
+        if not nodes:
+            return nodes
+        self.manager.merge_nodes_bulk(nodes, batch_size=self.batch_size)
+        self.manager.merge_relationships([(a, b, RelationType.NEXT) for a, b in zip(nodes, nodes[1:])])
+        self.stats["dates"] += len(nodes)
+        logger.info(f"Bootstrap: merged {len(nodes)} Date nodes {date_strings[0]}..{date_strings[-1]}")
+        return nodes
+
+    # ---------------- bars ----------------
+    def _fetch_one(self, date_str: str) -> bool:
+        try:
+            aggs = self.polygon.get_rest_client().get_grouped_daily_aggs(
+                date_str, adjusted="true", include_otc="false")
+            frame = pd.DataFrame([a.__dict__ for a in aggs]).set_index("ticker") if aggs else pd.DataFrame()
+            if frame.empty:
+                logger.warning(f"Bootstrap: no grouped bars for {date_str}; will retry on the next run")
+                return False
+            self.store.write_bars(date_str, frame[frame.index.isin(self.store.symbols)])
+            return True
+        except Exception as e:
+            logger.warning(f"Bootstrap: grouped bars fetch failed for {date_str}: {e}")
+            return False
+
+    def fetch_bars(self, date_strings: Iterable[str]) -> int:
+        """Fetch every date not yet in the store, workers at a time. Returns dates fetched."""
+        missing = sorted({d for d in date_strings if d and not self.store.has_bars(d)})
+        if not missing:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bootstrap-bars") as pool:
+            ok = list(pool.map(self._fetch_one, missing))
+        self.stats["bars_fetched"] += sum(ok)
+        self.stats["bar_fetch_failures"] += len(ok) - sum(ok)
+        logger.info(f"Bootstrap: fetched grouped bars for {sum(ok)}/{len(missing)} dates")
+        return sum(ok)
+
+    # ---------------- prices ----------------
+    def _dates_with_prices(self, date_ids: List[str]) -> set:
+        with self.manager.driver.session() as session:
+            result = session.run("""
+                MATCH (d:Date)-[r:HAS_PRICE]->(e)
+                WHERE d.id IN $date_ids
+                WITH d.id AS date_id, count(r) AS rel_count
+                WHERE rel_count > 0
+                RETURN collect(date_id) AS dates_with_relationships
+                """, {"date_ids": date_ids}).single()
+        return set(result["dates_with_relationships"]) if result else set()
+
+    def _price_params(self, node: DateNode, entities: Dict[str, Tuple[str, str]]) -> List[dict]:
+        prev = node.previous_trading_date
+        if not (self.store.has_bars(node.date_str) and self.store.has_bars(prev)):
+            return []
+        frame = daily_summary(self.store.read_bars(node.date_str), self.store.read_bars(prev))
+        if frame is None:
+            return []
+        params = []
+        for ticker, row in frame.iterrows():
+            if ticker not in entities:
+                continue
+            props = row.to_dict()
+            if "timestamp" in props and pd.notnull(props["timestamp"]):
+                props["timestamp"] = props["timestamp"].strftime(TIME_FORMAT)
+            entity_id, entity_type = entities[ticker]
+            params.append({"date_id": node.id, "entity_id": entity_id, "entity_type": entity_type,
+                           "properties": props})
+        return params
+
+    def load_prices(self, nodes: List[DateNode], entities: Dict[str, Tuple[str, str]]) -> int:
+        """Fetch bars and write HAS_PRICE for past trading days not yet loaded. Returns relationships written."""
+        candidates = [n for n in nodes if n.is_trading_day and n.date_str < self.today
+                      and n.previous_trading_date and not self.store.is_loaded(n.date_str)]
+        if not candidates or not entities:
+            return 0
+        already = self._dates_with_prices([n.id for n in candidates])
+        if already:
+            self.store.mark_loaded(already)
+            candidates = [n for n in candidates if n.id not in already]
+        self.fetch_bars([d for n in candidates for d in (n.date_str, n.previous_trading_date)])
+
+        written = 0
+        chunk, chunk_dates = [], []
+        for node in candidates:
+            params = self._price_params(node, entities)
+            if not params:
+                continue
+            chunk.extend(params)
+            chunk_dates.append(node.date_str)
+            if len(chunk) >= self.batch_size:
+                written += self._write_price_chunk(chunk, chunk_dates)
+                chunk, chunk_dates = [], []
+        if chunk:
+            written += self._write_price_chunk(chunk, chunk_dates)
+        self.stats["price_rels"] += written
+        logger.info(f"Bootstrap: wrote {written} HAS_PRICE relationships")
+        return written
+
+    def _write_price_chunk(self, params: List[dict], dates: List[str]) -> int:
+        count = self.manager.create_price_relationships_batch(params)
+        if count:                                   # 0 = the transaction failed (logged by the manager)
+            self.store.mark_loaded(dates)
+            self.stats["price_dates_loaded"] += len(dates)
+        return count
+
+    # ---------------- dividends / splits ----------------
+    def _fetch_events(self, kind: str, tickers: List[str]) -> pd.DataFrame:
+        cached = self.store.read_events(kind, self.today)
+        if cached is not None:
+            return cached
+        fetch = self.polygon.get_dividends if kind == "dividends" else self.polygon.get_splits
+        size = max(1, -(-len(tickers) // self.workers))
+        chunks = [tickers[i:i + size] for i in range(0, len(tickers), size)]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"bootstrap-{kind}") as pool:
+            frames = [f for f in pool.map(fetch, chunks) if f is not None and not f.empty]
+        frame = pd.concat(frames) if frames else pd.DataFrame()
+        if not frame.empty:
+            try:
+                self.store.write_events(kind, self.today, frame)
+            except Exception as e:                  # cache only; the load itself does not need it
+                logger.warning(f"Bootstrap: could not store {kind}: {e}")
+        return frame
+
+    def _run_chunked(self, query: str, params: List[dict]) -> int:
+        total = 0
+        with self.manager.driver.session() as session:
+            for i in range(0, len(params), self.batch_size):
+                record = session.run(query, {"params": params[i:i + self.batch_size]}).single()
+                total += record["created"] if record else 0
+        return total
+
+    def _existing_dates(self, dates: List[str]) -> set:
+        with self.manager.driver.session() as session:
+            result = session.run("MATCH (d:Date) WHERE d.date IN $dates RETURN d.date as date", {"dates": dates})
+            return {record["date"] for record in result}
+
+    def load_dividends(self, tickers: List[str], start_date: str) -> int:
+        frame = self._fetch_events("dividends", tickers)
+        if frame.empty:
+            return 0
+        frame = frame[frame["declaration_date"] >= start_date]
+        existing = self._existing_dates(frame["declaration_date"].unique().tolist())
+        nodes = []
+        for ticker, row in frame[frame["declaration_date"].isin(existing)].iterrows():
+            data = row.to_dict()
+            data["ticker"] = ticker
+            nodes.append(DividendNode.from_dividend_data(data))
+        if not nodes:
+            return 0
+        self.manager.merge_nodes_bulk(nodes, batch_size=self.batch_size)
+        self._run_chunked(DIVIDEND_COMPANY_QUERY, [{"company_ticker": n.ticker, "dividend_id": n.id} for n in nodes])
+        self._run_chunked(DIVIDEND_DATE_QUERY, [{"date_str": n.declaration_date, "dividend_id": n.id} for n in nodes])
+        self.stats["dividends"] += len(nodes)
+        logger.info(f"Bootstrap: merged {len(nodes)} dividends since {start_date}")
+        return len(nodes)
+
+    def load_splits(self, tickers: List[str], start_date: str) -> int:
+        frame = self._fetch_events("splits", tickers)
+        if frame.empty:
+            return 0
+        with self.manager.driver.session() as session:
+            record = session.run("MATCH (d:Date) RETURN min(d.date) as min_date").single()
+        min_date = record["min_date"] if record else None
+        if not min_date:
+            logger.error("Bootstrap: no Date nodes found; cannot load splits")
+            return 0
+        frame = frame[(frame["execution_date"] >= start_date) & (frame["execution_date"] >= min_date)]
+        nodes = []
+        for ticker, row in frame.iterrows():
+            data = row.to_dict()
+            data["ticker"] = ticker
+            nodes.append(SplitNode.from_split_data(data))
+        if not nodes:
+            return 0
+        self.manager.merge_nodes_bulk(nodes, batch_size=self.batch_size)
+        self._run_chunked(SPLIT_COMPANY_QUERY, [{"company_ticker": n.ticker, "split_id": n.id} for n in nodes])
+        self._run_chunked(SPLIT_DATE_QUERY, [{"company_ticker": n.ticker, "date_str": n.execution_date,
+                                              "split_id": n.id} for n in nodes if n.execution_date < self.today])
+        self.stats["splits"] += len(nodes)
+        logger.info(f"Bootstrap: merged {len(nodes)} splits since {start_date}")
+        return len(nodes)
@@ -5,6 +5,7 @@ import logging
 import json
 import os
 import asyncio
+import threading
 from hashlib import sha256
 from typing import Dict, List, Any
 from utils.chromadb_safe import safe_chromadb_call as chroma
@@ -23,15 +24,29 @@ from config.feature_flags import (
     ENABLE_QAEXCHANGE_EMBEDDINGS,
     MAX_EMBEDDING_CHARS,
     NEWS_EMBEDDING_BATCH_SIZE,
-    QAEXCHANGE_EMBEDDING_BATCH_SIZE
+    QAEXCHANGE_EMBEDDING_BATCH_SIZE,
+    ENABLE_LOCAL_VECTOR_MIRROR,
+    VECTOR_MIRROR_DIR,
+    VECTOR_MIRROR_DIMS,
+    VECTOR_MIRROR_NPROBE,
+    VECTOR_MIRROR_RESCORE_CANDIDATES,
+    VECTOR_MIRROR_SAVE_EVERY,
+    QUERY_EMBEDDING_CACHE_SIZE
 )
 
+from ..embedding_batcher import batcher_from_flags, genai_encoder, unwind_writer
+from ..vector_mirror import BackgroundMirror, LocalSimilarityEngine, QuantizedVectorIndex, QueryEmbeddingCache
+
 # Updated path for local import
 from openai_local.openai_parallel_embeddings import process_embeddings_in_parallel
 from openai_local.openai_token_counter import truncate_for_embeddings, count_tokens
 
 logger = logging.getLogger(__name__)
 
+_MIRROR_LOCK = threading.RLock()
+_BATCHER_LOCK = threading.Lock()
+MIRRORED_LABELS = ("News", "QAExchange")
+
 class EmbeddingMixin:
     """
     Handles vector embeddings, interaction with ChromaDB, and vector similarity search.
@@ -42,6 +57,117 @@ class EmbeddingMixin:
         """Execute QAExchange embedding cypher query with retry for OpenAI failures"""
         return self.manager.execute_cypher_query(cypher, params)
     
+    def _embedding_batcher(self, label):
+        """Live micro-batcher for News / QAExchange embeddings, or None when ENABLE_EMBEDDING_MICROBATCH is off."""
+        batchers = self.__dict__.setdefault("_embedding_batchers", {})
+        with _BATCHER_LOCK:     # two first writers must not each start a batcher thread
+            if label in batchers:
+                return batchers[label]
+            config = {"token": OPENAI_API_KEY, "model": OPENAI_EMBEDDING_MODEL}
+            encode = genai_encoder(self.manager, config)
+            if label == "QAExchange":
+                encode = retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2))(encode)
+            cache = self.chroma_collection if USE_CHROMADB_CACHING else None
+            write = unwind_writer(self.manager, label)
+
+            def write_and_mirror(rows):
+                written = write(rows)
+                done = set(written)
+                self._mirror_sync(label, {r["id"]: r["embedding"] for r in rows if r["id"] in done})
+                return written
+
+            batchers[label] = batcher_from_flags(label, encode, write_and_mirror, cache=cache, cache_call=chroma)
+            return batchers[label]
+
+    def _vector_mirror(self, label):
+        """BackgroundMirror of a label's embeddings (load/build + catch-up started on first use), or None when disabled."""
+        if not ENABLE_LOCAL_VECTOR_MIRROR or label not in MIRRORED_LABELS:
+            return None
+        with _MIRROR_LOCK:
+            mirrors = self.__dict__.setdefault("_vector_mirrors", {})
+            if label in mirrors:
+                return mirrors[label]
+            ids_query = f"""
+            MATCH (n:{label})
+            WHERE n.embedding IS NOT NULL AND n.id > $after
+            RETURN n.id AS id
+            ORDER BY n.id
+            LIMIT $page
+            """
+            fetch_query = f"""
+            MATCH (n:{label})
+            WHERE n.id IN $ids AND n.embedding IS NOT NULL
+            RETURN n.id AS id, n.embedding AS embedding
+            """
+
+            def list_ids(after):
+                rows = self.manager.execute_cypher_query_all(ids_query, {"after": after, "page": 20000}) or []
+                return [r["id"] for r in rows]
+
+            def fetch(ids):
+                rows = self.manager.execute_cypher_query_all(fetch_query, {"ids": ids}) or []
+                return [(r["id"], r["embedding"]) for r in rows]
+
+            mirrors[label] = BackgroundMirror(
+                label, os.path.join(VECTOR_MIRROR_DIR, f"{label}.npz"),
+                lambda: QuantizedVectorIndex(dims=VECTOR_MIRROR_DIMS, n_probe=VECTOR_MIRROR_NPROBE),
+                list_ids, fetch).start()
+            self.__dict__.setdefault("_vector_mirror_pending", {})[label] = 0
+            return mirrors[label]
+
+    def _mirror_sync(self, label, embeddings):
+        """Upsert freshly written {node_id: embedding} into the label's mirror (queued until it is ready);
+        saves every VECTOR_MIRROR_SAVE_EVERY."""
+        if not embeddings or not ENABLE_LOCAL_VECTOR_MIRROR or label not in MIRRORED_LABELS:
+            return
+        try:
+            mirror = self._vector_mirror(label)
+            added = mirror.upsert(list(embeddings), list(embeddings.values()))
+            with _MIRROR_LOCK:
+                pending = self._vector_mirror_pending
+                pending[label] = pending.get(label, 0) + added
+                if pending[label] < VECTOR_MIRROR_SAVE_EVERY:
+                    return
+                pending[label] = 0
+            mirror.save()
+        except Exception as e:
+            logger.warning(f"[VECTOR-MIRROR] Failed to sync {len(embeddings)} {label} embeddings: {e}")
+
+    def _save_vector_mirrors(self):
+        for label, mirror in getattr(self, "_vector_mirrors", {}).items():
+            try:
+                mirror.save()
+            except Exception as e:
+                logger.warning(f"[VECTOR-MIRROR] Failed to save {label} mirror: {e}")
+
+    def _similarity_engine(self, label):
+        """LocalSimilarityEngine over the label's mirror; None when ENABLE_LOCAL_VECTOR_MIRROR is off
+        or the mirror is still loading (searches then use Neo4j directly)."""
+        mirror = self._vector_mirror(label)
+        if mirror is None or not mirror.ready:
+            return None
+        index = mirror.index
+        engines = self.__dict__.setdefault("_similarity_engines", {})
+        if label not in engines:
+            cache = self.__dict__.setdefault("_query_embedding_cache", QueryEmbeddingCache(QUERY_EMBEDDING_CACHE_SIZE))
+            embedding_query = """
+            WITH $query_text AS text, $config AS config
+            CALL genai.vector.encodeBatch([text], 'OpenAI', config) 
+            YIELD index, vector
+            RETURN vector AS query_embedding
+            """
+
+            def encode(text):
+                result = self.manager.execute_cypher_query(embedding_query, {
+                    "query_text": text,
+                    "config": {"token": OPENAI_API_KEY, "model": OPENAI_EMBEDDING_MODEL}
+                })
+                return result.get("query_embedding") if result else None
+
+            engines[label] = LocalSimilarityEngine(index, encode, rescore=None, cache=cache,
+                                                   candidates=VECTOR_MIRROR_RESCORE_CANDIDATES)
+        return engines[label]
+
     def create_vector_index(self, label, property_name, index_name=None, dimensions=3072, similarity_function="cosine"):
         """
         Create a vector index for any node type and property
@@ -301,6 +427,7 @@ class EmbeddingMixin:
                 )
                 results["cached"] = total_cached
                 logger.info(f"Applied {total_cached} cached embeddings from ChromaDB")
+                self._mirror_sync(label, {node_id: data["embedding"] for node_id, data in cached_embeddings.items()})
             
             # Generate new embeddings for remaining nodes
             if nodes_needing_embeddings:
@@ -326,6 +453,7 @@ class EmbeddingMixin:
                         
                         # Process results
                         processed = 0
+                        written = {}
                         for i, embedding in enumerate(embeddings):
                             if embedding:
                                 # Store in Neo4j
@@ -341,6 +469,7 @@ class EmbeddingMixin:
                                 })
                                 if result and result.get("updated", 0) > 0:
                                     processed += 1
+                                    written[all_nodes[i]] = embedding
                                     
                                     # Store in ChromaDB if enabled
                                     if use_chromadb:
@@ -356,6 +485,7 @@ class EmbeddingMixin:
                                                 logger.warning(f"Error storing in ChromaDB: {e}")
                         
                         # After processing all embeddings, update results and return
+                        self._mirror_sync(label, written)
                         results["processed"] = processed
                         logger.info(f"[EMBED-FLOW] Completed parallel OpenAI embedding: {results}")
                         return {"status": "completed", **results, "total": len(all_items)}
@@ -416,8 +546,8 @@ class EmbeddingMixin:
                         # 6. Embedding Generation Failure Path
                         logger.warning(f"[EMBED-FLOW] Neo4j encodeBatch FAILED to generate any embeddings for {len(nodes_needing_embeddings)} items")
                     
-                    # Store new embeddings in ChromaDB if enabled
-                    if use_chromadb and processed > 0:
+                    # Store new embeddings in ChromaDB (and the local vector mirror) if enabled
+                    if (use_chromadb or ENABLE_LOCAL_VECTOR_MIRROR) and processed > 0:
                         fetch_query = f"""
                         MATCH (n:{label})
                         WHERE n.{id_property} IN $nodes AND n.{embedding_property} IS NOT NULL
@@ -430,11 +560,14 @@ class EmbeddingMixin:
                             if not isinstance(embeddings_result, list):
                                 embeddings_result = [embeddings_result]
                             
-                            for item in embeddings_result:
+                            self._mirror_sync(label, {item["id"]: item["embedding"] for item in embeddings_result
+                                                      if item.get("embedding")})
+                            node_by_id = {n["id"]: n for n in nodes_needing_embeddings}
+                            for item in embeddings_result if use_chromadb else []:
                                 try:
                                     node_id = item["id"]
                                     embedding = item["embedding"]
-                                    node_data = next((n for n in nodes_needing_embeddings if n["id"] == node_id), None)
+                                    node_data = node_by_id.get(node_id)
                                     
                                     if node_data and embedding:
                                         content_hash = sha256(node_data["content"].encode()).hexdigest()
@@ -694,7 +827,12 @@ class EmbeddingMixin:
 
 
     def _create_news_embedding(self, news_id):
-        """Generate embedding for a single news item using Neo4j's GenAI function"""
+        """Generate embedding for a single news item using Neo4j's GenAI function
+
+        With ENABLE_EMBEDDING_MICROBATCH on, returns the batcher's Future instead of
+        a bool: it resolves to True only once the embedding is written, so do not
+        count the return value itself as a success.
+        """
         if not self.manager and not self.connect():
             return False
             
@@ -737,6 +875,10 @@ class EmbeddingMixin:
             # Truncate text to token limit using tiktoken
             content = truncate_for_embeddings(content, OPENAI_EMBEDDING_MODEL)
             
+            batcher = self._embedding_batcher("News")
+            if batcher is not None:
+                return batcher.submit(news_id, content)
+            
             embedding = None
             
             # Check if we should try to get embedding from ChromaDB first
@@ -773,7 +915,10 @@ class EmbeddingMixin:
                         })
                         
                         logger.info(f"[EMBED-FLOW] Successfully generated embedding for news {news_id}")
-                        return result and result.get("processed", 0) > 0
+                        if result and result.get("processed", 0) > 0:
+                            self._mirror_sync("News", {news_id: embedding})
+                            return True
+                        return False
                         
                 except Exception as e:
                     logger.warning(f"Error checking ChromaDB: {e}")
@@ -839,6 +984,7 @@ class EmbeddingMixin:
                         logger.warning(f"Failed to store embedding in ChromaDB: {e}")
             
             if success:
+                self._mirror_sync("News", {news_id: result.get("embedding")} if result.get("embedding") else {})
                 logger.info(f"[EMBED-FLOW] Successfully generated embedding for news {news_id}")
             else:
                 logger.error(f"[EMBED-FLOW] Failed to generate embedding for news {news_id}, result: {result}")
@@ -852,7 +998,10 @@ class EmbeddingMixin:
 
     
     def _create_qaexchange_embedding(self, qa_id):
-        """Generate embedding for a single QAExchange item"""
+        """Generate embedding for a single QAExchange item
+
+        Returns a Future under ENABLE_EMBEDDING_MICROBATCH, as _create_news_embedding does.
+        """
         if not self.manager and not self.connect():
             return False
             
@@ -906,6 +1055,10 @@ class EmbeddingMixin:
             if not content:
                 return False
             
+            batcher = self._embedding_batcher("QAExchange")
+            if batcher is not None:
+                return batcher.submit(qa_id, content)
+            
             embedding = None
             
             # Check if we should try to get embedding from ChromaDB first
@@ -943,7 +1096,10 @@ class EmbeddingMixin:
                         })
                         
                         logger.info(f"Successfully applied cached embedding for QAExchange {qa_id}")
-                        return result and result.get("processed", 0) > 0
+                        if result and result.get("processed", 0) > 0:
+                            self._mirror_sync("QAExchange", {qa_id: embedding})
+                            return True
+                        return False
                         
                 except Exception as e:
                     logger.warning(f"Error checking ChromaDB: {e}")
@@ -1009,6 +1165,7 @@ class EmbeddingMixin:
                         logger.warning(f"Failed to store embedding in ChromaDB: {e}")
             
             if success:
+                self._mirror_sync("QAExchange", {qa_id: result.get("embedding")} if result.get("embedding") else {})
                 logger.info(f"Successfully generated embedding for QAExchange {qa_id}")
             else:
                 logger.warning(f"Failed to generate embedding for QAExchange {qa_id}, result: {result}")
@@ -1052,6 +1209,14 @@ class EmbeddingMixin:
             # Truncate query to token limit
             query_text = truncate_for_embeddings(query_text, OPENAI_EMBEDDING_MODEL)
             
+            engine = (self._similarity_engine(node_label)
+                      if embedding_property == "embedding" and id_property == "id" else None)
+            if engine is not None and len(engine.index):
+                results = self._mirror_similarity_search(engine, query_text, node_label, limit, min_score,
+                                                         return_properties or [id_property])
+                if results is not None:
+                    return results
+            
             # Generate embedding for query text
             embedding_query = """
             WITH $query_text AS text, $config AS config
@@ -1135,6 +1300,27 @@ class EmbeddingMixin:
             return []
 
 
+    def _mirror_similarity_search(self, engine, query_text, node_label, limit, min_score, return_properties):
+        """Candidates from the local mirror, rescored exactly in Neo4j; None if the query could not be encoded."""
+        return_clause = ", ".join([f"node.{prop} AS {prop}" for prop in return_properties])
+        rescore_query = f"""
+        MATCH (node:{node_label})
+        WHERE node.id IN $ids AND node.embedding IS NOT NULL
+        WITH node, vector.similarity.cosine(node.embedding, $query_embedding) AS score
+        RETURN node.id AS id, {return_clause}, score
+        """
+
+        def rescore(query_embedding, ids):
+            return self.manager.execute_cypher_query_all(rescore_query, {
+                "ids": ids, "query_embedding": [float(v) for v in query_embedding]
+            }) or []
+
+        results = engine.search(query_text, limit=limit, min_score=min_score, rescore=rescore)
+        if results is not None:
+            logger.info(f"[EMBED-FLOW] Local mirror search returned {len(results)} {node_label} results "
+                        f"({engine.cache.hits} query cache hits so far)")
+        return results
+
     def check_chromadb_status(self):
         """
         Check the status of ChromaDB configuration and data persistence
@@ -92,6 +92,13 @@ class InitializationMixin:
     
     def close(self):
         """Close Neo4j connection"""
+        # Flush queued live embeddings (only present when ENABLE_EMBEDDING_MICROBATCH is on)
+        for batcher in getattr(self, "_embedding_batchers", {}).values():
+            if batcher is not None:
+                batcher.stop()
+        if hasattr(self, "_save_vector_mirrors"):
+            self._save_vector_mirrors()
+            
         if self.manager:
             self.manager.close()
             
@@ -7,6 +7,7 @@ import threading
 import time # Likely needed for sleep in the loop
 from typing import Dict, List, Optional, Any
 from redisDB.redis_constants import RedisKeys
+from utils.lifecycle_trace import trace
 from config.feature_flags import ENABLE_NEWS_EMBEDDINGS, PUBSUB_RECONCILIATION_INTERVAL
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,7 @@ class PubSubMixin:
             RedisKeys.SOURCE_REPORTS    if content_type == "report" else
             RedisKeys.SOURCE_TRANSCRIPTS
         )
+        trace(source_for_meta, item_id, "pubsub_pickup")
 
         try:
             logger.info(f"Processing {content_type} update from {channel}: {item_id}")
@@ -128,6 +130,12 @@ class PubSubMixin:
                     
                     logger.info(f"Successfully processed report {item_id}")
 
+                    if success:
+                        accession_no = report_id.split('.')[0]  # item ids are "ACCNO.timestamp"
+                        self.event_trader_redis.live_client.publish_asset_ingested(
+                            "report", accession_no,
+                            self._extract_symbols_from_data(report_data))
+
                 else:
                     logger.warning("No data found for report %s", item_id)
 
@@ -175,6 +183,10 @@ class PubSubMixin:
 
                         logger.info(f"Successfully processed transcript {resolved_id}")
 
+                        self.event_trader_redis.live_client.publish_asset_ingested(
+                            "transcript", resolved_id,
+                            [transcript_data.get("symbol") or resolved_id.split("_")[0]])
+
                         try:
                             # Get ALL QAExchange nodes for this transcript
                             query = """
@@ -214,7 +226,7 @@ class PubSubMixin:
 
 
     def _generate_embeddings_for_pubsub_item(self, news_id):
-        """Generate embedding for a news item received via PubSub"""
+        """Generate embedding for a news item received via PubSub (a Future when micro-batched, see _create_news_embedding)"""
         
         if not ENABLE_NEWS_EMBEDDINGS:
             return False
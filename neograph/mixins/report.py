@@ -19,6 +19,37 @@ from ..EventTraderNodes import (
 )
 logger = logging.getLogger(__name__)
 
+# ON MATCH SET list for the Report MERGE, shared with the batched writer (neograph/report_writer.py)
+REPORT_ON_MATCH_SET = [
+    "r.cik = CASE WHEN (r.cik IS NULL OR r.cik = '') AND $cik IS NOT NULL AND $cik <> '' THEN $cik ELSE r.cik END",
+    "r.description = CASE WHEN $updated > r.updated THEN $description ELSE r.description END",
+    "r.formType = CASE WHEN $updated > r.updated THEN $formType ELSE r.formType END",
+    "r.periodOfReport = CASE WHEN $updated > r.updated THEN $periodOfReport ELSE r.periodOfReport END",
+    "r.effectivenessDate = CASE WHEN $updated > r.updated THEN $effectivenessDate ELSE r.effectivenessDate END",
+    "r.updated = CASE WHEN $updated > r.updated THEN $updated ELSE r.updated END",
+    "r.primaryDocumentUrl = $primaryDocumentUrl",
+    "r.linkToHtml = $linkToHtml",
+    "r.linkToTxt = $linkToTxt",
+    "r.linkToFilingDetails = $linkToFilingDetails",
+    "r.exhibits = $exhibits",
+    "r.entities = $entities",
+    "r.items = $items",
+    "r.symbols = $symbols",
+    "r.is_xml = $is_xml",
+    "r.isAmendment = $isAmendment",
+    "r.accessionNo = $id",
+    "r.id = $id",
+    "r.market_session = $market_session",
+    "r.returns_schedule = $returns_schedule",
+    "r.extracted_sections = CASE WHEN $updated > r.updated THEN $extracted_sections ELSE r.extracted_sections END",
+    "r.financial_statements = CASE WHEN $updated > r.updated THEN $financial_statements ELSE r.financial_statements END",
+    "r.exhibit_contents = CASE WHEN $updated > r.updated THEN $exhibit_contents ELSE r.exhibit_contents END",
+    "r.filing_text_content = CASE WHEN $updated > r.updated THEN $filing_text_content ELSE r.filing_text_content END",
+    "r.xbrl_status = CASE WHEN $updated > r.updated AND $xbrl_status IS NOT NULL THEN $xbrl_status ELSE r.xbrl_status END",
+    "r.created = $created"
+]
+
+
 class ReportMixin:
     """
     Handles processing and storage of report data (e.g., 8-K, 10-K) into Neo4j.
@@ -138,6 +169,9 @@ class ReportMixin:
         total_reports = len(all_keys)
         logger.info(f"Processing {total_reports} total reports")
         
+        from config.feature_flags import ENABLE_REPORT_SUBGRAPH_WRITER
+        use_subgraph_writer = ENABLE_REPORT_SUBGRAPH_WRITER
+        
         # Process in batches
         processed_count = 0
         error_count = 0
@@ -149,6 +183,9 @@ class ReportMixin:
             
             logger.info(f"Processing batch {batch_start//batch_size + 1}, items {batch_start+1}-{batch_start+batch_size_actual} of {total_reports}")
             
+            # With the subgraph writer, reports are parsed here and committed per batch
+            pending_plans = []
+            
             # Process each report in the batch
             for key in batch_keys:
                 try:
@@ -200,6 +237,11 @@ class ReportMixin:
                         
                     # Parse JSON data and process
                     report_data = json.loads(raw_data)
+                    if use_subgraph_writer:
+                        # Written below, together with the rest of this batch
+                        pending_plans.append((key, report_id, namespace, delete_client,
+                                              self._prepare_report_plan(report_id, report_data)))
+                        continue
                     success = self._process_deduplicated_report(report_id, report_data)
                     
                     # Finalize processing with proper cleanup
@@ -221,6 +263,11 @@ class ReportMixin:
                     logger.error(f"Error processing report key {key}: {e}", exc_info=True)
                     error_count += 1
                 
+            if pending_plans:
+                batch_processed, batch_errors = self._flush_report_plans(pending_plans)
+                processed_count += batch_processed
+                error_count += batch_errors
+            
             logger.info(f"Processed batch {batch_start//batch_size + 1}/{(len(all_keys) + batch_size - 1)//batch_size}")
             
         # Summary and status
@@ -303,22 +350,25 @@ class ReportMixin:
             accession_no = report_id[:20]
             report_node, node_properties, valid_symbols, company_params, sector_params, industry_params, market_params, report_timestamps = self._prepare_report_data(accession_no, report_data)
             
-            # Execute all database operations
-            success = self._execute_report_database_operations(
-                accession_no, report_node, node_properties, valid_symbols,
-                company_params, sector_params, industry_params, market_params,
-                report_timestamps
-            )
+            from config.feature_flags import ENABLE_REPORT_SUBGRAPH_WRITER
+            if ENABLE_REPORT_SUBGRAPH_WRITER:
+                # Whole report subgraph in one transaction
+                plan = self._build_report_subgraph(
+                    accession_no, report_node, node_properties, valid_symbols,
+                    company_params, sector_params, industry_params, market_params,
+                    report_timestamps
+                )
+                success = self._write_report_subgraphs([plan]).get(accession_no, False)
+            else:
+                # Execute all database operations
+                success = self._execute_report_database_operations(
+                    accession_no, report_node, node_properties, valid_symbols,
+                    company_params, sector_params, industry_params, market_params,
+                    report_timestamps
+                )
 
             if success:
-                # with a single physical Redis, "history" - That's the one every reader expects, so we must use it when we write meta hashes. Using live_client would prefix the key with live: and no guard would ever see it. Hence we keep history_client unconditionally.
-                meta_key = f"tracking:meta:{RedisKeys.SOURCE_REPORTS}:{report_id}"
-                self.event_trader_redis.history_client.mark_lifecycle_timestamp(
-                    meta_key, "inserted_into_neo4j_at"
-                )
-                # Durable no-TTL dedup SET (keyed by accessionNo only — no timezone ambiguity)
-                accession_no = report_id.split('.')[0]
-                self.event_trader_redis.history_client.client.sadd("reports:confirmed_in_neo4j", accession_no)
+                self._mark_report_inserted(report_id)
 
             return success
         except Exception as e:
@@ -328,7 +378,217 @@ class ReportMixin:
 
 
 
-    def _execute_report_database_operations(self, report_id, report_node, node_properties, valid_symbols, 
+    def _report_merge_params(self, node_properties, updated_str):
+        """Parameters for the Report MERGE (node properties plus every $param REPORT_ON_MATCH_SET references)."""
+        # Create parameter dictionary from node_properties
+        query_params = {
+            "updated": updated_str,  # For conditional updates
+        }
+
+        # Add all node properties to query params
+        for key, value in node_properties.items():
+            query_params[key] = value
+
+        # Ensure all referenced parameters exist (even if they weren't in node_properties)
+        required_params = ["periodOfReport", "effectivenessDate", "financial_statements", "exhibit_contents",
+                         "extracted_sections", "market_session", "returns_schedule", "filing_text_content", "items"]
+
+        for param in required_params:
+            if param not in query_params:
+                if param in ["financial_statements", "exhibit_contents", "extracted_sections", "returns_schedule"]:
+                    # These need to be JSON strings
+                    query_params[param] = json.dumps({})
+                elif param == "filing_text_content":
+                    # This is a text field that can be null
+                    query_params[param] = None
+                elif param == "items":
+                    # Default items to empty array as JSON string
+                    query_params[param] = json.dumps([])
+                else:
+                    # Default to empty string for other fields
+                    query_params[param] = ""
+        return query_params
+
+
+    def _maybe_enqueue_xbrl(self, session, report_props):
+        """Queue XBRL processing for a merged report if it is eligible and not already handled."""
+        # Import flags to check the exclusion list
+        from config.feature_flags import PRESERVE_XBRL_FAILED_STATUS
+
+        # Build exclusion list based on feature flag
+        excluded_statuses = ['COMPLETED', 'PROCESSING', 'SKIPPED', 'REFERENCE_ONLY']
+        if PRESERVE_XBRL_FAILED_STATUS:
+            excluded_statuses.append('FAILED')
+
+        if (self.enable_xbrl and  # Only if XBRL processing is enabled via feature flags
+            not self.xbrl_processed and
+            report_props.get('is_xml') == True and
+            report_props.get('cik') and
+            report_props.get('xbrl_status') not in excluded_statuses):
+            # Kubernetes workers and the local thread pool are both routed by _enqueue_xbrl
+            self._enqueue_xbrl(
+                session=session,
+                report_id=report_props["id"],
+                cik=report_props["cik"],
+                accessionNo=report_props["accessionNo"],
+                form_type=report_props.get("formType", "")
+            )
+
+
+    def _build_report_subgraph(self, report_id, report_node, node_properties, valid_symbols,
+                               company_params, sector_params, industry_params, market_params,
+                               report_timestamps):
+        """
+        Assemble everything _execute_report_database_operations writes for one report as
+        parameter rows for ReportSubgraphWriter (same arguments, nothing is written here).
+
+        Returns:
+            dict: {id, create, params, contents: [(node, rel_type)], companies, sectors,
+                   industries, markets, form_type}
+        """
+        filed_at, updated_at, filed_str, updated_str = report_timestamps
+
+        content_data = {
+            'extracted_sections': report_node.extracted_sections,
+            'exhibit_contents': report_node.exhibit_contents,
+            'financial_statements': report_node.financial_statements,
+            'filing_text_content': report_node.filing_text_content,
+            'formType': report_node.formType,
+            'cik': report_node.cik,
+            'created': report_node.created
+        }
+        contents = []
+        for build, rel_type in ((self._build_section_nodes, RelationType.HAS_SECTION),
+                                (self._build_exhibit_nodes, RelationType.HAS_EXHIBIT),
+                                (self._build_financial_statement_nodes, RelationType.HAS_FINANCIAL_STATEMENT),
+                                (self._build_filing_text_content_nodes, RelationType.HAS_FILING_TEXT)):
+            try:
+                contents.extend((node, rel_type.value) for node in build(report_id, content_data))
+            except Exception as e:
+                logger.error(f"Error building {rel_type.value} nodes for report {report_id}: {e}", exc_info=True)
+
+        plan = {
+            'id': report_id,
+            'create': dict(node_properties),
+            'params': self._report_merge_params(node_properties, updated_str),
+            'contents': contents,
+            'companies': [], 'sectors': [], 'industries': [], 'markets': [], 'form_type': ""
+        }
+
+        # Relationships and category are skipped without symbols, as in the per-report path
+        if not valid_symbols:
+            logger.warning(f"No valid symbols found for report {report_id}")
+            return plan
+
+        # PRIMARY_FILER vs REFERENCED_IN is decided in Cypher against the merged report cik
+        plan['companies'] = list({param['cik']: param for param in company_params}.values())
+        plan['sectors'] = list(sector_params or [])
+        plan['industries'] = list(industry_params or [])
+        plan['markets'] = list(market_params or [])
+        plan['form_type'] = report_node.formType.split('/')[0] if report_node.formType else ""
+        return plan
+
+
+    def _get_report_writer(self):
+        """Lazily created ReportSubgraphWriter bound to this manager."""
+        writer = getattr(self, '_report_writer', None)
+        if writer is None:
+            from config.feature_flags import REPORT_WRITER_BATCH_SIZE
+            from ..report_writer import ReportSubgraphWriter
+            writer = ReportSubgraphWriter(self.manager, REPORT_ON_MATCH_SET, batch_size=REPORT_WRITER_BATCH_SIZE)
+            self._report_writer = writer
+        return writer
+
+
+    def _write_report_subgraphs(self, plans):
+        """
+        Commit report plans through the batched writer and run the XBRL enqueue hook on
+        each merged report.
+
+        Returns:
+            dict: report_id -> bool success
+        """
+        if not plans:
+            return {}
+        results = self._get_report_writer().write(plans)
+        merged = [props for props in results.values() if props]
+        if merged:
+            with self.manager.driver.session() as session:
+                for report_props in merged:
+                    try:
+                        self._maybe_enqueue_xbrl(session, report_props)
+                    except Exception as e:
+                        logger.error(f"Error enqueueing XBRL for report {report_props.get('id')}: {e}", exc_info=True)
+        for report_id, props in results.items():
+            if not props:
+                logger.error(f"Failed to create or update report node {report_id}")
+        return {report_id: bool(props) for report_id, props in results.items()}
+
+
+    def _mark_report_inserted(self, report_id):
+        """Record a successful Neo4j insert in the report's meta hash and the durable dedup set."""
+        # with a single physical Redis, "history" - That's the one every reader expects, so we must use it when we write meta hashes. Using live_client would prefix the key with live: and no guard would ever see it. Hence we keep history_client unconditionally.
+        meta_key = f"tracking:meta:{RedisKeys.SOURCE_REPORTS}:{report_id}"
+        self.event_trader_redis.history_client.mark_lifecycle_timestamp(
+            meta_key, "inserted_into_neo4j_at"
+        )
+        # Durable no-TTL dedup SET (keyed by accessionNo only — no timezone ambiguity)
+        accession_no = report_id.split('.')[0]
+        self.event_trader_redis.history_client.client.sadd("reports:confirmed_in_neo4j", accession_no)
+
+
+    def _prepare_report_plan(self, report_id, report_data):
+        """Prepare a report and return its subgraph plan, or None if it could not be prepared."""
+        try:
+            accession_no = report_id[:20]
+            prepared = self._prepare_report_data(accession_no, report_data)
+            return self._build_report_subgraph(accession_no, *prepared)
+        except Exception as e:
+            logger.error(f"Error preparing report {report_id}: {e}", exc_info=True)
+            return None
+
+
+    def _flush_report_plans(self, pending_plans):
+        """
+        Write the plans collected for one Redis batch and finalize each key.
+        
+        Args:
+            pending_plans: List of (redis_key, report_id, namespace, delete_client, plan)
+            
+        Returns:
+            tuple: (processed_count, error_count)
+        """
+        plans = [plan for *_, plan in pending_plans if plan]
+        try:
+            results = self._write_report_subgraphs(plans)
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(plans)} reports: {e}", exc_info=True)
+            results = {}
+        
+        processed_count = error_count = 0
+        for key, report_id, namespace, delete_client, plan in pending_plans:
+            success = bool(plan) and results.get(plan['id'], False)
+            if success:
+                try:
+                    self._mark_report_inserted(report_id)
+                except Exception as e:
+                    logger.error(f"Error marking report {report_id} as inserted: {e}", exc_info=True)
+            self._finalize_report_batch(
+                delete_client=delete_client,
+                redis_key=key,
+                report_id=report_id,
+                success=success,
+                namespace=namespace,
+                failure_reason="neo4j_insertion_failed"
+            )
+            if success:
+                processed_count += 1
+            else:
+                error_count += 1
+        return processed_count, error_count
+
+
+    def _execute_report_database_operations(self, report_id, report_node, node_properties, valid_symbols,
                                            company_params, sector_params, industry_params, market_params, 
                                            report_timestamps):
         """
@@ -357,65 +617,9 @@ class ReportMixin:
         for key, value in node_properties.items():
             on_create_parts.append(f"r.{key} = ${key}")
         
-        # Build ON MATCH SET parts with conditional updates for content fields
-        on_match_parts = [
-            "r.cik = CASE WHEN (r.cik IS NULL OR r.cik = '') AND $cik IS NOT NULL AND $cik <> '' THEN $cik ELSE r.cik END",
-            "r.description = CASE WHEN $updated > r.updated THEN $description ELSE r.description END",
-            "r.formType = CASE WHEN $updated > r.updated THEN $formType ELSE r.formType END",
-            "r.periodOfReport = CASE WHEN $updated > r.updated THEN $periodOfReport ELSE r.periodOfReport END",
-            "r.effectivenessDate = CASE WHEN $updated > r.updated THEN $effectivenessDate ELSE r.effectivenessDate END",
-            "r.updated = CASE WHEN $updated > r.updated THEN $updated ELSE r.updated END",
-            "r.primaryDocumentUrl = $primaryDocumentUrl",
-            "r.linkToHtml = $linkToHtml",
-            "r.linkToTxt = $linkToTxt",
-            "r.linkToFilingDetails = $linkToFilingDetails",
-            "r.exhibits = $exhibits",
-            "r.entities = $entities",
-            "r.items = $items",
-            "r.symbols = $symbols",
-            "r.is_xml = $is_xml",
-            "r.isAmendment = $isAmendment",
-            "r.accessionNo = $id",
-            "r.id = $id",
-            "r.market_session = $market_session",
-            "r.returns_schedule = $returns_schedule",
-            "r.extracted_sections = CASE WHEN $updated > r.updated THEN $extracted_sections ELSE r.extracted_sections END",
-            "r.financial_statements = CASE WHEN $updated > r.updated THEN $financial_statements ELSE r.financial_statements END",
-            "r.exhibit_contents = CASE WHEN $updated > r.updated THEN $exhibit_contents ELSE r.exhibit_contents END",
-            "r.filing_text_content = CASE WHEN $updated > r.updated THEN $filing_text_content ELSE r.filing_text_content END",
-            "r.xbrl_status = CASE WHEN $updated > r.updated AND $xbrl_status IS NOT NULL THEN $xbrl_status ELSE r.xbrl_status END",
-            "r.created = $created"
-        ]
-
-            # "r.xbrl_status = CASE WHEN $updated > r.updated THEN $xbrl_status ELSE r.xbrl_status END",
-
-        # Create parameter dictionary from node_properties
-        query_params = {
-            "updated": updated_str,  # For conditional updates
-        }
-        
-        # Add all node properties to query params
-        for key, value in node_properties.items():
-            query_params[key] = value
-        
-        # Ensure all referenced parameters exist (even if they weren't in node_properties)
-        required_params = ["periodOfReport", "effectivenessDate", "financial_statements", "exhibit_contents", 
-                         "extracted_sections", "market_session", "returns_schedule", "filing_text_content", "items"]
-        
-        for param in required_params:
-            if param not in query_params:
-                if param in ["financial_statements", "exhibit_contents", "extracted_sections", "returns_schedule"]:
-                    # These need to be JSON strings
-                    query_params[param] = json.dumps({})
-                elif param == "filing_text_content":
-                    # This is a text field that can be null
-                    query_params[param] = None
-                elif param == "items":
-                    # Default items to empty array as JSON string
-                    query_params[param] = json.dumps([])
-                else:
-                    # Default to empty string for other fields
-                    query_params[param] = ""
+        # ON MATCH SET parts with conditional updates for content fields
+        on_match_parts = REPORT_ON_MATCH_SET
+        query_params = self._report_merge_params(node_properties, updated_str)
         
         # Construct the complete Cypher query
         # Use id for MERGE since it has unique constraint, ensuring proper deduplication
@@ -479,64 +683,7 @@ class ReportMixin:
                 self._create_filing_text_content_nodes_from_report(report_id, filing_text_data)
             
             # Check if this report is eligible for XBRL processing and we haven't processed one yet
-            # Import flags to check processing method and exclusion list
-            from config.feature_flags import ENABLE_KUBERNETES_XBRL, PRESERVE_XBRL_FAILED_STATUS
-            
-            # Build exclusion list based on feature flag
-            excluded_statuses = ['COMPLETED', 'PROCESSING', 'SKIPPED', 'REFERENCE_ONLY']
-            if PRESERVE_XBRL_FAILED_STATUS:
-                excluded_statuses.append('FAILED')
-            
-            if (self.enable_xbrl and  # Only if XBRL processing is enabled via feature flags
-                not self.xbrl_processed and
-                report_props.get('is_xml') == True and 
-                report_props.get('cik') and
-                report_props.get('xbrl_status') not in excluded_statuses):
-                
-                # if ENABLE_KUBERNETES_XBRL:
-                #     # Use Kubernetes worker pods (queue-based approach)
-                #     if self.event_trader_redis:
-                #         xbrl_queue = RedisKeys.XBRL_QUEUE
-                #         self.event_trader_redis.history_client.push_to_queue(xbrl_queue, json.dumps({
-                #             "report_id": report_props["id"],
-                #             "accession": report_props["accessionNo"],
-                #             "cik": report_props["cik"],
-                #             "form_type": report_props["formType"]
-                #         }))
-                #         logger.info(f"[Kube]: Queued XBRL processing for {report_props['id']} via Kubernetes workers")
-                #     else:
-                #         logger.warning(f"[Kube]: Cannot queue XBRL processing for {report_props['id']}: Redis client not available")
-                # else:
-                #     # Use local thread pool with semaphore (original approach)
-                #     self._process_xbrl(
-                #         session=session,
-                #         report_id=report_props["id"],
-                #         cik=report_props["cik"],
-                #         accessionNo=report_props["accessionNo"]
-                #     )
-
-                if ENABLE_KUBERNETES_XBRL:
-                    # Use Kubernetes worker pods (queue-based approach)
-                    # Now using _enqueue_xbrl for consistent status management
-                    self._enqueue_xbrl(
-                        session=session,
-                        report_id=report_props["id"],
-                        cik=report_props["cik"],
-                        accessionNo=report_props["accessionNo"],
-                        form_type=report_props.get("formType", "")
-                    )
-                else:
-                    # Use local thread pool with semaphore (original approach)
-                    self._enqueue_xbrl(
-                        session=session,
-                        report_id=report_props["id"],
-                        cik=report_props["cik"],
-                        accessionNo=report_props["accessionNo"],
-                        form_type=form_type if 'form_type' in locals() else report_props.get("formType", "")
-                    )
-
-
-
+            self._maybe_enqueue_xbrl(session, report_props)
 
             # Skip processing if no symbols found
             if not valid_symbols:
@@ -663,6 +810,45 @@ class ReportMixin:
         return report_node
 
 
+    def _build_section_nodes(self, report_id, report_data):
+        """Section content nodes for a report's extracted_sections (not written)."""
+        extracted_sections = report_data.get('extracted_sections')
+        if not extracted_sections:
+            return []
+
+        # Get report information needed for section nodes
+        form_type = report_data.get('formType', '')
+        cik = report_data.get('cik', '')
+        filed_at = report_data.get('created', '')
+
+        # Create section nodes
+        section_nodes = []
+
+        for section_name, content in extracted_sections.items():
+            # Skip sections with null content
+            if content is None:
+                logger.warning(f"Skipping section {section_name} with null content for report {report_id}")
+                continue
+
+            # Create unique ID from report ID and section name
+            content_id = f"{report_id}_{section_name}"
+
+            # Create section content node
+            section_node = ExtractedSectionContent(
+                content_id=content_id,
+                filing_id=report_id,
+                form_type=form_type,
+                section_name=section_name,
+                content=content,
+                filer_cik=cik,
+                filed_at=filed_at
+            )
+
+            section_nodes.append(section_node)
+
+        return section_nodes
+
+
     def _create_section_nodes_from_report(self, report_id, report_data):
         """
         Create section nodes from report extracted_sections and link them to the report
@@ -676,40 +862,11 @@ class ReportMixin:
         """
         
         # Skip if no extracted sections
-        extracted_sections = report_data.get('extracted_sections')
-        if not extracted_sections:
+        if not report_data.get('extracted_sections'):
             return []
         
         try:
-            # Get report information needed for section nodes
-            form_type = report_data.get('formType', '')
-            cik = report_data.get('cik', '')
-            filed_at = report_data.get('created', '')
-            
-            # Create section nodes
-            section_nodes = []
-            
-            for section_name, content in extracted_sections.items():
-                # Skip sections with null content
-                if content is None:
-                    logger.warning(f"Skipping section {section_name} with null content for report {report_id}")
-                    continue
-                
-                # Create unique ID from report ID and section name
-                content_id = f"{report_id}_{section_name}"
-                
-                # Create section content node
-                section_node = ExtractedSectionContent(
-                    content_id=content_id,
-                    filing_id=report_id,
-                    form_type=form_type,
-                    section_name=section_name,
-                    content=content,
-                    filer_cik=cik,
-                    filed_at=filed_at
-                )
-                
-                section_nodes.append(section_node)
+            section_nodes = self._build_section_nodes(report_id, report_data)
             
             # Create the nodes
             if section_nodes:
@@ -736,6 +893,54 @@ class ReportMixin:
             return []
 
 
+    def _build_exhibit_nodes(self, report_id, report_data):
+        """Exhibit content nodes for a report's exhibit_contents (not written)."""
+        exhibit_contents = report_data.get('exhibit_contents')
+        if not exhibit_contents:
+            return []
+
+        # Make sure exhibit_contents is a dictionary if it's a JSON string
+        if isinstance(exhibit_contents, str):
+            exhibit_contents = json.loads(exhibit_contents)
+
+        # Get report information needed for exhibit nodes
+        form_type = report_data.get('formType', '')
+        cik = report_data.get('cik', '')
+        filed_at = report_data.get('created', '')
+
+        # Create exhibit nodes
+        exhibit_nodes = []
+
+        for exhibit_number, content in exhibit_contents.items():
+            if not content:
+                continue
+
+            # Create unique ID from report ID and exhibit number
+            content_id = f"{report_id}_EX-{exhibit_number}"
+
+            # Handle different content formats
+            content_str = content
+            if isinstance(content, dict) and 'text' in content:
+                content_str = content['text']
+            elif not isinstance(content, str):
+                content_str = str(content)
+
+            # Create exhibit content node
+            exhibit_node = ExhibitContent(
+                content_id=content_id,
+                filing_id=report_id,
+                form_type=form_type,
+                exhibit_number=exhibit_number,
+                content=content_str,
+                filer_cik=cik,
+                filed_at=filed_at
+            )
+
+            exhibit_nodes.append(exhibit_node)
+
+        return exhibit_nodes
+
+
     def _create_exhibit_nodes_from_report(self, report_id, report_data):
         """
         Create exhibit nodes from report exhibit_contents and link them to the report
@@ -749,49 +954,11 @@ class ReportMixin:
         """
         
         # Skip if no exhibit contents
-        exhibit_contents = report_data.get('exhibit_contents')
-        if not exhibit_contents:
+        if not report_data.get('exhibit_contents'):
             return []
         
         try:
-            # Make sure exhibit_contents is a dictionary if it's a JSON string
-            if isinstance(exhibit_contents, str):
-                exhibit_contents = json.loads(exhibit_contents)
-            
-            # Get report information needed for exhibit nodes
-            form_type = report_data.get('formType', '')
-            cik = report_data.get('cik', '')
-            filed_at = report_data.get('created', '')
-            
-            # Create exhibit nodes
-            exhibit_nodes = []
-            
-            for exhibit_number, content in exhibit_contents.items():
-                if not content:
-                    continue
-                
-                # Create unique ID from report ID and exhibit number
-                content_id = f"{report_id}_EX-{exhibit_number}"
-                
-                # Handle different content formats
-                content_str = content
-                if isinstance(content, dict) and 'text' in content:
-                    content_str = content['text']
-                elif not isinstance(content, str):
-                    content_str = str(content)
-                
-                # Create exhibit content node
-                exhibit_node = ExhibitContent(
-                    content_id=content_id,
-                    filing_id=report_id,
-                    form_type=form_type,
-                    exhibit_number=exhibit_number,
-                    content=content_str,
-                    filer_cik=cik,
-                    filed_at=filed_at
-                )
-                
-                exhibit_nodes.append(exhibit_node)
+            exhibit_nodes = self._build_exhibit_nodes(report_id, report_data)
             
             # Create the nodes
             if exhibit_nodes:
@@ -818,6 +985,33 @@ class ReportMixin:
             return []
 
 
+    def _build_filing_text_content_nodes(self, report_id, report_data):
+        """Filing text content node (as a one-element list) for a report's filing_text_content (not written)."""
+        filing_text_content = report_data.get('filing_text_content')
+        if not filing_text_content:
+            return []
+
+        # Get report information needed for the filing text content node
+        form_type = report_data.get('formType', '')
+        cik = report_data.get('cik', '')
+        filed_at = report_data.get('created', '')
+
+        # Create unique ID for this filing text content
+        content_id = f"{report_id}_text"
+
+        # Create filing text content node
+        filing_text_node = FilingTextContent(
+            content_id=content_id,
+            filing_id=report_id,
+            form_type=form_type,
+            content=filing_text_content,
+            filer_cik=cik,
+            filed_at=filed_at
+        )
+
+        return [filing_text_node]
+
+
     def _create_filing_text_content_nodes_from_report(self, report_id, report_data):
         """
         Create filing text content node from report filing_text_content and link it to the report
@@ -831,28 +1025,11 @@ class ReportMixin:
         """
         
         # Skip if no filing text content
-        filing_text_content = report_data.get('filing_text_content')
-        if not filing_text_content:
+        if not report_data.get('filing_text_content'):
             return []
         
         try:
-            # Get report information needed for the filing text content node
-            form_type = report_data.get('formType', '')
-            cik = report_data.get('cik', '')
-            filed_at = report_data.get('created', '')
-            
-            # Create unique ID for this filing text content
-            content_id = f"{report_id}_text"
-            
-            # Create filing text content node
-            filing_text_node = FilingTextContent(
-                content_id=content_id,
-                filing_id=report_id,
-                form_type=form_type,
-                content=filing_text_content,
-                filer_cik=cik,
-                filed_at=filed_at
-            )
+            [filing_text_node] = self._build_filing_text_content_nodes(report_id, report_data)
             
             # Create the node using Neo4jManager's merge_nodes method
             self.manager.merge_nodes([filing_text_node])
@@ -875,6 +1052,51 @@ class ReportMixin:
             return []
 
 
+    def _build_financial_statement_nodes(self, report_id, report_data):
+        """Financial statement content nodes (one per statement type) for a report (not written)."""
+        financial_statements = report_data.get('financial_statements')
+        if not financial_statements:
+            return []
+
+        # Make sure financial_statements is a dictionary if it's a JSON string
+        if isinstance(financial_statements, str):
+            financial_statements = json.loads(financial_statements)
+
+        # Get report information needed for financial statement nodes
+        form_type = report_data.get('formType', '')
+        cik = report_data.get('cik', '')
+        filed_at = report_data.get('created', '')
+
+        # Create financial statement nodes - one for each statement type
+        financial_nodes = []
+
+        # Process each statement type (BalanceSheets, StatementsOfIncome, etc.)
+        for statement_type, metrics in financial_statements.items():
+            if not metrics:
+                continue
+
+            # Create unique ID for this statement type
+            content_id = f"{report_id}_{statement_type}"
+
+            # Store the entire content as JSON
+            content_json = json.dumps(metrics)
+
+            # Create financial statement content node
+            financial_node = FinancialStatementContent(
+                content_id=content_id,
+                filing_id=report_id,
+                form_type=form_type,
+                statement_type=statement_type,
+                value=content_json,  # Store the entire content as JSON
+                filer_cik=cik,
+                filed_at=filed_at
+            )
+
+            financial_nodes.append(financial_node)
+
+        return financial_nodes
+
+
     def _create_financial_statement_nodes_from_report(self, report_id, report_data):
         """
         Create financial statement nodes from report financial_statements and link them to the report.
@@ -890,46 +1112,11 @@ class ReportMixin:
         
         
         # Skip if no financial statements
-        financial_statements = report_data.get('financial_statements')
-        if not financial_statements:
+        if not report_data.get('financial_statements'):
             return []
         
         try:
-            # Make sure financial_statements is a dictionary if it's a JSON string
-            if isinstance(financial_statements, str):
-                financial_statements = json.loads(financial_statements)
-            
-            # Get report information needed for financial statement nodes
-            form_type = report_data.get('formType', '')
-            cik = report_data.get('cik', '')
-            filed_at = report_data.get('created', '')
-            
-            # Create financial statement nodes - one for each statement type
-            financial_nodes = []
-            
-            # Process each statement type (BalanceSheets, StatementsOfIncome, etc.)
-            for statement_type, metrics in financial_statements.items():
-                if not metrics:
-                    continue
-                
-                # Create unique ID for this statement type
-                content_id = f"{report_id}_{statement_type}"
-                
-                # Store the entire content as JSON
-                content_json = json.dumps(metrics)
-                
-                # Create financial statement content node
-                financial_node = FinancialStatementContent(
-                    content_id=content_id,
-                    filing_id=report_id,
-                    form_type=form_type,
-                    statement_type=statement_type,
-                    value=content_json,  # Store the entire content as JSON
-                    filer_cik=cik,
-                    filed_at=filed_at
-                )
-                
-                financial_nodes.append(financial_node)
+            financial_nodes = self._build_financial_statement_nodes(report_id, report_data)
             
             # Create the nodes using Neo4jManager's merge_nodes method
             if financial_nodes:
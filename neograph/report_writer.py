@@ -0,0 +1,206 @@
+"""
+Report subgraph writer - one UNWIND-driven transaction per batch of reports.
+
+A report used to cost a dozen or more round-trips: the Report MERGE, merge_nodes +
+merge_relationships for each of sections / exhibits / financial statements / filing
+text, PRIMARY_FILER and REFERENCED_IN, three INFLUENCES calls and IN_CATEGORY.
+ReportMixin now assembles each report into a plan (plain parameter rows, see
+ReportMixin._build_report_subgraph) and this writer commits many plans at once:
+every statement below runs once per batch with the rows of all its reports.
+
+MERGE semantics are the same as the per-report path:
+  * Report: ON CREATE sets all node properties, ON MATCH applies the same
+    conditional (updated-newer) SET list (REPORT_ON_MATCH_SET in mixins/report.py);
+  * content nodes: MERGE on id, SET n += properties, MERGE the HAS_* edge;
+  * companies: PRIMARY_FILER when the (post-merge) report cik equals the company
+    cik, else REFERENCED_IN; Company/Sector/Industry/MarketIndex targets are MERGEd
+    with the same ON CREATE / SET clauses as _create_influences_relationships;
+  * IN_CATEGORY only to an existing AdminReport.
+
+If a batch transaction fails, its reports are retried one transaction each so a
+single bad report does not fail the others.
+"""
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPORT_RETURN = ("r.id AS id, r.accessionNo AS accessionNo, r.cik AS cik, r.is_xml AS is_xml, "
+                 "r.xbrl_status AS xbrl_status, r.formType AS formType")
+
+COMPANY_QUERY = """
+UNWIND $rows AS row
+MATCH (r:Report {id: row.report_id})
+MERGE (c:Company {cik: row.cik})
+WITH r, c, row, (r.cik IS NOT NULL AND r.cik <> '' AND r.cik = row.cik) AS is_primary
+FOREACH (_ IN CASE WHEN is_primary THEN [1] ELSE [] END |
+    MERGE (r)-[rel:PRIMARY_FILER]->(c) SET rel += row.properties)
+FOREACH (_ IN CASE WHEN is_primary THEN [] ELSE [1] END |
+    MERGE (r)-[rel:REFERENCED_IN]->(c) SET rel += row.properties)
+"""
+
+SECTOR_QUERY = """
+UNWIND $rows AS row
+MATCH (r:Report {id: row.report_id})
+MERGE (target:Sector {id: row.sector_id})
+ON CREATE SET target.name = row.sector_name, target.etf = row.sector_etf
+SET target.etf = CASE
+    WHEN row.sector_etf IS NOT NULL AND (target.etf IS NULL OR target.etf = '')
+    THEN row.sector_etf ELSE target.etf
+END
+MERGE (r)-[rel:INFLUENCES]->(target)
+SET rel += row.properties
+"""
+
+INDUSTRY_QUERY = """
+UNWIND $rows AS row
+MATCH (r:Report {id: row.report_id})
+MERGE (target:Industry {id: row.industry_id})
+ON CREATE SET target.name = row.industry_name, target.etf = row.industry_etf
+SET target.etf = CASE
+    WHEN row.industry_etf IS NOT NULL AND (target.etf IS NULL OR target.etf = '')
+    THEN row.industry_etf ELSE target.etf
+END
+MERGE (r)-[rel:INFLUENCES]->(target)
+SET rel += row.properties
+"""
+
+MARKET_QUERY = """
+UNWIND $rows AS row
+MATCH (r:Report {id: row.report_id})
+MERGE (target:MarketIndex {id: 'SPY'})
+ON CREATE SET target.name = 'S&P 500 ETF', target.ticker = 'SPY', target.etf = 'SPY'
+SET target.ticker = 'SPY', target.etf = 'SPY',
+    target.name = CASE
+        WHEN target.name IS NULL OR target.name = ''
+        THEN 'S&P 500 ETF' ELSE target.name
+    END
+MERGE (r)-[rel:INFLUENCES]->(target)
+SET rel += row.properties
+"""
+
+CATEGORY_QUERY = """
+UNWIND $rows AS row
+MATCH (r:Report {id: row.report_id})
+MATCH (a:AdminReport {code: row.form_type})
+MERGE (r)-[:IN_CATEGORY]->(a)
+"""
+
+
+def report_merge_query(on_match_set: List[str]) -> str:
+    """UNWIND form of the per-report MERGE: `$param` references become `row.params.param`."""
+    on_match = ', '.join(re.sub(r'\$(\w+)', r'row.params.\1', part) for part in on_match_set)
+    return f"""
+UNWIND $rows AS row
+MERGE (r:Report {{id: row.id}})
+ON CREATE SET r += row.create
+ON MATCH SET {on_match}
+RETURN {REPORT_RETURN}
+"""
+
+
+def content_query(label: str, rel_type: str) -> str:
+    return f"""
+UNWIND $rows AS row
+MATCH (r:Report {{id: row.report_id}})
+MERGE (n:`{label}` {{id: row.id}})
+SET n += row.props
+MERGE (r)-[:`{rel_type}`]->(n)
+"""
+
+
+def node_merge_props(node) -> Dict[str, Any]:
+    """Node properties exactly as Neo4jManager.merge_nodes writes them (None -> "null",
+    collections without nulls, numbers formatted)."""
+    def format_value(v):
+        if isinstance(v, (int, float)):
+            return f"{v:,.3f}".rstrip('0').rstrip('.') if isinstance(v, float) else f"{v:,}"
+        return v
+
+    def sanitize_value(v):
+        if isinstance(v, list):
+            return [item for item in v if item is not None]
+        if isinstance(v, dict):
+            return {k: val for k, val in v.items() if val is not None}
+        return v
+
+    return {k: "null" if v is None else format_value(sanitize_value(v))
+            for k, v in node.properties.items() if k != 'id'}
+
+
+def plan_rows(plans: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Flatten report plans into parameter rows per statement (insertion order kept)."""
+    rows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for plan in plans:
+        report_id = plan['id']
+        rows['report'].append({'id': report_id, 'create': plan['create'], 'params': plan['params']})
+        for node, rel_type in plan.get('contents', []):
+            if node.id is None:
+                continue
+            rows[f"content:{node.node_type.value}:{rel_type}"].append(
+                {'report_id': report_id, 'id': node.id, 'props': node_merge_props(node)})
+        for key in ('companies', 'sectors', 'industries', 'markets'):
+            rows[key].extend({'report_id': report_id, **param} for param in plan.get(key, []))
+        if plan.get('form_type'):
+            rows['category'].append({'report_id': report_id, 'form_type': plan['form_type']})
+    return rows
+
+
+class ReportSubgraphWriter:
+    """Commits report plans in batches, one write transaction per batch."""
+
+    def __init__(self, manager, on_match_set: List[str], batch_size: int = 50):
+        self.manager = manager
+        self.batch_size = max(1, int(batch_size))
+        self.report_query = report_merge_query(on_match_set)
+
+    def _statements(self, rows: Dict[str, List[Dict[str, Any]]]):
+        yield self.report_query, rows.get('report', [])
+        for key, key_rows in rows.items():
+            if key.startswith('content:'):
+                _, label, rel_type = key.split(':', 2)
+                yield content_query(label, rel_type), key_rows
+        yield COMPANY_QUERY, rows.get('companies', [])
+        yield SECTOR_QUERY, rows.get('sectors', [])
+        yield INDUSTRY_QUERY, rows.get('industries', [])
+        yield MARKET_QUERY, rows.get('markets', [])
+        yield CATEGORY_QUERY, rows.get('category', [])
+
+    def _write_tx(self, tx, plans):
+        reports = {}
+        for query, rows in self._statements(plan_rows(plans)):
+            if not rows:
+                continue
+            result = tx.run(query, {"rows": rows})
+            if query is self.report_query:
+                reports = {rec["id"]: dict(rec) for rec in result}
+        return reports
+
+    def _write(self, plans) -> Dict[str, dict]:
+        with self.manager.driver.session() as session:
+            return session.execute_write(self._write_tx, plans)
+
+    def write(self, plans: List[Dict[str, Any]]) -> Dict[str, Optional[dict]]:
+        """Write all plans; returns report id -> merged report properties (None if it failed)."""
+        results: Dict[str, Optional[dict]] = {}
+        for i in range(0, len(plans), self.batch_size):
+            batch = plans[i:i + self.batch_size]
+            try:
+                results.update(self._write(batch))
+            except Exception as e:
+                if len(batch) == 1:
+                    logger.error(f"Report subgraph write failed for {batch[0]['id']}: {e}", exc_info=True)
+                    results[batch[0]['id']] = None
+                    continue
+                logger.warning(f"Report subgraph batch of {len(batch)} failed - retrying individually. Error: {e}")
+                for plan in batch:
+                    try:
+                        results.update(self._write([plan]))
+                    except Exception as e_single:
+                        logger.error(f"Report subgraph write failed for {plan['id']}: {e_single}", exc_info=True)
+                        results[plan['id']] = None
+            for plan in batch:
+                results.setdefault(plan['id'], None)
+        return results
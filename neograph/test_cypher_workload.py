@@ -0,0 +1,131 @@
+"""Offline tests for neograph/cypher_workload.py, including the index-coverage gate over the whole tree."""
+import os
+import sys
+import textwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.cypher_workload import (  # noqa: E402
+    ROOT, Schema, analyze, analyze_query, extract_queries, load_baseline, new_findings, parse_schema_statement,
+)
+
+
+def _schema():
+    schema = Schema()
+    for statement in ("CREATE CONSTRAINT c IF NOT EXISTS FOR (n:Report) REQUIRE n.id IS UNIQUE",
+                      "CREATE INDEX i IF NOT EXISTS FOR (n:Company) ON (n.ticker)",
+                      "CREATE INDEX j IF NOT EXISTS FOR (n:Fact) ON (n.qname, n.period)",
+                      "CREATE CONSTRAINT k IF NOT EXISTS FOR ()-[r:HAS_UNIT]-() REQUIRE r.key IS UNIQUE",
+                      "CREATE FULLTEXT INDEX news_ft IF NOT EXISTS FOR (n:News) ON EACH [n.title, n.body]"):
+        assert parse_schema_statement(statement, schema)
+    assert not parse_schema_statement("CREATE INDEX IF NOT EXISTS by_period ON filings (ticker, period)", schema)
+    return schema
+
+
+def test_anchors_against_declared_indexes():
+    schema = _schema()
+    assert analyze_query("MATCH (r:Report {id: $id})-[:PRIMARY_FILER]->(c:Company) RETURN c", schema) == []
+    assert analyze_query("MATCH (c:Company) WHERE c.ticker IN $tickers RETURN c", schema) == []
+    assert analyze_query("MATCH (f:Fact) WHERE f.qname = $q AND f.period STARTS WITH '2024' RETURN f", schema) == []
+    assert analyze_query("MATCH ()-[u:HAS_UNIT {key: $k}]->() RETURN u", schema) == []
+    assert analyze_query("MATCH (n) WHERE elementId(n) = $eid RETURN n", schema) == []
+    assert analyze_query("MATCH (r:Report {accessionNo: $acc}) RETURN r", schema) == \
+        [("unindexed_anchor", "Report.accessionNo")]
+    # composite index needs every property; an OR cannot anchor; fulltext is not an anchor
+    assert analyze_query("MATCH (f:Fact {qname: $q}) RETURN f", schema) == [("unindexed_anchor", "Fact.qname")]
+    assert analyze_query("MATCH (c:Company) WHERE c.ticker = $a OR c.ticker = $b RETURN c", schema) == \
+        [("label_scan", "Company")]
+    assert analyze_query("MATCH (n:News {title: $t}) RETURN n", schema) == [("unindexed_anchor", "News.title")]
+    assert analyze_query("MATCH (n:News) RETURN count(n)", schema) == [("label_scan", "News")]
+    assert analyze_query("MATCH (e) WHERE e.id = $id RETURN e", schema) == [("all_nodes_scan", "()")]
+
+
+def test_bound_variables_carry_across_clauses():
+    schema = _schema()
+    assert analyze_query("""
+        UNWIND $rows AS row
+        MATCH (r:Report {id: row.report_id})
+        WITH r, row
+        MATCH (r)-[:HAS_XBRL]->(x:XBRLNode)
+        MATCH (c:Company) WHERE c.ticker = row.symbol
+        MERGE (x)-[:FOR_COMPANY]->(c)""", schema) == []
+    # consecutive MATCH clauses are one graph: the second is reached through the third
+    assert analyze_query("""
+        MATCH (:Report {id: $src})-[:PRIMARY_FILER]->(c:Company)
+        MATCH (f:DriverUpdate)-[:OF_DRIVER]->(:Driver {name: $driver})
+        MATCH (f)-[:FROM_SOURCE]->(:Report)-[:PRIMARY_FILER]->(c)
+        RETURN f""", schema) == []
+    # WITH drops what it does not project: this `r` is a new, unconnected node
+    assert analyze_query("MATCH (r:Report {id: $id}) WITH r.cik AS cik MATCH (r)-[:X]->(y) RETURN y", schema) == \
+        [("cartesian", "label_scan [:X]")]
+    assert analyze_query("""
+        CALL db.index.fulltext.queryNodes('news_ft', $q) YIELD node, score
+        MATCH (node)-[:INFLUENCES]->(c:Company) RETURN c""", schema) == []
+
+
+def test_cartesian_products_and_var_length_patterns():
+    schema = _schema()
+    assert analyze_query("MATCH (r:Report {id: $id}), (n:News) RETURN r, n", schema) == \
+        [("cartesian", "label_scan News")]
+    assert analyze_query("MATCH (r:Report {id: $id}) MATCH (a:AdminReport {code: $f}) MERGE (r)-[:IN]->(a)",
+                         schema) == [("cartesian", "unindexed_anchor AdminReport.code")]
+    # joined by a predicate (hash join) or produced from one aggregate row: not cartesian
+    assert analyze_query("MATCH (r:Report {id: $id}), (d:Date) WHERE d.date = r.date RETURN d", schema) == \
+        [("unindexed_anchor", "Date.date")]
+    assert analyze_query("MATCH (n:News) WITH count(n) AS total MATCH (r:Report) RETURN total, count(r)",
+                         schema) == [("label_scan", "News"), ("label_scan", "Report")]
+    assert analyze_query("MATCH (c:Company {ticker: $t})-[:BELONGS_TO*]->(s) RETURN s", schema) == \
+        [("unbounded_varlength", "[:BELONGS_TO*]")]
+    assert analyze_query("MATCH (c:Company {ticker: $t})-[*2..]->(s) RETURN s", schema) == \
+        [("unbounded_varlength", "[*2..]")]
+    assert analyze_query("MATCH (c:Company {ticker: $t})-[:BELONGS_TO*1..3]->(s) RETURN s", schema) == []
+    assert analyze_query("MATCH (a:Company {ticker: $a}), (b:Company {ticker: $b}) "
+                         "MATCH p = shortestPath((a)-[*]-(b)) RETURN p", schema) == []
+
+
+def test_extracts_python_queries_with_call_sites(tmp_path):
+    (tmp_path / "XBRL").mkdir()
+    (tmp_path / "XBRL" / "xbrl_core.py").write_text("class NodeType(Enum):\n    REPORT = 'Report'\n")
+    (tmp_path / "schema.cypher").write_text("CREATE INDEX company_ticker FOR (n:Company) ON (n.ticker);\n")
+    (tmp_path / "store.py").write_text(textwrap.dedent('''
+        """Docstrings are not queries: MATCH (n:Nothing) RETURN n"""
+        LABEL = "Report"
+        BY_ACCESSION = "MATCH (r:{label} {{accessionNo: $acc}}) RETURN r"
+
+        def fetch(session, tickers):
+            rel = "PRIMARY_FILER"
+            query = f"MATCH (r:{LABEL})-[:{rel}]->(c:Company)"
+            query += " WHERE c.ticker = $t RETURN r"
+            for t in tickers:
+                session.run(query, t=t)
+            return session.run(BY_ACCESSION.format(label=LABEL), acc="x")
+
+        def loop(session):
+            for _ in range(3):
+                fetch(session, ["A"])
+    '''))
+    queries, _ = extract_queries(str(tmp_path))
+    by_line = {q.line: q for q in queries if q.path == "store.py"}
+    assert sorted(by_line) == [4, 8]
+    fetch_query = by_line[8]
+    assert fetch_query.text == "MATCH (r:Report)-[:PRIMARY_FILER]->(c:Company) WHERE c.ticker = $t RETURN r"
+    assert (fetch_query.function, fetch_query.uses, fetch_query.callers, fetch_query.hot) == ("fetch", 1, 1, True)
+    assert "{accessionNo: $acc}" in by_line[4].text and "__DYN_label__" in by_line[4].text
+
+    report = analyze(str(tmp_path))
+    assert report.schema.covers(["Company"], {"ticker"}) and report.schema.covers(["Report"], {"id"})
+    assert [(f.kind, f.detail, f.query.line) for f in report.findings] == \
+        [("unindexed_anchor", "?.accessionNo", 4)]
+
+
+def test_tree_has_no_findings_beyond_baseline():
+    """
+    The gate: a new query that scans without an index (or a new unbounded
+    expansion / cartesian product) fails here. Add the index to
+    Neo4jManager.create_indexes, anchor the query, or - if the scan is intended -
+    accept it with `python -m neograph.cypher_workload --write-baseline`.
+    """
+    report = analyze(ROOT)
+    assert len(report.queries) > 300
+    fresh = new_findings(report, load_baseline())
+    assert not fresh, "queries not covered by a declared index:\n" + "\n".join(f.describe() for f in fresh)
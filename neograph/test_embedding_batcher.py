@@ -0,0 +1,163 @@
+"""Offline tests for neograph/embedding_batcher.py (deterministic fake provider, Chroma and Neo4j; no network)."""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.embedding_batcher import EmbeddingBatcher, EmbeddingRequest, content_hash, genai_encoder, unwind_writer  # noqa: E402
+
+
+def fake_vector(text):
+    """Deterministic 4-d vector for a text."""
+    digest = content_hash(text)
+    return [int(digest[i:i + 2], 16) / 255 for i in range(0, 8, 2)]
+
+
+class FakeProvider:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("429 Too Many Requests")
+        return [fake_vector(t) for t in texts]
+
+
+class FakeCollection:
+    def __init__(self, seed=None):
+        self.store = dict(seed or {})
+        self.gets, self.adds = [], []
+
+    def get(self, ids, include):
+        self.gets.append(list(ids))
+        found = [i for i in ids if i in self.store]
+        return {"ids": found, "embeddings": [self.store[i]["embedding"] for i in found]}
+
+    def add(self, ids, documents, embeddings):
+        self.adds.append(list(ids))
+        for i, doc, emb in zip(ids, documents, embeddings):
+            self.store[i] = {"document": doc, "embedding": emb}
+
+
+class FakeGraph:
+    """Nodes without an embedding; write() sets them and returns ids in reverse order."""
+
+    def __init__(self, ids):
+        self.embeddings = {i: None for i in ids}
+        self.writes = []
+
+    def __call__(self, rows):
+        self.writes.append([r["id"] for r in rows])
+        done = []
+        for row in rows:
+            if row["id"] in self.embeddings and self.embeddings[row["id"]] is None:
+                self.embeddings[row["id"]] = row["embedding"]
+                done.append(row["id"])
+        return list(reversed(done))
+
+
+def _req(node_id, content):
+    return EmbeddingRequest(node_id, content)
+
+
+def _batcher(graph, provider, cache=None, **kwargs):
+    return EmbeddingBatcher("News", provider, graph, cache=cache, **kwargs)
+
+
+def test_burst_is_coalesced_into_size_bounded_batches():
+    ids = [f"bzNews_{i}" for i in range(10)]
+    graph, provider, cache = FakeGraph(ids), FakeProvider(), FakeCollection()
+    batcher = _batcher(graph, provider, cache, batch_size=4, max_wait=1.0)
+    futures = [batcher.submit(i, f"headline {i}") for i in ids]   # queued before the worker starts
+    batcher.start()
+    assert all(f.result(timeout=5) for f in futures)
+    batcher.stop()
+
+    assert [len(c) for c in provider.calls] == [4, 4, 2]
+    assert len(cache.gets) == len(cache.adds) == len(graph.writes) == 3
+    assert all(graph.embeddings[i] == fake_vector(f"headline {i}") for i in ids)
+    s = batcher.snapshot()
+    assert (s["batches"], s["written"], s["encoded"], s["provider_calls"], s["max_batch"]) == (3, 10, 10, 3, 4)
+    assert s["queue_wait_p50_ms"] >= 0 and "provider_p99_ms" in s
+
+
+def test_partial_batch_flushes_after_max_wait():
+    graph, provider = FakeGraph(["a"]), FakeProvider()
+    batcher = _batcher(graph, provider, batch_size=64, max_wait=0.01)
+    batcher.start()
+    assert batcher.submit("a", "lonely item").result(timeout=5) is True
+    batcher.stop()
+    assert provider.calls == [["lonely item"]]
+
+
+def test_cache_hits_skip_the_provider_and_only_misses_are_added():
+    seeded = {content_hash("cached text"): {"document": "cached text", "embedding": [9.0, 9.0, 9.0, 9.0]}}
+    graph, provider, cache = FakeGraph(["a", "b", "c"]), FakeProvider(), FakeCollection(seeded)
+    batcher = _batcher(graph, provider, cache)
+    written = batcher.process_batch([_req("a", "cached text"), _req("b", "new text"), _req("c", "cached text")])
+
+    assert written == 3
+    assert provider.calls == [["new text"]]
+    assert cache.gets == [[content_hash("cached text"), content_hash("new text")]]   # duplicates fetched once
+    assert cache.adds == [[content_hash("new text")]]
+    assert graph.embeddings["a"] == graph.embeddings["c"] == [9.0, 9.0, 9.0, 9.0]
+    assert batcher.stats["cache_hits"] == 1
+
+
+def test_results_are_mapped_by_id_and_failures_resolve_false():
+    graph = FakeGraph(["a", "b"])                    # "ghost" is not in the graph
+    requests = [_req("a", "x"), _req("ghost", "y"), _req("b", "z"), _req("a", "x")]
+    batcher = _batcher(graph, FakeProvider())
+    batcher.process_batch(requests)
+    assert [r.future.result() for r in requests] == [True, False, True, True]
+    assert graph.writes == [["a", "ghost", "b"]]     # one row per node
+    assert batcher.stats["failed"] == 1
+
+    failing = _batcher(FakeGraph(["a"]), FakeProvider(fail=True), FakeCollection())
+    request = _req("a", "x")
+    assert failing.process_batch([request]) == 0 and request.future.result() is False
+    assert failing.stats["provider_calls"] == 1 and failing.provider_latency.count == 1
+
+
+def test_concurrent_producers_all_complete():
+    ids = [f"qa_{i}" for i in range(200)]
+    graph, provider = FakeGraph(ids), FakeProvider()
+    batcher = _batcher(graph, provider, batch_size=32, max_wait=0.005)
+    batcher.start()
+    futures = {}
+
+    def produce(chunk):
+        for i in chunk:
+            futures[i] = batcher.submit(i, f"exchange {i}")
+
+    threads = [threading.Thread(target=produce, args=(ids[k::4],)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(f.result(timeout=10) for f in futures.values())
+    batcher.stop()
+    assert sum(len(c) for c in provider.calls) == 200
+    assert all(len(c) <= 32 for c in provider.calls)
+
+
+def test_neo4j_encoder_and_writer_issue_one_statement_per_batch():
+    class Manager:
+        def __init__(self):
+            self.queries = []
+
+        def execute_cypher_query_all(self, query, params):
+            self.queries.append((query, params))
+            if "encodeBatch" in query:
+                return [{"index": i, "vector": fake_vector(t)} for i, t in reversed(list(enumerate(params["contents"])))]
+            return [{"id": row["id"]} for row in params["batch"]]
+
+    manager = Manager()
+    vectors = genai_encoder(manager, {"model": "m"})(["one", "two", "three"])
+    assert vectors == [fake_vector("one"), fake_vector("two"), fake_vector("three")]
+    assert unwind_writer(manager, "QAExchange")([{"id": "q1", "embedding": [0.1]}, {"id": "q2", "embedding": [0.2]}]) == ["q1", "q2"]
+    assert len(manager.queries) == 2 and "UNWIND $batch" in manager.queries[1][0]
+    assert "MATCH (n:QAExchange {id: item.id})" in manager.queries[1][0]
@@ -0,0 +1,202 @@
+"""Offline tests for neograph/graph_bootstrap.py (fake calendar, Polygon and driver; no Neo4j, no network)."""
+import os
+import sys
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.graph_bootstrap import BarStore, GraphBootstrap, date_nodes_for_range  # noqa: E402
+
+# 2024-07-03 is an early close, 2024-07-04 a holiday, 07-06/07 a weekend.
+SESSIONS = ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05", "2024-07-08", "2024-07-09"]
+EARLY = ["2024-07-03"]
+
+
+class FakeCalendar:
+    def __init__(self):
+        index = pd.DatetimeIndex(SESSIONS)
+        opens = [pd.Timestamp(f"{d} 13:30", tz="UTC") for d in SESSIONS]
+        closes = [pd.Timestamp(f"{d} {'17:00' if d in EARLY else '20:00'}", tz="UTC") for d in SESSIONS]
+        self.schedule = pd.DataFrame({"open": opens, "close": closes}, index=index)
+        self.early_closes = pd.DatetimeIndex(EARLY)
+
+    def is_session(self, date):
+        return pd.Timestamp(date) in self.schedule.index
+
+    def date_to_session(self, date, direction="none"):
+        date = pd.Timestamp(date)
+        if direction == "previous":
+            return self.schedule.index[self.schedule.index <= date][-1]
+        if direction == "next":
+            return self.schedule.index[self.schedule.index >= date][0]
+        return date
+
+
+DATES = [d.strftime("%Y-%m-%d") for d in pd.date_range("2024-07-02", "2024-07-08")]
+
+
+def test_vectorized_dates_match_the_per_date_classifier():
+    pytest.importorskip("exchange_calendars")
+    import pytz
+    from utils.market_session import MarketSessionClassifier
+
+    classifier = MarketSessionClassifier.__new__(MarketSessionClassifier)
+    classifier.calendar = FakeCalendar()
+    classifier.eastern = pytz.timezone("America/New_York")
+    for node in date_nodes_for_range(DATES, FakeCalendar()):
+        hours, is_trading_day = classifier.get_trading_hours(pd.Timestamp(f"{node.date_str} 12:00:00-04:00"))
+        expected = {k: (v.strftime("%Y-%m-%d %H:%M:%S%z") if v is not None else None)
+                    for k, v in classifier.extract_times(hours).items()}
+        assert node.is_trading_day == is_trading_day, node.date_str
+        assert {k: getattr(node, k) for k in expected} == expected, node.date_str
+
+
+def test_session_metadata_edges():
+    nodes = {n.date_str: n for n in date_nodes_for_range(DATES, FakeCalendar())}
+    july3, july4, july5 = nodes["2024-07-03"], nodes["2024-07-04"], nodes["2024-07-05"]
+    assert july3.post_market_current_day == july3.market_close_current_day == "2024-07-03 13:00:00-0400"
+    assert not july4.is_trading_day and july4.market_open_current_day is None
+    assert (july4.previous_trading_date, july4.next_trading_date) == ("2024-07-03", "2024-07-05")
+    assert july5.pre_market_current_day == "2024-07-05 04:00:00-0400"
+    assert nodes["2024-07-08"].previous_trading_date == "2024-07-05"
+
+
+class Agg:
+    def __init__(self, ticker, close, day):
+        self.ticker, self.close, self.open, self.otc = ticker, close, close, None
+        self.timestamp = int(pd.Timestamp(f"{day} 20:00", tz="UTC").value // 10**6)
+
+
+class FakePolygon:
+    """Grouped bars: SPY closes at 100 + day-of-month, AAPL at 200 + day; OTHER is outside the universe."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.bar_calls = []
+        self.dividend_calls = []
+
+    def get_rest_client(self):
+        return SimpleNamespace(get_grouped_daily_aggs=self._grouped)
+
+    def _grouped(self, date, adjusted, include_otc):
+        self.bar_calls.append(date)
+        if date in self.fail:
+            raise RuntimeError("503")
+        day = int(date[-2:])
+        return [Agg("SPY", 100 + day, date), Agg("AAPL", 200 + day, date), Agg("OTHER", 1, date)]
+
+    def get_dividends(self, tickers):
+        self.dividend_calls.append(list(tickers))
+        rows = [{"ticker": t, "declaration_date": "2024-07-05", "cash_amount": 0.25, "ex_dividend_date": None,
+                 "pay_date": None, "record_date": None, "dividend_type": "CD", "currency": "USD",
+                 "frequency": 4} for t in tickers if t == "AAPL"]
+        return pd.DataFrame(rows).set_index("ticker") if rows else pd.DataFrame()
+
+    def get_splits(self, tickers):
+        return pd.DataFrame()
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+
+class FakeSession:
+    def __init__(self, manager):
+        self.manager = manager
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, params=None):
+        self.manager.queries.append((query, params))
+        if "HAS_PRICE" in query:
+            return FakeResult([{"dates_with_relationships": sorted(self.manager.priced)}])
+        if "RETURN d.date as date" in query:
+            return FakeResult({"date": d} for d in params["dates"] if d in self.manager.dates)
+        if "count(r) as created" in query:
+            return FakeResult([{"created": len(params["params"])}])
+        return FakeResult()
+
+
+class FakeManager:
+    def __init__(self, fail_batches=0):
+        self.driver = SimpleNamespace(session=lambda: FakeSession(self))
+        self.queries, self.price_batches, self.merged = [], [], []
+        self.priced, self.dates = set(), set()
+        self.fail_batches = fail_batches
+
+    def merge_nodes_bulk(self, nodes, batch_size=5000):
+        self.merged.extend(nodes)
+        self.dates.update(n.id for n in nodes if n.node_type.value == "Date")
+
+    def merge_relationships(self, rels):
+        pass
+
+    def create_price_relationships_batch(self, params):
+        if self.fail_batches:
+            self.fail_batches -= 1
+            return 0
+        self.price_batches.append(params)
+        self.priced.update(p["date_id"] for p in params)
+        return len(params)
+
+
+ENTITIES = {"SPY": ("SPY", "MarketIndex"), "AAPL": ("AAPL", "Company")}
+
+
+def _engine(tmp_path, polygon, manager, batch_size=20000):
+    store = BarStore(str(tmp_path), ["SPY", "AAPL"])
+    return GraphBootstrap(manager, polygon, store, FakeCalendar(), workers=4, batch_size=batch_size,
+                          today="2024-07-09")
+
+
+def test_prices_mirror_daily_market_summary(tmp_path):
+    polygon, manager = FakePolygon(), FakeManager()
+    engine = _engine(tmp_path, polygon, manager)
+    nodes = engine.create_dates("2024-07-02", "2024-07-08")
+    assert engine.load_prices(nodes, ENTITIES) == 8                  # 4 trading days x 2 entities
+    assert sorted(polygon.bar_calls) == ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05", "2024-07-08"]
+    assert len(manager.price_batches) == 1
+    row = next(p for p in manager.price_batches[0] if p["date_id"] == "2024-07-05" and p["entity_id"] == "AAPL")
+    assert row["entity_type"] == "Company"
+    assert row["properties"]["daily_return"] == round((205 - 203) / 203 * 100, 2)
+    assert row["properties"]["timestamp"] == "2024-07-05 16:00:00-0400"
+    assert "otc" not in row["properties"]
+    assert set(pd.read_parquet(tmp_path / "bars" / "2024-07-05.parquet").index) == {"SPY", "AAPL"}
+
+
+def test_interrupted_run_resumes_from_manifest(tmp_path):
+    polygon, manager = FakePolygon(fail={"2024-07-08"}), FakeManager(fail_batches=1)
+    engine = _engine(tmp_path, polygon, manager, batch_size=2)       # one date per chunk
+    nodes = engine.create_dates("2024-07-02", "2024-07-08")
+    assert engine.load_prices(nodes, ENTITIES) == 4                  # first chunk failed, 07-08 unfetched
+    assert engine.stats["bar_fetch_failures"] == 1
+
+    polygon2 = FakePolygon()
+    engine = _engine(tmp_path, polygon2, manager, batch_size=2)
+    assert engine.load_prices(nodes, ENTITIES) == 4
+    assert polygon2.bar_calls == ["2024-07-08"]                      # everything else came from the store
+    assert manager.priced == {"2024-07-02", "2024-07-03", "2024-07-05", "2024-07-08"}
+    assert engine.load_prices(nodes, ENTITIES) == 0
+    assert BarStore(str(tmp_path), ["SPY", "AAPL", "MSFT"]).manifest["fetched"] == {}   # other universe
+
+
+def test_dividends_bulk_loaded_and_cached_for_the_day(tmp_path):
+    polygon, manager = FakePolygon(), FakeManager()
+    engine = _engine(tmp_path, polygon, manager)
+    engine.create_dates("2024-07-02", "2024-07-08")
+    tickers = ["AAPL", "MSFT", "NVDA", "AMZN", "META"]
+    assert engine.load_dividends(tickers, "2024-07-01") == 1
+    assert sorted(t for call in polygon.dividend_calls for t in call) == sorted(tickers)
+    assert len(polygon.dividend_calls) == 3                          # ceil(5 / 4 workers) per request
+    rel_queries = [q for q, _ in manager.queries if "DIVIDEND" in q]
+    assert len(rel_queries) == 2
+    assert engine.load_dividends(tickers, "2024-07-01") == 1
+    assert len(polygon.dividend_calls) == 3                          # second pass read the store
@@ -0,0 +1,167 @@
+"""Offline tests for neograph/report_writer.py and the ReportMixin plan path (fake driver, no Neo4j)."""
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.EventTraderNodes import ReportNode  # noqa: E402
+from neograph.mixins.report import REPORT_ON_MATCH_SET, ReportMixin  # noqa: E402
+from neograph.report_writer import ReportSubgraphWriter  # noqa: E402
+
+CIK = "0000320193"
+
+
+class FakeTx:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, params=None, **kwargs):
+        self.driver.runs.append((query, params or kwargs))
+        if "MERGE (r:Report" in query:
+            for row in params["rows"]:
+                if row["id"] in self.driver.poison:
+                    raise RuntimeError("constraint violation")
+            return [{"id": row["id"], "accessionNo": row["id"], "cik": row["create"].get("cik"),
+                     "is_xml": row["create"].get("is_xml"), "xbrl_status": row["create"].get("xbrl_status"),
+                     "formType": row["create"].get("formType")} for row in params["rows"]]
+        return []
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def execute_write(self, fn, *args):
+        self.driver.transactions += 1
+        return fn(FakeTx(self.driver), *args)
+
+    def run(self, query, **kwargs):
+        return FakeTx(self.driver).run(query, kwargs)
+
+
+class FakeDriver:
+    def __init__(self, poison=()):
+        self.runs, self.transactions, self.poison = [], 0, set(poison)
+
+    @contextmanager
+    def session(self):
+        yield FakeSession(self)
+
+
+class FakeManager:
+    def __init__(self, poison=()):
+        self.driver = FakeDriver(poison)
+
+
+class Reports(ReportMixin):
+    def __init__(self, manager):
+        self.manager = manager
+        self.enable_xbrl = True
+        self.xbrl_processed = False
+        self.enqueued = []
+
+    def _enqueue_xbrl(self, session, report_id, cik, accessionNo, form_type=""):
+        self.enqueued.append((report_id, form_type))
+
+
+def _report(n, cik=CIK, is_xml=True):
+    accession = f"0000320193-25-00000{n}"
+    node = ReportNode(accessionNo=accession, primaryDocumentUrl="u", cik=cik, formType="10-K/A",
+                      is_xml=is_xml, created="2025-01-30T16:30:00-05:00",
+                      extracted_sections={"RiskFactors": "risk", "Empty": None},
+                      exhibit_contents={"99.1": {"text": "press release"}},
+                      financial_statements={"BalanceSheets": {"Assets": 1}},
+                      filing_text_content="full text")
+    return accession, node
+
+
+def _plan(reports, n, symbols=True, **kwargs):
+    accession, node = _report(n, **kwargs)
+    company = [{"cik": CIK, "properties": {"symbol": "AAPL", "v": 1}},
+               {"cik": CIK, "properties": {"symbol": "AAPL", "v": 2}},
+               {"cik": "0000789019", "properties": {"symbol": "MSFT"}}]
+    sector = [{"sector_id": "Technology", "sector_name": "Technology", "sector_etf": "XLK", "properties": {}}]
+    industry = [{"industry_id": "ConsumerElectronics", "industry_name": "Consumer Electronics",
+                 "industry_etf": None, "properties": {}}]
+    market = [{"properties": {"symbol": "AAPL"}}]
+    timestamps = (None, None, "2025-01-30T16:30:00-05:00", "2025-01-30T16:30:00-05:00")
+    return reports._build_report_subgraph(accession, node, node.properties, ["AAPL"] if symbols else [],
+                                          company, sector, industry, market, timestamps)
+
+
+def _queries(driver, needle):
+    return [params["rows"] for query, params in driver.runs if needle in query]
+
+
+def test_batch_is_one_transaction_with_one_statement_per_kind():
+    manager = FakeManager()
+    reports = Reports(manager)
+    plans = [_plan(reports, i) for i in range(3)]
+    results = reports._write_report_subgraphs(plans)
+
+    assert results == {p["id"]: True for p in plans}
+    assert manager.driver.transactions == 1
+    # Report, 4 content kinds, companies, sector, industry, market, category - all UNWIND over 3 reports
+    writes = [q for q, _ in manager.driver.runs if "UNWIND $rows" in q]
+    assert len(writes) == 10
+    [report_rows] = _queries(manager.driver, "MERGE (r:Report")
+    assert [r["id"] for r in report_rows] == [p["id"] for p in plans]
+    [sections] = _queries(manager.driver, "HAS_SECTION")
+    assert [r["id"] for r in sections] == [f"{p['id']}_RiskFactors" for p in plans]
+    [companies] = _queries(manager.driver, ":PRIMARY_FILER")
+    assert [(r["cik"], r["properties"].get("v")) for r in companies[:2]] == [(CIK, 2), ("0000789019", None)]
+    [category] = _queries(manager.driver, ":IN_CATEGORY")
+    assert {r["form_type"] for r in category} == {"10-K"}
+    assert [rid for rid, _ in reports.enqueued] == [p["id"] for p in plans]
+
+
+def test_report_merge_keeps_per_report_semantics():
+    writer = ReportSubgraphWriter(FakeManager(), REPORT_ON_MATCH_SET)
+    assert "ON CREATE SET r += row.create" in writer.report_query
+    assert "$" not in writer.report_query.split("ON MATCH SET")[1]
+    assert ("r.updated = CASE WHEN row.params.updated > r.updated THEN row.params.updated ELSE r.updated END"
+            in writer.report_query)
+    plan = _plan(Reports(FakeManager()), 1)
+    # Same parameters as the per-report MERGE, defaults included
+    assert plan["params"]["updated"] == "2025-01-30T16:30:00-05:00"
+    assert plan["params"]["items"] == "[]" and plan["params"]["periodOfReport"] == ""
+    assert all(plan["params"][k] == v for k, v in plan["create"].items())
+
+
+def test_no_symbols_writes_report_and_content_only():
+    manager = FakeManager()
+    reports = Reports(manager)
+    reports._write_report_subgraphs([_plan(reports, 1, symbols=False)])
+    assert _queries(manager.driver, "HAS_FILING_TEXT")
+    assert not _queries(manager.driver, ":PRIMARY_FILER")
+    assert not _queries(manager.driver, ":INFLUENCES")
+    assert not _queries(manager.driver, ":IN_CATEGORY")
+
+
+def test_failed_batch_retries_reports_individually():
+    reports = Reports(FakeManager())
+    plans = [_plan(reports, i) for i in range(3)]
+    manager = FakeManager(poison={plans[1]["id"]})
+    reports.manager = manager
+    results = reports._write_report_subgraphs(plans)
+    assert results == {plans[0]["id"]: True, plans[1]["id"]: False, plans[2]["id"]: True}
+    assert manager.driver.transactions == 4
+    assert [rid for rid, _ in reports.enqueued] == [plans[0]["id"], plans[2]["id"]]
+
+
+def test_xbrl_hook_skips_ineligible_reports():
+    reports = Reports(FakeManager())
+    reports._write_report_subgraphs([_plan(reports, 1, is_xml=False), _plan(reports, 2, cik="")])
+    assert reports.enqueued == []
+
+
+@pytest.mark.parametrize("batch_size, transactions", [(1, 5), (2, 3), (50, 1)])
+def test_batch_size(batch_size, transactions):
+    manager = FakeManager()
+    reports = Reports(manager)
+    writer = ReportSubgraphWriter(manager, REPORT_ON_MATCH_SET, batch_size=batch_size)
+    writer.write([_plan(reports, i) for i in range(5)])
+    assert manager.driver.transactions == transactions
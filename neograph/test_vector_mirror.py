@@ -0,0 +1,153 @@
+"""Offline tests for neograph/vector_mirror.py (synthetic vectors, no Neo4j, no network)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.vector_mirror import (BackgroundMirror, LocalSimilarityEngine, QuantizedVectorIndex,  # noqa: E402
+                                    QueryEmbeddingCache, exact_rescorer, normalize_query)
+from scripts.vector_mirror_bench import exact_top_k, synthetic_corpus  # noqa: E402
+
+
+def _index(ids, x, **kwargs):
+    index = QuantizedVectorIndex(**kwargs)
+    for start in range(0, len(ids), 500):                 # incremental, like the write paths
+        index.upsert(ids[start:start + 500], x[start:start + 500])
+    return index
+
+
+def test_rescoring_recovers_exact_neighbours():
+    ids, x, queries = synthetic_corpus(6000, 256, clusters=32, queries=50)
+    index = _index(ids, x, dims=128, n_probe=16, train_min=2000)
+    assert index.centroids is not None and len(index) == 6000
+    assert index.memory_bytes() < x.nbytes / 3
+
+    truth = exact_top_k(x, queries, 10)
+    engine = LocalSimilarityEngine(index, encode=lambda text: queries[int(text)],
+                                   rescore=exact_rescorer(dict(zip(ids, x))), candidates=5)
+    hits = 0
+    for qi in range(len(queries)):
+        rows = engine.search(str(qi), limit=10, min_score=-1.0)
+        scores = [r["score"] for r in rows]
+        assert scores == sorted(scores, reverse=True)
+        hits += len({int(r["id"].split("_")[1]) for r in rows} & truth[qi])
+    assert hits / (10 * len(queries)) >= 0.95
+
+    top = engine.search("0", limit=3, min_score=0.0)
+    exact = x @ queries[0]
+    assert abs(top[0]["score"] - float(exact.max())) < 1e-5          # exact score, not the int8 estimate
+
+
+def test_upsert_replaces_removes_and_keeps_last_duplicate():
+    index = QuantizedVectorIndex(train_min=10**6)
+    index.upsert(["a", "b", "a"], [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    assert len(index) == 2
+    assert index.search([0, 0, 1], k=1)[0][0] == "a"
+    index.upsert(["b"], [[0, 0, 1]])
+    assert [i for i, _ in index.search([0, 0, 1], k=5)] in (["a", "b"], ["b", "a"])
+    assert index.remove(["a", "missing"]) == 1 and "a" not in index
+    assert [i for i, _ in index.search([1, 0, 0], k=5)] == ["b"]
+    assert index.upsert(["zero"], [[0, 0, 0]]) == 0
+
+
+def test_training_is_triggered_by_growth_and_survives_save_load(tmp_path):
+    ids, x, queries = synthetic_corpus(3000, 64, clusters=8, queries=5)
+    index = _index(ids[:1500], x[:1500], train_min=1000, n_probe=4)
+    trained = index.centroids
+    assert trained is not None
+    index.upsert(ids[1500:], x[1500:])
+    assert index.centroids is trained                               # 3000 < 4 x 1000, no retrain yet
+
+    path = str(tmp_path / "News.npz")
+    index.save(path)
+    loaded = QuantizedVectorIndex.load(path)
+    assert len(loaded) == 3000 and loaded.n_probe == 4
+    for q in queries:
+        assert loaded.search(q, 10) == index.search(q, 10)
+
+
+def test_query_cache_is_keyed_by_normalized_text():
+    assert normalize_query("  Apple  GUIDANCE\tcut ") == "apple guidance cut"
+    calls = []
+    index = QuantizedVectorIndex()
+    index.upsert(["n1"], [[1.0, 0.0]])
+    engine = LocalSimilarityEngine(index, encode=lambda t: calls.append(t) or [1.0, 0.0],
+                                   rescore=exact_rescorer({"n1": [1.0, 0.0]}),
+                                   cache=QueryEmbeddingCache(max_size=1))
+    assert engine.search("Apple guidance cut", limit=1)[0]["id"] == "n1"
+    assert engine.search("apple   guidance CUT", limit=1)[0]["id"] == "n1"
+    assert calls == ["Apple guidance cut"]
+    engine.search("other query", limit=1)
+    engine.search("apple guidance cut", limit=1)                     # evicted by the size-1 LRU
+    assert len(calls) == 3
+    snap = engine.snapshot()
+    assert (snap["cache_hits"], snap["encode_count"], snap["vectors"]) == (1, 3, 1)
+
+
+def test_unencodable_query_returns_none_and_min_score_filters():
+    index = QuantizedVectorIndex()
+    index.upsert(["n1", "n2"], [[1.0, 0.0], [0.0, 1.0]])
+    engine = LocalSimilarityEngine(index, encode=lambda t: None, rescore=exact_rescorer({}))
+    assert engine.search("anything") is None
+    engine = LocalSimilarityEngine(index, encode=lambda t: [1.0, 0.1],
+                                   rescore=exact_rescorer({"n1": [1.0, 0.0], "n2": [0.0, 1.0]}))
+    assert [r["id"] for r in engine.search("q", limit=5, min_score=0.5)] == ["n1"]
+
+
+class _Graph:
+    """Embedded nodes by id; list_ids pages them in id order, fetch returns the requested ones."""
+
+    def __init__(self, vectors, page=2, gate=None):
+        self.vectors, self.page, self.gate = dict(vectors), page, gate
+        self.fetched = []
+
+    def list_ids(self, after):
+        if self.gate:
+            self.gate.wait(5)
+        return sorted(i for i in self.vectors if i > after)[:self.page]
+
+    def fetch(self, ids):
+        self.fetched.extend(ids)
+        return [(i, self.vectors[i]) for i in ids if i in self.vectors]
+
+
+def _mirror(path, graph):
+    return BackgroundMirror("News", str(path), lambda: QuantizedVectorIndex(train_min=10**6),
+                            graph.list_ids, graph.fetch, fetch_batch=2)
+
+
+def test_background_mirror_queues_writes_until_built(tmp_path):
+    import threading
+    gate = threading.Event()
+    graph = _Graph({"a": [1, 0, 0], "b": [0, 1, 0], "c": [0, 0, 1]}, gate=gate)
+    mirror = _mirror(tmp_path / "News.npz", graph).start()
+    assert mirror.index is None and not mirror.wait(0.05)          # build blocked: searches fall back
+    mirror.upsert(["d", "a"], [[1, 1, 0], [0, 1, 1]])               # live writes while building
+    gate.set()
+    assert mirror.wait(5)
+    assert sorted(mirror.index.ids()) == ["a", "b", "c", "d"]
+    assert mirror.index.search([0, 1, 1], k=1)[0][0] == "a"        # queued write wins over the scan
+    assert sorted(graph.fetched) == ["a", "b", "c"]
+    assert os.path.exists(tmp_path / "News.npz")
+    assert mirror.upsert(["e"], [[1, 0, 1]]) == 1 and "e" in mirror.index
+
+
+def test_loaded_mirror_catches_up_with_the_graph(tmp_path):
+    path = tmp_path / "News.npz"
+    first = _mirror(path, _Graph({"a": [1, 0, 0], "b": [0, 1, 0]})).start()
+    assert first.wait(5)
+
+    graph = _Graph({"a": [1, 0, 0], "c": [0, 0, 1], "d": [1, 1, 1]})   # b deleted, c/d embedded while down
+    restarted = _mirror(path, graph).start()
+    assert restarted.wait(5)
+    assert sorted(restarted.index.ids()) == ["a", "c", "d"]
+    assert sorted(graph.fetched) == ["c", "d"]                         # only the missing vectors are fetched
+
+
+def test_failed_build_leaves_the_mirror_unavailable(tmp_path):
+    def boom(after):
+        raise RuntimeError("neo4j down")
+
+    mirror = BackgroundMirror("News", str(tmp_path / "News.npz"), QuantizedVectorIndex, boom, lambda ids: []).start()
+    assert mirror.wait(5) is False and mirror.failed
+    assert mirror.upsert(["a"], [[1, 0]]) == 0 and mirror.index is None
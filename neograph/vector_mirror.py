@@ -0,0 +1,503 @@
+"""
+Local quantized mirror of the News / QAExchange embeddings for similarity search.
+
+vector_similarity_search used to re-encode every query through
+genai.vector.encodeBatch and then score it against every 3072-dim float
+embedding in Neo4j. This module keeps three things in process instead:
+
+  * QueryEmbeddingCache - LRU of query vectors keyed by normalized text, so a
+    repeated (or case / whitespace variant) query skips the provider entirely;
+  * QuantizedVectorIndex - an int8 copy of every embedding, optionally truncated
+    to its first `dims` components and re-normalized (text-embedding-3 vectors
+    keep most of their signal in the leading dimensions), grouped into an IVF
+    (spherical k-means lists) so a query only scans the n_probe nearest lists;
+  * LocalSimilarityEngine - cache -> index candidates -> exact rescoring of
+    those candidates against the full-precision vectors (EmbeddingMixin rescores
+    in Neo4j with vector.similarity.cosine over the candidate ids only), so the
+    returned scores and order are the same as the exact search whenever the true
+    neighbours are among the candidates.
+
+The index is kept current with upsert() from the embedding write paths and is
+persisted as one .npz per label (save() / QuantizedVectorIndex.load()).
+BackgroundMirror loads or builds it off the ingestion path and reconciles a
+loaded file with the graph, queueing live writes until it is ready.
+"""
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.ws_pipeline import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: NFKC, case-folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query embeddings keyed by normalize_query(text)."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max(1, int(max_size))
+        self._items: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = normalize_query(text)
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, text: str, vector: Sequence[float]):
+        key = normalize_query(text)
+        with self._lock:
+            self._items[key] = np.asarray(vector, dtype=np.float32)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class QuantizedVectorIndex:
+    """
+    int8 IVF index over (optionally truncated) unit vectors.
+
+    Args:
+        dims: Leading components kept per vector (None / 0 = all)
+        n_probe: Lists scanned per query once the index is trained
+        train_min: Vectors needed before clustering; below that every search is a flat scan
+        seed: k-means seed (training is deterministic for a given insertion order)
+
+    Rows are append-only: upserting an existing id retires its old row. The
+    lists are re-clustered automatically when the live row count has grown 4x
+    since the last training.
+    """
+
+    def __init__(self, dims: Optional[int] = None, n_probe: int = 16, train_min: int = 2000, seed: int = 0):
+        self.dims = int(dims) if dims else None
+        self.n_probe = max(1, int(n_probe))
+        self.train_min = max(1, int(train_min))
+        self.seed = seed
+        self._lock = threading.RLock()
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._size = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_at = 0
+        self._lists: Dict[int, List[int]] = {}
+        self._list_arrays: Dict[int, np.ndarray] = {}
+
+    # ---- encoding ----
+    def _prepare(self, vectors) -> Tuple[np.ndarray, np.ndarray]:
+        """Truncate + L2-normalize rows; returns (unit vectors, mask of usable rows)."""
+        x = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.dims:
+            x = x[:, :self.dims]
+        norms = np.linalg.norm(x, axis=1)
+        ok = norms > 0
+        x = x / np.where(ok, norms, 1.0)[:, None]
+        return x, ok
+
+    @staticmethod
+    def _quantize(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        scales = np.abs(x).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(x / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        return self._codes[rows].astype(np.float32) * self._scales[rows, None]
+
+    # ---- writes ----
+    def _reserve(self, extra: int, width: int):
+        need = self._size + extra
+        if self._codes.shape[1] == 0:
+            self._codes = np.zeros((0, width), dtype=np.int8)
+        if need <= len(self._codes):
+            return
+        capacity = max(need, 2 * len(self._codes), 1024)
+        for name, fill in (("_codes", 0), ("_scales", 0.0), ("_assign", -1)):
+            old = getattr(self, name)
+            grown = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def upsert(self, ids: Sequence[str], vectors) -> int:
+        """Add or replace vectors; returns the number stored (zero vectors are skipped)."""
+        if len(ids) == 0:
+            return 0
+        x, ok = self._prepare(vectors)
+        last = {node_id: i for i, node_id in enumerate(ids) if ok[i]}     # last write of an id wins
+        ids, x = list(last), x[list(last.values())]
+        if not ids:
+            return 0
+        codes, scales = self._quantize(x)
+        with self._lock:
+            if self._codes.shape[1] and self._codes.shape[1] != x.shape[1]:
+                raise ValueError(f"vector width {x.shape[1]} does not match index width {self._codes.shape[1]}")
+            self._remove_locked(ids)
+            self._reserve(len(ids), x.shape[1])
+            start = self._size
+            rows = np.arange(start, start + len(ids))
+            self._codes[rows] = codes
+            self._scales[rows] = scales
+            self._size += len(ids)
+            for node_id, row in zip(ids, rows):
+                self._ids.append(node_id)
+                self._row[node_id] = int(row)
+            self._assign_rows(rows)
+            if len(self._row) >= self.train_min and len(self._row) >= 4 * max(self._trained_at, self.train_min // 4):
+                self._train_locked()
+        return len(ids)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        with self._lock:
+            return self._remove_locked(ids)
+
+    def _remove_locked(self, ids: Iterable[str]) -> int:
+        removed = 0
+        for node_id in ids:
+            row = self._row.pop(node_id, None)
+            if row is None:
+                continue
+            members = self._lists.get(int(self._assign[row]))
+            if members is not None:
+                members.remove(row)
+                self._list_arrays.pop(int(self._assign[row]), None)
+            self._assign[row] = -1
+            removed += 1
+        return removed
+
+    def _assign_rows(self, rows: np.ndarray):
+        if self.centroids is None:
+            labels = np.zeros(len(rows), dtype=np.int32)
+        else:
+            labels = np.argmax(self._decode(rows) @ self.centroids.T, axis=1).astype(np.int32)
+        self._assign[rows] = labels
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            self._lists.setdefault(label, []).append(row)
+            self._list_arrays.pop(label, None)
+
+    # ---- clustering ----
+    def train(self, iterations: int = 10, sample_size: int = 50000):
+        with self._lock:
+            self._train_locked(iterations, sample_size)
+
+    def _train_locked(self, iterations: int = 10, sample_size: int = 50000):
+        rows = np.fromiter(self._row.values(), dtype=np.int64, count=len(self._row))
+        n_lists = int(min(4096, max(1, round(4 * np.sqrt(len(rows))))))
+        if len(rows) < self.train_min or n_lists < 2:
+            return
+        rng = np.random.default_rng(self.seed)
+        sample = self._decode(rng.choice(rows, size=min(sample_size, len(rows)), replace=False))
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=n_lists).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1), 1e-12)[:, None]
+        self.centroids = centroids.astype(np.float32)
+        self._lists, self._list_arrays = {}, {}
+        for start in range(0, len(rows), 50000):
+            self._assign_rows(rows[start:start + 50000])
+        self._trained_at = len(rows)
+        logger.info(f"[VECTOR-MIRROR] trained {n_lists} lists over {len(rows)} vectors (dims {self.dims or 'all'})")
+
+    # ---- search ----
+    def _list_rows(self, label: int) -> np.ndarray:
+        rows = self._list_arrays.get(label)
+        if rows is None:
+            rows = self._list_arrays[label] = np.asarray(self._lists.get(label, ()), dtype=np.int64)
+        return rows
+
+    def search(self, query, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Approximate top-k as [(id, cosine over the quantized prefix)], best first."""
+        q, ok = self._prepare(query)
+        if not ok[0] or k <= 0:
+            return []
+        q = q[0]
+        with self._lock:
+            if not self._row:
+                return []
+            if self.centroids is None:
+                rows = self._list_rows(0)
+            else:
+                probes = np.argsort(-(self.centroids @ q))[:n_probe or self.n_probe]
+                rows = np.concatenate([self._list_rows(int(p)) for p in probes])
+            if len(rows) == 0:
+                return []
+            scores = (self._codes[rows].astype(np.float32) @ q) * self._scales[rows]
+            top = np.argpartition(-scores, k - 1)[:k] if len(rows) > k else np.arange(len(rows))
+            top = top[np.argsort(-scores[top])]
+            return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def __len__(self):
+        return len(self._row)
+
+    def __contains__(self, node_id):
+        return node_id in self._row
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._row)
+
+    def memory_bytes(self) -> int:
+        return int(self._codes[:self._size].nbytes + self._scales[:self._size].nbytes)
+
+    # ---- persistence ----
+    def save(self, path: str):
+        """Write live rows + centroids to path (.npz) atomically."""
+        with self._lock:
+            ids = list(self._row)
+            rows = np.asarray([self._row[i] for i in ids], dtype=np.int64)
+            payload = {
+                "ids": np.asarray(ids, dtype=np.str_),
+                "codes": self._codes[rows] if len(rows) else np.zeros((0, self._codes.shape[1]), dtype=np.int8),
+                "scales": self._scales[rows],
+                "centroids": self.centroids if self.centroids is not None else np.zeros((0, 0), dtype=np.float32),
+                "meta": np.asarray([self.dims or 0, self.n_probe, self.train_min, self.seed, self._trained_at]),
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **payload)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedVectorIndex":
+        with np.load(path) as data:
+            dims, n_probe, train_min, seed, trained_at = (int(v) for v in data["meta"])
+            index = cls(dims=dims or None, n_probe=n_probe, train_min=train_min, seed=seed)
+            ids, codes, scales = [str(i) for i in data["ids"]], data["codes"], data["scales"]
+            centroids = data["centroids"]
+        index.centroids = centroids if centroids.size else None
+        index._trained_at = trained_at
+        if ids:
+            index._reserve(len(ids), codes.shape[1])
+            index._codes[:len(ids)] = codes
+            index._scales[:len(ids)] = scales
+            index._size = len(ids)
+            index._ids = ids
+            index._row = {node_id: row for row, node_id in enumerate(ids)}
+            index._assign_rows(np.arange(len(ids)))
+        return index
+
+
+class BackgroundMirror:
+    """
+    A QuantizedVectorIndex that is loaded or built, then reconciled with the graph, on a daemon thread.
+
+    Args:
+        name: Label, for logs
+        path: .npz the index is loaded from (when present) and saved to
+        new_index: () -> empty QuantizedVectorIndex, used when there is no readable file
+        list_ids: after -> next page (ascending) of ids of nodes that have an embedding; [] at the end
+        fetch: ids -> [(id, embedding)]
+        fetch_batch: ids per fetch() call
+
+    The reconcile lists every embedded id (ids only, no vectors), fetches the
+    embeddings the index lacks (all of them on a fresh build, the ones written
+    while the process was down after a load) and drops ids no longer in the graph.
+    Until it finishes, index is None (callers use the exact search) and upsert()
+    queues writes, which are applied afterwards so they win over scanned rows.
+    If the reconcile fails, the mirror stays unavailable and queued writes are dropped.
+    """
+
+    def __init__(self, name: str, path: str, new_index: Callable[[], QuantizedVectorIndex],
+                 list_ids: Callable[[str], List[str]], fetch: Callable[[List[str]], Iterable[Tuple[str, Sequence[float]]]],
+                 fetch_batch: int = 500):
+        self.name = name
+        self.path = path
+        self.new_index = new_index
+        self.list_ids = list_ids
+        self.fetch = fetch
+        self.fetch_batch = max(1, int(fetch_batch))
+        self.index: Optional[QuantizedVectorIndex] = None
+        self.failed = False
+        self._queued: List[Tuple[List[str], Sequence]] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BackgroundMirror":
+        self._thread = threading.Thread(target=self._run, name=f"vector-mirror-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.index is not None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the load/build finished (or failed); True if the mirror is ready."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def upsert(self, ids: Sequence[str], vectors) -> int:
+        """Index.upsert once ready; before that the write is queued (returns 0), after a failure dropped."""
+        with self._lock:
+            if self.failed:
+                return 0
+            if self.index is None:
+                self._queued.append((list(ids), vectors))
+                return 0
+            index = self.index
+        return index.upsert(ids, vectors)
+
+    def save(self):
+        if self.index is not None:
+            self.index.save(self.path)
+
+    def _load(self) -> QuantizedVectorIndex:
+        if os.path.exists(self.path):
+            try:
+                index = QuantizedVectorIndex.load(self.path)
+                logger.info(f"[VECTOR-MIRROR] Loaded {len(index)} {self.name} vectors from {self.path}")
+                return index
+            except Exception as e:
+                logger.warning(f"[VECTOR-MIRROR] Unreadable {self.path}, rebuilding: {e}")
+        return self.new_index()
+
+    def _reconcile(self, index: QuantizedVectorIndex) -> Tuple[int, int]:
+        seen, missing, after = set(), [], ""
+        while True:
+            page = self.list_ids(after)
+            if not page:
+                break
+            seen.update(page)
+            missing.extend(node_id for node_id in page if node_id not in index)
+            after = page[-1]
+        stale = [node_id for node_id in index.ids() if node_id not in seen]
+        index.remove(stale)
+        for start in range(0, len(missing), self.fetch_batch):
+            rows = list(self.fetch(missing[start:start + self.fetch_batch]))
+            if rows:
+                index.upsert([node_id for node_id, _ in rows], [vector for _, vector in rows])
+        return len(missing), len(stale)
+
+    def _run(self):
+        started = time.monotonic()
+        try:
+            index = self._load()
+            added, removed = self._reconcile(index)
+        except Exception as e:
+            logger.error(f"[VECTOR-MIRROR] {self.name} mirror unavailable, using the exact search: {e}", exc_info=True)
+            with self._lock:
+                self.failed = True
+                self._queued = []
+            self._done.set()
+            return
+        with self._lock:
+            for ids, vectors in self._queued:
+                index.upsert(ids, vectors)
+            queued, self._queued = len(self._queued), []
+            self.index = index
+        logger.info(f"[VECTOR-MIRROR] {self.name} mirror ready in {time.monotonic() - started:.1f}s: "
+                    f"{len(index)} vectors ({added} fetched, {removed} removed, {queued} queued writes applied)")
+        try:
+            self.save()
+        except Exception as e:
+            logger.warning(f"[VECTOR-MIRROR] Failed to save {self.name} mirror: {e}")
+        self._done.set()
+
+
+def exact_rescorer(vectors: Dict[str, Sequence[float]]) -> Callable:
+    """Rescorer over in-memory full vectors: (query, ids) -> [{"id", "score"}] with exact cosine."""
+
+    def rescore(query, ids):
+        q = np.asarray(query, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        ids = [i for i in ids if i in vectors]
+        if not ids:
+            return []
+        m = np.asarray([vectors[i] for i in ids], dtype=np.float32)
+        scores = (m @ q) / np.maximum(np.linalg.norm(m, axis=1), 1e-12)
+        return [{"id": i, "score": float(s)} for i, s in zip(ids, scores)]
+
+    return rescore
+
+
+class LocalSimilarityEngine:
+    """
+    Query cache + quantized candidates + exact rescoring.
+
+    Args:
+        index: QuantizedVectorIndex mirror of one label's embeddings
+        encode: text -> full query vector (only called on a cache miss)
+        rescore: (query vector, candidate ids) -> rows with an exact "score"
+        cache: QueryEmbeddingCache (shared between labels is fine)
+        candidates: Candidates rescored per requested result
+    """
+
+    def __init__(self, index: QuantizedVectorIndex, encode: Callable[[str], Sequence[float]],
+                 rescore: Callable, cache: Optional[QueryEmbeddingCache] = None, candidates: int = 5):
+        self.index = index
+        self.encode = encode
+        self.rescore = rescore
+        self.cache = cache if cache is not None else QueryEmbeddingCache()
+        self.candidates = max(1, int(candidates))
+        self.encode_latency = LatencyWindow()
+        self.ann_latency = LatencyWindow()
+        self.rescore_latency = LatencyWindow()
+
+    def query_vector(self, text: str) -> Optional[np.ndarray]:
+        vector = self.cache.get(text)
+        if vector is None:
+            started = time.monotonic()
+            vector = self.encode(text)
+            self.encode_latency.add_many([time.monotonic() - started])
+            if vector is None:
+                return None
+            vector = np.asarray(vector, dtype=np.float32)
+            self.cache.put(text, vector)
+        return vector
+
+    def search(self, text: str, limit: int = 10, min_score: float = 0.0,
+               rescore: Optional[Callable] = None) -> Optional[List[Dict]]:
+        """Exact-rescored top `limit` rows with score >= min_score; None if the query could not be encoded."""
+        vector = self.query_vector(text)
+        if vector is None:
+            return None
+        started = time.monotonic()
+        candidates = self.index.search(vector, limit * self.candidates)
+        self.ann_latency.add_many([time.monotonic() - started])
+        if not candidates:
+            return []
+        started = time.monotonic()
+        rows = (rescore or self.rescore)(vector, [node_id for node_id, _ in candidates]) or []
+        self.rescore_latency.add_many([time.monotonic() - started])
+        rows = sorted((r for r in rows if r["score"] >= min_score), key=lambda r: r["score"], reverse=True)
+        return rows[:limit]
+
+    def snapshot(self) -> Dict[str, float]:
+        stats = {"vectors": len(self.index), "memory_bytes": self.index.memory_bytes(),
+                 "cache_size": len(self.cache), "cache_hits": self.cache.hits, "cache_misses": self.cache.misses}
+        for prefix, window in (("encode", self.encode_latency), ("ann", self.ann_latency),
+                               ("rescore", self.rescore_latency)):
+            summary = window.summary()
+            stats[f"{prefix}_count"] = summary["count"]
+            stats[f"{prefix}_p50_ms"] = summary["p50_ms"]
+            stats[f"{prefix}_p99_ms"] = summary["p99_ms"]
+        return stats
@@ -180,11 +180,18 @@ def main():
 
             with neo4j_manager.driver.session() as session:
                 def update_status(tx):
-                    tx.run(
-                        "MATCH (r:Report {id: $id}) SET r.xbrl_status = $status, r.xbrl_error = $error",
+                    record = tx.run(
+                        "MATCH (r:Report {id: $id}) SET r.xbrl_status = $status, r.xbrl_error = $error "
+                        "WITH r OPTIONAL MATCH (r)-[:PRIMARY_FILER]->(c:Company) "
+                        "RETURN collect(c.ticker) AS tickers",
                         id=report_id, status=final_status, error=final_error
-                    )
-                session.execute_write(update_status)
+                    ).single()
+                    return record["tickers"] if record else []
+                filer_tickers = session.execute_write(update_status)
+
+            # Wake the guidance trigger for this filer (10-Q/10-K extraction reads XBRL)
+            if final_status == "COMPLETED":
+                redis_client.publish_asset_ingested("xbrl", report_id, filer_tickers)
 
             # Log completion with timing information
             elapsed = time.time() - start_time
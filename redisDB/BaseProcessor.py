@@ -7,11 +7,13 @@ from typing import Optional, Dict, Any
 from .redis_constants import RedisKeys
 from .redisClasses import RedisClient
 from eventReturns.EventReturnsManager import EventReturnsManager
+from eventReturns.price_tape import get_price_tape
 from datetime import datetime
 import pytz
 from dateutil import parser
 from utils.metadata_fields import MetadataFields
 from config import feature_flags # Add this import
+from utils.lifecycle_trace import trace
 
 class BaseProcessor(ABC):
     """Base class for all processors (news, reports, transcripts)"""
@@ -146,6 +148,7 @@ class BaseProcessor(ABC):
             prefix_type = RedisKeys.PREFIX_HIST if raw_key.startswith(self.hist_client.prefix) else RedisKeys.PREFIX_LIVE
             identifier = raw_key.split(':')[-1]
             meta_key = f"tracking:meta:{self.source_type}:{identifier}"
+            trace(self.source_type, identifier, "process_start")
 
             raw_content = client.get(raw_key)
             if not raw_content:
@@ -182,6 +185,7 @@ class BaseProcessor(ABC):
 
             # 6. Add metadata
             metadata = self._add_metadata(processed_dict)
+            trace(self.source_type, identifier, "metadata")
             
             if metadata is None:
                 pipe = client.client.pipeline(transaction=True)
@@ -398,7 +402,12 @@ class BaseProcessor(ABC):
             if not all(field in metadata['metadata'] for field in required_fields):
                 self.logger.error(f"Missing required metadata fields in: {metadata}")
                 return None
-                
+
+            # Start streaming the event's symbols now, not when ReturnsProcessor picks it up
+            tape = get_price_tape()
+            if tape is not None:
+                tape.ensure_event(metadata['metadata'])
+
             return metadata['metadata']
 
         except Exception as e:
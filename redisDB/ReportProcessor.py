@@ -15,6 +15,8 @@ from inscriptis import get_text
 from config import feature_flags
 import json
 from redisDB.redis_constants import RedisKeys
+from secReports.sec_fetch import get_sec_fetcher
+from utils.lifecycle_trace import trace
 import copy
 import os
 import concurrent.futures
@@ -100,6 +102,9 @@ class ReportProcessor(BaseProcessor):
         self.ttl = ttl
         self.extractor = ExtractorApi(SEC_API_KEY) if SEC_API_KEY else None
         self.xbrl_api = XbrlApi(SEC_API_KEY) if SEC_API_KEY else None
+        # Shared per-process fetch layer: keep-alive pool, Redis rate limits, disk cache
+        live_client = getattr(event_trader_redis, 'live_client', None)
+        self.fetcher = get_sec_fetcher(SEC_API_KEY, getattr(live_client, 'client', None))
 
 
 
@@ -111,73 +116,21 @@ class ReportProcessor(BaseProcessor):
             self.logger.warning("SEC API extractor not initialized - missing API key")
             return None
         
-        processing_attempts = 0
-        regular_attempts = 0
         # Use the EXTRACTOR_CALL_TIMEOUT from feature_flags, with a default if not found
-        call_timeout_val = getattr(feature_flags, 'EXTRACTOR_CALL_TIMEOUT', 90) 
-            
-        while regular_attempts < retries or processing_attempts < processing_retries:
-            try:
-                # --- new block for timeout --- 
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    # Pass self.extractor and its method arguments to submit
-                    future = executor.submit(self.extractor.get_section, url, section_id, "text")
-                    content = future.result(timeout=call_timeout_val)
-                # --- end new block --- 
-
-                # Handle processing status - retry with SEC recommended delay
-                if content == "processing":
-                    processing_attempts += 1
-                    if processing_attempts <= processing_retries:
-                        delay = 500 + (500 * processing_attempts)  # 500ms, 1000ms, 1500ms
-                        self.logger.debug(f"Section {section_id} processing, attempt {processing_attempts}/{processing_retries}, waiting {delay}ms")
-                        time.sleep(delay / 1000)  # Convert to seconds
-                        continue
-                    else:
-                        self.logger.warning(f"Section {section_id} still processing after {processing_retries} attempts")
-                        return None
-
-                # Only retry if content is empty/None
-                if not content or not content.strip():
-                    regular_attempts += 1
-                    if regular_attempts < retries:
-                        delay = 500 + (500 * regular_attempts)  # Match SEC recommended delays
-                        self.logger.debug(f"Empty content received for section {section_id}, attempt {regular_attempts}/{retries}")
-                        time.sleep(delay / 1000)
-                        continue
-                    else:
-                        self.logger.warning(f"Failed to get content for section {section_id} after {retries} regular attempts (empty content)")
-                        return None
-                    
-                # Clean content if we have it
-                content = html.unescape(content)
-                self.logger.info(f"Successfully extracted section {section_id}")
-                return unicodedata.normalize("NFKC", content)
-            
-            except FutureTimeout: # Handle the timeout specifically
-                regular_attempts += 1
-                self.logger.warning(f"Timeout extracting section {section_id} (attempt {regular_attempts}/{retries}) after {call_timeout_val}s")
-                if regular_attempts < retries:
-                    # Using the same delay logic as other errors for consistency
-                    delay = 500 + (500 * regular_attempts) 
-                    time.sleep(delay / 1000)
-                    continue
-                # If retries exceeded after timeout, break to return None outside loop
-                self.logger.warning(f"Failed to get content for section {section_id} due to repeated timeouts.")
-                break 
-            except Exception as e:
-                regular_attempts += 1
-                self.logger.error(f"Error extracting section {section_id} (attempt {regular_attempts}/{retries}): {e}", exc_info=True)
-                if regular_attempts < retries:
-                    delay = 500 + (500 * regular_attempts)
-                    time.sleep(delay / 1000)
-                    continue
-                # If retries exceeded after other exceptions, break to return None
-                self.logger.warning(f"Failed to get content for section {section_id} due to repeated errors.")
-                break
-                    
-        self.logger.warning(f"Failed to get content for section {section_id} after {regular_attempts} regular attempts and {processing_attempts} processing attempts. Returning None.")
-        return None
+        call_timeout_val = getattr(feature_flags, 'EXTRACTOR_CALL_TIMEOUT', 90)
+
+        # Retries, 'processing' back-off, rate limiting, per-request deadline and caching
+        # all live in the shared fetcher (secReports/sec_fetch.py)
+        content = self.fetcher.get_section(url, section_id, "text", retries=retries,
+                                           processing_retries=processing_retries, timeout=call_timeout_val)
+        if content is None:
+            self.logger.warning(f"Failed to get content for section {section_id} from {url}. Returning None.")
+            return None
+
+        # Clean content if we have it
+        content = html.unescape(content)
+        self.logger.info(f"Successfully extracted section {section_id}")
+        return unicodedata.normalize("NFKC", content)
 
 
 
@@ -206,49 +159,24 @@ class ReportProcessor(BaseProcessor):
                                     # del content # Not strictly necessary, GC will handle
             
             elif form_type.startswith(('10-K', '10-Q')):
-                self.logger.info(f"Processing {form_type} sections in parallel using ThreadPoolExecutor for URL: {url}")
+                self.logger.info(f"Processing {form_type} sections in parallel on the shared fetch pool for URL: {url}")
                 
                 if not SEC_API_KEY: # This check might be redundant if self.extractor check passed
                     self.logger.warning("SEC API key is missing, skipping section extraction")
                     return {}
                 
-                # Use a ThreadPoolExecutor for I/O-bound tasks within the worker process
-                # The number of workers here can be tuned, e.g., 4-8, or based on a new feature_flag
-                # os.cpu_count() might be too high for threads if many enricher processes are running.
-                # Let's use a moderate fixed number or make it configurable.
-                num_threads_for_sections = getattr(feature_flags, 'THREADS_PER_SECTION_EXTRACTION', 4)
-
-                futures = {}
-                with ThreadPoolExecutor(max_workers=num_threads_for_sections) as executor:
-                    for section_id, section_name in sections_map.items():
-                        # _extract_section_content handles its own retries and timeouts internally
-                        future = executor.submit(self._extract_section_content, url, section_id)
-                        futures[future] = section_name # Map future to section_name
-
-                    # Collect results as they complete
-                    # Add an overall timeout for collecting all section results for this report
-                    # This is similar to the old batch_timeout but for threads.
-                    overall_section_timeout = getattr(feature_flags, 'SECTION_BATCH_EXTRACTION_TIMEOUT', 450)
-                    start_time = time.time()
-
-                    for future in concurrent.futures.as_completed(futures):
-                        # Check for overall timeout for this report's sections
-                        if time.time() - start_time > overall_section_timeout:
-                            self.logger.warning(f"Overall timeout of {overall_section_timeout}s reached for extracting sections from {url}. Aborting remaining.")
-                            # Cancel remaining futures
-                            for f_cancel in futures:
-                                if not f_cancel.done():
-                                    f_cancel.cancel()
-                            break # Exit the collection loop
-
-                        section_name_from_future = futures[future]
-                        try:
-                            content = future.result() # This won't block indefinitely due to internal timeout in _extract_section_content
-                            if content:
-                                extracted_sections[section_name_from_future] = content
-                                self.logger.info(f"Successfully extracted section {section_name_from_future} for {form_type}")
-                        except Exception as exc:
-                            self.logger.error(f"Section {section_name_from_future} generated an exception: {exc}", exc_info=True)
+                # Sections fan out on the fetcher's shared thread pool (one per process, bounded by
+                # SEC_FETCH_WORKERS and the shared extractor rate limit) under one overall deadline.
+                overall_section_timeout = getattr(feature_flags, 'SECTION_BATCH_EXTRACTION_TIMEOUT', 450)
+                results = self.fetcher.fetch_all(
+                    {section_name: (lambda sid=section_id: self._extract_section_content(url, sid))
+                     for section_id, section_name in sections_map.items()},
+                    timeout=overall_section_timeout)
+
+                for section_name in sections_map.values():   # keep sections-map order
+                    if content := results.get(section_name):
+                        extracted_sections[section_name] = content
+                        self.logger.info(f"Successfully extracted section {section_name} for {form_type}")
             
             if extracted_sections:
                 self.logger.info(f"Successfully extracted {len(extracted_sections)} sections for {url}")
@@ -483,19 +411,11 @@ class ReportProcessor(BaseProcessor):
 
     def _download_exhibit(self, url: str) -> Optional[str]:
         """Download and extract exhibit content with proper SEC rate limiting and timeout"""
-        headers = {
-            'User-Agent': 'EventTrader research.bot@example.com',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'www.sec.gov' # Corrected Host back to www.sec.gov
-        }
         REQUEST_TIMEOUT = 60 # seconds
 
         try:
-            # Respect SEC's rate limit
-            time.sleep(0.1)
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            content = response.text
+            # Shared pool + SEC rate limit + deadline + disk cache (secReports/sec_fetch.py)
+            content = self.fetcher.get_document(url, timeout=REQUEST_TIMEOUT)
             
             # Format detection and appropriate text extraction
             raw_text = ""
@@ -539,22 +459,12 @@ class ReportProcessor(BaseProcessor):
     # These are specifically for 6-K, 13D etc (Non FORM_TYPES_REQUIRING_SECTIONS)
     def _extract_secondary_filing_content(self, url: str) -> Optional[str]:
         """Extract clean text from any SEC filing format with minimal dependencies, with timeout"""
-        headers = {
-            'User-Agent': 'EventTrader research.bot@example.com',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'www.sec.gov'
-        }
         REQUEST_TIMEOUT = 180 # seconds
         
         try:
-            # Respect SEC's rate limit
-            time.sleep(0.1)
-            
-            # Download with proper headers
+            # Download with proper headers (shared pool, SEC rate limit, deadline, disk cache)
             self.logger.info(f"Downloading secondary filing from {url}")
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            content = response.text
+            content = self.fetcher.get_document(url, timeout=REQUEST_TIMEOUT)
             
             # PHASE 1: Format-specific extraction
             raw_text = ""
@@ -604,11 +514,13 @@ class ReportProcessor(BaseProcessor):
             return None
 
     def _process_exhibits(self, exhibits: Dict[str, str]) -> Dict[str, Dict[str, str]]:
-        """Process all exhibits in a filing"""
+        """Process all exhibits in a filing (downloaded concurrently on the shared fetch pool)"""
         exhibit_content = {}
+        results = self.fetcher.fetch_all(
+            {exhibit_id: (lambda u=url: self._download_exhibit(u)) for exhibit_id, url in exhibits.items()})
         
         for exhibit_id, url in exhibits.items():
-            if content := self._download_exhibit(url):
+            if content := results.get(exhibit_id):
                 exhibit_content[exhibit_id] = {
                     'text': content,
                     'url': url
@@ -758,6 +670,7 @@ class ReportProcessor(BaseProcessor):
             prefix_type = RedisKeys.PREFIX_HIST if raw_key.startswith(self.hist_client.prefix) else RedisKeys.PREFIX_LIVE
             identifier = raw_key.split(":")[-1]
             meta_key = f"tracking:meta:{self.source_type}:{identifier}"
+            trace(self.source_type, identifier, "process_start")
 
             raw_content = client.get(raw_key)
             if not raw_content:
@@ -793,6 +706,7 @@ class ReportProcessor(BaseProcessor):
             )
 
             metadata = self._add_metadata(processed)
+            trace(self.source_type, identifier, "metadata")
             if metadata is None:
                 pipe = client.client.pipeline(transaction=True)
                 pipe.lpush(client.FAILED_QUEUE, raw_key)
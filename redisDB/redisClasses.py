@@ -14,6 +14,7 @@ from .redis_constants import RedisKeys, RedisQueues
 from secReports.sec_schemas import SECFilingSchema, UnifiedReport
 # Import feature flags to get the CSV path
 from config import feature_flags
+from utils.lifecycle_trace import trace_lifecycle_on_execute
 from eventtrader.keys import REDIS_HOST, REDIS_PORT
 # Use standard module logger
 logger = logging.getLogger(__name__)
@@ -275,6 +276,91 @@ class RedisClient:
         return False  # Should never reach here, but just in case
 
 
+    def _store_live_batch(self, entries, ex=None) -> List[bool]:
+        """
+        Pipelined form of set_news / set_filing for a batch of live items.
+
+        entries: list of (storage_key, payload_json, meta_key, source_api_timestamp)
+        One non-transactional round trip reads the lifecycle fields already present,
+        then one MULTI/EXEC stores every item, pushes it to RAW_QUEUE and queues the
+        missing "ingested_at" / "source_api_timestamp" fields through the same writers
+        mark_lifecycle_timestamp and set_lifecycle_data use.
+        """
+        if not entries:
+            return []
+
+        check = self.client.pipeline(transaction=False)
+        for _, _, meta_key, _ in entries:
+            check.hexists(meta_key, "ingested_at")
+            check.hexists(meta_key, "source_api_timestamp")
+        present = check.execute()
+
+        pipe = self.client.pipeline(transaction=True)
+        set_positions = []
+        for i, (storage_key, payload, meta_key, source_ts) in enumerate(entries):
+            set_positions.append(len(pipe))
+            pipe.set(storage_key, payload, ex=ex)
+            pipe.lpush(self.RAW_QUEUE, storage_key)
+            if not present[2 * i]:
+                self._queue_lifecycle_timestamp(pipe, meta_key, "ingested_at", ttl=ex)
+            if source_ts and not present[2 * i + 1]:
+                self._queue_lifecycle_data(pipe, meta_key, "source_api_timestamp", source_ts, ttl=ex)
+        results = pipe.execute()
+        return [bool(results[pos]) for pos in set_positions]
+
+    def set_news_live_batch(self, news_items: List[UnifiedNews], ex: int = None) -> List[bool]:
+        """Batch form of set_news for the websocket worker pool: one dedup read, one pipeline."""
+        try:
+            processed = set(self.client.lrange(self.PROCESSED_QUEUE, 0, -1))
+            stored = [False] * len(news_items)
+            entries, positions, seen = [], [], set()
+            for i, item in enumerate(news_items):
+                updated_key = item.updated.replace(':', '.')
+                storage_key = f"{self.prefix}raw:{item.id}.{updated_key}"
+                if f"{self.prefix}processed:{item.id}.{updated_key}" in processed or storage_key in seen:
+                    continue
+                seen.add(storage_key)
+                meta_key = f"tracking:meta:{self.source_type}:{item.id}.{updated_key}"
+                entries.append((storage_key, item.model_dump_json(), meta_key, item.updated))
+                positions.append(i)
+            for i, ok in zip(positions, self._store_live_batch(entries, ex=ex)):
+                stored[i] = ok
+            return stored
+        except Exception as e:
+            self.logger.error(f"Live news batch storage failed: {e}", exc_info=True)
+            return [False] * len(news_items)
+
+    def set_filings_batch(self, filings: List[UnifiedReport], ex: int = None) -> List[bool]:
+        """Batch form of set_filing for the websocket worker pool: one dedup read, one pipeline."""
+        try:
+            check = self.client.pipeline(transaction=False)
+            for filing in filings:
+                check.sismember("reports:confirmed_in_neo4j", filing.accessionNo)
+            confirmed = check.execute()
+
+            stored = [False] * len(filings)
+            entries, positions, seen = [], [], set()
+            for i, (filing, is_confirmed) in enumerate(zip(filings, confirmed)):
+                if is_confirmed:
+                    self.logger.info(f"Skipping filing already confirmed in Neo4j: {filing.accessionNo}")
+                    continue
+                filed_at = filing.filedAt.replace(':', '.')
+                storage_key = f"{self.prefix}raw:{filing.accessionNo}.{filed_at}"
+                if storage_key in seen:
+                    continue
+                seen.add(storage_key)
+                meta_key = f"tracking:meta:{self.source_type}:{filing.accessionNo}.{filed_at}"
+                entries.append((storage_key, filing.model_dump_json(), meta_key, filing.filedAt))
+                positions.append(i)
+            for i, ok in zip(positions, self._store_live_batch(entries, ex=ex)):
+                stored[i] = ok
+            return stored
+        except Exception as e:
+            # One transient error must not drop the whole frame: set_filing retries and reconnects per filing
+            self.logger.error(f"Filing batch storage failed, storing the {len(filings)} filings one by one: {e}",
+                              exc_info=True)
+            return [self.set_filing(filing, ex=ex) for filing in filings]
+
     def set_news_batch(self, news_items: List[UnifiedNews], ex=None):
         """For historical news ingestion (batch mode)"""
         try:
@@ -347,6 +433,21 @@ class RedisClient:
             self.logger.error(f"Queue pop failed: {e}", exc_info=True)
             return None
 
+    def publish_asset_ingested(self, asset: str, asset_id: str, symbols=None) -> bool:
+        """Announce that an asset is now in Neo4j (fire-and-forget, never raises)"""
+        try:
+            payload = json.dumps({
+                "asset": asset,
+                "id": asset_id,
+                "symbols": [s.upper() for s in (symbols or []) if s],
+                "published_at": time.time(),
+            })
+            self.client.publish(RedisKeys.ASSET_INGESTED_CHANNEL, payload)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Asset-ingested publish failed for {asset}:{asset_id}: {e}")
+            return False
+
     def clear(self, preserve_processed=True):  # Same default as EventTraderRedis
         """Clear keys with prefix, optionally preserving processed news"""
         try:
@@ -456,42 +557,8 @@ class RedisClient:
             if self.client.hexists(key, field):
                 return external_pipe if external_pipe else None
 
-            payload = {field: datetime.now(timezone.utc)
-                                .isoformat(timespec="seconds")}
-            if reason:
-                payload[f"{field}_reason"] = reason
-
             pipe = external_pipe or self.client.pipeline()
-
-            # -----------------------------------------------------------
-            # One-shot collision fix: success wipes earlier error flags
-            # -----------------------------------------------------------
-            if field == "inserted_into_neo4j_at":
-                pipe.hdel(
-                    key,
-                    "filtered_at", "filtered_at_reason",
-                    "failed_at",   "failed_at_reason",
-                )
-
-            pipe.hset(key, mapping=payload)
-
-            if ttl:
-                pipe.expire(key, ttl)
-
-            # ----------------------------------------------------------
-            # Pending-set maintenance (unchanged)
-            # ----------------------------------------------------------
-            parts = key.split(":")
-            if len(parts) >= 3:
-                source_type = parts[2]
-                pending_set_key = f"tracking:pending:{source_type}"
-
-                if field == "ingested_at":
-                    pipe.sadd(pending_set_key, key)
-
-                if field in {"inserted_into_neo4j_at", "filtered_at", "failed_at"} \
-                        and feature_flags.REMOVE_FROM_PENDING_SET:
-                    pipe.srem(pending_set_key, key)
+            self._queue_lifecycle_timestamp(pipe, key, field, reason=reason, ttl=ttl)
 
             if not external_pipe:
                 pipe.execute()
@@ -524,16 +591,8 @@ class RedisClient:
             if self.client.hexists(key, field):
                 return external_pipe if external_pipe else None
 
-            # Normalise ISO timestamps if it’s the API field
-            if field == "source_api_timestamp" and value:
-                value = pd.to_datetime(value, utc=True) \
-                            .isoformat(timespec="seconds")
-
             pipe = external_pipe or self.client.pipeline()
-            pipe.hset(key, field, value)
-
-            if ttl:
-                pipe.expire(key, ttl)
+            self._queue_lifecycle_data(pipe, key, field, value, ttl=ttl)
 
             if not external_pipe:
                 pipe.execute()
@@ -548,3 +607,60 @@ class RedisClient:
             )
             return external_pipe if external_pipe else None
 
+    # ------------------------------------------------------------------
+    #  Pipeline writers shared by the helpers above and _store_live_batch
+    #  (the set-once existence checks are the caller's)
+    # ------------------------------------------------------------------
+    def _queue_lifecycle_timestamp(self, pipe, key: str, field: str,
+                                   reason: str | None = None, ttl: int | None = None):
+        """Queue the writes of one lifecycle timestamp on pipe."""
+        payload = {field: datetime.now(timezone.utc)
+                            .isoformat(timespec="seconds")}
+        if reason:
+            payload[f"{field}_reason"] = reason
+
+        # -----------------------------------------------------------
+        # One-shot collision fix: success wipes earlier error flags
+        # -----------------------------------------------------------
+        if field == "inserted_into_neo4j_at":
+            pipe.hdel(
+                key,
+                "filtered_at", "filtered_at_reason",
+                "failed_at",   "failed_at_reason",
+            )
+
+        pipe.hset(key, mapping=payload)
+        trace_lifecycle_on_execute(pipe, key, field)
+
+        if ttl:
+            pipe.expire(key, ttl)
+
+        # ----------------------------------------------------------
+        # Pending-set maintenance (unchanged)
+        # ----------------------------------------------------------
+        parts = key.split(":")
+        if len(parts) >= 3:
+            source_type = parts[2]
+            pending_set_key = f"tracking:pending:{source_type}"
+
+            if field == "ingested_at":
+                pipe.sadd(pending_set_key, key)
+
+            if field in {"inserted_into_neo4j_at", "filtered_at", "failed_at"} \
+                    and feature_flags.REMOVE_FROM_PENDING_SET:
+                pipe.srem(pending_set_key, key)
+        return pipe
+
+    def _queue_lifecycle_data(self, pipe, key: str, field: str, value: str, ttl: int | None = None):
+        """Queue the write of one lifecycle value on pipe."""
+        # Normalise ISO timestamps if it’s the API field
+        if field == "source_api_timestamp" and value:
+            value = pd.to_datetime(value, utc=True) \
+                        .isoformat(timespec="seconds")
+
+        pipe.hset(key, field, value)
+
+        if ttl:
+            pipe.expire(key, ttl)
+        return pipe
+
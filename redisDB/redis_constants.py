@@ -29,6 +29,10 @@ class RedisKeys:
     XBRL_QUEUE_HEAVY = f"{SOURCE_REPORTS}:queues:xbrl:heavy"
     XBRL_QUEUE_MEDIUM = f"{SOURCE_REPORTS}:queues:xbrl:medium"
     XBRL_QUEUE_LIGHT = f"{SOURCE_REPORTS}:queues:xbrl:light"
+
+    # Published once an asset (report / transcript / XBRL run) is committed to Neo4j.
+    # Consumed by scripts/guidance_trigger_daemon.py for incremental triggering.
+    ASSET_INGESTED_CHANNEL = "assets:ingested"
     
     
     @staticmethod
@@ -112,6 +112,16 @@ def run_all() -> None:
     except Exception as e:
         logger.error(f"Error retrieving Neo4j counts: {e}", exc_info=True)
     
+    # In-process stage latencies (only when ENABLE_LIFECYCLE_TRACING is on)
+    from utils.lifecycle_trace import get_tracer
+    tracer = get_tracer()
+    if tracer is not None:
+        logger.info("--- LIFECYCLE LATENCY (last %ss) ---", tracer.window)
+        for source, stages in tracer.snapshot()["sources"].items():
+            for stage, s in stages.items():
+                logger.info(f"{source:<12} {stage:<22} n={s['count']:>6} p50={s['p50_ms']:>9.0f}ms "
+                            f"p99={s['p99_ms']:>9.0f}ms max={s['max_ms']:>9.0f}ms")
+
     logger.info("Redis and Neo4j stats analysis completed")
 
 
@@ -0,0 +1,50 @@
+"""Offline tests for RedisClient's live batch writers against the in-memory FakeRedis."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("dotenv")
+pytest.importorskip("pydantic")
+pytest.importorskip("redis")
+
+from redisDB import redisClasses  # noqa: E402
+from redisDB.redis_constants import RedisKeys  # noqa: E402
+from secReports.sec_schemas import UnifiedReport  # noqa: E402
+from utils.ingest_fakes import FakeRedis, fake_redis_module  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    server = FakeRedis()
+    monkeypatch.setattr(redisClasses, "redis", fake_redis_module(server))
+    return redisClasses.RedisClient(prefix=f"{RedisKeys.SOURCE_REPORTS}:live:", source_type=RedisKeys.SOURCE_REPORTS), server
+
+
+def _filing(i):
+    return UnifiedReport(formType="8-K", cik="320193", filedAt="2026-10-19T08:00:00-04:00",
+                         primaryDocumentUrl=f"https://www.sec.gov/d{i}.htm", accessionNo=f"0000320193-26-{i:06d}",
+                         is_xml=False)
+
+
+def test_failed_filing_batch_falls_back_to_per_filing_writes(client, monkeypatch):
+    client, server = client
+    pipeline, failures = client.client.pipeline, []
+
+    def flaky_pipeline(transaction=True, **kwargs):
+        pipe = pipeline(transaction=transaction, **kwargs)
+        if transaction and not failures:                # only the batch's MULTI/EXEC hits the outage
+            def execute(*args, **kw):
+                failures.append(1)
+                raise ConnectionError("connection reset")
+            pipe.execute = execute
+        return pipe
+
+    monkeypatch.setattr(client.client, "pipeline", flaky_pipeline)
+    server.sadd("reports:confirmed_in_neo4j", _filing(2).accessionNo)
+    assert client.set_filings_batch([_filing(i) for i in range(3)]) == [True, True, False]
+    assert failures == [1]
+    assert sorted(server.lrange(client.RAW_QUEUE, 0, -1)) == \
+        [f"{client.prefix}raw:0000320193-26-{i:06d}.2026-10-19T08.00.00-04.00" for i in range(2)]
@@ -8,6 +8,8 @@ Tier-1 additionally requires the XBRL concept be revenue/income-ish AND the dime
 match the KPI's slice token (entity KPIs) or be undimensioned (aggregate KPIs).
 """
 import re, json, math, os, sys
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                 '..', '..', 'driver', 'relocation'))
 import exact_numbers as XN     # THE shared exact-value helpers (Decimal-exact; no float round-trips)
@@ -242,26 +244,35 @@ def seg_axis_members(fc):
 def member_tokens(members):
     toks = set()
     for m in members:
-        pre, _, local = str(_norm_initials(str(m))).rpartition(':')
-        local = local or m
-        # owner recall packet (measured 113-row miss class): XBRL tags geography as ISO codes
-        # (`country:US`) while KPI names say 'United States' — expand via the generated ISO
-        # table. Precision-safe: unknown code -> no extra tokens -> behaves exactly as before.
-        if pre == 'country' and local.upper() in COUNTRY_NAME:
-            toks.update(w for w in re.findall(r"[A-Za-z]{2,}", COUNTRY_NAME[local.upper()].lower())
-                        if w not in GENERIC_MEM)
-        base = re.sub(r'Member$', '', local)
-        # round-17: acronym split ONLY for runs of >=2 capitals — 'EMEASegment' -> 'EMEA Segment'
-        # but 'IPhone' stays whole (the round-16 union leaked 'phone'; a 'Phone Revenue' KPI could
-        # bind IPhoneMember — reviewer-reproduced). Single tokenization, no union.
-        v = re.sub(r'([A-Z]{2,})([A-Z][a-z])', r'\1 \2', base)
-        v = re.sub(r'([a-z])([A-Z])', r'\1 \2', v)
-        for w in re.findall(r"[A-Za-z]{2,}", v.lower()):
-            if w not in GENERIC_MEM:
-                toks.add(w)
+        toks |= _member_token_set(m) if isinstance(m, str) else _member_token_set.__wrapped__(m)
     return toks
 
 
+@lru_cache(maxsize=65536)
+def _member_token_set(m):
+    """one member's tokens (the body of member_tokens) — memoized: worklists re-tokenize the
+    same few thousand member qnames for every claim."""
+    toks = set()
+    pre, _, local = str(_norm_initials(str(m))).rpartition(':')
+    local = local or m
+    # owner recall packet (measured 113-row miss class): XBRL tags geography as ISO codes
+    # (`country:US`) while KPI names say 'United States' — expand via the generated ISO
+    # table. Precision-safe: unknown code -> no extra tokens -> behaves exactly as before.
+    if pre == 'country' and local.upper() in COUNTRY_NAME:
+        toks.update(w for w in re.findall(r"[A-Za-z]{2,}", COUNTRY_NAME[local.upper()].lower())
+                    if w not in GENERIC_MEM)
+    base = re.sub(r'Member$', '', local)
+    # round-17: acronym split ONLY for runs of >=2 capitals — 'EMEASegment' -> 'EMEA Segment'
+    # but 'IPhone' stays whole (the round-16 union leaked 'phone'; a 'Phone Revenue' KPI could
+    # bind IPhoneMember — reviewer-reproduced). Single tokenization, no union.
+    v = re.sub(r'([A-Z]{2,})([A-Z][a-z])', r'\1 \2', base)
+    v = re.sub(r'([a-z])([A-Z])', r'\1 \2', v)
+    for w in re.findall(r"[A-Za-z]{2,}", v.lower()):
+        if w not in GENERIC_MEM:
+            toks.add(w)
+    return frozenset(toks)
+
+
 def concept_ok(con):
     cl = (con or '').lower()
     if not any(g in cl for g in ('revenue', 'sales', 'income', 'profit', 'margin', 'operating',
@@ -280,18 +291,35 @@ def concept_ok(con):
 
 def concept_type_ok(name, concept):
     """concept must match the metric TYPE named in the KPI (revenue vs income vs margin)."""
-    nl = name.lower(); cl = concept.lower()
+    kind = _name_type(name)
+    return kind is None or kind in _concept_types(concept)
+
+
+def _name_type(name):
+    """the metric TYPE a KPI name asks for (first matching rule wins), None = no strong hint."""
+    nl = name.lower()
     if any(w in nl for w in ('revenue', 'sales')):
-        return 'revenue' in cl or 'sales' in cl
+        return 'revenue'
     if 'gross profit' in nl or 'gross margin' in nl:
-        return 'grossprofit' in cl or 'grossmargin' in cl
+        return 'gross'
     if any(w in nl for w in ('operating income', 'operating profit', 'operating loss', 'ebit')):
-        return 'operatingincome' in cl or 'operatingprofit' in cl
+        return 'operating'
     if 'premium' in nl:
-        return 'premium' in cl
+        return 'premium'
     if any(w in nl for w in ('income', 'earnings', 'profit')):
-        return 'income' in cl or 'profit' in cl or 'earnings' in cl
-    return True   # no strong type hint -> rely on concept_ok + value + member
+        return 'income'
+    return None   # no strong type hint -> rely on concept_ok + value + member
+
+
+def _concept_types(concept):
+    """every metric TYPE a concept name satisfies (the concept half of concept_type_ok)."""
+    cl = concept.lower()
+    return frozenset(t for t, ok in (
+        ('revenue', 'revenue' in cl or 'sales' in cl),
+        ('gross', 'grossprofit' in cl or 'grossmargin' in cl),
+        ('operating', 'operatingincome' in cl or 'operatingprofit' in cl),
+        ('premium', 'premium' in cl),
+        ('income', 'income' in cl or 'profit' in cl or 'earnings' in cl)) if ok)
 
 
 def _member_score(kt, mt):
@@ -306,25 +334,54 @@ def _member_score(kt, mt):
     return None
 
 
-def tier1(xbrls, name, val, per, is_currency=None):
-    """match an XBRL fact by value+period+dimension member. Deterministic; returns dict or None.
-    Collects all facts equal in (concept-type, value, period); picks the best member match, and
-    ABSTAINS if two different members tie (genuinely ambiguous).
-    is_currency (round-12 unit-class guard): 1 -> a fact tagged with a non-USD unitRef (e.g.
-    shares) never binds; 0 -> a USD-tagged fact never binds; None/absent unitRef -> no opinion."""
-    # SIGNED + Decimal-EXACT: a -X KPI must not bind a +X fact, and 2.34 must never bind a 2.01
-    # fact (the old int-truncation conflated them — WP1 exactness fix).
-    def _same_value(fc_value):
-        try:
-            return XN.eq(str(fc_value).strip(), str(val))
-        except XN.ExactError:
-            return False
-    kt = slice_tokens(name)                # round-27: the ONE global set (uppercase shorts in)
-    # a KPI with no slice tokens is only an aggregate if it actually says so; otherwise its
-    # slice identity is unrecoverable (e.g. a residual "other" bucket) -> abstain
-    if not kt and not any(w in name.lower() for w in ('total', 'consolidated')):
-        return None
-    cands = []   # (score, concept, members_label, member_key, fc)
+# ---------- Tier-1 prepared fact index ----------
+# Everything tier1 decides about a fact that does NOT depend on the claim (JSON parse, concept_ok,
+# concept TYPE flags, unit class, period shape + exact-date law, seg_parse completeness, the
+# full-slice token set and its overlap gate, member tokens) is computed ONCE per filing and the
+# surviving facts are bucketed by (Decimal value, endDate, slice key). A claim then reads one
+# bucket instead of re-walking every blob. slice key = frozenset of the members' full-slice
+# tokens (the set tier1 requires to EQUAL the KPI's slice tokens), None for an undimensioned fact.
+_Fact = namedtuple('_Fact', 'concept types unit pairs members mt fc')
+_PREPARED = OrderedDict()          # tuple(xbrls) -> index, most recently used last
+_PREPARED_MAX = 32
+
+
+def _fact_slice(pairs):
+    """(slice key, ok) for sorted (axis, member) pairs — the full-slice proof half of tier1.
+    ok=False: an unknown ∅-token member or overlapping members -> the fact can never bind."""
+    if not pairs:
+        return None, True
+    contribs = []
+    for _ax, _mm in pairs:
+        if (_ax, _mm) in STRUCTURAL_PAIRS:
+            continue           # exact graph-proven structural pins ONLY
+        _pre, _, _loc = str(_mm).rpartition(':')
+        if _pre == 'country':
+            # round-29 (reviewer safety find, reproduced + MEASURED): bare ISO codes
+            # collide with business abbreviations (IT≠Italy, NA≠North America,
+            # AI/GM/SA...) and ZERO live binds depended on the round-28 code
+            # shortcut (filer-named members carry their own tokens) — so codes are
+            # NEVER proof: country members bind on FULL-NAME tokens only.
+            _nm = COUNTRY_NAME.get(_loc.upper())
+            _tk = ({w for w in re.findall(r"[A-Za-z]{3,}", _nm.lower())
+                    if w not in SLICE_STOP} if _nm else set())
+        else:
+            _tk = member_tokens([_mm]) - SLICE_STOP   # ONE shared normalization
+        if not _tk:
+            return None, False     # round-21: an UNKNOWN ∅-token member is a REAL,
+                                   # unprovable slice (OtherNet class) -> ABSTAIN
+        contribs.append(_tk)
+    need = set().union(*contribs) if contribs else set()
+    if sum(len(c) for c in contribs) != len(need):
+        return None, False         # round-21: overlapping members under different
+                                   # axes = ambiguous attribution (any shared token)
+    return frozenset(need), True
+
+
+def prepare_xbrls(xbrls):
+    """the Tier-1 index for one filing's XBRL blobs: {(Decimal value, endDate): {slice key: [_Fact]}}.
+    Facts that fail a claim-independent gate are dropped here, exactly as tier1 would skip them."""
+    index = {}
     for b in xbrls:
         try:
             data = json.loads(b)
@@ -333,25 +390,22 @@ def tier1(xbrls, name, val, per, is_currency=None):
         if not isinstance(data, dict):
             continue
         for concept, facts in data.items():
-            if not concept_ok(concept) or not concept_type_ok(name, concept):
+            if not concept_ok(concept):
                 continue
+            types = _concept_types(concept)
             for fc in (facts if isinstance(facts, list) else [facts]):
                 if not isinstance(fc, dict):
                     continue
-                if not _same_value(fc.get('value', '')):
+                try:
+                    value = XN.dec(str(fc.get('value', '')).strip())
+                except XN.ExactError:
                     continue
                 u = str(fc.get('unitRef') or '').lower()
                 if 'pure' in u:
                     continue                      # round-14: a pure-unit fact (rate/ratio/percent)
                                                   # never binds this money/number lane — unit
                                                   # identity decides, never concept-name tokens
-                if is_currency == 1 and u and 'usd' not in u:
-                    continue                      # shares/other units never satisfy a money KPI
-                if is_currency == 0 and 'usd' in u:
-                    continue                      # a money fact never satisfies a non-money KPI
                 _pe = fc.get('period') or {}
-                if _pe.get('endDate') != per:
-                    continue
                 if not (isinstance(_pe.get('startDate'), str) and _pe['startDate'].strip()
                         and isinstance(_pe.get('endDate'), str)):
                     continue           # round-28: an INVALID duration shape (endDate-only etc.)
@@ -366,57 +420,78 @@ def tier1(xbrls, name, val, per, is_currency=None):
                 if not _complete:
                     continue           # any unparsed/blank/typed entry -> identity unprovable
                 pairs = sorted(_pairs)
+                key, ok = _fact_slice(pairs)
+                if not ok:
+                    continue
                 members = [m for _, m in pairs]         # canonical ONCE for every emitted field
-                # round-20 (reviewer-generalized from the country rule): FULL-SLICE PROOF
-                # for EVERY dimension — the KPI's slice-token set must EQUAL the union of every
-                # member's meaningful tokens (country codes expand via the ISO names; structural
-                # members tokenize to ∅ = the exact already-proven class and change nothing).
-                # [Alpha, Beta] never binds plain 'Alpha Revenue'; US+Canada never binds US;
-                # identical member names under different axes still bind when the KPI names them.
-                _contribs = []             # per-member token sets (attribution units)
-                _gate_fail = False
-                for _ax, _mm in pairs:
-                    if (_ax, _mm) in STRUCTURAL_PAIRS:
-                        continue           # exact graph-proven structural pins ONLY
-                    _pre, _, _loc = str(_mm).rpartition(':')
-                    if _pre == 'country':
-                        # round-29 (reviewer safety find, reproduced + MEASURED): bare ISO codes
-                        # collide with business abbreviations (IT≠Italy, NA≠North America,
-                        # AI/GM/SA...) and ZERO live binds depended on the round-28 code
-                        # shortcut (filer-named members carry their own tokens) — so codes are
-                        # NEVER proof: country members bind on FULL-NAME tokens only.
-                        _nm = COUNTRY_NAME.get(_loc.upper())
-                        _tk = ({w for w in re.findall(r"[A-Za-z]{3,}", _nm.lower())
-                                if w not in SLICE_STOP} if _nm else set())
-                    else:
-                        _tk = member_tokens([_mm]) - SLICE_STOP   # ONE shared normalization
-                    if not _tk:
-                        _gate_fail = True  # round-21: an UNKNOWN ∅-token member is a REAL,
-                        break              # unprovable slice (OtherNet class) -> ABSTAIN
-                    _contribs.append(_tk)
-                if not _gate_fail:
-                    for _i in range(len(_contribs)):
-                        for _j in range(_i + 1, len(_contribs)):
-                            if _contribs[_i] & _contribs[_j]:
-                                _gate_fail = True   # round-21: overlapping members under
-                                break               # different axes = ambiguous attribution
-                        if _gate_fail:
-                            break
-                _need = set().union(*_contribs) if _contribs else set()
-                if _gate_fail or (pairs and kt and _need != kt):
-                    continue           # round-27: plain equality against the ONE global set
-                mt = member_tokens(members)
-                if kt:
-                    score = _member_score(kt, mt)
-                    if score is None:
-                        continue
-                else:
-                    if seg_axis_members(fc):  # aggregate KPI binds ONLY an UNdimensioned fact (multi-axis-aware)
-                        continue
-                    score = 0
-                mlabel = ", ".join(m.split(':')[-1] for m in members) or "total"
-                mkey = frozenset(mt)
-                cands.append((score, concept, mlabel, mkey, fc))
+                index.setdefault((value, _pe['endDate']), {}).setdefault(key, []).append(
+                    _Fact(concept, types, u, pairs, members, frozenset(member_tokens(members)), fc))
+    return index
+
+
+def _prepared(xbrls):
+    """prepare_xbrls memoized on the blob tuple (LRU) — worklists hit the same filing per claim."""
+    key = tuple(xbrls)
+    try:
+        index = _PREPARED.get(key)
+    except TypeError:                      # an unhashable blob: index it, just don't cache it
+        return prepare_xbrls(key)
+    if index is None:
+        index = _PREPARED[key] = prepare_xbrls(key)
+        while len(_PREPARED) > _PREPARED_MAX:
+            _PREPARED.popitem(last=False)
+    else:
+        _PREPARED.move_to_end(key)
+    return index
+
+
+@lru_cache(maxsize=16384)
+def _slice_key(name):
+    return frozenset(slice_tokens(name))
+
+
+def tier1(xbrls, name, val, per, is_currency=None):
+    """match an XBRL fact by value+period+dimension member. Deterministic; returns dict or None.
+    Collects all facts equal in (concept-type, value, period); picks the best member match, and
+    ABSTAINS if two different members tie (genuinely ambiguous).
+    is_currency (round-12 unit-class guard): 1 -> a fact tagged with a non-USD unitRef (e.g.
+    shares) never binds; 0 -> a USD-tagged fact never binds; None/absent unitRef -> no opinion.
+    xbrls: the filing's JSON blobs (indexed once via prepare_xbrls and cached) or an index
+    already returned by prepare_xbrls."""
+    kt = _slice_key(name)                  # round-27: the ONE global set (uppercase shorts in)
+    # a KPI with no slice tokens is only an aggregate if it actually says so; otherwise its
+    # slice identity is unrecoverable (e.g. a residual "other" bucket) -> abstain
+    if not kt and not any(w in name.lower() for w in ('total', 'consolidated')):
+        return None
+    # SIGNED + Decimal-EXACT: a -X KPI must not bind a +X fact, and 2.34 must never bind a 2.01
+    # fact (the old int-truncation conflated them — WP1 exactness fix). Decimal equality is the
+    # bucket key, so only exactly-equal facts are ever looked at.
+    try:
+        want = XN.dec(str(val))
+    except XN.ExactError:
+        return None
+    index = xbrls if isinstance(xbrls, dict) else _prepared(xbrls)
+    # round-20/27 FULL-SLICE PROOF: a sliced KPI binds only a fact whose members' token union
+    # EQUALS its slice-token set ([Alpha, Beta] never binds plain 'Alpha Revenue'; US+Canada
+    # never binds US); an aggregate KPI binds ONLY an UNdimensioned fact (multi-axis-aware).
+    facts = index.get((want, per), {}).get(kt if kt else None, ())
+    kind = _name_type(name)
+    cands = []   # (score, concept, members_label, member_key, fc)
+    for f in facts:
+        if kind is not None and kind not in f.types:
+            continue
+        if is_currency == 1 and f.unit and 'usd' not in f.unit:
+            continue                      # shares/other units never satisfy a money KPI
+        if is_currency == 0 and 'usd' in f.unit:
+            continue                      # a money fact never satisfies a non-money KPI
+        if kt:
+            score = _member_score(kt, f.mt)
+            if score is None:
+                continue
+        else:
+            score = 0
+        mlabel = ", ".join(m.split(':')[-1] for m in f.members) or "total"
+        cands.append((score, f.concept, mlabel, f.mt, f.fc))
     if not cands:
         return None
     cands.sort(key=lambda c: -c[0])
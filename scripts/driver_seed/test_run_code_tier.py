@@ -3,7 +3,7 @@
 
     venv/bin/python scripts/driver_seed/test_run_code_tier.py
 """
-import os, sys, json
+import os, sys, json, functools, multiprocessing
 import pytest
 _HERE = os.path.dirname(os.path.abspath(__file__))
 _ROOT = os.path.abspath(os.path.join(_HERE, '..', '..'))
@@ -518,3 +518,172 @@ def test_round29_live_w_pega_recoveries():
             checked += 1
         assert checked, "no BSX filing fetched — the fail-closed claim went unexercised"
     print("[ok] LIVE: W missing-dot + PEGA redundant-acronym recoveries hold; BSX stays fail-closed")
+
+
+class _FakeGraph:
+    """Answers the per-cp fetch queries AND the TickerPrefetch batch queries from one table."""
+
+    def __init__(self, reports, parts):
+        self.reports, self.parts, self.calls = reports, parts, 0
+
+    def run(self, query, **p):
+        self.calls += 1
+        if 'AS por' in query:                                    # TickerPrefetch filings
+            return [{'form': r['form'], 'por': r['por'], 'acc': r['acc'], 'created': r['created'],
+                     'doc_url': r['doc_url'], 'xbrls': r['xbrls']} for r in self.reports
+                    if r['form'] in p['forms'] and any(r['por'].startswith(x) for x in p['periods'])]
+        if 'r.accessionNo IN $accessions' in query:              # batched text parts
+            return sorted(({'acc': a, 'rel': rel, 'part': part, 'content': c}
+                           for (a, rel, part, c) in self.parts
+                           if a in p['accessions'] and rel in p['relationship_types']),
+                          key=lambda r: (r['acc'], r['part']))
+        if 'RETURN n.id AS part' in query:                       # per-accession text parts
+            return sorted(({'part': part, 'content': c} for (a, rel, part, c) in self.parts
+                           if a == p['accession'] and rel in p['relationship_types']),
+                          key=lambda r: r['part'])
+        return [{'acc': r['acc'], 'created': r['created'], 'doc_url': r['doc_url'],   # fetch_filing
+                 'xbrls': r['xbrls']} for r in self.reports
+                if r['form'] == p['form'] and r['por'].startswith(p['period'])]
+
+
+def _fake_world(monkeypatch):
+    reports = [{'form': '10-Q', 'por': '2024-06-30', 'acc': 'Q2', 'created': 't2', 'doc_url': 'u2', 'xbrls': ['{}']},
+               {'form': '10-K', 'por': '2024-12-31', 'acc': 'K4', 'created': 't4', 'doc_url': 'u4', 'xbrls': []}]
+    parts = [('Q2', 'HAS_SECTION', 'q2-b', 'Revenue was $ 1,234.'), ('Q2', 'HAS_SECTION', 'q2-a', 'MD&A'),
+             ('Q2', 'HAS_EXHIBIT', 'q2-x', 'not a filing section'),
+             ('K4', 'HAS_SECTION', 'k4-a', 'Annual revenue $ 5,432.'),
+             ('E1', 'HAS_EXHIBIT', 'e1-a', 'Quarter revenue was $ 1,234.'),
+             ('E1', 'HAS_FILING_TEXT', 'e1-b', 'filing text'),
+             ('E2', 'HAS_EXHIBIT', 'e2-a', 'Year revenue was $ 5,432.')]
+    matches = [{'accession_8k': 'E1', 'filed_8k': '2024-07-25T16:00:00', 'accession_10q': 'Q2', 'lag_valid': True},
+               {'accession_8k': 'E2', 'filed_8k': '2025-01-30T16:00:00', 'accession_10q': 'K4', 'lag_valid': True},
+               {'accession_8k': 'E3', 'filed_8k': '2025-02-10T16:00:00', 'accession_10q': 'K4', 'lag_valid': True}]
+    resolved = []
+
+    def fake_resolve(tk, acc8, session=None):
+        resolved.append(acc8)
+        if acc8 == 'E3':
+            raise ValueError('unplaceable')
+        return {'safety_action': 'AUTO_OK', 'quarter_label': acc8}
+    monkeypatch.setattr(RC, 'match_8k_to_periodic', lambda s, tk, require_daily_stock: list(matches))
+    monkeypatch.setattr(RC.QI, 'resolve_quarter_info', fake_resolve)
+    return _FakeGraph(reports, parts), resolved
+
+
+def test_ticker_prefetch_equals_per_cp_fetch(monkeypatch):
+    """The batched per-ticker prefetch must serve EXACTLY what fetch_filing + fetch_earnings_8ks serve."""
+    g, resolved = _fake_world(monkeypatch)
+    keys = [('10-Q', '2024-06-30'), ('10-K', '2024-12-31'), ('10-Q', '2023-03-31')]
+    per_cp = {}
+    for form, per in keys:
+        f = RC.fetch_filing(g, 'TST', form, per)
+        per_cp[(form, per)] = (f, RC.fetch_earnings_8ks(g, 'TST', f['source_id']) if f else None)
+    n_resolve_per_cp = len(resolved)
+    resolved.clear(); g.calls = 0
+    pre = RC.TickerPrefetch(g, 'TST', keys)
+    assert g.calls == 2, g.calls                 # one filings query + one batched text-parts query
+    assert len(resolved) == 3 < n_resolve_per_cp  # quarter_identity once per 8-K, not per target
+    for form, per in keys:
+        f = pre.filing(form, per)
+        assert f == per_cp[(form, per)][0]
+        if f:
+            _assert_source_parts(f)
+            assert pre.earnings_8ks(f['source_id']) == per_cp[(form, per)][1]
+    events, uncertain, _ = pre.earnings_8ks('K4')
+    assert [e['source_id'] for e in events] == ['E2'] and uncertain == 1
+
+
+def test_parallel_runner_checkpoint_resume_and_deterministic_merge(monkeypatch, tmp_path):
+    """A crash mid-run resumes from checkpoints, and the merged files equal a clean serial run."""
+    cps = {(tk, '10-Q', '2024-06-30'): [mk_item(f'kpi {tk}', i)] for i, tk in enumerate(['CCC', 'AAA', 'BBB'])}
+
+    class _Drv:
+        def session(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+        def close(self):
+            pass
+    monkeypatch.setattr(RC, '_neo4j_driver', lambda: _Drv())
+    seen = []
+
+    def fake_ticker(session, tk, ticker_cps):
+        seen.append(tk)
+        if tk == 'BBB' and len(seen) == 2:
+            raise RuntimeError('crash')
+        return {'resolved': [{'tk': tk}], 'residual': [], 'abstain': [{'tk': tk, 'n': 1}],
+                'ledger': [{'ticker': tk}], 'stats': {'T1_xbrl': 1}}
+    monkeypatch.setattr(RC, 'run_ticker', fake_ticker)
+
+    crashed = tmp_path / 'crashed'; crashed.mkdir()
+    with pytest.raises(RuntimeError):
+        RC.run(cps, str(crashed))
+    assert seen == ['AAA', 'BBB']
+    counts, stats, resumed, _ = RC.run(cps, str(crashed))
+    assert resumed == 1 and seen[2:] == ['BBB', 'CCC']          # AAA came from its checkpoint
+    assert counts['resolved'] == 3 and stats['T1_xbrl'] == 3
+    assert not (crashed / '_checkpoint').exists()
+
+    clean = tmp_path / 'clean'; clean.mkdir()
+    RC.run(cps, str(clean))
+    for name in ('code_resolved.jsonl', 'residual.jsonl', 'abstain.jsonl', 'sources_ledger.jsonl'):
+        assert (crashed / name).read_text() == (clean / name).read_text(), name
+    assert [json.loads(l)['tk'] for l in (clean / 'code_resolved.jsonl').read_text().splitlines()] \
+        == ['AAA', 'BBB', 'CCC']
+
+
+def test_process_pool_runner_resumes_and_closes_worker_drivers(monkeypatch, tmp_path):
+    """jobs > 1: a worker crash leaves the other tickers checkpointed, the rerun only redoes the
+    crashed one, the merge equals a serial run, and every worker closes its Neo4j driver."""
+    cps = {(tk, '10-Q', '2024-06-30'): [mk_item(f'kpi {tk}', i)] for i, tk in enumerate(['DDD', 'AAA', 'CCC', 'BBB'])}
+    marks = tmp_path / 'marks'; marks.mkdir()
+
+    class _Drv:
+        def __init__(self):
+            (marks / f'open-{os.getpid()}').touch()
+
+        def session(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+        def close(self):
+            (marks / f'closed-{os.getpid()}').touch()
+
+    def fake_ticker(session, tk, ticker_cps):            # runs in the workers: report through files
+        (marks / f'ran-{tk}-{len(list(marks.glob(f"ran-{tk}-*")))}').touch()
+        if tk == 'BBB' and (marks / 'crash').exists():
+            (marks / 'crash').unlink()
+            raise RuntimeError('crash')
+        return {'resolved': [{'tk': tk}], 'residual': [], 'abstain': [], 'ledger': [{'ticker': tk}],
+                'stats': {'T1_xbrl': 1}}
+    monkeypatch.setattr(RC, '_neo4j_driver', _Drv)
+    monkeypatch.setattr(RC, 'run_ticker', fake_ticker)
+    monkeypatch.setattr(RC, 'ProcessPoolExecutor',     # fork, so the workers inherit the stubs above
+                        functools.partial(RC.ProcessPoolExecutor, mp_context=multiprocessing.get_context('fork')))
+
+    (marks / 'crash').touch()
+    pooled = tmp_path / 'pooled'; pooled.mkdir()
+    with pytest.raises(RuntimeError):
+        RC.run(cps, str(pooled), jobs=2)
+    assert sorted(f.name for f in (pooled / '_checkpoint').glob('???.json')) == ['AAA.json', 'CCC.json', 'DDD.json']
+    counts, stats, resumed, _ = RC.run(cps, str(pooled), jobs=2)
+    assert resumed == 3 and counts['resolved'] == 4 and stats['T1_xbrl'] == 4
+    assert sorted(f.name for f in marks.glob('ran-*')) == \
+        ['ran-AAA-0', 'ran-BBB-0', 'ran-BBB-1', 'ran-CCC-0', 'ran-DDD-0']
+    opened = {f.name.split('-')[1] for f in marks.glob('open-*')}
+    assert opened and opened == {f.name.split('-')[1] for f in marks.glob('closed-*')}
+
+    serial = tmp_path / 'serial'; serial.mkdir()
+    RC.run(cps, str(serial))
+    for name in ('code_resolved.jsonl', 'residual.jsonl', 'abstain.jsonl', 'sources_ledger.jsonl'):
+        assert (pooled / name).read_text() == (serial / name).read_text(), name
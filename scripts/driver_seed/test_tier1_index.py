@@ -0,0 +1,261 @@
+"""Prepared Tier-1 fact index: tier1() answers from link_lib.prepare_xbrls buckets instead of
+re-walking every blob / concept / fact per claim. None of that may change an outcome, so every
+answer is compared with ``legacy_tier1`` — the pre-index full scan, kept here verbatim minus its
+comments — on:
+
+  - every tier1 call the existing fixtures make (test_exactness + test_run_code_tier), and
+  - a seeded synthetic corpus covering the gates (units, period shapes, incomplete segments,
+    country / structural / overlapping members, Decimal spellings, ties).
+
+    venv/bin/python -m pytest scripts/driver_seed/test_tier1_index.py -q
+"""
+import os, sys, json, random, re, time, inspect
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, 'relocate_probe'))
+import link_lib as L
+
+
+def legacy_tier1(xbrls, name, val, per, is_currency=None):
+    """tier1 as it was before the prepared index: a full scan of every blob / concept / fact."""
+    def _same_value(fc_value):
+        try:
+            return L.XN.eq(str(fc_value).strip(), str(val))
+        except L.XN.ExactError:
+            return False
+    kt = L.slice_tokens(name)
+    if not kt and not any(w in name.lower() for w in ('total', 'consolidated')):
+        return None
+    cands = []
+    for b in xbrls:
+        try:
+            data = json.loads(b)
+        except (ValueError, TypeError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        for concept, facts in data.items():
+            if not L.concept_ok(concept) or not L.concept_type_ok(name, concept):
+                continue
+            for fc in (facts if isinstance(facts, list) else [facts]):
+                if not isinstance(fc, dict):
+                    continue
+                if not _same_value(fc.get('value', '')):
+                    continue
+                u = str(fc.get('unitRef') or '').lower()
+                if 'pure' in u:
+                    continue
+                if is_currency == 1 and u and 'usd' not in u:
+                    continue
+                if is_currency == 0 and 'usd' in u:
+                    continue
+                _pe = fc.get('period') or {}
+                if _pe.get('endDate') != per:
+                    continue
+                if not (isinstance(_pe.get('startDate'), str) and _pe['startDate'].strip()
+                        and isinstance(_pe.get('endDate'), str)):
+                    continue
+                if 'instant' in _pe:
+                    continue
+                try:
+                    L.XN.period_key(_pe['startDate'], _pe['endDate'])
+                except L.XN.ExactError:
+                    continue
+                _pairs, _complete = L.seg_parse(fc)
+                if not _complete:
+                    continue
+                pairs = sorted(_pairs)
+                members = [m for _, m in pairs]
+                _contribs = []
+                _gate_fail = False
+                for _ax, _mm in pairs:
+                    if (_ax, _mm) in L.STRUCTURAL_PAIRS:
+                        continue
+                    _pre, _, _loc = str(_mm).rpartition(':')
+                    if _pre == 'country':
+                        _nm = L.COUNTRY_NAME.get(_loc.upper())
+                        _tk = ({w for w in re.findall(r"[A-Za-z]{3,}", _nm.lower())
+                                if w not in L.SLICE_STOP} if _nm else set())
+                    else:
+                        _tk = L.member_tokens([_mm]) - L.SLICE_STOP
+                    if not _tk:
+                        _gate_fail = True
+                        break
+                    _contribs.append(_tk)
+                if not _gate_fail:
+                    for _i in range(len(_contribs)):
+                        for _j in range(_i + 1, len(_contribs)):
+                            if _contribs[_i] & _contribs[_j]:
+                                _gate_fail = True
+                                break
+                        if _gate_fail:
+                            break
+                _need = set().union(*_contribs) if _contribs else set()
+                if _gate_fail or (pairs and kt and _need != kt):
+                    continue
+                mt = L.member_tokens(members)
+                if kt:
+                    score = L._member_score(kt, mt)
+                    if score is None:
+                        continue
+                else:
+                    if L.seg_axis_members(fc):
+                        continue
+                    score = 0
+                mlabel = ", ".join(m.split(':')[-1] for m in members) or "total"
+                mkey = frozenset(mt)
+                cands.append((score, concept, mlabel, mkey, fc))
+    if not cands:
+        return None
+    cands.sort(key=lambda c: -c[0])
+    top = [c for c in cands if c[0] == cands[0][0]]
+    structs = {(c[1], tuple(sorted(tuple(p) for p in L.seg_axis_members(c[4]))),
+                (c[4].get('period') or {}).get('startDate'),
+                (c[4].get('period') or {}).get('endDate') or (c[4].get('period') or {}).get('instant'),
+                str(c[4].get('unitRef') or '').strip().lower())
+               for c in top}
+    if len(structs) > 1:
+        return None
+    score, concept, mlabel, _, fc = min(
+        top, key=lambda c: (c[1], c[2], json.dumps(c[4], sort_keys=True)))
+    pe = fc.get('period') or {}
+    q = f'{concept} [{mlabel}] [{pe.get("startDate","")}..{pe.get("endDate","")}] = {fc.get("value")}'
+    return {'member': mlabel, 'concept': concept, 'quote': q,
+            'axis_members': sorted(tuple(p) for p in L.seg_axis_members(fc)),
+            'period_start': pe.get('startDate', ''),
+            'period_end': pe.get('endDate') or pe.get('instant', ''),
+            'ptype': 'instant' if 'instant' in pe else 'duration'}
+
+
+
+
+def _fixture_calls(monkeypatch):
+    """(args, kwargs) of every tier1 call the existing fixture tests make."""
+    import test_exactness, test_run_code_tier
+    calls, real = [], L.tier1
+
+    def record(*args, **kwargs):
+        calls.append((args, kwargs))
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(L, 'tier1', record)
+    for module in (test_exactness, test_run_code_tier):
+        for name, fn in sorted(vars(module).items()):
+            if (name.startswith('test_') and '_live' not in name and callable(fn)
+                    and not inspect.signature(fn).parameters):       # offline fixtures only
+                try:
+                    fn()
+                except Exception:
+                    pass                 # a RED/env failure still leaves its calls recorded
+    monkeypatch.setattr(L, 'tier1', real)
+    return calls
+
+
+def test_fixture_calls_identical_to_legacy_scan(monkeypatch):
+    calls = _fixture_calls(monkeypatch)
+    assert len(calls) >= 30
+    for args, kwargs in calls:
+        assert L.tier1(*args, **kwargs) == legacy_tier1(*args, **kwargs), (args[1:], kwargs)
+
+
+# ── seeded synthetic corpus ───────────────────────────────────────────────
+CONCEPTS = ['Revenues', 'RevenueFromContractWithCustomerExcludingAssessedTax', 'CostOfRevenue',
+            'GrossProfit', 'OperatingIncomeLoss', 'NetIncomeLoss', 'PremiumsEarnedNet',
+            'IncomeTaxExpenseBenefit', 'SalesRevenueNet', 'StockholdersEquity']
+MEMBERS = [('srt:ProductOrServiceAxis', 'aapl:IPhoneMember'),
+           ('srt:ProductOrServiceAxis', 'co:NewVehiclesMember'),
+           ('srt:ProductOrServiceAxis', 'co:UsedVehiclesMember'),
+           ('us-gaap:StatementBusinessSegmentsAxis', 'co:EMEASegmentMember'),
+           ('us-gaap:StatementBusinessSegmentsAxis', 'co:RvAndOutdoorRetailMember'),
+           ('srt:StatementGeographicalAxis', 'country:US'),
+           ('srt:StatementGeographicalAxis', 'country:GB'),
+           ('srt:StatementGeographicalAxis', 'country:ZZ'),
+           ('srt:StatementGeographicalAxis', 'co:UnitedStatesMember'),
+           ('srt:ConsolidationItemsAxis', 'us-gaap:OperatingSegmentsMember'),
+           ('x:OtherAxis', 'x:OtherNetMember'),
+           ('x:ChannelAxis', 'co:NewVehiclesOnlineMember')]
+NAMES = ['Total Revenue', 'Revenue', 'Other Revenue', 'iPhone Revenue', 'Phone Revenue',
+         'New Vehicles Revenue', 'Used Vehicles Revenue', 'EMEA Revenue', 'EMEA Gross Profit',
+         'United States Revenue', 'United Kingdom Revenue', 'United States iPhone Revenue',
+         'RV and Outdoor Retail New Vehicles Revenue', 'Total Operating Income', 'Operating Income',
+         'Consolidated Net Income', 'Total Premiums', 'New Vehicles Online Revenue',
+         'United States Operating Income', 'U.S. Revenue']
+VALUES = ['100', '100.0', '100.00', '-100', '2.34', '2.01', '999000000', '0', 'N/A', '']
+PERIODS = [('2024-01-01', '2024-12-31'), ('2024-10-01', '2024-12-31'), ('2023-01-01', '2023-12-31'),
+           ('', '2024-12-31'), (None, '2024-12-31'), ('2024-13-01', '2024-12-31')]
+
+
+def _synthetic_fact(rng):
+    start, end = rng.choice(PERIODS)
+    period = {'endDate': end}
+    if start is not None:
+        period['startDate'] = start
+    if rng.random() < 0.05:
+        period['instant'] = end
+    fc = {'value': rng.choice(VALUES), 'period': period,
+          'unitRef': rng.choice(['U_USD', 'usd', 'shares', 'pure', None])}
+    shape = rng.random()
+    pairs = rng.sample(MEMBERS, rng.choice([1, 1, 2, 2, 3]))
+    if shape < 0.3:
+        pass                                                  # undimensioned
+    elif shape < 0.75:
+        seg = [{'dimension': a, 'value': m} for a, m in pairs]
+        fc['segment'] = seg[0] if len(seg) == 1 and rng.random() < 0.5 else seg
+    elif shape < 0.9:
+        fc['segment'] = {'explicitMember': [{'dimension': a, '$t': m} for a, m in pairs]}
+    else:
+        fc['segment'] = [{'dimension': pairs[0][0], 'value': ''}]      # incomplete
+    return fc
+
+
+def _synthetic_filing(rng, n_facts):
+    blobs = []
+    for _ in range(3):
+        data = {}
+        for _ in range(n_facts // 3):
+            data.setdefault(rng.choice(CONCEPTS), []).append(_synthetic_fact(rng))
+        blobs.append(json.dumps(data))
+    return blobs + ['not json', json.dumps(['a', 'list'])]
+
+
+def test_synthetic_corpus_identical_to_legacy_scan():
+    rng = random.Random(20260718)
+    compared = bound = 0
+    for _ in range(12):
+        blobs = _synthetic_filing(rng, 240)
+        for name in NAMES:
+            for val in ('100', 100, -100, 2.34, '999000000', 'N/A'):
+                for per in ('2024-12-31', '2023-12-31', None):
+                    for cur in (None, 0, 1):
+                        got = L.tier1(blobs, name, val, per, is_currency=cur)
+                        assert got == legacy_tier1(blobs, name, val, per, is_currency=cur), \
+                            (name, val, per, cur)
+                        compared += 1
+                        bound += got is not None
+    assert compared > 10000 and bound > 100          # the corpus really exercises binds
+
+
+def test_prepared_index_is_reused_and_passable():
+    blobs = _synthetic_filing(random.Random(7), 60)
+    index = L.prepare_xbrls(blobs)
+    for name in NAMES:
+        assert L.tier1(index, name, 100, '2024-12-31') == L.tier1(blobs, name, 100, '2024-12-31')
+    assert L._prepared(list(blobs)) is L._prepared(blobs)        # cached on blob content
+
+
+def test_worklist_against_one_filing_is_much_faster():
+    rng = random.Random(11)
+    blobs = _synthetic_filing(rng, 3000)
+    claims = [(rng.choice(NAMES), rng.choice(['100', '2.34', '999000000']), '2024-12-31') for _ in range(300)]
+
+    def run(fn):
+        started = time.perf_counter()
+        out = [fn(blobs, n, v, p, is_currency=1) for n, v, p in claims]
+        return out, time.perf_counter() - started
+
+    legacy, legacy_s = run(legacy_tier1)
+    L._PREPARED.clear()
+    indexed, indexed_s = run(L.tier1)
+    assert indexed == legacy
+    assert indexed_s * 10 < legacy_s
@@ -100,6 +100,7 @@ def fetch_av_raw(
     max_retries: int = 2,
     retry_spacing: float = 2.0,
     should_retry_response: Callable[[str], bool] | None = None,
+    before_request: Callable[[], None] | None = None,
     _urlopen: Any = None,  # test injection point
 ) -> str | None:
     """Fetch raw response text from Alpha Vantage with retry.
@@ -116,6 +117,8 @@ def fetch_av_raw(
         should_retry_response: Optional callback called on successful (non-error)
             responses.  If it returns True and retries remain, the request is
             retried.  Use make_false_empty_checker() for false-empty detection.
+        before_request: Optional callback run before every HTTP attempt,
+            retries included (e.g. taking a token from a shared rate limiter).
         _urlopen: Test injection — replaces urllib.request.urlopen.
     """
     query_params = {"function": function, "apikey": api_key}
@@ -128,6 +131,8 @@ def fetch_av_raw(
 
     for attempt in range(max_retries + 1):
         # ── HTTP call ──
+        if before_request is not None:
+            before_request()
         try:
             with opener(req, timeout=timeout) as resp:
                 raw = resp.read().decode("utf-8")
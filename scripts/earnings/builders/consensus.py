@@ -27,7 +27,6 @@ import json
 import logging
 import os
 import sys
-import time
 
 log = logging.getLogger(__name__)
 from datetime import datetime, timezone, timedelta
@@ -36,14 +35,14 @@ from ._paths import ensure_legacy_paths, ENV_PATH
 ensure_legacy_paths()
 
 # ── AV client import ─────────────────────────────────────────────────────
-from av_client import fetch_av_json, make_false_empty_checker
+from av_client import make_false_empty_checker
+from provider_client import get_provider_client
 
 # ── Constants ────────────────────────────────────────────────────────────
 
 _HISTORY_QUARTERS = 8      # total including current, newest first
 _FORWARD_QUARTERS = 4
 _FORWARD_YEARS = 2
-_AV_REQUEST_SPACING = 1.2  # seconds between API calls
 _AV_RETRY_SPACING = 2.0    # seconds before retry on rate limit
 _AV_MAX_RETRIES = 2
 _AV_TIMEOUT = 30
@@ -181,17 +180,20 @@ def _resolve_pub_ts(reported_date: str,
 # ── AV API (via av_client.py) ─────────────────────────────────────────────
 
 def _fetch_all_av(api_key: str, ticker: str, gaps: list) -> tuple:
-    """Fetch EARNINGS, ESTIMATES, INCOME_STATEMENT with throttling."""
+    """Fetch EARNINGS, ESTIMATES, INCOME_STATEMENT through the shared provider client.
+
+    Pacing comes from the cross-process AV token bucket (waits only when the
+    real quota is spent); fresh payloads are served from PROVIDER_CACHE_DIR.
+    """
     endpoints = [
         ("EARNINGS", "earnings"),
         ("EARNINGS_ESTIMATES", "estimates"),
         ("INCOME_STATEMENT", "income_statement"),
     ]
+    client = get_provider_client()
     results = []
-    for i, (function, label) in enumerate(endpoints):
-        if i > 0:
-            time.sleep(_AV_REQUEST_SPACING)
-        data = fetch_av_json(
+    for function, label in endpoints:
+        data = client.av_json(
             api_key, function, {"symbol": ticker},
             timeout=_AV_TIMEOUT,
             max_retries=_AV_MAX_RETRIES,
@@ -275,8 +277,7 @@ def _get_fye_month(ticker: str, gaps: list) -> int | None:
 
     # Tier 2: Yahoo info.lastFiscalYearEnd — always available, manual day<=5 adjustment
     try:
-        import yfinance as yf
-        fye_ts = yf.Ticker(ticker).info.get("lastFiscalYearEnd")
+        fye_ts = get_provider_client().yahoo_ticker(ticker).info.get("lastFiscalYearEnd")
         if fye_ts:
             dt = datetime.utcfromtimestamp(fye_ts)
             month = dt.month
@@ -428,13 +429,13 @@ def _fetch_yahoo_fallback(ticker: str, gaps: list) -> tuple:
     Returns (earnings_data, estimates_data, income_data) — all reshaped to AV-like dicts.
     """
     try:
-        import yfinance as yf
+        import yfinance  # noqa: F401
     except ImportError:
         gaps.append({"type": "fallback_error", "reason": "yfinance not installed"})
         return None, None, None
 
     try:
-        t = yf.Ticker(ticker)
+        t = get_provider_client().yahoo_ticker(ticker)
     except Exception as exc:
         gaps.append({"type": "fallback_error", "reason": f"yfinance init failed: {exc}"})
         return None, None, None
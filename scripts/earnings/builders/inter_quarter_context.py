@@ -8,6 +8,8 @@ Owns:
     same name, intentionally distinct — see test_parse_dt_for_pit_disambiguation)
   - PIT safety gates (_is_price_pit_safe, _build_forward_returns, _cutoff_boundary_price_role)
   - Render helpers (_best_safe_horizon, _report_summary, _render_*)
+  - Composite fetch layer (_fetch_iq_rows: concurrent queries + per-ticker
+    price timeline cache, opt-in via IQ_TIMELINE_CACHE_DIR)
   - render_inter_quarter_text(packet) -> str
   - build_inter_quarter_context(ticker, prev_8k_ts, context_cutoff_ts,
                                 out_path=None, context_cutoff_reason=None) -> packet dict
@@ -719,6 +721,145 @@ def render_inter_quarter_text(packet):
     return '\n'.join(lines)
 
 
+# --- Composite fetch layer ---
+#
+# The inter-quarter queries are independent of each other, and each
+# execute_cypher_query_all call opens its own session, so they run concurrently
+# on the shared driver instead of back to back. Related-filing content for the
+# sidecars is prefetched the same way, one job per accession.
+#
+# Price rows additionally go through a per-ticker daily-timeline cache (opt-in:
+# set IQ_TIMELINE_CACHE_DIR). Each ticker file holds the QUERY_IQ_PRICES rows for
+# one contiguous, settled date range; a request only queries the days outside
+# that range and widens it. Days within _IQ_TIMELINE_SETTLE_DAYS of today are
+# never cached (bars and benchmark returns may still be filling in) and are
+# always read live. News/filing rows are not cached: their forward returns are
+# written asynchronously after the event. Rows are stored exactly as returned,
+# so the packet is the same with or without the cache.
+
+_IQ_FETCH_WORKERS = 5
+_IQ_TIMELINE_CACHE_VERSION = 1
+_IQ_TIMELINE_SETTLE_DAYS = 3
+
+
+def _iq_timeline_cache_dir():
+    return os.environ.get("IQ_TIMELINE_CACHE_DIR") or None
+
+
+def _run_concurrently(jobs, workers=None):
+    """Run {key: zero-arg callable} and return {key: result}.
+
+    Sequential when there is a single job or workers <= 1. The first exception
+    raised by a job propagates, as it would from the sequential calls.
+    """
+    workers = _IQ_FETCH_WORKERS if workers is None else workers
+    if workers <= 1 or len(jobs) <= 1:
+        return {key: fn() for key, fn in jobs.items()}
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {key: pool.submit(fn) for key, fn in jobs.items()}
+        return {key: f.result() for key, f in futures.items()}
+
+
+def _shift_day(day, days):
+    from datetime import date, timedelta
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+def _load_price_timeline(path, ticker):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(cached, dict)
+            or cached.get("version") != _IQ_TIMELINE_CACHE_VERSION
+            or cached.get("ticker") != ticker):
+        return None
+    return cached
+
+
+def _fetch_price_rows(manager, ticker, prev_day, cutoff_day, cache_dir=None, today=None):
+    """QUERY_IQ_PRICES rows for [prev_day, cutoff_day], via the timeline cache if enabled."""
+    def query(lo, hi):
+        return manager.execute_cypher_query_all(QUERY_IQ_PRICES, {
+            'ticker': ticker, 'prev_day': lo, 'cutoff_day': hi
+        }) or []
+
+    today = today or datetime.now(timezone.utc).date().isoformat()
+    settled_end = min(cutoff_day, _shift_day(today, -_IQ_TIMELINE_SETTLE_DAYS))
+    if not cache_dir or settled_end < prev_day:
+        return query(prev_day, cutoff_day)
+
+    path = os.path.join(cache_dir, f"{ticker}.json")
+    cached = _load_price_timeline(path, ticker)
+    if cached is None:
+        lo, hi, rows = prev_day, settled_end, query(prev_day, settled_end)
+        changed = True
+    else:
+        lo, hi, rows = cached["start"], cached["end"], cached["rows"]
+        changed = False
+        # Widen to a contiguous range covering the request (bridging any gap).
+        if prev_day < lo:
+            rows = query(prev_day, _shift_day(lo, -1)) + rows
+            lo, changed = prev_day, True
+        if settled_end > hi:
+            rows = rows + query(_shift_day(hi, 1), settled_end)
+            hi, changed = settled_end, True
+
+    if changed:
+        try:
+            payload = json.dumps({
+                "version": _IQ_TIMELINE_CACHE_VERSION, "ticker": ticker,
+                "start": lo, "end": hi, "rows": rows,
+            })
+            os.makedirs(cache_dir, exist_ok=True)
+            _atomic_write_text(path, payload)
+        except (TypeError, ValueError, OSError):
+            pass  # non-JSON values or unwritable dir: serve uncached
+
+    window = [r for r in rows if prev_day <= str(r['date']) <= settled_end]
+    if cutoff_day > settled_end:
+        window += query(_shift_day(settled_end, 1), cutoff_day)
+    return window
+
+
+def _fetch_iq_rows(manager, ticker, prev_8k_ts, context_cutoff_ts, prev_day, cutoff_day):
+    """Fetch price/news/filing/dividend/split rows concurrently."""
+    ts_params = {'ticker': ticker, 'prev_8k_ts': prev_8k_ts, 'context_cutoff_ts': context_cutoff_ts}
+    day_params = {'ticker': ticker, 'prev_day': prev_day, 'cutoff_day': cutoff_day}
+    cache_dir = _iq_timeline_cache_dir()
+    return _run_concurrently({
+        'prices': lambda: _fetch_price_rows(manager, ticker, prev_day, cutoff_day, cache_dir),
+        'news': lambda: manager.execute_cypher_query_all(QUERY_IQ_NEWS, ts_params),
+        'filings': lambda: manager.execute_cypher_query_all(QUERY_IQ_FILINGS, ts_params),
+        'dividends': lambda: manager.execute_cypher_query_all(QUERY_IQ_DIVIDENDS, day_params),
+        'splits': lambda: manager.execute_cypher_query_all(QUERY_IQ_SPLITS, day_params),
+    })
+
+
+def _filing_row_wants_sidecar(row):
+    items = _iq_parse_json_field(row.get('items'), [])
+    exhibits_parsed = _iq_parse_json_field(row.get('exhibits'), {})
+    items_codes = {c for c in (_parse_item_code(i) for i in items) if c}
+    return _should_emit_sidecar(row.get('form_type'), items_codes,
+                                exhibits_parsed if isinstance(exhibits_parsed, dict) else {})
+
+
+def _prefetch_related_filing_content(manager, filing_rows, exclude_accessions):
+    """{accession: (sections, exhibits, filing_text)} for every sidecar-eligible filing."""
+    accessions = []
+    for row in filing_rows:
+        acc = row.get('accession')
+        if acc in exclude_accessions or acc in accessions:
+            continue
+        if _filing_row_wants_sidecar(row):
+            accessions.append(acc)
+    return _run_concurrently({
+        acc: (lambda a=acc: _fetch_related_filing_content(manager, a)) for acc in accessions
+    })
+
+
 def build_inter_quarter_context(ticker, prev_8k_ts, context_cutoff_ts,
                                 out_path=None, context_cutoff_reason=None,
                                 exclude_accessions=None,
@@ -755,26 +896,14 @@ def build_inter_quarter_context(ticker, prev_8k_ts, context_cutoff_ts,
 
     manager = get_manager()
     try:
-        # 3. Query
-        price_rows = manager.execute_cypher_query_all(QUERY_IQ_PRICES, {
-            'ticker': ticker, 'prev_day': prev_day, 'cutoff_day': cutoff_day
-        })
-
-        news_rows = manager.execute_cypher_query_all(QUERY_IQ_NEWS, {
-            'ticker': ticker, 'prev_8k_ts': prev_8k_ts, 'context_cutoff_ts': context_cutoff_ts
-        })
-
-        filing_rows = manager.execute_cypher_query_all(QUERY_IQ_FILINGS, {
-            'ticker': ticker, 'prev_8k_ts': prev_8k_ts, 'context_cutoff_ts': context_cutoff_ts
-        })
-
-        div_rows = manager.execute_cypher_query_all(QUERY_IQ_DIVIDENDS, {
-            'ticker': ticker, 'prev_day': prev_day, 'cutoff_day': cutoff_day
-        })
-
-        split_rows = manager.execute_cypher_query_all(QUERY_IQ_SPLITS, {
-            'ticker': ticker, 'prev_day': prev_day, 'cutoff_day': cutoff_day
-        })
+        # 3. Query (independent queries run concurrently)
+        rows = _fetch_iq_rows(manager, ticker, prev_8k_ts, context_cutoff_ts,
+                              prev_day, cutoff_day)
+        price_rows = rows['prices']
+        news_rows = rows['news']
+        filing_rows = rows['filings']
+        div_rows = rows['dividends']
+        split_rows = rows['splits']
 
         # 4. Build base day_map from price rows
         day_map = {}
@@ -918,8 +1047,11 @@ def build_inter_quarter_context(ticker, prev_8k_ts, context_cutoff_ts,
         # 9. Merge filing events
         # Set up sidecar directory once (only when caller opted in via
         # related_filings_dir — dry inspections pass None to avoid side effects).
+        related_content = {}
         if related_filings_dir:
             os.makedirs(related_filings_dir, exist_ok=True)
+            related_content = _prefetch_related_filing_content(
+                manager, filing_rows, exclude_accessions)
         for row in filing_rows:
             # U7: defensive target-accession exclusion (covers --pit > filed_8k).
             if row.get('accession') in exclude_accessions:
@@ -969,24 +1101,20 @@ def build_inter_quarter_context(ticker, prev_8k_ts, context_cutoff_ts,
                 'related_content_path': None,
             }
             # U7: emit sidecar for selected 8-K / 8-K/A only when caller opted in.
-            if related_filings_dir:
-                items_codes = {c for c in (_parse_item_code(i) for i in items) if c}
-                if _should_emit_sidecar(row.get('form_type'), items_codes,
-                                        exhibits_parsed if isinstance(exhibits_parsed, dict) else {}):
-                    sections, exhibits, filing_text = _fetch_related_filing_content(
-                        manager, row.get('accession'))
-                    md = _render_sidecar_md(ev, sections, exhibits, filing_text)
-                    if md.strip():
-                        sidecar_path = os.path.join(related_filings_dir,
-                                                    f"{row.get('accession')}.md")
-                        try:
-                            _atomic_write_text(sidecar_path, md)
-                            if os.path.isfile(sidecar_path):
-                                # Repo-relative path for the bundle / allowlist.
-                                ev['related_content_path'] = os.path.relpath(
-                                    sidecar_path, str(Path.cwd()))
-                        except OSError:
-                            pass  # leave related_content_path = None
+            if related_filings_dir and row.get('accession') in related_content:
+                sections, exhibits, filing_text = related_content[row.get('accession')]
+                md = _render_sidecar_md(ev, sections, exhibits, filing_text)
+                if md.strip():
+                    sidecar_path = os.path.join(related_filings_dir,
+                                                f"{row.get('accession')}.md")
+                    try:
+                        _atomic_write_text(sidecar_path, md)
+                        if os.path.isfile(sidecar_path):
+                            # Repo-relative path for the bundle / allowlist.
+                            ev['related_content_path'] = os.path.relpath(
+                                sidecar_path, str(Path.cwd()))
+                    except OSError:
+                        pass  # leave related_content_path = None
             if day_key not in day_map:
                 day_map[day_key] = {
                     'date': day_key, 'is_trading_day': False, 'boundary_role': None,
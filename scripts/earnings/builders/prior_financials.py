@@ -22,12 +22,14 @@ Orchestrator call:
 
 Environment:
     NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD (or .env file in project root)
+    PRIOR_FINANCIALS_CUBE_PATH  optional SQLite XBRL cube (see builders/xbrl_cube.py)
 """
 from __future__ import annotations
 
 import json
 import os
 import sys
+from contextlib import contextmanager
 from datetime import date, datetime, timezone
 from pathlib import Path
 
@@ -279,8 +281,8 @@ def _get_fye_month(ticker: str, gaps: list) -> int | None:
 
     # Tier 2: Yahoo info.lastFiscalYearEnd
     try:
-        import yfinance as yf
-        fye_ts = yf.Ticker(ticker).info.get("lastFiscalYearEnd")
+        from provider_client import get_provider_client
+        fye_ts = get_provider_client().yahoo_ticker(ticker).info.get("lastFiscalYearEnd")
         if fye_ts:
             dt = datetime.fromtimestamp(fye_ts, tz=timezone.utc)
             month = dt.month
@@ -1200,6 +1202,81 @@ def _compute_derived(m: dict) -> None:
         m["debt_to_equity"] = None
 
 
+# ── XBRL cube (optional local materialization) ───────────────────────────
+
+def _open_cube(path: str):
+    from .xbrl_cube import XbrlCube
+    segment_concepts = _FIELD_TO_CONCEPTS["revenue"] + ["us-gaap:OperatingIncomeLoss"]
+    return XbrlCube(path, ALL_CONCEPT_QNAMES, segment_concepts)
+
+
+def _cube_router(manager, cube):
+    """Manager stand-in answering the builder's XBRL/FSC/DEI/segment queries from the cube."""
+    from .xbrl_cube import CubeQueryRouter
+    return CubeQueryRouter(manager, {
+        _XBRL_FACTS_QUERY: cube.xbrl_facts,
+        _ALL_PERIODS_QUERY: cube.all_periods,
+        _FSC_QUERY: cube.fsc,
+        _DEI_FISCAL_QUERY: cube.dei_fiscal,
+        _SEGMENT_QUERY: cube.segments,
+        _FSC_FOR_SEGMENTS_QUERY: cube.fsc_for_segments,
+    })
+
+
+@contextmanager
+def _cube_backed_manager(manager, ticker: str):
+    """Route reads through the cube at PRIOR_FINANCIALS_CUBE_PATH (synced first), else the graph.
+
+    The cube's SQLite connection is closed when the block exits.
+    """
+    path = os.environ.get("PRIOR_FINANCIALS_CUBE_PATH")
+    if not path:
+        yield manager
+        return
+    cube = None
+    try:
+        cube = _open_cube(path)
+        delta = cube.sync_ticker(manager, ticker)
+    except Exception as e:
+        print(f"  XBRL cube unavailable ({e}); reading from Neo4j", file=sys.stderr)
+        if cube is not None:
+            cube.close()
+        yield manager
+        return
+    print(f"  XBRL cube: {len(delta)} filing(s) synced for {ticker}", file=sys.stderr)
+    try:
+        yield _cube_router(manager, cube)
+    finally:
+        cube.close()
+
+
+def _cube_verify_calls(manager, ticker: str, current_period: str, as_of: str | None) -> list:
+    """(label, query, params) for every query build_prior_financials would issue."""
+    def periods(query, params):
+        return {rec["period"] for rec in manager.execute_cypher_query_all(query, params)}
+
+    base = {"ticker": ticker, "current_period": current_period, "as_of": as_of,
+            "limit": _OVERFETCH_QUARTERS}
+    target = sorted(periods(_ALL_PERIODS_QUERY, base)
+                    | periods(_XBRL_FACTS_QUERY, {**base, "concept_list": ALL_CONCEPT_QNAMES}),
+                    reverse=True)[:_OVERFETCH_QUARTERS]
+    calls = [
+        ("xbrl_facts", _XBRL_FACTS_QUERY, {**base, "concept_list": ALL_CONCEPT_QNAMES}),
+        ("all_periods", _ALL_PERIODS_QUERY, base),
+        ("fsc", _FSC_QUERY, {"ticker": ticker, "periods": target, "as_of": as_of}),
+        ("dei_fiscal", _DEI_FISCAL_QUERY, {"ticker": ticker, "periods": target, "as_of": as_of}),
+    ]
+    accessions = sorted({rec["accession"] for rec in manager.execute_cypher_query_all(
+        _FSC_QUERY, {"ticker": ticker, "periods": target, "as_of": as_of})}
+        | {rec["accession"] for rec in manager.execute_cypher_query_all(
+            _DEI_FISCAL_QUERY, {"ticker": ticker, "periods": target, "as_of": as_of})})
+    segment_concepts = _FIELD_TO_CONCEPTS["revenue"] + ["us-gaap:OperatingIncomeLoss"]
+    for acc in accessions:
+        calls.append(("segments", _SEGMENT_QUERY, {"accession": acc, "concepts": segment_concepts}))
+        calls.append(("fsc_for_segments", _FSC_FOR_SEGMENTS_QUERY, {"accession": acc}))
+    return calls
+
+
 # ── Main Builder ─────────────────────────────────────────────────────────
 
 def build_prior_financials(ticker: str, quarter_info: dict,
@@ -1236,6 +1313,14 @@ def build_prior_financials(ticker: str, quarter_info: dict,
                      "reason": f"Neo4j connection failed: {e}"})
         return _assemble_packet(ticker, current_period, as_of_ts, mode, [], {}, gaps, None, None, out_path)
 
+    # Optional: serve the XBRL/FSC/DEI/segment reads from the local cube
+    with _cube_backed_manager(manager, ticker) as manager:
+        return _build_packet(manager, ticker, current_period, as_of_ts, mode, gaps, out_path, allow_yahoo)
+
+
+def _build_packet(manager, ticker: str, current_period: str, as_of_ts: str | None, mode: str,
+                  gaps: list[dict], out_path: str | None, allow_yahoo: bool) -> dict:
+    """Steps 1-11 of build_prior_financials, reading through manager."""
     # Get FYE month for fiscal labeling
     fye_month = _get_fye_month(ticker, gaps)
 
@@ -1563,13 +1648,14 @@ def _yahoo_fallback(ticker: str, current_period: str, as_of_ts: str | None,
                      gaps: list) -> list[dict]:
     """Fetch missing quarters from Yahoo Finance."""
     try:
-        import yfinance as yf
+        import yfinance  # noqa: F401
     except ImportError:
         gaps.append({"type": "yahoo_unavailable", "reason": "yfinance not installed"})
         return []
 
     try:
-        t = yf.Ticker(ticker)
+        from provider_client import get_provider_client
+        t = get_provider_client().yahoo_ticker(ticker)
         inc = t.quarterly_income_stmt
         cf = t.quarterly_cashflow
     except Exception as e:
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""Materialized per-company XBRL metric cube for prior_financials.
+
+A local SQLite copy of exactly the graph data build_prior_financials reads:
+
+  filings     (ticker, accession) → period, form, filed, xbrl_status
+  facts       accession → non-dimensional facts for the registry concepts
+              (concept, value, decimals, context_id, unit_ref, period_start, period_end)
+  statements  accession → FinancialStatementContent blobs (income / cash flow / balance)
+  dei         accession → (DocumentFiscalPeriodFocus, DocumentFiscalYearFocus) rows
+  members     accession → (concept, member qname, member label) for segment concepts
+
+The read methods (xbrl_facts, all_periods, fsc, dei_fiscal, segments,
+fsc_for_segments) return the same rows, in the same order, as the matching
+prior_financials Cypher queries — including the as_of (PIT) filter on
+Report.created — so the builder's grouping/dedupe code runs unchanged on top.
+
+Updates are incremental. sync_ticker() runs one manifest query per ticker and
+re-syncs only accessions that are new or whose form / period / created /
+xbrl_status changed (e.g. an XBRL worker finished the filing); rows are fetched
+with one UNWIND query per table for the whole delta. `follow` keeps the cube
+current from the `assets:ingested` channel the XBRL worker and report writer
+publish on; build_prior_financials also calls sync_ticker() first, so a missed
+notification only costs that one manifest diff.
+
+Enable for builds with PRIOR_FINANCIALS_CUBE_PATH=/path/to/cube.sqlite.
+
+Usage:
+    python3 -m scripts.earnings.builders.xbrl_cube sync CRM AAPL
+    python3 -m scripts.earnings.builders.xbrl_cube sync CRM --full
+    python3 -m scripts.earnings.builders.xbrl_cube follow
+    python3 -m scripts.earnings.builders.xbrl_cube verify CRM --period-of-report 2025-04-30 [--pit ISO]
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+
+REPORT_FORMS = ("10-Q", "10-K", "10-Q/A", "10-K/A")
+_STATEMENT_TYPES = ("StatementsOfIncome", "StatementsOfCashFlows", "BalanceSheets")
+_DEI_LIMIT = 50          # mirrors `WITH r LIMIT 50` in prior_financials._DEI_FISCAL_QUERY
+_SYNC_CHUNK = 50         # accessions per UNWIND
+
+
+# ── Sync queries (graph → cube) ─────────────────────────────────────────
+
+_CUBE_MANIFEST_QUERY = """\
+MATCH (r:Report)-[:PRIMARY_FILER]->(c:Company {ticker: $ticker})
+WHERE r.formType IN $forms
+RETURN r.accessionNo AS accession,
+       r.periodOfReport AS period,
+       r.formType AS form,
+       toString(r.created) AS filed,
+       r.xbrl_status AS xbrl_status
+"""
+
+_CUBE_FACTS_QUERY = """\
+UNWIND $accessions AS acc
+MATCH (r:Report {accessionNo: acc})-[:HAS_XBRL]->(x:XBRLNode)<-[:REPORTS]-(f:Fact)
+MATCH (f)-[:HAS_CONCEPT]->(con:Concept)
+MATCH (f)-[:IN_CONTEXT]->(ctx:Context)-[:HAS_PERIOD]->(p:Period)
+WHERE con.qname IN $concept_list
+  AND NOT exists { (f)-[:FACT_MEMBER]->(:Member) }
+  AND p.start_date IS NOT NULL
+RETURN acc AS accession,
+       con.qname AS concept,
+       f.value AS value,
+       f.decimals AS decimals,
+       f.context_id AS context_id,
+       f.unit_ref AS unit_ref,
+       p.start_date AS period_start,
+       p.end_date AS period_end
+ORDER BY acc, con.qname
+"""
+
+_CUBE_STATEMENTS_QUERY = """\
+UNWIND $accessions AS acc
+MATCH (r:Report {accessionNo: acc})-[:HAS_FINANCIAL_STATEMENT]->(fs:FinancialStatementContent)
+WHERE fs.statement_type IN $statement_types
+RETURN acc AS accession,
+       fs.statement_type AS statement_type,
+       fs.value AS fs_value
+"""
+
+_CUBE_DEI_QUERY = """\
+UNWIND $accessions AS acc
+MATCH (r:Report {accessionNo: acc})
+OPTIONAL MATCH (r)-[:HAS_XBRL]->(x:XBRLNode)<-[:REPORTS]-(fp:Fact)-[:HAS_CONCEPT]->(fpc:Concept {qname: 'dei:DocumentFiscalPeriodFocus'})
+OPTIONAL MATCH (r)-[:HAS_XBRL]->(x)<-[:REPORTS]-(fy:Fact)-[:HAS_CONCEPT]->(fyc:Concept {qname: 'dei:DocumentFiscalYearFocus'})
+RETURN acc AS accession,
+       fp.value AS fiscal_period,
+       fy.value AS fiscal_year
+"""
+
+_CUBE_MEMBERS_QUERY = """\
+UNWIND $accessions AS acc
+MATCH (r:Report {accessionNo: acc})-[:HAS_XBRL]->(x:XBRLNode)<-[:REPORTS]-(f:Fact)
+MATCH (f)-[:HAS_CONCEPT]->(con:Concept)
+MATCH (f)-[:FACT_MEMBER]->(m:Member)
+WHERE con.qname IN $concepts
+RETURN DISTINCT acc AS accession,
+       con.qname AS concept,
+       m.qname AS member_qname,
+       m.label AS member_label
+"""
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS filings (
+    ticker TEXT NOT NULL, accession TEXT NOT NULL, period TEXT, form TEXT,
+    filed TEXT, xbrl_status TEXT, PRIMARY KEY (ticker, accession));
+CREATE INDEX IF NOT EXISTS filings_by_period ON filings (ticker, period);
+CREATE TABLE IF NOT EXISTS facts (
+    accession TEXT NOT NULL, seq INTEGER, concept TEXT, value, decimals,
+    context_id TEXT, unit_ref TEXT, period_start TEXT, period_end TEXT);
+CREATE INDEX IF NOT EXISTS facts_by_accession ON facts (accession, concept);
+CREATE TABLE IF NOT EXISTS statements (
+    accession TEXT NOT NULL, seq INTEGER, statement_type TEXT, fs_value TEXT);
+CREATE INDEX IF NOT EXISTS statements_by_accession ON statements (accession);
+CREATE TABLE IF NOT EXISTS dei (
+    accession TEXT NOT NULL, seq INTEGER, fiscal_period, fiscal_year);
+CREATE INDEX IF NOT EXISTS dei_by_accession ON dei (accession);
+CREATE TABLE IF NOT EXISTS members (
+    accession TEXT NOT NULL, seq INTEGER, concept TEXT, member_qname TEXT, member_label TEXT);
+CREATE INDEX IF NOT EXISTS members_by_accession ON members (accession);
+"""
+
+_ACCESSION_TABLES = ("facts", "statements", "dei", "members")
+
+
+def _parse_ts(ts):
+    """Parse an ISO timestamp (Z / ±HH:MM / ±HHMM) the way Cypher datetime() would."""
+    s = str(ts).strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    if len(s) >= 5 and s[-5] in ("+", "-") and s[-4:].isdigit():
+        s = s[:-2] + ":" + s[-2:]
+    return datetime.fromisoformat(s)
+
+
+def _pit_ok(filed, as_of) -> bool:
+    """`$as_of IS NULL OR datetime(r.created) <= datetime($as_of)`."""
+    if as_of is None:
+        return True
+    try:
+        return _parse_ts(filed) <= _parse_ts(as_of)
+    except (TypeError, ValueError):
+        return False
+
+
+def _sort_desc(rows, *keys):
+    """Stable multi-key DESC sort (ORDER BY k1 DESC, k2 DESC, ...); nulls first, as in Cypher."""
+    for key in reversed(keys):
+        rows.sort(key=lambda r: (r[key] is None, r[key] or ""), reverse=True)
+    return rows
+
+
+class XbrlCube:
+    """SQLite-backed cube. One instance may be shared across threads."""
+
+    def __init__(self, path: str, fact_concepts, segment_concepts):
+        self.path = path
+        self.fact_concepts = list(fact_concepts)
+        self.segment_concepts = list(dict.fromkeys(segment_concepts))
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")      # rebuildable cache: favour write speed
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._check_concept_set()
+
+    def close(self):
+        self._conn.close()
+
+    # ── bookkeeping ──
+
+    def _concept_signature(self) -> str:
+        blob = json.dumps([sorted(self.fact_concepts), sorted(self.segment_concepts)])
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _check_concept_set(self):
+        """A changed METRIC_REGISTRY invalidates every stored filing."""
+        sig = self._concept_signature()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'concepts'").fetchone()
+            if row and row[0] == sig:
+                return
+            for table in _ACCESSION_TABLES + ("filings",):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('concepts', ?)", (sig,))
+
+    def _filings(self, ticker):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT accession, period, form, filed, xbrl_status FROM filings WHERE ticker = ?",
+                (ticker,)).fetchall()
+        return [dict(zip(("accession", "period", "form", "filed", "xbrl_status"), r)) for r in rows]
+
+    def _rows(self, table, columns, accessions):
+        """{accession: [row dicts in stored order]} for the given accessions."""
+        out: dict[str, list[dict]] = {}
+        accessions = list(dict.fromkeys(accessions))
+        for i in range(0, len(accessions), 500):
+            chunk = accessions[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT accession, {', '.join(columns)} FROM {table} "
+                    f"WHERE accession IN ({marks}) ORDER BY accession, seq", chunk).fetchall()
+            for r in rows:
+                out.setdefault(r[0], []).append(dict(zip(columns, r[1:])))
+        return out
+
+    # ── sync (graph → cube) ──
+
+    def sync_ticker(self, manager, ticker: str, full: bool = False) -> list[str]:
+        """Bring one ticker up to date; returns the accessions (re)loaded."""
+        ticker = ticker.upper()
+        manifest = manager.execute_cypher_query_all(
+            _CUBE_MANIFEST_QUERY, {"ticker": ticker, "forms": list(REPORT_FORMS)}) or []
+        current = {m["accession"]: m for m in manifest if m.get("accession")}
+        stored = {f["accession"]: f for f in self._filings(ticker)}
+
+        def changed(acc):
+            old, new = stored.get(acc), current[acc]
+            return full or old is None or any(old[k] != new.get(k)
+                                               for k in ("period", "form", "filed", "xbrl_status"))
+
+        delta = [acc for acc in current if changed(acc)]
+        removed = [acc for acc in stored if acc not in current]
+        if delta:
+            self._load_accessions(manager, ticker, [current[a] for a in delta])
+        if removed:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM filings WHERE ticker = ? AND accession = ?",
+                                       [(ticker, a) for a in removed])
+        return delta
+
+    def _load_accessions(self, manager, ticker, filings):
+        for i in range(0, len(filings), _SYNC_CHUNK):
+            chunk = filings[i:i + _SYNC_CHUNK]
+            accs = [f["accession"] for f in chunk]
+            facts = manager.execute_cypher_query_all(
+                _CUBE_FACTS_QUERY, {"accessions": accs, "concept_list": self.fact_concepts}) or []
+            statements = manager.execute_cypher_query_all(
+                _CUBE_STATEMENTS_QUERY, {"accessions": accs,
+                                         "statement_types": list(_STATEMENT_TYPES)}) or []
+            dei = manager.execute_cypher_query_all(_CUBE_DEI_QUERY, {"accessions": accs}) or []
+            members = manager.execute_cypher_query_all(
+                _CUBE_MEMBERS_QUERY, {"accessions": accs, "concepts": self.segment_concepts}) or []
+
+            def fs_text(v):
+                return v if v is None or isinstance(v, str) else json.dumps(v)
+
+            with self._lock, self._conn:
+                marks = ",".join("?" * len(accs))
+                for table in _ACCESSION_TABLES:
+                    self._conn.execute(f"DELETE FROM {table} WHERE accession IN ({marks})", accs)
+                self._conn.executemany(
+                    "INSERT INTO facts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(r["accession"], n, r["concept"], r.get("value"), r.get("decimals"),
+                      r.get("context_id"), r.get("unit_ref"), r.get("period_start"), r.get("period_end"))
+                     for n, r in enumerate(facts)])
+                self._conn.executemany(
+                    "INSERT INTO statements VALUES (?, ?, ?, ?)",
+                    [(r["accession"], n, r.get("statement_type"), fs_text(r.get("fs_value")))
+                     for n, r in enumerate(statements)])
+                self._conn.executemany(
+                    "INSERT INTO dei VALUES (?, ?, ?, ?)",
+                    [(r["accession"], n, r.get("fiscal_period"), r.get("fiscal_year"))
+                     for n, r in enumerate(dei)])
+                self._conn.executemany(
+                    "INSERT INTO members VALUES (?, ?, ?, ?, ?)",
+                    [(r["accession"], n, r.get("concept"), r.get("member_qname"), r.get("member_label"))
+                     for n, r in enumerate(members)])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO filings VALUES (?, ?, ?, ?, ?, ?)",
+                    [(ticker, f["accession"], f.get("period"), f.get("form"), f.get("filed"),
+                      f.get("xbrl_status")) for f in chunk])
+
+    # ── reads (same rows as the prior_financials queries) ──
+
+    def _reports(self, ticker, as_of, pred):
+        return [f for f in self._filings(ticker.upper())
+                if f["form"] in REPORT_FORMS and f["period"] is not None
+                and pred(f) and _pit_ok(f["filed"], as_of)]
+
+    def xbrl_facts(self, ticker, current_period, as_of, concept_list, limit):
+        """_XBRL_FACTS_QUERY."""
+        reports = self._reports(ticker, as_of, lambda f: f["xbrl_status"] == "COMPLETED"
+                                and f["period"] < current_period)
+        periods = set(sorted({f["period"] for f in reports}, reverse=True)[:limit])
+        reports = {f["accession"]: f for f in reports if f["period"] in periods}
+        wanted = set(concept_list)
+        rows = []
+        for acc, facts in self._rows("facts", ("concept", "value", "decimals", "context_id", "unit_ref",
+                                              "period_start", "period_end"), reports).items():
+            rep = reports[acc]
+            for fact in facts:
+                if fact["concept"] in wanted:
+                    rows.append({"period": rep["period"], "form": rep["form"],
+                                 "accession": acc, "filed": rep["filed"], **fact})
+        rows.sort(key=lambda r: r["concept"])
+        return _sort_desc(rows, "period", "filed")
+
+    def all_periods(self, ticker, current_period, as_of, limit):
+        """_ALL_PERIODS_QUERY."""
+        reports = self._reports(ticker, as_of, lambda f: f["period"] < current_period)
+        return [{"period": p} for p in sorted({f["period"] for f in reports}, reverse=True)[:limit]]
+
+    def fsc(self, ticker, periods, as_of):
+        """_FSC_QUERY."""
+        wanted = set(periods)
+        reports = {f["accession"]: f for f in self._reports(ticker, as_of, lambda f: f["period"] in wanted)}
+        rows = []
+        for acc, stmts in self._rows("statements", ("statement_type", "fs_value"), reports).items():
+            rep = reports[acc]
+            for s in stmts:
+                rows.append({"period": rep["period"], "form": rep["form"], "accession": acc,
+                             "filed": rep["filed"], **s})
+        return _sort_desc(rows, "period", "filed")
+
+    def dei_fiscal(self, ticker, periods, as_of):
+        """_DEI_FISCAL_QUERY."""
+        wanted = set(periods)
+        reports = _sort_desc(self._reports(ticker, as_of, lambda f: f["period"] in wanted), "filed")
+        reports = reports[:_DEI_LIMIT]
+        dei = self._rows("dei", ("fiscal_period", "fiscal_year"), [f["accession"] for f in reports])
+        rows = []
+        for rep in reports:
+            for d in dei.get(rep["accession"]) or [{"fiscal_period": None, "fiscal_year": None}]:
+                rows.append({"period": rep["period"], "form": rep["form"], "accession": rep["accession"],
+                             "filed": rep["filed"], **d})
+        return _sort_desc(rows, "period", "filed")
+
+    def segments(self, accession, concepts):
+        """_SEGMENT_QUERY."""
+        wanted = set(concepts)
+        return [m for m in self._rows("members", ("concept", "member_qname", "member_label"),
+                                      [accession]).get(accession, [])
+                if m["concept"] in wanted]
+
+    def fsc_for_segments(self, accession):
+        """_FSC_FOR_SEGMENTS_QUERY."""
+        for s in self._rows("statements", ("statement_type", "fs_value"), [accession]).get(accession, []):
+            if s["statement_type"] == "StatementsOfIncome":
+                return [{"fs_value": s["fs_value"]}]
+        return []
+
+
+class CubeQueryRouter:
+    """Manager stand-in: answers routed queries from the cube, passes the rest to Neo4j.
+
+    `routes` maps a Cypher query string to a callable taking that query's
+    parameters as keyword arguments.
+    """
+
+    def __init__(self, manager, routes: dict):
+        self._manager = manager
+        self._routes = routes
+
+    def execute_cypher_query_all(self, query, parameters=None):
+        handler = self._routes.get(query)
+        if handler is None:
+            return self._manager.execute_cypher_query_all(query, parameters)
+        return handler(**(parameters or {}))
+
+    def __getattr__(self, name):
+        return getattr(self._manager, name)
+
+
+def _canonical(rows):
+    return Counter(json.dumps(r, sort_keys=True, default=str) for r in rows or [])
+
+
+def verify(manager, router, calls) -> list[dict]:
+    """Compare graph vs cube rows for [(label, query, params)]; returns mismatches.
+
+    Rows are compared as multisets: where the Cypher ORDER BY leaves ties
+    (or has none), the graph's row order is not defined either.
+    """
+    mismatches = []
+    for label, query, params in calls:
+        graph_rows = manager.execute_cypher_query_all(query, params)
+        cube_rows = router.execute_cypher_query_all(query, params)
+        g, c = _canonical(graph_rows), _canonical(cube_rows)
+        if g != c:
+            mismatches.append({"query": label, "params": params,
+                               "graph_only": sum((g - c).values()), "cube_only": sum((c - g).values())})
+    return mismatches
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────
+
+def _follow(cube, manager):
+    """Re-sync tickers named on assets:ingested (report / xbrl notifications)."""
+    import redis as redis_mod
+    r = redis_mod.Redis(host=os.environ.get("REDIS_HOST", "192.168.40.72"),
+                        port=int(os.environ.get("REDIS_PORT", "31379")), decode_responses=True)
+    pubsub = r.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe("assets:ingested")           # RedisKeys.ASSET_INGESTED_CHANNEL
+    print("  following assets:ingested", file=sys.stderr)
+    try:
+        for message in pubsub.listen():
+            try:
+                data = json.loads(message["data"])
+            except (json.JSONDecodeError, TypeError, KeyError):
+                continue
+            if data.get("asset") not in ("report", "xbrl"):
+                continue
+            for ticker in {s.upper() for s in data.get("symbols") or [] if s}:
+                try:
+                    delta = cube.sync_ticker(manager, ticker)
+                    print(f"  {ticker}: {len(delta)} filing(s) synced", file=sys.stderr)
+                except Exception as e:
+                    print(f"  {ticker}: sync failed: {e}", file=sys.stderr)
+    finally:
+        pubsub.close()
+
+
+def main() -> None:
+    import argparse
+
+    from ._paths import ensure_legacy_paths
+    ensure_legacy_paths()
+    from . import prior_financials as pf
+
+    parser = argparse.ArgumentParser(description="prior_financials XBRL cube")
+    parser.add_argument("command", choices=["sync", "follow", "verify"])
+    parser.add_argument("tickers", nargs="*")
+    parser.add_argument("--cube", default=os.environ.get("PRIOR_FINANCIALS_CUBE_PATH"))
+    parser.add_argument("--full", action="store_true", help="sync: reload every filing")
+    parser.add_argument("--period-of-report", help="verify: current period (exclusive upper bound)")
+    parser.add_argument("--pit", help="verify: as_of timestamp")
+    args = parser.parse_args()
+    if not args.cube:
+        parser.error("--cube or PRIOR_FINANCIALS_CUBE_PATH is required")
+
+    pf._load_env()
+    from neograph.Neo4jConnection import get_manager
+    manager = get_manager()
+    cube = pf._open_cube(args.cube)
+
+    if args.command == "follow":
+        _follow(cube, manager)
+        return
+    if not args.tickers:
+        parser.error(f"{args.command} needs at least one ticker")
+
+    failed = False
+    for ticker in args.tickers:
+        ticker = ticker.upper()
+        delta = cube.sync_ticker(manager, ticker, full=args.full)
+        print(f"  {ticker}: {len(delta)} filing(s) synced", file=sys.stderr)
+        if args.command == "verify":
+            if not args.period_of_report:
+                parser.error("verify needs --period-of-report")
+            mismatches = verify(manager, pf._cube_router(manager, cube),
+                                pf._cube_verify_calls(manager, ticker, args.period_of_report, args.pit))
+            for m in mismatches:
+                print(f"  MISMATCH {ticker} {m}", file=sys.stderr)
+            print(f"  {ticker}: {'OK' if not mismatches else f'{len(mismatches)} mismatch(es)'}")
+            failed = failed or bool(mismatches)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""Shared provider-client layer for Alpha Vantage and Yahoo Finance.
+
+One ProviderClient per process (get_provider_client) owns:
+  * Redis-backed token buckets (utils/rate_limit.py), one per provider, so the
+    builders, warmup_cache and trade_ready_scanner draw from one real quota
+    instead of each sleeping a fixed spacing between calls;
+  * a content-addressed on-disk response cache (secReports.sec_fetch.ContentCache)
+    with a freshness policy per endpoint, so the same EARNINGS / ESTIMATES /
+    INCOME_STATEMENT payload or Yahoo frame is downloaded once per window
+    across every process sharing PROVIDER_CACHE_DIR;
+  * hit / miss / quota-wait counters (metrics()).
+
+Only successful payloads are cached: AV error payloads, false-empties (even
+the one fetch_av_raw hands back after its last retry) and empty Yahoo results
+are always refetched. The AV api key is never part of the cache key. Every AV
+HTTP attempt, retries included, takes a token from the AV bucket.
+
+Yahoo values are cached as tagged JSON (DataFrames, Series, timestamps and
+dates round-trip), never pickle: the cache directory is shared, and unpickling
+would run whatever any writer put there. Values JSON cannot hold are not cached.
+
+Environment:
+    PROVIDER_CACHE_DIR    cache root; unset = no disk cache (rate limiting only)
+    AV_RATE_PER_MIN       shared AV budget (default 70)
+    YAHOO_RATE_PER_SEC    shared Yahoo budget (default 2)
+    REDIS_HOST/REDIS_PORT bucket state; without Redis each process paces locally
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable
+
+from secReports.sec_fetch import ContentCache
+from utils.rate_limit import TokenBucket
+
+try:
+    from av_client import check_av_error, fetch_av_raw
+except ImportError:  # imported from the repo root (e.g. scripts/trade_ready_scanner.py)
+    from scripts.earnings.av_client import check_av_error, fetch_av_raw
+
+log = logging.getLogger(__name__)
+
+_HOUR = 3600.0
+
+# Seconds a cached payload stays fresh. Endpoints not listed use _DEFAULT_MAX_AGE.
+AV_FRESHNESS: dict[str, float] = {
+    "EARNINGS": 12 * _HOUR,
+    "EARNINGS_ESTIMATES": 6 * _HOUR,
+    "INCOME_STATEMENT": 24 * _HOUR,
+    "EARNINGS_CALENDAR": 6 * _HOUR,
+}
+YAHOO_FRESHNESS: dict[str, float] = {
+    "info": 24 * _HOUR,
+    "calendar": 6 * _HOUR,
+    "get_earnings_dates": 6 * _HOUR,
+    "earnings_estimate": 6 * _HOUR,
+    "revenue_estimate": 6 * _HOUR,
+    "eps_trend": 6 * _HOUR,
+    "earnings_history": 12 * _HOUR,
+    "quarterly_income_stmt": 24 * _HOUR,
+    "quarterly_cashflow": 24 * _HOUR,
+}
+_DEFAULT_MAX_AGE = 6 * _HOUR
+
+_AV_RATE_PER_MIN = 70.0     # AV false-empties stay rare at ~70 req/min (see av_client.py)
+_YAHOO_RATE_PER_SEC = 2.0
+
+
+def _default_redis():
+    try:
+        import redis as redis_lib
+    except ImportError:
+        return None
+    return redis_lib.Redis(host=os.environ.get("REDIS_HOST", "192.168.40.72"),
+                           port=int(os.environ.get("REDIS_PORT", "31379")),
+                           socket_connect_timeout=2, socket_timeout=2)
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    empty = getattr(value, "empty", None)          # pandas DataFrame / Series
+    if isinstance(empty, bool):
+        return empty
+    return isinstance(value, (dict, list)) and not value
+
+
+# ── Yahoo value <-> JSON ──
+
+def _axis(index) -> dict:
+    return {"values": list(index), "names": list(index.names), "dtype": str(index.dtype)}
+
+
+def _to_json(obj: Any) -> Any:
+    """json.dumps default: pandas / datetime values as tagged objects; TypeError for anything else."""
+    import numpy as np
+    import pandas as pd
+    if isinstance(obj, pd.DataFrame):
+        return {"__frame__": {"index": _axis(obj.index), "columns": _axis(obj.columns),
+                              "dtypes": [str(dt) for dt in obj.dtypes],
+                              "data": [obj.iloc[:, i].tolist() for i in range(obj.shape[1])]}}
+    if isinstance(obj, pd.Series):
+        return {"__series__": {"index": _axis(obj.index), "name": obj.name, "dtype": str(obj.dtype),
+                               "data": obj.tolist()}}
+    if obj is pd.NaT:
+        return {"__datetime__": None}
+    if isinstance(obj, datetime):                   # pd.Timestamp included; isoformat keeps the offset
+        return {"__datetime__": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__date__": obj.isoformat()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (tuple, set)):
+        return list(obj)
+    raise TypeError(f"{type(obj).__name__} is not cacheable")
+
+
+def _typed(values: list, dtype: str, name=None):
+    """pd.Index of values restored to dtype (timestamps come back with their own offsets)."""
+    import pandas as pd
+    try:
+        if dtype.startswith("datetime64"):
+            return pd.Index(pd.to_datetime(values, utc="," in dtype).astype(dtype), name=name)
+        return pd.Index(values, dtype=None if dtype == "object" else dtype, name=name)
+    except (TypeError, ValueError):
+        return pd.Index(values, dtype=object, name=name)
+
+
+def _restore_axis(axis: dict):
+    import pandas as pd
+    if len(axis["names"]) > 1:
+        return pd.MultiIndex.from_tuples([tuple(v) for v in axis["values"]], names=axis["names"])
+    return _typed(axis["values"], axis["dtype"], axis["names"][0])
+
+
+def _from_json(obj: dict) -> Any:
+    """json.loads object_hook reversing _to_json."""
+    import pandas as pd
+    if len(obj) != 1:
+        return obj
+    tag, value = next(iter(obj.items()))
+    if tag == "__datetime__":
+        return pd.NaT if value is None else pd.Timestamp(value)
+    if tag == "__date__":
+        return date.fromisoformat(value)
+    if tag == "__frame__":
+        index = _restore_axis(value["index"])
+        columns = [pd.Series(_typed(col, dt), index=index) for col, dt in zip(value["data"], value["dtypes"])]
+        frame = pd.concat(columns, axis=1, ignore_index=True) if columns else pd.DataFrame(index=index)
+        frame.columns = _restore_axis(value["columns"])
+        return frame
+    if tag == "__series__":
+        return pd.Series(_typed(value["data"], value["dtype"]), index=_restore_axis(value["index"]),
+                         name=value["name"])
+    return obj
+
+
+class ProviderClient:
+    """Rate-limited, cached access to Alpha Vantage and Yahoo Finance."""
+
+    def __init__(self, cache_dir: str | None = None, redis_client=None,
+                 av_rate_per_min: float = _AV_RATE_PER_MIN, yahoo_rate_per_sec: float = _YAHOO_RATE_PER_SEC,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.cache = ContentCache(cache_dir) if cache_dir else None
+        self.buckets = {
+            "av": TokenBucket("alphavantage", av_rate_per_min / 60.0, redis_client=redis_client,
+                              clock=clock, sleep=sleep),
+            "yahoo": TokenBucket("yahoo", yahoo_rate_per_sec, redis_client=redis_client,
+                                 clock=clock, sleep=sleep),
+        }
+        self._lock = threading.Lock()
+        self.stats = {p: {"requests": 0, "cache_hits": 0, "cache_misses": 0, "quota_wait_s": 0.0}
+                      for p in self.buckets}
+
+    # ---------------- bookkeeping ----------------
+    def _count(self, provider: str, field: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[provider][field] += amount
+
+    def _acquire(self, provider: str) -> None:
+        bucket = self.buckets[provider]
+        before = bucket.waited
+        bucket.acquire()
+        self._count(provider, "requests")
+        if bucket.waited > before:
+            self._count(provider, "quota_wait_s", bucket.waited - before)
+
+    def _lookup(self, provider: str, key: str, max_age: float) -> str | None:
+        if self.cache is None:
+            return None
+        text = self.cache.get(key, max_age=max_age)
+        self._count(provider, "cache_hits" if text is not None else "cache_misses")
+        return text
+
+    def metrics(self) -> dict[str, dict]:
+        """Per-provider counters plus cache hit rate (hits / lookups)."""
+        with self._lock:
+            out = {p: dict(s) for p, s in self.stats.items()}
+        for s in out.values():
+            lookups = s["cache_hits"] + s["cache_misses"]
+            s["hit_rate"] = round(s["cache_hits"] / lookups, 4) if lookups else None
+            s["quota_wait_s"] = round(s["quota_wait_s"], 3)
+        return out
+
+    # ---------------- Alpha Vantage ----------------
+    def av_raw(self, api_key: str, function: str, params: dict[str, str] | None = None,
+               **kwargs: Any) -> str | None:
+        """fetch_av_raw() behind the shared AV bucket and the response cache.
+
+        A token is taken before every HTTP attempt, so fetch_av_raw's retries stay
+        inside the budget. The payload is cached only if it passes the same checks
+        fetch_av_raw retries on: on the last attempt fetch_av_raw hands back a body
+        should_retry_response still flags (a false-empty), which is returned
+        but not cached.
+        """
+        key = ContentCache.request_key("av", function, json.dumps(params or {}, sort_keys=True))
+        raw = self._lookup("av", key, AV_FRESHNESS.get(function, _DEFAULT_MAX_AGE))
+        if raw is not None:
+            return raw
+        caller_hook = kwargs.pop("before_request", None)
+
+        def before_request():
+            self._acquire("av")
+            if caller_hook is not None:
+                caller_hook()
+
+        raw = fetch_av_raw(api_key, function, params, before_request=before_request, **kwargs)
+        if raw is not None and self.cache is not None and self._av_cacheable(raw, kwargs.get("should_retry_response")):
+            self.cache.put(key, raw)
+        return raw
+
+    @staticmethod
+    def _av_cacheable(raw: str, should_retry_response: Callable[[str], bool] | None) -> bool:
+        if check_av_error(raw) is not None:
+            return False
+        return not (should_retry_response and should_retry_response(raw))
+
+    def av_json(self, api_key: str, function: str, params: dict[str, str] | None = None,
+                **kwargs: Any) -> dict | None:
+        """Cached equivalent of av_client.fetch_av_json()."""
+        raw = self.av_raw(api_key, function, params, **kwargs)
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            return data if isinstance(data, dict) else None
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    # ---------------- Yahoo ----------------
+    def yahoo_ticker(self, ticker: str) -> "CachedYahooTicker":
+        """Drop-in for yfinance.Ticker(ticker) whose data attributes go through the cache."""
+        return CachedYahooTicker(self, ticker)
+
+    def _yahoo_value(self, ticker: str, name: str, args: tuple, kwargs: dict, load: Callable[[], Any]) -> Any:
+        key = ContentCache.request_key("yahoo", ticker.upper(), name, repr(args), repr(sorted(kwargs.items())))
+        text = self._lookup("yahoo", key, YAHOO_FRESHNESS.get(name, _DEFAULT_MAX_AGE))
+        if text is not None:
+            try:
+                return json.loads(text, object_hook=_from_json)
+            except Exception as e:
+                log.debug(f"Unreadable Yahoo cache entry {ticker}.{name}: {e}")
+        self._acquire("yahoo")
+        value = load()
+        if self.cache is not None and not _is_empty(value):
+            try:
+                self.cache.put(key, json.dumps(value, default=_to_json))
+            except Exception as e:
+                log.debug(f"Yahoo {ticker}.{name} not cacheable: {e}")
+        return value
+
+
+class CachedYahooTicker:
+    """Wraps yfinance.Ticker; names in YAHOO_FRESHNESS are cached, everything else passes through."""
+
+    def __init__(self, client: ProviderClient, ticker: str):
+        self._client = client
+        self._symbol = ticker
+        self._real = None
+
+    def _ticker(self):
+        if self._real is None:
+            import yfinance as yf
+            self._real = yf.Ticker(self._symbol)
+        return self._real
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in YAHOO_FRESHNESS:
+            return getattr(self._ticker(), name)
+        if name.startswith("get_"):
+            def call(*args, **kwargs):
+                return self._client._yahoo_value(self._symbol, name, args, kwargs,
+                                                 lambda: getattr(self._ticker(), name)(*args, **kwargs))
+            return call
+        return self._client._yahoo_value(self._symbol, name, (), {}, lambda: getattr(self._ticker(), name))
+
+
+_client: ProviderClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_provider_client() -> ProviderClient:
+    """Process-wide client (one set of buckets and counters per process)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ProviderClient(
+                cache_dir=os.environ.get("PROVIDER_CACHE_DIR") or None,
+                redis_client=_default_redis(),
+                av_rate_per_min=float(os.environ.get("AV_RATE_PER_MIN", _AV_RATE_PER_MIN)),
+                yahoo_rate_per_sec=float(os.environ.get("YAHOO_RATE_PER_SEC", _YAHOO_RATE_PER_SEC)),
+            )
+        return _client
@@ -20,6 +20,16 @@ NOT safe for NFS / distributed filesystems with weak locking.
 Readers tolerate torn/malformed JSONL lines silently (skip) so a crashed
 writer never poisons the reader for later rows.
 
+Reads are incremental. Each process keeps one ``_LedgerView`` per ledger
+path: the collapsed state, a ``run_id → byte offset`` index (latest row and
+opening ``running`` row), and the offset it has parsed up to. A read only
+parses the bytes appended since then. Every ``SNAPSHOT_EVERY_ROWS`` rows the
+view writes a compacted snapshot (``{ledger}.snapshot.json``: collapsed state
++ offsets + the ledger offset it covers). A fresh process loads the
+snapshot and parses only the tail after it. The JSONL itself is never
+rewritten — the snapshot is a cache. It is discarded whenever it no longer
+matches the ledger (rotated, truncated or rewritten file).
+
 Atomic write on the index: write to ``{path}.tmp.{pid}`` + ``os.replace``.
 Crash during regeneration never leaves a half-written index visible.
 
@@ -30,6 +40,7 @@ from __future__ import annotations
 import fcntl
 import json
 import os
+import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -59,6 +70,11 @@ TERMINAL_STATUSES: frozenset[str] = frozenset(
 )
 ALL_STATUSES: frozenset[str] = TERMINAL_STATUSES | {"running"}
 
+# Rows parsed since the last snapshot before the view writes a new one.
+SNAPSHOT_EVERY_ROWS = 500
+_SNAPSHOT_VERSION = 1
+_SIG_BYTES = 64  # bytes before the parsed offset used to detect a rewritten ledger
+
 
 # ── Atomic append primitive ───────────────────────────────────────────────
 
@@ -106,6 +122,146 @@ def _read_all_rows(path: Path) -> list[dict[str, Any]]:
     return rows
 
 
+# ── Incremental state (snapshot + tail + offset index) ────────────────────
+
+def _snapshot_path(path: Path) -> Path:
+    return path.with_name(path.name + ".snapshot.json")
+
+
+class _LedgerView:
+    """Collapsed ledger state for one path, kept current by parsing only the
+    bytes appended since the last read (see module docstring)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offset = 0                      # bytes parsed (always a line boundary)
+        self.inode: int | None = None
+        self.sig = ""                        # last _SIG_BYTES bytes before offset
+        self.latest: dict[str, dict[str, Any]] = {}
+        self.latest_offset: dict[str, int] = {}
+        self.open_offset: dict[str, int] = {}
+        self.rows_since_snapshot = 0
+        self.lines: dict[tuple[str, str], tuple[dict[str, Any], str]] = {}  # refresh_index row cache
+
+    # -- consistency checks --------------------------------------------------
+    @staticmethod
+    def _sig_at(f, offset: int) -> str:
+        start = max(0, offset - _SIG_BYTES)
+        f.seek(start)
+        return f.read(offset - start).decode("latin-1")
+
+    def _still_valid(self, f, st: os.stat_result) -> bool:
+        if self.inode is None:
+            return self.offset == 0
+        return (st.st_ino == self.inode and st.st_size >= self.offset
+                and self._sig_at(f, self.offset) == self.sig)
+
+    def _load_snapshot(self, f, st: os.stat_result) -> None:
+        try:
+            snap = json.loads(_snapshot_path(self.path).read_text(encoding="utf-8"))
+            if (snap.get("version") != _SNAPSHOT_VERSION or snap.get("inode") != st.st_ino
+                    or snap["offset"] > st.st_size or self._sig_at(f, snap["offset"]) != snap["sig"]):
+                return
+            self.offset, self.inode, self.sig = snap["offset"], st.st_ino, snap["sig"]
+            self.latest = snap["latest"]
+            self.latest_offset = snap["latest_offset"]
+            self.open_offset = snap["open_offset"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+
+    def _write_snapshot(self) -> None:
+        snap = {"version": _SNAPSHOT_VERSION, "offset": self.offset, "inode": self.inode,
+                "sig": self.sig, "latest": self.latest, "latest_offset": self.latest_offset,
+                "open_offset": self.open_offset}
+        dst = _snapshot_path(self.path)
+        tmp = dst.with_name(dst.name + f".tmp.{os.getpid()}.{threading.get_ident()}")
+        try:
+            tmp.write_text(json.dumps(snap, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, dst)
+            self.rows_since_snapshot = 0
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    # -- refresh -------------------------------------------------------------
+    def refresh(self) -> None:
+        """Bring the view up to the current end of the ledger. Caller holds ``lock``."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            self._reset()
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if not self._still_valid(f, st):
+                self._reset()
+            if self.inode is None:
+                self._load_snapshot(f, st)
+                self.inode = st.st_ino
+            if st.st_size <= self.offset:
+                return
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+            end = data.rfind(b"\n") + 1         # a writer may be mid-line; stop at the last newline
+            if end == 0:
+                return
+            pos = self.offset
+            for line in data[:end].split(b"\n")[:-1]:
+                self._apply(line, pos)
+                pos += len(line) + 1
+            self.offset = pos
+            self.sig = self._sig_at(f, pos)
+        if self.rows_since_snapshot >= SNAPSHOT_EVERY_ROWS:
+            self._write_snapshot()
+
+    def _apply(self, line: bytes, pos: int) -> None:
+        if not line.strip():
+            return
+        try:
+            row = json.loads(line)
+        except ValueError:
+            return  # Torn write from a crashed process — silently skip.
+        run_id = row.get("run_id") if isinstance(row, dict) else None
+        self.rows_since_snapshot += 1
+        if run_id is None:
+            return
+        self.latest[run_id] = row
+        self.latest_offset[run_id] = pos
+        if row.get("status") == "running" and run_id not in self.open_offset:
+            self.open_offset[run_id] = pos
+
+    def opening_row(self, run_id: str) -> dict[str, Any] | None:
+        """The first ``running`` row of ``run_id``, read at its indexed offset."""
+        pos = self.open_offset.get(run_id)
+        if pos is None:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(pos)
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+
+_VIEWS: dict[str, _LedgerView] = {}
+_VIEWS_LOCK = threading.Lock()
+
+
+def _view(path: Path) -> _LedgerView:
+    key = os.path.abspath(path)
+    with _VIEWS_LOCK:
+        view = _VIEWS.get(key)
+        if view is None:
+            view = _VIEWS[key] = _LedgerView(Path(key))
+        return view
+
+
 # ── Public API ────────────────────────────────────────────────────────────
 
 def open_run(
@@ -203,13 +359,15 @@ def close_run(
     # Try to preserve started_at / compute elapsed by looking up the original
     # running row — but don't fail if it's missing (the ledger may have been
     # rotated, pruned, or this is a close of a run we never opened).
-    started_at = None
     path = ledger_path or LEDGER_PATH
-    rows = _read_all_rows(path)
-    for r in rows:
-        if r.get("run_id") == run_id and r.get("status") == "running":
-            started_at = r.get("started_at")
-            break
+    view = _view(path)
+    with view.lock:
+        view.refresh()
+        # Copy the identifying fields from the opening row so each row is
+        # self-describing. This means a reader can render any row without
+        # having to also scan the opening row.
+        open_row: dict[str, Any] = view.opening_row(run_id) or {}
+    started_at = open_row.get("started_at")
 
     elapsed = None
     if started_at:
@@ -219,15 +377,6 @@ def close_run(
         except (ValueError, TypeError):
             pass
 
-    # Copy the identifying fields from the opening row so each row is
-    # self-describing. This means a reader can render any row without
-    # having to also scan the opening row.
-    open_row: dict[str, Any] = {}
-    for r in rows:
-        if r.get("run_id") == run_id and r.get("status") == "running":
-            open_row = r
-            break
-
     close = {
         "schema_version": SCHEMA_VERSION,
         "run_id": run_id,
@@ -269,14 +418,10 @@ def current_state(
     Applies optional filters. Sort is reverse-chronological by
     ``started_at``. Pass ``limit`` to cap the result list size.
     """
-    rows = _read_all_rows(ledger_path or LEDGER_PATH)
-    latest: dict[str, dict[str, Any]] = {}
-    for r in rows:
-        run_id = r.get("run_id")
-        if run_id is not None:
-            latest[run_id] = r
-
-    out = list(latest.values())
+    view = _view(ledger_path or LEDGER_PATH)
+    with view.lock:
+        view.refresh()
+        out = [dict(r) for r in view.latest.values()]
     if component is not None:
         out = [r for r in out if r.get("component") == component]
     if status is not None:
@@ -330,7 +475,70 @@ def _short_id(run_id: str | None) -> str:
     return run_id[:8]
 
 
-def _render_in_flight_section(running: list[dict[str, Any]]) -> str:
+def _row_line(cells: list[str]) -> str:
+    return "| " + " | ".join(cells) + " |"
+
+
+def _in_flight_row(r: dict[str, Any]) -> str:
+    return _row_line([
+        _short_id(r.get("run_id")),
+        _fmt(r.get("component")),
+        _fmt(r.get("ticker")),
+        _fmt(r.get("quarter_label")),
+        _fmt(r.get("started_at")),
+    ])
+
+
+def _prediction_row(r: dict[str, Any]) -> str:
+    s = r.get("summary", {}) or {}
+    return _row_line([
+        _fmt_date(r.get("started_at")),
+        _fmt(r.get("ticker")),
+        _fmt(r.get("quarter_label")),
+        _fmt(s.get("direction")),
+        _fmt(s.get("confidence_score")),
+        _fmt(s.get("magnitude_bucket")),
+        _fmt(s.get("expected_move_range_pct")),
+        _fmt_status(r.get("status", "?")),
+        _short_id(r.get("run_id")),
+    ])
+
+
+def _learner_row(r: dict[str, Any]) -> str:
+    s = r.get("summary", {}) or {}
+    ar = s.get("actual_daily_stock_pct")
+    actual_return = f"{ar:+.2f}%" if isinstance(ar, (int, float)) else _fmt(ar)
+    mep = s.get("magnitude_error_pct")
+    mag_err = f"{mep:.2f}pp" if isinstance(mep, (int, float)) else _fmt(mep)
+    return _row_line([
+        _fmt_date(r.get("started_at")),
+        _fmt(r.get("ticker")),
+        _fmt(r.get("quarter_label")),
+        _fmt(s.get("direction_correct")),
+        actual_return,
+        mag_err,
+        _fmt(s.get("primary_driver_category")),
+        _fmt_status(r.get("status", "?")),
+        _short_id(r.get("run_id")),
+    ])
+
+
+def _extraction_row(r: dict[str, Any]) -> str:
+    s = r.get("summary", {}) or {}
+    return _row_line([
+        _fmt_date(r.get("started_at")),
+        _fmt(r.get("ticker")),
+        _fmt(r.get("source_asset")),
+        _fmt(r.get("source_id")),
+        _fmt(s.get("items_extracted")),
+        _fmt(s.get("items_written")),
+        _fmt(s.get("enrichment_status")),
+        _fmt_status(r.get("status", "?")),
+        _short_id(r.get("run_id")),
+    ])
+
+
+def _render_in_flight_section(running: list[dict[str, Any]], render_row=_in_flight_row) -> str:
     header = "## In Flight (status = running)\n\n"
     if not running:
         return header + "_No runs in flight._\n\n"
@@ -338,22 +546,11 @@ def _render_in_flight_section(running: list[dict[str, Any]]) -> str:
         "| run_id | component | ticker | quarter | started_at |",
         "|---|---|---|---|---|",
     ]
-    for r in running:
-        lines.append(
-            "| "
-            + " | ".join([
-                _short_id(r.get("run_id")),
-                _fmt(r.get("component")),
-                _fmt(r.get("ticker")),
-                _fmt(r.get("quarter_label")),
-                _fmt(r.get("started_at")),
-            ])
-            + " |"
-        )
+    lines.extend(render_row(r) for r in running)
     return header + "\n".join(lines) + "\n\n"
 
 
-def _render_predictions_section(rows: list[dict[str, Any]]) -> str:
+def _render_predictions_section(rows: list[dict[str, Any]], render_row=_prediction_row) -> str:
     header = "## Recent Predictions (last 50)\n\n"
     if not rows:
         return header + "_No predictions yet._\n\n"
@@ -361,27 +558,11 @@ def _render_predictions_section(rows: list[dict[str, Any]]) -> str:
         "| date | ticker | quarter | direction | conf | magnitude | expected | status | run_id |",
         "|---|---|---|---|---|---|---|---|---|",
     ]
-    for r in rows:
-        s = r.get("summary", {}) or {}
-        lines.append(
-            "| "
-            + " | ".join([
-                _fmt_date(r.get("started_at")),
-                _fmt(r.get("ticker")),
-                _fmt(r.get("quarter_label")),
-                _fmt(s.get("direction")),
-                _fmt(s.get("confidence_score")),
-                _fmt(s.get("magnitude_bucket")),
-                _fmt(s.get("expected_move_range_pct")),
-                _fmt_status(r.get("status", "?")),
-                _short_id(r.get("run_id")),
-            ])
-            + " |"
-        )
+    lines.extend(render_row(r) for r in rows)
     return header + "\n".join(lines) + "\n\n"
 
 
-def _render_learners_section(rows: list[dict[str, Any]]) -> str:
+def _render_learners_section(rows: list[dict[str, Any]], render_row=_learner_row) -> str:
     header = "## Recent Learners (last 50)\n\n"
     if not rows:
         return header + "_No learner runs yet._\n\n"
@@ -389,31 +570,11 @@ def _render_learners_section(rows: list[dict[str, Any]]) -> str:
         "| date | ticker | quarter | direction_correct | actual_return | magnitude_error | primary_driver | status | run_id |",
         "|---|---|---|---|---|---|---|---|---|",
     ]
-    for r in rows:
-        s = r.get("summary", {}) or {}
-        ar = s.get("actual_daily_stock_pct")
-        actual_return = f"{ar:+.2f}%" if isinstance(ar, (int, float)) else _fmt(ar)
-        mep = s.get("magnitude_error_pct")
-        mag_err = f"{mep:.2f}pp" if isinstance(mep, (int, float)) else _fmt(mep)
-        lines.append(
-            "| "
-            + " | ".join([
-                _fmt_date(r.get("started_at")),
-                _fmt(r.get("ticker")),
-                _fmt(r.get("quarter_label")),
-                _fmt(s.get("direction_correct")),
-                actual_return,
-                mag_err,
-                _fmt(s.get("primary_driver_category")),
-                _fmt_status(r.get("status", "?")),
-                _short_id(r.get("run_id")),
-            ])
-            + " |"
-        )
+    lines.extend(render_row(r) for r in rows)
     return header + "\n".join(lines) + "\n\n"
 
 
-def _render_extractions_section(rows: list[dict[str, Any]]) -> str:
+def _render_extractions_section(rows: list[dict[str, Any]], render_row=_extraction_row) -> str:
     header = "## Recent Extractions (last 50)\n\n"
     if not rows:
         return header + "_No guidance extractions yet._\n\n"
@@ -421,23 +582,7 @@ def _render_extractions_section(rows: list[dict[str, Any]]) -> str:
         "| date | ticker | asset | source_id | items_extracted | items_written | enrichment | status | run_id |",
         "|---|---|---|---|---|---|---|---|---|",
     ]
-    for r in rows:
-        s = r.get("summary", {}) or {}
-        lines.append(
-            "| "
-            + " | ".join([
-                _fmt_date(r.get("started_at")),
-                _fmt(r.get("ticker")),
-                _fmt(r.get("source_asset")),
-                _fmt(r.get("source_id")),
-                _fmt(s.get("items_extracted")),
-                _fmt(s.get("items_written")),
-                _fmt(s.get("enrichment_status")),
-                _fmt_status(r.get("status", "?")),
-                _short_id(r.get("run_id")),
-            ])
-            + " |"
-        )
+    lines.extend(render_row(r) for r in rows)
     return header + "\n".join(lines) + "\n\n"
 
 
@@ -452,29 +597,54 @@ def refresh_index(
     leaves a half-written index.
 
     Called automatically by :func:`open_run` and :func:`close_run` so the
-    "In Flight" section is always real-time.
+    "In Flight" section is always real-time. Reads the incremental view, and
+    table rows whose ledger row is unchanged since the previous refresh in
+    this process are reused rather than re-rendered.
     """
     src = ledger_path or LEDGER_PATH
     dst = index_path or INDEX_PATH
-    state = current_state(ledger_path=src)
-
-    # Partition state — "In Flight" is a disjoint view from the per-component
-    # "Recent *" tables. A running row belongs ONLY in the In Flight section;
-    # it must not double-appear in the per-component list, or the user sees
-    # the same run_id in two places and the row-counts lie.
-    running = [r for r in state if r.get("status") == "running"]
-    predictions = [
-        r for r in state
-        if r.get("component") == "prediction" and r.get("status") != "running"
-    ][:50]
-    learners = [
-        r for r in state
-        if r.get("component") == "learning" and r.get("status") != "running"
-    ][:50]
-    extractions = [
-        r for r in state
-        if r.get("component") == "guidance" and r.get("status") != "running"
-    ][:50]
+    view = _view(src)
+    with view.lock:
+        view.refresh()
+        state = sorted(view.latest.values(), key=lambda r: (r.get("started_at") or ""), reverse=True)
+
+        # Partition state — "In Flight" is a disjoint view from the per-component
+        # "Recent *" tables. A running row belongs ONLY in the In Flight section;
+        # it must not double-appear in the per-component list, or the user sees
+        # the same run_id in two places and the row-counts lie.
+        running = [r for r in state if r.get("status") == "running"]
+        predictions = [
+            r for r in state
+            if r.get("component") == "prediction" and r.get("status") != "running"
+        ][:50]
+        learners = [
+            r for r in state
+            if r.get("component") == "learning" and r.get("status") != "running"
+        ][:50]
+        extractions = [
+            r for r in state
+            if r.get("component") == "guidance" and r.get("status") != "running"
+        ][:50]
+
+        # Only rows whose ledger row changed since the last refresh are
+        # re-rendered; the rest reuse the line cached against the same row.
+        previous, view.lines = view.lines, {}
+
+        def cached(section, render_row):
+            def render(r: dict[str, Any]) -> str:
+                key = (section, r.get("run_id"))
+                hit = previous.get(key)
+                line = hit[1] if hit is not None and hit[0] is r else render_row(r)
+                view.lines[key] = (r, line)
+                return line
+            return render
+
+        sections = [
+            _render_in_flight_section(running, cached("in_flight", _in_flight_row)),
+            _render_predictions_section(predictions, cached("prediction", _prediction_row)),
+            _render_learners_section(learners, cached("learning", _learner_row)),
+            _render_extractions_section(extractions, cached("guidance", _extraction_row)),
+        ]
 
     now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     parts = [
@@ -482,10 +652,7 @@ def refresh_index(
         f"_Last regenerated: {now}_\n",
         "_Schema: run_ledger.v1. Authoritative ledger: "
         f"`{LEDGER_PATH}`._\n\n",
-        _render_in_flight_section(running),
-        _render_predictions_section(predictions),
-        _render_learners_section(learners),
-        _render_extractions_section(extractions),
+        *sections,
     ]
     content = "".join(parts)
 
@@ -0,0 +1,141 @@
+"""Composite fetch layer for inter_quarter_context: concurrent queries, price timeline cache, sidecar prefetch."""
+from __future__ import annotations
+import json
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scripts.earnings.builders import inter_quarter_context as iq
+
+pytestmark = pytest.mark.builders
+
+PREV = "2024-06-03T16:30:00-04:00"
+CUTOFF = "2024-06-20T16:30:00-04:00"
+
+
+def _price_row(day, ret):
+    return {
+        "date": day, "open": 100, "high": 101, "low": 99, "close": 100 + ret,
+        "daily_return": ret, "volume": 1000, "vwap": 100.1, "transactions": 10,
+        "price_timestamp": f"{day}T16:00:00-04:00", "spy_return": 0.25,
+        "sector_return": 0.5, "sector_name": "Tech", "industry_return": None, "industry_name": "Software",
+    }
+
+
+PRICES = [_price_row(f"2024-06-{d:02d}", d * 0.75 - 6) for d in range(3, 21) if d not in (8, 9, 15, 16)]
+NEWS = [{"created": "2024-06-05T10:00:00-04:00", "market_session": "in_market", "news_id": "bzNews_1",
+         "title": "Headline", "channels": '["News"]', "daily_stock": 1.5, "daily_macro": 0.5}]
+FILINGS = [{"created": "2024-06-10T17:00:00-04:00", "market_session": "post_market", "form_type": "8-K",
+            "accession": "ACC-1", "report_id": "r1", "items": '["Item 8.01: Other Events"]',
+            "exhibits": '{"EX-99.1": "u"}', "section_names": ["OtherEvents"]},
+           {"created": "2024-06-12T09:00:00-04:00", "market_session": "pre_market", "form_type": "10-Q",
+            "accession": "ACC-2", "report_id": "r2", "items": "[]", "exhibits": "{}", "section_names": []}]
+DIVIDENDS = [{"dividend_id": "d1", "declaration_date": "2024-06-08", "cash_amount": 0.5}]
+
+
+def _manager():
+    """Fake manager that honours the date/timestamp bounds and records calls."""
+    m = MagicMock()
+    m.calls = []
+    lock = threading.Lock()
+
+    def execute(query, params):
+        with lock:
+            m.calls.append((query, dict(params)))
+        if query == iq.QUERY_IQ_PRICES:
+            return [r for r in PRICES if params["prev_day"] <= r["date"] <= params["cutoff_day"]]
+        if query == iq.QUERY_IQ_NEWS:
+            return NEWS
+        if query == iq.QUERY_IQ_FILINGS:
+            return FILINGS
+        if query == iq.QUERY_IQ_DIVIDENDS:
+            return DIVIDENDS
+        if query == iq.QUERY_IQ_SPLITS:
+            return []
+        if query == iq.QUERY_RF_SECTIONS:
+            return [{"section_name": "OtherEvents", "content": f"body {params['accession']}"}]
+        if query in (iq.QUERY_RF_EXHIBITS, iq.QUERY_RF_FILING_TEXT, iq.QUERY_IQ_COMPANY_CONTEXT):
+            return []
+        raise AssertionError(f"unexpected query: {query[:80]}")
+
+    m.execute_cypher_query_all.side_effect = execute
+    return m
+
+
+def _session_helper():
+    h = MagicMock()
+    h.get_interval_start_time = lambda ts: iq._parse_dt_for_pit(ts)
+    h.get_interval_end_time = lambda ts, mins, respect_session_boundary=True: \
+        iq._parse_dt_for_pit(ts) + timedelta(minutes=mins)
+    h.get_start_time = lambda ts: iq._parse_dt_for_pit(ts)
+    h.get_end_time = lambda ts: iq._parse_dt_for_pit(ts) + timedelta(hours=4)
+    h.get_1d_impact_times = lambda ts: (iq._parse_dt_for_pit(ts) - timedelta(hours=1),
+                                        iq._parse_dt_for_pit(ts) + timedelta(hours=24))
+    return h
+
+
+def _build(tmp_path, mgr, prev=PREV, cutoff=CUTOFF, name="iq.json", **kw):
+    with patch.object(iq, "get_manager", return_value=mgr), \
+            patch("utils.market_session.MarketSessionClassifier", return_value=_session_helper()):
+        iq.build_inter_quarter_context("FAKE", prev, cutoff, out_path=str(tmp_path / name), **kw)
+    packet = json.loads((tmp_path / name).read_text())
+    packet.pop("assembled_at")
+    return packet
+
+
+def _price_windows(mgr):
+    return [(p["prev_day"], p["cutoff_day"]) for q, p in mgr.calls if q == iq.QUERY_IQ_PRICES]
+
+
+def test_concurrent_fetch_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.delenv("IQ_TIMELINE_CACHE_DIR", raising=False)
+    monkeypatch.setattr(iq, "_IQ_FETCH_WORKERS", 1)
+    sequential = _build(tmp_path, _manager(), name="seq.json")
+    monkeypatch.setattr(iq, "_IQ_FETCH_WORKERS", 5)
+    assert _build(tmp_path, _manager(), name="conc.json") == sequential
+
+
+def test_timeline_cache_extends_incrementally_and_matches_uncached(tmp_path, monkeypatch):
+    monkeypatch.delenv("IQ_TIMELINE_CACHE_DIR", raising=False)
+    uncached_narrow = _build(tmp_path, _manager(), cutoff="2024-06-12T16:30:00-04:00", name="a.json")
+    uncached_wide = _build(tmp_path, _manager(), name="b.json")
+
+    monkeypatch.setenv("IQ_TIMELINE_CACHE_DIR", str(tmp_path / "timeline"))
+    mgr = _manager()
+    assert _build(tmp_path, mgr, cutoff="2024-06-12T16:30:00-04:00", name="c.json") == uncached_narrow
+    assert _price_windows(mgr) == [("2024-06-03", "2024-06-12")]
+
+    mgr = _manager()
+    assert _build(tmp_path, mgr, name="d.json") == uncached_wide
+    assert _price_windows(mgr) == [("2024-06-13", "2024-06-20")]      # only the new days
+
+    mgr = _manager()
+    _build(tmp_path, mgr, prev="2024-06-05T16:30:00-04:00", cutoff="2024-06-18T16:30:00-04:00", name="e.json")
+    assert _price_windows(mgr) == []                                   # fully covered
+
+    cached = json.loads((tmp_path / "timeline" / "FAKE.json").read_text())
+    assert (cached["start"], cached["end"]) == ("2024-06-03", "2024-06-20")
+    assert cached["rows"] == PRICES
+
+
+def test_unsettled_days_are_fetched_live_and_not_cached(tmp_path):
+    mgr = _manager()
+    cache_dir = str(tmp_path / "timeline")
+    rows = iq._fetch_price_rows(mgr, "FAKE", "2024-06-03", "2024-06-20", cache_dir, today="2024-06-19")
+    assert rows == PRICES
+    assert _price_windows(mgr) == [("2024-06-03", "2024-06-16"), ("2024-06-17", "2024-06-20")]
+    cached = json.loads((tmp_path / "timeline" / "FAKE.json").read_text())
+    assert cached["end"] == "2024-06-16"
+
+
+def test_sidecar_content_prefetched_once_for_eligible_filings(tmp_path, monkeypatch):
+    monkeypatch.delenv("IQ_TIMELINE_CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    mgr = _manager()
+    packet = _build(tmp_path, mgr, related_filings_dir=str(tmp_path / "rf"))
+    fetched = [p["accession"] for q, p in mgr.calls if q == iq.QUERY_RF_SECTIONS]
+    assert fetched == ["ACC-1"]                                        # the 10-Q gets no sidecar
+    assert packet["_allowed_related_filing_paths"] == ["rf/ACC-1.md"]
+    assert "body ACC-1" in (tmp_path / "rf" / "ACC-1.md").read_text()
@@ -0,0 +1,242 @@
+"""Cube-vs-graph equivalence for scripts.earnings.builders.xbrl_cube on a fixture graph."""
+from __future__ import annotations
+import copy
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from scripts.earnings.builders import prior_financials as bpf
+from scripts.earnings.builders import xbrl_cube as xc
+
+pytestmark = pytest.mark.builders
+
+REV = "us-gaap:Revenues"
+NI = "us-gaap:NetIncomeLoss"
+OIL = "us-gaap:OperatingIncomeLoss"
+
+
+def _fact(concept, value, start, end, ctx, decimals="-6", members=()):
+    return {"concept": concept, "value": value, "decimals": decimals, "context_id": ctx,
+            "unit_ref": "usd", "period_start": start, "period_end": end, "members": list(members)}
+
+
+def _report(acc, period, form, created, status="COMPLETED", facts=(), statements=(), fp=(), fy=()):
+    return {"accession": acc, "ticker": "FAKE", "period": period, "form": form, "created": created,
+            "xbrl_status": status, "facts": list(facts), "statements": list(statements),
+            "fp": list(fp), "fy": list(fy)}
+
+
+FSC_INCOME = ('{"Revenues": [{"value": "900", "decimals": "-6", "unitRef": "usd", '
+              '"period": {"startDate": "2024-01-01", "endDate": "2024-03-31"}}, '
+              '{"value": "400", "segment": {"explicitMember": {"dimension": "srt:ProductOrServiceAxis", '
+              '"$t": "fake:CloudMember"}}, "period": {"startDate": "2024-01-01", "endDate": "2024-03-31"}}]}')
+
+REPORTS = [
+    _report("A-Q1", "2024-03-31", "10-Q", "2024-05-01T16:05:00-04:00",
+            facts=[_fact(REV, "1000", "2024-01-01", "2024-03-31", "c1"),
+                   _fact(REV, "1000.0", "2024-01-01", "2024-03-31", "c1", decimals="-3"),
+                   _fact(NI, "100", "2024-01-01", "2024-03-31", "c2"),
+                   _fact(REV, "400", "2024-01-01", "2024-03-31", "c3", members=[("fake:CloudMember", "Cloud")]),
+                   _fact(OIL, "50", "2024-01-01", "2024-03-31", "c4", members=[("fake:EmeaMember", "EMEA")]),
+                   _fact(NI, "7", None, "2024-03-31", "c5")],
+            statements=[("StatementsOfIncome", FSC_INCOME)], fp=["Q1"], fy=["2024"]),
+    _report("A-Q1A", "2024-03-31", "10-Q/A", "2024-06-10T09:00:00-04:00",
+            facts=[_fact(REV, "1010", "2024-01-01", "2024-03-31", "c1")], fp=["Q1"], fy=["2024"]),
+    _report("A-Q2", "2024-06-30", "10-Q", "2024-07-31T16:10:00-04:00",
+            facts=[_fact(REV, "1100", "2024-04-01", "2024-06-30", "d1"),
+                   _fact(REV, "2100", "2024-01-01", "2024-06-30", "d2")],
+            statements=[("StatementsOfCashFlows", '{"Revenues": []}')], fp=["Q2"], fy=["2024", "2024"]),
+    _report("A-Q3", "2024-09-30", "10-Q", "2024-10-30T16:00:00-04:00", status="PROCESSING",
+            statements=[("StatementsOfIncome", FSC_INCOME), ("BalanceSheets", "{}")]),
+    _report("A-8K", "2024-07-31", "8-K", "2024-07-31T16:05:00-04:00"),
+]
+
+
+class FakeGraph:
+    """Answers the prior_financials and cube-sync queries straight from REPORTS."""
+
+    def __init__(self, reports):
+        self.reports = reports
+        self.calls = []
+
+    def _by_acc(self, acc):
+        return [r for r in self.reports if r["accession"] == acc]
+
+    @staticmethod
+    def _pit(r, as_of):
+        return as_of is None or datetime.fromisoformat(r["created"]) <= datetime.fromisoformat(as_of)
+
+    def _filed(self, ticker, pred, as_of):
+        return [r for r in self.reports if r["ticker"] == ticker and r["form"] in xc.REPORT_FORMS
+                and pred(r) and self._pit(r, as_of)]
+
+    @staticmethod
+    def _order(rows, *keys):
+        for key in reversed(keys):
+            rows.sort(key=lambda row: row[key], reverse=True)
+        return rows
+
+    def execute_cypher_query_all(self, query, p):
+        self.calls.append((query, p))
+        if query == bpf._XBRL_FACTS_QUERY:
+            reps = self._filed(p["ticker"], lambda r: r["xbrl_status"] == "COMPLETED"
+                               and r["period"] < p["current_period"], p["as_of"])
+            periods = sorted({r["period"] for r in reps}, reverse=True)[:p["limit"]]
+            rows = [{"period": r["period"], "form": r["form"], "accession": r["accession"], "filed": r["created"],
+                     **{k: f[k] for k in ("concept", "value", "decimals", "context_id", "unit_ref",
+                                          "period_start", "period_end")}}
+                    for r in reps if r["period"] in periods for f in r["facts"]
+                    if f["concept"] in p["concept_list"] and not f["members"] and f["period_start"]]
+            rows.sort(key=lambda row: row["concept"])
+            return self._order(rows, "period", "filed")
+        if query == bpf._ALL_PERIODS_QUERY:
+            reps = self._filed(p["ticker"], lambda r: r["period"] < p["current_period"], p["as_of"])
+            return [{"period": x} for x in sorted({r["period"] for r in reps}, reverse=True)[:p["limit"]]]
+        if query == bpf._FSC_QUERY:
+            reps = self._filed(p["ticker"], lambda r: r["period"] in p["periods"], p["as_of"])
+            rows = [{"period": r["period"], "form": r["form"], "accession": r["accession"], "filed": r["created"],
+                     "statement_type": t, "fs_value": v} for r in reps for t, v in r["statements"]]
+            return self._order(rows, "period", "filed")
+        if query == bpf._DEI_FISCAL_QUERY:
+            reps = self._order(self._filed(p["ticker"], lambda r: r["period"] in p["periods"], p["as_of"]),
+                               "created")[:50]
+            rows = [{"period": r["period"], "form": r["form"], "accession": r["accession"], "filed": r["created"],
+                     "fiscal_period": fp, "fiscal_year": fy if fp is not None else None}
+                    for r in reps for fp in (r["fp"] or [None]) for fy in (r["fy"] or [None])]
+            return self._order(rows, "period", "filed")
+        if query == bpf._SEGMENT_QUERY:
+            rows = []
+            for r in self._by_acc(p["accession"]):
+                for f in r["facts"]:
+                    for qn, label in f["members"]:
+                        row = {"concept": f["concept"], "member_qname": qn, "member_label": label}
+                        if f["concept"] in p["concepts"] and row not in rows:
+                            rows.append(row)
+            return rows
+        if query == bpf._FSC_FOR_SEGMENTS_QUERY:
+            return [{"fs_value": v} for r in self._by_acc(p["accession"])
+                    for t, v in r["statements"] if t == "StatementsOfIncome"][:1]
+        if query == xc._CUBE_MANIFEST_QUERY:
+            return [{"accession": r["accession"], "period": r["period"], "form": r["form"],
+                     "filed": r["created"], "xbrl_status": r["xbrl_status"]}
+                    for r in self.reports if r["ticker"] == p["ticker"] and r["form"] in p["forms"]]
+        if query == xc._CUBE_FACTS_QUERY:
+            return [{"accession": acc, **{k: f[k] for k in ("concept", "value", "decimals", "context_id",
+                                                            "unit_ref", "period_start", "period_end")}}
+                    for acc in p["accessions"] for r in self._by_acc(acc) for f in r["facts"]
+                    if f["concept"] in p["concept_list"] and not f["members"] and f["period_start"]]
+        if query == xc._CUBE_STATEMENTS_QUERY:
+            return [{"accession": acc, "statement_type": t, "fs_value": v}
+                    for acc in p["accessions"] for r in self._by_acc(acc)
+                    for t, v in r["statements"] if t in p["statement_types"]]
+        if query == xc._CUBE_DEI_QUERY:
+            return [{"accession": acc, "fiscal_period": fp, "fiscal_year": fy if fp is not None else None}
+                    for acc in p["accessions"] for r in self._by_acc(acc)
+                    for fp in (r["fp"] or [None]) for fy in (r["fy"] or [None])]
+        if query == xc._CUBE_MEMBERS_QUERY:
+            rows = []
+            for acc in p["accessions"]:
+                for r in self._by_acc(acc):
+                    for f in r["facts"]:
+                        for qn, label in f["members"]:
+                            row = {"accession": acc, "concept": f["concept"], "member_qname": qn,
+                                   "member_label": label}
+                            if f["concept"] in p["concepts"] and row not in rows:
+                                rows.append(row)
+            return rows
+        if query == bpf._PERIOD_OF_REPORT_QUERY:
+            return []
+        raise AssertionError(f"unexpected query: {query[:80]}")
+
+
+@pytest.fixture
+def graph():
+    return FakeGraph(copy.deepcopy(REPORTS))
+
+
+@pytest.fixture
+def cube(tmp_path):
+    c = bpf._open_cube(str(tmp_path / "cube.sqlite"))
+    yield c
+    c.close()
+
+
+@pytest.mark.parametrize("current_period,as_of", [
+    ("2024-12-31", None),
+    ("2024-12-31", "2024-06-01T00:00:00-04:00"),     # before the 10-Q/A
+    ("2024-06-30", None),                            # Q2 excluded (period < current)
+])
+def test_cube_rows_match_graph(graph, cube, current_period, as_of):
+    cube.sync_ticker(graph, "FAKE")
+    router = bpf._cube_router(graph, cube)
+    calls = bpf._cube_verify_calls(graph, "FAKE", current_period, as_of)
+    assert {label for label, _, _ in calls} == {"xbrl_facts", "all_periods", "fsc", "dei_fiscal",
+                                               "segments", "fsc_for_segments"}
+    assert xc.verify(graph, router, calls) == []
+    for label, query, params in calls:                # ordered queries: same order too
+        if label in ("xbrl_facts", "all_periods", "fsc", "dei_fiscal"):
+            assert router.execute_cypher_query_all(query, params) == graph.execute_cypher_query_all(query, params)
+
+
+def test_builder_helpers_identical_on_cube(graph, cube):
+    cube.sync_ticker(graph, "FAKE")
+    router = bpf._cube_router(graph, cube)
+    periods = ["2024-09-30", "2024-06-30", "2024-03-31"]
+    assert bpf._extract_xbrl(router, "FAKE", "2024-12-31", None, []) == \
+        bpf._extract_xbrl(graph, "FAKE", "2024-12-31", None, [])
+    assert bpf._extract_fsc(router, "FAKE", periods, None, []) == bpf._extract_fsc(graph, "FAKE", periods, None, [])
+    assert bpf._build_segment_inventory(router, "A-Q1", REV, []) == \
+        bpf._build_segment_inventory(graph, "A-Q1", REV, [])
+    assert bpf._build_segment_inventory(router, "A-Q1", REV, [])["revenue"]["axes"]["srt:ProductOrServiceAxis"]
+
+
+def test_sync_is_incremental(graph, cube):
+    assert sorted(cube.sync_ticker(graph, "FAKE")) == ["A-Q1", "A-Q1A", "A-Q2", "A-Q3"]
+    graph.calls.clear()
+    assert cube.sync_ticker(graph, "FAKE") == []
+    assert [q for q, _ in graph.calls] == [xc._CUBE_MANIFEST_QUERY]      # nothing changed: one query
+
+    graph.reports[3]["xbrl_status"] = "COMPLETED"                       # XBRL worker finished Q3
+    graph.reports[3]["facts"] = [_fact(REV, "1200", "2024-07-01", "2024-09-30", "e1")]
+    graph.reports.append(_report("A-K", "2024-12-31", "10-K", "2025-02-20T16:00:00-05:00"))
+    graph.calls.clear()
+    assert sorted(cube.sync_ticker(graph, "FAKE")) == ["A-K", "A-Q3"]
+    fact_calls = [p for q, p in graph.calls if q == xc._CUBE_FACTS_QUERY]
+    assert [sorted(p["accessions"]) for p in fact_calls] == [["A-K", "A-Q3"]]
+    rows = cube.xbrl_facts("FAKE", "2025-03-31", None, bpf.ALL_CONCEPT_QNAMES, 10)
+    assert [r["value"] for r in rows if r["accession"] == "A-Q3"] == ["1200"]
+
+    graph.reports = [r for r in graph.reports if r["accession"] != "A-Q1A"]  # deleted from the graph
+    cube.sync_ticker(graph, "FAKE")
+    assert "A-Q1A" not in {r["accession"] for r in cube.fsc("FAKE", ["2024-03-31"], None)
+                           + cube.dei_fiscal("FAKE", ["2024-03-31"], None)}
+
+
+def test_concept_registry_change_invalidates_cube(graph, tmp_path):
+    path = str(tmp_path / "cube.sqlite")
+    c = bpf._open_cube(path)
+    c.sync_ticker(graph, "FAKE")
+    c.close()
+    c = xc.XbrlCube(path, bpf.ALL_CONCEPT_QNAMES + ["us-gaap:NewConcept"], [OIL])
+    assert c.xbrl_facts("FAKE", "2024-12-31", None, bpf.ALL_CONCEPT_QNAMES, 10) == []
+    assert len(c.sync_ticker(graph, "FAKE")) == 4
+    c.close()
+
+
+def test_cube_backed_manager_is_opt_in(graph, tmp_path, monkeypatch):
+    monkeypatch.delenv("PRIOR_FINANCIALS_CUBE_PATH", raising=False)
+    with bpf._cube_backed_manager(graph, "FAKE") as manager:
+        assert manager is graph
+
+    monkeypatch.setenv("PRIOR_FINANCIALS_CUBE_PATH", str(tmp_path / "cube.sqlite"))
+    opened = []
+    monkeypatch.setattr(bpf, "_open_cube", lambda path, _open=bpf._open_cube: opened.append(_open(path)) or opened[-1])
+    with bpf._cube_backed_manager(graph, "FAKE") as router:
+        graph.calls.clear()
+        assert bpf._extract_xbrl(router, "FAKE", "2024-12-31", None, [])
+        assert graph.calls == []                                            # served locally
+        router.execute_cypher_query_all(bpf._PERIOD_OF_REPORT_QUERY, {"ticker": "FAKE"})
+        assert [q for q, _ in graph.calls] == [bpf._PERIOD_OF_REPORT_QUERY]  # unrouted: passed through
+    with pytest.raises(sqlite3.ProgrammingError):                           # connection closed on exit
+        opened[0]._conn.execute("SELECT 1")
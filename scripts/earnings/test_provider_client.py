@@ -0,0 +1,215 @@
+"""Offline tests for provider_client.py (no network, no Redis, no yfinance)."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("requests")
+
+from av_client import make_false_empty_checker  # noqa: E402
+from provider_client import AV_FRESHNESS, ProviderClient  # noqa: E402
+
+EARNINGS = json.dumps({"symbol": "CCL", "quarterlyEarnings": [{"fiscalDateEnding": "2025-02-28"}],
+                       "annualEarnings": [{"fiscalDateEnding": "2024-11-30"}]})
+ERROR = json.dumps({"Error Message": "Invalid API call."})
+FALSE_EMPTY = json.dumps({"symbol": "CCL", "quarterlyEarnings": [], "annualEarnings": []})
+RATE_LIMITED = json.dumps({"Information": "Please consider spreading out your free API requests more sparingly."})
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.t += s
+
+
+class _Opener:
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.urls = []
+
+    def __call__(self, req, timeout=None):
+        self.urls.append(req.full_url)
+        return BytesIO(self.bodies.pop(0).encode("utf-8"))
+
+
+def _client(tmp_path, av_rate_per_min=6000.0, cache=True):
+    clock = _Clock()
+    client = ProviderClient(cache_dir=str(tmp_path) if cache else None, av_rate_per_min=av_rate_per_min,
+                            yahoo_rate_per_sec=1000.0, clock=clock, sleep=clock.sleep)
+    return client, clock
+
+
+def test_av_payload_cached_across_api_keys(tmp_path):
+    client, _ = _client(tmp_path)
+    opener = _Opener(EARNINGS)
+    first = client.av_json("key-a", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)
+    second = client.av_json("key-b", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)
+    assert first == second == json.loads(EARNINGS)
+    assert len(opener.urls) == 1
+    m = client.metrics()["av"]
+    assert (m["requests"], m["cache_hits"], m["cache_misses"], m["hit_rate"]) == (1, 1, 1, 0.5)
+
+
+def test_av_errors_are_not_cached(tmp_path):
+    client, _ = _client(tmp_path)
+    opener = _Opener(ERROR, EARNINGS)
+    assert client.av_json("k", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener) is None
+    assert client.av_json("k", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)["symbol"] == "CCL"
+    assert len(opener.urls) == 2
+
+
+def test_av_stale_entry_is_refetched(tmp_path):
+    client, _ = _client(tmp_path)
+    opener = _Opener(EARNINGS, EARNINGS)
+    client.av_raw("k", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)
+    old = os.path.getmtime(next(p for p in Path(tmp_path, "refs").rglob("*") if p.is_file()))
+    for ref in Path(tmp_path, "refs").rglob("*"):
+        if ref.is_file():
+            os.utime(ref, (old - AV_FRESHNESS["EARNINGS"] - 60,) * 2)
+    client.av_raw("k", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)
+    assert len(opener.urls) == 2
+
+
+def test_av_waits_only_when_quota_is_spent(tmp_path):
+    client, clock = _client(tmp_path, av_rate_per_min=60.0, cache=False)
+    opener = _Opener(EARNINGS, EARNINGS, EARNINGS)
+    for _ in range(3):
+        client.av_raw("k", "EARNINGS", {"symbol": "CCL"}, max_retries=0, _urlopen=opener)
+    assert clock.slept == [pytest.approx(1.0), pytest.approx(1.0)]     # 1-token burst, then 1/s
+    assert client.metrics()["av"]["quota_wait_s"] == pytest.approx(2.0)
+    assert client.metrics()["av"]["hit_rate"] is None
+
+
+def test_av_false_empty_from_last_attempt_is_not_cached(tmp_path):
+    client, _ = _client(tmp_path)
+    opener = _Opener(FALSE_EMPTY, FALSE_EMPTY, EARNINGS)
+    checker = make_false_empty_checker("EARNINGS", "CCL")
+    kwargs = dict(max_retries=1, retry_spacing=0, should_retry_response=checker, _urlopen=opener)
+    assert client.av_json("k", "EARNINGS", {"symbol": "CCL"}, **kwargs)["quarterlyEarnings"] == []
+    assert client.av_json("k", "EARNINGS", {"symbol": "CCL"}, **kwargs) == json.loads(EARNINGS)
+    assert len(opener.urls) == 3
+    assert client.av_json("k", "EARNINGS", {"symbol": "CCL"}, **kwargs) == json.loads(EARNINGS)   # now cached
+    assert len(opener.urls) == 3
+
+
+def test_av_retries_each_take_a_token(tmp_path):
+    client, clock = _client(tmp_path, av_rate_per_min=60.0, cache=False)
+    opener = _Opener(RATE_LIMITED, RATE_LIMITED, EARNINGS)
+    raw = client.av_raw("k", "EARNINGS", {"symbol": "CCL"}, max_retries=2, retry_spacing=0, _urlopen=opener)
+    assert json.loads(raw)["symbol"] == "CCL"
+    assert client.metrics()["av"]["requests"] == 3
+    assert clock.slept == [pytest.approx(1.0), pytest.approx(1.0)]
+
+
+class _FakeYahoo:
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def info(self):
+        self.calls.append("info")
+        return {"lastFiscalYearEnd": 1727654400}
+
+    @property
+    def earnings_estimate(self):
+        self.calls.append("earnings_estimate")
+        return {}
+
+    def get_earnings_dates(self, limit=12):
+        self.calls.append(("get_earnings_dates", limit))
+        return [f"row{i}" for i in range(limit)]
+
+    @property
+    def fast_info(self):
+        self.calls.append("fast_info")
+        return {"last_price": 1.0}
+
+
+def _yahoo(client, fake, symbol="AAPL"):
+    t = client.yahoo_ticker(symbol)
+    t._real = fake
+    return t
+
+
+def test_yahoo_attributes_and_methods_cached(tmp_path):
+    client, _ = _client(tmp_path)
+    fake = _FakeYahoo()
+    assert _yahoo(client, fake).info["lastFiscalYearEnd"] == 1727654400
+    assert _yahoo(client, fake).info["lastFiscalYearEnd"] == 1727654400
+    assert _yahoo(client, fake).get_earnings_dates(limit=3) == ["row0", "row1", "row2"]
+    assert _yahoo(client, fake).get_earnings_dates(limit=3) == ["row0", "row1", "row2"]
+    assert _yahoo(client, fake).get_earnings_dates(limit=2) == ["row0", "row1"]
+    assert fake.calls == ["info", ("get_earnings_dates", 3), ("get_earnings_dates", 2)]
+    assert client.metrics()["yahoo"]["cache_hits"] == 2
+
+
+def test_yahoo_empty_and_uncached_names_pass_through(tmp_path):
+    client, _ = _client(tmp_path)
+    fake = _FakeYahoo()
+    _yahoo(client, fake).earnings_estimate
+    _yahoo(client, fake).earnings_estimate
+    _yahoo(client, fake).fast_info
+    _yahoo(client, fake).fast_info
+    assert fake.calls == ["earnings_estimate"] * 2 + ["fast_info"] * 2
+    assert client.metrics()["yahoo"]["requests"] == 2                 # fast_info is not metered
+
+
+def test_yahoo_frames_round_trip_as_json(tmp_path):
+    pd = pytest.importorskip("pandas")
+    client, _ = _client(tmp_path)
+    dates = pd.DatetimeIndex(["2025-01-30 16:00", "2024-10-31 16:00"], name="Earnings Date").tz_localize("America/New_York")
+    earnings = pd.DataFrame({"EPS Estimate": [2.35, None], "Reported EPS": [2.40, 1.64],
+                             "Surprise(%)": [2.13, 0.61]}, index=dates)
+    statement = pd.DataFrame({pd.Timestamp("2024-12-31"): [124300.0, 36330.0],
+                              pd.Timestamp("2024-09-30"): [94930.0, 14736.0]}, index=["Total Revenue", "Net Income"])
+    calendar = {"Earnings Date": [pd.Timestamp("2025-05-01").date()], "Earnings Average": 1.62}
+
+    class _Frames:
+        calls = 0
+
+        def get_earnings_dates(self, limit=12):
+            self.calls += 1
+            return earnings
+
+        @property
+        def quarterly_income_stmt(self):
+            self.calls += 1
+            return statement
+
+        @property
+        def calendar(self):
+            self.calls += 1
+            return calendar
+
+        @property
+        def info(self):
+            self.calls += 1
+            return {"handle": object()}                  # not JSON: returned, never cached
+
+    fake = _Frames()
+    for _ in range(2):
+        pd.testing.assert_frame_equal(_yahoo(client, fake).get_earnings_dates(limit=4), earnings)
+        pd.testing.assert_frame_equal(_yahoo(client, fake).quarterly_income_stmt, statement)
+        assert _yahoo(client, fake).calendar == calendar
+        assert "handle" in _yahoo(client, fake).info
+    assert fake.calls == 5
+    blobs = [p for p in Path(tmp_path, "blobs").rglob("*.gz")]
+    assert len(blobs) == 3
+    import gzip
+    for blob in blobs:
+        json.loads(gzip.decompress(blob.read_bytes()))     # plain JSON on disk
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import sys
 import threading
@@ -499,3 +500,154 @@ def test_22_all_enrichment_status_fixtures_use_valid_enum_values():
         f"Invalid enrichment_status fixtures in test_run_ledger.py: {invalid}. "
         f"Valid values: {valid}. See extraction_worker.py::ENRICHMENT_STATUSES."
     )
+
+
+# ── Incremental engine: tail reads, snapshots, offset index ──────────────
+
+def _fresh_process_view(path):
+    """Forget this process's cached view, as a newly started process would."""
+    import run_ledger
+    run_ledger._VIEWS.pop(str(path.resolve()), None)
+
+
+def test_24_reads_parse_only_the_appended_tail(tmp_path, monkeypatch):
+    import run_ledger
+    from run_ledger import _append_row, current_state
+    path = tmp_path / "ledger.jsonl"
+    for i in range(10):
+        _append_row(path, {"run_id": f"r{i}", "status": "running", "started_at": f"2026-01-01T00:00:{i:02d}Z"})
+    assert len(current_state(ledger_path=path)) == 10
+
+    parsed = []
+    real_apply = run_ledger._LedgerView._apply
+    monkeypatch.setattr(run_ledger._LedgerView, "_apply",
+                        lambda self, line, pos: (parsed.append(pos), real_apply(self, line, pos)))
+    _append_row(path, {"run_id": "r3", "status": "failed", "started_at": "2026-01-01T00:00:03Z"})
+    with open(path, "a") as f:
+        f.write('{"run_id": "half')                     # a writer mid-line is not consumed yet
+    state = {r["run_id"]: r for r in current_state(ledger_path=path)}
+    assert state["r3"]["status"] == "failed"
+    assert len(parsed) == 1
+
+
+def test_25_rewritten_ledger_is_detected_and_rebuilt(tmp_path):
+    from run_ledger import _append_row, current_state
+    path = tmp_path / "ledger.jsonl"
+    _append_row(path, {"run_id": "old", "status": "running", "started_at": "2026-01-01T00:00:00Z"})
+    assert [r["run_id"] for r in current_state(ledger_path=path)] == ["old"]
+    path.write_text(json.dumps({"run_id": "new", "status": "succeeded", "started_at": "2026-01-02T00:00:00Z"})
+                    + "\n" + json.dumps({"run_id": "new2", "status": "running"}) + "\n")
+    assert {r["run_id"] for r in current_state(ledger_path=path)} == {"new", "new2"}
+
+
+def test_26_snapshot_plus_tail_matches_full_collapse(tmp_path, monkeypatch):
+    import run_ledger
+    from run_ledger import _append_row, _read_all_rows, current_state
+    monkeypatch.setattr(run_ledger, "SNAPSHOT_EVERY_ROWS", 20)
+    path = tmp_path / "ledger.jsonl"
+    for i in range(50):
+        _append_row(path, {"run_id": f"r{i % 15}", "status": "running" if i < 15 else "succeeded",
+                           "started_at": f"2026-01-01T00:00:{i % 15:02d}Z", "n": i})
+        current_state(ledger_path=path)
+    snap = json.loads((tmp_path / "ledger.jsonl.snapshot.json").read_text())
+    assert 0 < snap["offset"] < path.stat().st_size
+
+    _fresh_process_view(path)
+    expected = {}
+    for r in _read_all_rows(path):
+        expected[r["run_id"]] = r
+    got = {r["run_id"]: r for r in current_state(ledger_path=path)}
+    assert got == expected
+    assert run_ledger._view(path).opening_row("r7")["n"] == 7
+
+    (tmp_path / "ledger.jsonl.snapshot.json").write_text('{"version": 1, "offset": 999999}')
+    _fresh_process_view(path)
+    assert {r["run_id"]: r for r in current_state(ledger_path=path)} == expected
+
+
+def test_27_close_run_uses_the_indexed_opening_row(tmp_path):
+    from run_ledger import open_run, close_run, current_state
+    ledger = tmp_path / "ledger.jsonl"
+    index = tmp_path / "Run Index.md"
+    rid = open_run("prediction", ticker="burl", quarter_label="Q3_FY2025",
+                   ledger_path=ledger, index_path=index)
+    for _ in range(5):
+        open_run("learning", ticker="X", ledger_path=ledger, index_path=index)
+    _fresh_process_view(ledger)                        # closing process never saw the open
+    close_run(rid, "succeeded", ledger_path=ledger, index_path=index)
+    row = next(r for r in current_state(ledger_path=ledger) if r["run_id"] == rid)
+    assert (row["ticker"], row["quarter_label"], row["component"]) == ("BURL", "Q3_FY2025", "prediction")
+    assert row["elapsed_seconds"] is not None
+
+
+def test_28_index_rerenders_only_changed_rows(tmp_path, monkeypatch):
+    import run_ledger
+    from run_ledger import open_run, close_run, refresh_index
+    ledger = tmp_path / "ledger.jsonl"
+    index = tmp_path / "Run Index.md"
+    rids = [open_run("prediction", ticker=f"T{i}", ledger_path=ledger, index_path=index) for i in range(3)]
+    for rid in rids:
+        close_run(rid, "succeeded", summary={"direction": "long"}, ledger_path=ledger, index_path=index)
+    before = index.read_text().split("\n", 2)[2]
+
+    rendered = []
+    real = run_ledger._prediction_row
+    monkeypatch.setattr(run_ledger, "_prediction_row",
+                        lambda r: (rendered.append(r["run_id"]), real(r))[1])
+    close_run(rids[1], "failed", ledger_path=ledger, index_path=index)
+    assert rendered == [rids[1]]
+    refresh_index(ledger_path=ledger, index_path=index)
+    assert rendered == [rids[1]]
+    after = index.read_text().split("\n", 2)[2]
+    changed = [line for line in after.splitlines() if line not in before.splitlines()]
+    assert len(changed) == 1 and f"❌ failed | {rids[1][:8]}" in changed[0]
+
+
+# ── Concurrency harness: many writer processes on one ledger ─────────────
+
+def _stress_writer(ledger, index, runs, snapshot_every):
+    import run_ledger
+    run_ledger.SNAPSHOT_EVERY_ROWS = snapshot_every
+    for i in range(runs):
+        rid = run_ledger.open_run("guidance", ticker="T", source_id=f"{os.getpid()}-{i}",
+                                  ledger_path=ledger, index_path=index)
+        run_ledger.close_run(rid, "succeeded", summary={"items_extracted": i},
+                             ledger_path=ledger, index_path=index)
+
+
+def test_29_many_writer_processes_lose_no_transitions(tmp_path):
+    """RUN_LEDGER_STRESS_WRITERS / RUN_LEDGER_STRESS_RUNS scale this up for a
+    manual throughput run (RUN_LEDGER_MIN_TPS sets the floor); the defaults
+    keep it quick in CI."""
+    import multiprocessing
+    import time
+    from run_ledger import _read_all_rows, current_state, refresh_index
+
+    writers = int(os.environ.get("RUN_LEDGER_STRESS_WRITERS", "8"))
+    runs = int(os.environ.get("RUN_LEDGER_STRESS_RUNS", "15"))
+    ledger = tmp_path / "ledger.jsonl"
+    index = tmp_path / "Run Index.md"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_stress_writer, args=(ledger, index, runs, 25)) for _ in range(writers)]
+    started = time.monotonic()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(120)
+    elapsed = time.monotonic() - started
+    assert all(p.exitcode == 0 for p in procs)
+
+    transitions = 2 * writers * runs
+    rows = _read_all_rows(ledger)
+    assert len(rows) == transitions
+    assert len({r["source_id"] for r in rows}) == writers * runs
+    _fresh_process_view(ledger)
+    state = current_state(ledger_path=ledger)
+    assert len(state) == writers * runs
+    assert {r["status"] for r in state} == {"succeeded"}
+    assert all(r["elapsed_seconds"] is not None for r in state)
+    refresh_index(ledger_path=ledger, index_path=index)
+    assert "_No runs in flight._" in index.read_text()
+    print(f"\n{transitions} transitions from {writers} processes in {elapsed:.2f}s "
+          f"({transitions / elapsed:.0f}/s)")
+    assert transitions / elapsed >= float(os.environ.get("RUN_LEDGER_MIN_TPS", "5"))
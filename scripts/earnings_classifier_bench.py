@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for earningsClassifier's batch mode.
+
+Classifies the same corpus three ways and checks that they agree:
+
+  * scalar - EarningsClassifier.classify, one item at a time
+  * batch  - BatchEarningsClassifier.classify_batch in this process
+  * pool   - classify_batch spread over --workers processes
+
+and times merging the LLM answers back into the results: the per-answer scan
+over all results that EarningsClassificationService used before, against the
+positional merge (--merge-n caps the quadratic one).
+
+The corpus is the titles of earningsClassifier/final_classifier_200_results.csv
+with synthetic bodies, or --jsonl with one {"id", "title", "body"} per line.
+
+Usage:
+    python scripts/earnings_classifier_bench.py
+    python scripts/earnings_classifier_bench.py --n 1000000 --workers 8
+    python scripts/earnings_classifier_bench.py --jsonl news_dump.jsonl --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "earningsClassifier"))
+
+from earnings_classifier_batch import BatchEarningsClassifier  # noqa: E402
+from earnings_classifier_final import EarningsClassifier  # noqa: E402
+
+FILLER = ("the company said on monday that it would expand operations in europe while analysts "
+          "remain cautious about demand and shares traded higher in early session after the "
+          "announcement investors watched closely as management outlined plans for growth").split()
+SIGNAL = ["revenue", "quarter", "beat", "estimates", "guidance", "$1.2B", "fiscal", "margin",
+          "acquisition", "fda", "approval", "launch", "product", "stock", "ceo", "eps"]
+
+
+def synthetic_news(n, seed=7):
+    """n news dicts: 200-sample titles with bodies of filler text and a few concept words."""
+    with open(os.path.join(ROOT, "earningsClassifier", "final_classifier_200_results.csv")) as fh:
+        titles = [row["title"] for row in csv.DictReader(fh)]
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        words = [rng.choice(SIGNAL) if rng.random() < 0.05 else rng.choice(FILLER) for _ in range(60)]
+        items.append({"id": f"bench_{i}", "title": rng.choice(titles), "body": " ".join(words)})
+    return items
+
+
+def load_jsonl(path, n):
+    items = []
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                items.append(json.loads(line))
+                if n and len(items) >= n:
+                    break
+    return items
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - started
+
+
+def nested_merge(results, llm_needed, llm_results):
+    """The merge EarningsClassificationService.classify_batch used to do."""
+    for item, llm_result in zip(llm_needed, llm_results):
+        for i, r in enumerate(results):
+            if r["news_id"] == item.get("id"):
+                results[i].update(llm_result)
+                break
+
+
+def run(args):
+    items = load_jsonl(args.jsonl, args.n) if args.jsonl else synthetic_news(args.n, args.seed)
+    scalar = EarningsClassifier()
+    batch = BatchEarningsClassifier(EarningsClassifier())
+    report = {"items": len(items), "workers": args.workers}
+
+    expected, secs = _timed(lambda: [scalar.classify(item) for item in items])
+    report["scalar"] = {"secs": round(secs, 3), "items_per_sec": round(len(items) / secs)}
+    runs = [("batch", 0)] + ([("pool", args.workers)] if args.workers > 1 else [])
+    for name, workers in runs:
+        got, secs = _timed(lambda: batch.classify_batch(items, workers=workers, chunk_size=args.chunk_size))
+        report[name] = {"secs": round(secs, 3), "items_per_sec": round(len(items) / secs),
+                        "speedup": round(report["scalar"]["secs"] / secs, 2), "parity": got == expected}
+
+    needs = batch.needs_llm(expected)
+    report["needs_llm"] = len(needs)
+    answer = {"is_earnings": False, "confidence": 0.99, "reason": "bench"}
+    m = min(args.merge_n, len(items))
+    sub = [i for i in needs if i < m]
+    results = [{"news_id": item.get("id"), **r.to_dict()} for item, r in zip(items[:m], expected[:m])]
+    _, nested = _timed(lambda: nested_merge(results, [items[i] for i in sub], [answer] * len(sub)))
+    results = [{"news_id": item.get("id"), **r.to_dict()} for item, r in zip(items[:m], expected[:m])]
+    _, positional = _timed(lambda: [results[i].update(answer) for i in sub])
+    report["llm_merge"] = {"items": m, "merged": len(sub), "nested_secs": round(nested, 4),
+                           "positional_secs": round(positional, 4)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100000, help="items (synthetic corpus, or cap for --jsonl)")
+    parser.add_argument("--jsonl", help="news dump, one {id, title, body} object per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--merge-n", type=int, default=20000, help="items used for the LLM merge timing")
+    parser.add_argument("--seed", type=int, default=7)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Bulk event-return maintenance on the columnar store (eventReturns/return_store.py).
+
+Replaces the per-relationship loops in fix_null_returns_*.py / fix_missing_sector_returns.py:
+the store is seeded from Neo4j once (one paged query per date range), nulls are found and
+re-priced in bulk (each distinct instrument/timestamp fetched once), and the results are
+written back with one UNWIND per batch.
+
+Usage:
+    python scripts/event_return_store.py seed   --start 2024-01-01 --end 2025-07-01
+    python scripts/event_return_store.py nulls  [--start ...] [--end ...]
+    python scripts/event_return_store.py repair [--start ...] [--end ...] [--workers 16] [--sync] [--dry-run]
+    python scripts/event_return_store.py sync   [--start ...] [--end ...] [--dry-run]
+    python scripts/event_return_store.py compact
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import feature_flags
+from eventReturns import return_store as rs
+from utils.log_config import setup_logging
+
+log_file = setup_logging(name="event_return_store")
+logger = logging.getLogger(__name__)
+
+SEED_QUERY = """
+MATCH (e)-[r:INFLUENCES|PRIMARY_FILER]->(c:Company)
+WHERE (e:News OR e:Report OR e:Transcript) AND e.created >= $start AND e.created < $end
+RETURN CASE WHEN e:News THEN 'news' WHEN e:Report THEN 'reports' ELSE 'transcripts' END AS source,
+       e.id AS event_id, e.created AS created, c.ticker AS symbol,
+       head([(e)-[rs:INFLUENCES]->(s:Sector) WHERE rs.symbol = c.ticker | s.etf]) AS sector_etf,
+       head([(e)-[ri:INFLUENCES]->(i:Industry) WHERE ri.symbol = c.ticker | i.etf]) AS industry_etf,
+       properties(r) AS props
+"""
+
+
+def _polygon():
+    from eventReturns.polygonClass import Polygon
+    from eventtrader.keys import POLYGON_API_KEY
+    return Polygon(api_key=POLYGON_API_KEY, polygon_subscription_delay=1020)
+
+
+def _days(start: str, end: str, step: int):
+    d, stop = date.fromisoformat(start), date.fromisoformat(end)
+    while d < stop:
+        nxt = min(d + timedelta(days=step), stop)
+        yield d.isoformat(), nxt.isoformat()
+        d = nxt
+
+
+def seed(store: rs.ReturnStore, manager, start: str, end: str, step_days: int = 7) -> int:
+    """Import relationship returns from Neo4j, with leg instruments and windows (no prices)."""
+    polygon = _polygon()
+    windows = {}                                       # (created, horizon) -> (start, end)
+
+    def window(created, horizon):
+        key = (created, horizon)
+        if key not in windows:
+            pairs = polygon.event_time_pairs('X', 'X', 'X', created, horizon,
+                                             [60] if horizon == 'hourly' else None)
+            windows[key] = (pairs[0][2], pairs[0][3])
+        return windows[key]
+
+    total = 0
+    for lo, hi in _days(start, end, step_days):
+        t0 = time.time()
+        records = manager.execute_cypher_query_all(SEED_QUERY, {'start': lo, 'end': hi})
+        rows, now = [], time.time()
+        for rec in records:
+            rec = dict(rec)
+            if not rec.get('symbol') or not rec.get('created'):
+                continue
+            props = rec.get('props') or {}
+            instruments = {'stock': rec['symbol'], 'sector': rec.get('sector_etf'),
+                           'industry': rec.get('industry_etf'), 'macro': 'SPY'}
+            for horizon in rs.HORIZONS:
+                try:
+                    w = window(rec['created'], horizon)
+                except Exception as e:
+                    logger.warning(f"No {horizon} window for {rec['event_id']}: {e}")
+                    w = (None, None)
+                legs = {i: (instruments[role], w[0], w[1], None, None)
+                        for i, role in enumerate(rs.ROLES) if instruments[role]}
+                returns = {role: props.get(f"{horizon}_{role}") for role in rs.ROLES}
+                rows.extend(rs.leg_rows(rec['source'], rec['event_id'], rec['created'], rec['symbol'],
+                                        horizon, returns, legs, rs.TIER_GRAPH, written_at=0.0))
+        if rows:
+            df = rs.to_frame(rows).drop_duplicates(rs.KEY_COLUMNS)
+            store.write(df)
+            total += len(df)
+        logger.info(f"seed {lo}..{hi}: {len(rows)} rows in {time.time() - t0:.1f}s")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk event-return store maintenance')
+    parser.add_argument('command', choices=['seed', 'nulls', 'repair', 'sync', 'compact'])
+    parser.add_argument('--store', default=os.getenv('RETURN_STORE_DIR', feature_flags.RETURN_STORE_DIR))
+    parser.add_argument('--start', help='First event date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last event date (YYYY-MM-DD; exclusive for seed)')
+    parser.add_argument('--source', action='append', choices=list(rs.NEO4J_LABELS),
+                        help='Restrict to a source (repeatable)')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent price fetches for repair')
+    parser.add_argument('--batch-size', type=int, default=2000, help='UNWIND rows per Neo4j transaction')
+    parser.add_argument('--sync', action='store_true', help='repair: sync repaired rows to Neo4j')
+    parser.add_argument('--dry-run', action='store_true', help='Do not write to Neo4j')
+    args = parser.parse_args()
+
+    store = rs.ReturnStore(args.store)
+    t0 = time.time()
+
+    if args.command == 'compact':
+        logger.info(f"Compacted {store.compact(args.start, args.end)} partitions")
+        return
+
+    if args.command == 'seed':
+        if not (args.start and args.end):
+            parser.error('seed needs --start and --end')
+        from neograph.Neo4jConnection import get_manager
+        n = seed(store, get_manager(), args.start, args.end)
+        logger.info(f"Seeded {n} rows in {time.time() - t0:.1f}s")
+        return
+
+    df = store.read(args.start, args.end, sources=args.source)
+    nulls = rs.find_nulls(df)
+    logger.info(f"{len(df)} rows, {len(nulls)} null returns "
+                f"({nulls.groupby(['horizon', 'role']).size().to_dict() if len(nulls) else {}})")
+    if args.command == 'nulls':
+        return
+
+    if args.command == 'repair':
+        polygon = _polygon()
+        fixed = rs.repair(nulls, polygon.get_last_trade, max_workers=args.workers)
+        store.write(fixed)
+        still = int(fixed['return_pct'].isna().sum()) if len(fixed) else 0
+        logger.info(f"Repaired {len(fixed) - still}/{len(fixed)} rows in {time.time() - t0:.1f}s")
+        if not args.sync:
+            return
+        df = fixed
+
+    from neograph.Neo4jConnection import get_manager
+    n = rs.sync_to_neo4j(get_manager(), df, batch_size=args.batch_size, dry_run=args.dry_run)
+    logger.info(f"{'Would sync' if args.dry_run else 'Synced'} {n} relationships in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
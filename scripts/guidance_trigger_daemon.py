@@ -6,10 +6,17 @@ Reads trade_ready:entries from Redis, finds unprocessed data assets in Neo4j,
 and pushes extraction jobs to extract:pipeline. Runs as an always-on K8s Deployment.
 
 Handles both historical backfill (first sweep after ticker enters TradeReady)
-and real-time detection (subsequent sweeps catch newly ingested assets).
+and real-time detection. Real-time detection is event-driven: the Neo4j writer
+(PubSubMixin) and the XBRL worker publish on `assets:ingested`, and the daemon
+re-checks only the tickers named in those notifications. The full sweep over all
+active tickers remains as a low-frequency safety net (SAFETY_SWEEP_INTERVAL).
+
+Eligible items are staged in a per-route Redis sorted set (PRIORITY_QUEUE:{route})
+scored by earnings-date proximity and drained into the route's queue by a Lua
+script that does the lease check + LPUSH for a whole batch in one round-trip.
 
 Usage:
-  python3 scripts/guidance_trigger_daemon.py              # Run daemon (60s loop)
+  python3 scripts/guidance_trigger_daemon.py              # Run daemon (event-driven + safety sweep)
   python3 scripts/guidance_trigger_daemon.py --list        # Dry run: show what would be queued
   python3 scripts/guidance_trigger_daemon.py --once        # Single sweep, then exit
   python3 scripts/guidance_trigger_daemon.py --ticker LULU # Scope to specific ticker(s)
@@ -44,11 +51,18 @@ log = logging.getLogger("guidance_trigger")
 
 # ── Configuration ──
 
-POLL_INTERVAL = 60           # seconds between sweeps
+POLL_INTERVAL = 60           # seconds between trade_ready:entries refreshes
+SAFETY_SWEEP_INTERVAL = int(os.environ.get("SAFETY_SWEEP_INTERVAL", "900"))  # full sweep backstop
+NOTIFY_DEBOUNCE = 2.0        # seconds to coalesce a burst of ingest notifications
 LEASE_TTL = 14400            # 4-hour enqueue lease (covers backfill burst + extraction)
 ACTIVE_WINDOW_DAYS = int(os.environ.get("ACTIVE_WINDOW_DAYS", "1"))  # 1=upcoming only, 45=backfill
 QUEUE_NAME = "extract:pipeline"
 EXTRACTION_TYPE = "guidance"
+PRIORITY_QUEUE = "guidance_trigger:pending"       # ZSET per route: payload → earnings-proximity score
+DETECTED_HASH = "guidance_trigger:detected"       # HASH per route: payload → {"t": detected_at, "status": ...}
+LEASE_PREFIX = "guidance_lease:"
+DRAIN_BATCH = 200
+INGEST_CHANNEL = "assets:ingested"                # RedisKeys.ASSET_INGESTED_CHANNEL
 
 ASSET_CONFIGS = {
     "transcript": {"label": "Transcript", "alias": "t", "extra_where": None,
@@ -172,7 +186,7 @@ def find_eligible(mgr, asset_name, asset_cfg, tickers, status_prop):
 
 def enqueue_with_lease(r, source_id, asset, ticker, status, queue, dry_run=False):
     """Atomic lease-based dedup + LPUSH. Returns True if enqueued."""
-    lease_key = f"guidance_lease:{asset}:{source_id}"
+    lease_key = f"{LEASE_PREFIX}{asset}:{source_id}"
 
     if status is None:  # NULL in Neo4j → None in Python
         # Normal path: acquire lease, then push
@@ -192,15 +206,135 @@ def enqueue_with_lease(r, source_id, asset, ticker, status, queue, dry_run=False
         if not acquired:
             return False  # Another pod beat us
 
-    payload = json.dumps({
+    r.lpush(queue, build_payload(asset, ticker, source_id))
+    return True
+
+
+# KEYS: [1] priority zset, [2] detected hash, [3] target list
+# ARGV: [1] batch size, [2] lease ttl, [3] lease prefix
+# Both status paths of enqueue_with_lease reduce to "enqueue iff SET NX on the
+# lease succeeds", so one script covers new and stale-recovery items alike.
+_DRAIN_LUA = """
+local members = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+local out = {}
+for _, m in ipairs(members) do
+  local item = cjson.decode(m)
+  local lease = ARGV[3] .. item['asset'] .. ':' .. item['source_id']
+  local ok = redis.call('SET', lease, '1', 'EX', tonumber(ARGV[2]), 'NX')
+  if ok then
+    redis.call('LPUSH', KEYS[3], m)
+  end
+  local detected = redis.call('HGET', KEYS[2], m) or ''
+  redis.call('ZREM', KEYS[1], m)
+  redis.call('HDEL', KEYS[2], m)
+  out[#out + 1] = {m, ok and 1 or 0, detected}
+end
+return out
+"""
+
+_drain_scripts = {}
+
+
+def _item_symbol(item):
+    return item["symbol"] or item["id"].split("_")[0]
+
+
+def priority_score(earnings_date, today_str=None):
+    """ZSET score: upcoming/today earnings first (nearest first), then past earnings.
+
+    Same ordering as the historical in-Python sort key
+    (0 if ed >= today else 1, ed).
+    """
+    today_str = today_str or date.today().isoformat()
+    try:
+        ordinal = date.fromisoformat(earnings_date).toordinal()
+    except (TypeError, ValueError):
+        earnings_date, ordinal = "9999-12-31", date.max.toordinal()
+    bucket = 0 if earnings_date >= today_str else 1
+    return bucket * 10_000_000 + ordinal
+
+
+def build_payload(asset, ticker, source_id):
+    """Queue payload (also the ZSET member, so re-detection is idempotent)."""
+    return json.dumps({
         "asset": asset,
         "ticker": ticker,
         "source_id": source_id,
         "type": EXTRACTION_TYPE,
         "mode": "write",
     })
-    r.lpush(queue, payload)
-    return True
+
+
+def staging_keys(route):
+    """(priority ZSET, detected HASH) for `route`.
+
+    Keyed per route because the drain script pushes everything it pops into
+    one target queue: a shared ZSET would hand one route's items to another.
+    """
+    return f"{PRIORITY_QUEUE}:{route['name']}", f"{DETECTED_HASH}:{route['name']}"
+
+
+def schedule(r, route, to_enqueue, tickers, detected_at=None):
+    """Stage eligible items in the route's priority ZSET (one pipeline round-trip).
+
+    detected_at: optional {ticker: epoch seconds} from ingest notifications;
+    items without one are stamped now. HSETNX keeps the first detection time
+    when an item is re-found by a later sweep before it is drained.
+    """
+    zset, detected_hash = staging_keys(route)
+    now = time.time()
+    today_str = date.today().isoformat()
+    pipe = r.pipeline(transaction=False)
+    for item, asset_name in to_enqueue:
+        sym = _item_symbol(item)
+        member = build_payload(asset_name, sym, item["id"])
+        pipe.zadd(zset, {member: priority_score(tickers.get(sym), today_str)})
+        pipe.hsetnx(detected_hash, member, json.dumps({
+            "t": (detected_at or {}).get(sym, now),
+            "status": item.get("status"),
+        }))
+    pipe.execute()
+
+
+def drain(r, route, batch_size=DRAIN_BATCH):
+    """Move the route's staged items into its queue in priority order via the batched lease script.
+
+    Returns (stats, latencies): per-asset [queued, skipped, stale] and the
+    detection→enqueue latency in seconds of every enqueued item.
+    """
+    script = _drain_scripts.get(id(r))
+    if script is None:
+        script = _drain_scripts[id(r)] = r.register_script(_DRAIN_LUA)
+
+    zset, detected_hash = staging_keys(route)
+    stats, latencies = {}, []
+    while True:
+        rows = script(keys=[zset, detected_hash, route["queue"]],
+                      args=[batch_size, LEASE_TTL, LEASE_PREFIX])
+        now = time.time()
+        for member, enqueued, detected in rows:
+            asset_name = json.loads(member)["asset"]
+            meta = json.loads(detected) if detected else {}
+            s = stats.setdefault(asset_name, [0, 0, 0])
+            if enqueued:
+                s[0] += 1
+                if meta.get("status") == "in_progress":
+                    s[2] += 1
+                if "t" in meta:
+                    latencies.append(now - meta["t"])
+            else:
+                s[1] += 1
+        if len(rows) < batch_size:
+            return stats, latencies
+
+
+def _log_latency(latencies):
+    if not latencies:
+        return
+    lat = sorted(latencies)
+    p50 = lat[len(lat) // 2]
+    p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+    log.info(f"  detection→enqueue latency: n={len(lat)} p50={p50:.2f}s p95={p95:.2f}s max={lat[-1]:.2f}s")
 
 
 def _precompute_sec_refresh(r, to_enqueue, dry_run):
@@ -232,8 +366,12 @@ def _precompute_sec_refresh(r, to_enqueue, dry_run):
                 log.warning(f"SEC cache refresh failed for {ticker}: {e}")
 
 
-def sweep_once(r, mgr, tickers, route, dry_run=False):
-    """One full sweep: query all 4 assets, sort by earnings date (nearest first), enqueue. Returns count."""
+def sweep_once(r, mgr, tickers, route, dry_run=False, detected_at=None):
+    """One sweep over `tickers`: query all 4 assets, stage by earnings date, drain. Returns count.
+
+    The live path passes only the tickers named in ingest notifications; the
+    safety net passes every active ticker.
+    """
     queue = route["queue"]
     status_prop = route["status_prop"]
     assets = route["assets"]
@@ -247,45 +385,77 @@ def sweep_once(r, mgr, tickers, route, dry_run=False):
     if not to_enqueue:
         return 0
 
-    # Sort: future/today earnings first (nearest first), then past earnings last.
-    # Ensures upcoming tickers always take precedence over backfill items.
-    today_str = date.today().isoformat()
-    to_enqueue.sort(key=lambda x: (
-        0 if tickers.get(x[0]["symbol"] or x[0]["id"].split("_")[0], "9999-12-31") >= today_str else 1,
-        tickers.get(x[0]["symbol"] or x[0]["id"].split("_")[0], "9999-12-31")))
-
-    # Precompute SEC cache refresh (once per ticker, before enqueue loop)
+    # Precompute SEC cache refresh (once per ticker, before enqueue)
     _precompute_sec_refresh(r, to_enqueue, dry_run)
 
-    # Enqueue in priority order, track per-asset stats
-    total = 0
-    stats = {}  # asset_name → [queued, skipped, stale]
-    for item, asset_name in to_enqueue:
-        sid = item["id"]
-        sym = item["symbol"] or sid.split("_")[0]
-        st = item["status"]
-
-        enqueued = enqueue_with_lease(r, sid, asset_name, sym, st, queue, dry_run)
-        s = stats.setdefault(asset_name, [0, 0, 0])
-        if enqueued:
-            s[0] += 1
-            if st == "in_progress":
+    if dry_run:
+        # --list: read-only, so no staging — evaluate leases in priority order in Python
+        today_str = date.today().isoformat()
+        to_enqueue.sort(key=lambda x: priority_score(tickers.get(_item_symbol(x[0])), today_str))
+        stats = {}
+        for item, asset_name in to_enqueue:
+            enqueued = enqueue_with_lease(r, item["id"], asset_name, _item_symbol(item),
+                                          item["status"], queue, dry_run=True)
+            s = stats.setdefault(asset_name, [0, 0, 0])
+            s[0 if enqueued else 1] += 1
+            if enqueued and item["status"] == "in_progress":
                 s[2] += 1
-            total += 1
-        else:
-            s[1] += 1
+        latencies = []
+    else:
+        schedule(r, route, to_enqueue, tickers, detected_at)
+        stats, latencies = drain(r, route)
 
     # Log per-asset stats (same format as before)
+    total = 0
     for asset_name in assets:
         s = stats.get(asset_name)
         if s and (s[0] > 0 or s[1] > 0):
+            total += s[0]
             stale_str = f" ({s[2]} stale recovery)" if s[2] else ""
             action = "would queue" if dry_run else "queued"
             log.info(f"  [{asset_name}] {action}: {s[0]}{stale_str}, skipped (lease active): {s[1]}")
+    _log_latency(latencies)
 
     return total
 
 
+def parse_notification(message):
+    """Decode an assets:ingested pubsub message → (symbols, published_at) or None."""
+    if not message or message.get("type") != "message":
+        return None
+    try:
+        data = json.loads(message["data"])
+    except (json.JSONDecodeError, TypeError, KeyError):
+        return None
+    symbols = [s.upper() for s in data.get("symbols") or [] if s]
+    if not symbols:
+        return None
+    return symbols, float(data.get("published_at") or time.time())
+
+
+def collect_notifications(pubsub, debounce=NOTIFY_DEBOUNCE, wait=1.0):
+    """Block up to `wait`s for the first notification, then coalesce for `debounce`s.
+
+    Returns {ticker: earliest published_at}.
+    """
+    touched = {}
+    deadline = None
+    timeout = wait
+    while True:
+        parsed = parse_notification(pubsub.get_message(timeout=timeout))
+        if parsed:
+            symbols, published_at = parsed
+            for sym in symbols:
+                touched[sym] = min(touched.get(sym, published_at), published_at)
+            if deadline is None:
+                deadline = time.time() + debounce
+        if deadline is None:
+            return touched
+        timeout = deadline - time.time()
+        if timeout <= 0 or _shutdown:
+            return touched
+
+
 def main():
     parser = argparse.ArgumentParser(description="Guidance Trigger Daemon")
     parser.add_argument("--list", action="store_true", help="Dry run: show what would be queued")
@@ -323,28 +493,48 @@ def main():
         return
 
     # Daemon loop
-    log.info(f"Starting daemon: poll={POLL_INTERVAL}s, lease={LEASE_TTL}s, window={ACTIVE_WINDOW_DAYS}d")
-    log.info(f"Queue: {QUEUE_NAME}, routes: {[r['name'] for r in ROUTES]}")
+    log.info(f"Starting daemon: event-driven on {INGEST_CHANNEL}, safety sweep={SAFETY_SWEEP_INTERVAL}s, "
+             f"lease={LEASE_TTL}s, window={ACTIVE_WINDOW_DAYS}d")
+    log.info(f"Routes: {[(route['name'], route['queue'], staging_keys(route)[0]) for route in ROUTES]}")
 
+    pubsub = r.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(INGEST_CHANNEL)
+
+    tickers = {}
+    last_refresh = 0.0
+    last_full_sweep = 0.0
     while not _shutdown:
         try:
-            tickers = get_active_tickers(r, args.ticker)
-            if tickers:
+            now = time.time()
+            if now - last_refresh >= POLL_INTERVAL:
+                tickers = get_active_tickers(r, args.ticker)
+                last_refresh = now
+
+            if now - last_full_sweep >= SAFETY_SWEEP_INTERVAL:
+                # Safety net: catches anything ingested while we were down or whose
+                # notification was lost (pubsub is at-most-once).
+                if tickers:
+                    for route in ROUTES:
+                        total = sweep_once(r, mgr, tickers, route)
+                        if total > 0:
+                            log.info(f"[{route['name']}] Safety sweep queued {total} items "
+                                     f"for {len(tickers)} active tickers")
+                else:
+                    log.debug("No active tickers in window")
+                last_full_sweep = now
+
+            touched = collect_notifications(pubsub)
+            scoped = {t: tickers[t] for t in touched if t in tickers}
+            if scoped:
                 for route in ROUTES:
-                    total = sweep_once(r, mgr, tickers, route)
+                    total = sweep_once(r, mgr, scoped, route, detected_at=touched)
                     if total > 0:
-                        log.info(f"[{route['name']}] Queued {total} items for {len(tickers)} active tickers")
-            else:
-                log.debug("No active tickers in window")
+                        log.info(f"[{route['name']}] Queued {total} items for {sorted(scoped)} (ingest notification)")
         except Exception as e:
-            log.error(f"Sweep failed: {e}")
-
-        # Sleep in small increments for responsive shutdown
-        for _ in range(POLL_INTERVAL):
-            if _shutdown:
-                break
+            log.error(f"Trigger loop failed: {e}")
             time.sleep(1)
 
+    pubsub.close()
     log.info("Shutdown complete")
     mgr.close()
 
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Hermetic end-to-end ingestion benchmark.
+
+Runs the real ingestion path
+
+    bz_websocket / sec_websocket / bz_restAPI  ->  RedisClient raw queues
+      ->  NewsProcessor / ReportProcessor (+ report_enricher workers)
+      ->  ReturnsProcessor  ->  Neo4jProcessor.process_with_pubsub  ->  Neo4j
+
+with every vendor replaced by a local fake (utils/ingest_fakes.py, utils/ws_replay.py):
+websocket replay servers for Benzinga and sec-api, HTTP fakes for Polygon, the
+Benzinga REST feed and the sec-api extractor, an in-process FakeRedis and a
+recording Neo4j manager. Nothing leaves the machine and no Redis or Neo4j
+server is needed. Only the services are faked: the vendor client SDKs
+(polygon-api-client, sec-api, ...) run for real, so requirements.txt must be
+installed; a missing one is reported before any fake server starts.
+
+Stage latencies come from the monotonic time FakeRedis saw each tracking:meta:*
+lifecycle field written by the real code (ingested_at, processed_at,
+withreturns_at / withoutreturns_at, inserted_into_neo4j_at), plus the time the
+fake server sent the item:
+
+    feed       sent by the fake vendor     -> ingested_at
+    process    ingested_at                 -> processed_at (includes enrichment)
+    enrich     queued_for_enrichment_at    -> finished_enrichment_at
+    returns    processed_at                -> withreturns_at / withoutreturns_at
+    neo4j      with(out)returns_at         -> inserted_into_neo4j_at
+    end_to_end sent (or ingested_at)       -> inserted_into_neo4j_at
+
+Queue depth (raw, enrich, processed, pending returns, awaiting Neo4j) is sampled
+over the run. Each run appends one JSON record to --out; --compare prints the
+change against the latest record of the same scenario in another results file.
+
+Scenarios:
+    open_burst    live news + SEC bursts at the open (websockets)
+    backfill      historical Benzinga REST pages, returns priced from fake Polygon
+    eightk_flood  earnings-season 8-K flood through the enrichment workers
+
+Usage:
+    python scripts/ingestion_bench.py --scenario open_burst
+    python scripts/ingestion_bench.py --scenario all --out bench_results.jsonl
+    python scripts/ingestion_bench.py --scenario eightk_flood --reports 3000 --enrichers 8 --vendor-latency 0.05
+    python scripts/ingestion_bench.py --scenario backfill --compare baseline.jsonl
+"""
+import argparse
+import csv
+import functools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingest_fakes import (FakeRedis, FakeVendorServer, RecordingNeo4jManager, benzinga_routes,  # noqa: E402
+                                install_fake_redis, polygon_routes, sec_routes)
+from utils.ws_pipeline import LatencyWindow  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("news", "reports")
+TERMINAL_FIELDS = ("inserted_into_neo4j_at", "filtered_at", "failed_at")
+RETURNS_FIELDS = ("withreturns_at", "withoutreturns_at")
+STAGES = [
+    ("feed", ("sent",), ("ingested_at",)),
+    ("process", ("ingested_at",), ("processed_at",)),
+    ("enrich", ("queued_for_enrichment_at",), ("finished_enrichment_at",)),
+    ("returns", ("processed_at",), RETURNS_FIELDS),
+    ("neo4j", RETURNS_FIELDS, ("inserted_into_neo4j_at",)),
+    ("end_to_end", ("sent", "ingested_at"), ("inserted_into_neo4j_at",)),
+]
+
+SCENARIOS = {
+    "open_burst": {"news": 2000, "reports": 200, "live": True, "burst_size": 400, "burst_gap": 1.0,
+                   "form_type": "8-K"},
+    "backfill": {"news": 5000, "reports": 0, "live": False, "days_ago": 30},
+    "eightk_flood": {"news": 0, "reports": 1000, "live": True, "burst_size": 100, "burst_gap": 0.5,
+                     "form_type": "8-K"},
+}
+
+NEWS_ID_BASE = 900000000
+
+
+# ---------------------------------------------------------------------------
+# Synthetic vendor payloads
+# ---------------------------------------------------------------------------
+def universe(path, limit=500):
+    """[(symbol, cik)] from the stock universe CSV, in file order."""
+    rows = []
+    with open(path, newline="") as fh:
+        for row in csv.DictReader(fh):
+            symbol = (row.get("symbol") or "").strip()
+            if symbol and symbol.lower() != "nan":
+                rows.append((symbol, (row.get("cik") or "").split(".")[0]))
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+def _news_content(i, symbol, created):
+    return {"id": NEWS_ID_BASE + i, "title": f"{symbol} bench headline {i}",
+            "body": f"<p>{symbol} bench body {i}. " + "Guidance and results commentary. " * 20 + "</p>",
+            "authors": ["Bench Wire"], "teaser": f"{symbol} teaser {i}", "url": f"https://www.benzinga.com/bench/{i}",
+            "channels": ["News", "Earnings"], "tags": ["bench"], "created_at": created, "updated_at": created,
+            "revision_id": 1, "type": "story",
+            "securities": [{"symbol": symbol, "exchange": "NASDAQ", "primary": True}]}
+
+
+def news_ws_frames(n, symbols, burst_size, burst_gap, created=None):
+    """[(t, frame)] Benzinga websocket 'Created' messages in bursts of burst_size, burst_gap seconds apart."""
+    created = format_datetime(created or datetime.now(timezone.utc))
+    frames = []
+    for i in range(n):
+        message = {"api_version": "websocket/v1", "kind": "News/v1",
+                   "data": {"action": "Created", "id": NEWS_ID_BASE + i, "timestamp": created,
+                            "content": _news_content(i, symbols[i % len(symbols)], created)}}
+        frames.append(((i // burst_size) * burst_gap, json.dumps(message)))
+    return frames
+
+
+def news_rest_items(n, symbols, start, spacing=timedelta(minutes=1)):
+    """Benzinga newsfeed v2 REST items, created every `spacing` from start."""
+    items = []
+    for i in range(n):
+        created = format_datetime(start + i * spacing)
+        c = _news_content(i, symbols[i % len(symbols)], created)
+        items.append({"id": c["id"], "author": "Bench Wire", "created": created, "updated": created,
+                      "title": c["title"], "teaser": c["teaser"], "body": c["body"], "url": c["url"],
+                      "image": [], "channels": [{"name": ch} for ch in c["channels"]],
+                      "stocks": [{"name": c["securities"][0]["symbol"]}], "tags": [{"name": "bench"}]})
+    return items
+
+
+def sec_ws_frames(n, companies, base_url, burst_size, burst_gap, form_type="8-K", filed_at=None):
+    """[(t, frame)] sec-api stream frames, one filing each; documents point at the fake SEC server."""
+    filed_at = (filed_at or datetime.now(timezone.utc)).astimezone(timezone(timedelta(hours=-5)))
+    frames = []
+    for i in range(n):
+        symbol, cik = companies[i % len(companies)]
+        accession = f"9999999999-26-{i:06d}"
+        folder = f"{base_url}/Archives/edgar/data/{cik}/{accession.replace('-', '')}"
+        filing = {"id": f"bench{i}", "accessionNo": accession, "cik": cik, "ticker": symbol, "formType": form_type,
+                  "filedAt": filed_at.isoformat(timespec="seconds"), "companyName": f"{symbol} INC",
+                  "linkToTxt": f"{folder}/{accession}.txt", "linkToHtml": f"{folder}/{accession}-index.htm",
+                  "linkToFilingDetails": f"{folder}/d{i}.htm",
+                  "entities": [{"cik": cik, "companyName": f"{symbol} INC", "ticker": symbol}],
+                  "documentFormatFiles": [{"sequence": "1", "description": form_type, "type": form_type,
+                                           "documentUrl": f"{folder}/d{i}.htm", "size": "20000"}],
+                  "dataFiles": [], "items": ["Item 2.02: Results of Operations and Financial Condition",
+                                             "Item 9.01: Financial Statements and Exhibits"]}
+        frames.append(((i // burst_size) * burst_gap, json.dumps([filing])))
+    return frames
+
+
+def frame_item_ids(source, frame):
+    """Item ids a frame carries (news content id / accessionNo)."""
+    data = json.loads(frame)
+    if source == "reports":
+        return [f["accessionNo"] for f in data]
+    return [str(data["data"]["content"]["id"])]
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+def _first(stamps, fields):
+    return next((stamps[f] for f in fields if f in stamps), None)
+
+
+def stage_report(lifecycle, sent_at):
+    """
+    Per-source throughput and stage latencies from FakeRedis.lifecycle.
+
+    Args:
+        lifecycle: {"tracking:meta:<source>:<identifier>": {field: monotonic}}
+        sent_at: {(source, item_id): monotonic send time}; item_id is the identifier up to the first "."
+    """
+    report = {}
+    for meta_key, stamps in lifecycle.items():
+        parts = meta_key.split(":", 3)
+        if len(parts) < 4:
+            continue
+        source, identifier = parts[2], parts[3]
+        stamps = dict(stamps)
+        sent = sent_at.get((source, identifier.split(".", 1)[0]))
+        if sent is not None:
+            stamps["sent"] = sent
+        entry = report.setdefault(source, {"items": 0, "completed": 0, "filtered": 0, "failed": 0,
+                                           "_first": None, "_last": None,
+                                           "_windows": {name: LatencyWindow(size=10**6) for name, _, _ in STAGES}})
+        entry["items"] += 1
+        entry["completed"] += "inserted_into_neo4j_at" in stamps
+        entry["filtered"] += "filtered_at" in stamps
+        entry["failed"] += "failed_at" in stamps and "inserted_into_neo4j_at" not in stamps
+        start = _first(stamps, ("sent", "ingested_at"))
+        done = stamps.get("inserted_into_neo4j_at")
+        if start is not None:
+            entry["_first"] = start if entry["_first"] is None else min(entry["_first"], start)
+        if done is not None:
+            entry["_last"] = done if entry["_last"] is None else max(entry["_last"], done)
+        for name, begin_fields, end_fields in STAGES:
+            begin, end = _first(stamps, begin_fields), _first(stamps, end_fields)
+            if begin is not None and end is not None:
+                entry["_windows"][name].add_many([max(0.0, end - begin)])
+
+    for entry in report.values():
+        first, last = entry.pop("_first"), entry.pop("_last")
+        span = (last - first) if first is not None and last is not None else 0.0
+        entry["span_s"] = round(span, 3)
+        entry["items_per_sec"] = round(entry["completed"] / span, 2) if span > 0 else 0.0
+        windows = entry.pop("_windows")
+        entry["stages"] = {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in w.summary().items()}
+                           for name, w in windows.items() if w.count}
+    return report
+
+
+def depth_keys(sources=SOURCES):
+    """{label: (kind, key)}: kind "size" samples FakeRedis.size, "prefix" counts keys under the prefix."""
+    from redisDB.redis_constants import RedisKeys, RedisQueues
+    keys = {"enrich": ("size", RedisKeys.ENRICH_QUEUE)}
+    for source in sources:
+        queues = RedisQueues.get_queues(source)
+        returns = RedisKeys.get_returns_keys(source)
+        keys[f"{source}.raw"] = ("size", queues["RAW_QUEUE"])
+        keys[f"{source}.processed"] = ("size", queues["PROCESSED_QUEUE"])
+        keys[f"{source}.pending_returns"] = ("size", returns["pending"])
+        keys[f"{source}.awaiting_neo4j"] = ("prefix", returns["withreturns"] + ":")
+    return keys
+
+
+class DepthSampler:
+    """Samples queue depths from a FakeRedis every interval seconds on a daemon thread."""
+
+    def __init__(self, server, keys, interval=0.25, clock=time.monotonic):
+        self.server = server
+        self.keys = keys
+        self.interval = interval
+        self.clock = clock
+        self.samples = []
+        self.peak = {label: 0 for label in keys}
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def sample(self):
+        row = {"t": round(self.clock() - self._started, 3) if self._started is not None else 0.0}
+        for label, (kind, key) in self.keys.items():
+            value = self.server.size(key) if kind == "size" else self.server.count_prefix(key)
+            row[label] = value
+            self.peak[label] = max(self.peak[label], value)
+        self.samples.append(row)
+        return row
+
+    def start(self):
+        self._started = self.clock()
+        self._thread = threading.Thread(target=self._run, name="depth-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.sample()
+
+
+def terminal_count(lifecycle):
+    return sum(1 for stamps in list(lifecycle.values()) if any(f in stamps for f in TERMINAL_FIELDS))
+
+
+def compare_runs(baseline, current):
+    """Ratios current/baseline for throughput and per-stage p50/p99 (per source)."""
+    delta = {"scenario": current["scenario"], "baseline_rev": baseline.get("git_rev"), "rev": current.get("git_rev")}
+    for source, entry in current.get("sources", {}).items():
+        base = baseline.get("sources", {}).get(source)
+        if not base:
+            continue
+        row = {"items_per_sec": _ratio(entry["items_per_sec"], base["items_per_sec"])}
+        for stage, summary in entry["stages"].items():
+            if stage in base["stages"]:
+                for pct in ("p50_ms", "p99_ms"):
+                    row[f"{stage}_{pct}"] = _ratio(summary[pct], base["stages"][stage][pct])
+        delta[source] = row
+    return delta
+
+
+def _ratio(value, base):
+    return round(value / base, 3) if base else None
+
+
+def load_results(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _wait_for(predicate, timeout, interval=0.05):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline wiring
+# ---------------------------------------------------------------------------
+def _thread(target, name):
+    t = threading.Thread(target=target, name=name, daemon=True)
+    t.start()
+    return t
+
+
+def run_scenario(name, spec, args):
+    """Wire the real ingestion path to the fakes, replay one scenario and return its result record."""
+    # Keys and Redis must be faked before any project module reads them.
+    for key in ("POLYGON_API_KEY", "SEC_API_KEY", "BENZINGANEWS_API_KEY", "OPENAI_API_KEY"):
+        os.environ.setdefault(key, "bench")
+    redis_server = FakeRedis()
+    install_fake_redis(redis_server)
+
+    from config import feature_flags
+    feature_flags.ENABLE_LIVE_DATA = spec["live"]
+    feature_flags.ENABLE_HISTORICAL_DATA = not spec["live"]
+    feature_flags.ENABLE_PRICE_TAPE = False
+    feature_flags.ENABLE_NEWS_EMBEDDINGS = False
+    feature_flags.ENABLE_XBRL_PROCESSING = False
+    feature_flags.SEC_FETCH_CACHE_DIR = None
+
+    try:
+        from redisDB.redisClasses import EventTraderRedis
+        from redisDB.redis_constants import RedisKeys
+        from redisDB.NewsProcessor import NewsProcessor
+        from redisDB.ReportProcessor import ReportProcessor
+        from eventReturns import polygonClass
+        from eventReturns.ReturnsProcessor import ReturnsProcessor
+        from neograph.Neo4jProcessor import Neo4jProcessor
+        from neograph.mixins import pubsub as pubsub_mixin
+        from secReports import sec_fetch
+        from utils.ws_replay import ReplayWebSocketServer
+    except ModuleNotFoundError as e:
+        raise SystemExit(f"ingestion_bench: {e}. The bench drives the real vendor SDKs against local fakes; "
+                         f"install requirements.txt first.") from e
+
+    delay = args.polygon_delay
+    polygon = FakeVendorServer(polygon_routes(), rate=args.polygon_rate, latency=args.vendor_latency,
+                               name="polygon").start()
+    sec_api = FakeVendorServer(sec_routes(), rate=args.sec_rate, latency=args.vendor_latency, name="sec").start()
+    polygonClass.RESTClient = functools.partial(polygonClass.RESTClient, base=polygon.url)
+    sec_fetch.EXTRACTOR_ENDPOINT = f"{sec_api.url}/extractor"
+    pubsub_mixin.ENABLE_NEWS_EMBEDDINGS = False
+    pubsub_mixin.PUBSUB_RECONCILIATION_INTERVAL = 10**9
+
+    companies = universe(feature_flags.SYMBOLS_CSV_PATH, args.symbols)
+    symbols = [s for s, _ in companies]
+    sources = [s for s in SOURCES if spec.get(s)]
+    redis_envs = {s: EventTraderRedis(source=getattr(RedisKeys, "SOURCE_NEWS" if s == "news" else "SOURCE_REPORTS"))
+                  for s in SOURCES}
+    sent_at, threads, stoppers, servers = {}, [], [], [polygon, sec_api]
+
+    # Processors and consumers first, so nothing is published before its subscriber exists.
+    processor_classes = {"news": NewsProcessor, "reports": ReportProcessor}
+    processors = {s: processor_classes[s](redis_envs[s], delete_raw=True, polygon_subscription_delay=delay)
+                  for s in sources}
+    for source in sources:
+        returns = ReturnsProcessor(redis_envs[source], polygon_subscription_delay=delay)
+        threads += [_thread(processors[source].process_all_items, f"{source}-processor"),
+                    _thread(returns.process_all_returns, f"{source}-returns")]
+        stoppers += [processors[source].stop, returns.stop]
+    if "reports" in sources:
+        from redisDB import report_enricher
+        threads += [_thread(report_enricher.enrich_worker, f"enricher-{i}") for i in range(args.enrichers)]
+        _wait_for(lambda: redis_server.blocked(RedisKeys.ENRICH_QUEUE) >= args.enrichers, 30)
+
+    neo4j = Neo4jProcessor(redis_envs["news"])
+    neo4j.manager = RecordingNeo4jManager(write_latency=args.neo4j_latency)
+    threads.append(_thread(neo4j.process_with_pubsub, "neo4j-pubsub"))
+    stoppers.append(lambda: setattr(neo4j, "pubsub_running", False))
+    queue_client = {s: processors[s].queue_client for s in sources}
+    _wait_for(lambda: all(redis_server.blocked(queue_client[s].RAW_QUEUE) for s in sources)
+              and getattr(neo4j, "pubsub_running", False), 30)
+
+    sampler = DepthSampler(redis_server, depth_keys(sources), interval=args.sample_interval).start()
+    started = time.monotonic()
+    expected = 0
+
+    # Feeds.
+    clients = []
+    if spec["live"]:
+        from benzinga import bz_websocket
+        from secReports.sec_websocket import SECWebSocket
+        bz_websocket.ENABLE_LIVE_DATA = True
+        feeds = []
+        if spec.get("news"):
+            feeds.append(("news", news_ws_frames(spec["news"], symbols, spec["burst_size"], spec["burst_gap"]),
+                          lambda: bz_websocket.BenzingaNewsWebSocket(api_key="bench",
+                                                                     redis_client=redis_envs["news"].live_client)))
+        if spec.get("reports"):
+            feeds.append(("reports", sec_ws_frames(spec["reports"], companies, sec_api.url, spec["burst_size"],
+                                                   spec["burst_gap"], spec.get("form_type", "8-K")),
+                          lambda: SECWebSocket(api_key="bench", redis_client=redis_envs["reports"].live_client)))
+        for source, frames, make_client in feeds:
+            server = ReplayWebSocketServer(frames, speed=args.speed, heartbeat_every=1.0).start()
+            client = make_client()
+            client.url = server.url
+            threads.append(_thread(client.connect, f"{source}-ws"))
+            servers.append(server)
+            clients.append((source, frames, server, client))
+            expected += len(frames)
+    else:
+        from benzinga.bz_restAPI import BenzingaNewsRestAPI
+        start = (datetime.now(timezone.utc) - timedelta(days=spec.get("days_ago", 30))).replace(
+            hour=14, minute=0, second=0, microsecond=0)
+        while start.weekday() >= 5:
+            start -= timedelta(days=1)
+        items = news_rest_items(spec["news"], symbols, start, spacing=timedelta(seconds=20))
+
+        def on_page(rows):
+            now = time.monotonic()
+            for row in rows:
+                sent_at.setdefault(("news", str(row["id"])), now)
+
+        benzinga = FakeVendorServer(benzinga_routes(items, on_page=on_page), rate=args.benzinga_rate,
+                                    latency=args.vendor_latency, name="benzinga").start()
+        servers.append(benzinga)
+        rest = BenzingaNewsRestAPI(api_key="bench", redis_client=redis_envs["news"].history_client)
+        rest.api_url = f"{benzinga.url}/api/v2/news"
+        end = start + len(items) * timedelta(seconds=20)
+        threads.append(_thread(lambda: rest.get_historical_data(start.date().isoformat(), end.date().isoformat()),
+                               "news-rest"))
+        expected += len(items)
+
+    def recorded_sends():
+        for source, frames, server, _ in clients:
+            for i, sent in enumerate(list(server.sent_at)):
+                for item_id in frame_item_ids(source, frames[i][1]):
+                    sent_at.setdefault((source, item_id), sent)
+
+    done = _wait_for(lambda: terminal_count(redis_server.lifecycle) >= expected, args.timeout, interval=0.2)
+    elapsed = time.monotonic() - started
+    recorded_sends()
+    sampler.stop()
+    for stop in stoppers:
+        stop()
+    for _, _, _, client in clients:
+        client.disconnect()
+    for server in servers:
+        server.stop()
+
+    sources_report = stage_report(redis_server.lifecycle, sent_at)
+    completed = sum(e["completed"] for e in sources_report.values())
+    return {
+        "scenario": name, "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": _git_rev(), "params": dict(spec, speed=args.speed, enrichers=args.enrichers,
+                                              vendor_latency=args.vendor_latency, neo4j_latency=args.neo4j_latency),
+        "complete": done, "items_sent": expected, "items_seen": len(redis_server.lifecycle), "completed": completed,
+        "elapsed_s": round(elapsed, 2), "items_per_sec": round(completed / elapsed, 2) if elapsed else 0.0,
+        "sources": sources_report, "queue_peak": sampler.peak, "queue_depth": sampler.samples,
+        "vendors": {s.name: s.snapshot() for s in servers if isinstance(s, FakeVendorServer)},
+        "neo4j": neo4j.manager.snapshot(), "redis_commands": dict(redis_server.command_counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["all"], default="open_burst")
+    parser.add_argument("--news", type=int, help="override the scenario's news item count")
+    parser.add_argument("--reports", type=int, help="override the scenario's filing count")
+    parser.add_argument("--burst-size", type=int)
+    parser.add_argument("--burst-gap", type=float)
+    parser.add_argument("--speed", type=float, default=1.0, help="websocket replay speed multiplier, 0 = back to back")
+    parser.add_argument("--symbols", type=int, default=500, help="distinct symbols drawn from the stock universe")
+    parser.add_argument("--enrichers", type=int, default=4, help="report_enricher worker threads")
+    parser.add_argument("--polygon-delay", type=int, default=0, help="polygon_subscription_delay (seconds)")
+    parser.add_argument("--polygon-rate", type=float, default=0.0, help="fake Polygon responses/sec (0 = unlimited)")
+    parser.add_argument("--sec-rate", type=float, default=10.0, help="fake sec-api responses/sec (0 = unlimited)")
+    parser.add_argument("--benzinga-rate", type=float, default=0.0)
+    parser.add_argument("--vendor-latency", type=float, default=0.0, help="seconds added to every fake HTTP response")
+    parser.add_argument("--neo4j-latency", type=float, default=0.0, help="seconds slept per recorded write statement")
+    parser.add_argument("--sample-interval", type=float, default=0.25)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--out", default="ingestion_bench_results.jsonl", help="JSONL file each run is appended to")
+    parser.add_argument("--compare", help="results JSONL to compare against (latest record per scenario)")
+    parser.add_argument("--quiet-depth", action="store_true", help="omit the depth time series from stdout")
+    args = parser.parse_args()
+
+    from utils.log_config import setup_logging
+    setup_logging(name="ingestion_bench")
+
+    baseline = {}
+    if args.compare:
+        for record in load_results(args.compare):
+            baseline[record["scenario"]] = record
+
+    for name in sorted(SCENARIOS) if args.scenario == "all" else [args.scenario]:
+        spec = dict(SCENARIOS[name])
+        for field in ("news", "reports", "burst_size", "burst_gap"):
+            if getattr(args, field) is not None and (field in spec or field in ("news", "reports")):
+                spec[field] = getattr(args, field)
+        result = run_scenario(name, spec, args)
+        with open(args.out, "a") as fh:
+            fh.write(json.dumps(result) + "\n")
+        shown = {k: v for k, v in result.items() if not (args.quiet_depth and k == "queue_depth")}
+        print(json.dumps(shown, indent=2))
+        logger.info(f"ingestion_bench {name}: {result['items_per_sec']} items/s, complete={result['complete']}")
+        if name in baseline:
+            print(json.dumps(compare_runs(baseline[name], result), indent=2))
+
+
+if __name__ == "__main__":
+    main()
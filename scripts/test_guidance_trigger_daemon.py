@@ -0,0 +1,155 @@
+"""Tests for scripts/guidance_trigger_daemon.py — incremental trigger helpers.
+
+Covers: priority score ordering (parity with the old in-Python sort key),
+payload shape, ingest-notification parsing and debounce coalescing, the
+dry-run sweep path, and the Lua drain script (on fakeredis; skipped without
+fakeredis + lupa).
+"""
+from __future__ import annotations
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for p in (REPO_ROOT, REPO_ROOT / "scripts"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import pytest
+
+pytest.importorskip("dotenv")
+import guidance_trigger_daemon as gtd  # noqa: E402
+
+
+# ── 1. priority_score ─────────────────────────────────────────────────────
+
+def test_priority_score_matches_legacy_sort_key():
+    today = date(2026, 5, 1)
+    today_str = today.isoformat()
+    dates = [(today + timedelta(days=d)).isoformat() for d in (-30, -1, 0, 3, 40)] + ["9999-12-31"]
+    legacy = sorted(dates, key=lambda ed: (0 if ed >= today_str else 1, ed))
+    by_score = sorted(dates, key=lambda ed: gtd.priority_score(ed, today_str))
+    assert by_score == legacy
+    assert by_score[0] == today_str
+
+
+def test_priority_score_missing_date_sorts_after_dated_upcoming():
+    today_str = "2026-05-01"
+    assert gtd.priority_score(None, today_str) > gtd.priority_score("2026-05-20", today_str)
+    assert gtd.priority_score(None, today_str) < gtd.priority_score("2026-04-01", today_str)
+
+
+# ── 2. payload ────────────────────────────────────────────────────────────
+
+def test_build_payload_is_stable_queue_contract():
+    a = gtd.build_payload("8k", "LULU", "0001397187-24-000010")
+    assert a == gtd.build_payload("8k", "LULU", "0001397187-24-000010")
+    assert json.loads(a) == {
+        "asset": "8k", "ticker": "LULU", "source_id": "0001397187-24-000010",
+        "type": "guidance", "mode": "write",
+    }
+
+
+# ── 3. notifications ──────────────────────────────────────────────────────
+
+def _msg(payload, type_="message"):
+    return {"type": type_, "data": json.dumps(payload) if isinstance(payload, dict) else payload}
+
+
+def test_parse_notification_filters_noise():
+    assert gtd.parse_notification(None) is None
+    assert gtd.parse_notification(_msg({}, type_="subscribe")) is None
+    assert gtd.parse_notification(_msg("not json")) is None
+    assert gtd.parse_notification(_msg({"asset": "report", "symbols": []})) is None
+    assert gtd.parse_notification(_msg({"symbols": ["lulu"], "published_at": 12.5})) == (["LULU"], 12.5)
+
+
+class _FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def get_message(self, timeout=0):
+        return self.messages.pop(0) if self.messages else None
+
+
+def test_collect_notifications_keeps_earliest_timestamp_per_ticker():
+    ps = _FakePubSub([
+        _msg({"symbols": ["AAPL"], "published_at": 10.0}),
+        _msg({"symbols": ["AAPL", "MSFT"], "published_at": 5.0}),
+        _msg({"symbols": ["MSFT"], "published_at": 7.0}),
+    ])
+    assert gtd.collect_notifications(ps, debounce=0.05, wait=0) == {"AAPL": 5.0, "MSFT": 5.0}
+
+
+def test_collect_notifications_returns_empty_when_idle():
+    assert gtd.collect_notifications(_FakePubSub([]), debounce=0.05, wait=0) == {}
+
+
+# ── 4. dry-run sweep ──────────────────────────────────────────────────────
+
+class _FakeRedis:
+    def __init__(self, leases=()):
+        self.leases = set(leases)
+
+    def exists(self, key):
+        return key in self.leases
+
+
+def test_dry_run_sweep_counts_without_staging(monkeypatch):
+    rows = {
+        "transcript": [{"id": "AAPL_2026-05-01T16.30", "symbol": "AAPL", "status": None}],
+        "8k": [{"id": "acc-1", "symbol": "AAPL", "status": "in_progress"},
+               {"id": "acc-2", "symbol": "AAPL", "status": None}],
+    }
+    monkeypatch.setattr(gtd, "find_eligible",
+                        lambda mgr, name, cfg, tickers, prop: rows.get(name, []))
+    r = _FakeRedis(leases={f"{gtd.LEASE_PREFIX}8k:acc-2"})
+    total = gtd.sweep_once(r, None, {"AAPL": "2026-05-01"}, gtd.ROUTES[0], dry_run=True)
+    assert total == 2
+
+
+# ── 5. Lua drain ──────────────────────────────────────────────────────────
+
+@pytest.fixture
+def lua_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    gtd._drain_scripts.clear()
+    yield fakeredis.FakeRedis(decode_responses=True)
+    gtd._drain_scripts.clear()
+
+
+def test_drain_leases_pushes_in_priority_order_and_clears_staging(lua_redis):
+    r = lua_redis
+    route = gtd.ROUTES[0]
+    items = [({"id": f"acc-{i}", "symbol": sym, "status": None}, "8k")
+             for i, sym in enumerate(["MSFT", "AAPL", "MSFT", "AAPL", "AAPL"])]
+    r.set(f"{gtd.LEASE_PREFIX}8k:acc-3", "1")                     # already queued by an earlier sweep
+    upcoming, past = (date.today() + timedelta(days=3)).isoformat(), (date.today() - timedelta(days=30)).isoformat()
+    gtd.schedule(r, route, items, {"AAPL": upcoming, "MSFT": past}, detected_at={"AAPL": 1.0})
+
+    stats, latencies = gtd.drain(r, route, batch_size=2)           # 3 script calls: 2 + 2 + 1
+    assert stats == {"8k": [4, 1, 0]} and len(latencies) == 4
+    assert sum(lat > 1e6 for lat in latencies) == 2                # AAPL kept its notification time
+    queued = [json.loads(m)["source_id"] for m in reversed(r.lrange(route["queue"], 0, -1))]
+    assert sorted(queued[:2]) == ["acc-1", "acc-4"] and sorted(queued[2:]) == ["acc-0", "acc-2"]
+    assert all(r.ttl(f"{gtd.LEASE_PREFIX}8k:acc-{i}") > 0 for i in (0, 1, 2, 4))
+    zset, detected_hash = gtd.staging_keys(route)
+    assert r.zcard(zset) == 0 and r.hlen(detected_hash) == 0
+
+    # re-detected while leased: dropped from staging, not pushed twice
+    gtd.schedule(r, route, items[:1], {"MSFT": past})
+    assert gtd.drain(r, route)[0] == {"8k": [0, 1, 0]} and r.llen(route["queue"]) == 4
+
+
+def test_drain_keeps_routes_apart(lua_redis):
+    r = lua_redis
+    other = dict(gtd.ROUTES[0], name="other", queue="extract:other")
+    gtd.schedule(r, gtd.ROUTES[0], [({"id": "acc-1", "symbol": "AAPL", "status": None}, "8k")], {})
+    gtd.schedule(r, other, [({"id": "T_1", "symbol": "MSFT", "status": None}, "transcript")], {})
+    gtd.drain(r, other)
+    assert [json.loads(m)["source_id"] for m in r.lrange("extract:other", 0, -1)] == ["T_1"]
+    assert r.llen(gtd.QUEUE_NAME) == 0
+    gtd.drain(r, gtd.ROUTES[0])
+    assert [json.loads(m)["source_id"] for m in r.lrange(gtd.QUEUE_NAME, 0, -1)] == ["acc-1"]
@@ -26,7 +26,6 @@ import os
 import sys
 from datetime import date, datetime, timezone
 from pathlib import Path
-from urllib.request import Request, urlopen
 from zoneinfo import ZoneInfo
 
 # Project root
@@ -150,13 +149,11 @@ def load_universe(r=None) -> set[str]:
 
 def fetch_alphavantage(api_key: str, target_dates: set[date]) -> dict[str, dict]:
     """Fetch AV EARNINGS_CALENDAR bulk CSV, filter to target_dates."""
-    url = f"https://www.alphavantage.co/query?function=EARNINGS_CALENDAR&horizon=3month&apikey={api_key}"
-    req = Request(url, headers={"User-Agent": "trade-ready-scanner/1.0"})
-    try:
-        with urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8")
-    except Exception as e:
-        log.error(f"AV fetch failed: {e}")
+    from scripts.earnings.provider_client import get_provider_client
+    raw = get_provider_client().av_raw(api_key, "EARNINGS_CALENDAR", {"horizon": "3month"},
+                                       timeout=30, max_retries=0)
+    if raw is None:
+        log.error("AV fetch failed")
         return {}
 
     # Check for error/rate-limit
@@ -240,15 +237,17 @@ def fetch_yahoo(tickers: list[str]) -> dict[str, dict]:
     if not tickers:
         return {}
     try:
-        import yfinance as yf
+        import yfinance  # noqa: F401
     except ImportError:
         log.error("yfinance not installed")
         return {}
+    from scripts.earnings.provider_client import get_provider_client
+    client = get_provider_client()
 
     results = {}
     for ticker in tickers:
         try:
-            stock = yf.Ticker(ticker)
+            stock = client.yahoo_ticker(ticker)
             cal = stock.calendar
             if cal is None or not isinstance(cal, dict):
                 continue
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Recall@k and latency benchmark for neograph/vector_mirror.py on synthetic vectors.
+
+Builds a clustered corpus whose variance decays across dimensions (like
+text-embedding-3 vectors, so truncation is meaningful), draws near-duplicate
+queries from it, and compares against exact float32 brute-force search:
+
+  * ann      - quantized IVF candidates only, scored on the int8 prefix
+  * rescored - the same candidates rescored exactly on the full vectors
+  * exact    - brute-force cosine over the full float32 matrix
+
+Usage:
+    python scripts/vector_mirror_bench.py
+    python scripts/vector_mirror_bench.py --n 200000 --dim 3072 --dims 256 --nprobe 16 --candidates 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neograph.vector_mirror import LocalSimilarityEngine, QuantizedVectorIndex, exact_rescorer  # noqa: E402
+from utils.ws_pipeline import LatencyWindow  # noqa: E402
+
+
+def synthetic_corpus(n, dim, clusters=64, queries=200, noise=0.35, seed=7):
+    """(ids, unit vectors, query vectors): clustered, leading dimensions carry most variance."""
+    rng = np.random.default_rng(seed)
+    decay = (1.0 / np.sqrt(1.0 + np.arange(dim) / 32.0)).astype(np.float32)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    x = (centers[labels] + noise * 2 * rng.standard_normal((n, dim)).astype(np.float32)) * decay
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    base = x[rng.integers(0, n, size=queries)]
+    q = base + noise * 0.5 * rng.standard_normal(base.shape).astype(np.float32) * decay
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return [f"node_{i}" for i in range(n)], x, q
+
+
+def exact_top_k(x, queries, k):
+    top = []
+    for q in queries:
+        scores = x @ q
+        idx = np.argpartition(-scores, k - 1)[:k]
+        top.append(set(idx[np.argsort(-scores[idx])].tolist()))
+    return top
+
+
+def run(args):
+    ids, x, queries = synthetic_corpus(args.n, args.dim, args.clusters, args.queries, seed=args.seed)
+    truth = exact_top_k(x, queries, args.k)
+
+    started = time.monotonic()
+    index = QuantizedVectorIndex(dims=args.dims, n_probe=args.nprobe, train_min=min(args.n, 2000))
+    for start in range(0, args.n, args.sync_batch):                     # incremental sync, as the write paths do
+        index.upsert(ids[start:start + args.sync_batch], x[start:start + args.sync_batch])
+    build_s = time.monotonic() - started
+
+    vectors = {node_id: x[i] for i, node_id in enumerate(ids)}
+    engine = LocalSimilarityEngine(index, encode=lambda text: queries[int(text)], rescore=exact_rescorer(vectors),
+                                   candidates=args.candidates)
+    row_of = {node_id: i for i, node_id in enumerate(ids)}
+
+    ann_hits = rescored_hits = 0
+    ann_lat, engine_lat, exact_lat = LatencyWindow(), LatencyWindow(), LatencyWindow()
+    for qi, q in enumerate(queries):
+        started = time.monotonic()
+        ann = index.search(q, args.k)
+        ann_lat.add_many([time.monotonic() - started])
+        ann_hits += len({row_of[i] for i, _ in ann} & truth[qi])
+
+        started = time.monotonic()
+        rows = engine.search(str(qi), args.k, min_score=-1.0)
+        engine_lat.add_many([time.monotonic() - started])
+        rescored_hits += len({row_of[r["id"]] for r in rows} & truth[qi])
+
+        started = time.monotonic()
+        scores = x @ q
+        np.argpartition(-scores, args.k - 1)[:args.k]
+        exact_lat.add_many([time.monotonic() - started])
+
+    total = args.k * len(queries)
+    return {
+        "n": args.n, "dim": args.dim, "dims": args.dims or args.dim, "k": args.k, "nprobe": args.nprobe,
+        "candidates": args.candidates, "build_s": round(build_s, 2),
+        "recall_ann": round(ann_hits / total, 4), "recall_rescored": round(rescored_hits / total, 4),
+        "index_mb": round(index.memory_bytes() / 2**20, 1), "float_mb": round(x.nbytes / 2**20, 1),
+        "ann_p50_ms": round(ann_lat.summary()["p50_ms"], 3), "ann_p99_ms": round(ann_lat.summary()["p99_ms"], 3),
+        "rescored_p50_ms": round(engine_lat.summary()["p50_ms"], 3),
+        "rescored_p99_ms": round(engine_lat.summary()["p99_ms"], 3),
+        "exact_p50_ms": round(exact_lat.summary()["p50_ms"], 3), "exact_p99_ms": round(exact_lat.summary()["p99_ms"], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--dims", type=int, default=256, help="leading dimensions kept in the index (0 = all)")
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--candidates", type=int, default=5, help="candidates rescored per result")
+    parser.add_argument("--sync-batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
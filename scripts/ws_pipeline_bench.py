@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Frame-to-Redis latency benchmark for the live websocket clients.
+
+Replays a recorded burst (utils/ws_replay.py JSONL format) from a local fake
+websocket server into SECWebSocket or BenzingaNewsWebSocket and measures, per
+filing / news item, the time from the server sending the frame to the item being
+stored in Redis. Runs the inline path (ENABLE_WS_FRAME_PIPELINE off) and/or the
+receive/process pipeline (on) against the same recording.
+
+Writes go to a separate Redis database (--redis-db, default 15); pass --flush to
+empty it before each run.
+
+Usage:
+    python scripts/ws_pipeline_bench.py --feed sec  --recording sec_open_burst.jsonl --mode both --flush
+    python scripts/ws_pipeline_bench.py --feed sec  --synthetic 2000 --burst-size 200 --mode pipeline
+    python scripts/ws_pipeline_bench.py --feed news --recording bz_open_burst.jsonl --speed 0
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import feature_flags
+from utils.log_config import setup_logging
+from utils.ws_pipeline import LatencyWindow
+from utils.ws_replay import ReplayWebSocketServer, load_recording
+
+log_file = setup_logging(name="ws_pipeline_bench")
+logger = logging.getLogger(__name__)
+
+
+def synthetic_sec_frames(n, burst_size, burst_gap):
+    """n one-filing frames in bursts of burst_size, burst_gap seconds apart."""
+    frames = []
+    for i in range(n):
+        accession = f"9999999999-26-{i:06d}"
+        filing = {"id": f"bench{i}", "accessionNo": accession, "cik": "320193", "ticker": "AAPL",
+                  "formType": "8-K", "filedAt": "2026-01-29T16:30:00-05:00", "companyName": "APPLE INC",
+                  "linkToHtml": f"https://www.sec.gov/Archives/edgar/data/320193/{accession}-index.htm",
+                  "linkToFilingDetails": f"https://www.sec.gov/Archives/edgar/data/320193/{accession}.htm",
+                  "entities": [{"cik": "320193", "companyName": "APPLE INC", "ticker": "AAPL"}],
+                  "documentFormatFiles": [], "dataFiles": [], "items": ["Item 2.02"]}
+        frames.append(((i // burst_size) * burst_gap, json.dumps([filing])))
+    return frames
+
+
+def frame_ids(feed, frame):
+    """Item ids a frame should produce in Redis (accessionNo / news content id)."""
+    if frame.isdigit():
+        return []
+    data = json.loads(frame)
+    if feed == "sec":
+        return [f.get("accessionNo") for f in data]
+    return [str(data.get("data", {}).get("content", {}).get("id"))]
+
+
+def instrument(redis_client, stored_at):
+    """Record the monotonic time each item reached Redis (single and batch writers)."""
+    def wrap(method, id_of, batch):
+        def wrapped(items, *args, **kwargs):
+            result = method(items, *args, **kwargs)
+            now = time.monotonic()
+            for item, ok in (zip(items, result) if batch else [(items, result)]):
+                if ok:
+                    stored_at.setdefault(id_of(item), now)
+            return result
+        return wrapped
+
+    redis_client.set_filing = wrap(redis_client.set_filing, lambda f: f.accessionNo, False)
+    redis_client.set_filings_batch = wrap(redis_client.set_filings_batch, lambda f: f.accessionNo, True)
+    redis_client.set_news = wrap(redis_client.set_news, lambda n: n.id, False)
+    redis_client.set_news_live_batch = wrap(redis_client.set_news_live_batch, lambda n: n.id, True)
+
+
+def run(feed, frames, use_pipeline, args):
+    from redisDB.redisClasses import RedisClient
+    from redisDB.redis_constants import RedisKeys
+
+    feature_flags.ENABLE_LIVE_DATA = True
+    feature_flags.ENABLE_WS_FRAME_PIPELINE = use_pipeline
+    source = RedisKeys.SOURCE_REPORTS if feed == "sec" else RedisKeys.SOURCE_NEWS
+    redis_client = RedisClient(db=args.redis_db, prefix=RedisKeys.get_prefixes(source)['live'], source_type=source)
+    if args.flush:
+        redis_client.client.flushdb()
+    stored_at = {}
+    instrument(redis_client, stored_at)
+
+    if feed == "sec":
+        from secReports.sec_websocket import SECWebSocket
+        client = SECWebSocket(api_key="bench", redis_client=redis_client)
+    else:
+        from benzinga import bz_websocket
+        bz_websocket.ENABLE_LIVE_DATA = True
+        client = bz_websocket.BenzingaNewsWebSocket(api_key="bench", redis_client=redis_client)
+
+    expected = [(i, item_id) for i, (_, frame) in enumerate(frames) for item_id in frame_ids(feed, frame)]
+    server = ReplayWebSocketServer(frames, speed=args.speed, heartbeat_every=1.0).start()
+    client.url = server.url
+    thread = threading.Thread(target=client.connect, daemon=True)
+    started = time.monotonic()
+    thread.start()
+
+    server.replay_done.wait(timeout=args.timeout)
+    deadline = time.monotonic() + args.timeout
+    while len(stored_at) < len({item_id for _, item_id in expected}) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    elapsed = time.monotonic() - started
+    client.disconnect()
+    server.stop()
+
+    latency = LatencyWindow(size=len(expected) or 1)
+    latency.add_many([stored_at[item_id] - server.sent_at[i] for i, item_id in expected
+                      if item_id in stored_at and i < len(server.sent_at)])
+    summary = latency.summary()
+    summary.update(mode="pipeline" if use_pipeline else "inline", frames=len(frames),
+                   expected_items=len(expected), stored_items=len(stored_at), elapsed_s=round(elapsed, 2),
+                   pings_answered=server.pings, connections=server.connections)
+    if use_pipeline and client._pipeline:
+        snap = client._pipeline.snapshot()
+        summary.update({k: snap[k] for k in ("dropped", "overflows", "max_depth", "batches", "failed_frames")})
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feed", choices=["sec", "news"], default="sec")
+    parser.add_argument("--recording", help="JSONL recording ({t, frame} per line)")
+    parser.add_argument("--synthetic", type=int, default=0, help="SEC only: number of synthetic one-filing frames")
+    parser.add_argument("--burst-size", type=int, default=200)
+    parser.add_argument("--burst-gap", type=float, default=1.0)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier, 0 = back to back")
+    parser.add_argument("--mode", choices=["inline", "pipeline", "both"], default="both")
+    parser.add_argument("--redis-db", type=int, default=15)
+    parser.add_argument("--flush", action="store_true", help="FLUSHDB the bench Redis database before each run")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    if args.recording:
+        frames = load_recording(args.recording)
+    elif args.synthetic and args.feed == "sec":
+        frames = synthetic_sec_frames(args.synthetic, args.burst_size, args.burst_gap)
+    else:
+        parser.error("--recording is required (--synthetic is available for --feed sec)")
+    if args.redis_db == 0 and args.flush:
+        parser.error("refusing to --flush Redis db 0")
+
+    modes = [False, True] if args.mode == "both" else [args.mode == "pipeline"]
+    for use_pipeline in modes:
+        summary = run(args.feed, frames, use_pipeline, args)
+        print(json.dumps(summary, indent=2))
+        logger.info(f"ws_pipeline_bench {args.feed}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+Shared fetch layer for SEC section extraction and document/exhibit downloads.
+
+One SecFetcher per process (get_sec_fetcher) owns:
+  * a single keep-alive requests.Session (pooled connections to sec.gov and
+    api.sec-api.io instead of a new TCP/TLS handshake per exhibit);
+  * Redis-backed token buckets (utils/rate_limit.py) so every enricher process
+    shares one budget for sec.gov and one for the sec-api extractor, replacing
+    the fixed per-call time.sleep(0.1);
+  * per-request deadlines enforced while streaming the body, so no
+    single-thread executor is spun up per call just to impose a timeout;
+  * a content-addressed on-disk cache: a request key (kind + url + section)
+    points at a gzip blob named by the sha256 of its content, so reprocessing
+    a filing never refetches and identical documents are stored once. Blob
+    bytes are bounded; the least recently used blobs are pruned past the bound;
+  * a shared thread pool for fan-out (10-K/10-Q sections, exhibits).
+
+Callers keep their own parsing/cleaning; the fetcher returns raw text.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+EXTRACTOR_ENDPOINT = "https://api.sec-api.io/extractor"
+SEC_HEADERS = {
+    'User-Agent': 'EventTrader research.bot@example.com',
+    'Accept-Encoding': 'gzip, deflate',
+    'Host': 'www.sec.gov',
+}
+_CHUNK = 64 * 1024
+
+
+class FetchTimeout(Exception):
+    """The request's deadline passed before the body was fully read."""
+
+
+class ContentCache:
+    """refs/<kk>/<request-key> -> content sha256; blobs/<hh>/<sha256>.gz -> text.
+
+    With max_bytes set, a put that takes the blobs past it prunes the least
+    recently read/written blobs (by mtime) down to 90% and drops their refs.
+    The running total is per process; each prune rescans the directory, so
+    several processes sharing it converge on the real size."""
+
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._bytes = sum(size for _, _, size in self._blobs()) if max_bytes else 0
+
+    @staticmethod
+    def request_key(*parts: str) -> str:
+        return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.root, "refs", key[:2], key)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.gz")
+
+    def _blobs(self):
+        """(mtime, path, size) of every blob currently on disk."""
+        found = []
+        for dirpath, _, files in os.walk(os.path.join(self.root, "blobs")):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((st.st_mtime, path, st.st_size))
+        return found
+
+    def _touch(self, path: str) -> None:
+        if self.max_bytes:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Cached text for key; None if absent or its ref is older than max_age seconds."""
+        try:
+            ref = self._ref_path(key)
+            if max_age is not None and time.time() - os.path.getmtime(ref) > max_age:
+                return None
+            with open(ref, "r") as fh:
+                digest = fh.read().strip()
+            blob = self._blob_path(digest)
+            with gzip.open(blob, "rb") as fh:
+                text = fh.read().decode("utf-8")
+            self._touch(blob)
+            return text
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Cache read error for {key}: {e}")
+            return None
+
+    def put(self, key: str, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._blob_path(digest)
+        if os.path.exists(blob):
+            self._touch(blob)
+        else:
+            compressed = gzip.compress(data, compresslevel=6)
+            self._atomic_write(blob, compressed)
+            if self.max_bytes:
+                with self._lock:
+                    self._bytes += len(compressed)
+                    if self._bytes > self.max_bytes:
+                        self._prune()
+        self._atomic_write(self._ref_path(key), digest.encode("ascii"))
+        return digest
+
+    def _prune(self) -> None:
+        """Drop least recently used blobs down to 90% of max_bytes (caller holds _lock)."""
+        blobs = sorted(self._blobs())
+        total = sum(size for _, _, size in blobs)
+        target = int(self.max_bytes * 0.9)
+        removed = set()
+        for _, path, size in blobs:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.add(os.path.basename(path)[:-len(".gz")])
+        self._bytes = total
+        if not removed:
+            return
+        for dirpath, _, files in os.walk(os.path.join(self.root, "refs")):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                try:
+                    with open(path, "r") as fh:
+                        if fh.read().strip() in removed:
+                            os.remove(path)
+                except OSError:
+                    continue
+        logger.info(f"Pruned {len(removed)} cached blobs from {self.root} ({total} bytes kept)")
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+
+class SecFetcher:
+    """Pooled, rate-limited, deadline-bounded, cached fetches of SEC content."""
+
+    def __init__(self, api_key: Optional[str], cache_dir: Optional[str] = None, redis_client=None,
+                 cache_max_bytes: Optional[int] = None, pool_size: int = 16, workers: int = 8, sec_rate: float = 8.0,
+                 extractor_rate: float = 10.0, session: Optional[requests.Session] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.api_key = api_key
+        self.cache = ContentCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.session = session or self._new_session(pool_size)
+        self.clock = clock
+        self.sleep = sleep
+        self.sec_bucket = TokenBucket("sec.gov", sec_rate, redis_client=redis_client, clock=clock, sleep=sleep)
+        self.extractor_bucket = TokenBucket("sec-api:extractor", extractor_rate, redis_client=redis_client,
+                                            clock=clock, sleep=sleep)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sec-fetch")
+        self.stats = {"requests": 0, "cache_hits": 0, "timeouts": 0, "throttled": 0}
+        self._stats_lock = threading.Lock()              # fan-out threads update stats concurrently
+
+    @staticmethod
+    def _new_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    # ---------------- transport ----------------
+    def _get(self, url: str, deadline: float, params: Optional[dict] = None,
+             headers: Optional[dict] = None) -> requests.Response:
+        """GET with the whole exchange (connect + body) bounded by deadline (clock() time)."""
+        remaining = deadline - self.clock()
+        if remaining <= 0:
+            raise FetchTimeout(url)
+        self._count("requests")
+        resp = self.session.get(url, params=params, headers=headers, stream=True,
+                                timeout=(min(10.0, remaining), remaining))
+        try:
+            chunks = []
+            for chunk in resp.iter_content(_CHUNK):
+                chunks.append(chunk)
+                if self.clock() > deadline:
+                    raise FetchTimeout(url)
+        except BaseException:
+            resp.close()                           # drop a half-read connection instead of pooling it
+            raise
+        # Hand the body back to requests so .text keeps its usual charset handling
+        resp._content = b"".join(chunks)
+        resp._content_consumed = True
+        return resp
+
+    def _cached(self, *parts: str):
+        if not self.cache:
+            return None, None
+        key = ContentCache.request_key(*parts)
+        text = self.cache.get(key)
+        if text is not None:
+            self._count("cache_hits")
+        return key, text
+
+    # ---------------- sec-api extractor ----------------
+    def get_section(self, filing_url: str, section_id: str, return_type: str = "text",
+                    retries: int = 3, processing_retries: int = 3, timeout: float = 90.0) -> Optional[str]:
+        """Raw section text, or None after retries. Same retry schedule as the
+        sec-api guidance: 'processing' and empty bodies back off 500ms * (attempt + 1)."""
+        if not self.api_key:
+            return None
+        key, text = self._cached("section", filing_url, section_id, return_type)
+        if text is not None:
+            return text
+
+        params = {"url": filing_url, "item": section_id, "type": return_type, "token": self.api_key}
+        regular_attempts = processing_attempts = 0
+        while regular_attempts < retries or processing_attempts < processing_retries:
+            deadline = self.clock() + timeout
+            try:
+                if not self.extractor_bucket.acquire(deadline=deadline):
+                    raise FetchTimeout(filing_url)
+                resp = self._get(EXTRACTOR_ENDPOINT, deadline, params=params)
+                if resp.status_code == 429:
+                    self._count("throttled")
+                    raise requests.HTTPError("429 Too Many Requests", response=resp)
+                resp.raise_for_status()
+                content = resp.text
+            except FetchTimeout:
+                self._count("timeouts")
+                regular_attempts += 1
+                logger.warning(f"Timeout extracting section {section_id} (attempt {regular_attempts}/{retries}) after {timeout}s")
+                if regular_attempts < retries:
+                    self.sleep((500 + 500 * regular_attempts) / 1000)
+                    continue
+                break
+            except Exception as e:
+                regular_attempts += 1
+                logger.warning(f"Error extracting section {section_id} (attempt {regular_attempts}/{retries}): {e}")
+                if regular_attempts < retries:
+                    self.sleep((500 + 500 * regular_attempts) / 1000)
+                    continue
+                break
+
+            if content == "processing":
+                processing_attempts += 1
+                if processing_attempts <= processing_retries:
+                    self.sleep((500 + 500 * processing_attempts) / 1000)
+                    continue
+                return None
+            if not content or not content.strip():
+                regular_attempts += 1
+                if regular_attempts < retries:
+                    self.sleep((500 + 500 * regular_attempts) / 1000)
+                    continue
+                return None
+
+            if key:
+                self.cache.put(key, content)
+            return content
+        return None
+
+    # ---------------- sec.gov documents / exhibits ----------------
+    def get_document(self, url: str, timeout: float = 60.0, retries: int = 2) -> str:
+        """Raw text of a sec.gov document. Raises on HTTP error / timeout, like requests.get
+        + raise_for_status did; 429 and 5xx are retried after the bucket's pacing."""
+        key, text = self._cached("document", url)
+        if text is not None:
+            return text
+        deadline = self.clock() + timeout
+        attempt = 0
+        while True:
+            if not self.sec_bucket.acquire(deadline=deadline):
+                raise FetchTimeout(url)
+            try:
+                resp = self._get(url, deadline, headers=SEC_HEADERS)
+            except FetchTimeout:
+                self._count("timeouts")
+                raise
+            if (resp.status_code == 429 or resp.status_code >= 500) and attempt < retries:
+                attempt += 1
+                if resp.status_code == 429:
+                    self._count("throttled")
+                self.sleep(min(1.0 * attempt, max(0.0, deadline - self.clock())))
+                continue
+            resp.raise_for_status()
+            text = resp.text
+            if key and text.strip():
+                self.cache.put(key, text)
+            return text
+
+    # ---------------- fan-out ----------------
+    def fetch_all(self, tasks: Dict[str, Callable[[], object]], timeout: Optional[float] = None) -> Dict[str, object]:
+        """Run callables on the shared pool; results by key for those done within timeout.
+        Stragglers are cancelled if not started (running ones end at their own deadline)."""
+        futures = {self.executor.submit(fn): key for key, fn in tasks.items()}
+        done, pending = futures_wait(futures, timeout=timeout)
+        for f in pending:
+            f.cancel()
+        if pending:
+            logger.warning(f"fetch_all: {len(pending)}/{len(futures)} tasks still running after {timeout}s")
+        results = {}
+        for f in done:
+            try:
+                results[futures[f]] = f.result()
+            except Exception as e:
+                logger.error(f"fetch_all: task {futures[f]} failed: {e}", exc_info=True)
+        return results
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_sec_fetcher(api_key: Optional[str] = None, redis_client=None) -> SecFetcher:
+    """Process-wide fetcher (one connection pool and thread pool per enricher process)."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            from config import feature_flags
+            _fetcher = SecFetcher(
+                api_key,
+                cache_dir=feature_flags.SEC_FETCH_CACHE_DIR,
+                cache_max_bytes=feature_flags.SEC_FETCH_CACHE_MAX_MB * 1024 * 1024,
+                redis_client=redis_client,
+                pool_size=feature_flags.SEC_FETCH_POOL_SIZE,
+                workers=feature_flags.SEC_FETCH_WORKERS,
+                sec_rate=feature_flags.SEC_RATE_LIMIT_PER_SEC,
+                extractor_rate=feature_flags.SEC_API_EXTRACTOR_RATE_PER_SEC,
+            )
+        return _fetcher
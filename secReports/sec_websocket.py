@@ -2,12 +2,14 @@ import websocket
 import json
 import time
 import ssl
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from typing import Optional, Union, Dict
 from redisDB.redisClasses import RedisClient
 import threading
 from .sec_schemas import SECFilingSchema, UnifiedReport
 from .sec_errors import FilingErrorHandler
+from utils.ws_pipeline import pipeline_from_flags
+from utils.lifecycle_trace import trace
 import logging
 
 class SECWebSocket:
@@ -74,6 +76,9 @@ class SECWebSocket:
         
         # Feature flag logging state
         self._feature_flag_logged = False
+        
+        # Receive/process split (None when ENABLE_WS_FRAME_PIPELINE is off)
+        self._pipeline = pipeline_from_flags("sec", self._process_frames)
             
         self.logger.info("=== SEC REPORTS WEBSOCKET INITIALIZED ===")
 
@@ -133,6 +138,9 @@ class SECWebSocket:
             self.heartbeat_thread.start()
             self.logger.info("Started heartbeat monitoring thread")
         
+        if self._pipeline:
+            self._pipeline.start()
+        
         self.logger.info("Starting SEC WebSocket connection...")
         
         while self.should_run:
@@ -303,6 +311,11 @@ class SECWebSocket:
         
         if self.ws:
             self.ws.close()
+        
+        # Let the workers store what was already received
+        if self._pipeline:
+            self._pipeline.stop(timeout=10)
+            self._pipeline.log_stats()
             
         # Wait for heartbeat thread to complete
         if self.heartbeat_thread and self.heartbeat_thread.is_alive():
@@ -351,11 +364,21 @@ class SECWebSocket:
 
     def _on_message(self, ws, message: str):
         """Handle incoming WebSocket message"""
+        received_at = time.monotonic()
         # Check feature flag to avoid unnecessary processing
         from config.feature_flags import ENABLE_LIVE_DATA
         if not ENABLE_LIVE_DATA:
             # Don't log this message for every message received
             return
+        
+        if self._pipeline and not message.isdigit():
+            with self._stats_lock:
+                self.last_message_time = datetime.now(timezone.utc)
+                self.current_retry = 0
+                self.stats['messages_received'] += 1
+            # Parsing, validation and Redis writes run on the pipeline workers (_process_frames)
+            self._pipeline.submit(message)
+            return
             
         with self._stats_lock:
             # Always update message time, even for heartbeats
@@ -387,6 +410,7 @@ class SECWebSocket:
                     unified_filing = self.error_handler.process_filing(filing, raw=False)
                     if unified_filing:
                         self.logger.debug(f"Successfully created UnifiedReport")
+                        trace("reports", unified_filing.accessionNo, "ws_receive", received_at)
                         
                         # Attempt to store in Redis
                         if self.redis_client.set_filing(unified_filing, ex=self.ttl):
@@ -436,6 +460,59 @@ class SECWebSocket:
                 self.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
                 self.error_handler.handle_unexpected_error(e)
 
+    def _process_frames(self, frames) -> int:
+        """Pipeline worker: parse and validate a batch of frames, store their filings in one Redis pipeline"""
+        unified_filings = []
+        last = None  # (frame, filings) of the last frame with filings
+        for frame in frames:
+            try:
+                filings = json.loads(frame.data)
+            except json.JSONDecodeError as je:
+                self.logger.error(f"JSON decode error: {str(je)}", exc_info=True)
+                self.error_handler.handle_json_error(je, frame.data)
+                continue
+            try:
+                self.logger.info(f"Parsed {len(filings)} filings from message")
+                for filing in filings:
+                    unified_filing = self.error_handler.process_filing(filing, raw=False)
+                    if unified_filing:
+                        trace("reports", unified_filing.accessionNo, "ws_receive", frame.received_at)
+                        unified_filings.append(unified_filing)
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            unified_filing.print()
+                    else:
+                        self.logger.error(f"Failed to create UnifiedReport")
+                        self.logger.error(f"Original filing data: {json.dumps(filing, indent=2)}")
+                if filings:
+                    last = (frame, filings)
+            except Exception as e:
+                self.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+                self.error_handler.handle_unexpected_error(e)
+        
+        stored = self.redis_client.set_filings_batch(unified_filings, ex=self.ttl) if unified_filings else []
+        processed_count = sum(1 for ok in stored if ok)
+        if len(stored) > processed_count:
+            self.logger.error(f"Failed to store {len(stored) - processed_count}/{len(stored)} filings in Redis (or already confirmed)")
+        
+        with self._stats_lock:
+            self.stats['messages_processed'] += processed_count
+        
+        # Persist the last message time to Redis (once per batch) - Later remove this
+        if processed_count > 0 and last:
+            frame, filings = last
+            try:
+                received = datetime.now(timezone.utc) - timedelta(seconds=time.monotonic() - frame.received_at)
+                self.redis_client.set_json("admin:reports:last_message_time", {
+                    'timestamp': received.isoformat(),
+                    'accession_no': filings[-1].get('accessionNo', 'unknown'),
+                    'filings_count': len(filings),
+                    'updated_at': datetime.now(timezone.utc).isoformat()
+                })
+            except Exception as e:
+                self.logger.warning(f"Failed to update last message time in Redis: {e}")
+            self._log_stats()
+        return processed_count
+
     def _on_error(self, ws, error):
         """Handle WebSocket error"""
         self.connected = False
@@ -506,6 +583,8 @@ class SECWebSocket:
     def print_stats(self):
         """Print WebSocket statistics (for external calls)"""
         self._log_stats()
+        if self._pipeline:
+            self._pipeline.log_stats()
         
         # Detailed stats for debug level
         if self.logger.isEnabledFor(logging.DEBUG):
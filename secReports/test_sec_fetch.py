@@ -0,0 +1,143 @@
+"""Offline tests for secReports/sec_fetch.py and utils/rate_limit.py (no network, no Redis)."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("requests")
+
+from secReports.sec_fetch import ContentCache, FetchTimeout, SecFetcher  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.t += s
+
+
+class _Resp:
+    def __init__(self, status, body, clock=None, chunk_cost=0.0):
+        self.status_code = status
+        self.body = body.encode("utf-8")
+        self.encoding = "utf-8"
+        self.clock = clock
+        self.chunk_cost = chunk_cost
+        self.closed = False
+
+    def iter_content(self, size):
+        for i in range(0, max(len(self.body), 1), 4):
+            if self.clock:
+                self.clock.t += self.chunk_cost
+            yield self.body[i:i + 4]
+
+    def close(self):
+        self.closed = True
+
+    @property
+    def text(self):
+        return self._content.decode(self.encoding)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, stream=False, timeout=None):
+        self.calls.append((url, params, headers))
+        return self.responses.pop(0)
+
+
+def _fetcher(tmp_path, responses, clock=None):
+    clock = clock or _Clock()
+    session = _Session(responses)
+    f = SecFetcher("key", cache_dir=str(tmp_path), session=session, workers=2,
+                   sec_rate=1000, extractor_rate=1000, clock=clock, sleep=clock.sleep)
+    return f, session, clock
+
+
+def test_token_bucket_local_paces_to_rate():
+    clock = _Clock()
+    bucket = TokenBucket("t", rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    for _ in range(6):
+        assert bucket.acquire()
+    assert clock.t == pytest.approx(2.0)           # 2 burst + 4 at 2/s
+    assert not bucket.acquire(deadline=clock.t + 0.1)
+
+
+def test_content_cache_dedups_blobs(tmp_path):
+    cache = ContentCache(str(tmp_path))
+    k1, k2 = ContentCache.request_key("document", "a"), ContentCache.request_key("document", "b")
+    assert cache.get(k1) is None
+    assert cache.put(k1, "same body") == cache.put(k2, "same body")
+    assert cache.get(k2) == "same body"
+    blobs = [f for _, _, fs in os.walk(tmp_path / "blobs") for f in fs]
+    assert len(blobs) == 1
+
+
+def test_content_cache_prunes_least_recently_used(tmp_path):
+    cache = ContentCache(str(tmp_path), max_bytes=10 ** 6)
+    keys = [ContentCache.request_key("document", str(i)) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        blob = cache._blob_path(cache.put(key, os.urandom(1000).hex()))
+        os.utime(blob, (i, i))
+    cache.max_bytes = int(cache._bytes * 1.13)         # room for three blobs, not four
+    assert cache.get(keys[0]) is not None               # read: now the most recent
+    cache.put(keys[3], os.urandom(1000).hex())
+    assert cache.get(keys[1]) is None and not os.path.exists(cache._ref_path(keys[1]))
+    assert all(cache.get(k) is not None for k in (keys[0], keys[2], keys[3]))
+    assert sum(size for _, _, size in cache._blobs()) <= cache.max_bytes
+
+
+def test_get_section_retries_processing_then_caches(tmp_path):
+    f, session, clock = _fetcher(tmp_path, [_Resp(200, "processing"), _Resp(200, ""),
+                                            _Resp(200, "Item 1A text")])
+    assert f.get_section("https://sec.gov/x.htm", "1A") == "Item 1A text"
+    assert len(session.calls) == 3
+    assert session.calls[0][1]["item"] == "1A"
+    assert clock.slept == [1.0, 1.0]               # processing #1, empty #1
+    assert f.get_section("https://sec.gov/x.htm", "1A") == "Item 1A text"
+    assert len(session.calls) == 3 and f.stats["cache_hits"] == 1
+
+
+def test_get_section_deadline_aborts_slow_body(tmp_path):
+    clock = _Clock()
+    slow = [_Resp(200, "x" * 40, clock=clock, chunk_cost=1.0) for _ in range(3)]
+    f, session, _ = _fetcher(tmp_path, slow, clock=clock)
+    assert f.get_section("u", "7", retries=3, timeout=5.0) is None
+    assert f.stats["timeouts"] == 3
+    assert all(r.closed for r in slow)
+
+
+def test_get_document_retries_429_and_raises_on_404(tmp_path):
+    f, session, _ = _fetcher(tmp_path, [_Resp(429, ""), _Resp(200, "<html>exhibit</html>"), _Resp(404, "")])
+    assert f.get_document("https://www.sec.gov/ex99.htm") == "<html>exhibit</html>"
+    assert session.calls[0][2]["Host"] == "www.sec.gov"
+    assert f.get_document("https://www.sec.gov/ex99.htm") == "<html>exhibit</html>"   # cached
+    import requests
+    with pytest.raises(requests.HTTPError):
+        f.get_document("https://www.sec.gov/missing.htm")
+
+
+def test_fetch_all_returns_finished_results(tmp_path):
+    f, _, _ = _fetcher(tmp_path, [])
+
+    def boom():
+        raise FetchTimeout("x")
+
+    assert f.fetch_all({"a": lambda: 1, "b": boom, "c": lambda: "c"}, timeout=5) == {"a": 1, "c": "c"}
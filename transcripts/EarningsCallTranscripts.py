@@ -19,6 +19,8 @@ from openai import OpenAI
 import earningscall
 import numpy as np
 from config.feature_flags import SPEAKER_CLASSIFICATION_MODEL
+from config.feature_flags import ENABLE_SPEAKER_ROLE_RESOLVER, SPEAKER_CLASSIFICATION_BATCH_SIZE
+from transcripts.speaker_roles import SpeakerRegistry, SpeakerRoleResolver
 
 
 class EarningsCallProcessor:
@@ -34,7 +36,8 @@ class EarningsCallProcessor:
 
         self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
         self.rate_limiter = ModelRateLimiter()
-        
+        self.speaker_resolver = None
+
         if redis_client:
             self.redis_client = redis_client
             self.universe_data = redis_client.get_stock_universe()
@@ -42,6 +45,12 @@ class EarningsCallProcessor:
         else:
             self.logger.warning("No redis client provided")
 
+        if ENABLE_SPEAKER_ROLE_RESOLVER:
+            registry_client = redis_client.config.client if redis_client else None
+            self.speaker_resolver = SpeakerRoleResolver(self._classify_speaker_batch,
+                                                        SpeakerRegistry(registry_client),
+                                                        batch_size=SPEAKER_CLASSIFICATION_BATCH_SIZE)
+
         self.company_dict = {}
         self.ttl = ttl  # Store TTL for Redis entries
 
@@ -101,7 +110,8 @@ class EarningsCallProcessor:
         self.logger.info(f"Stats: {db_count}/{len(target_date_events)} in database, {ready_count}/{db_count} ready")
         
         final_events = []
-        
+        ready = []
+
         for calendar_event in target_date_events:
             if calendar_event.symbol.upper() not in self.company_dict:
                 self.logger.info(f"{calendar_event.symbol} Not in the database")
@@ -114,18 +124,23 @@ class EarningsCallProcessor:
                 # Create EarningsEvent directly from calendar data
                 from earningscall.event import EarningsEvent
                 earnings_event = EarningsEvent(year=calendar_event.year,quarter=calendar_event.quarter,conference_date=calendar_event.conference_date)
-                
-                try:
-                    result = self.get_single_event(company_obj, earnings_event)
-                    if result:
-                        final_events.extend(result)
-                    else:
-                        self.logger.info(f"No transcript returned for {calendar_event.symbol}")
-                except Exception as e:
-                    self.logger.error(f"Error processing transcript for {calendar_event.symbol}: {e}", exc_info=True)
+                ready.append((calendar_event, company_obj, earnings_event))
             else:
                 self.logger.info(f"Transcript not ready for {calendar_event.symbol}")
 
+        # With the resolver on, speakers of every ready transcript are classified in one batched pass
+        prefetched = self._prefetch_speaker_roles([(c, e) for _, c, e in ready])
+
+        for i, (calendar_event, company_obj, earnings_event) in enumerate(ready):
+            try:
+                result = self.get_single_event(company_obj, earnings_event, *prefetched.get(i, (None, None)))
+                if result:
+                    final_events.extend(result)
+                else:
+                    self.logger.info(f"No transcript returned for {calendar_event.symbol}")
+            except Exception as e:
+                self.logger.error(f"Error processing transcript for {calendar_event.symbol}: {e}", exc_info=True)
+
         return final_events
 
 
@@ -245,22 +260,73 @@ class EarningsCallProcessor:
         now = self.ny_tz.localize(datetime.now())
         
         # Skips events outside the start–end date range or in the future.
+        events = []
         for event in company_obj.events():
             event_date = event.conference_date.astimezone(self.ny_tz)
             if now < event_date or event_date < start_date or event_date > end_date:
                 continue
+            events.append(event)
 
-            results.extend(self.get_single_event(company_obj, event))
+        prefetched = self._prefetch_speaker_roles([(company_obj, event) for event in events])
+        for i, event in enumerate(events):
+            results.extend(self.get_single_event(company_obj, event, *prefetched.get(i, (None, None))))
 
         return results
 
 
+    def _extract_speakers(self, transcript_level3) -> Dict[str, str]:
+        """{speaker name: title} from a level-3 transcript ("Unknown" / "" for missing values)."""
+        speakers = {}
+        for speaker in transcript_level3.speakers:
+            if hasattr(speaker, "speaker_info"):
+                name = getattr(speaker.speaker_info, "name", "Unknown")
+                if name is None:
+                    name = "Unknown"
+                title = getattr(speaker.speaker_info, "title", "")
+                if title is None:
+                    title = ""
+                speakers[name] = title
+        return speakers
+
+
+    def _prefetch_speaker_roles(self, pairs):
+        """Fetch level-3 transcripts for (company_obj, event) pairs and resolve all their
+        speakers in one SpeakerRoleResolver pass. Returns {index: (transcript_level3, roles)};
+        pairs that fail to fetch are left out so get_single_event handles them as before."""
+        if self.speaker_resolver is None or not pairs:
+            return {}
+        fetched = {}
+        for i, (company_obj, event) in enumerate(pairs):
+            try:
+                transcript_level3 = company_obj.get_transcript(event=event, level=3)
+            except Exception as e:
+                self.logger.debug(f"Level-3 prefetch failed for Q{event.quarter} {event.year}: {e}")
+                continue
+            if transcript_level3 and hasattr(transcript_level3, "speakers"):
+                fetched[i] = transcript_level3
+
+        order = list(fetched)
+        roles = self.speaker_resolver.resolve_many(
+            [(self._company_symbol(pairs[i][0]), self._extract_speakers(fetched[i])) for i in order])
+        self.logger.info(f"Speaker roles for {len(order)} transcripts: {self.speaker_resolver.metrics()}")
+        return {i: (fetched[i], r) for i, r in zip(order, roles)}
+
+
+    @staticmethod
+    def _company_symbol(company_obj):
+        try:
+            return company_obj.company_info.symbol
+        except AttributeError:
+            return str(company_obj)
+
 
-    def get_single_event(self, company_obj, event):
+
+    def get_single_event(self, company_obj, event, transcript_level3=None, speaker_roles=None):
         
         """ Retrieve and process transcript data for a single earnings call event.        
             This function can be called directly without going through get_transcripts_by_date_range.
             Make sure to call initialize_api() with your API key before using this function.            
+            transcript_level3 / speaker_roles: already fetched / resolved by _prefetch_speaker_roles.
             Returns: List containing a single transcript data dictionary if successful, empty list otherwise"""
         
         results = []
@@ -292,23 +358,17 @@ class EarningsCallProcessor:
                 "speaker_roles_LLM": {}      # set later using classify_speakers() LLM Calls
             }
             
-            transcript_level3 = company_obj.get_transcript(event=event, level=3)
+            if transcript_level3 is None:
+                transcript_level3 = company_obj.get_transcript(event=event, level=3)
             if not transcript_level3 or not hasattr(transcript_level3, "speakers"):
                 return []
 
             # Extract speakers and titles
-            for speaker in transcript_level3.speakers:
-                if hasattr(speaker, "speaker_info"):
-                    name = getattr(speaker.speaker_info, "name", "Unknown")
-                    if name is None:
-                        name = "Unknown"
-                    title = getattr(speaker.speaker_info, "title", "")
-                    if title is None:
-                        title = ""
-                    result["speakers"][name] = title
+            result["speakers"].update(self._extract_speakers(transcript_level3))
             
             # Classify speakers using LLM to get analyst, executive, or operator roles
-            speaker_roles = self.classify_speakers(result["speakers"])
+            if speaker_roles is None:
+                speaker_roles = self.classify_speakers(result["speakers"], symbol=result["symbol"])
             result["speaker_roles_LLM"] = speaker_roles
             
             # Debug: print all analysts
@@ -531,9 +591,26 @@ class EarningsCallProcessor:
         return transcript_dict
 
 
-    def classify_speakers(self, speakers: Dict[str, str]) -> Dict[str, str]:
+    def classify_speakers(self, speakers: Dict[str, str], symbol: str = None) -> Dict[str, str]:
         """Classify speakers from earnings call as ANALYST, EXECUTIVE, or OPERATOR"""
 
+        if not speakers:
+            return {}
+        if self.speaker_resolver is not None and symbol:
+            return self.speaker_resolver.resolve(symbol, speakers)
+        return self._classify_with_model(speakers)
+
+
+    def _classify_speaker_batch(self, speakers: Dict[str, str]) -> Dict[str, str]:
+        """SpeakerRoleResolver model hook: speakers of several transcripts, keyed "SYMBOL / name"."""
+        return self._classify_with_model(
+            speakers, "Each speaker name is prefixed with the company ticker (TICKER / Name); "
+                      "return the names exactly as given.")
+
+
+    def _classify_with_model(self, speakers: Dict[str, str], instructions: str = "") -> Dict[str, str]:
+        """One structured-output LLM request for {name: title} -> {name: role}."""
+
         if not speakers:
             return {}
         
@@ -552,7 +629,7 @@ class EarningsCallProcessor:
                 model=model,
                 # input=f"Classify these earnings call speakers:\n{speaker_info}",
                 input=[
-            {"role": "system", "content": "Classify each earnings call speaker as exactly one of: ANALYST, EXECUTIVE, or OPERATOR."},
+            {"role": "system", "content": " ".join(filter(None, ["Classify each earnings call speaker as exactly one of: ANALYST, EXECUTIVE, or OPERATOR.", instructions]))},
             {"role": "user", "content": f"Classify these earnings call speakers:\n{speaker_info}"}
                 ],
                 text={
@@ -0,0 +1,192 @@
+"""
+Speaker-role resolution for earnings-call transcripts.
+
+The same executives and analysts show up on a company's call quarter after
+quarter, so most LLM classifications repeat earlier answers. SpeakerRoleResolver
+resolves each (company, speaker, title) in this order and only sends what is
+left to the model:
+
+  1. SpeakerRegistry - the role stored for this company + speaker name, valid
+     while the speaker's title is unchanged (a promoted analyst is re-resolved);
+  2. heuristic_role() - operator lines and titles ending in "Analyst" (broader
+     keyword rules misread "Head of Research" or a buy-side "Chief Investment
+     Officer");
+  3. the company's prior-quarter titles - a new speaker whose exact title was
+     always classified one way for this company (e.g. a broker name);
+  4. the model, with the unresolved speakers of many transcripts in one request
+     (up to batch_size speakers each).
+
+Only model answers are written back to the registry: a heuristic or prior-title
+guess stored there would be re-served for that speaker every quarter and copied
+to every later speaker with the same title. The registry lives in one
+Redis hash per company (admin:speaker_roles:{SYMBOL}); without Redis it is an
+in-process dict. stats / metrics() record where each role came from and the
+model latency.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("ANALYST", "EXECUTIVE", "OPERATOR")
+REGISTRY_KEY_PREFIX = "admin:speaker_roles:"
+
+_OPERATOR_NAMES = {"operator", "conference operator", "moderator"}
+_ANALYST_TITLE = re.compile(r"\banalysts?$", re.I)
+
+
+def heuristic_role(name: str, title: str) -> Optional[str]:
+    """Role when it is unambiguous from the name/title alone, else None."""
+    name_l, title_l = (name or "").strip().lower(), (title or "").strip().lower()
+    if name_l in _OPERATOR_NAMES or title_l in _OPERATOR_NAMES:
+        return "OPERATOR"
+    if _ANALYST_TITLE.search(title_l):
+        return "ANALYST"
+    return None
+
+
+class SpeakerRegistry:
+    """Per-company {speaker name: {role, title}}; Redis hash per company, or in-process."""
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+        self._local: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, symbol: str) -> Dict[str, dict]:
+        symbol = symbol.upper()
+        if self._redis is not None:
+            try:
+                raw = self._redis.hgetall(f"{REGISTRY_KEY_PREFIX}{symbol}") or {}
+                out = {}
+                for name, value in raw.items():
+                    name = name.decode() if isinstance(name, bytes) else name
+                    out[name] = json.loads(value)
+                return out
+            except Exception as e:
+                logger.warning(f"Speaker registry read failed for {symbol} ({e}); using in-process registry")
+                self._redis = None
+        with self._lock:
+            return dict(self._local.get(symbol, {}))
+
+    def store(self, symbol: str, entries: Dict[str, dict]) -> None:
+        if not entries:
+            return
+        symbol = symbol.upper()
+        if self._redis is not None:
+            try:
+                self._redis.hset(f"{REGISTRY_KEY_PREFIX}{symbol}",
+                                 mapping={name: json.dumps(entry) for name, entry in entries.items()})
+                return
+            except Exception as e:
+                logger.warning(f"Speaker registry write failed for {symbol} ({e}); using in-process registry")
+                self._redis = None
+        with self._lock:
+            self._local.setdefault(symbol, {}).update(entries)
+
+
+class SpeakerRoleResolver:
+    """Registry -> heuristics -> prior titles -> batched model call; only model answers are stored."""
+
+    def __init__(self, model: Callable[[Dict[str, str]], Dict[str, str]],
+                 registry: Optional[SpeakerRegistry] = None, batch_size: int = 200,
+                 clock: Callable[[], float] = time.monotonic):
+        """model: {speaker key: title} -> {speaker key: role}; keys are "SYMBOL / name"."""
+        self.model = model
+        self.registry = registry or SpeakerRegistry()
+        self.batch_size = max(1, batch_size)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.stats = {"speakers": 0, "registry_hits": 0, "heuristic_hits": 0, "title_hits": 0,
+                      "model_resolved": 0, "unresolved": 0, "model_requests": 0, "model_seconds": 0.0}
+
+    def _count(self, field: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[field] += amount
+
+    def metrics(self) -> dict:
+        """stats plus the share resolved without the model and mean model latency."""
+        with self._lock:
+            out = dict(self.stats)
+        local = out["registry_hits"] + out["heuristic_hits"] + out["title_hits"]
+        out["hit_rate"] = round(local / out["speakers"], 4) if out["speakers"] else None
+        out["model_latency_s"] = (round(out["model_seconds"] / out["model_requests"], 3)
+                                  if out["model_requests"] else None)
+        return out
+
+    def resolve(self, symbol: str, speakers: Dict[str, str]) -> Dict[str, str]:
+        """{name: title} for one transcript -> {name: role}."""
+        return self.resolve_many([(symbol, speakers)])[0]
+
+    def resolve_many(self, transcripts: Iterable[Tuple[str, Dict[str, str]]]) -> List[Dict[str, str]]:
+        """One {name: role} per (symbol, {name: title}), with a single model pass for all of them."""
+        transcripts = [((symbol or "").upper(), speakers or {}) for symbol, speakers in transcripts]
+        results: List[Dict[str, str]] = [{} for _ in transcripts]
+        pending: Dict[str, List[Tuple[int, str, str]]] = {}        # model key -> [(transcript, symbol, name)]
+        titles: Dict[str, str] = {}
+        learned: Dict[str, Dict[str, dict]] = {}
+        registries: Dict[str, Dict[str, dict]] = {}
+
+        for i, (symbol, speakers) in enumerate(transcripts):
+            if symbol not in registries:
+                registries[symbol] = self.registry.load(symbol)
+            known = registries[symbol]
+            by_title = self._title_roles(known)
+            for name, title in speakers.items():
+                title = title or ""
+                self._count("speakers")
+                entry = known.get(name)
+                if entry and entry.get("title", "") == title and entry.get("role") in ROLES:
+                    results[i][name] = entry["role"]
+                    self._count("registry_hits")
+                    continue
+                role = heuristic_role(name, title)
+                source = "heuristic_hits"
+                if role is None and title:
+                    role, source = by_title.get(title.lower()), "title_hits"
+                if role:
+                    results[i][name] = role             # a guess: used here, never persisted
+                    self._count(source)
+                    continue
+                key = f"{symbol} / {name}"
+                pending.setdefault(key, []).append((i, symbol, name))
+                titles[key] = title
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.batch_size):
+            batch = {key: titles[key] for key in keys[start:start + self.batch_size]}
+            for key, role in self._ask_model(batch).items():
+                for i, symbol, name in pending.pop(key, []):
+                    results[i][name] = role
+                    self._count("model_resolved")
+                    learned.setdefault(symbol, {})[name] = {"role": role, "title": titles[key]}
+        self._count("unresolved", sum(len(v) for v in pending.values()))
+
+        for symbol, entries in learned.items():
+            self.registry.store(symbol, entries)
+        return results
+
+    @staticmethod
+    def _title_roles(known: Dict[str, dict]) -> Dict[str, str]:
+        """Exact prior titles (lower-cased) that always mapped to one role for this company."""
+        seen: Dict[str, set] = {}
+        for entry in known.values():
+            if entry.get("title") and entry.get("role") in ROLES:
+                seen.setdefault(entry["title"].lower(), set()).add(entry["role"])
+        return {title: roles.pop() for title, roles in seen.items() if len(roles) == 1}
+
+    def _ask_model(self, batch: Dict[str, str]) -> Dict[str, str]:
+        started = self.clock()
+        try:
+            answer = self.model(batch) or {}
+        except Exception as e:
+            logger.error(f"Speaker classification request failed for {len(batch)} speakers: {e}", exc_info=True)
+            answer = {}
+        finally:
+            self._count("model_requests")
+            self._count("model_seconds", self.clock() - started)
+        return {key: role for key, role in answer.items() if key in batch and role in ROLES}
@@ -0,0 +1,121 @@
+"""Offline tests for transcripts/speaker_roles.py (stubbed model, no Redis, no network)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcripts.speaker_roles import SpeakerRegistry, SpeakerRoleResolver, heuristic_role  # noqa: E402
+
+
+class StubModel:
+    def __init__(self, answers):
+        self.answers = answers
+        self.requests = []
+
+    def __call__(self, batch):
+        self.requests.append(dict(batch))
+        return {key: self.answers[key.split(" / ", 1)[1]] for key in batch if key.split(" / ", 1)[1] in self.answers}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def hgetall(self, key):
+        return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+
+AAPL_Q1 = {"Operator": "", "Tim Cook": "CEO", "Kevan Parekh": "Chief Financial Officer",
+           "Erik Woodring": "Morgan Stanley", "Suhasini Chandramouli": "Director of IR"}
+MSFT_Q1 = {"Operator": "", "Satya Nadella": "Chairman and CEO", "Keith Weiss": "Morgan Stanley Analyst",
+           "Brett Iversen": "VP, Investor Relations"}
+ANSWERS = {"Erik Woodring": "ANALYST", "Suhasini Chandramouli": "EXECUTIVE", "Keith Weiss": "ANALYST",
+           "Amit Daryanani": "ANALYST", "Tim Cook": "EXECUTIVE", "Kevan Parekh": "EXECUTIVE",
+           "Satya Nadella": "EXECUTIVE", "Brett Iversen": "EXECUTIVE"}
+
+
+def test_heuristics_are_conservative():
+    assert heuristic_role("Operator", "") == "OPERATOR"
+    assert heuristic_role("Jane Doe", "Equity Research Analyst") == "ANALYST"
+    assert heuristic_role("Jo Doe", "Goldman Sachs") is None
+    assert heuristic_role("John Doe", "Executive Vice President and CFO") is None
+    # keyword matches that would be wrong: an R&D executive, a research director, a buy-side questioner
+    assert heuristic_role("Jo Doe", "Head of Research and Development") is None
+    assert heuristic_role("Jo Doe", "Director, Research") is None
+    assert heuristic_role("Jo Doe", "Chief Investment Officer, Acme Capital") is None
+
+
+def test_many_transcripts_share_one_model_request():
+    model = StubModel(ANSWERS)
+    resolver = SpeakerRoleResolver(model, SpeakerRegistry())
+    aapl, msft = resolver.resolve_many([("aapl", AAPL_Q1), ("MSFT", MSFT_Q1)])
+    assert aapl == {"Operator": "OPERATOR", "Tim Cook": "EXECUTIVE", "Kevan Parekh": "EXECUTIVE",
+                    "Erik Woodring": "ANALYST", "Suhasini Chandramouli": "EXECUTIVE"}
+    assert msft == {"Operator": "OPERATOR", "Satya Nadella": "EXECUTIVE", "Keith Weiss": "ANALYST",
+                    "Brett Iversen": "EXECUTIVE"}
+    assert model.requests == [{"AAPL / Tim Cook": "CEO", "AAPL / Kevan Parekh": "Chief Financial Officer",
+                               "AAPL / Erik Woodring": "Morgan Stanley",
+                               "AAPL / Suhasini Chandramouli": "Director of IR",
+                               "MSFT / Satya Nadella": "Chairman and CEO",
+                               "MSFT / Brett Iversen": "VP, Investor Relations"}]
+
+
+def test_registry_and_prior_titles_skip_the_model_next_quarter():
+    redis = FakeRedis()
+    model = StubModel(ANSWERS)
+    SpeakerRoleResolver(model, SpeakerRegistry(redis)).resolve("AAPL", AAPL_Q1)
+    assert "admin:speaker_roles:AAPL" in redis.hashes
+
+    model.requests.clear()
+    resolver = SpeakerRoleResolver(model, SpeakerRegistry(redis))          # fresh process, same Redis
+    q2 = dict(AAPL_Q1, **{"Amit Daryanani": "Morgan Stanley", "New Analyst": "Evercore ISI"})
+    roles = resolver.resolve("AAPL", q2)
+    assert roles["Amit Daryanani"] == "ANALYST"                            # prior-quarter title
+    assert "New Analyst" not in roles                                      # model had no answer
+    assert model.requests == [{"AAPL / New Analyst": "Evercore ISI"}]
+    m = resolver.metrics()
+    assert (m["speakers"], m["registry_hits"], m["title_hits"], m["unresolved"]) == (7, 4, 1, 1)
+    assert m["hit_rate"] == round(6 / 7, 4) and m["model_requests"] == 1
+
+
+def test_changed_title_is_re_resolved():
+    model = StubModel({"Erik Woodring": "EXECUTIVE"})
+    registry = SpeakerRegistry()
+    registry.store("AAPL", {"Erik Woodring": {"role": "ANALYST", "title": "Morgan Stanley"}})
+    resolver = SpeakerRoleResolver(model, registry)
+    assert resolver.resolve("AAPL", {"Erik Woodring": "Head of Strategy"}) == {"Erik Woodring": "EXECUTIVE"}
+    assert registry.load("AAPL")["Erik Woodring"] == {"role": "EXECUTIVE", "title": "Head of Strategy"}
+
+
+def test_batches_are_capped_and_model_failures_leave_speakers_unresolved():
+    calls = []
+
+    def flaky(batch):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            raise RuntimeError("timeout")
+        return {key: "ANALYST" for key in batch}
+
+    resolver = SpeakerRoleResolver(flaky, batch_size=2)
+    speakers = {f"Person {i}": f"Bank {i}" for i in range(5)}
+    roles = resolver.resolve("XYZ", speakers)
+    assert calls == [2, 2, 1]
+    assert sorted(roles) == ["Person 0", "Person 1", "Person 4"]
+    assert resolver.metrics()["unresolved"] == 2
+    assert "Person 2" not in resolver.registry.load("XYZ")
+
+
+def test_only_model_answers_are_persisted():
+    redis = FakeRedis()
+    registry = SpeakerRegistry(redis)
+    registry.store("ACME", {"Ann Lee": {"role": "ANALYST", "title": "Acme Capital"}})
+    model = StubModel({"Raj Rao": "EXECUTIVE"})
+    roles = SpeakerRoleResolver(model, registry).resolve(
+        "ACME", {"Operator": "", "Kim Park": "Equity Research Analyst", "Bo Chan": "Acme Capital",
+                 "Raj Rao": "Head of Research and Development"})
+    assert roles == {"Operator": "OPERATOR", "Kim Park": "ANALYST", "Bo Chan": "ANALYST", "Raj Rao": "EXECUTIVE"}
+    # the heuristic and prior-title guesses are not written back, so they cannot spread to later speakers
+    assert set(registry.load("ACME")) == {"Ann Lee", "Raj Rao"}
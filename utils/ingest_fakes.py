@@ -0,0 +1,1024 @@
+"""
+In-process fakes for running the ingestion path hermetically.
+
+    FakeRedis           - thread-safe in-memory Redis (strings, lists with blocking pops,
+                          hashes, sets, sorted sets, pipelines, pub/sub). Records the
+                          monotonic time every tracking:meta:* lifecycle field is first
+                          written, so stage latencies come from the real code paths.
+    install_fake_redis  - makes redis.Redis()/ConnectionPool() resolve to one FakeRedis,
+                          whether or not redis-py is installed.
+    FakeVendorServer    - local HTTP server answering vendor REST calls (Polygon,
+                          Benzinga, sec-api / sec.gov) from route handlers or recorded
+                          responses, at a configurable response rate and latency.
+    RecordingNeo4jManager
+                        - Neo4jManager stand-in whose driver records every statement
+                          (with an optional per-statement write latency) instead of
+                          talking to Neo4j.
+
+Used by scripts/ingestion_bench.py; utils/ws_replay.py provides the websocket side.
+Standard library only.
+"""
+import bisect
+import fnmatch
+import json
+import logging
+import sys
+import threading
+import time
+import types
+import zlib
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+LIFECYCLE_PREFIX = "tracking:meta:"
+
+
+def _s(value):
+    """Store values the way a decode_responses=True client returns them."""
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return value if isinstance(value, str) else str(value)
+
+
+class FakePubSub:
+    def __init__(self, server: "FakeRedis"):
+        self._server = server
+        self._messages = deque()
+        self._ready = threading.Condition()
+        self.channels = set()
+        self.patterns = set()
+
+    def subscribe(self, *channels):
+        for channel in channels:
+            self.channels.add(channel)
+            self._deliver({"type": "subscribe", "pattern": None, "channel": channel, "data": len(self.channels)})
+        self._server._add_subscriber(self)
+
+    def psubscribe(self, *patterns):
+        for pattern in patterns:
+            self.patterns.add(pattern)
+            self._deliver({"type": "psubscribe", "pattern": None, "channel": pattern, "data": len(self.patterns)})
+        self._server._add_subscriber(self)
+
+    def unsubscribe(self, *channels):
+        for channel in channels or list(self.channels):
+            self.channels.discard(channel)
+
+    def punsubscribe(self, *patterns):
+        for pattern in patterns or list(self.patterns):
+            self.patterns.discard(pattern)
+
+    def close(self):
+        self.channels.clear()
+        self.patterns.clear()
+        self._server._remove_subscriber(self)
+
+    reset = close
+
+    def _matches(self, channel) -> Optional[str]:
+        if channel in self.channels:
+            return ""
+        for pattern in self.patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                return pattern
+        return None
+
+    def _deliver(self, message):
+        with self._ready:
+            self._messages.append(message)
+            self._ready.notify()
+
+    def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        deadline = time.monotonic() + (timeout or 0.0)
+        with self._ready:
+            while True:
+                while self._messages:
+                    message = self._messages.popleft()
+                    if ignore_subscribe_messages and message["type"] not in ("message", "pmessage"):
+                        continue
+                    return message
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._ready.wait(remaining)
+
+    def listen(self):
+        while self.channels or self.patterns:
+            message = self.get_message(timeout=1.0)
+            if message:
+                yield message
+
+
+class FakePipeline:
+    """Buffers commands; execute() applies them under the server lock and returns their results."""
+
+    def __init__(self, server: "FakeRedis", transaction: bool = True):
+        self._server = server
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not callable(getattr(self._server, name, None)):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self, raise_on_error=True):
+        commands, self._commands = self._commands, []
+        with self._server._lock:
+            return [getattr(self._server, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    def reset(self):
+        self._commands = []
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+
+class FakeRedis:
+    """
+    One in-memory Redis shared by every client that connects to it (all databases alike).
+
+    Values are stored and returned as str (decode_responses=True). Expiry is honoured
+    lazily on access. lifecycle[meta_key][field] holds the monotonic time a
+    tracking:meta:* field was first written; command_counts counts calls per command.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._data: Dict[str, object] = {}
+        self._expires: Dict[str, float] = {}
+        self._subscribers: List[FakePubSub] = []
+        self._blocked: Dict[str, int] = defaultdict(int)
+        self.lifecycle: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.command_counts: Dict[str, int] = defaultdict(int)
+        self.published = 0
+
+    # ---- client surface ----
+    def pipeline(self, transaction=True, shard_hint=None):
+        return FakePipeline(self, transaction)
+
+    def pubsub(self, **kwargs):
+        return FakePubSub(self)
+
+    def ping(self):
+        return True
+
+    def close(self):
+        pass
+
+    def _add_subscriber(self, sub):
+        with self._lock:
+            if sub not in self._subscribers:
+                self._subscribers.append(sub)
+
+    def _remove_subscriber(self, sub):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    # ---- internals ----
+    def _count(self, command):
+        self.command_counts[command] += 1
+
+    def _live(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and self.clock() >= expires:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return self._data.get(key)
+
+    def _container(self, key, factory):
+        value = self._live(key)
+        if value is None:
+            value = self._data[key] = factory()
+        return value
+
+    def _drop_if_empty(self, key):
+        value = self._data.get(key)
+        if value is not None and not isinstance(value, str) and not value:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    # ---- keys ----
+    def get(self, key):
+        with self._lock:
+            self._count("get")
+            value = self._live(key)
+            return value if isinstance(value, str) else None
+
+    def mget(self, keys, *args):
+        keys = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [self.get(k) for k in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False, **kwargs):
+        with self._lock:
+            self._count("set")
+            exists = self._live(key) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[key] = _s(value)
+            self._expires.pop(key, None)
+            if ex:
+                self._expires[key] = self.clock() + float(ex)
+            elif px:
+                self._expires[key] = self.clock() + float(px) / 1000.0
+            return True
+
+    def setex(self, key, time_s, value):
+        return self.set(key, value, ex=time_s)
+
+    def setnx(self, key, value):
+        return bool(self.set(key, value, nx=True))
+
+    def incrby(self, key, amount=1):
+        with self._lock:
+            self._count("incrby")
+            value = int(self._live(key) or 0) + int(amount)
+            self._data[key] = str(value)
+            return value
+
+    def incr(self, key, amount=1):
+        return self.incrby(key, amount)
+
+    def delete(self, *keys):
+        with self._lock:
+            self._count("delete")
+            removed = 0
+            for key in keys:
+                if self._live(key) is not None:
+                    removed += 1
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def exists(self, *keys):
+        with self._lock:
+            self._count("exists")
+            return sum(1 for k in keys if self._live(k) is not None)
+
+    def expire(self, key, seconds):
+        with self._lock:
+            self._count("expire")
+            if self._live(key) is None:
+                return False
+            self._expires[key] = self.clock() + float(seconds)
+            return True
+
+    def ttl(self, key):
+        with self._lock:
+            if self._live(key) is None:
+                return -2
+            expires = self._expires.get(key)
+            return -1 if expires is None else max(0, int(round(expires - self.clock())))
+
+    def persist(self, key):
+        with self._lock:
+            return self._expires.pop(key, None) is not None
+
+    def type(self, key):
+        with self._lock:
+            value = self._live(key)
+            return {str: "string", list: "list", dict: "hash", set: "set", _ZSet: "zset"}.get(type(value), "none")
+
+    def keys(self, pattern="*"):
+        with self._lock:
+            self._count("keys")
+            return [k for k in list(self._data) if fnmatch.fnmatchcase(k, pattern) and self._live(k) is not None]
+
+    def scan_iter(self, match=None, count=None, _type=None):
+        return iter(self.keys(match or "*"))
+
+    def dbsize(self):
+        with self._lock:
+            return len(self.keys())
+
+    def flushdb(self, *args, **kwargs):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    flushall = flushdb
+
+    # ---- lists ----
+    def _push(self, key, values, left):
+        with self._changed:
+            items = self._container(key, list)
+            for value in values:
+                if left:
+                    items.insert(0, _s(value))
+                else:
+                    items.append(_s(value))
+            self._changed.notify_all()
+            return len(items)
+
+    def lpush(self, key, *values):
+        self._count("lpush")
+        return self._push(key, values, left=True)
+
+    def rpush(self, key, *values):
+        self._count("rpush")
+        return self._push(key, values, left=False)
+
+    def _pop(self, key, left):
+        items = self._live(key)
+        if not items:
+            return None
+        value = items.pop(0 if left else -1)
+        self._drop_if_empty(key)
+        return value
+
+    def lpop(self, key):
+        with self._lock:
+            self._count("lpop")
+            return self._pop(key, left=True)
+
+    def rpop(self, key):
+        with self._lock:
+            self._count("rpop")
+            return self._pop(key, left=False)
+
+    def _blocking_pop(self, keys, timeout, left):
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        deadline = None if not timeout else self.clock() + float(timeout)
+        with self._changed:
+            for key in keys:
+                self._blocked[key] += 1
+            try:
+                while True:
+                    for key in keys:
+                        value = self._pop(key, left)
+                        if value is not None:
+                            return key, value
+                    remaining = None if deadline is None else deadline - self.clock()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._changed.wait(remaining)
+            finally:
+                for key in keys:
+                    self._blocked[key] -= 1
+
+    def brpop(self, keys, timeout=0):
+        self._count("brpop")
+        return self._blocking_pop(keys, timeout, left=False)
+
+    def blpop(self, keys, timeout=0):
+        self._count("blpop")
+        return self._blocking_pop(keys, timeout, left=True)
+
+    def blocked(self, key) -> int:
+        """Clients currently waiting in a blocking pop on key."""
+        with self._lock:
+            return self._blocked.get(key, 0)
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._live(key) or ())
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            self._count("lrange")
+            items = self._live(key) or []
+            end = len(items) if end == -1 else end + 1
+            return list(items[start:end])
+
+    def lrem(self, key, count, value):
+        with self._lock:
+            self._count("lrem")
+            items = self._live(key) or []
+            value, removed = _s(value), 0
+            order = range(len(items) - 1, -1, -1) if count < 0 else range(len(items))
+            for i in list(order):
+                if items[i] == value and (count == 0 or removed < abs(count)):
+                    items[i] = None
+                    removed += 1
+            items[:] = [v for v in items if v is not None]
+            self._drop_if_empty(key)
+            return removed
+
+    def ltrim(self, key, start, end):
+        with self._lock:
+            items = self._live(key) or []
+            end = len(items) if end == -1 else end + 1
+            items[:] = items[start:end]
+            self._drop_if_empty(key)
+            return True
+
+    # ---- hashes ----
+    def hset(self, key, field=None, value=None, mapping=None, items=None):
+        with self._lock:
+            self._count("hset")
+            fields = dict(mapping or {})
+            if field is not None:
+                fields[field] = value
+            if items:
+                fields.update(zip(items[::2], items[1::2]))
+            h = self._container(key, dict)
+            added = sum(1 for f in fields if f not in h)
+            h.update({f: _s(v) for f, v in fields.items()})
+            if key.startswith(LIFECYCLE_PREFIX):
+                now, stamps = self.clock(), self.lifecycle[key]
+                for f in fields:
+                    if f.endswith("_at"):
+                        stamps.setdefault(f, now)
+            return added
+
+    def hmset(self, key, mapping):
+        return self.hset(key, mapping=mapping)
+
+    def hget(self, key, field):
+        with self._lock:
+            return (self._live(key) or {}).get(field)
+
+    def hmget(self, key, fields, *args):
+        fields = list(fields) + list(args) if isinstance(fields, (list, tuple)) else [fields, *args]
+        with self._lock:
+            h = self._live(key) or {}
+            return [h.get(f) for f in fields]
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._live(key) or {})
+
+    def hexists(self, key, field):
+        with self._lock:
+            self._count("hexists")
+            return field in (self._live(key) or {})
+
+    def hdel(self, key, *fields):
+        with self._lock:
+            h = self._live(key) or {}
+            removed = sum(1 for f in fields if h.pop(f, None) is not None)
+            self._drop_if_empty(key)
+            return removed
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            h = self._container(key, dict)
+            h[field] = str(int(h.get(field, 0)) + int(amount))
+            return int(h[field])
+
+    def hlen(self, key):
+        with self._lock:
+            return len(self._live(key) or {})
+
+    def hkeys(self, key):
+        with self._lock:
+            return list(self._live(key) or {})
+
+    # ---- sets ----
+    def sadd(self, key, *members):
+        with self._lock:
+            self._count("sadd")
+            s = self._container(key, set)
+            before = len(s)
+            s.update(_s(m) for m in members)
+            return len(s) - before
+
+    def srem(self, key, *members):
+        with self._lock:
+            s = self._live(key) or set()
+            removed = sum(1 for m in members if _s(m) in s)
+            s.difference_update(_s(m) for m in members)
+            self._drop_if_empty(key)
+            return removed
+
+    def sismember(self, key, member):
+        with self._lock:
+            self._count("sismember")
+            return _s(member) in (self._live(key) or ())
+
+    def smembers(self, key):
+        with self._lock:
+            return set(self._live(key) or ())
+
+    def scard(self, key):
+        with self._lock:
+            return len(self._live(key) or ())
+
+    # ---- sorted sets ----
+    def zadd(self, key, mapping, nx=False, xx=False, ch=False, **kwargs):
+        with self._lock:
+            self._count("zadd")
+            z = self._container(key, _ZSet)
+            changed = 0
+            for member, score in mapping.items():
+                member = _s(member)
+                present = member in z.scores
+                if (nx and present) or (xx and not present):
+                    continue
+                updated = z.add(member, float(score))
+                changed += updated if ch else int(not present)
+            self._drop_if_empty(key)
+            return changed
+
+    def zrem(self, key, *members):
+        with self._lock:
+            self._count("zrem")
+            z = self._live(key)
+            removed = sum(1 for m in members if z is not None and z.remove(_s(m)))
+            self._drop_if_empty(key)
+            return removed
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._live(key) or ())
+
+    def zscore(self, key, member):
+        with self._lock:
+            z = self._live(key)
+            return None if z is None else z.scores.get(_s(member))
+
+    def zrange(self, key, start, end, withscores=False, **kwargs):
+        with self._lock:
+            z = self._live(key)
+            rows = [] if z is None else z.ordered()
+            end = len(rows) if end == -1 else end + 1
+            rows = rows[start:end]
+            return [(m, s) for s, m in rows] if withscores else [m for _, m in rows]
+
+    def zrangebyscore(self, key, min, max, start=None, num=None, withscores=False, **kwargs):
+        lo, hi = _score_bound(min, -float("inf")), _score_bound(max, float("inf"))
+        with self._lock:
+            self._count("zrangebyscore")
+            z = self._live(key)
+            rows = [] if z is None else [(s, m) for s, m in z.ordered() if lo <= s <= hi]
+            if start is not None and num is not None:
+                rows = rows[start:start + num]
+            return [(m, s) for s, m in rows] if withscores else [m for _, m in rows]
+
+    def zremrangebyscore(self, key, min, max):
+        members = self.zrangebyscore(key, min, max)
+        return self.zrem(key, *members) if members else 0
+
+    def zpopmin(self, key, count=1):
+        with self._lock:
+            rows = self.zrange(key, 0, count - 1, withscores=True)
+            if rows:
+                self.zrem(key, *[m for m, _ in rows])
+            return rows
+
+    # ---- pub/sub ----
+    def publish(self, channel, message):
+        with self._lock:
+            self._count("publish")
+            self.published += 1
+            subscribers = list(self._subscribers)
+        delivered = 0
+        for sub in subscribers:
+            pattern = sub._matches(channel)
+            if pattern is None:
+                continue
+            delivered += 1
+            if pattern:
+                sub._deliver({"type": "pmessage", "pattern": pattern, "channel": channel, "data": _s(message)})
+            else:
+                sub._deliver({"type": "message", "pattern": None, "channel": channel, "data": _s(message)})
+        return delivered
+
+    # ---- bench helpers ----
+    def size(self, key) -> int:
+        """Length of whatever is stored at key (list, hash, set, zset; 1 for a string, 0 if absent)."""
+        with self._lock:
+            value = self._live(key)
+            return 0 if value is None else 1 if isinstance(value, str) else len(value)
+
+    def count_prefix(self, prefix) -> int:
+        with self._lock:
+            return sum(1 for k in list(self._data) if k.startswith(prefix) and self._live(k) is not None)
+
+
+class _ZSet:
+    __slots__ = ("scores", "_order")
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self._order: List[Tuple[float, str]] = []
+
+    def add(self, member, score) -> int:
+        old = self.scores.get(member)
+        if old == score:
+            return 0
+        if old is not None:
+            self._order.remove((old, member))
+        self.scores[member] = score
+        bisect.insort(self._order, (score, member))
+        return 1
+
+    def remove(self, member) -> bool:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return False
+        self._order.remove((score, member))
+        return True
+
+    def ordered(self):
+        return list(self._order)
+
+    def __len__(self):
+        return len(self.scores)
+
+
+def _score_bound(value, infinite):
+    if isinstance(value, str):
+        if value in ("-inf", "+inf", "inf"):
+            return -float("inf") if value == "-inf" else float("inf")
+        if value.startswith("("):
+            # exclusive bounds are rare here; nudge by the smallest step
+            v = float(value[1:])
+            return v + 1e-9 if infinite < 0 else v - 1e-9
+    return float(value) if value is not None else infinite
+
+
+class _RedisError(Exception):
+    pass
+
+
+class _RedisConnectionError(_RedisError, ConnectionError):
+    pass
+
+
+class _RedisTimeoutError(_RedisError, TimeoutError):
+    pass
+
+
+def fake_redis_module(server: FakeRedis) -> types.ModuleType:
+    """A stand-in `redis` module whose Redis()/StrictRedis()/from_url() all return server."""
+    module = types.ModuleType("redis")
+    module.__fake__ = True
+    module.Redis = module.StrictRedis = lambda *args, **kwargs: server
+    module.from_url = lambda *args, **kwargs: server
+    module.ConnectionPool = lambda *args, **kwargs: dict(kwargs)
+    module.RedisError, module.ConnectionError, module.TimeoutError = _RedisError, _RedisConnectionError, _RedisTimeoutError
+    module.exceptions = types.SimpleNamespace(RedisError=_RedisError, ConnectionError=_RedisConnectionError,
+                                              TimeoutError=_RedisTimeoutError, ResponseError=_RedisError)
+    module.client = types.SimpleNamespace(Pipeline=FakePipeline, PubSub=FakePubSub)
+    return module
+
+
+def install_fake_redis(server: FakeRedis) -> types.ModuleType:
+    """
+    Route every redis.Redis() in this process to server: replaces sys.modules["redis"] (so
+    later imports see the fake even without redis-py installed) and rebinds the `redis`
+    global of modules that already imported it.
+    """
+    module = fake_redis_module(server)
+    real = sys.modules.get("redis")
+    sys.modules["redis"] = module
+    for mod in list(sys.modules.values()):
+        if mod is not None and mod is not module and real is not None and getattr(mod, "redis", None) is real:
+            mod.redis = module
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Vendor HTTP APIs
+# ---------------------------------------------------------------------------
+Route = Tuple[str, Callable[[str, Dict[str, str]], Tuple[int, object]]]
+
+
+class FakeVendorServer:
+    """
+    Local HTTP server answering GET/POST requests from route handlers.
+
+    Args:
+        routes: [(path_prefix, handler)]; the longest matching prefix wins. handler(path, query)
+                returns (status, body): dict/list bodies are sent as JSON, str as text.
+        rate: Responses per second across all connections (0 = unlimited); excess requests
+              queue, as they would behind a vendor rate limit.
+        latency: Seconds added to every response.
+    """
+
+    def __init__(self, routes: List[Route], host: str = "127.0.0.1", port: int = 0,
+                 rate: float = 0.0, latency: float = 0.0, name: str = "vendor"):
+        self.routes = sorted(routes, key=lambda r: len(r[0]), reverse=True)
+        self.rate = rate
+        self.latency = latency
+        self.name = name
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.errors = 0
+        self._pace_lock = threading.Lock()
+        self._next_slot = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            do_POST = do_GET
+
+            def log_message(self, fmt, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeVendorServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _pace(self):
+        delay = self.latency
+        if self.rate:
+            with self._pace_lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + 1.0 / self.rate
+            delay += slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        parsed = urlparse(request.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(request.headers.get("Content-Length") or 0)
+        if length:
+            request.rfile.read(length)
+        prefix, handler = next(((p, h) for p, h in self.routes if parsed.path.startswith(p)), (None, None))
+        self.requests[prefix or "unrouted"] += 1
+        self._pace()
+        try:
+            status, body = handler(parsed.path, query) if handler else (404, {"status": "NOT_FOUND"})
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"{self.name} handler failed for {request.path}: {e}", exc_info=True)
+            status, body = 500, {"status": "ERROR", "error": str(e)}
+        if isinstance(body, (dict, list)):
+            payload, ctype = json.dumps(body).encode(), "application/json"
+        else:
+            payload, ctype = str(body).encode(), "text/plain; charset=utf-8"
+        request.send_response(status)
+        request.send_header("Content-Type", ctype)
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def snapshot(self) -> dict:
+        return {"requests": sum(self.requests.values()), "by_route": dict(self.requests), "errors": self.errors}
+
+
+def replay_routes(path: str) -> List[Route]:
+    """
+    Routes that replay recorded responses. JSONL, one response per line:
+        {"path": "/v2/aggs/ticker/AAPL", "status": 200, "body": {...}}
+    Requests are matched by path prefix; responses recorded for a prefix are served in
+    order and cycle when exhausted.
+    """
+    recorded: Dict[str, List[Tuple[int, object]]] = defaultdict(list)
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                rec = json.loads(line)
+                recorded[rec["path"]].append((int(rec.get("status", 200)), rec["body"]))
+    routes = []
+    for prefix, responses in recorded.items():
+        position = {"i": 0}
+        lock = threading.Lock()
+
+        def handler(p, q, responses=responses, position=position, lock=lock):
+            with lock:
+                i = position["i"]
+                position["i"] = i + 1
+            return responses[i % len(responses)]
+        routes.append((prefix, handler))
+    return routes
+
+
+def synthetic_price(ticker: str, ts_ms: int) -> float:
+    """Deterministic positive price for a ticker at a millisecond timestamp (moves per minute)."""
+    base = 20 + zlib.crc32(ticker.encode()) % 400
+    minute = int(ts_ms) // 60000
+    return round(base * (1 + ((minute * 2654435761) % 2001 - 1000) / 100000.0), 4)
+
+
+def polygon_routes(price: Callable[[str, int], float] = synthetic_price, etfs=()) -> List[Route]:
+    """Polygon REST: ticker details and second/minute aggregates (one bar at the window end)."""
+    etfs = set(etfs)
+
+    def ticker_details(path, query):
+        ticker = path.rstrip("/").split("/")[-1]
+        return 200, {"status": "OK", "request_id": "bench",
+                     "results": {"ticker": ticker, "type": "ETF" if ticker in etfs else "CS",
+                                 "active": True, "market": "stocks", "name": ticker}}
+
+    def aggs(path, query):
+        # /v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from}/{to}
+        parts = path.strip("/").split("/")
+        ticker, to = parts[3], parts[-1]
+        ts = int(to) if to.isdigit() else int(time.time() * 1000)
+        close = price(ticker, ts)
+        return 200, {"status": "OK", "request_id": "bench", "ticker": ticker, "resultsCount": 1,
+                     "results": [{"t": ts, "o": close, "h": close, "l": close, "c": close, "v": 100, "n": 1}]}
+
+    def grouped(path, query):
+        return 200, {"status": "OK", "request_id": "bench", "resultsCount": 0, "results": []}
+
+    return [("/v3/reference/tickers/", ticker_details), ("/v2/aggs/ticker/", aggs), ("/v2/aggs/grouped/", grouped)]
+
+
+def benzinga_routes(items: List[dict], page_size: int = 99,
+                    on_page: Optional[Callable[[List[dict]], None]] = None) -> List[Route]:
+    """Benzinga newsfeed v2 REST: pages of items (page / pageSize query parameters).
+    on_page is called with each page just before it is returned."""
+    def news(path, query):
+        page, size = int(query.get("page", 0)), int(query.get("pageSize", page_size))
+        rows = items[page * size:(page + 1) * size]
+        if on_page:
+            on_page(rows)
+        return 200, rows
+    return [("/api/v2/news", news)]
+
+
+def sec_routes(section_text: Callable[[str, str], str] = None, document_text: Callable[[str], str] = None) -> List[Route]:
+    """sec-api extractor (/extractor?url=&item=&type=) and sec.gov documents (/Archives/...)."""
+    section_text = section_text or (lambda url, item: f"Item {item} of {url}. " + "Lorem ipsum dolor sit amet. " * 40)
+    document_text = document_text or (lambda path: f"<html><body>{path} " + "Filing text. " * 200 + "</body></html>")
+
+    def extractor(path, query):
+        return 200, section_text(query.get("url", ""), query.get("item", ""))
+
+    def document(path, query):
+        return 200, document_text(path)
+
+    return [("/extractor", extractor), ("/Archives/", document)]
+
+
+# ---------------------------------------------------------------------------
+# Neo4j
+# ---------------------------------------------------------------------------
+_WRITE_WORDS = ("MERGE", "CREATE", "SET ", "DELETE", "REMOVE")
+
+
+class RecordingRecord(dict):
+    """Record for a write statement: unknown keys resolve to the statement parameters (a node-like map)."""
+
+    def __missing__(self, key):
+        return dict(self)
+
+    def data(self):
+        return dict(self)
+
+
+class RecordingResult:
+    def __init__(self, records: List[RecordingRecord]):
+        self._records = records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self, strict=False):
+        return self._records[0] if self._records else None
+
+    def data(self):
+        return [r.data() for r in self._records]
+
+    def values(self):
+        return [list(r.values()) for r in self._records]
+
+    def consume(self):
+        return types.SimpleNamespace(counters=types.SimpleNamespace())
+
+
+class RecordingNeo4jDriver:
+    """
+    Driver whose sessions record statements instead of executing them.
+
+    statements: [(monotonic time, first Cypher line, rows)] where rows is the length of the
+    largest list parameter (the UNWIND batch) or 1. write_latency is slept per write statement.
+    """
+
+    def __init__(self, write_latency: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.write_latency = write_latency
+        self.clock = clock
+        self.statements: List[Tuple[float, str, int]] = []
+        self._lock = threading.Lock()
+
+    def session(self, **kwargs):
+        return RecordingSession(self)
+
+    def verify_connectivity(self):
+        return True
+
+    def close(self):
+        pass
+
+    def _run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        is_write = any(w in query.upper() for w in _WRITE_WORDS)
+        if is_write and self.write_latency:
+            time.sleep(self.write_latency)
+        rows = max([len(v) for v in params.values() if isinstance(v, list)] or [1])
+        head = next((line.strip() for line in query.strip().splitlines() if line.strip()), "")
+        with self._lock:
+            self.statements.append((self.clock(), head[:120], rows))
+        return RecordingResult([RecordingRecord(params)] if is_write else [])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"statements": len(self.statements), "rows": sum(r for _, _, r in self.statements)}
+
+
+class RecordingSession:
+    def __init__(self, driver: RecordingNeo4jDriver):
+        self._driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        return self._driver._run(query, parameters, **kwargs)
+
+    def execute_write(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+    execute_read = write_transaction = read_transaction = execute_write
+
+    def begin_transaction(self, *args, **kwargs):
+        return self
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class RecordingNeo4jManager:
+    """
+    Neo4jManager stand-in for Neo4jProcessor.manager. Cypher goes through the recording
+    driver; bulk helpers (merge_nodes, create_relationships, ...) are recorded by name.
+    """
+
+    def __init__(self, write_latency: float = 0.0):
+        self.driver = RecordingNeo4jDriver(write_latency)
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    def execute_cypher_query(self, query, parameters=None):
+        return self.driver._run(query, parameters).single()
+
+    def execute_cypher_query_all(self, query, parameters=None):
+        return self.driver._run(query, parameters).data()
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.calls[name] += 1
+            if self.driver.write_latency:
+                time.sleep(self.driver.write_latency)
+            return True
+        return record
+
+    def snapshot(self) -> dict:
+        snap = self.driver.snapshot()
+        snap["helper_calls"] = dict(self.calls)
+        return snap
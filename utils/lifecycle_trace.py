@@ -0,0 +1,417 @@
+"""
+Per-item lifecycle latency tracing for the ingestion pipeline.
+
+Components mark monotonic stage timestamps per (source, item) as an item moves
+through the pipeline; every mark records the time since the item's previous mark
+into a rolling per-source, per-stage histogram, and the slowest items of each
+stage are kept as exemplars together with their stage timeline.
+
+Stages, in pipeline order (lifecycle fields map onto them through
+RedisClient._queue_lifecycle_timestamp, the writer behind both
+mark_lifecycle_timestamp and the pipelined _store_live_batch, so every
+tracking:meta:* stamp is traced once its pipeline has executed):
+
+    ws_receive            frame received by bz_websocket / sec_websocket
+    ingested              raw item written to Redis                (ingested_at)
+    process_start         popped by BaseProcessor / ReportProcessor._process_item
+    metadata              _add_metadata returned
+    queued_for_enrichment handed to report_enricher                (queued_for_enrichment_at)
+    finished_enrichment   enrichment done                          (finished_enrichment_at)
+    processed             processed item stored and published      (processed_at)
+    withoutreturns / withreturns
+                          ReturnsProcessor moved it to a namespace (with*returns_at)
+    pubsub_pickup         Neo4jProcessor received the pubsub message
+    neo4j_commit          written to Neo4j                         (inserted_into_neo4j_at)
+    filtered / failed     terminal states
+    return_<horizon>      horizon close -> return published (observed directly)
+    end_to_end            first mark -> neo4j_commit
+
+Items are keyed by their identifier up to the first "." (news id, accession number),
+so the websocket id and the "<id>.<updated>" Redis identifier land on one item.
+Timelines live only in this process; stages recorded in another process (the
+report_enricher workers) show up here as part of the next stage's latency.
+
+Exports: snapshot() as JSON, appended to a JSONL file by the exporter thread and
+served on a local HTTP endpoint (GET /trace, /trace/exemplars). The process-wide
+tracer comes from get_tracer() and is None unless ENABLE_LIFECYCLE_TRACING is set.
+"""
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STAGE_ORDER = ("ws_receive", "ingested", "process_start", "metadata", "queued_for_enrichment",
+               "finished_enrichment", "processed", "withoutreturns", "withreturns", "pubsub_pickup",
+               "neo4j_commit", "filtered", "failed", "end_to_end")
+LIFECYCLE_STAGES = {
+    "ingested_at": "ingested",
+    "queued_for_enrichment_at": "queued_for_enrichment",
+    "finished_enrichment_at": "finished_enrichment",
+    "processed_at": "processed",
+    "withoutreturns_at": "withoutreturns",
+    "withreturns_at": "withreturns",
+    "inserted_into_neo4j_at": "neo4j_commit",
+    "filtered_at": "filtered",
+    "failed_at": "failed",
+}
+TERMINAL_STAGE = "neo4j_commit"
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000,
+              120000, 300000, 900000, 3600000, 4 * 3600000, 24 * 3600000)
+
+
+def item_key(identifier) -> str:
+    """Item part of an identifier: "123.2026-01-29T16.30.00+00.00" -> "123"."""
+    return str(identifier).split(".", 1)[0]
+
+
+class _Slot:
+    """One sub-window: bucket counts, totals and the slowest exemplars seen in it."""
+    __slots__ = ("start", "counts", "count", "total", "max", "exemplars")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.exemplars: List[Tuple[float, float, str]] = []    # min-heap of (ms, wall time, item)
+
+
+class RollingHistogram:
+    """
+    Bucketed latency histogram over the last window seconds, kept as `slots`
+    sub-windows that are recycled as time passes (O(1) record, no per-sample storage).
+    """
+
+    def __init__(self, window: float = 300.0, slots: int = 10, exemplars: int = 5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.slot_seconds = window / slots
+        self.n_exemplars = exemplars
+        self.clock = clock
+        self._slots: List[_Slot] = []
+        self.lifetime_count = 0
+
+    def _current(self, now: float) -> _Slot:
+        start = now - (now % self.slot_seconds)
+        if not self._slots or self._slots[-1].start != start:
+            self._slots.append(_Slot(start))
+            horizon = now - self.window
+            while self._slots and self._slots[0].start + self.slot_seconds <= horizon:
+                self._slots.pop(0)
+        return self._slots[-1]
+
+    def record(self, ms: float, item: str = ""):
+        now = self.clock()
+        slot = self._current(now)
+        slot.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        slot.count += 1
+        slot.total += ms
+        slot.max = max(slot.max, ms)
+        self.lifetime_count += 1
+        if self.n_exemplars:
+            entry = (ms, time.time(), item)
+            if len(slot.exemplars) < self.n_exemplars:
+                heapq.heappush(slot.exemplars, entry)
+            elif ms > slot.exemplars[0][0]:
+                heapq.heapreplace(slot.exemplars, entry)
+
+    def _live_slots(self) -> List[_Slot]:
+        horizon = self.clock() - self.window
+        return [s for s in self._slots if s.start + self.slot_seconds > horizon]
+
+    def summary(self) -> dict:
+        slots = self._live_slots()
+        counts = [sum(s.counts[i] for s in slots) for i in range(len(BUCKETS_MS) + 1)]
+        count = sum(counts)
+        out = {"count": count, "lifetime_count": self.lifetime_count}
+        if not count:
+            return out
+
+        peak = max(s.max for s in slots)
+
+        def pct(q):         # bucket upper bound, capped at the observed max
+            target, seen = q * count, 0
+            for i, c in enumerate(counts):
+                seen += c
+                if seen >= target and c:
+                    return round(min(float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else peak, peak), 2)
+            return round(peak, 2)
+
+        out.update(mean_ms=round(sum(s.total for s in slots) / count, 2), p50_ms=pct(0.50), p90_ms=pct(0.90),
+                   p99_ms=pct(0.99), max_ms=round(peak, 2),
+                   buckets={("+inf" if i == len(BUCKETS_MS) else str(BUCKETS_MS[i])): c
+                            for i, c in enumerate(counts) if c})
+        return out
+
+    def exemplars(self) -> List[Tuple[float, float, str]]:
+        """Slowest samples in the window, slowest first: [(ms, wall time, item)]."""
+        merged = [e for s in self._live_slots() for e in s.exemplars]
+        return heapq.nlargest(self.n_exemplars, merged)
+
+
+class LifecycleTracer:
+    """
+    Records stage marks per item and aggregates them per (source, stage).
+
+    Args:
+        window: Rolling window (seconds) of the histograms
+        exemplars: Slowest items kept per (source, stage)
+        max_items: Item timelines kept (least recently touched are dropped first)
+    """
+
+    def __init__(self, window: float = 300.0, exemplars: int = 5, max_items: int = 50000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.n_exemplars = exemplars
+        self.max_items = max_items
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Tuple[str, str], Dict[str, float]]" = OrderedDict()
+        self._hist: Dict[Tuple[str, str], RollingHistogram] = {}
+        self.marks = 0
+        self.evicted = 0
+
+    def _histogram(self, source: str, stage: str) -> RollingHistogram:
+        hist = self._hist.get((source, stage))
+        if hist is None:
+            hist = self._hist[(source, stage)] = RollingHistogram(self.window, exemplars=self.n_exemplars,
+                                                                  clock=self.clock)
+        return hist
+
+    def mark(self, source: str, identifier, stage: str, t: Optional[float] = None):
+        """Stamp stage for an item (first stamp per stage wins) and record the time since its previous mark."""
+        now = self.clock() if t is None else t
+        key = (source, item_key(identifier))
+        with self._lock:
+            self.marks += 1
+            timeline = self._items.get(key)
+            if timeline is None:
+                timeline = self._items[key] = {}
+                if len(self._items) > self.max_items:
+                    self._items.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._items.move_to_end(key)
+            if stage in timeline:
+                return
+            previous = max((v for v in timeline.values() if v <= now), default=None)
+            timeline[stage] = now
+            if previous is not None:
+                self._histogram(source, stage).record((now - previous) * 1000, key[1])
+            if stage == TERMINAL_STAGE and len(timeline) > 1:
+                self._histogram(source, "end_to_end").record((now - min(timeline.values())) * 1000, key[1])
+
+    def mark_lifecycle(self, meta_key: str, field: str, t: Optional[float] = None):
+        """Trace a tracking:meta:<source>:<identifier> lifecycle field."""
+        stage = LIFECYCLE_STAGES.get(field)
+        parts = meta_key.split(":", 3)
+        if stage and len(parts) == 4:
+            self.mark(parts[2], parts[3], stage, t)
+
+    def observe(self, source: str, stage: str, seconds: float, identifier=None):
+        """Record a latency measured elsewhere (e.g. horizon close -> return published)."""
+        with self._lock:
+            self.marks += 1
+            self._histogram(source, stage).record(max(0.0, seconds) * 1000,
+                                                  item_key(identifier) if identifier is not None else "")
+
+    def timeline(self, source: str, identifier) -> Optional[Dict[str, float]]:
+        """Stage -> ms since the item's first mark, in time order."""
+        with self._lock:
+            timeline = self._items.get((source, item_key(identifier)))
+            if not timeline:
+                return None
+            first = min(timeline.values())
+            return {stage: round((t - first) * 1000, 2) for stage, t in sorted(timeline.items(), key=lambda kv: kv[1])}
+
+    def snapshot(self) -> dict:
+        """{"sources": {source: {stage: histogram summary}}, "exemplars": {source: {stage: [...]}}, ...}"""
+        with self._lock:        # record() appends / drops the same histogram slots under this lock
+            taken = [(source, stage, hist.summary(), hist.exemplars())
+                     for (source, stage), hist in self._hist.items()]
+        sources, exemplars = {}, {}
+        for source, stage, summary, samples in sorted(taken, key=lambda t: (t[0], _stage_rank(t[1]))):
+            if summary["count"]:
+                sources.setdefault(source, {})[stage] = summary
+            slowest = [{"item": item, "ms": round(ms, 2),
+                        "at": datetime.fromtimestamp(wall, timezone.utc).isoformat(timespec="seconds"),
+                        "timeline": self.timeline(source, item) if item else None}
+                       for ms, wall, item in samples]
+            if slowest:
+                exemplars.setdefault(source, {})[stage] = slowest
+        return {"at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "window_s": self.window,
+                "marks": self.marks, "items_tracked": len(self._items), "items_evicted": self.evicted,
+                "sources": sources, "exemplars": exemplars}
+
+    def export_jsonl(self, path: str) -> dict:
+        """Append one snapshot line to path."""
+        snap = self.snapshot()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as fh:
+            fh.write(json.dumps(snap) + "\n")
+        return snap
+
+
+def _stage_rank(stage: str) -> int:
+    return STAGE_ORDER.index(stage) if stage in STAGE_ORDER else len(STAGE_ORDER)
+
+
+class TraceExporter:
+    """Appends a tracer snapshot to a JSONL file every interval seconds on a daemon thread."""
+
+    def __init__(self, tracer: LifecycleTracer, path: str, interval: float = 60.0):
+        self.tracer = tracer
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "TraceExporter":
+        self._thread = threading.Thread(target=self._run, name="lifecycle-trace-export", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tracer.export_jsonl(self.path)
+            except Exception as e:
+                logger.error(f"Lifecycle trace export failed: {e}", exc_info=True)
+
+    def stop(self, final_export: bool = True):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if final_export:
+            self.tracer.export_jsonl(self.path)
+
+
+def serve(tracer: LifecycleTracer, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve GET /trace (full snapshot) and /trace/exemplars on host:port; returns the running server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            snap = tracer.snapshot()
+            if self.path.rstrip("/") == "/trace/exemplars":
+                snap = {"at": snap["at"], "exemplars": snap["exemplars"]}
+            elif self.path.rstrip("/") not in ("/trace", ""):
+                self.send_error(404)
+                return
+            payload = json.dumps(snap).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="lifecycle-trace-http", daemon=True).start()
+    return server
+
+
+_tracer_singleton: Optional[LifecycleTracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[LifecycleTracer]:
+    """Process-wide tracer, or None when ENABLE_LIFECYCLE_TRACING is off.
+
+    The first call starts the JSONL exporter (LIFECYCLE_TRACE_JSONL) and the local
+    endpoint (LIFECYCLE_TRACE_PORT) when they are configured.
+    """
+    global _tracer_singleton
+    from config import feature_flags
+    if not feature_flags.ENABLE_LIFECYCLE_TRACING:
+        return None
+    if _tracer_singleton is not None:
+        return _tracer_singleton
+    with _tracer_lock:
+        if _tracer_singleton is None:
+            tracer = LifecycleTracer(window=feature_flags.LIFECYCLE_TRACE_WINDOW_SECONDS,
+                                     exemplars=feature_flags.LIFECYCLE_TRACE_EXEMPLARS,
+                                     max_items=feature_flags.LIFECYCLE_TRACE_MAX_ITEMS)
+            if feature_flags.LIFECYCLE_TRACE_JSONL:
+                path = feature_flags.LIFECYCLE_TRACE_JSONL.replace("{pid}", str(os.getpid()))
+                TraceExporter(tracer, path, feature_flags.LIFECYCLE_TRACE_EXPORT_SECONDS).start()
+            if feature_flags.LIFECYCLE_TRACE_PORT:
+                try:
+                    server = serve(tracer, feature_flags.LIFECYCLE_TRACE_PORT)
+                    logger.info(f"Lifecycle trace endpoint on http://127.0.0.1:{server.server_address[1]}/trace")
+                except OSError as e:        # port taken (e.g. a second process): keep tracing, skip the endpoint
+                    logger.warning(f"Lifecycle trace endpoint not started: {e}")
+            _tracer_singleton = tracer
+        return _tracer_singleton
+
+
+def trace(source: str, identifier, stage: str, t: Optional[float] = None):
+    """Mark a stage on the process-wide tracer; no-op when tracing is disabled. Never raises."""
+    try:
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.mark(source, identifier, stage, t)
+    except Exception as e:
+        logger.debug(f"lifecycle trace failed for {source}:{identifier}:{stage}: {e}")
+
+
+def trace_lifecycle(meta_key: str, field: str):
+    """Trace a tracking:meta:* lifecycle field on the process-wide tracer; never raises."""
+    try:
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.mark_lifecycle(meta_key, field)
+    except Exception as e:
+        logger.debug(f"lifecycle trace failed for {meta_key}:{field}: {e}")
+
+
+def trace_lifecycle_on_execute(pipe, meta_key: str, field: str):
+    """Trace a lifecycle field queued on pipe once pipe.execute() succeeds; never raises.
+
+    Marking when the HSET is queued would log stages whose transaction fails or is
+    never executed, with timestamps taken before the write.
+    """
+    try:
+        if get_tracer() is None:
+            return
+        pending = pipe.__dict__.get("_lifecycle_marks")
+        if pending is None:
+            pending = pipe._lifecycle_marks = []
+            execute = pipe.execute
+
+            def execute_and_trace(*args, **kwargs):
+                result = execute(*args, **kwargs)
+                marks, pending[:] = list(pending), []
+                for key, name in marks:
+                    trace_lifecycle(key, name)
+                return result
+
+            pipe.execute = execute_and_trace
+        pending.append((meta_key, field))
+    except Exception as e:
+        logger.debug(f"lifecycle trace failed for {meta_key}:{field}: {e}")
+
+
+def trace_latency(source: str, stage: str, seconds: float, identifier=None):
+    """Record a directly measured latency on the process-wide tracer; never raises."""
+    try:
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.observe(source, stage, seconds, identifier)
+    except Exception as e:
+        logger.debug(f"lifecycle trace failed for {source}:{stage}: {e}")
@@ -0,0 +1,105 @@
+"""
+Token-bucket rate limiting shared across processes via Redis.
+
+The bucket state (tokens, last refill) lives in one Redis hash per limit and is
+updated by a Lua script, so every enricher / worker process draws from the
+same budget (e.g. SEC's 10 requests/second per client). The script uses Redis
+TIME, so host clock skew between pods does not matter.
+
+acquire() never busy-loops: when the bucket is short the script returns how
+long until enough tokens refill, and the caller sleeps exactly that (bounded
+by an optional deadline). If Redis is unavailable the bucket degrades to an
+in-process limiter with the same arithmetic rather than failing the request.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:"
+
+# KEYS[1] bucket hash; ARGV: rate (tokens/s), capacity, tokens requested.
+# Returns the wait in seconds (string, to keep the fraction) — "0" means granted.
+_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local cap = tonumber(ARGV[2])
+local n = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or cap
+local ts = tonumber(b[2]) or now
+if now > ts then
+  tokens = math.min(cap, tokens + (now - ts) * rate)
+  ts = now
+end
+local wait = 0
+if tokens >= n then
+  tokens = tokens - n
+else
+  wait = (n - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(ts))
+redis.call('PEXPIRE', KEYS[1], math.ceil(cap / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """rate tokens/second, bursts up to capacity (default: one second's worth)."""
+
+    def __init__(self, name: str, rate: float, capacity: Optional[float] = None,
+                 redis_client=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.key = f"{KEY_PREFIX}{name}"
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._redis = redis_client
+        self._script = None
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._ts = clock()
+        self.waited = 0.0                      # total seconds spent throttled (stats)
+
+    def _try_redis(self, n: float) -> float:
+        if self._script is None:
+            self._script = self._redis.register_script(_BUCKET_LUA)
+        return float(self._script(keys=[self.key], args=[self.rate, self.capacity, n]))
+
+    def _try_local(self, n: float) -> float:
+        with self._lock:
+            now = self.clock()
+            if now > self._ts:
+                self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+                self._ts = now
+            if self._tokens >= n:
+                self._tokens -= n
+                return 0.0
+            return (n - self._tokens) / self.rate
+
+    def try_acquire(self, n: float = 1) -> float:
+        """Take n tokens if available (returns 0.0), else the seconds until they will be."""
+        if self._redis is not None:
+            try:
+                return self._try_redis(n)
+            except Exception as e:
+                logger.warning(f"Rate limiter {self.name}: Redis unavailable ({e}); using in-process bucket")
+                self._redis = None
+        return self._try_local(n)
+
+    def acquire(self, n: float = 1, deadline: Optional[float] = None) -> bool:
+        """Block until n tokens are taken. False if that would pass deadline (clock() time)."""
+        while True:
+            wait = self.try_acquire(n)
+            if wait <= 0:
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                return False
+            self.waited += wait
+            self.sleep(wait)
@@ -0,0 +1,184 @@
+"""Offline tests for utils/ingest_fakes.py and the measurement side of scripts/ingestion_bench.py."""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.ingestion_bench import (DepthSampler, compare_runs, frame_item_ids, news_rest_items,  # noqa: E402
+                                     news_ws_frames, sec_ws_frames, stage_report, terminal_count)
+from utils.ingest_fakes import (FakeRedis, FakeVendorServer, RecordingNeo4jManager, benzinga_routes,  # noqa: E402
+                                fake_redis_module, polygon_routes, replay_routes, sec_routes, synthetic_price)
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        body = resp.read().decode()
+        return json.loads(body) if resp.headers.get_content_type() == "application/json" else body
+
+
+def test_lists_pipelines_and_lifecycle_stamps():
+    clock = iter(range(100)).__next__
+    r = FakeRedis(clock=lambda: float(clock()))
+    pipe = r.pipeline(transaction=True)
+    pipe.set("news:live:raw:1.t", "{}", ex=3600).lpush("news:queues:raw", "news:live:raw:1.t")
+    pipe.hset("tracking:meta:news:1.t", mapping={"ingested_at": "2026-10-19T10:00:00+00:00"})
+    assert r.get("news:live:raw:1.t") is None and len(pipe) == 3       # nothing applied before execute
+    assert pipe.execute() == [True, 1, 1]
+    r.hset("tracking:meta:news:1.t", mapping={"ingested_at": "later", "processed_at": "x", "reason": "y"})
+    stamps = r.lifecycle["tracking:meta:news:1.t"]
+    assert set(stamps) == {"ingested_at", "processed_at"} and stamps["ingested_at"] < stamps["processed_at"]
+
+    r.rpush("q", "a", "b")
+    r.lpush("q", "c")
+    assert r.lrange("q", 0, -1) == ["c", "a", "b"] and r.brpop("q", timeout=1) == ("q", "b")
+    assert r.lrem("q", 0, "c") == 1 and r.llen("q") == 1 and r.type("q") == "list"
+    assert r.exists("news:live:raw:1.t") == 1 and r.delete("news:live:raw:1.t", "missing") == 1
+
+
+def test_blocking_pop_wakes_on_push_and_times_out():
+    r = FakeRedis()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(r.brpop(["a", "b"], timeout=5)))
+    waiter.start()
+    deadline = time.monotonic() + 2
+    while not r.blocked("b") and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert r.blocked("b") == 1
+    r.lpush("b", "x")
+    waiter.join(timeout=2)
+    assert got == [("b", "x")] and r.blocked("b") == 0
+    started = time.monotonic()
+    assert r.blpop("empty", timeout=0.05) is None and time.monotonic() - started >= 0.04
+
+
+def test_expiry_sets_zsets_and_pubsub():
+    now = [0.0]
+    r = FakeRedis(clock=lambda: now[0])
+    r.set("k", "v", ex=10)
+    now[0] = 9.9
+    assert r.get("k") == "v" and r.ttl("k") == 0
+    now[0] = 10.0
+    assert r.get("k") is None and r.ttl("k") == -2
+
+    assert r.zadd("z", {"a": 3, "b": 1}) == 2 and r.zadd("z", {"a": 0}) == 0
+    assert r.zrangebyscore("z", "-inf", 2) == ["a", "b"] and r.zrange("z", 0, 0, withscores=True) == [("a", 0.0)]
+    assert r.zrem("z", "a", "zz") == 1 and r.zcard("z") == 1
+    assert r.sadd("s", "x", "x", "y") == 2 and r.sismember("s", "x") and r.scard("s") == 2
+    assert sorted(r.keys("*")) == ["s", "z"] and r.count_prefix("s") == 1
+
+    sub = r.pubsub()
+    sub.subscribe("news:withreturns", "news:withoutreturns")
+    psub = r.pubsub()
+    psub.psubscribe("reports:*")
+    assert r.publish("news:withreturns", "id1") == 1 and r.publish("reports:live:processed", "k") == 1
+    assert sub.get_message(ignore_subscribe_messages=True, timeout=1) == {
+        "type": "message", "pattern": None, "channel": "news:withreturns", "data": "id1"}
+    assert psub.get_message(ignore_subscribe_messages=True)["pattern"] == "reports:*"
+    assert sub.get_message(timeout=0.01) is None
+    sub.close()
+    assert r.publish("news:withreturns", "id2") == 0
+
+
+def test_fake_redis_module_hands_out_one_server():
+    server = FakeRedis()
+    redis = fake_redis_module(server)
+    client = redis.Redis(connection_pool=redis.ConnectionPool(host="x", port=1, decode_responses=True))
+    assert client is server and redis.Redis(host="y").pubsub().__class__.__name__ == "FakePubSub"
+    assert issubclass(redis.ConnectionError, ConnectionError)
+
+
+def test_vendor_server_routes_rate_and_replay(tmp_path):
+    pages = []
+    items = news_rest_items(5, ["AAPL", "MSFT"], start=datetime(2026, 9, 1, 14))
+    routes = polygon_routes() + benzinga_routes(items, page_size=2, on_page=pages.append) + sec_routes()
+    with FakeVendorServer(routes, rate=50) as server:
+        details = _get(f"{server.url}/v3/reference/tickers/AAPL")
+        assert details["results"]["type"] == "CS" and details["results"]["market"] == "stocks"
+        bars = _get(f"{server.url}/v2/aggs/ticker/AAPL/range/1/second/1000/1800000000000?limit=5")
+        assert bars["results"][0]["c"] == synthetic_price("AAPL", 1800000000000) > 0
+        assert [len(_get(f"{server.url}/api/v2/news?page={p}&pageSize=2")) for p in range(4)] == [2, 2, 1, 0]
+        assert "Item 2-2 of u" in _get(f"{server.url}/extractor?url=u&item=2-2&type=text")
+        started = time.monotonic()
+        for _ in range(10):
+            _get(f"{server.url}/Archives/edgar/data/1/doc.txt")
+        assert time.monotonic() - started >= 9 / 50 * 0.9                    # paced at 50 responses/s
+        assert [len(p) for p in pages] == [2, 2, 1, 0]
+        with pytest.raises(urllib.error.HTTPError):
+            _get(f"{server.url}/nope")
+        assert server.snapshot()["by_route"]["unrouted"] == 1
+
+    path = tmp_path / "polygon.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in [
+        {"path": "/v2/aggs/ticker/", "body": {"results": [{"c": 1.0}]}},
+        {"path": "/v2/aggs/ticker/", "body": {"results": [{"c": 2.0}]}}]))
+    with FakeVendorServer(replay_routes(str(path))) as server:
+        closes = [_get(f"{server.url}/v2/aggs/ticker/X/range")["results"][0]["c"] for _ in range(3)]
+    assert closes == [1.0, 2.0, 1.0]
+
+
+def test_recording_neo4j_manager():
+    manager = RecordingNeo4jManager()
+    record = manager.execute_cypher_query("MERGE (n:News {id: $id}) RETURN n", {"id": "bz1"})
+    assert record and record["n"]["id"] == "bz1"
+    assert manager.execute_cypher_query("MATCH (n:News {id: $id}) RETURN n", {"id": "bz1"}) is None
+    with manager.driver.session() as session:
+        session.execute_write(lambda tx: tx.run("UNWIND $rows AS r\nMERGE (c:Company {id: r})", rows=[1, 2, 3]))
+    assert manager.merge_relationships([1, 2]) is True
+    snap = manager.snapshot()
+    assert (snap["statements"], snap["rows"], snap["helper_calls"]) == (3, 5, {"merge_relationships": 1})
+
+
+def test_synthetic_frames_carry_expected_ids():
+    news = news_ws_frames(5, ["AAPL"], burst_size=2, burst_gap=0.5)
+    assert [t for t, _ in news] == [0.0, 0.0, 0.5, 0.5, 1.0]
+    assert frame_item_ids("news", news[3][1]) == ["900000003"]
+    sec = sec_ws_frames(3, [("AAPL", "320193")], "http://127.0.0.1:1", burst_size=10, burst_gap=1)
+    filing = json.loads(sec[2][1])[0]
+    assert frame_item_ids("reports", sec[2][1]) == [filing["accessionNo"]]
+    assert filing["linkToTxt"].startswith("http://127.0.0.1:1/Archives/") and filing["formType"] == "8-K"
+
+
+def test_stage_report_and_compare():
+    lifecycle = {
+        "tracking:meta:news:1.2026-10-19T10.00.00": {"ingested_at": 1.0, "processed_at": 1.5,
+                                                      "withoutreturns_at": 2.0, "inserted_into_neo4j_at": 3.0},
+        "tracking:meta:news:2.2026-10-19T10.00.00": {"ingested_at": 1.2, "filtered_at": 1.3},
+        "tracking:meta:reports:0001-26-1.2026-10-19T10.00.00-05.00": {
+            "ingested_at": 2.0, "queued_for_enrichment_at": 2.1, "finished_enrichment_at": 4.0,
+            "processed_at": 4.0, "withreturns_at": 4.5, "inserted_into_neo4j_at": 5.0},
+        "tracking:meta:reports:0001-26-2.x": {"ingested_at": 3.0, "failed_at": 3.5},
+    }
+    assert terminal_count(lifecycle) == 4
+    report = stage_report(lifecycle, {("news", "1"): 0.5, ("reports", "0001-26-1"): 1.0})
+    news, reports = report["news"], report["reports"]
+    assert (news["items"], news["completed"], news["filtered"], news["failed"]) == (2, 1, 1, 0)
+    assert news["stages"]["feed"]["p50_ms"] == 500.0 and news["stages"]["end_to_end"]["p50_ms"] == 2500.0
+    assert "enrich" not in news["stages"] and reports["stages"]["enrich"]["p50_ms"] == 1900.0
+    assert reports["failed"] == 1 and reports["stages"]["neo4j"]["p50_ms"] == 500.0
+    assert news["span_s"] == 2.5 and news["items_per_sec"] == 0.4
+
+    baseline = {"scenario": "x", "git_rev": "a", "sources": {"news": dict(news, items_per_sec=0.2)}}
+    delta = compare_runs(baseline, {"scenario": "x", "git_rev": "b", "sources": report})
+    assert delta["news"]["items_per_sec"] == 2.0 and delta["news"]["neo4j_p99_ms"] == 1.0
+    assert "reports" not in delta
+
+
+def test_depth_sampler_tracks_peaks():
+    r = FakeRedis()
+    sampler = DepthSampler(r, {"raw": ("size", "q"), "waiting": ("prefix", "news:withreturns:")}, interval=0.01)
+    r.lpush("q", *range(5))
+    r.set("news:withreturns:1", "{}")
+    sampler.start()
+    time.sleep(0.05)
+    r.delete("q")
+    sampler.stop()
+    assert sampler.peak == {"raw": 5, "waiting": 1}
+    assert sampler.samples[-1]["raw"] == 0 and len(sampler.samples) >= 2
@@ -0,0 +1,109 @@
+"""Offline tests for utils/lifecycle_trace.py (fake clock, no Redis)."""
+import json
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import lifecycle_trace  # noqa: E402
+from utils.lifecycle_trace import LifecycleTracer, RollingHistogram, item_key, serve  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_marks_record_time_since_previous_stage_and_end_to_end():
+    clock = Clock()
+    tracer = LifecycleTracer(window=60, exemplars=2, clock=clock)
+    tracer.mark("news", "123", "ws_receive", t=999.9)
+    tracer.mark_lifecycle("tracking:meta:news:123.2026-10-19T10.00.00+00.00", "ingested_at")
+    clock.now += 0.05
+    tracer.mark("news", "123.2026-10-19T10.00.00+00.00", "process_start")
+    tracer.mark("news", "123.2026-10-19T10.00.00+00.00", "process_start")     # first stamp wins
+    clock.now += 2.0
+    tracer.mark_lifecycle("tracking:meta:news:123.2026-10-19T10.00.00+00.00", "inserted_into_neo4j_at")
+    tracer.mark_lifecycle("tracking:meta:news:123.x", "reason")                # not a stage field
+
+    assert item_key("0001-26-1.2026-10-19T10.00.00-05.00") == "0001-26-1"
+    stages = tracer.snapshot()["sources"]["news"]
+    assert list(stages) == ["ingested", "process_start", "neo4j_commit", "end_to_end"]
+    assert stages["ingested"]["max_ms"] == 100.0 and stages["process_start"]["max_ms"] == 50.0
+    assert stages["neo4j_commit"]["count"] == 1 and stages["end_to_end"]["max_ms"] == 2150.0
+    assert tracer.timeline("news", "123") == {"ws_receive": 0.0, "ingested": 100.0,
+                                              "process_start": 150.0, "neo4j_commit": 2150.0}
+
+
+def test_histogram_window_percentiles_and_exemplars():
+    clock = Clock()
+    hist = RollingHistogram(window=10, slots=5, exemplars=3, clock=clock)
+    for i in range(100):
+        hist.record(float(i), f"i{i}")
+    summary = hist.summary()
+    assert summary["count"] == 100 and summary["p50_ms"] == 50.0 and summary["p99_ms"] == 99.0
+    assert [item for _, _, item in hist.exemplars()] == ["i99", "i98", "i97"]
+
+    clock.now += 6
+    hist.record(5000.0, "slow")
+    assert hist.summary()["count"] == 101 and hist.exemplars()[0][2] == "slow"
+    clock.now += 6                                  # first batch has left the 10 s window
+    summary = hist.summary()
+    assert (summary["count"], summary["lifetime_count"], summary["p50_ms"]) == (1, 101, 5000.0)
+
+
+def test_observe_lru_and_exports(tmp_path):
+    clock = Clock()
+    tracer = LifecycleTracer(window=60, exemplars=1, max_items=2, clock=clock)
+    for i in range(3):
+        tracer.mark("reports", f"a{i}", "ingested")
+    assert tracer.timeline("reports", "a0") is None and tracer.evicted == 1
+    tracer.observe("news", "return_hourly", 12.5, "n1.2026")
+
+    snap = tracer.export_jsonl(str(tmp_path / "trace" / "t.jsonl"))
+    assert snap["exemplars"]["news"]["return_hourly"][0]["item"] == "n1"
+    assert json.loads((tmp_path / "trace" / "t.jsonl").read_text())["sources"]["news"]["return_hourly"]["p50_ms"] == 12500.0
+
+    server = serve(tracer)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/trace/exemplars", timeout=5) as resp:
+            body = json.loads(resp.read())
+        assert set(body) == {"at", "exemplars"} and body["exemplars"]["news"]["return_hourly"][0]["ms"] == 12500.0
+    finally:
+        server.shutdown()
+
+
+class Pipe:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def execute(self):
+        if self.fail:
+            raise ConnectionError("EXECABORT")
+        return [1]
+
+
+def test_pipelined_stamps_are_traced_only_after_execute(monkeypatch):
+    from config import feature_flags
+    tracer = LifecycleTracer(window=60)
+    monkeypatch.setattr(feature_flags, "ENABLE_LIFECYCLE_TRACING", True)
+    monkeypatch.setattr(lifecycle_trace, "_tracer_singleton", tracer)
+
+    ok, failed = Pipe(), Pipe(fail=True)
+    lifecycle_trace.trace_lifecycle_on_execute(ok, "tracking:meta:news:1.x", "ingested_at")
+    lifecycle_trace.trace_lifecycle_on_execute(failed, "tracking:meta:news:2.x", "ingested_at")
+    assert tracer.marks == 0                        # queued, not yet written
+
+    assert ok.execute() == [1]
+    try:
+        failed.execute()
+    except ConnectionError:
+        pass
+    assert list(tracer.timeline("news", "1")) == ["ingested"] and tracer.timeline("news", "2") is None
+    ok.execute()                                    # a reused pipeline does not re-trace old marks
+    assert tracer.marks == 1
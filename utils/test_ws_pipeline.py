@@ -0,0 +1,115 @@
+"""Offline tests for utils/ws_pipeline.py and utils/ws_replay.py (no Redis, no live feeds)."""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ws_pipeline import FramePipeline  # noqa: E402
+from utils.ws_replay import (OP_PING, OP_PONG, OP_TEXT, ReplayWebSocketServer, connect_client,  # noqa: E402
+                             encode_frame, load_recording, read_frame, save_recording)
+
+
+class Recorder:
+    def __init__(self, gate=None, fail_on=None):
+        self.batches, self.gate, self.fail_on = [], gate, fail_on
+
+    def __call__(self, frames):
+        if self.gate:
+            self.gate.wait(5)
+        if self.fail_on and any(f.data == self.fail_on for f in frames):
+            raise RuntimeError("bad frame")
+        self.batches.append([f.data for f in frames])
+        return len(frames)
+
+
+def test_frames_are_batched_and_all_handled():
+    gate = threading.Event()
+    handler = Recorder(gate)
+    pipe = FramePipeline("t", handler, capacity=100, workers=1, batch_size=10, max_wait=0)
+    pipe.start()
+    for i in range(25):
+        assert pipe.submit(str(i) + "x")
+    gate.set()
+    assert pipe.drain(5)
+    pipe.stop()
+    handled = [d for batch in handler.batches for d in batch]
+    assert handled == [f"{i}x" for i in range(25)]
+    assert max(len(b) for b in handler.batches) == 10
+    snap = pipe.snapshot()
+    assert snap["frames_handled"] == snap["items_stored"] == snap["count"] == 25
+    assert snap["dropped"] == 0 and snap["p99_ms"] >= snap["p50_ms"] > 0
+
+
+def test_drop_oldest_counts_overflow():
+    pipe = FramePipeline("t", Recorder(), capacity=3, overflow="drop_oldest")   # not started: nothing drains
+    for i in range(5):
+        assert pipe.submit(str(i))
+    assert list(f.data for f in pipe._ring) == ["2", "3", "4"]
+    assert pipe.stats["dropped"] == 2 and pipe.stats["overflows"] == 2
+
+
+def test_block_applies_backpressure_then_drops():
+    gate = threading.Event()
+    handler = Recorder(gate)
+    pipe = FramePipeline("t", handler, capacity=2, workers=1, batch_size=1, max_wait=0, block_seconds=0.2)
+    pipe.start()
+    pipe.submit("a")                          # taken by the (gated) worker
+    time.sleep(0.05)
+    pipe.submit("b")
+    pipe.submit("c")
+    started = time.monotonic()
+    assert pipe.submit("d") is False          # ring full for block_seconds
+    assert time.monotonic() - started >= 0.19
+    assert pipe.stats["dropped"] == 1 and pipe.stats["blocked_seconds"] > 0
+
+    releaser = threading.Timer(0.1, gate.set)
+    releaser.start()
+    assert pipe.submit("e") is True           # room appears while blocked
+    pipe.stop()
+    assert [d for b in handler.batches for d in b] == ["a", "b", "c", "e"]
+
+
+def test_handler_errors_are_counted_not_raised():
+    handler = Recorder(fail_on="bad")
+    pipe = FramePipeline("t", handler, workers=1, batch_size=1, max_wait=0)
+    pipe.start()
+    for data in ("ok1", "bad", "ok2"):
+        pipe.submit(data)
+    pipe.stop()
+    assert pipe.stats["failed_frames"] == 1
+    assert [d for b in handler.batches for d in b] == ["ok1", "ok2"]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        FramePipeline("t", Recorder(), overflow="drop_newest")
+
+
+def test_replay_server_sends_recording_and_answers_pings(tmp_path):
+    path = str(tmp_path / "burst.jsonl")
+    frames = [(0.0, json.dumps([{"accessionNo": f"a{i}"}])) for i in range(3)] + [(0.05, "x" * 70000)]
+    save_recording(path, frames)
+    assert load_recording(path) == frames
+
+    with ReplayWebSocketServer(load_recording(path)) as server:
+        sock = connect_client(server.url)
+        received = [read_frame(sock) for _ in range(4)]
+        assert [op for op, _ in received] == [OP_TEXT] * 4
+        assert [p.decode() for _, p in received] == [f for _, f in frames]
+
+        mask = b"\x01\x02\x03\x04"
+        sock.sendall(bytes([0x80 | OP_PING, 0x80 | 4]) + mask + bytes(b ^ mask[i] for i, b in enumerate(b"ping")))
+        assert read_frame(sock) == (OP_PONG, b"ping")
+        assert server.replay_done.wait(2) and len(server.sent_at) == 4
+        sock.close()
+
+
+def test_encode_frame_lengths():
+    assert encode_frame(b"a")[:2] == bytes([0x81, 1])
+    assert encode_frame(b"a" * 200)[1] == 126
+    assert encode_frame(b"a" * 70000)[1] == 127
@@ -0,0 +1,255 @@
+"""
+Receive/process split for the live websocket feeds (SEC filings, Benzinga news).
+
+The websocket callback thread only timestamps the raw frame and puts it in a
+bounded in-process ring; a small worker pool drains the ring in batches, parses
+and validates the frames and writes them to Redis in one pipeline per batch.
+A burst at the open therefore no longer backs up the socket reader (which also
+answers pings), so it cannot trip heartbeats and reconnects.
+
+Overflow policy when the ring is full:
+  * "block"       - the reader waits up to block_seconds for room (backpressure on
+                    the socket), then drops the new frame;
+  * "drop_oldest" - the oldest queued frame is evicted to make room.
+Every drop is counted (dropped) and so is every time the ring was found full
+(overflows), so a lossy burst shows up in the stats and the gap can be backfilled.
+
+End-to-end latency is measured per frame from submit() to the return of the
+batch handler (i.e. frame received -> written to Redis).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+
+@dataclass
+class Frame:
+    """One raw websocket message and the monotonic time it was received."""
+    data: str
+    received_at: float = field(default_factory=time.monotonic)
+
+
+class LatencyWindow:
+    """Most recent N frame latencies (seconds) with percentile summaries."""
+
+    def __init__(self, size: int = 10000):
+        self._values = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.max = 0.0
+
+    def add_many(self, values: List[float]):
+        with self._lock:
+            self._values.extend(values)
+            self.count += len(values)
+            if values:
+                self.max = max(self.max, max(values))
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return {"count": self.count, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def pct(p):
+            return values[min(len(values) - 1, int(p * len(values)))] * 1000
+
+        return {"count": self.count, "p50_ms": pct(0.50), "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99), "max_ms": self.max * 1000}
+
+
+class FramePipeline:
+    """
+    Bounded frame ring drained by worker threads.
+
+    Args:
+        name: Label for logs and thread names (e.g. "sec", "news")
+        handler: Called with a list of Frames from a worker thread; returns the number
+            of items it stored (used for the processed counter). Exceptions are logged
+            and counted as failed frames, never raised to the reader.
+        capacity: Maximum queued frames
+        workers: Number of worker threads
+        batch_size: Maximum frames per handler call
+        max_wait: Seconds a worker waits for more frames before handling a partial batch
+        overflow: "block" or "drop_oldest"
+        block_seconds: Longest submit() waits for room under the "block" policy
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[Frame]], int], capacity: int = 10000,
+                 workers: int = 2, batch_size: int = 50, max_wait: float = 0.02,
+                 overflow: str = "block", block_seconds: float = 1.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.name = name
+        self.handler = handler
+        self.capacity = max(1, int(capacity))
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.max_wait = max_wait
+        self.overflow = overflow
+        self.block_seconds = block_seconds
+
+        self._ring = deque()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._busy = 0
+        self.latency = LatencyWindow()
+        self.stats = {
+            "submitted": 0,     # frames offered by the reader
+            "enqueued": 0,      # frames accepted into the ring
+            "dropped": 0,       # frames lost to overflow
+            "overflows": 0,     # submits that found the ring full
+            "blocked_seconds": 0.0,
+            "batches": 0,
+            "frames_handled": 0,
+            "items_stored": 0,
+            "failed_frames": 0,
+            "max_depth": 0,
+        }
+
+    # ---- lifecycle ----
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._threads = [threading.Thread(target=self._worker, name=f"{self.name}-ws-worker-{i}", daemon=True)
+                         for i in range(self.workers)]
+        for t in self._threads:
+            t.start()
+        logger.info(f"[{self.name}] frame pipeline started: {self.workers} workers, capacity {self.capacity}, "
+                    f"batch {self.batch_size}, overflow={self.overflow}")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop accepting work once the ring is drained (or timeout), then join the workers."""
+        self.drain(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=max(0.1, timeout))
+        self._threads = []
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued frame has been handled; True if it emptied in time."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._ring or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return not (self._ring or self._busy)
+                self._cond.wait(remaining)
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def depth(self) -> int:
+        return len(self._ring)
+
+    # ---- reader side ----
+    def submit(self, data: str, received_at: Optional[float] = None) -> bool:
+        """Queue one raw frame; False if this frame was dropped (drop_oldest evicts an older one instead)."""
+        frame = Frame(data, received_at if received_at is not None else time.monotonic())
+        with self._cond:
+            self.stats["submitted"] += 1
+            if len(self._ring) >= self.capacity:
+                self.stats["overflows"] += 1
+                if self.overflow == "drop_oldest":
+                    self._ring.popleft()
+                    self.stats["dropped"] += 1
+                else:
+                    start = time.monotonic()
+                    deadline = start + self.block_seconds
+                    while len(self._ring) >= self.capacity and self._running:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    self.stats["blocked_seconds"] += time.monotonic() - start
+                    if len(self._ring) >= self.capacity:
+                        self.stats["dropped"] += 1
+                        logger.error(f"[{self.name}] frame ring full ({self.capacity}) for {self.block_seconds}s "
+                                     f"- dropped frame (total dropped {self.stats['dropped']})")
+                        return False
+            self._ring.append(frame)
+            self.stats["enqueued"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._ring))
+            self._cond.notify_all()
+            return True
+
+    # ---- worker side ----
+    def _take_batch(self) -> List[Frame]:
+        with self._cond:
+            while not self._ring and self._running:
+                self._cond.wait(0.5)
+            if not self._ring:
+                return []
+            # Give a burst a moment to accumulate so Redis sees full pipelines
+            if len(self._ring) < self.batch_size and self.max_wait > 0:
+                self._cond.wait(self.max_wait)
+            batch = [self._ring.popleft() for _ in range(min(self.batch_size, len(self._ring)))]
+            self._busy += 1
+            self._cond.notify_all()     # room for a blocked reader
+            return batch
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                if not self._running and not self._ring:
+                    return
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                stored = self.handler(batch) or 0
+                done = time.monotonic()
+                self.latency.add_many([done - f.received_at for f in batch])
+                with self._cond:
+                    self.stats["batches"] += 1
+                    self.stats["frames_handled"] += len(batch)
+                    self.stats["items_stored"] += stored
+            except Exception as e:
+                logger.error(f"[{self.name}] frame batch of {len(batch)} failed: {e}", exc_info=True)
+                with self._cond:
+                    self.stats["failed_frames"] += len(batch)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._cond:
+            stats = dict(self.stats, depth=len(self._ring))
+        stats.update(self.latency.summary())
+        return stats
+
+    def log_stats(self):
+        s = self.snapshot()
+        logger.info(f"[{self.name}] frame pipeline: depth {s['depth']} (max {s['max_depth']}), "
+                    f"enqueued {s['enqueued']}, handled {s['frames_handled']}, stored {s['items_stored']}, "
+                    f"dropped {s['dropped']}, overflows {s['overflows']}, failed {s['failed_frames']}, "
+                    f"latency p50 {s['p50_ms']:.1f}ms p99 {s['p99_ms']:.1f}ms")
+
+
+def pipeline_from_flags(name: str, handler: Callable[[List[Frame]], int]) -> Optional[FramePipeline]:
+    """FramePipeline configured from config.feature_flags, or None when ENABLE_WS_FRAME_PIPELINE is off."""
+    from config import feature_flags as ff
+    if not getattr(ff, "ENABLE_WS_FRAME_PIPELINE", False):
+        return None
+    return FramePipeline(name, handler,
+                         capacity=ff.WS_PIPELINE_CAPACITY,
+                         workers=ff.WS_PIPELINE_WORKERS,
+                         batch_size=ff.WS_PIPELINE_BATCH_SIZE,
+                         max_wait=ff.WS_PIPELINE_MAX_WAIT_SECONDS,
+                         overflow=ff.WS_PIPELINE_OVERFLOW,
+                         block_seconds=ff.WS_PIPELINE_BLOCK_SECONDS)
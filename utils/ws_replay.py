@@ -0,0 +1,241 @@
+"""
+Local fake websocket server that replays recorded feed bursts.
+
+Used to exercise SECWebSocket / BenzingaNewsWebSocket (and utils/ws_pipeline.py)
+against realistic bursts without the sec-api.io / Benzinga endpoints: point the
+client's .url at server.url. Standard library only (RFC 6455 text frames, no
+extensions); answers client pings, so ping_interval/ping_timeout behave as live.
+
+Recording format (JSONL), one frame per line:
+    {"t": <seconds from start>, "frame": "<raw websocket text>"}
+Frames sharing a "t" (or closer together than the sender can go) form a burst.
+Send times are recorded (monotonic) per frame so callers can compute
+frame-to-Redis latency against the time the data reached Redis.
+"""
+import base64
+import hashlib
+import json
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def load_recording(path: str) -> List[Tuple[float, str]]:
+    """Read a JSONL recording into [(t, frame)] sorted by t."""
+    frames = []
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                rec = json.loads(line)
+                frames.append((float(rec.get("t", 0.0)), rec["frame"]))
+    return sorted(frames, key=lambda f: f[0])
+
+
+def save_recording(path: str, frames: Iterable[Tuple[float, str]]):
+    with open(path, "w") as fh:
+        for t, frame in frames:
+            fh.write(json.dumps({"t": t, "frame": frame}) + "\n")
+
+
+def encode_frame(payload: bytes, opcode: int = OP_TEXT) -> bytes:
+    """Server-to-client frame (FIN set, unmasked)."""
+    header = bytes([0x80 | opcode])
+    n = len(payload)
+    if n < 126:
+        header += bytes([n])
+    elif n < 1 << 16:
+        header += bytes([126]) + struct.pack("!H", n)
+    else:
+        header += bytes([127]) + struct.pack("!Q", n)
+    return header + payload
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("socket closed")
+        buf += chunk
+    return buf
+
+
+def read_frame(sock) -> Tuple[int, bytes]:
+    """Read one frame (masked or not); returns (opcode, payload)."""
+    b1, b2 = _recv_exact(sock, 2)
+    opcode, masked, n = b1 & 0x0F, b2 & 0x80, b2 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", _recv_exact(sock, 2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", _recv_exact(sock, 8))[0]
+    mask = _recv_exact(sock, 4) if masked else None
+    payload = _recv_exact(sock, n) if n else b""
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+class ReplayWebSocketServer:
+    """
+    Serves one recording to each client that connects.
+
+    Args:
+        frames: [(t, frame_text)] as from load_recording
+        speed: Replay speed multiplier (0 = send everything back to back)
+        heartbeat_every: Seconds between numeric heartbeat frames after replay (0 = none)
+    """
+
+    def __init__(self, frames: List[Tuple[float, str]], host: str = "127.0.0.1", port: int = 0,
+                 speed: float = 1.0, heartbeat_every: float = 0.0):
+        self.frames = list(frames)
+        self.speed = speed
+        self.heartbeat_every = heartbeat_every
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(4)
+        self.host, self.port = self._sock.getsockname()[:2]
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.sent_at: List[float] = []      # monotonic send time per frame (last connection)
+        self.pings = 0
+        self.connections = 0
+        self.replay_done = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/"
+
+    def start(self) -> "ReplayWebSocketServer":
+        t = threading.Thread(target=self._accept_loop, name="ws-replay-accept", daemon=True)
+        t.start()
+        self._threads.append(t)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        for t in self._threads:
+            t.join(timeout=2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- server internals ----
+    def _accept_loop(self):
+        self._sock.settimeout(0.2)
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.connections += 1
+            t = threading.Thread(target=self._serve, args=(conn,), name="ws-replay-conn", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _handshake(self, conn) -> bool:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return False
+            request += chunk
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+        key = headers.get("sec-websocket-key")
+        if not key:
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        conn.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        return True
+
+    def _serve(self, conn):
+        send_lock = threading.Lock()
+        closed = threading.Event()
+
+        def send(payload: bytes, opcode: int = OP_TEXT):
+            with send_lock:
+                conn.sendall(encode_frame(payload, opcode))
+
+        def reader():
+            try:
+                while not closed.is_set():
+                    opcode, payload = read_frame(conn)
+                    if opcode == OP_PING:
+                        self.pings += 1
+                        send(payload, OP_PONG)
+                    elif opcode == OP_CLOSE:
+                        send(payload[:2], OP_CLOSE)
+                        break
+            except (ConnectionError, OSError):
+                pass
+            closed.set()
+
+        try:
+            if not self._handshake(conn):
+                conn.close()
+                return
+            threading.Thread(target=reader, name="ws-replay-reader", daemon=True).start()
+            self.sent_at = sent_at = []
+            start = time.monotonic()
+            for t, frame in self.frames:
+                if self.speed:
+                    delay = start + t / self.speed - time.monotonic()
+                    if delay > 0 and (closed.wait(delay) or self._stop.is_set()):
+                        break
+                if closed.is_set():
+                    break
+                sent_at.append(time.monotonic())
+                send(frame.encode())
+            self.replay_done.set()
+            beat = 0
+            while not closed.is_set() and not self._stop.is_set():
+                if self.heartbeat_every:
+                    beat += 1
+                    send(str(beat).encode())
+                closed.wait(self.heartbeat_every or 0.2)
+        except (ConnectionError, OSError) as e:
+            logger.debug(f"replay connection ended: {e}")
+        finally:
+            closed.set()
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+
+def connect_client(url: str, timeout: float = 5.0) -> socket.socket:
+    """Minimal blocking client for tests: handshake and return the socket (use read_frame)."""
+    host, port = url[len("ws://"):].rstrip("/").split(":")
+    sock = socket.create_connection((host, int(port)), timeout=timeout)
+    key = base64.b64encode(b"replay-test-key!").decode()
+    sock.sendall((f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    response = b""
+    while not response.endswith(b"\r\n\r\n"):     # byte-wise so no frame bytes are consumed
+        response += _recv_exact(sock, 1)
+    if b" 101 " not in response.split(b"\r\n", 1)[0]:
+        raise ConnectionError(response.decode("latin-1"))
+    return sock